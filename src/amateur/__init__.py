@@ -3,6 +3,7 @@ MeshForge Amateur Radio Edition Module
 
 Provides ham radio specific functionality:
 - Callsign management and lookup
+- Offline FCC ULS license database
 - ARES/RACES emergency communication tools
 - Part 97 compliance features
 - Band plan reference
@@ -10,12 +11,14 @@ Provides ham radio specific functionality:
 """
 
 from .callsign import CallsignManager, CallsignInfo
+from .uls import UlsDatabase
 from .compliance import Part97Reference, ComplianceChecker
 from .ares_races import ARESRACESTools, NetChecklistItem, TrafficMessage
 
 __all__ = [
     'CallsignManager',
     'CallsignInfo',
+    'UlsDatabase',
     'Part97Reference',
     'ComplianceChecker',
     'ARESRACESTools',
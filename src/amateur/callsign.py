@@ -2,6 +2,12 @@
 Callsign Management for MeshForge Amateur Radio Edition
 
 Provides callsign lookup, validation, and management features.
+
+Lookups try, in order: the in-memory cache, the local FCC ULS database
+(imported from the weekly l_amat.zip dump, see amateur.uls) and finally
+the FCC License View API. Batches go through lookup_callsigns(), which
+answers everything it can locally in a few SQLite queries and sends
+only the remainder to the API, concurrently.
 """
 
 import re
@@ -12,6 +18,7 @@ import urllib.request
 import urllib.parse
 import urllib.error
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any, Callable, Tuple
 from datetime import datetime, timedelta
@@ -29,8 +36,15 @@ except ImportError:
             return Path(f'/home/{sudo_user}')
         return Path.home()
 
+from .uls import UlsDatabase
+
 logger = logging.getLogger(__name__)
 
+# Concurrent FCC License View API requests in a batch lookup
+API_WORKERS = 8
+# Cache writes after lookups are coalesced over this many seconds
+CACHE_SAVE_DELAY = 2.0
+
 
 @dataclass
 class CallsignInfo:
@@ -136,8 +150,13 @@ class CallsignManager:
         self.my_callsign: Optional[str] = None
         self.my_info: Optional[CallsignInfo] = None
         self._cache: Dict[str, CallsignInfo] = {}
+        self._cache_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self._load_cache()
 
+        # Local FCC ULS database (present once l_amat.zip has been imported)
+        self.uls = UlsDatabase(self.config_dir / 'fcc_uls.db')
+
         # Station ID settings
         self.id_interval_minutes = 10  # FCC requires every 10 minutes
         self.last_id_time: Optional[datetime] = None
@@ -159,19 +178,44 @@ class CallsignManager:
                 logger.warning(f"Failed to load callsign cache: {e}")
 
     def _save_cache(self) -> None:
-        """Save callsign cache to disk"""
-        try:
-            self.config_dir.mkdir(parents=True, exist_ok=True)
+        """Save callsign cache to disk now"""
+        with self._cache_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
             data = {
                 'cache': {call: info.to_dict() for call, info in self._cache.items()},
                 'my_callsign': self.my_callsign,
                 'my_info': self.my_info.to_dict() if self.my_info else None,
             }
-            with open(self.cache_file, 'w') as f:
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp, self.cache_file)
         except Exception as e:
             logger.warning(f"Failed to save callsign cache: {e}")
 
+    def _schedule_save(self) -> None:
+        """Save the cache shortly; lookups in the meantime share one write"""
+        with self._cache_lock:
+            if self._save_timer is not None:
+                return
+            # Not a daemon: a pending write still lands at interpreter exit
+            self._save_timer = threading.Timer(CACHE_SAVE_DELAY, self._save_cache)
+            self._save_timer.start()
+
+    def flush_cache(self) -> None:
+        """Write a pending (debounced) cache save now"""
+        if self._save_timer is not None:
+            self._save_cache()
+
+    def _remember(self, callsign: str, info: CallsignInfo) -> None:
+        with self._cache_lock:
+            self._cache[callsign] = info
+        self._schedule_save()
+
     def validate_callsign(self, callsign: str, country: str = 'US') -> bool:
         """
         Validate callsign format.
@@ -243,15 +287,124 @@ class CallsignManager:
             logger.debug(f"Callsign {callsign} found in cache")
             return self._cache[callsign]
 
-        # Try FCC ULS lookup (placeholder - would need actual API implementation)
+        # Local ULS database, then the FCC License View API
+        info = self._lookup_local(callsign)
+        if info:
+            return info
+
         info = self._lookup_fcc_uls(callsign)
 
         if info:
-            self._cache[callsign] = info
-            self._save_cache()
+            self._remember(callsign, info)
 
         return info
 
+    def _lookup_local(self, callsign: str) -> Optional[CallsignInfo]:
+        """Look up callsign in the imported FCC ULS database"""
+        record = self.uls.lookup(callsign)
+        return CallsignInfo.from_dict(record) if record else None
+
+    def lookup_callsigns(
+        self,
+        callsigns: List[str],
+        use_cache: bool = True,
+        use_api: bool = True,
+        max_workers: int = API_WORKERS,
+    ) -> Dict[str, Optional[CallsignInfo]]:
+        """
+        Look up many callsigns at once.
+
+        Cached and locally known callsigns are answered without network
+        access (a few indexed queries for the whole batch); the rest go to
+        the FCC API concurrently, and the cache is written once at the end.
+
+        Args:
+            callsigns: Callsigns to look up (case and duplicates ignored)
+            use_cache: Whether to use cached data
+            use_api: Query the FCC API for callsigns not found locally
+            max_workers: Concurrent API requests
+
+        Returns:
+            {CALLSIGN: CallsignInfo or None}
+        """
+        wanted = list(dict.fromkeys(c.upper().strip() for c in callsigns if c and c.strip()))
+        results: Dict[str, Optional[CallsignInfo]] = {}
+
+        pending = []
+        for callsign in wanted:
+            cached = self._cache.get(callsign) if use_cache else None
+            if cached:
+                results[callsign] = cached
+            else:
+                pending.append(callsign)
+
+        if pending:
+            local = self.uls.lookup_many(pending)
+            for callsign, record in local.items():
+                results[callsign] = CallsignInfo.from_dict(record)
+            pending = [c for c in pending if c not in local]
+
+        # Only US-format calls can be in the FCC database
+        remote = [c for c in pending if use_api and self.validate_callsign(c)]
+        if remote:
+            logger.info(f"FCC API lookup for {len(remote)} callsigns")
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(remote))),
+                                    thread_name_prefix="callsign-lookup") as pool:
+                found = dict(zip(remote, pool.map(self._lookup_fcc_uls, remote)))
+            hits = {c: info for c, info in found.items() if info}
+            if hits:
+                with self._cache_lock:
+                    self._cache.update(hits)
+                self._schedule_save()
+            results.update(found)
+
+        for callsign in wanted:
+            results.setdefault(callsign, None)
+        return results
+
+    def validate_callsigns(self, callsigns: List[str], use_api: bool = False) -> Dict[str, bool]:
+        """
+        Batch-validate callsigns.
+
+        A callsign is valid when its format is valid and, if the local FCC
+        ULS database is available (or use_api is set), it holds an active
+        license.
+
+        Returns:
+            {CALLSIGN: valid}
+        """
+        wanted = [c.upper().strip() for c in callsigns if c and c.strip()]
+        formats = {c: self.validate_callsign(c) for c in wanted}
+        if not (use_api or self.uls.available):
+            return formats
+
+        candidates = [c for c, ok in formats.items() if ok]
+        today = datetime.now().strftime("%Y-%m-%d")
+        records = self.uls.lookup_many(candidates)
+        active = {c for c, record in records.items()
+                  if record['status'] == 'A'
+                  and (not record['expiration_date'] or record['expiration_date'] >= today)}
+
+        if use_api:
+            unknown = [c for c in candidates if c not in records]
+            infos = self.lookup_callsigns(unknown)
+            active.update(c for c, info in infos.items() if info and not info.is_expired())
+
+        return {c: c in active for c in formats}
+
+    def import_uls(self, zip_path, progress=None) -> int:
+        """
+        Import the FCC ULS weekly amateur dump (l_amat.zip) for offline lookups.
+
+        Args:
+            zip_path: Local path to l_amat.zip
+            progress: Optional callback(stage, rows_so_far)
+
+        Returns:
+            Number of licenses imported
+        """
+        return self.uls.import_zip(zip_path, progress=progress)
+
     def _lookup_fcc_uls(self, callsign: str) -> Optional[CallsignInfo]:
         """
         Look up callsign in FCC ULS database.
@@ -565,14 +718,16 @@ class CallsignManager:
 
         for source in sources:
             if source == 'fcc':
+                info = self._lookup_local(callsign)
+                if info:
+                    return info
                 info = self._lookup_fcc_uls(callsign)
             elif source == 'hamqth':
                 info = self.lookup_callsign_hamqth(callsign)
 
             if info:
                 # Update cache
-                self._cache[callsign] = info
-                self._save_cache()
+                self._remember(callsign, info)
                 return info
 
         return None
@@ -623,7 +778,8 @@ class CallsignManager:
 
     def clear_cache(self) -> None:
         """Clear the callsign cache"""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
         self._save_cache()
 
     def check_license_expiration(self, callsign: Optional[str] = None) -> Dict[str, Any]:
@@ -715,6 +871,7 @@ class CallsignManager:
             'callsigns': list(self._cache.keys()),
             'cache_file': str(self.cache_file),
             'cache_exists': self.cache_file.exists(),
+            'uls_database': self.uls.info(),
         }
 
 
@@ -0,0 +1,400 @@
+"""
+Local FCC ULS amateur license database
+
+The FCC publishes the complete amateur license database every week as
+l_amat.zip (https://www.fcc.gov/uls/transactions/daily-weekly). This
+module imports that dump from a local file into an indexed SQLite table,
+so callsign lookups and batch validation run offline in microseconds
+instead of one License View API round trip per callsign.
+
+The dump is a set of pipe-delimited .dat files; three are used:
+    HD.dat  license header: call sign, status, service, grant/expiry dates
+    EN.dat  entity: licensee name, address, FRN
+    AM.dat  amateur: operator class
+
+Usage:
+    db = UlsDatabase(Path('~/.config/meshforge/fcc_uls.db'))
+    db.import_zip('l_amat.zip')             # ~1.5M licenses, a minute or two
+    db.lookup('W1AW')                       # dict or None
+    db.lookup_many(['W1AW', 'K6XYZ'])       # {callsign: dict}
+
+    python3 -m amateur.uls import l_amat.zip
+    python3 -m amateur.uls lookup W1AW K6XYZ
+"""
+
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# FCC operator class codes (AM.dat) -> readable names
+LICENSE_CLASSES = {
+    'E': 'Amateur Extra',
+    'A': 'Advanced',
+    'G': 'General',
+    'P': 'Technician Plus',
+    'T': 'Technician',
+    'N': 'Novice',
+}
+
+# Rows handed to executemany() at a time during import
+IMPORT_BATCH = 10000
+# Callsigns per IN (...) query; below SQLite's host parameter limit
+LOOKUP_CHUNK = 500
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def _iso_date(value: str) -> str:
+    """ULS 'MM/DD/YYYY' -> 'YYYY-MM-DD' ('' if empty or malformed)."""
+    if len(value) != 10 or value[2] != '/' or value[5] != '/':
+        return ''
+    return f"{value[6:]}-{value[:2]}-{value[3:5]}"
+
+
+def iter_records(stream: Iterable[str], record_type: str) -> Iterator[List[str]]:
+    """
+    Split a ULS .dat stream into field lists.
+
+    Some free-text fields contain line breaks; a line that does not start
+    with the record type ('HD|', 'EN|', ...) continues the previous record.
+    """
+    prefix = record_type + '|'
+    pending = None
+    for line in stream:
+        line = line.rstrip('\r\n')
+        if line.startswith(prefix):
+            if pending is not None:
+                yield pending.split('|')
+            pending = line
+        elif pending is not None:
+            pending += ' ' + line
+    if pending is not None:
+        yield pending.split('|')
+
+
+def _hd_rows(records: Iterable[List[str]]):
+    for f in records:
+        if len(f) < 9:
+            continue
+        yield (int(f[1]), f[4].upper(), f[5], f[6], _iso_date(f[7]), _iso_date(f[8]))
+
+
+def _en_rows(records: Iterable[List[str]]):
+    for f in records:
+        # Only the licensee; contact/representative entities share the key
+        if len(f) < 23 or f[5] != 'L':
+            continue
+        name = f[7] or ' '.join(part for part in (f[8], f[9], f[10], f[11]) if part)
+        yield (int(f[1]), name, f[15], f[16], f[17], f[18], f[22])
+
+
+def _am_rows(records: Iterable[List[str]]):
+    for f in records:
+        if len(f) < 6:
+            continue
+        yield (int(f[1]), f[5])
+
+
+def _batched(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class UlsDatabase:
+    """
+    SQLite index of the FCC ULS amateur dump.
+
+    Lookups are thread-safe. An import builds a new database file beside
+    the current one and swaps it in atomically, so lookups keep working
+    (against the previous week's data) while it runs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # === Connection ===
+
+    @property
+    def available(self) -> bool:
+        """True once a dump has been imported"""
+        return self._connection() is not None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        with self._lock:
+            if self._conn is None and self.path.exists():
+                try:
+                    conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                           check_same_thread=False)
+                    version = conn.execute(
+                        "SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+                    if not version or int(version[0]) != SCHEMA_VERSION:
+                        conn.close()
+                        logger.warning(f"FCC ULS database {self.path} has an old schema; re-import it")
+                        return None
+                    self._conn = conn
+                except sqlite3.Error as e:
+                    logger.warning(f"Cannot open FCC ULS database {self.path}: {e}")
+            return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # === Lookups ===
+
+    _COLUMNS = ('callsign, status, grant_date, expiration_date, name, address, '
+                'city, state, zip_code, frn, operator_class')
+
+    @staticmethod
+    def _to_info(row: Tuple) -> Dict[str, Any]:
+        (callsign, status, grant_date, expiration_date, name, address,
+         city, state, zip_code, frn, operator_class) = row
+        return {
+            'callsign': callsign,
+            'name': name or '',
+            'address': address or '',
+            'city': city or '',
+            'state': state or '',
+            'zip_code': zip_code or '',
+            'country': 'US',
+            'license_class': LICENSE_CLASSES.get(operator_class or '', operator_class or ''),
+            'grant_date': grant_date,
+            'expiration_date': expiration_date,
+            'frn': frn or '',
+            'status': status,
+        }
+
+    def lookup(self, callsign: str) -> Optional[Dict[str, Any]]:
+        """
+        License record for one callsign.
+
+        Returns:
+            Dict with CallsignInfo fields plus 'status' ('A' active, 'E'
+            expired, 'C' cancelled, ...), or None if not in the database
+        """
+        return self.lookup_many([callsign]).get(callsign.upper().strip())
+
+    def lookup_many(self, callsigns: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        License records for many callsigns in a few indexed queries.
+
+        When a callsign has several licenses on file (an expired grant
+        re-issued later) the active, most recently granted one wins.
+
+        Returns:
+            {callsign: record} for the callsigns found
+        """
+        wanted = sorted({c.upper().strip() for c in callsigns if c})
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return found
+            for start in range(0, len(wanted), LOOKUP_CHUNK):
+                chunk = wanted[start:start + LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT {self._COLUMNS} FROM licenses "
+                    f"WHERE callsign IN ({','.join('?' * len(chunk))}) "
+                    "ORDER BY callsign, status = 'A' DESC, grant_date DESC",
+                    chunk)
+                for row in rows:
+                    if row[0] not in found:
+                        found[row[0]] = self._to_info(row)
+        return found
+
+    def info(self) -> Dict[str, Any]:
+        """Import metadata: source, imported_at, licenses (empty if none)"""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return {}
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        return {
+            'path': str(self.path),
+            'source': meta.get('source', ''),
+            'imported_at': float(meta.get('imported_at', 0)),
+            'licenses': int(meta.get('licenses', 0)),
+        }
+
+    # === Import ===
+
+    def import_zip(self, zip_path, progress: Optional[ProgressCallback] = None) -> int:
+        """
+        Import an l_amat.zip weekly dump (or a directory of its .dat files).
+
+        Args:
+            zip_path: Path to l_amat.zip, or a directory holding HD/EN/AM.dat
+            progress: Optional callback(stage, rows_so_far)
+
+        Returns:
+            Number of licenses imported
+
+        Raises:
+            FileNotFoundError / zipfile.BadZipFile / KeyError (missing .dat)
+        """
+        zip_path = Path(zip_path)
+        start = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.importing')
+        tmp.unlink(missing_ok=True)
+
+        conn = sqlite3.connect(str(tmp))
+        try:
+            conn.executescript("""
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE hd (usi INTEGER PRIMARY KEY, callsign TEXT, status TEXT,
+                                 service TEXT, grant_date TEXT, expiration_date TEXT);
+                CREATE TABLE en (usi INTEGER PRIMARY KEY, name TEXT, address TEXT,
+                                 city TEXT, state TEXT, zip_code TEXT, frn TEXT);
+                CREATE TABLE am (usi INTEGER PRIMARY KEY, operator_class TEXT);
+            """)
+            stages = (
+                ('HD', "INSERT OR REPLACE INTO hd VALUES (?, ?, ?, ?, ?, ?)", _hd_rows),
+                ('EN', "INSERT OR REPLACE INTO en VALUES (?, ?, ?, ?, ?, ?, ?)", _en_rows),
+                ('AM', "INSERT OR REPLACE INTO am VALUES (?, ?)", _am_rows),
+            )
+            with self._open_source(zip_path) as open_dat:
+                for record_type, sql, to_rows in stages:
+                    count = 0
+                    with open_dat(f"{record_type}.dat") as stream:
+                        rows = to_rows(iter_records(stream, record_type))
+                        for batch in _batched(rows, IMPORT_BATCH):
+                            conn.executemany(sql, batch)
+                            count += len(batch)
+                            if progress:
+                                progress(record_type, count)
+                    logger.info(f"ULS {record_type}.dat: {count} records")
+
+            conn.executescript("""
+                CREATE TABLE licenses AS
+                    SELECT hd.usi, hd.callsign, hd.status, hd.grant_date, hd.expiration_date,
+                           en.name, en.address, en.city, en.state, en.zip_code, en.frn,
+                           am.operator_class
+                    FROM hd LEFT JOIN en USING (usi) LEFT JOIN am USING (usi);
+                DROP TABLE hd;
+                DROP TABLE en;
+                DROP TABLE am;
+                CREATE INDEX licenses_callsign ON licenses (callsign);
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+            total = conn.execute("SELECT COUNT(*) FROM licenses").fetchone()[0]
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('schema_version', str(SCHEMA_VERSION)),
+                ('source', str(zip_path)),
+                ('imported_at', str(time.time())),
+                ('licenses', str(total)),
+            ])
+            conn.commit()
+            conn.execute("VACUUM")
+        except BaseException:
+            conn.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        conn.close()
+
+        self.close()
+        os.replace(tmp, self.path)
+        logger.info(f"Imported {total} FCC ULS licenses from {zip_path} "
+                    f"in {time.monotonic() - start:.1f}s")
+        return total
+
+    @staticmethod
+    @contextmanager
+    def _open_source(path: Path):
+        """Yields open_dat(name) -> text stream, for a zip or a directory"""
+        if path.is_dir():
+            yield lambda name: open(path / name, encoding='latin-1', newline='')
+            return
+
+        with zipfile.ZipFile(path) as zf:
+            members = {Path(n).name.upper(): n for n in zf.namelist()}
+
+            def open_dat(name):
+                member = members.get(name.upper())
+                if member is None:
+                    raise KeyError(f"{name} not found in {path}")
+                return io.TextIOWrapper(zf.open(member), encoding='latin-1', newline='')
+
+            yield open_dat
+
+
+def main(argv=None) -> int:
+    """Command-line import and lookup."""
+    import argparse
+
+    try:
+        from utils.paths import get_real_user_home
+    except ImportError:
+        get_real_user_home = Path.home
+
+    default_db = get_real_user_home() / '.config' / 'meshforge' / 'fcc_uls.db'
+    parser = argparse.ArgumentParser(prog='python3 -m amateur.uls',
+                                     description="FCC ULS amateur license database")
+    parser.add_argument('--db', type=Path, default=default_db,
+                        help=f"database path (default {default_db})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help="import l_amat.zip")
+    imp.add_argument('zip', type=Path)
+    look = sub.add_parser('lookup', help="look up callsigns")
+    look.add_argument('callsigns', nargs='+')
+    sub.add_parser('info', help="show import metadata")
+    args = parser.parse_args(argv)
+
+    db = UlsDatabase(args.db)
+    if args.command == 'import':
+        def progress(stage, count):
+            if count % 100000 == 0:
+                print(f"  {stage}: {count:,}")
+        start = time.monotonic()
+        total = db.import_zip(args.zip, progress=progress)
+        print(f"Imported {total:,} licenses into {args.db} "
+              f"in {time.monotonic() - start:.1f}s")
+    elif args.command == 'lookup':
+        start = time.perf_counter()
+        found = db.lookup_many(args.callsigns)
+        elapsed = (time.perf_counter() - start) * 1000
+        for callsign in args.callsigns:
+            record = found.get(callsign.upper())
+            if record:
+                print(f"{record['callsign']:<8} {record['status']}  {record['license_class']:<14} "
+                      f"{record['name']}, {record['city']} {record['state']} "
+                      f"(expires {record['expiration_date'] or '?'})")
+            else:
+                print(f"{callsign.upper():<8} not found")
+        print(f"{len(args.callsigns)} lookups in {elapsed:.2f} ms")
+    else:
+        meta = db.info()
+        if not meta:
+            print(f"No database at {args.db}")
+            return 1
+        print(f"{meta['licenses']:,} licenses from {meta['source']}, imported "
+              f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['imported_at']))}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
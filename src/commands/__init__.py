@@ -43,6 +43,7 @@ Usage:
     # Messaging - Native mesh messaging
     result = messaging.send_message("Hello mesh!", destination="!abcd1234")
     result = messaging.get_messages(limit=20)
+    result = messaging.search_messages("KD7ABC", network="meshtastic")
     result = messaging.get_conversations()
 """
 
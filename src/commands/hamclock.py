@@ -11,6 +11,11 @@ HamClock provides:
 - DX cluster spots
 - Satellite tracking
 
+Responses are cached per endpoint (see utils.fetch_cache): a TTL
+matched to how often each source changes, stale-while-revalidate, and
+the last good copy kept on disk for offline use. Aggregates such as
+get_all_data() fetch their sections concurrently.
+
 Reference: https://www.clearskyinstitute.com/ham/HamClock/
 """
 
@@ -18,11 +23,18 @@ import urllib.request
 import urllib.error
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from dataclasses import dataclass
 
 from .base import CommandResult
 
+# Shared TTL cache (optional; without it every call goes to the network)
+try:
+    from utils.fetch_cache import get_fetch_cache
+    FETCH_CACHE_AVAILABLE = True
+except ImportError:
+    FETCH_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +44,37 @@ _api_port = 8082  # HamClock REST API default
 _live_port = 8081  # HamClock live display default
 _timeout = 10  # Request timeout in seconds
 
+# Cache lifetimes (seconds), matched to how often each source changes.
+# get_sys.txt doubles as the availability probe, so it is never served
+# stale; satellite position changes continuously.
+HAMCLOCK_TTLS = {
+    'get_sys.txt': 30,
+    'get_spacewx.txt': 300,       # HamClock polls its space weather feeds
+    'get_bc.txt': 600,
+    'get_voacap.txt': 600,
+    'get_de.txt': 300,
+    'get_dx.txt': 60,
+    'get_dxspots.txt': 60,
+    'get_satellite.txt': 5,
+    'get_satlist.txt': 3600,
+}
+HAMCLOCK_DEFAULT_TTL = 60
+_LIVE_ENDPOINTS = {'get_sys.txt', 'get_satellite.txt'}
+
+NOAA_SOLAR_CYCLE_URL = "https://services.swpc.noaa.gov/json/solar-cycle/observed-solar-cycle-indices.json"
+NOAA_KP_URL = "https://services.swpc.noaa.gov/products/noaa-planetary-k-index.json"
+NOAA_XRAY_FLARES_URL = "https://services.swpc.noaa.gov/json/goes/primary/xray-flares-latest.json"
+NOAA_XRAY_FLUX_URL = "https://services.swpc.noaa.gov/json/goes/primary/xrays-6-hour.json"
+NOAA_ALERTS_URL = "https://services.swpc.noaa.gov/products/alerts.json"
+
+NOAA_TTLS = {
+    NOAA_SOLAR_CYCLE_URL: 6 * 3600,   # monthly indices
+    NOAA_KP_URL: 900,                 # 3-hour index, estimates update within the period
+    NOAA_XRAY_FLARES_URL: 300,
+    NOAA_XRAY_FLUX_URL: 120,          # 1-minute GOES data
+    NOAA_ALERTS_URL: 600,
+}
+
 
 @dataclass
 class HamClockConfig:
@@ -85,30 +128,52 @@ def _get_api_url() -> str:
     return f"{protocol}://{_host}:{_api_port}"
 
 
-def _fetch_endpoint(endpoint: str, timeout: int = None) -> CommandResult:
+def _http_get(url: str, timeout: Optional[float] = None) -> str:
+    """GET url and return the body (raises urllib errors)."""
+    req = urllib.request.Request(url, method='GET')
+    req.add_header('User-Agent', 'MeshForge/1.0')
+    with urllib.request.urlopen(req, timeout=timeout or _timeout) as response:
+        return response.read().decode('utf-8')
+
+
+def _cached(key: str, loader, ttl: float, live: bool = False):
+    """
+    Value from the shared fetch cache, or straight from loader without it.
+
+    Returns:
+        (value, stale, age_seconds)
+    """
+    if not FETCH_CACHE_AVAILABLE:
+        return loader(), False, 0.0
+    cached = get_fetch_cache().get(key, loader, ttl, persist=not live, allow_stale=not live)
+    return cached.value, cached.stale, cached.age
+
+
+def _fetch_endpoint(endpoint: str, timeout: int = None,
+                    base_url: Optional[str] = None) -> CommandResult:
     """
     Fetch data from a HamClock API endpoint.
 
     Args:
         endpoint: API endpoint (e.g., 'get_spacewx.txt')
         timeout: Request timeout in seconds
+        base_url: Override the configured 'http://host:port'
 
     Returns:
         CommandResult with raw response data
     """
-    url = f"{_get_api_url()}/{endpoint}"
+    url = f"{base_url or _get_api_url()}/{endpoint}"
 
     try:
-        req = urllib.request.Request(url, method='GET')
-        req.add_header('User-Agent', 'MeshForge/1.0')
-
-        with urllib.request.urlopen(req, timeout=timeout or _timeout) as response:
-            data = response.read().decode('utf-8')
-            return CommandResult.ok(
-                f"Fetched {endpoint}",
-                data={'raw': data, 'url': url},
-                raw=data
-            )
+        data, stale, age = _cached(
+            f"hamclock:{url}", lambda: _http_get(url, timeout),
+            HAMCLOCK_TTLS.get(endpoint, HAMCLOCK_DEFAULT_TTL),
+            live=endpoint in _LIVE_ENDPOINTS)
+        return CommandResult.ok(
+            f"Fetched {endpoint}" + (" (cached)" if stale else ""),
+            data={'raw': data, 'url': url, 'stale': stale, 'age': round(age)},
+            raw=data
+        )
 
     except urllib.error.HTTPError as e:
         return CommandResult.fail(
@@ -144,6 +209,65 @@ def _fetch_endpoint(endpoint: str, timeout: int = None) -> CommandResult:
         )
 
 
+def fetch_endpoints(endpoints: Iterable[str],
+                    base_url: Optional[str] = None) -> Dict[str, CommandResult]:
+    """
+    Fetch several HamClock endpoints concurrently (cached).
+
+    Args:
+        endpoints: API endpoints, e.g. ['get_sys.txt', 'get_spacewx.txt']
+        base_url: Override the configured 'http://host:port'
+
+    Returns:
+        {endpoint: CommandResult}
+    """
+    return _gather({endpoint: (lambda e=endpoint: _fetch_endpoint(e, base_url=base_url))
+                    for endpoint in endpoints})
+
+
+def _fetch_noaa_json(url: str):
+    """
+    Parsed JSON from a NOAA SWPC product (cached).
+
+    Returns:
+        (data, stale, age_seconds); raises urllib/JSON errors when there
+        is no cached copy to fall back on
+    """
+    return _cached(f"noaa:{url}", lambda: json.loads(_http_get(url)),
+                   NOAA_TTLS.get(url, 600))
+
+
+def _gather(calls: Dict[str, Any]) -> Dict[str, CommandResult]:
+    """Run CommandResult-returning callables concurrently."""
+    if FETCH_CACHE_AVAILABLE:
+        results = get_fetch_cache().gather(calls)
+    else:
+        results = {}
+        for name, fn in calls.items():
+            try:
+                results[name] = fn()
+            except Exception as e:
+                results[name] = e
+    return {name: result if isinstance(result, CommandResult)
+            else CommandResult.fail(f"{name} failed: {result}", error=str(result))
+            for name, result in results.items()}
+
+
+def _mark_stale(data: Dict[str, Any], source: CommandResult) -> Dict[str, Any]:
+    """Carry the cache's staleness from a fetch result into derived data."""
+    if source.data and source.data.get('stale'):
+        data['stale'] = True
+        data['age'] = source.data.get('age')
+    return data
+
+
+def _noaa_freshness(data: Dict[str, Any], stale: bool, age: float) -> Dict[str, Any]:
+    if stale:
+        data['stale'] = True
+        data['age'] = round(age)
+    return data
+
+
 def _parse_key_value(data: str) -> Dict[str, str]:
     """Parse key=value format response."""
     result = {}
@@ -248,7 +372,7 @@ def get_space_weather() -> CommandResult:
 
     return CommandResult.ok(
         f"Space weather: SFI={weather.get('sfi', '?')}, Kp={weather.get('kp', '?')}",
-        data=weather,
+        data=_mark_stale(weather, result),
         raw=raw
     )
 
@@ -287,7 +411,7 @@ def get_band_conditions() -> CommandResult:
 
     return CommandResult.ok(
         f"Band conditions retrieved ({len(bands)} bands)",
-        data={'bands': bands, 'raw_parsed': parsed},
+        data=_mark_stale({'bands': bands, 'raw_parsed': parsed}, result),
         raw=raw
     )
 
@@ -365,7 +489,7 @@ def get_voacap() -> CommandResult:
 
     return CommandResult.ok(
         f"VOACAP: {len(voacap['bands'])} bands, best={best_band or 'none'} ({best_rel}%)",
-        data=voacap,
+        data=_mark_stale(voacap, result),
         raw=raw
     )
 
@@ -541,14 +665,8 @@ def get_noaa_solar_data() -> CommandResult:
     Returns:
         CommandResult with solar indices
     """
-    url = "https://services.swpc.noaa.gov/json/solar-cycle/observed-solar-cycle-indices.json"
-
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'MeshForge/1.0')
-
-        with urllib.request.urlopen(req, timeout=_timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        data, stale, age = _fetch_noaa_json(NOAA_SOLAR_CYCLE_URL)
 
         if not data:
             return CommandResult.fail("No NOAA data available")
@@ -604,7 +722,7 @@ def get_noaa_solar_data() -> CommandResult:
 
         return CommandResult.ok(
             f"NOAA solar data: SFI={solar['sfi']}, SSN={solar['ssn']}",
-            data=solar
+            data=_noaa_freshness(solar, stale, age)
         )
 
     except urllib.error.URLError as e:
@@ -630,6 +748,9 @@ def get_all_data() -> CommandResult:
     """
     Get all available data from HamClock in one call.
 
+    The four sections are fetched concurrently, so a slow or dead
+    HamClock costs one timeout rather than four.
+
     Returns:
         CommandResult with comprehensive data:
         - space_weather: Solar indices
@@ -645,33 +766,17 @@ def get_all_data() -> CommandResult:
         'errors': []
     }
 
-    # Space weather
-    result = get_space_weather()
-    if result.success:
-        all_data['space_weather'] = result.data
-    else:
-        all_data['errors'].append(f"space_weather: {result.message}")
-
-    # Band conditions
-    result = get_band_conditions()
-    if result.success:
-        all_data['band_conditions'] = result.data
-    else:
-        all_data['errors'].append(f"band_conditions: {result.message}")
-
-    # VOACAP
-    result = get_voacap()
-    if result.success:
-        all_data['voacap'] = result.data
-    else:
-        all_data['errors'].append(f"voacap: {result.message}")
-
-    # System info
-    result = get_system_info()
-    if result.success:
-        all_data['system'] = result.data
-    else:
-        all_data['errors'].append(f"system: {result.message}")
+    results = _gather({
+        'space_weather': get_space_weather,
+        'band_conditions': get_band_conditions,
+        'voacap': get_voacap,
+        'system': get_system_info,
+    })
+    for section, result in results.items():
+        if result.success:
+            all_data[section] = result.data
+        else:
+            all_data['errors'].append(f"{section}: {result.message}")
 
     # Determine overall success
     success_count = sum(1 for k in ['space_weather', 'band_conditions', 'voacap', 'system']
@@ -707,14 +812,8 @@ def get_noaa_kp_index() -> CommandResult:
     - 6-7: Minor to Major Storm
     - 8-9: Severe Storm
     """
-    url = "https://services.swpc.noaa.gov/products/noaa-planetary-k-index.json"
-
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'MeshForge/1.0')
-
-        with urllib.request.urlopen(req, timeout=_timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        data, stale, age = _fetch_noaa_json(NOAA_KP_URL)
 
         if len(data) < 2:
             return CommandResult.fail("No Kp data available")
@@ -726,7 +825,8 @@ def get_noaa_kp_index() -> CommandResult:
 
         return CommandResult.ok(
             f"Kp Index: {kp_value}",
-            data={'kp': kp_value, 'timestamp': timestamp, 'source': 'NOAA SWPC'}
+            data=_noaa_freshness({'kp': kp_value, 'timestamp': timestamp, 'source': 'NOAA SWPC'},
+                                 stale, age)
         )
     except Exception as e:
         return CommandResult.fail(f"Kp fetch failed: {e}")
@@ -741,40 +841,31 @@ def get_noaa_xray_flux() -> CommandResult:
     - M: Moderate flare
     - X: Major flare (HF radio blackout possible)
     """
-    url = "https://services.swpc.noaa.gov/json/goes/primary/xray-flares-latest.json"
-
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'MeshForge/1.0')
-
-        with urllib.request.urlopen(req, timeout=_timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        data, stale, age = _fetch_noaa_json(NOAA_XRAY_FLARES_URL)
 
         if not data:
             # Try alternate endpoint for current flux
-            url2 = "https://services.swpc.noaa.gov/json/goes/primary/xrays-6-hour.json"
-            req2 = urllib.request.Request(url2)
-            req2.add_header('User-Agent', 'MeshForge/1.0')
-            with urllib.request.urlopen(req2, timeout=_timeout) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                if data:
-                    latest = data[-1]
-                    flux = latest.get('flux', 0)
-                    # Convert flux to class
-                    if flux < 1e-7:
-                        xray_class = "A"
-                    elif flux < 1e-6:
-                        xray_class = "B"
-                    elif flux < 1e-5:
-                        xray_class = "C"
-                    elif flux < 1e-4:
-                        xray_class = "M"
-                    else:
-                        xray_class = "X"
-                    return CommandResult.ok(
-                        f"X-ray: {xray_class}",
-                        data={'xray': xray_class, 'flux': flux, 'source': 'NOAA GOES'}
-                    )
+            data, stale, age = _fetch_noaa_json(NOAA_XRAY_FLUX_URL)
+            if data:
+                latest = data[-1]
+                flux = latest.get('flux', 0)
+                # Convert flux to class
+                if flux < 1e-7:
+                    xray_class = "A"
+                elif flux < 1e-6:
+                    xray_class = "B"
+                elif flux < 1e-5:
+                    xray_class = "C"
+                elif flux < 1e-4:
+                    xray_class = "M"
+                else:
+                    xray_class = "X"
+                return CommandResult.ok(
+                    f"X-ray: {xray_class}",
+                    data=_noaa_freshness({'xray': xray_class, 'flux': flux, 'source': 'NOAA GOES'},
+                                         stale, age)
+                )
             return CommandResult.fail("No X-ray data available")
 
         latest = data[0] if isinstance(data, list) else data
@@ -782,7 +873,7 @@ def get_noaa_xray_flux() -> CommandResult:
 
         return CommandResult.ok(
             f"X-ray flux: {xray_class}",
-            data={'xray': xray_class, 'source': 'NOAA GOES'}
+            data=_noaa_freshness({'xray': xray_class, 'source': 'NOAA GOES'}, stale, age)
         )
     except Exception as e:
         return CommandResult.fail(f"X-ray fetch failed: {e}")
@@ -792,14 +883,8 @@ def get_noaa_alerts() -> CommandResult:
     """
     Get active space weather alerts from NOAA.
     """
-    url = "https://services.swpc.noaa.gov/products/alerts.json"
-
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'MeshForge/1.0')
-
-        with urllib.request.urlopen(req, timeout=_timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        data, stale, age = _fetch_noaa_json(NOAA_ALERTS_URL)
 
         # Filter recent alerts (last 24h)
         alerts = []
@@ -811,7 +896,8 @@ def get_noaa_alerts() -> CommandResult:
 
         return CommandResult.ok(
             f"{len(alerts)} space weather alerts",
-            data={'alerts': alerts, 'count': len(alerts), 'source': 'NOAA SWPC'}
+            data=_noaa_freshness({'alerts': alerts, 'count': len(alerts), 'source': 'NOAA SWPC'},
+                                 stale, age)
         )
     except Exception as e:
         return CommandResult.fail(f"Alerts fetch failed: {e}")
@@ -833,29 +919,41 @@ def get_native_space_weather() -> CommandResult:
         'hamclock_available': False
     }
     errors = []
-
-    # Get solar indices
-    result = get_noaa_solar_data()
+    results = _gather({
+        'solar': get_noaa_solar_data,
+        'kp': get_noaa_kp_index,
+        'xray': get_noaa_xray_flux,
+    })
+
+    # Solar indices
+    result = results['solar']
     if result.success:
         weather.update(result.data)
     else:
         errors.append(f"Solar: {result.message}")
 
-    # Get Kp index
-    result = get_noaa_kp_index()
+    # Kp index
+    result = results['kp']
     if result.success:
         weather['kp'] = result.data.get('kp', '')
         weather['kp_timestamp'] = result.data.get('timestamp', '')
     else:
         errors.append(f"Kp: {result.message}")
 
-    # Get X-ray flux
-    result = get_noaa_xray_flux()
+    # X-ray flux
+    result = results['xray']
     if result.success:
         weather['xray'] = result.data.get('xray', '')
     else:
         errors.append(f"X-ray: {result.message}")
 
+    # Any section served from the last good copy marks the whole as stale
+    stale_ages = [r.data['age'] for r in results.values()
+                  if r.success and r.data.get('stale')]
+    if stale_ages:
+        weather['stale'] = True
+        weather['age'] = max(stale_ages)
+
     # Derive overall conditions from Kp
     kp_str = weather.get('kp', '0')
     try:
@@ -941,8 +1039,13 @@ def get_propagation_summary() -> CommandResult:
         'source': 'NOAA SWPC'
     }
 
-    # Get space weather
-    result = get_space_weather_auto()
+    # Space weather and alerts are independent: fetch both at once
+    results = _gather({
+        'weather': get_space_weather_auto,
+        'alerts': get_noaa_alerts,
+    })
+
+    result = results['weather']
     if result.success:
         data = result.data
         summary['sfi'] = data.get('sfi', '')
@@ -951,6 +1054,9 @@ def get_propagation_summary() -> CommandResult:
         summary['ssn'] = data.get('ssn', '')
         summary['geomagnetic'] = data.get('geomagnetic', data.get('conditions', ''))
         summary['source'] = data.get('source', 'NOAA')
+        if data.get('stale'):
+            summary['stale'] = True
+            summary['age'] = data.get('age')
 
         # Determine overall conditions
         try:
@@ -975,8 +1081,7 @@ def get_propagation_summary() -> CommandResult:
         if bands:
             summary['hf_conditions'] = bands
 
-    # Get alerts
-    alerts_result = get_noaa_alerts()
+    alerts_result = results['alerts']
     if alerts_result.success:
         summary['alerts'] = alerts_result.data.get('alerts', [])[:3]  # Top 3
 
@@ -0,0 +1,868 @@
+"""
+Message Store - long-lived SQLite storage for commands/messaging.py
+
+One store per database file, shared by every caller in the process:
+- WAL journaling so UI reads never block gateway writes
+- A single writer thread with group commit: writes that queue up while
+  the previous commit is running (up to batch_rows, optionally lingering
+  batch_interval for more) share one transaction
+- One reader connection per thread (pruned when the thread exits)
+- Schema migrations run once when the store opens (PRAGMA user_version)
+- Messages partitioned by month (messages_YYYYMM tables behind a
+  `messages` UNION ALL view) so retention drops whole tables
+- Conversation summary and counters maintained by triggers, so UI
+  panels read a few rows instead of scanning the history
+- An FTS5 index per partition (external content, kept by triggers)
+  behind search()
+
+Usage:
+    from commands.message_store import get_store
+
+    store = get_store(db_path)
+    message_id = store.insert_message(network="meshtastic", from_id="!abcd1234",
+                                      content="hello")
+    rows = store.reader().execute("SELECT * FROM messages LIMIT 10").fetchall()
+
+Benchmark (sustained inserts/sec, legacy connect-per-message vs store):
+    cd src && python3 -m commands.message_store --bench 5000 --path /tmp/bench.db
+"""
+
+import atexit
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Group commit size, and how long to linger for more rows once the queue
+# is empty. 0 commits as soon as the queue drains, which suits callers
+# that block on their write; write-behind producers can raise it.
+DEFAULT_BATCH_INTERVAL = 0.0  # seconds
+DEFAULT_BATCH_ROWS = 256
+
+# How long a caller waits for its write to commit
+WRITE_TIMEOUT = 10.0
+
+# Columns of every message partition, in view order
+_PARTITION_COLUMNS = ('id', 'timestamp', 'network', 'from_id', 'to_id', 'content',
+                      'channel', 'is_dm', 'snr', 'rssi', 'delivered', 'partner')
+
+# Legacy single table (schema v1), kept as the oldest partition
+LEGACY_PARTITION = 'messages_legacy'
+
+_PARTITION_PREFIX = 'messages_'
+
+_PARTITION_DDL = [
+    '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        network TEXT NOT NULL,
+        from_id TEXT NOT NULL,
+        to_id TEXT,
+        content TEXT NOT NULL,
+        channel INTEGER DEFAULT 0,
+        is_dm BOOLEAN DEFAULT 1,
+        snr REAL,
+        rssi INTEGER,
+        delivered BOOLEAN DEFAULT 0,
+        partner TEXT
+    )
+    ''',
+]
+
+# Indexes and summary triggers, applied to every partition (incl. legacy)
+_PARTITION_EXTRAS = [
+    'CREATE INDEX IF NOT EXISTS idx_{table}_ts ON {table}(timestamp DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_{table}_from ON {table}(from_id)',
+    'CREATE INDEX IF NOT EXISTS idx_{table}_to ON {table}(to_id)',
+    # Covers conversation lookups and per-partner counts without the table
+    'CREATE INDEX IF NOT EXISTS idx_{table}_partner ON {table}(partner, network, timestamp)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON {table}
+    BEGIN
+        INSERT INTO message_counters (name, value) VALUES ('total', 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        INSERT INTO message_counters (name, value) VALUES ('network:' || NEW.network, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        INSERT INTO message_counters (name, value) SELECT 'sent', 1 WHERE NEW.from_id = 'local'
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        INSERT INTO conversations (partner, network, last_message, message_count)
+            SELECT NEW.partner, NEW.network, NEW.timestamp, 1 WHERE NEW.partner IS NOT NULL
+            ON CONFLICT(partner, network) DO UPDATE SET
+                message_count = message_count + 1,
+                last_message = max(last_message, excluded.last_message);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON {table}
+    BEGIN
+        UPDATE message_counters SET value = value - 1 WHERE name = 'total';
+        UPDATE message_counters SET value = value - 1 WHERE name = 'network:' || OLD.network;
+        UPDATE message_counters SET value = value - 1
+            WHERE name = 'sent' AND OLD.from_id = 'local';
+        UPDATE conversations SET message_count = message_count - 1
+            WHERE partner = OLD.partner AND network = OLD.network;
+        DELETE FROM conversations
+            WHERE partner = OLD.partner AND network = OLD.network AND message_count <= 0;
+    END
+    ''',
+]
+
+
+# Full-text index over a partition's content. External content: the index
+# stores only tokens, rows are read back from the partition by id.
+_PARTITION_FTS = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+        content, content='{table}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert AFTER INSERT ON {table}
+    BEGIN
+        INSERT INTO {table}_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete AFTER DELETE ON {table}
+    BEGIN
+        INSERT INTO {table}_fts ({table}_fts, rowid, content)
+            VALUES ('delete', OLD.id, OLD.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update AFTER UPDATE OF content ON {table}
+    BEGIN
+        INSERT INTO {table}_fts ({table}_fts, rowid, content)
+            VALUES ('delete', OLD.id, OLD.content);
+        INSERT INTO {table}_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END
+    ''',
+]
+
+# Terms of a search string: "quoted phrases" or bare words (optional trailing *)
+_SEARCH_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _fts_query(text: str) -> str:
+    """
+    Turn user search text into a safe FTS5 query.
+
+    Every term is quoted, so FTS syntax characters in callsigns, node ids
+    or incident numbers ("KD7-ABC", "!a1b2c3d4", "2024-0113") match as
+    text instead of raising. Terms are ANDed; "quoted text" is a phrase
+    and a trailing * makes a prefix search.
+    """
+    terms = []
+    for phrase, word in _SEARCH_TERM.findall(text or ''):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith('*')
+        term = term.rstrip('*') if prefix else term
+        if not any(ch.isalnum() for ch in term):
+            continue
+        terms.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+    return ' AND '.join(terms)
+
+
+def _partition_name(timestamp: str) -> str:
+    """Partition table for a 'YYYY-MM-DD HH:MM:SS' timestamp."""
+    return f"{_PARTITION_PREFIX}{timestamp[0:4]}{timestamp[5:7]}"
+
+
+def _partner(from_id: str, to_id: Optional[str]) -> Optional[str]:
+    """Conversation partner; None for broadcasts (not a conversation)."""
+    if to_id is None:
+        return None
+    return to_id if from_id == 'local' else from_id
+
+
+def _utc_now() -> str:
+    """Current time in SQLite CURRENT_TIMESTAMP format (UTC)."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _migrate_v2(conn: sqlite3.Connection):
+    """
+    Partitioned layout with summary tables.
+
+    The v1 table becomes the legacy partition behind the `messages` view;
+    partner is backfilled and the summaries are built once from it.
+    """
+    conn.execute(f'ALTER TABLE messages RENAME TO {LEGACY_PARTITION}')
+    conn.execute(f'ALTER TABLE {LEGACY_PARTITION} ADD COLUMN partner TEXT')
+    conn.execute(f'''
+        UPDATE {LEGACY_PARTITION}
+        SET partner = CASE WHEN from_id = 'local' THEN to_id ELSE from_id END
+        WHERE to_id IS NOT NULL
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conversations (
+            partner TEXT NOT NULL,
+            network TEXT NOT NULL,
+            last_message DATETIME,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (partner, network)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_conversations_last
+        ON conversations(last_message DESC)
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS message_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'''
+        INSERT INTO conversations (partner, network, last_message, message_count)
+        SELECT partner, network, MAX(timestamp), COUNT(*)
+        FROM {LEGACY_PARTITION} WHERE partner IS NOT NULL
+        GROUP BY partner, network
+    ''')
+    conn.execute(f'''
+        INSERT INTO message_counters (name, value)
+        SELECT 'total', COUNT(*) FROM {LEGACY_PARTITION}
+        UNION ALL
+        SELECT 'sent', COUNT(*) FROM {LEGACY_PARTITION} WHERE from_id = 'local'
+        UNION ALL
+        SELECT 'network:' || network, COUNT(*) FROM {LEGACY_PARTITION} GROUP BY network
+        UNION ALL
+        SELECT '{_LAST_ID}', MAX(COALESCE(MAX(id), 0), COALESCE(
+            (SELECT seq FROM sqlite_sequence WHERE name = '{LEGACY_PARTITION}'), 0))
+        FROM {LEGACY_PARTITION}
+    ''')
+    for sql in _PARTITION_EXTRAS:
+        conn.execute(sql.format(table=LEGACY_PARTITION))
+    # The v1 index names now point at the legacy table; replaced above
+    conn.execute('DROP INDEX IF EXISTS idx_messages_timestamp')
+    conn.execute('DROP INDEX IF EXISTS idx_messages_from')
+    MessageStore._rebuild_view(conn)
+
+
+def _migrate_v3(conn: sqlite3.Connection):
+    """Full-text index on every existing partition, built from its rows."""
+    for table in MessageStore._partition_tables(conn):
+        for sql in _PARTITION_FTS:
+            conn.execute(sql.format(table=table))
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+# Ordered schema migrations: (user_version, statements or callable(conn)).
+# Version 1 is the original schema, so databases created before the store
+# upgrade in place.
+MIGRATIONS: List[Tuple[int, Any]] = [
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            network TEXT NOT NULL,
+            from_id TEXT NOT NULL,
+            to_id TEXT,
+            content TEXT NOT NULL,
+            channel INTEGER DEFAULT 0,
+            is_dm BOOLEAN DEFAULT 1,
+            snr REAL,
+            rssi INTEGER,
+            delivered BOOLEAN DEFAULT 0
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_messages_from ON messages(from_id)',
+    ]),
+    (2, _migrate_v2),
+    (3, _migrate_v3),
+]
+
+# Fields accepted by insert_message(); partner is derived
+_MESSAGE_COLUMNS = ('timestamp', 'network', 'from_id', 'to_id', 'content', 'channel',
+                    'is_dm', 'snr', 'rssi', 'delivered')
+
+_INSERT_MESSAGE = (
+    "INSERT INTO {table} (id, " + ', '.join(_MESSAGE_COLUMNS) + ", partner) "
+    "VALUES (" + ', '.join('?' * (len(_MESSAGE_COLUMNS) + 2)) + ")"
+)
+
+# message_counters row holding the last id handed out. Ids are shared
+# across partitions, so a late row for an older month cannot reuse one.
+_LAST_ID = 'last_id'
+
+
+_STOP = object()
+
+
+class _Write:
+    """A queued write: fn(conn) runs inside the batch transaction."""
+    __slots__ = ('fn', 'future')
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any]):
+        self.fn = fn
+        self.future: Future = Future()
+
+
+class MessageStore:
+    """
+    Shared SQLite message store with a group-commit writer thread.
+
+    Thread-safe. Writes go through the writer thread and block the caller
+    until committed (or return a Future with wait=False); reads use a
+    per-thread connection and see every committed write.
+    """
+
+    def __init__(self, db_path: Union[str, Path],
+                 batch_interval: float = DEFAULT_BATCH_INTERVAL,
+                 batch_rows: int = DEFAULT_BATCH_ROWS):
+        self.db_path = Path(db_path)
+        self.batch_interval = batch_interval
+        self.batch_rows = max(1, batch_rows)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+        self._readers: List[Tuple[weakref.ref, sqlite3.Connection]] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._stats = {'writes': 0, 'batches': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._partitions: set = set()
+        self._schema_seen: Optional[int] = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer_conn = self._connect()
+        self._writer_conn.execute('PRAGMA journal_mode=WAL')
+        # WAL + NORMAL: commits survive app crashes, fsync at checkpoints only
+        self._writer_conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate(self._writer_conn)
+
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True,
+                                        name=f"MessageStore-{self.db_path.name}")
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30,
+                               check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    # === Schema ===
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Apply migrations newer than the database's user_version."""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target, migration in MIGRATIONS:
+            if target <= version:
+                continue
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if callable(migration):
+                    migration(conn)
+                else:
+                    for sql in migration:
+                        conn.execute(sql)
+                conn.execute(f'PRAGMA user_version = {int(target)}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            logger.debug(f"Message store migrated to schema v{target}")
+
+    @property
+    def schema_version(self) -> int:
+        return self.reader().execute('PRAGMA user_version').fetchone()[0]
+
+    # === Reads ===
+
+    def reader(self) -> sqlite3.Connection:
+        """Read connection for the calling thread (do not close it)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Message store is closed")
+            conn = self._connect()
+            conn.execute('PRAGMA query_only=ON')
+            self._local.conn = conn
+            with self._readers_lock:
+                self._prune_readers()
+                self._readers.append((weakref.ref(threading.current_thread()), conn))
+        return conn
+
+    def _prune_readers(self):
+        """Close connections of threads that have exited (GTK loader threads)."""
+        alive = []
+        for thread_ref, conn in self._readers:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                alive.append((thread_ref, conn))
+            else:
+                conn.close()
+        self._readers = alive
+
+    # === Writes ===
+
+    def write(self, fn: Callable[[sqlite3.Connection], Any], wait: bool = True) -> Any:
+        """
+        Run fn(conn) on the writer thread inside a group-commit transaction.
+
+        Args:
+            fn: Callable given the writer connection; its return value is
+                the result (evaluate cursors inside fn, e.g. .lastrowid)
+            wait: Block until committed and return the result; if False,
+                return a Future
+
+        Raises:
+            Whatever fn raised, or sqlite3.ProgrammingError if closed
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Message store is closed")
+        item = _Write(fn)
+        self._queue.put(item)
+        if not wait:
+            return item.future
+        return item.future.result(timeout=WRITE_TIMEOUT)
+
+    def insert_message(self, wait: bool = True, **fields) -> Any:
+        """
+        Insert one message row; returns its id (or a Future).
+
+        timestamp defaults to now (UTC, 'YYYY-MM-DD HH:MM:SS') and picks
+        the month partition.
+        """
+        params = self._message_params(fields)
+        return self.write(lambda conn: self._insert(conn, params), wait)
+
+    def insert_messages(self, rows: Sequence[Dict[str, Any]], wait: bool = True) -> Any:
+        """Insert several message rows in one transaction; returns their ids."""
+        params = [self._message_params(row) for row in rows]
+
+        def insert(conn: sqlite3.Connection) -> List[int]:
+            return [self._insert(conn, p) for p in params]
+
+        return self.write(insert, wait)
+
+    def _insert(self, conn: sqlite3.Connection, params: Tuple) -> int:
+        table = self._ensure_partition(conn, _partition_name(params[0]))
+        conn.execute('UPDATE message_counters SET value = value + 1 WHERE name = ?', (_LAST_ID,))
+        message_id = conn.execute('SELECT value FROM message_counters WHERE name = ?',
+                                  (_LAST_ID,)).fetchone()[0]
+        conn.execute(_INSERT_MESSAGE.format(table=table), (message_id,) + params)
+        return message_id
+
+    @staticmethod
+    def _message_params(fields: Dict[str, Any]) -> Tuple:
+        unknown = set(fields) - set(_MESSAGE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown message fields: {', '.join(sorted(unknown))}")
+        timestamp = fields.get('timestamp') or _utc_now()
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        defaults = {'to_id': None, 'channel': 0, 'is_dm': fields.get('to_id') is not None,
+                    'snr': None, 'rssi': None, 'delivered': False}
+        values = [fields.get(col, defaults.get(col)) for col in _MESSAGE_COLUMNS]
+        values[0] = timestamp
+        return tuple(values) + (_partner(fields.get('from_id'), fields.get('to_id')),)
+
+    # === Partitions ===
+
+    @staticmethod
+    def _partition_tables(conn: sqlite3.Connection) -> List[str]:
+        """Partition tables, oldest first (legacy, then by month)."""
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ESCAPE '\\'",
+            (_PARTITION_PREFIX.replace('_', '\\_') + '%',)
+        ).fetchall()
+        names = [r[0] for r in rows
+                 if r[0] == LEGACY_PARTITION or r[0][len(_PARTITION_PREFIX):].isdigit()]
+        return sorted(names, key=lambda n: (n != LEGACY_PARTITION, n))
+
+    @staticmethod
+    def _rebuild_view(conn: sqlite3.Connection):
+        """Point the `messages` view at the current partitions."""
+        tables = MessageStore._partition_tables(conn)
+        if not tables:
+            MessageStore._create_partition(conn, _partition_name(_utc_now()))
+            return
+        columns = ', '.join(_PARTITION_COLUMNS)
+        conn.execute('DROP VIEW IF EXISTS messages')
+        conn.execute('CREATE VIEW messages AS ' + ' UNION ALL '.join(
+            f'SELECT {columns} FROM {table}' for table in tables))
+
+    @staticmethod
+    def _create_partition(conn: sqlite3.Connection, table: str):
+        """Create a month partition and add it to the view."""
+        for sql in _PARTITION_DDL + _PARTITION_EXTRAS + _PARTITION_FTS:
+            conn.execute(sql.format(table=table))
+        MessageStore._rebuild_view(conn)
+
+    def _ensure_partition(self, conn: sqlite3.Connection, table: str) -> str:
+        # Re-read the partition list only when some process changed the schema
+        schema = conn.execute('PRAGMA schema_version').fetchone()[0]
+        if schema != self._schema_seen:
+            self._partitions = set(self._partition_tables(conn))
+            self._schema_seen = schema
+        if table not in self._partitions:
+            self._create_partition(conn, table)
+            self._partitions.add(table)
+            self._schema_seen = conn.execute('PRAGMA schema_version').fetchone()[0]
+        return table
+
+    def drop_before(self, cutoff: str) -> int:
+        """
+        Delete messages with timestamp < cutoff ('YYYY-MM-DD HH:MM:SS', UTC).
+
+        Partitions entirely older than cutoff are dropped as whole tables
+        (summaries adjusted from their indexes); only the one partition
+        straddling the cutoff needs a row DELETE.
+
+        Returns:
+            Number of messages removed
+        """
+        def retain(conn: sqlite3.Connection) -> int:
+            deleted = 0
+            current = _partition_name(_utc_now())
+            for table in self._partition_tables(conn):
+                oldest, newest, count = conn.execute(
+                    f'SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM {table}').fetchone()
+                if count and oldest >= cutoff:
+                    continue
+                if count == 0 and table == current:
+                    continue
+                if count == 0 or newest < cutoff:
+                    self._drop_partition(conn, table)
+                    deleted += count
+                else:
+                    deleted += conn.execute(
+                        f'DELETE FROM {table} WHERE timestamp < ?', (cutoff,)).rowcount
+            self._rebuild_view(conn)
+            return deleted
+
+        return self.write(retain)
+
+    @staticmethod
+    def _drop_partition(conn: sqlite3.Connection, table: str):
+        """Drop a partition table, taking its rows out of the summaries."""
+        for network, count, sent in conn.execute(
+                f"SELECT network, COUNT(*), SUM(from_id = 'local') FROM {table} GROUP BY network"
+        ).fetchall():
+            conn.execute("UPDATE message_counters SET value = value - ? WHERE name = 'total'",
+                         (count,))
+            conn.execute("UPDATE message_counters SET value = value - ? WHERE name = ?",
+                         (count, f'network:{network}'))
+            conn.execute("UPDATE message_counters SET value = value - ? WHERE name = 'sent'",
+                         (sent or 0,))
+        for partner, network, count in conn.execute(
+                f'SELECT partner, network, COUNT(*) FROM {table} '
+                f'WHERE partner IS NOT NULL GROUP BY partner, network'
+        ).fetchall():
+            conn.execute('UPDATE conversations SET message_count = message_count - ? '
+                         'WHERE partner = ? AND network = ?', (count, partner, network))
+        conn.execute('DELETE FROM conversations WHERE message_count <= 0')
+        conn.execute("DELETE FROM message_counters WHERE name LIKE 'network:%' AND value <= 0")
+        conn.execute(f'DROP TABLE IF EXISTS {table}_fts')
+        conn.execute(f'DROP TABLE {table}')
+
+    # === Search ===
+
+    def search(self, query: str, since: Optional[str] = None, network: Optional[str] = None,
+               limit: int = 50, offset: int = 0) -> List[sqlite3.Row]:
+        """
+        Full-text search over message content, best match first.
+
+        Args:
+            query: Search text (see _fts_query: words ANDed, "phrases", prefix*)
+            since: Only messages with timestamp >= since ('YYYY-MM-DD HH:MM:SS',
+                UTC); month partitions before it are not searched at all
+            network: Only this network
+            limit: Page size
+            offset: Rows to skip (pagination)
+
+        Returns:
+            Message rows plus 'rank' (bm25, lower is better) and 'snippet'
+            (content with matches in [brackets])
+
+        Raises:
+            ValueError: query has no searchable terms
+        """
+        match = _fts_query(query)
+        conn = self.reader()
+        tables = self._partition_tables(conn)
+        if since:
+            first = _partition_name(since)
+            tables = [t for t in tables if t == LEGACY_PARTITION or t >= first]
+        if not tables:
+            return []
+
+        # Ranks are per partition (bm25 uses each index's own statistics),
+        # which is close enough to compare across months.
+        columns = ', '.join(f'm.{c}' for c in _PARTITION_COLUMNS)
+        conditions = ''
+        condition_params: List[Any] = []
+        if since:
+            conditions += ' AND m.timestamp >= ?'
+            condition_params.append(since)
+        if network:
+            conditions += ' AND m.network = ?'
+            condition_params.append(network)
+
+        window = max(0, limit) + max(0, offset)
+        arms = []
+        params: List[Any] = []
+        for table in tables:
+            if conditions:
+                arms.append(f'''
+                    SELECT * FROM (
+                        SELECT {columns}, {table}_fts.rank AS rank,
+                               snippet({table}_fts, 0, '[', ']', '...', 12) AS snippet
+                        FROM {table}_fts JOIN {table} AS m ON m.id = {table}_fts.rowid
+                        WHERE {table}_fts MATCH ?{conditions}
+                        ORDER BY rank, m.id DESC LIMIT ?
+                    )''')
+            else:
+                # Unfiltered: rank in the index alone, join only the top rows
+                arms.append(f'''
+                    SELECT {columns}, f.rank AS rank, f.snippet AS snippet FROM (
+                        SELECT rowid, rank,
+                               snippet({table}_fts, 0, '[', ']', '...', 12) AS snippet
+                        FROM {table}_fts WHERE {table}_fts MATCH ?
+                        ORDER BY rank, rowid DESC LIMIT ?
+                    ) AS f JOIN {table} AS m ON m.id = f.rowid''')
+            params.extend([match, *condition_params, window])
+        # Ties (equal rank) newest id first, the same in every arm, so
+        # pages are stable
+        sql = ' UNION ALL '.join(arms) + ' ORDER BY rank, id DESC LIMIT ? OFFSET ?'
+        params.extend([max(0, limit), max(0, offset)])
+        return conn.execute(sql, params).fetchall()
+
+    def flush(self, timeout: float = WRITE_TIMEOUT) -> bool:
+        """Wait until everything queued so far is committed."""
+        if self._closed:
+            return True
+        try:
+            self.write(lambda conn: None, wait=False).result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def _writer_loop(self):
+        conn = self._writer_conn
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_rows:
+                try:
+                    remaining = deadline - time.monotonic()
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit_batch(conn, batch)
+            if stop:
+                break
+
+        # Drain anything queued after stop so no caller waits forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item.future.set_exception(sqlite3.ProgrammingError("Message store is closed"))
+        conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[_Write]):
+        """Commit a batch in one transaction; on failure retry rows one by one."""
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for item in batch:
+                results.append(item.fn(conn))
+            conn.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            if len(batch) > 1:
+                # Isolate the bad write so the rest of the batch still lands
+                for item in batch:
+                    self._commit_batch(conn, [item])
+                return
+            with self._stats_lock:
+                self._stats['errors'] += 1
+            batch[0].future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._stats['writes'] += len(batch)
+            self._stats['batches'] += 1
+        for item, result in zip(batch, results):
+            item.future.set_result(result)
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Writer counters: writes, batches (commits), errors, queue depth."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        stats['avg_batch'] = stats['writes'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    # === Lifecycle ===
+
+    def close(self, timeout: float = WRITE_TIMEOUT):
+        """Commit queued writes, stop the writer and close connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout=timeout)
+        with self._readers_lock:
+            for _, conn in self._readers:
+                conn.close()
+            self._readers = []
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+# === Shared stores ===
+
+_stores: Dict[str, MessageStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: Union[str, Path]) -> MessageStore:
+    """Get the process-wide store for a database file (opened on first use)."""
+    key = str(Path(db_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.closed:
+            store = MessageStore(db_path)
+            _stores[key] = store
+        return store
+
+
+def close_all():
+    """Close every shared store (registered atexit)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_all)
+
+
+# === Benchmark ===
+
+def _bench_legacy(db_path: Path, count: int) -> float:
+    """Old path: connect + CREATE IF NOT EXISTS + insert + commit per message."""
+    start = time.monotonic()
+    for i in range(count):
+        conn = sqlite3.connect(str(db_path))
+        for sql in MIGRATIONS[0][1]:
+            conn.execute(sql)
+        conn.commit()
+        conn.execute(
+            'INSERT INTO messages (network, from_id, to_id, content, channel, is_dm, '
+            'snr, rssi, delivered) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ('meshtastic', f'!{i % 64:08x}', 'local', f'msg {i}', 0, True, 5.0, -90, True))
+        conn.commit()
+        conn.close()
+    return count / (time.monotonic() - start)
+
+
+def _bench_store(db_path: Path, count: int, threads: int) -> Tuple[float, Dict[str, Any]]:
+    """Store path: concurrent callers each waiting for their own commit."""
+    store = MessageStore(db_path)
+    per_thread = count // threads
+
+    def worker(offset: int):
+        for i in range(offset, offset + per_thread):
+            store.insert_message(network='meshtastic', from_id=f'!{i % 64:08x}', to_id='local',
+                                 content=f'msg {i}', snr=5.0, rssi=-90, delivered=True)
+
+    start = time.monotonic()
+    workers = [threading.Thread(target=worker, args=(t * per_thread,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    rate = (per_thread * threads) / (time.monotonic() - start)
+    stats = store.get_write_stats()
+    store.close()
+    return rate, stats
+
+
+def _bench_summaries(legacy_path: Path, store_path: Path, reads: int = 20) -> Tuple[float, float]:
+    """Conversation list + stats: GROUP BY scan (legacy) vs summary tables (ms per read)."""
+    conn = sqlite3.connect(str(legacy_path))
+    start = time.monotonic()
+    for _ in range(reads):
+        conn.execute('''
+            SELECT CASE WHEN from_id = 'local' THEN to_id ELSE from_id END AS partner,
+                   network, MAX(timestamp), COUNT(*)
+            FROM messages WHERE to_id IS NOT NULL
+            GROUP BY partner, network ORDER BY MAX(timestamp) DESC
+        ''').fetchall()
+        conn.execute('SELECT network, COUNT(*) FROM messages GROUP BY network').fetchall()
+    legacy = (time.monotonic() - start) * 1000 / reads
+    conn.close()
+
+    store = MessageStore(store_path)
+    conn = store.reader()
+    start = time.monotonic()
+    for _ in range(reads):
+        conn.execute('SELECT * FROM conversations ORDER BY last_message DESC').fetchall()
+        conn.execute('SELECT name, value FROM message_counters').fetchall()
+    summary = (time.monotonic() - start) * 1000 / reads
+    store.close()
+    return legacy, summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark message store inserts")
+    parser.add_argument('--bench', type=int, default=2000, metavar='N', help="Messages to insert")
+    parser.add_argument('--threads', type=int, default=4, help="Concurrent writers for the store")
+    parser.add_argument('--path', help="Directory for the test databases (use the SD card)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.path) as tmp:
+        legacy = _bench_legacy(Path(tmp) / 'legacy.db', args.bench)
+        store, stats = _bench_store(Path(tmp) / 'store.db', args.bench, args.threads)
+        scan_ms, summary_ms = _bench_summaries(Path(tmp) / 'legacy.db', Path(tmp) / 'store.db')
+
+    print(f"legacy  connect/commit per message: {legacy:,.0f} inserts/s")
+    print(f"store   WAL + group commit ({args.threads} writers): {store:,.0f} inserts/s "
+          f"(avg {stats['avg_batch']:.1f} rows/commit)")
+    print(f"speedup {store / legacy:.1f}x")
+    print(f"conversations+stats: GROUP BY scan {scan_ms:.2f} ms, "
+          f"summary tables {summary_ms:.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
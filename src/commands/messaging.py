@@ -12,17 +12,23 @@ Usage:
 
     # Get messages
     result = messaging.get_messages(limit=20)
+
+    # Search history (ranked, paginated)
+    result = messaging.search_messages("KD7ABC storm", since="2026-01-01", limit=20)
+
+Storage goes through the shared MessageStore (commands/message_store.py):
+one WAL database per process with group-committed writes.
 """
 
 import logging
 import time
-import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field
 
 from .base import CommandResult
+from .message_store import MessageStore, get_store
 
 # Import centralized path utility
 try:
@@ -79,40 +85,9 @@ def _get_db_path() -> Path:
     return db_dir / "messages.db"
 
 
-def _init_db() -> sqlite3.Connection:
-    """Initialize message database."""
-    db_path = _get_db_path()
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            network TEXT NOT NULL,
-            from_id TEXT NOT NULL,
-            to_id TEXT,
-            content TEXT NOT NULL,
-            channel INTEGER DEFAULT 0,
-            is_dm BOOLEAN DEFAULT 1,
-            snr REAL,
-            rssi INTEGER,
-            delivered BOOLEAN DEFAULT 0
-        )
-    ''')
-
-    conn.execute('''
-        CREATE INDEX IF NOT EXISTS idx_messages_timestamp
-        ON messages(timestamp DESC)
-    ''')
-
-    conn.execute('''
-        CREATE INDEX IF NOT EXISTS idx_messages_from
-        ON messages(from_id)
-    ''')
-
-    conn.commit()
-    return conn
+def _get_store() -> MessageStore:
+    """Get the shared message store (schema migrated on first open)."""
+    return get_store(_get_db_path())
 
 
 def _chunk_message(content: str, max_length: int = MAX_MESSAGE_LENGTH) -> List[str]:
@@ -196,19 +171,16 @@ def send_message(
         except ImportError:
             pass
 
-        # Store message
-        conn = _init_db()
-        cursor = conn.cursor()
-
-        for chunk in chunks:
-            cursor.execute('''
-                INSERT INTO messages (network, from_id, to_id, content, channel, is_dm, delivered)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (network, "local", destination, chunk, channel, destination is not None, False))
-
-        conn.commit()
-        message_id = cursor.lastrowid
-        conn.close()
+        # Store message (all chunks in one commit)
+        message_ids = _get_store().insert_messages([
+            {
+                'network': network, 'from_id': "local", 'to_id': destination,
+                'content': chunk, 'channel': channel,
+                'is_dm': destination is not None, 'delivered': False,
+            }
+            for chunk in chunks
+        ])
+        message_id = message_ids[-1]
 
         # TODO: Actually send via bridge when available
         # For now, just store and report
@@ -246,8 +218,7 @@ def get_messages(
         CommandResult with message list
     """
     try:
-        conn = _init_db()
-        cursor = conn.cursor()
+        cursor = _get_store().reader().cursor()
 
         query = "SELECT * FROM messages"
         params = []
@@ -258,6 +229,8 @@ def get_messages(
             params.append(network)
 
         if conversation_with:
+            # Either side, so broadcasts from the node are included
+            # (MULTI-INDEX OR over idx_*_from / idx_*_to)
             conditions.append("(from_id = ? OR to_id = ?)")
             params.extend([conversation_with, conversation_with])
 
@@ -269,24 +242,8 @@ def get_messages(
 
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        conn.close()
 
-        messages = []
-        for row in rows:
-            msg = Message(
-                id=row['id'],
-                timestamp=datetime.fromisoformat(row['timestamp']) if row['timestamp'] else None,
-                network=row['network'],
-                from_id=row['from_id'],
-                to_id=row['to_id'],
-                content=row['content'],
-                channel=row['channel'],
-                is_dm=bool(row['is_dm']),
-                snr=row['snr'],
-                rssi=row['rssi'],
-                delivered=bool(row['delivered']),
-            )
-            messages.append(msg.to_dict())
+        messages = [_row_to_message(row).to_dict() for row in rows]
 
         return CommandResult.ok(
             f"Retrieved {len(messages)} messages",
@@ -298,6 +255,86 @@ def get_messages(
         return CommandResult.fail(f"Failed to retrieve messages: {e}")
 
 
+def _row_to_message(row) -> Message:
+    """Build a Message from a messages row."""
+    return Message(
+        id=row['id'],
+        timestamp=datetime.fromisoformat(row['timestamp']) if row['timestamp'] else None,
+        network=row['network'],
+        from_id=row['from_id'],
+        to_id=row['to_id'],
+        content=row['content'],
+        channel=row['channel'],
+        is_dm=bool(row['is_dm']),
+        snr=row['snr'],
+        rssi=row['rssi'],
+        delivered=bool(row['delivered']),
+    )
+
+
+def search_messages(
+    query: str,
+    since: Optional[Any] = None,
+    network: str = "all",
+    limit: int = 50,
+    offset: int = 0
+) -> CommandResult:
+    """
+    Full-text search of stored messages, best match first.
+
+    Words must all match; "quoted text" matches a phrase and a trailing
+    * matches a prefix (e.g. KD7*).
+
+    Args:
+        query: Search text (callsign, incident number, keywords)
+        since: Only messages at or after this time (datetime, or
+            'YYYY-MM-DD[ HH:MM:SS]' in UTC)
+        network: Filter by network ("all", "meshtastic", "rns")
+        limit: Page size
+        offset: Results to skip (next page: offset + limit)
+
+    Returns:
+        CommandResult with ranked message list; each message has a
+        'snippet' with matches in [brackets]. An unusable query fails
+        with data['invalid'] set.
+    """
+    if not query or not query.strip():
+        return CommandResult.fail("Search query required", data={'invalid': True})
+
+    try:
+        if isinstance(since, datetime):
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc)
+            since = since.strftime('%Y-%m-%d %H:%M:%S')
+
+        rows = _get_store().search(
+            query,
+            since=since or None,
+            network=None if network == "all" else network,
+            limit=limit,
+            offset=offset,
+        )
+
+        messages = []
+        for row in rows:
+            msg = _row_to_message(row).to_dict()
+            msg['snippet'] = row['snippet']
+            msg['rank'] = row['rank']
+            messages.append(msg)
+
+        return CommandResult.ok(
+            f"Found {len(messages)} messages matching '{query}'",
+            data={'messages': messages, 'count': len(messages), 'query': query,
+                  'limit': limit, 'offset': offset}
+        )
+
+    except ValueError as e:
+        return CommandResult.fail(str(e), data={'invalid': True})
+    except Exception as e:
+        logger.error(f"Failed to search messages: {e}")
+        return CommandResult.fail(f"Failed to search messages: {e}")
+
+
 def get_conversations() -> CommandResult:
     """
     Get list of active conversations.
@@ -306,37 +343,24 @@ def get_conversations() -> CommandResult:
         CommandResult with conversation list
     """
     try:
-        conn = _init_db()
-        cursor = conn.cursor()
+        cursor = _get_store().reader().cursor()
 
-        # Get unique conversation partners
+        # Summary table maintained on insert/delete (broadcasts excluded)
         cursor.execute('''
-            SELECT
-                CASE
-                    WHEN from_id = 'local' THEN to_id
-                    ELSE from_id
-                END as partner,
-                network,
-                MAX(timestamp) as last_message,
-                COUNT(*) as message_count
-            FROM messages
-            WHERE from_id != to_id OR to_id IS NOT NULL
-            GROUP BY partner, network
+            SELECT partner, network, last_message, message_count
+            FROM conversations
             ORDER BY last_message DESC
         ''')
 
-        rows = cursor.fetchall()
-        conn.close()
-
-        conversations = []
-        for row in rows:
-            if row['partner']:  # Skip broadcast messages
-                conversations.append({
-                    'partner': row['partner'],
-                    'network': row['network'],
-                    'last_message': row['last_message'],
-                    'message_count': row['message_count'],
-                })
+        conversations = [
+            {
+                'partner': row['partner'],
+                'network': row['network'],
+                'last_message': row['last_message'],
+                'message_count': row['message_count'],
+            }
+            for row in cursor.fetchall()
+        ]
 
         return CommandResult.ok(
             f"Found {len(conversations)} conversations",
@@ -375,18 +399,12 @@ def store_incoming(
         CommandResult with storage confirmation
     """
     try:
-        conn = _init_db()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO messages
-            (network, from_id, to_id, content, channel, is_dm, snr, rssi, delivered)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-        ''', (network, from_id, to_id, content, channel, to_id is not None, snr, rssi))
-
-        conn.commit()
-        message_id = cursor.lastrowid
-        conn.close()
+        # Group-committed with other concurrent writes
+        message_id = _get_store().insert_message(
+            network=network, from_id=from_id, to_id=to_id, content=content,
+            channel=channel, is_dm=to_id is not None, snr=snr, rssi=rssi,
+            delivered=True,
+        )
 
         logger.info(f"Stored message {message_id} from {from_id}")
 
@@ -408,27 +426,21 @@ def get_stats() -> CommandResult:
         CommandResult with message counts and stats
     """
     try:
-        conn = _init_db()
-        cursor = conn.cursor()
-
-        # Total messages
-        cursor.execute("SELECT COUNT(*) as total FROM messages")
-        total = cursor.fetchone()['total']
+        cursor = _get_store().reader().cursor()
 
-        # By network
-        cursor.execute('''
-            SELECT network, COUNT(*) as count
-            FROM messages
-            GROUP BY network
-        ''')
-        by_network = {row['network']: row['count'] for row in cursor.fetchall()}
-
-        # Sent vs received
-        cursor.execute("SELECT COUNT(*) as sent FROM messages WHERE from_id = 'local'")
-        sent = cursor.fetchone()['sent']
+        # Rolling counters maintained on insert/delete
+        cursor.execute("SELECT name, value FROM message_counters")
+        counters = {row['name']: row['value'] for row in cursor.fetchall()}
+        total = counters.get('total', 0)
+        sent = counters.get('sent', 0)
         received = total - sent
+        by_network = {
+            name[len('network:'):]: value
+            for name, value in counters.items()
+            if name.startswith('network:') and value > 0
+        }
 
-        # Last 24 hours
+        # Last 24 hours (timestamp index range in the newest partitions)
         cursor.execute('''
             SELECT COUNT(*) as recent
             FROM messages
@@ -436,8 +448,6 @@ def get_stats() -> CommandResult:
         ''')
         last_24h = cursor.fetchone()['recent']
 
-        conn.close()
-
         return CommandResult.ok(
             f"{total} total messages",
             data={
@@ -465,17 +475,9 @@ def clear_messages(older_than_days: int = 30) -> CommandResult:
         CommandResult with deletion count
     """
     try:
-        conn = _init_db()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            DELETE FROM messages
-            WHERE timestamp < datetime('now', ? || ' days')
-        ''', (f'-{older_than_days}',))
-
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
+        # Whole month partitions are dropped; only the boundary month is DELETEd
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days))
+        deleted = _get_store().drop_before(cutoff.strftime('%Y-%m-%d %H:%M:%S'))
 
         return CommandResult.ok(
             f"Deleted {deleted} messages older than {older_than_days} days",
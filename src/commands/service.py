@@ -17,6 +17,12 @@ from pathlib import Path
 
 from .base import CommandResult
 
+# Shared journal follower (optional; without it logs come from journalctl)
+try:
+    from utils.log_service import format_entries, peek_log_service
+except ImportError:
+    peek_log_service = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -300,6 +306,16 @@ def get_logs(name: str, lines: int = 50, follow: bool = False) -> CommandResult:
         lines: Number of lines to retrieve
         follow: Whether to follow (not implemented for non-interactive)
     """
+    # A running log service already holds these lines
+    shared = peek_log_service(name) if peek_log_service else None
+    if shared is not None:
+        logs = format_entries(shared.tail(name, lines)) or "No logs available"
+        return CommandResult.ok(
+            f"Retrieved {lines} log lines",
+            data={'logs': logs, 'lines': lines},
+            raw=logs
+        )
+
     try:
         result = subprocess.run(
             ['journalctl', '-u', name, '-n', str(lines), '--no-pager'],
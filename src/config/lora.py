@@ -4,6 +4,11 @@ from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 
+try:
+    from utils.airtime import MAX_LORA_PACKET, LoRaModem, max_throughput
+except ImportError:
+    LoRaModem = None
+
 console = Console()
 
 
@@ -72,6 +77,7 @@ class LoRaConfigurator:
 
     # Coding rates
     CODING_RATES = [5, 6, 7, 8]  # Represented as 4/5, 4/6, 4/7, 4/8
+    DEFAULT_CODING_RATE = 8  # 4/8, as used by every Meshtastic preset
 
     # Official Meshtastic Modem Presets (ordered Fastest to Slowest)
     MODEM_PRESETS = {
@@ -417,7 +423,7 @@ class LoRaConfigurator:
         else:
             table.add_row("Bandwidth", f"{config.get('bandwidth', 250)} kHz", "Spectrum width")
             table.add_row("Spreading Factor", str(config.get('spreading_factor', 11)), "Signal spreading")
-            table.add_row("Coding Rate", f"4/{config.get('coding_rate', 8)}", "Error correction")
+            table.add_row("Coding Rate", f"4/{config.get('coding_rate', self.DEFAULT_CODING_RATE)}", "Error correction")
 
         # Power and network
         table.add_row("TX Power", f"{config.get('tx_power', 22)} dBm", "Transmit power")
@@ -501,6 +507,14 @@ class LoRaConfigurator:
         console.print(f"  Speed: [yellow]{speed_estimate}[/yellow]")
         console.print(f"  Bandwidth: [yellow]{bw} kHz[/yellow]")
 
+        if LoRaModem is not None:
+            modem = LoRaModem(sf, bw * 1000, config.get('coding_rate', self.DEFAULT_CODING_RATE))
+            console.print(f"  Bit rate: [yellow]{modem.bitrate:.0f} bps[/yellow]")
+            console.print(f"  Airtime (50 / {MAX_LORA_PACKET} bytes): [yellow]"
+                          f"{modem.time_on_air(50) * 1000:.0f} / "
+                          f"{modem.time_on_air(MAX_LORA_PACKET) * 1000:.0f} ms[/yellow]")
+            console.print(f"  Max throughput: [yellow]{max_throughput(modem):.0f} bytes/s[/yellow]")
+
         console.print("\n[dim]Note: Actual range depends on terrain, antennas, and interference[/dim]")
 
     def get_recommended_settings(self, use_case='general'):
@@ -0,0 +1,131 @@
+"""
+Diagnostic Engine Benchmark
+
+Times a full run_all() sequentially (one check at a time, the old
+behaviour) and with the concurrent executor, on this machine, plus a
+cold and warm background-monitor cycle (cached static checks).
+
+Usage:
+    cd src && python3 -m core.diagnostics.benchmark
+    cd src && python3 -m core.diagnostics.benchmark --runs 3 --workers 8 --json
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+from .engine import DiagnosticEngine, DEFAULT_MAX_WORKERS
+from .models import CheckCategory
+
+
+def _time_run(engine: DiagnosticEngine, max_workers: int) -> Dict:
+    """Time one run_all() and return wall time plus the slowest checks."""
+    start = time.monotonic()
+    results = engine.run_all(max_workers=max_workers)
+    wall = time.monotonic() - start
+    slowest = sorted(results, key=lambda r: r.duration_ms or 0, reverse=True)[:3]
+    return {
+        'wall_sec': wall,
+        'checks': len(results),
+        'sum_check_sec': sum((r.duration_ms or 0) for r in results) / 1000,
+        'timeouts': sum(1 for r in results if (r.details or {}).get('timeout')),
+        'slowest': [(r.name, round((r.duration_ms or 0) / 1000, 3)) for r in slowest],
+    }
+
+
+def benchmark(runs: int = 1, max_workers: int = DEFAULT_MAX_WORKERS,
+              engine: Optional[DiagnosticEngine] = None) -> Dict:
+    """
+    Compare sequential and concurrent run_all() wall-clock time.
+
+    Returns:
+        Dict with 'sequential', 'concurrent' (best of runs) and 'speedup'
+    """
+    engine = engine or DiagnosticEngine.get_instance()
+    report: Dict = {}
+    for label, workers in (('sequential', 1), ('concurrent', max_workers)):
+        timings: List[Dict] = [_time_run(engine, workers) for _ in range(max(1, runs))]
+        best = min(timings, key=lambda t: t['wall_sec'])
+        best['workers'] = workers
+        report[label] = best
+
+    concurrent_wall = report['concurrent']['wall_sec']
+    report['speedup'] = (report['sequential']['wall_sec'] / concurrent_wall
+                         if concurrent_wall > 0 else 0.0)
+    return report
+
+
+def benchmark_monitor(cycles: int = 3,
+                      engine: Optional[DiagnosticEngine] = None) -> Dict:
+    """
+    Time background-monitor cycles: one cold (empty cache), then warm ones.
+
+    Returns:
+        Dict with cold/warm wall time and how many checks were reused
+    """
+    engine = engine or DiagnosticEngine.get_instance()
+    engine.invalidate()
+    before = engine.get_cache_stats()
+
+    start = time.monotonic()
+    results = engine._execute_checks(list(CheckCategory), use_cache=True)
+    cold = time.monotonic() - start
+    after_cold = engine.get_cache_stats()
+
+    warm = []
+    for _ in range(max(1, cycles)):
+        start = time.monotonic()
+        engine._execute_checks(list(CheckCategory), use_cache=True)
+        warm.append(time.monotonic() - start)
+    after_warm = engine.get_cache_stats()
+
+    warm_cycles = max(1, cycles)
+    reused = (after_warm['hits'] - after_cold['hits']) / warm_cycles
+    return {
+        'checks': len(results),
+        'cold_sec': cold,
+        'warm_sec': sum(warm) / len(warm),
+        'cold_reused': after_cold['hits'] - before['hits'],
+        'warm_reused': reused,
+        'warm_run': len(results) - reused,
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Human-readable benchmark summary."""
+    lines = []
+    for label in ('sequential', 'concurrent'):
+        r = report[label]
+        lines.append(
+            f"{label:<11} workers={r['workers']:<3} wall={r['wall_sec']:.2f}s "
+            f"checks={r['checks']} (sum {r['sum_check_sec']:.2f}s) timeouts={r['timeouts']}"
+        )
+        slowest = ", ".join(f"{name} {sec:.2f}s" for name, sec in r['slowest'])
+        lines.append(f"{'':<11} slowest: {slowest}")
+    lines.append(f"speedup     {report['speedup']:.1f}x")
+    monitor = report.get('monitor')
+    if monitor:
+        lines.append(
+            f"monitor     cold={monitor['cold_sec']:.2f}s warm={monitor['warm_sec']:.2f}s "
+            f"checks run per warm cycle: {monitor['warm_run']:.0f}/{monitor['checks']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DiagnosticEngine.run_all()")
+    parser.add_argument('--runs', type=int, default=1, help="Runs per mode (best is reported)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Concurrent checks for the concurrent run")
+    parser.add_argument('--json', action='store_true', help="Print JSON")
+    args = parser.parse_args(argv)
+
+    report = benchmark(runs=args.runs, max_workers=args.workers)
+    report['monitor'] = benchmark_monitor()
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -10,6 +10,7 @@ Design Principles:
 3. Callback-driven - real-time notifications for GUI/Web
 4. Persistent logging - events written to disk
 5. Category-based - checks organized by subsystem
+6. Concurrent - independent checks run in parallel with per-check deadlines
 
 Usage:
     engine = DiagnosticEngine.get_instance()
@@ -26,9 +27,10 @@ import time
 import json
 import logging
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from .models import (
     CheckResult, CheckStatus, CheckCategory,
@@ -65,6 +67,89 @@ try:
 except ImportError:
     CLASSIFIER_AVAILABLE = False
 
+# Shared service poller; its state is reused when a UI already runs one
+try:
+    from utils.system_state import peek_system_state
+    SYSTEM_STATE_AVAILABLE = True
+except ImportError:
+    SYSTEM_STATE_AVAILABLE = False
+
+# Queued daily event files (no open/append/close per event)
+try:
+    from utils.logging_config import get_event_logger
+except ImportError:
+    get_event_logger = None
+
+try:
+    from utils.log_service import get_log_service
+    LOG_SERVICE_AVAILABLE = True
+except ImportError:
+    LOG_SERVICE_AVAILABLE = False
+
+
+# Deadline for checks that don't set their own (seconds)
+DEFAULT_CHECK_TIMEOUT = 5.0
+
+# Concurrent checks per run; most checks wait on subprocesses or sockets
+DEFAULT_MAX_WORKERS = 8
+
+# How often the executor looks for queued checks that have started
+_QUEUE_POLL_INTERVAL = 0.05
+
+
+# Result reuse by background monitoring (seconds). Checks without a ttl
+# (sockets, /proc reads) are cheap and re-run every cycle.
+TTL_STATIC = float('inf')   # only changes when a watched path changes
+TTL_SERVICE = 300.0         # systemctl; invocation link catches restarts
+TTL_PROCESS = 60.0          # pgrep; processes started outside systemd
+TTL_LOGS = 300.0            # error window read (journalctl scan without the log service)
+
+
+def _site_package_dirs() -> Tuple[str, ...]:
+    """Directories whose mtime changes when packages are (un)installed."""
+    dirs = []
+    try:
+        import site
+        dirs.extend(site.getsitepackages())
+        dirs.append(site.getusersitepackages())
+    except Exception:
+        pass
+    return tuple(dirs)
+
+
+def _path_fingerprint(paths: Tuple[str, ...]) -> Tuple:
+    """Cheap change detector for watched paths (one stat per path)."""
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            try:
+                # Dangling symlinks (systemd invocation links) still have an lstat
+                st = os.lstat(path)
+            except OSError:
+                fingerprint.append(None)
+                continue
+        fingerprint.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(fingerprint)
+
+
+class _CheckSpec(NamedTuple):
+    """One schedulable check: result name, bound method, args, deadline, cache rules."""
+    name: str
+    fn: Callable[..., CheckResult]
+    args: tuple
+    timeout: float
+    ttl: float = 0.0
+    watch: Tuple[str, ...] = ()
+
+
+class _CachedCheck(NamedTuple):
+    """A reusable result with the time and watched-path state it was taken at."""
+    result: CheckResult
+    taken_at: float
+    fingerprint: Tuple
+
 
 class DiagnosticEngine:
     """
@@ -119,6 +204,15 @@ class DiagnosticEngine:
         self._monitor_thread: Optional[threading.Thread] = None
         self._monitor_interval = 30  # seconds
 
+        # Concurrent check execution
+        self._max_workers = DEFAULT_MAX_WORKERS
+
+        # Check result cache (see _check_plan ttl/watch)
+        self._cache: Dict[Tuple, _CachedCheck] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
         # Paths
         self._diag_dir = _get_real_user_home() / '.config' / 'meshforge' / 'diagnostics'
         self._ensure_dirs()
@@ -197,206 +291,378 @@ class DiagnosticEngine:
 
     # === Check Execution ===
 
-    def run_all(self, async_mode: bool = False) -> List[CheckResult]:
+    def run_all(self, async_mode: bool = False,
+                max_workers: Optional[int] = None) -> List[CheckResult]:
         """
         Run all diagnostic checks across all categories.
 
+        Checks run concurrently; register check/progress callbacks to
+        receive results as they complete.
+
         Args:
             async_mode: If True, run in background thread and return immediately
+            max_workers: Concurrent checks (default: engine setting, 1 = sequential)
 
         Returns:
             List of all CheckResults (empty list if async_mode=True)
         """
         if async_mode:
-            threading.Thread(target=self._run_all_internal, daemon=True).start()
+            threading.Thread(target=self._run_all_internal, args=(max_workers,),
+                             daemon=True).start()
             return []
-        return self._run_all_internal()
+        return self._run_all_internal(max_workers)
 
-    def _run_all_internal(self) -> List[CheckResult]:
+    def _run_all_internal(self, max_workers: Optional[int] = None) -> List[CheckResult]:
         """Internal implementation of run_all."""
-        all_results = []
-        categories = list(CheckCategory)
+        return self._execute_checks(list(CheckCategory), max_workers)
 
-        for i, category in enumerate(categories):
-            self._notify_progress(category.value, i + 1, len(categories))
-            results = self.run_category(category)
-            all_results.extend(results)
-
-        return all_results
-
-    def run_category(self, category: CheckCategory) -> List[CheckResult]:
+    def run_category(self, category: CheckCategory,
+                     max_workers: Optional[int] = None) -> List[CheckResult]:
         """Run all checks in a specific category."""
-        check_map = {
-            CheckCategory.SERVICES: self._run_services_checks,
-            CheckCategory.NETWORK: self._run_network_checks,
-            CheckCategory.RNS: self._run_rns_checks,
-            CheckCategory.MESHTASTIC: self._run_meshtastic_checks,
-            CheckCategory.SERIAL: self._run_serial_checks,
-            CheckCategory.HARDWARE: self._run_hardware_checks,
-            CheckCategory.SYSTEM: self._run_system_checks,
-            CheckCategory.HAM_RADIO: self._run_ham_radio_checks,
-            CheckCategory.LOGS: self._run_logs_checks,
-        }
+        return self._execute_checks([category], max_workers)
 
-        check_fn = check_map.get(category)
-        if check_fn:
-            return check_fn()
-        return []
+    def set_max_workers(self, max_workers: int):
+        """Set how many checks may run at once (1 = strictly sequential)."""
+        self._max_workers = max(1, int(max_workers))
 
-    # === Category Check Implementations ===
-
-    def _run_services_checks(self) -> List[CheckResult]:
-        """Check system services."""
-        results = []
+    # === Check Plan ===
 
-        # meshtasticd
-        results.append(self._check_service('meshtasticd', 'Meshtastic daemon'))
-
-        # rnsd
-        results.append(self._check_process('rnsd', 'RNS daemon'))
-
-        # nomadnet
-        results.append(self._check_process('nomadnet', 'NomadNet'))
+    def _check_plan(self) -> Dict[CheckCategory, List[_CheckSpec]]:
+        """
+        Checks to run per category, with per-check deadlines and cache rules.
 
-        # bluetooth
-        results.append(self._check_service('bluetooth', 'Bluetooth'))
+        Names must match the CheckResult name each check produces so a
+        timed-out check replaces the previous result for the same key.
+        Deadlines sit just above the check's own subprocess/socket timeout.
 
-        self._update_subsystem_health('services', results)
-        return results
+        ttl is how long background monitoring may reuse a result; watch
+        lists paths whose change (mtime/size/inode) invalidates it early:
+        /dev for udev hotplug, /etc/group for group changes, systemd's
+        per-unit invocation links for service restarts, config files.
+        """
+        home = _get_real_user_home()
+        rns_config = str(home / '.reticulum' / 'config')
+        rns_interface = str(home / '.reticulum' / 'Meshtastic_Interface.py')
+        site_dirs = _site_package_dirs()
 
-    def _run_network_checks(self) -> List[CheckResult]:
-        """Check network connectivity."""
-        results = []
+        def unit_watch(service: str) -> Tuple[str, ...]:
+            return (f'/run/systemd/units/invocation:{service}.service',)
 
-        # Internet connectivity
-        results.append(self._check_internet())
+        return {
+            CheckCategory.SERVICES: [
+                _CheckSpec("Meshtastic daemon", self._check_service,
+                           ('meshtasticd', 'Meshtastic daemon'), 6.0,
+                           ttl=TTL_SERVICE, watch=unit_watch('meshtasticd')),
+                _CheckSpec("RNS daemon", self._check_process, ('rnsd', 'RNS daemon'), 6.0,
+                           ttl=TTL_PROCESS),
+                _CheckSpec("NomadNet", self._check_process, ('nomadnet', 'NomadNet'), 6.0,
+                           ttl=TTL_PROCESS),
+                _CheckSpec("Bluetooth", self._check_service, ('bluetooth', 'Bluetooth'), 6.0,
+                           ttl=TTL_SERVICE, watch=unit_watch('bluetooth')),
+            ],
+            CheckCategory.NETWORK: [
+                _CheckSpec("Internet connectivity", self._check_internet, (), 4.0),
+                # gethostbyname() has no timeout of its own
+                _CheckSpec("DNS resolution", self._check_dns, (), 5.0),
+                _CheckSpec("meshtasticd API (:4403)", self._check_tcp_port,
+                           (4403, 'meshtasticd API'), 3.0),
+                _CheckSpec("meshtasticd Web UI (:9443)", self._check_tcp_port,
+                           (9443, 'meshtasticd Web UI', True), 3.0),
+                _CheckSpec("MQTT broker (:1883)", self._check_tcp_port,
+                           (1883, 'MQTT broker', True), 3.0),
+            ],
+            CheckCategory.RNS: [
+                _CheckSpec("RNS library", self._check_rns_installed, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=site_dirs),
+                _CheckSpec("RNS config", self._check_rns_config, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=(rns_config,)),
+                _CheckSpec("RNS daemon", self._check_process, ('rnsd', 'RNS daemon'), 6.0,
+                           ttl=TTL_PROCESS),
+                _CheckSpec("RNS AutoInterface port", self._check_rns_port, (), DEFAULT_CHECK_TIMEOUT),
+                _CheckSpec("Meshtastic Interface", self._check_meshtastic_interface_file, (),
+                           DEFAULT_CHECK_TIMEOUT, ttl=TTL_STATIC, watch=(rns_interface,)),
+            ],
+            CheckCategory.MESHTASTIC: [
+                _CheckSpec("Meshtastic library", self._check_meshtastic_installed, (),
+                           DEFAULT_CHECK_TIMEOUT, ttl=TTL_STATIC, watch=site_dirs),
+                _CheckSpec("Meshtastic CLI", self._check_meshtastic_cli, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC,
+                           watch=('/usr/local/bin', '/usr/bin', str(home / '.local' / 'bin'))),
+                _CheckSpec("Meshtastic connection", self._check_meshtastic_connection, (), 4.0),
+            ],
+            CheckCategory.SERIAL: [
+                _CheckSpec("Serial ports", self._check_serial_ports, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=('/dev',)),
+                _CheckSpec("Dialout group", self._check_dialout_group, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=('/etc/group',)),
+            ],
+            CheckCategory.HARDWARE: [
+                _CheckSpec("SPI interface", self._check_spi, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=('/dev',)),
+                _CheckSpec("I2C interface", self._check_i2c, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=('/dev',)),
+                _CheckSpec("CPU temperature", self._check_temperature, (), DEFAULT_CHECK_TIMEOUT),
+                _CheckSpec("RTL-SDR", self._check_sdr, (), 6.0,
+                           ttl=TTL_STATIC, watch=('/dev', '/dev/bus/usb')),
+            ],
+            CheckCategory.SYSTEM: [
+                _CheckSpec("Python version", self._check_python_version, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC),
+                _CheckSpec("Required packages", self._check_pip_packages, (), 10.0,
+                           ttl=TTL_STATIC, watch=site_dirs),
+                _CheckSpec("Memory", self._check_memory, (), DEFAULT_CHECK_TIMEOUT),
+                _CheckSpec("Disk space", self._check_disk_space, (), DEFAULT_CHECK_TIMEOUT),
+                _CheckSpec("CPU load", self._check_cpu_load, (), DEFAULT_CHECK_TIMEOUT),
+            ],
+            CheckCategory.HAM_RADIO: [
+                _CheckSpec("Callsign", self._check_callsign, (), DEFAULT_CHECK_TIMEOUT,
+                           ttl=TTL_STATIC, watch=(str(home / '.nomadnetwork' / 'config'),)),
+            ],
+            CheckCategory.LOGS: [
+                _CheckSpec("meshtasticd logs", self._check_service_logs, ('meshtasticd',), 11.0,
+                           ttl=TTL_LOGS),
+            ],
+        }
 
-        # DNS resolution
-        results.append(self._check_dns())
+    # === Concurrent Executor ===
 
-        # Meshtasticd API port
-        results.append(self._check_tcp_port(4403, 'meshtasticd API'))
+    def _execute_checks(self, categories: List[CheckCategory],
+                        max_workers: Optional[int] = None,
+                        use_cache: bool = False) -> List[CheckResult]:
+        """
+        Run the checks for the given categories concurrently.
 
-        # Meshtasticd Web UI port
-        results.append(self._check_tcp_port(9443, 'meshtasticd Web UI', optional=True))
+        Checks are independent (subprocess, socket and file probes), so they
+        run on a thread pool. Each result is pushed to check callbacks as soon
+        as it completes; subsystem health and progress are updated when the
+        last check of a category finishes. A check that exceeds its deadline
+        is reported as a WARN result and its late answer is discarded.
 
-        # MQTT (optional)
-        results.append(self._check_tcp_port(1883, 'MQTT broker', optional=True))
+        Results of checks with a ttl are always cached; with use_cache a
+        cached result still within its ttl and with unchanged watched paths
+        is reused instead of re-running the check.
 
-        self._update_subsystem_health('network', results)
-        return results
+        Returns:
+            Results in plan order (category order, then check order)
+        """
+        plan = self._check_plan()
+        jobs: List[Tuple[CheckCategory, int, _CheckSpec]] = []
+        slots: Dict[CheckCategory, List[Optional[CheckResult]]] = {}
+        for category in categories:
+            specs = plan.get(category, [])
+            slots[category] = [None] * len(specs)
+            jobs.extend((category, idx, spec) for idx, spec in enumerate(specs))
+
+        remaining = {cat: len(slot) for cat, slot in slots.items()}
+        finished_categories = 0
+        total_categories = len(slots)
+
+        def complete(job_index: int, result: CheckResult):
+            nonlocal finished_categories
+            category, idx, _ = jobs[job_index]
+            slots[category][idx] = result
+            with self._results_lock:
+                self._results[f"{category.value}.{result.name}"] = result
+            self._notify_check(result)
+
+            remaining[category] -= 1
+            if remaining[category] == 0:
+                finished_categories += 1
+                self._update_subsystem_health(category.value, slots[category],
+                                              notify_checks=False)
+                self._notify_progress(category.value, finished_categories, total_categories)
+
+        for category in [c for c, count in remaining.items() if count == 0]:
+            finished_categories += 1
+            self._update_subsystem_health(category.value, [], notify_checks=False)
+            self._notify_progress(category.value, finished_categories, total_categories)
+
+        to_run = []
+        fingerprints: Dict[int, Tuple] = {}
+        for i, (_, _, spec) in enumerate(jobs):
+            if spec.ttl > 0:
+                fingerprints[i] = _path_fingerprint(spec.watch)
+                if use_cache:
+                    cached = self._get_cached(spec, fingerprints[i])
+                    if cached is not None:
+                        complete(i, cached)
+                        continue
+            to_run.append(i)
+
+        if to_run:
+            workers = max(1, min(max_workers or self._max_workers, len(to_run)))
+            started: Dict[int, float] = {}
+
+            def run(job_index: int) -> CheckResult:
+                started[job_index] = time.monotonic()
+                spec = jobs[job_index][2]
+                return spec.fn(*spec.args)
+
+            executor = ThreadPoolExecutor(max_workers=workers,
+                                          thread_name_prefix='diagnostics')
+            try:
+                futures = {executor.submit(run, i): i for i in to_run}
+                pending = set(futures)
+
+                while pending:
+                    now = time.monotonic()
+                    deadlines = []
+                    for future in list(pending):
+                        i = futures[future]
+                        t0 = started.get(i)
+                        if t0 is None or future.done():
+                            continue
+                        deadline = t0 + jobs[i][2].timeout
+                        if now >= deadline:
+                            pending.discard(future)
+                            future.cancel()
+                            complete(i, self._timeout_result(jobs[i][0], jobs[i][2]))
+                        else:
+                            deadlines.append(deadline)
+                    if not pending:
+                        break
+
+                    # Queued checks have no deadline yet; poll until they start
+                    wait_for = _QUEUE_POLL_INTERVAL
+                    if deadlines and len(deadlines) == len(pending):
+                        wait_for = max(0.0, min(deadlines) - now)
+                    elif deadlines:
+                        wait_for = min(wait_for, max(0.0, min(deadlines) - now))
+
+                    done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        i = futures[future]
+                        try:
+                            result = future.result()
+                            if i in fingerprints:
+                                self._put_cached(jobs[i][2], result, fingerprints[i])
+                        except Exception as e:
+                            result = self._error_result(jobs[i][0], jobs[i][2], e)
+                        complete(i, result)
+            finally:
+                # Timed-out checks finish in the background on their own timeouts
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return [r for category in categories for r in slots.get(category, []) if r]
+
+    # === Result Cache ===
+
+    @staticmethod
+    def _cache_key(spec: _CheckSpec) -> Tuple:
+        # Keyed by check + args so a check planned in two categories
+        # (rnsd under services and rns) is shared
+        return (spec.fn, spec.args)
+
+    def _get_cached(self, spec: _CheckSpec, fingerprint: Tuple) -> Optional[CheckResult]:
+        """Cached result if still within ttl and watched paths are unchanged."""
+        with self._cache_lock:
+            entry = self._cache.get(self._cache_key(spec))
+            if (entry is not None
+                    and time.monotonic() - entry.taken_at < spec.ttl
+                    and entry.fingerprint == fingerprint):
+                self._cache_hits += 1
+                return entry.result
+            self._cache_misses += 1
+            return None
+
+    def _put_cached(self, spec: _CheckSpec, result: CheckResult, fingerprint: Tuple):
+        with self._cache_lock:
+            self._cache[self._cache_key(spec)] = _CachedCheck(
+                result, time.monotonic(), fingerprint)
+
+    def invalidate(self, category: Optional[CheckCategory] = None,
+                   name: Optional[str] = None):
+        """
+        Drop cached check results so the next monitor cycle re-runs them.
 
-    def _run_rns_checks(self) -> List[CheckResult]:
-        """Check Reticulum/RNS."""
-        results = []
+        Call after changing something the watched paths can't see (e.g.
+        installing a package into a venv, editing CALLSIGN).
 
-        # RNS installation
-        results.append(self._check_rns_installed())
+        Args:
+            category: Only checks in this category (default: all)
+            name: Only the check with this result name
+        """
+        plan = self._check_plan()
+        keys = {
+            self._cache_key(spec)
+            for cat, specs in plan.items()
+            if category is None or cat == category
+            for spec in specs
+            if name is None or spec.name == name
+        }
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def get_cache_stats(self) -> Dict:
+        """Cache hit/miss counts for background monitoring."""
+        with self._cache_lock:
+            return {
+                'entries': len(self._cache),
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+            }
+
+    def _timeout_result(self, category: CheckCategory, spec: _CheckSpec) -> CheckResult:
+        """Result reported for a check that missed its deadline."""
+        return CheckResult(
+            name=spec.name,
+            category=category,
+            status=CheckStatus.WARN,
+            message=f"Timed out after {spec.timeout:.0f}s",
+            details={"timeout": spec.timeout},
+            duration_ms=spec.timeout * 1000
+        )
 
-        # RNS config file
-        results.append(self._check_rns_config())
+    def _error_result(self, category: CheckCategory, spec: _CheckSpec,
+                      error: Exception) -> CheckResult:
+        """Result reported for a check that raised."""
+        logger.error(f"Check {spec.name} error: {error}")
+        return CheckResult(
+            name=spec.name,
+            category=category,
+            status=CheckStatus.FAIL,
+            message=str(error)
+        )
 
-        # rnsd running
-        results.append(self._check_process('rnsd', 'RNS daemon'))
+    # === Category Check Implementations ===
 
-        # Port 29716 availability (AutoInterface)
-        results.append(self._check_rns_port())
+    def _run_services_checks(self) -> List[CheckResult]:
+        """Check system services."""
+        return self.run_category(CheckCategory.SERVICES)
 
-        # Meshtastic interface file
-        results.append(self._check_meshtastic_interface_file())
+    def _run_network_checks(self) -> List[CheckResult]:
+        """Check network connectivity."""
+        return self.run_category(CheckCategory.NETWORK)
 
-        self._update_subsystem_health('rns', results)
-        return results
+    def _run_rns_checks(self) -> List[CheckResult]:
+        """Check Reticulum/RNS."""
+        return self.run_category(CheckCategory.RNS)
 
     def _run_meshtastic_checks(self) -> List[CheckResult]:
         """Check Meshtastic."""
-        results = []
-
-        # Library installed
-        results.append(self._check_meshtastic_installed())
-
-        # CLI available
-        results.append(self._check_meshtastic_cli())
-
-        # Can connect via TCP
-        results.append(self._check_meshtastic_connection())
-
-        self._update_subsystem_health('meshtastic', results)
-        return results
+        return self.run_category(CheckCategory.MESHTASTIC)
 
     def _run_serial_checks(self) -> List[CheckResult]:
         """Check serial ports."""
-        results = []
-
-        # Available ports
-        results.append(self._check_serial_ports())
-
-        # Dialout group membership
-        results.append(self._check_dialout_group())
-
-        self._update_subsystem_health('serial', results)
-        return results
+        return self.run_category(CheckCategory.SERIAL)
 
     def _run_hardware_checks(self) -> List[CheckResult]:
         """Check hardware interfaces."""
-        results = []
-
-        # SPI enabled
-        results.append(self._check_spi())
-
-        # I2C enabled
-        results.append(self._check_i2c())
-
-        # Temperature (Raspberry Pi)
-        results.append(self._check_temperature())
-
-        # SDR devices (optional)
-        results.append(self._check_sdr())
-
-        self._update_subsystem_health('hardware', results)
-        return results
+        return self.run_category(CheckCategory.HARDWARE)
 
     def _run_system_checks(self) -> List[CheckResult]:
         """Check system resources."""
-        results = []
-
-        # Python version
-        results.append(self._check_python_version())
-
-        # Required packages
-        results.append(self._check_pip_packages())
-
-        # Memory
-        results.append(self._check_memory())
-
-        # Disk space
-        results.append(self._check_disk_space())
-
-        # CPU load
-        results.append(self._check_cpu_load())
-
-        self._update_subsystem_health('system', results)
-        return results
+        return self.run_category(CheckCategory.SYSTEM)
 
     def _run_ham_radio_checks(self) -> List[CheckResult]:
         """Check HAM radio configuration."""
-        results = []
-
-        # Callsign configured
-        results.append(self._check_callsign())
-
-        self._update_subsystem_health('ham_radio', results)
-        return results
+        return self.run_category(CheckCategory.HAM_RADIO)
 
     def _run_logs_checks(self) -> List[CheckResult]:
         """Analyze logs for errors."""
-        results = []
-
-        # Recent errors in meshtasticd
-        results.append(self._check_service_logs('meshtasticd'))
-
-        self._update_subsystem_health('logs', results)
-        return results
+        return self.run_category(CheckCategory.LOGS)
 
     # === Individual Check Implementations ===
 
@@ -404,11 +670,16 @@ class DiagnosticEngine:
         """Check if a systemd service is running."""
         start = time.time()
         try:
-            result = subprocess.run(
-                ['systemctl', 'is-active', service],
-                capture_output=True, text=True, timeout=5
-            )
-            status_str = result.stdout.strip()
+            state = peek_system_state() if SYSTEM_STATE_AVAILABLE else None
+            unit = state.service(service) if state is not None and state.systemd else None
+            if unit is not None:
+                status_str = unit.active
+            else:
+                result = subprocess.run(
+                    ['systemctl', 'is-active', service],
+                    capture_output=True, text=True, timeout=5
+                )
+                status_str = result.stdout.strip()
             duration = (time.time() - start) * 1000
 
             if status_str == 'active':
@@ -1291,15 +1562,23 @@ class DiagnosticEngine:
         """Check recent service logs for errors."""
         start = time.time()
         try:
-            result = subprocess.run(
-                ['journalctl', '-u', service, '--since', '1 hour ago', '-p', 'err', '--no-pager', '-q'],
-                capture_output=True, text=True, timeout=10
-            )
+            logs = get_log_service() if LOG_SERVICE_AVAILABLE else None
+            error_count = None
+            if logs is not None and logs.watches(service) \
+                    and logs.wait_ready(timeout=5) and logs.running:
+                # Counted as entries arrive; no journal scan
+                # (None if more errors arrived than the history keeps)
+                error_count = logs.error_count(service)
+                lines = [entry.line for entry in logs.recent_errors(service, 5)]
+            if error_count is None:
+                result = subprocess.run(
+                    ['journalctl', '-u', service, '--since', '1 hour ago', '-p', 'err', '--no-pager', '-q'],
+                    capture_output=True, text=True, timeout=10
+                )
+                lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
+                error_count = len(lines)
             duration = (time.time() - start) * 1000
 
-            lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            error_count = len(lines)
-
             if error_count == 0:
                 return CheckResult(
                     name=f"{service} logs",
@@ -1314,7 +1593,7 @@ class DiagnosticEngine:
                     category=CheckCategory.LOGS,
                     status=CheckStatus.WARN,
                     message=f"{error_count} error(s) in last hour",
-                    details={"recent_errors": lines[:3]},
+                    details={"recent_errors": lines[-3:]},
                     duration_ms=duration
                 )
             else:
@@ -1324,7 +1603,7 @@ class DiagnosticEngine:
                     status=CheckStatus.FAIL,
                     message=f"{error_count} errors in last hour",
                     fix_hint=f"Check: journalctl -u {service} -f",
-                    details={"recent_errors": lines[:5]},
+                    details={"recent_errors": lines[-5:]},
                     duration_ms=duration
                 )
         except Exception as e:
@@ -1338,8 +1617,15 @@ class DiagnosticEngine:
 
     # === Health Management ===
 
-    def _update_subsystem_health(self, name: str, checks: List[CheckResult]):
-        """Update health status for a subsystem based on check results."""
+    def _update_subsystem_health(self, name: str, checks: List[CheckResult],
+                                 notify_checks: bool = True):
+        """
+        Update health status for a subsystem based on check results.
+
+        Args:
+            notify_checks: Store and notify each check (False when the
+                executor has already streamed them)
+        """
         fail_count = sum(1 for c in checks if c.status == CheckStatus.FAIL)
         warn_count = sum(1 for c in checks if c.status == CheckStatus.WARN)
 
@@ -1377,6 +1663,9 @@ class DiagnosticEngine:
         if old_health is None or old_health.status != status:
             self._notify_health(name, health)
 
+        if not notify_checks:
+            return
+
         # Store results and notify
         with self._results_lock:
             for check in checks:
@@ -1518,6 +1807,12 @@ class DiagnosticEngine:
 
     def _write_event_to_file(self, event: DiagnosticEvent):
         """Write event to daily log file."""
+        if get_event_logger is not None:
+            try:
+                get_event_logger(self._diag_dir).info(event.to_log_line())
+                return
+            except Exception as e:
+                logger.debug(f"Event logger unavailable: {e}")
         try:
             log_file = self._diag_dir / f"events_{datetime.now().strftime('%Y%m%d')}.log"
             with open(log_file, 'a') as f:
@@ -1633,12 +1928,16 @@ class DiagnosticEngine:
         logger.info("Background monitoring stopped")
 
     def _monitor_loop(self):
-        """Background monitoring loop."""
+        """
+        Background monitoring loop.
+
+        Covers every category, but only re-runs checks whose cached result
+        expired or whose watched paths changed; static checks (Python
+        version, packages, SPI/I2C, callsign) cost one stat() per cycle.
+        """
         while self._monitor_running:
             try:
-                # Run critical checks only (services, network)
-                self._run_services_checks()
-                self._run_network_checks()
+                self._execute_checks(list(CheckCategory), use_cache=True)
             except Exception as e:
                 logger.error(f"Monitor loop error: {e}")
             time.sleep(self._monitor_interval)
@@ -1657,9 +1956,7 @@ class DiagnosticEngine:
         else:
             categories = list(CheckCategory)
 
-        all_results = []
-        for cat in categories:
-            all_results.extend(self.run_category(cat))
+        all_results = self._execute_checks(categories)
 
         # Analyze for recommendations
         failures = [r for r in all_results if r.status == CheckStatus.FAIL]
@@ -10,6 +10,7 @@ Supports two bridge modes:
 from .rns_bridge import RNSMeshtasticBridge
 from .node_tracker import UnifiedNodeTracker
 from .config import GatewayConfig, RNSOverMeshtasticConfig
+from .mqtt_ingest import MQTTNodeIngest
 from .rns_transport import (
     RNSMeshtasticTransport,
     RNSMeshtasticInterface,
@@ -22,6 +23,7 @@ __all__ = [
     'UnifiedNodeTracker',
     'GatewayConfig',
     'RNSOverMeshtasticConfig',
+    'MQTTNodeIngest',
     'RNSMeshtasticTransport',
     'RNSMeshtasticInterface',
     'TransportStats',
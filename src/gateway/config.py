@@ -24,6 +24,11 @@ except ImportError:
             return Path(f'/home/{sudo_user}')
         return Path.home()
 
+try:
+    from utils.airtime import MESHTASTIC_HEADER, max_throughput, time_on_air
+except ImportError:
+    time_on_air = None
+
 
 @dataclass
 class MeshtasticConfig:
@@ -88,8 +93,13 @@ class RNSOverMeshtasticConfig:
     packet_loss_threshold: float = 0.1  # Alert if >10% loss
     latency_threshold_ms: int = 5000  # Alert if >5s roundtrip
 
-    def get_throughput_estimate(self) -> dict:
-        """Estimate throughput based on speed preset."""
+    def get_throughput_estimate(self, fragment_size: int = 200) -> dict:
+        """Estimate throughput based on speed preset.
+
+        With utils.airtime available, also the time a fragment of
+        fragment_size bytes spends on air and the preset's ceiling in
+        bytes/s (full packets back to back).
+        """
         speed_info = {
             8: {'name': 'SHORT_TURBO', 'delay': 0.4, 'bps': 500, 'range': 'short'},
             7: {'name': 'SHORT_FAST+', 'delay': 0.5, 'bps': 400, 'range': 'short'},
@@ -101,7 +111,12 @@ class RNSOverMeshtasticConfig:
             1: {'name': 'LONG_SLOW', 'delay': 7.0, 'bps': 55, 'range': 'very long'},
             0: {'name': 'LONG_FAST', 'delay': 8.0, 'bps': 50, 'range': 'maximum'},
         }
-        return speed_info.get(self.data_speed, speed_info[8])
+        estimate = dict(speed_info.get(self.data_speed, speed_info[8]))
+        if time_on_air is not None:
+            modem = estimate['name'].rstrip('+')
+            estimate['fragment_airtime'] = time_on_air(fragment_size + MESHTASTIC_HEADER, modem)
+            estimate['max_bytes_per_sec'] = round(max_throughput(modem), 1)
+        return estimate
 
 
 @dataclass
@@ -0,0 +1,506 @@
+"""
+MQTT Node Ingest for the Unified Node Tracker
+
+Turns the public/regional Meshtastic MQTT feed into tracked nodes.
+Most of a region's nodes are only visible through MQTT, so this path
+has to keep up with thousands of messages per second on a Pi.
+
+Pipeline:
+    paho network thread -> submit() -> bounded queue -> worker pool
+        -> parse + dedup by packet id -> batched tracker.add_nodes()
+
+Supported topics:
+- msh/<region>/json/#, msh/<region>/2/json/#  (JSON uplink, default)
+- msh/<region>/2/e/#                        (protobuf ServiceEnvelope, optional)
+
+Encrypted protobuf packets are not decrypted; they still refresh the
+sender's last-seen time and radio metrics.
+
+Usage:
+    ingest = MQTTNodeIngest(tracker)
+    ingest.start()
+    ingest.attach(mqtt_plugin)   # subscribes topics, feeds submit()
+    ...
+    print(ingest.get_stats())
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Queue, Empty, Full
+from typing import Optional, List, Tuple, Dict, Any
+
+from .node_tracker import UnifiedNodeTracker, UnifiedNode, Position, Telemetry
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+# JSON uplink topics (old and new region layouts)
+DEFAULT_JSON_TOPICS = ("msh/+/json/#", "msh/+/2/json/#")
+
+# Protobuf ServiceEnvelope topics
+DEFAULT_PROTOBUF_TOPICS = ("msh/+/2/e/#",)
+
+# Ingest tuning defaults (sized for a Pi 4)
+DEFAULT_WORKERS = 2
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_QUEUE_SIZE = 20000
+DEFAULT_DEDUP_SIZE = 50000
+
+# Window for the "current" messages/sec figure
+RATE_WINDOW_SEC = 10.0
+
+BROADCAST_NUM = 0xFFFFFFFF
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+@dataclass
+class IngestStats:
+    """MQTT ingest statistics"""
+    messages_received: int = 0
+    messages_processed: int = 0
+    duplicates: int = 0
+    parse_errors: int = 0
+    ignored: int = 0
+    dropped: int = 0
+    nodes_upserted: int = 0
+    nodes_added: int = 0
+    batches: int = 0
+    max_batch: int = 0
+    queue_high_water: int = 0
+    start_time: Optional[datetime] = None
+    last_activity: Optional[datetime] = None
+
+    @property
+    def uptime_seconds(self) -> float:
+        if not self.start_time:
+            return 0.0
+        return (datetime.now() - self.start_time).total_seconds()
+
+    @property
+    def avg_messages_per_second(self) -> float:
+        uptime = self.uptime_seconds
+        if uptime <= 0:
+            return 0.0
+        return self.messages_processed / uptime
+
+    @property
+    def duplicate_rate(self) -> float:
+        if self.messages_processed == 0:
+            return 0.0
+        return self.duplicates / self.messages_processed
+
+    def to_dict(self) -> dict:
+        return {
+            'messages_received': self.messages_received,
+            'messages_processed': self.messages_processed,
+            'duplicates': self.duplicates,
+            'duplicate_rate': round(self.duplicate_rate, 4),
+            'parse_errors': self.parse_errors,
+            'ignored': self.ignored,
+            'dropped': self.dropped,
+            'nodes_upserted': self.nodes_upserted,
+            'nodes_added': self.nodes_added,
+            'batches': self.batches,
+            'max_batch': self.max_batch,
+            'queue_high_water': self.queue_high_water,
+            'avg_messages_per_second': round(self.avg_messages_per_second, 1),
+            'uptime_seconds': round(self.uptime_seconds, 1),
+            'last_activity': self.last_activity.isoformat() if self.last_activity else None,
+        }
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+def parse_json_message(data: Dict[str, Any]) -> Optional[Tuple[Optional[tuple], UnifiedNode]]:
+    """
+    Build a UnifiedNode from a decoded Meshtastic MQTT JSON message.
+
+    Args:
+        data: Decoded JSON uplink message (keys: from, id, type, payload, ...)
+
+    Returns:
+        (dedup_key, node) or None if the message carries no node info.
+        dedup_key is None when the packet has no id.
+    """
+    node_num = data.get('from')
+    if not isinstance(node_num, int) or node_num in (0, BROADCAST_NUM):
+        return None
+
+    meshtastic_id = f"!{node_num & 0xFFFFFFFF:08x}"
+    now = datetime.now()
+
+    node = UnifiedNode(
+        id=f"mesh_{meshtastic_id}",
+        network="meshtastic",
+        name=meshtastic_id,
+        meshtastic_id=meshtastic_id,
+        is_online=True,
+        last_seen=now,
+        first_seen=now,
+    )
+
+    snr = data.get('snr')
+    if snr is not None:
+        node.snr = snr
+    rssi = data.get('rssi')
+    if rssi is not None:
+        node.rssi = rssi
+    hops = data.get('hops_away')
+    if hops is not None:
+        node.hops = hops
+
+    payload = data.get('payload')
+    if isinstance(payload, dict):
+        msg_type = data.get('type')
+        if msg_type == 'nodeinfo':
+            long_name = payload.get('longname')
+            if long_name:
+                node.name = long_name
+            node.short_name = payload.get('shortname') or ''
+            hardware = payload.get('hardware')
+            if hardware is not None:
+                node.hardware_model = str(hardware)
+            role = payload.get('role')
+            if role is not None:
+                node.role = str(role)
+        elif msg_type == 'position':
+            lat_i = payload.get('latitude_i')
+            lon_i = payload.get('longitude_i')
+            if lat_i is not None and lon_i is not None:
+                node.position = Position(
+                    latitude=lat_i / 1e7,
+                    longitude=lon_i / 1e7,
+                    altitude=payload.get('altitude', 0) or 0,
+                    timestamp=now,
+                )
+        elif msg_type == 'telemetry':
+            telemetry = Telemetry(
+                battery_level=payload.get('battery_level'),
+                voltage=payload.get('voltage'),
+                temperature=payload.get('temperature'),
+                humidity=payload.get('relative_humidity'),
+                pressure=payload.get('barometric_pressure'),
+                uptime=payload.get('uptime_seconds'),
+            )
+            if telemetry.to_dict():
+                telemetry.timestamp = now
+                node.telemetry = telemetry
+
+    packet_id = data.get('id')
+    key = (node_num, packet_id) if packet_id else None
+    return key, node
+
+
+_protobufs = None
+
+
+def _load_protobufs():
+    """Import Meshtastic protobuf modules once (optional dependency)."""
+    global _protobufs
+    if _protobufs is None:
+        try:
+            from meshtastic.protobuf import mqtt_pb2, mesh_pb2, portnums_pb2, telemetry_pb2
+        except ImportError:
+            try:
+                from meshtastic import mqtt_pb2, mesh_pb2, portnums_pb2, telemetry_pb2
+            except ImportError:
+                _protobufs = False
+                return _protobufs
+        _protobufs = (mqtt_pb2, mesh_pb2, portnums_pb2, telemetry_pb2)
+    return _protobufs
+
+
+def envelope_to_json(payload: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Convert a protobuf ServiceEnvelope into the JSON uplink shape.
+
+    Returns None if protobuf support is unavailable or the payload
+    does not parse. Encrypted packets yield header fields only.
+    """
+    pbs = _load_protobufs()
+    if not pbs:
+        return None
+    mqtt_pb2, mesh_pb2, portnums_pb2, telemetry_pb2 = pbs
+
+    envelope = mqtt_pb2.ServiceEnvelope.FromString(payload)
+    packet = envelope.packet
+
+    data = {
+        'from': getattr(packet, 'from'),
+        'id': packet.id,
+        'snr': packet.rx_snr or None,
+        'rssi': packet.rx_rssi or None,
+    }
+    if packet.hop_start:
+        data['hops_away'] = packet.hop_start - packet.hop_limit
+
+    if packet.WhichOneof('payload_variant') != 'decoded':
+        return data
+
+    portnum = packet.decoded.portnum
+    raw = packet.decoded.payload
+    if portnum == portnums_pb2.NODEINFO_APP:
+        user = mesh_pb2.User.FromString(raw)
+        data['type'] = 'nodeinfo'
+        data['payload'] = {
+            'longname': user.long_name,
+            'shortname': user.short_name,
+            'hardware': user.hw_model,
+            'role': user.role,
+        }
+    elif portnum == portnums_pb2.POSITION_APP:
+        pos = mesh_pb2.Position.FromString(raw)
+        data['type'] = 'position'
+        data['payload'] = {
+            'latitude_i': pos.latitude_i,
+            'longitude_i': pos.longitude_i,
+            'altitude': pos.altitude,
+        }
+    elif portnum == portnums_pb2.TELEMETRY_APP:
+        tel = telemetry_pb2.Telemetry.FromString(raw)
+        variant = tel.WhichOneof('variant')
+        fields = {}
+        if variant == 'device_metrics':
+            dm = tel.device_metrics
+            fields = {
+                'battery_level': dm.battery_level,
+                'voltage': dm.voltage,
+                'uptime_seconds': dm.uptime_seconds,
+            }
+        elif variant == 'environment_metrics':
+            em = tel.environment_metrics
+            fields = {
+                'temperature': em.temperature,
+                'relative_humidity': em.relative_humidity,
+                'barometric_pressure': em.barometric_pressure,
+            }
+        data['type'] = 'telemetry'
+        data['payload'] = {k: v for k, v in fields.items() if v}
+
+    return data
+
+
+# ============================================================================
+# Ingest Pipeline
+# ============================================================================
+
+class MQTTNodeIngest:
+    """
+    High-rate MQTT -> UnifiedNodeTracker ingest pipeline.
+
+    submit() is called from the MQTT network thread and only enqueues;
+    parsing, deduplication and tracker upserts happen in a small worker
+    pool that drains the queue in batches (one tracker lock per batch).
+    """
+
+    def __init__(self, tracker: UnifiedNodeTracker,
+                 workers: int = DEFAULT_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 dedup_size: int = DEFAULT_DEDUP_SIZE,
+                 include_protobuf: bool = False):
+        self.tracker = tracker
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.dedup_size = dedup_size
+        self.include_protobuf = include_protobuf
+
+        self.topics: List[str] = list(DEFAULT_JSON_TOPICS)
+        if include_protobuf:
+            self.topics.extend(DEFAULT_PROTOBUF_TOPICS)
+
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+        # Dedup: (from, packet id) -> None, oldest first
+        self._seen: "OrderedDict[tuple, None]" = OrderedDict()
+        self._seen_lock = threading.Lock()
+
+        self.stats = IngestStats()
+        self._stats_lock = threading.Lock()
+        self._rate_samples: deque = deque()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the worker pool"""
+        if self._running:
+            return
+        self._running = True
+        self.stats.start_time = datetime.now()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                daemon=True,
+                name=f"MQTTIngest-{i}"
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"MQTT node ingest started ({self.workers} workers)")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop workers after draining what is already queued"""
+        if not self._running:
+            return
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                logger.warning(f"{thread.name} did not stop in time")
+        self._threads = []
+        logger.info("MQTT node ingest stopped")
+
+    def attach(self, plugin) -> None:
+        """Subscribe ingest topics on an MQTTBridgePlugin and feed submit()"""
+        for topic in self.topics:
+            plugin.subscribe(topic)
+        plugin.register_raw_callback(self.submit)
+
+    def submit(self, topic: str, payload: bytes) -> bool:
+        """
+        Queue a raw MQTT message for ingest (non-blocking).
+
+        Only the MQTT network thread calls this, so the received/dropped
+        counters are updated without taking the stats lock.
+
+        Returns:
+            False if the message was not for us or the queue was full
+        """
+        if '/json/' in topic:
+            kind = 'json'
+        elif self.include_protobuf and '/e/' in topic:
+            kind = 'pb'
+        else:
+            return False
+
+        self.stats.messages_received += 1
+        try:
+            self._queue.put_nowait((kind, payload))
+        except Full:
+            self.stats.dropped += 1
+            return False
+        return True
+
+    def get_stats(self) -> dict:
+        """Get ingest throughput metrics"""
+        with self._stats_lock:
+            stats = self.stats.to_dict()
+            stats['messages_per_second'] = round(self._current_rate(), 1)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['dedup_entries'] = len(self._seen)
+        stats['workers'] = self.workers
+        stats['topics'] = list(self.topics)
+        return stats
+
+    # ========================================
+    # Private Methods
+    # ========================================
+
+    def _worker_loop(self):
+        """Drain the queue in batches until stopped and empty"""
+        while self._running or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"MQTT ingest batch error: {e}")
+
+    def _process_batch(self, batch: List[tuple]):
+        """Parse, dedup and upsert one batch"""
+        depth = self._queue.qsize() + len(batch)
+        parsed = []
+        errors = 0
+        ignored = 0
+
+        for kind, payload in batch:
+            try:
+                if kind == 'json':
+                    data = json.loads(payload)
+                else:
+                    data = envelope_to_json(payload)
+                result = parse_json_message(data) if isinstance(data, dict) else None
+            except Exception:
+                errors += 1
+                continue
+            if result is None:
+                ignored += 1
+            else:
+                parsed.append(result)
+
+        nodes = []
+        duplicates = 0
+        with self._seen_lock:
+            seen = self._seen
+            for key, node in parsed:
+                if key is not None:
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen[key] = None
+                nodes.append(node)
+            while len(seen) > self.dedup_size:
+                seen.popitem(last=False)
+
+        added = self.tracker.add_nodes(nodes) if nodes else 0
+
+        with self._stats_lock:
+            stats = self.stats
+            stats.messages_processed += len(batch)
+            stats.parse_errors += errors
+            stats.ignored += ignored
+            stats.duplicates += duplicates
+            stats.nodes_upserted += len(nodes)
+            stats.nodes_added += added
+            stats.batches += 1
+            stats.max_batch = max(stats.max_batch, len(batch))
+            stats.queue_high_water = max(stats.queue_high_water, depth)
+            stats.last_activity = datetime.now()
+            now = time.monotonic()
+            self._rate_samples.append((now, stats.messages_processed))
+            self._trim_rate_samples(now)
+
+    def _trim_rate_samples(self, now: float):
+        """Drop samples older than RATE_WINDOW_SEC, keeping the newest (stats lock held)"""
+        samples = self._rate_samples
+        cutoff = now - RATE_WINDOW_SEC
+        while len(samples) > 1 and samples[0][0] < cutoff:
+            samples.popleft()
+
+    def _current_rate(self) -> float:
+        """Messages/sec over the last RATE_WINDOW_SEC (stats lock held)"""
+        samples = self._rate_samples
+        self._trim_rate_samples(time.monotonic())
+        if len(samples) < 2:
+            return 0.0
+        (t0, c0), (t1, c1) = samples[0], samples[-1]
+        if t1 <= t0:
+            return 0.0
+        return (c1 - c0) / (t1 - t0)
@@ -15,6 +15,18 @@ import json
 
 logger = logging.getLogger(__name__)
 
+try:
+    from utils.metrics import get_metrics
+except ImportError:
+    from ..utils.metrics import get_metrics
+
+# Import per-node telemetry history (time series with rollups)
+try:
+    from utils.telemetry_store import get_telemetry_store
+    TELEMETRY_STORE_AVAILABLE = True
+except ImportError:
+    TELEMETRY_STORE_AVAILABLE = False
+
 # Import centralized path utility
 try:
     from utils.paths import get_real_user_home
@@ -245,7 +257,12 @@ class UnifiedNodeTracker:
         """Get the cache file path (evaluated at runtime, not import time)"""
         return get_real_user_home() / ".config" / "meshforge" / "node_cache.json"
 
-    def __init__(self):
+    def __init__(self, telemetry_history: bool = False):
+        """
+        Args:
+            telemetry_history: Record node telemetry into the shared
+                telemetry store (utils.telemetry_store) while running
+        """
         self._nodes: Dict[str, UnifiedNode] = {}
         self._lock = threading.RLock()
         self._callbacks: List[Callable] = []
@@ -254,16 +271,42 @@ class UnifiedNodeTracker:
         self._rns_thread = None
         self._reticulum = None
         self._rns_connected = False
+        self._telemetry_store = None
+        self._telemetry_history = telemetry_history
 
         # Load cached nodes
         self._load_cache()
 
+        metrics = get_metrics()
+        if metrics:
+            for network in ('meshtastic', 'rns'):
+                metrics.gauge_fn('meshforge_tracker_nodes',
+                                 lambda t, key=network: t.get_stats()[key],
+                                 'Tracked nodes by network', owner=self, network=network)
+            metrics.gauge_fn('meshforge_tracker_nodes_online',
+                             lambda t: t.get_stats()['online'],
+                             'Tracked nodes currently online', owner=self)
+            self._updates_counter = metrics.counter(
+                'meshforge_tracker_updates', 'Node add/update operations')
+        else:
+            self._updates_counter = None
+
     def start(self):
         """Start the node tracker"""
         self._running = True
         self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
         self._cleanup_thread.start()
 
+        # Keep telemetry history while running (opt-in: the store is process-global)
+        if (self._telemetry_history and TELEMETRY_STORE_AVAILABLE
+                and self._telemetry_store is None):
+            try:
+                store = get_telemetry_store()
+                store.start()
+                self.attach_telemetry_store(store)
+            except Exception as e:
+                logger.warning(f"Telemetry history disabled: {e}")
+
         # Initialize RNS in the main thread to avoid signal handler issues
         # RNS.Reticulum() sets up signal handlers which only work in main thread
         self._init_rns_main_thread()
@@ -367,6 +410,11 @@ class UnifiedNodeTracker:
                 logger.warning("RNS thread did not stop in time")
 
         self._save_cache()
+        if self._telemetry_store:
+            self._telemetry_store.flush()
+        metrics = get_metrics()
+        if metrics:
+            metrics.unregister_owner(self)
         logger.info("Node tracker stopped")
 
     def add_node(self, node: UnifiedNode):
@@ -381,6 +429,99 @@ class UnifiedNodeTracker:
                 logger.debug(f"Added new node: {node.id} ({node.name})")
 
             self._notify_callbacks("update", node)
+        self._record_telemetry(node)
+        if self._updates_counter:
+            self._updates_counter.inc()
+
+    def touch_meshtastic(self, meshtastic_id: str, snr: Optional[float] = None,
+                         hops: Optional[int] = None, rssi: Optional[int] = None):
+        """Mark a Meshtastic node heard (per-packet fast path).
+
+        Known nodes are updated in place - no UnifiedNode is built and
+        merged for every received packet. Unknown nodes go through
+        add_node() as before.
+        """
+        with self._lock:
+            existing = self._nodes.get(f"mesh_{meshtastic_id}")
+            if existing is not None:
+                if snr is not None:
+                    existing.snr = snr
+                if rssi is not None:
+                    existing.rssi = rssi
+                if hops is not None:
+                    existing.hops = hops
+                existing.update_seen()
+                self._notify_callbacks("update", existing)
+        if existing is None:
+            try:
+                num = int(meshtastic_id[1:], 16)
+            except ValueError:
+                return
+            self.add_node(UnifiedNode.from_meshtastic(
+                {'num': num, 'snr': snr, 'hopsAway': hops}))
+            return
+
+        store = self._telemetry_store
+        if store is not None and (snr is not None or rssi is not None):
+            try:
+                store.record(meshtastic_id, {'snr': snr, 'rssi': rssi})
+            except Exception as e:
+                logger.debug(f"Telemetry record failed for {meshtastic_id}: {e}")
+        if self._updates_counter:
+            self._updates_counter.inc()
+
+    def add_nodes(self, nodes: List[UnifiedNode]) -> int:
+        """Add or update many nodes under a single lock acquisition.
+
+        Used by high-rate feeds (e.g. MQTT ingest) to avoid per-node lock
+        churn. Callbacks are still notified once per node.
+
+        Returns:
+            Number of nodes that were new to the tracker
+        """
+        added = 0
+        with self._lock:
+            for node in nodes:
+                existing = self._nodes.get(node.id)
+                if existing:
+                    self._merge_node(existing, node)
+                else:
+                    self._nodes[node.id] = node
+                    added += 1
+                self._notify_callbacks("update", node)
+        if self._telemetry_store:
+            for node in nodes:
+                self._record_telemetry(node)
+        if self._updates_counter:
+            self._updates_counter.inc(len(nodes))
+        return added
+
+    def attach_telemetry_store(self, store):
+        """Record node telemetry and link metrics into store (None to stop)"""
+        self._telemetry_store = store
+
+    def _record_telemetry(self, node: UnifiedNode):
+        """Append a node update's telemetry and SNR/RSSI to the history store"""
+        store = self._telemetry_store
+        if store is None:
+            return
+        telemetry = node.telemetry
+        values = {
+            'battery_level': telemetry.battery_level,
+            'voltage': telemetry.voltage,
+            'temperature': telemetry.temperature,
+            'humidity': telemetry.humidity,
+            'pressure': telemetry.pressure,
+            'air_quality': telemetry.air_quality,
+            'snr': node.snr,
+            'rssi': node.rssi,
+        }
+        when = telemetry.timestamp or node.last_seen
+        try:
+            store.record(node.meshtastic_id or node.id, values,
+                         when.timestamp() if when else None)
+        except Exception as e:
+            logger.debug(f"Telemetry record failed for {node.id}: {e}")
 
     def remove_node(self, node_id: str):
         """Remove a node"""
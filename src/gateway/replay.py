@@ -0,0 +1,832 @@
+"""
+Gateway Traffic Capture and Replay Benchmark
+
+Records live Meshtastic/LXMF traffic seen by RNSMeshtasticBridge and
+RNSMeshtasticTransport, and replays recorded or synthetic streams
+through the real pipeline code with stub Meshtastic/RNS endpoints:
+
+    bridge:    _on_meshtastic_receive -> classifier -> queue -> send_to_rns
+               _on_lxmf_receive -> classifier -> queue -> sendText
+    transport: send_packet -> fragment -> sendData -> _on_meshtastic_receive
+               -> reassembly -> packet callback
+    receive:   one Meshtastic packet stream -> the bridge, transport and
+               NodeMonitor receive handlers (per-handler packets/sec)
+
+Capture format (JSON lines):
+    {"format": "meshforge-capture", "version": 1, "created": "..."}
+    {"t": 0.0123, "source": "meshtastic", "packet": {...}}
+
+Bytes values are stored as {"__bytes__": "<base64>"}; values that are not
+JSON-serializable (e.g. the protobuf 'raw' packet) are dropped.
+
+Usage:
+    recorder = PacketRecorder("/tmp/mesh.capture")
+    bridge.set_recorder(recorder)
+    ...
+    report = replay_bridge(load_capture("/tmp/mesh.capture"), rate=200)
+    print(report.format())
+
+    python3 -m gateway.replay --synthetic 5000 --target transport
+    python3 -m gateway.replay --synthetic 50000 --target receive --private-ratio 0.2
+"""
+
+import base64
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional, List, Dict, Any, Iterable
+
+from .config import GatewayConfig, RNSOverMeshtasticConfig
+from .rns_bridge import RNSMeshtasticBridge
+from .rns_transport import RNSMeshtasticTransport
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FORMAT = "meshforge-capture"
+CAPTURE_VERSION = 1
+
+
+# ============================================================================
+# Capture Format
+# ============================================================================
+
+@dataclass
+class CaptureRecord:
+    """A single captured packet"""
+    t: float          # Seconds since capture start
+    source: str       # "meshtastic", "lxmf" or "transport"
+    packet: Dict[str, Any]
+
+
+_SKIP = object()
+
+
+def _encode(value):
+    """Make a packet JSON-safe (bytes -> base64 marker)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode('ascii')}
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            encoded = _encode(v)
+            if encoded is not _SKIP:
+                out[str(k)] = encoded
+        return out
+    if isinstance(value, (list, tuple)):
+        return [e for e in (_encode(v) for v in value) if e is not _SKIP]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return _SKIP
+
+
+def _decode(value):
+    """Reverse of _encode()"""
+    if isinstance(value, dict):
+        if len(value) == 1 and "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class PacketRecorder:
+    """
+    Append-only capture writer.
+
+    Thread-safe; attach with bridge.set_recorder() or
+    transport.set_recorder(). Writes are line-buffered so a capture
+    survives an unclean gateway shutdown.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._file = open(self.path, 'w', buffering=1)
+        self._file.write(json.dumps({
+            "format": CAPTURE_FORMAT,
+            "version": CAPTURE_VERSION,
+            "created": datetime.now().isoformat(),
+        }) + "\n")
+        self.count = 0
+
+    def record(self, source: str, packet: Dict[str, Any]):
+        """Record one received packet"""
+        line = json.dumps({
+            "t": round(time.monotonic() - self._start, 6),
+            "source": source,
+            "packet": _encode(packet),
+        })
+        with self._lock:
+            if self._file:
+                self._file.write(line + "\n")
+                self.count += 1
+
+    def close(self):
+        """Flush and close the capture file"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_capture(path) -> List[CaptureRecord]:
+    """Load a capture file written by PacketRecorder"""
+    records = []
+    with open(path, 'r') as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != CAPTURE_FORMAT:
+            raise ValueError(f"Not a MeshForge capture: {path}")
+        if header.get("version", 0) > CAPTURE_VERSION:
+            raise ValueError(f"Unsupported capture version: {header.get('version')}")
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            records.append(CaptureRecord(
+                t=data["t"],
+                source=data["source"],
+                packet=_decode(data["packet"]),
+            ))
+    return records
+
+
+# ============================================================================
+# Synthetic Streams
+# ============================================================================
+
+def synthetic_mesh_stream(count: int, nodes: int = 50, text_ratio: float = 0.3,
+                          seed: int = 1, private_ratio: float = 0.0) -> List[CaptureRecord]:
+    """
+    Generate a Meshtastic receive stream resembling a busy channel.
+
+    Mix: text_ratio text messages, private_ratio PRIVATE_APP (RNS)
+    fragments, the rest split between position, telemetry and nodeinfo
+    packets from `nodes` distinct senders. Non-text packets carry the
+    decoded sections the meshtastic library would add.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        node_num = 0x10000000 + rng.randrange(nodes)
+        packet = {
+            'id': i + 1,
+            'from': node_num,
+            'fromId': f"!{node_num:08x}",
+            'toId': '!ffffffff',
+            'channel': 0,
+            'rxSnr': round(rng.uniform(-15, 10), 2),
+            'rxRssi': rng.randrange(-125, -60),
+            'hopStart': 3,
+            'hopLimit': rng.randrange(0, 4),
+        }
+        roll = rng.random()
+        if roll < text_ratio:
+            packet['decoded'] = {
+                'portnum': 'TEXT_MESSAGE_APP',
+                'payload': f"msg {i} from {node_num:08x}".encode(),
+            }
+        elif roll < text_ratio + private_ratio:
+            packet['decoded'] = {
+                'portnum': 'PRIVATE_APP',
+                'payload': bytes(rng.getrandbits(8) for _ in range(200)),
+            }
+        else:
+            portnum = rng.choice(['POSITION_APP', 'TELEMETRY_APP', 'NODEINFO_APP'])
+            decoded = {
+                'portnum': portnum,
+                'payload': bytes(rng.getrandbits(8) for _ in range(24)),
+            }
+            if portnum == 'POSITION_APP':
+                lat_i = 213000000 + rng.randrange(-500000, 500000)
+                lon_i = -1578000000 + rng.randrange(-500000, 500000)
+                decoded['position'] = {
+                    'latitudeI': lat_i, 'longitudeI': lon_i,
+                    'latitude': lat_i / 1e7, 'longitude': lon_i / 1e7,
+                    'altitude': rng.randrange(0, 500), 'time': 1700000000 + i,
+                }
+            elif portnum == 'TELEMETRY_APP':
+                if rng.random() < 0.7:
+                    decoded['telemetry'] = {'deviceMetrics': {
+                        'batteryLevel': rng.randrange(0, 101),
+                        'voltage': round(rng.uniform(3.3, 4.2), 3),
+                        'channelUtilization': round(rng.uniform(0, 40), 2),
+                        'airUtilTx': round(rng.uniform(0, 5), 2),
+                    }}
+                else:
+                    decoded['telemetry'] = {'environmentMetrics': {
+                        'temperature': round(rng.uniform(10, 35), 1),
+                        'relativeHumidity': round(rng.uniform(20, 90), 1),
+                        'barometricPressure': round(rng.uniform(990, 1030), 1),
+                    }}
+            else:
+                decoded['user'] = {
+                    'id': f"!{node_num:08x}",
+                    'longName': f"Node {node_num & 0xffff:04x}",
+                    'shortName': f"{node_num & 0xffff:04x}",
+                    'hwModel': 'HELTEC_V3',
+                }
+            packet['decoded'] = decoded
+        records.append(CaptureRecord(t=i * 0.01, source='meshtastic', packet=packet))
+    return records
+
+
+def synthetic_lxmf_stream(count: int, seed: int = 1) -> List[CaptureRecord]:
+    """Generate LXMF deliveries for the RNS -> Meshtastic direction"""
+    rng = random.Random(seed)
+    return [
+        CaptureRecord(t=i * 0.01, source='lxmf', packet={
+            'source_hash': bytes(rng.getrandbits(8) for _ in range(16)),
+            'content': f"lxmf {i}",
+            'title': '',
+        })
+        for i in range(count)
+    ]
+
+
+def synthetic_rns_packets(count: int, min_size: int = 40, max_size: int = 500,
+                          seed: int = 1) -> List[bytes]:
+    """Generate RNS packets (unique leading bytes so fragment ids differ)"""
+    rng = random.Random(seed)
+    packets = []
+    for i in range(count):
+        size = rng.randint(min_size, max_size)
+        body = bytes(rng.getrandbits(8) for _ in range(max(0, size - 8)))
+        packets.append(i.to_bytes(8, 'big') + body)
+    return packets
+
+
+# ============================================================================
+# Stub Endpoints
+# ============================================================================
+
+class StubMeshInterface:
+    """Stand-in for meshtastic TCPInterface (records sends)"""
+
+    def __init__(self, on_send_data=None):
+        self.nodes: Dict[str, dict] = {}
+        self.sent_text: List[tuple] = []
+        self.sent_data = 0
+        self._on_send_data = on_send_data
+
+    def sendText(self, text, destinationId=None, channelIndex=0, **kwargs):
+        self.sent_text.append((text, destinationId, channelIndex))
+
+    def sendData(self, data, destinationId=None, portNum=256, hopLimit=3, **kwargs):
+        self.sent_data += 1
+        if self._on_send_data:
+            self._on_send_data(data, destinationId, portNum)
+
+    def getMyNodeInfo(self):
+        return {'num': 0}
+
+    def close(self):
+        pass
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+@dataclass
+class ReplayReport:
+    """Result of one replay run"""
+    name: str
+    injected: int = 0
+    completed: int = 0
+    duration_sec: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+    peak_memory_kb: Optional[float] = None
+    rss_kb: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def msgs_per_sec(self) -> float:
+        if self.duration_sec <= 0:
+            return 0.0
+        return self.injected / self.duration_sec
+
+    @property
+    def p50_ms(self) -> float:
+        return _percentile(sorted(self.latencies_ms), 50)
+
+    @property
+    def p99_ms(self) -> float:
+        return _percentile(sorted(self.latencies_ms), 99)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            'name': self.name,
+            'injected': self.injected,
+            'completed': self.completed,
+            'duration_sec': round(self.duration_sec, 4),
+            'msgs_per_sec': round(self.msgs_per_sec, 1),
+            'latency_p50_ms': round(_percentile(latencies, 50), 3),
+            'latency_p99_ms': round(_percentile(latencies, 99), 3),
+            'latency_max_ms': round(latencies[-1], 3) if latencies else 0.0,
+            'latency_mean_ms': round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            'peak_memory_kb': self.peak_memory_kb,
+            'rss_kb': self.rss_kb,
+            **self.extra,
+        }
+
+    def format(self) -> str:
+        d = self.to_dict()
+        lines = [
+            f"{self.name}: {d['injected']} injected, {d['completed']} completed "
+            f"in {d['duration_sec']:.3f}s ({d['msgs_per_sec']:.0f} msg/s)",
+            f"  latency p50={d['latency_p50_ms']:.3f}ms p99={d['latency_p99_ms']:.3f}ms "
+            f"max={d['latency_max_ms']:.3f}ms",
+        ]
+        if self.peak_memory_kb is not None:
+            lines.append(f"  peak traced memory={self.peak_memory_kb:.0f} KiB rss={self.rss_kb} KiB")
+        return "\n".join(lines)
+
+
+def _rss_kb() -> Optional[int]:
+    """Current resident set size from /proc (Linux only)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class _Pacer:
+    """Inject at a fixed rate, at recorded timing, or flat out"""
+
+    def __init__(self, rate: Optional[float], speed: Optional[float]):
+        self.rate = rate
+        self.speed = speed
+        self.start = time.perf_counter()
+
+    def wait(self, index: int, record_t: float):
+        if self.rate:
+            target = self.start + index / self.rate
+        elif self.speed:
+            target = self.start + record_t / self.speed
+        else:
+            return
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _wait_until(predicate, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return predicate()
+
+
+# ============================================================================
+# Replay Drivers
+# ============================================================================
+
+def make_bench_bridge(config: Optional[GatewayConfig] = None) -> RNSMeshtasticBridge:
+    """
+    Build an RNSMeshtasticBridge wired to stub endpoints.
+
+    Only the bridge loop thread is run by replay_bridge(); meshtasticd,
+    rnsd and the LXMF router are never touched and the node cache is
+    never written.
+    """
+    if config is None:
+        config = GatewayConfig(enabled=True)
+        config.routing_rules = config.get_default_rules()
+    bridge = RNSMeshtasticBridge(config)
+    bridge.node_tracker._nodes.clear()
+    bridge._mesh_interface = StubMeshInterface()
+    bridge._connected_mesh = True
+    bridge._connected_rns = True
+    bridge.send_to_rns = lambda message, destination_hash=None: True
+    return bridge
+
+
+def replay_bridge(records: Iterable[CaptureRecord], rate: Optional[float] = None,
+                  speed: Optional[float] = None, trace_memory: bool = False,
+                  drain_timeout: float = 30.0,
+                  bridge: Optional[RNSMeshtasticBridge] = None) -> ReplayReport:
+    """
+    Replay traffic through the gateway bridge pipeline.
+
+    Latency is measured from receive-handler entry until the bridge loop
+    has handed the message to the stub endpoint (send_to_rns for mesh
+    traffic, sendText for LXMF traffic). Packets that are not bridged
+    (position, telemetry, dropped by routing) count toward msg/s but
+    produce no latency sample.
+
+    Args:
+        records: Capture records ("meshtastic" and/or "lxmf")
+        rate: Inject at this many msgs/sec (None = as fast as possible)
+        speed: Replay at recorded timing scaled by this factor
+        trace_memory: Track peak Python allocations with tracemalloc
+        drain_timeout: Seconds to wait for the bridge queues to drain
+        bridge: Pre-built bridge (default make_bench_bridge())
+    """
+    records = list(records)
+    bridge = bridge or make_bench_bridge()
+    report = ReplayReport(name="bridge")
+
+    lock = threading.Lock()
+    inject_times: Dict[tuple, float] = {}
+    counters = {'queued': 0, 'processed': 0}
+    latencies = report.latencies_ms
+
+    def complete(key):
+        done = time.perf_counter()
+        with lock:
+            counters['processed'] += 1
+            started = inject_times.pop(key, None)
+        if started is not None:
+            latencies.append((done - started) * 1000.0)
+
+    original_should_bridge = bridge._should_bridge
+    original_mesh_to_rns = bridge._process_mesh_to_rns
+    original_rns_to_mesh = bridge._process_rns_to_mesh
+
+    def should_bridge(msg):
+        result = original_should_bridge(msg)
+        if result:
+            with lock:
+                counters['queued'] += 1
+        return result
+
+    def process_mesh_to_rns(msg):
+        try:
+            original_mesh_to_rns(msg)
+        finally:
+            complete(('m', msg.metadata.get('packet_id')))
+
+    def process_rns_to_mesh(msg):
+        try:
+            original_rns_to_mesh(msg)
+        finally:
+            # replay_bridge passes its record index as the LXMF stamp
+            complete(('r', msg.metadata.get('lxmf_stamp')))
+
+    bridge._should_bridge = should_bridge
+    bridge._process_mesh_to_rns = process_mesh_to_rns
+    bridge._process_rns_to_mesh = process_rns_to_mesh
+
+    bridge._running = True
+    loop = threading.Thread(target=bridge._bridge_loop, daemon=True, name="ReplayBridge")
+    loop.start()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    pacer = _Pacer(rate, speed)
+    start = time.perf_counter()
+    try:
+        for i, record in enumerate(records):
+            pacer.wait(i, record.t)
+            if record.source == 'meshtastic':
+                key = ('m', record.packet.get('id'))
+                handler, arg = bridge._on_meshtastic_receive, record.packet
+            elif record.source == 'lxmf':
+                key = ('r', i)
+                handler, arg = bridge._on_lxmf_receive, SimpleNamespace(stamp=i, **record.packet)
+            else:
+                continue
+
+            with lock:
+                queued_before = counters['queued']
+                inject_times[key] = time.perf_counter()
+            handler(arg)
+            with lock:
+                if counters['queued'] == queued_before:
+                    inject_times.pop(key, None)
+            report.injected += 1
+
+        drained = _wait_until(lambda: counters['processed'] >= counters['queued'], drain_timeout)
+        report.duration_sec = time.perf_counter() - start
+        if not drained:
+            logger.warning(f"Bridge did not drain in {drain_timeout}s "
+                           f"({counters['processed']}/{counters['queued']})")
+    finally:
+        bridge._running = False
+        bridge._queue_event.set()
+        loop.join(timeout=2)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.peak_memory_kb = round(peak / 1024.0, 1)
+
+    report.completed = len(latencies)
+    report.rss_kb = _rss_kb()
+    report.extra = {
+        'queued': counters['queued'],
+        'bridged_mesh_to_rns': bridge.stats['messages_mesh_to_rns'],
+        'bridged_rns_to_mesh': bridge.stats['messages_rns_to_mesh'],
+        'bounced': bridge.stats['bounced'],
+        'errors': bridge.stats['errors'],
+        'nodes_tracked': len(bridge.node_tracker.get_all_nodes()),
+    }
+    return report
+
+
+def make_bench_transport(config: Optional[RNSOverMeshtasticConfig] = None,
+                         fragment_delay: float = 0.0,
+                         loopback: bool = True) -> RNSMeshtasticTransport:
+    """
+    Build an RNSMeshtasticTransport wired to a stub Meshtastic interface.
+
+    With loopback, every fragment passed to sendData() is delivered back
+    through _on_meshtastic_receive(), exercising fragmentation and
+    reassembly end to end. fragment_delay replaces the speed-preset
+    inter-fragment sleep (0 = measure CPU cost only).
+    """
+    transport = RNSMeshtasticTransport(config or RNSOverMeshtasticConfig(enabled=True))
+    transport._fragment_delay = fragment_delay
+
+    def deliver(data, destination, port):
+        transport._on_meshtastic_receive({
+            'decoded': {'portnum': 'PRIVATE_APP', 'payload': data},
+        })
+
+    stub = StubMeshInterface(on_send_data=deliver if loopback else None)
+
+    def connect():
+        transport._interface = stub
+        transport._connected = True
+        return True
+
+    transport._connect = connect
+    return transport
+
+
+def _stop_bench_transport(transport: RNSMeshtasticTransport):
+    """Stop worker threads without waiting on the 5 s cleanup sleep"""
+    transport._running = False
+    for thread in (transport._send_thread, transport._receive_thread):
+        if thread and thread.is_alive():
+            thread.join(timeout=2)
+
+
+def replay_transport(packets: Iterable[bytes], rate: Optional[float] = None,
+                     trace_memory: bool = False, drain_timeout: float = 30.0,
+                     transport: Optional[RNSMeshtasticTransport] = None) -> ReplayReport:
+    """
+    Push RNS packets through fragment -> stub radio -> reassembly.
+
+    Latency is send_packet() to reassembled-packet callback.
+    """
+    packets = list(packets)
+    transport = transport or make_bench_transport()
+    report = ReplayReport(name="transport")
+
+    lock = threading.Lock()
+    inject_times: Dict[bytes, float] = {}
+    latencies = report.latencies_ms
+
+    def on_packet(packet):
+        done = time.perf_counter()
+        with lock:
+            started = inject_times.pop(transport._generate_packet_id(packet), None)
+        if started is not None:
+            latencies.append((done - started) * 1000.0)
+
+    transport.register_packet_callback(on_packet)
+    transport.start()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    pacer = _Pacer(rate, None)
+    start = time.perf_counter()
+    try:
+        for i, packet in enumerate(packets):
+            pacer.wait(i, 0.0)
+            with lock:
+                inject_times[transport._generate_packet_id(packet)] = time.perf_counter()
+            transport.send_packet(packet)
+            report.injected += 1
+
+        _wait_until(lambda: len(latencies) >= report.injected, drain_timeout)
+        report.duration_sec = time.perf_counter() - start
+    finally:
+        _stop_bench_transport(transport)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.peak_memory_kb = round(peak / 1024.0, 1)
+
+    report.completed = len(latencies)
+    report.rss_kb = _rss_kb()
+    report.extra = {
+        'fragments_sent': transport.stats.fragments_sent,
+        'fragments_received': transport.stats.fragments_received,
+        'reassembly_successes': transport.stats.reassembly_successes,
+        'pending_at_end': len(transport._pending_packets),
+    }
+    return report
+
+
+def replay_transport_capture(records: Iterable[CaptureRecord], rate: Optional[float] = None,
+                             speed: Optional[float] = None, trace_memory: bool = False,
+                             drain_timeout: float = 30.0) -> ReplayReport:
+    """
+    Replay recorded PRIVATE_APP fragments into transport reassembly.
+
+    Latency is first fragment received to reassembled-packet callback.
+    """
+    records = [r for r in records if r.source == 'transport']
+    transport = make_bench_transport(loopback=False)
+    report = ReplayReport(name="transport-capture")
+
+    lock = threading.Lock()
+    first_seen: Dict[bytes, float] = {}
+    latencies = report.latencies_ms
+
+    def on_packet(packet):
+        done = time.perf_counter()
+        with lock:
+            started = first_seen.pop(transport._generate_packet_id(packet), None)
+        if started is not None:
+            latencies.append((done - started) * 1000.0)
+
+    transport.register_packet_callback(on_packet)
+    transport.start()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    pacer = _Pacer(rate, speed)
+    start = time.perf_counter()
+    try:
+        for i, record in enumerate(records):
+            pacer.wait(i, record.t)
+            payload = record.packet.get('decoded', {}).get('payload')
+            if isinstance(payload, str):
+                payload = payload.encode('latin-1')
+            if isinstance(payload, bytes) and len(payload) >= 4:
+                with lock:
+                    first_seen.setdefault(payload[:4], time.perf_counter())
+            transport._on_meshtastic_receive(record.packet)
+            report.injected += 1
+
+        _wait_until(lambda: transport._inbound_queue.empty(), drain_timeout)
+        time.sleep(0.01)
+        report.duration_sec = time.perf_counter() - start
+    finally:
+        _stop_bench_transport(transport)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.peak_memory_kb = round(peak / 1024.0, 1)
+
+    report.completed = len(latencies)
+    report.rss_kb = _rss_kb()
+    report.extra = {
+        'fragments_received': transport.stats.fragments_received,
+        'reassembly_successes': transport.stats.reassembly_successes,
+        'pending_at_end': len(transport._pending_packets),
+    }
+    return report
+
+
+def replay_receive(records: Iterable[CaptureRecord],
+                   trace_memory: bool = False) -> ReplayReport:
+    """
+    Time the Meshtastic receive handlers on one packet stream.
+
+    Every packet is handed in turn to the bridge, the RNS transport and
+    a NodeMonitor, as a process running all three would see it. Nothing
+    is connected or started: this is the cost of the receive callbacks
+    themselves. Latency is the time spent in all three handlers for one
+    packet; extra holds each handler's packets/sec.
+    """
+    try:
+        from monitoring.node_monitor import NodeMonitor
+    except ImportError:
+        from ..monitoring.node_monitor import NodeMonitor
+
+    packets = [r.packet for r in records if r.source in ('meshtastic', 'transport')]
+    bridge = make_bench_bridge()
+    transport = make_bench_transport(loopback=False)
+    monitor = NodeMonitor()
+    handlers = [
+        ('bridge', bridge._on_meshtastic_receive),
+        ('transport', transport._on_meshtastic_receive),
+        ('node_monitor', lambda packet: monitor._on_receive(packet, None)),
+    ]
+    spent = {name: 0.0 for name, _ in handlers}
+    report = ReplayReport(name="receive")
+    latencies = report.latencies_ms
+    clock = time.perf_counter
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = clock()
+    try:
+        for packet in packets:
+            began = t = clock()
+            for name, handler in handlers:
+                handler(packet)
+                now = clock()
+                spent[name] += now - t
+                t = now
+            latencies.append((t - began) * 1000.0)
+        report.duration_sec = clock() - start
+    finally:
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.peak_memory_kb = round(peak / 1024.0, 1)
+
+    report.injected = report.completed = len(packets)
+    report.rss_kb = _rss_kb()
+    report.extra = {
+        f'{name}_pkts_per_sec': round(len(packets) / seconds) if seconds > 0 else 0
+        for name, seconds in spent.items()
+    }
+    report.extra.update({
+        'nodes_tracked': len(bridge.node_tracker.get_all_nodes()),
+        'monitor_nodes': monitor.get_node_count(),
+        'texts_queued': bridge._mesh_to_rns_queue.qsize(),
+        'fragments_queued': transport._inbound_queue.qsize(),
+    })
+    return report
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry: python3 -m gateway.replay"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MeshForge gateway replay benchmark")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--capture', help="Capture file written by PacketRecorder")
+    source.add_argument('--synthetic', type=int, metavar='N', help="Generate N synthetic messages")
+    parser.add_argument('--target', choices=['bridge', 'transport', 'receive'], default='bridge')
+    parser.add_argument('--rate', type=float, help="Inject rate in msgs/sec (default: flat out)")
+    parser.add_argument('--speed', type=float, help="Capture timing multiplier (capture only)")
+    parser.add_argument('--private-ratio', type=float, default=0.0,
+                        help="Share of PRIVATE_APP packets in the synthetic mesh stream")
+    parser.add_argument('--memory', action='store_true', help="Trace peak Python memory")
+    parser.add_argument('--json', action='store_true', help="Print report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.target == 'receive':
+        records = (load_capture(args.capture) if args.capture else
+                   synthetic_mesh_stream(args.synthetic, private_ratio=args.private_ratio))
+        report = replay_receive(records, trace_memory=args.memory)
+    elif args.capture:
+        records = load_capture(args.capture)
+        if args.target == 'transport':
+            report = replay_transport_capture(records, rate=args.rate, speed=args.speed,
+                                              trace_memory=args.memory)
+        else:
+            report = replay_bridge(records, rate=args.rate, speed=args.speed,
+                                   trace_memory=args.memory)
+    elif args.target == 'transport':
+        report = replay_transport(synthetic_rns_packets(args.synthetic), rate=args.rate,
+                                  trace_memory=args.memory)
+    else:
+        report = replay_bridge(synthetic_mesh_stream(args.synthetic,
+                                                     private_ratio=args.private_ratio),
+                               rate=args.rate, trace_memory=args.memory)
+
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -28,8 +28,40 @@ try:
 except ImportError:
     CLASSIFIER_AVAILABLE = False
 
+try:
+    from utils.metrics import get_metrics
+except ImportError:
+    from ..utils.metrics import get_metrics
+
+# asyncio stream client (no meshtastic package, pubsub or polling thread)
+try:
+    from utils.meshtastic_client import StreamInterface
+    STREAM_CLIENT_AVAILABLE = True
+except ImportError:
+    STREAM_CLIENT_AVAILABLE = False
+
+# Received packets are decoded once and routed by portnum
+try:
+    from utils.packet_view import PacketDispatcher, PacketView
+except ImportError:
+    from ..utils.packet_view import PacketDispatcher, PacketView
+
+# Active MQTT bridge plugin feeds its node ingest into our tracker
+try:
+    from utils.plugins import get_plugin_manager
+except ImportError:
+    from ..utils.plugins import get_plugin_manager
+
 logger = logging.getLogger(__name__)
 
+# One INFO/DEBUG line per bridged message: rate limited per call site
+# so a busy mesh can't flood the log (warnings and errors always pass)
+try:
+    from utils.logging_config import rate_limit
+    rate_limit(logger, rate=2, burst=20)
+except ImportError:
+    pass
+
 # Import centralized path utility
 try:
     from utils.paths import get_real_user_home
@@ -71,7 +103,7 @@ class RNSMeshtasticBridge:
 
     def __init__(self, config: Optional[GatewayConfig] = None):
         self.config = config or GatewayConfig.load()
-        self.node_tracker = UnifiedNodeTracker()
+        self.node_tracker = UnifiedNodeTracker(telemetry_history=True)
 
         # State
         self._running = False
@@ -82,6 +114,16 @@ class RNSMeshtasticBridge:
         # Message queues
         self._mesh_to_rns_queue = Queue()
         self._rns_to_mesh_queue = Queue()
+        self._queue_event = threading.Event()  # Wakes bridge loop on put
+
+        # Optional traffic recorder (see gateway.replay.PacketRecorder)
+        self._recorder = None
+
+        # Meshtastic receive path: every packet marks its sender heard,
+        # only text is bridged
+        self._mesh_dispatcher = PacketDispatcher("Bridge")
+        self._mesh_dispatcher.register(None, self._track_mesh_sender)
+        self._mesh_dispatcher.register('TEXT_MESSAGE_APP', self._on_mesh_text)
 
         # Threads
         self._mesh_thread = None
@@ -109,6 +151,8 @@ class RNSMeshtasticBridge:
             'bounced': 0,
             'start_time': None,
         }
+        if get_metrics():
+            self._register_metrics()
 
         # Routing classifier with confidence scoring
         self._classifier = None
@@ -154,15 +198,22 @@ class RNSMeshtasticBridge:
 
         # Start node tracker
         self.node_tracker.start()
+        mqtt_plugin = get_plugin_manager().get_instance("mqtt-bridge")
+        if mqtt_plugin is not None and hasattr(mqtt_plugin, 'set_node_tracker'):
+            mqtt_plugin.set_node_tracker(self.node_tracker)
 
         # Start network threads
         if self.config.enabled:
-            self._mesh_thread = threading.Thread(
-                target=self._meshtastic_loop,
-                daemon=True,
-                name="MeshtasticBridge"
-            )
-            self._mesh_thread.start()
+            if STREAM_CLIENT_AVAILABLE:
+                # Connects and reconnects on the shared client loop
+                self._start_meshtastic_stream()
+            else:
+                self._mesh_thread = threading.Thread(
+                    target=self._meshtastic_loop,
+                    daemon=True,
+                    name="MeshtasticBridge"
+                )
+                self._mesh_thread.start()
 
             self._rns_thread = threading.Thread(
                 target=self._rns_loop,
@@ -178,6 +229,10 @@ class RNSMeshtasticBridge:
             )
             self._bridge_thread.start()
 
+        metrics = get_metrics()
+        if metrics:
+            metrics.start_exporter("gateway")
+
         logger.info("Bridge started")
         self._notify_status("started")
         return True
@@ -202,6 +257,11 @@ class RNSMeshtasticBridge:
             if thread and thread.is_alive():
                 thread.join(timeout=5)
 
+        metrics = get_metrics()
+        if metrics:
+            metrics.stop_exporter()
+            metrics.unregister_owner(self)
+
         logger.info("Bridge stopped")
         self._notify_status("stopped")
 
@@ -295,6 +355,10 @@ class RNSMeshtasticBridge:
             self.stats['errors'] += 1
             return False
 
+    def set_recorder(self, recorder) -> None:
+        """Record received Meshtastic/LXMF traffic (None to stop)"""
+        self._recorder = recorder
+
     def register_message_callback(self, callback: Callable):
         """Register callback for bridged messages"""
         self._message_callbacks.append(callback)
@@ -330,6 +394,33 @@ class RNSMeshtasticBridge:
     # Private Methods
     # ========================================
 
+    def _register_metrics(self):
+        """Expose bridge counters and queue depths in the metrics registry"""
+        metrics = get_metrics()
+        for direction in ('mesh_to_rns', 'rns_to_mesh'):
+            metrics.counter_fn(
+                'meshforge_bridge_messages',
+                lambda b, key=f'messages_{direction}': b.stats[key],
+                'Messages bridged between networks', owner=self, direction=direction)
+            metrics.gauge_fn(
+                'meshforge_bridge_queue_depth',
+                lambda b, attr=f'_{direction}_queue': getattr(b, attr).qsize(),
+                'Messages waiting in the bridge queue', owner=self, direction=direction)
+        metrics.counter_fn('meshforge_bridge_errors', lambda b: b.stats['errors'],
+                           'Bridge send/processing errors', owner=self)
+        metrics.counter_fn('meshforge_bridge_bounced', lambda b: b.stats['bounced'],
+                           'Messages bounced by the routing classifier', owner=self)
+
+    def _observe_latency(self, direction: str, msg: BridgedMessage):
+        """Record receive-to-send latency for a bridged message"""
+        metrics = get_metrics()
+        if metrics:
+            metrics.histogram(
+                'meshforge_bridge_latency_seconds',
+                'Time from message receipt to delivery on the other network',
+                direction=direction,
+            ).observe((datetime.now() - msg.timestamp).total_seconds())
+
     def _meshtastic_loop(self):
         """Main loop for Meshtastic connection"""
         while self._running:
@@ -374,20 +465,31 @@ class RNSMeshtasticBridge:
         """Main loop for message bridging"""
         while self._running:
             try:
+                processed = False
+
                 # Process Meshtastic → RNS queue
                 try:
-                    msg = self._mesh_to_rns_queue.get(timeout=0.1)
+                    msg = self._mesh_to_rns_queue.get_nowait()
                     self._process_mesh_to_rns(msg)
+                    processed = True
                 except Empty:
                     pass
 
                 # Process RNS → Meshtastic queue
                 try:
-                    msg = self._rns_to_mesh_queue.get(timeout=0.1)
+                    msg = self._rns_to_mesh_queue.get_nowait()
                     self._process_rns_to_mesh(msg)
+                    processed = True
                 except Empty:
                     pass
 
+                # Idle: sleep until either side queues a message.
+                # (Blocking on each queue in turn capped one-way
+                # throughput at ~10 msg/s.)
+                if not processed:
+                    self._queue_event.wait(timeout=0.1)
+                    self._queue_event.clear()
+
             except Exception as e:
                 logger.error(f"Bridge loop error: {e}")
                 time.sleep(1)
@@ -428,6 +530,29 @@ class RNSMeshtasticBridge:
             logger.error(f"Failed to connect to Meshtastic: {e}")
             self._connected_mesh = False
 
+    def _start_meshtastic_stream(self):
+        """Connect via the asyncio stream client, which keeps reconnecting"""
+        host = self.config.meshtastic.host
+        port = self.config.meshtastic.port
+        logger.info(f"Connecting to Meshtastic at {host}:{port}")
+        self._mesh_interface = StreamInterface(
+            host, port,
+            on_receive=self._on_meshtastic_receive,
+            on_connection=self._on_meshtastic_connection,
+        )
+        self._mesh_interface.start()
+
+    def _on_meshtastic_connection(self, connected: bool):
+        """Stream client connected (config loaded) or lost the connection"""
+        self._connected_mesh = connected
+        if connected:
+            self._update_meshtastic_nodes()
+            logger.info("Connected to Meshtastic")
+            self._notify_status("meshtastic_connected")
+        else:
+            logger.warning("Meshtastic connection lost, reconnecting")
+            self._notify_status("meshtastic_disconnected")
+
     def _disconnect_meshtastic(self):
         """Disconnect from Meshtastic"""
         if self._mesh_interface:
@@ -559,52 +684,54 @@ class RNSMeshtasticBridge:
 
     def _on_meshtastic_receive(self, packet: dict):
         """Handle incoming Meshtastic message"""
-        try:
-            decoded = packet.get('decoded', {})
-            portnum = decoded.get('portnum')
-
-            # Update node info
-            from_id = packet.get('fromId')
-            if from_id:
-                node = UnifiedNode.from_meshtastic({
-                    'num': int(from_id[1:], 16) if from_id.startswith('!') else 0,
-                    'snr': packet.get('rxSnr'),
-                    'hopsAway': packet.get('hopStart', 0) - packet.get('hopLimit', 0),
-                })
-                self.node_tracker.add_node(node)
-
-            # Handle text messages
-            if portnum == 'TEXT_MESSAGE_APP':
-                payload = decoded.get('payload', b'')
-                if isinstance(payload, bytes):
-                    text = payload.decode('utf-8', errors='ignore')
-                else:
-                    text = str(payload)
-
-                msg = BridgedMessage(
-                    source_network="meshtastic",
-                    source_id=from_id,
-                    destination_id=packet.get('toId'),
-                    content=text,
-                    is_broadcast=packet.get('toId') == '!ffffffff',
-                    metadata={
-                        'channel': packet.get('channel', 0),
-                        'snr': packet.get('rxSnr'),
-                    }
-                )
-
-                # Queue for bridging if enabled
-                if self._should_bridge(msg):
-                    self._mesh_to_rns_queue.put(msg)
+        if self._recorder:
+            try:
+                self._recorder.record('meshtastic', packet)
+            except Exception as e:
+                logger.debug(f"Packet recorder error: {e}")
+        self._mesh_dispatcher.dispatch(packet)
+
+    def _track_mesh_sender(self, view: PacketView):
+        """Update node info for the sender of any packet"""
+        from_id = view.from_id
+        if from_id and from_id[0] == '!':
+            self.node_tracker.touch_meshtastic(from_id, snr=view.snr,
+                                               hops=view.hops_away, rssi=view.rssi)
+
+    def _on_mesh_text(self, view: PacketView):
+        """Handle text messages"""
+        msg = BridgedMessage(
+            source_network="meshtastic",
+            source_id=view.from_id,
+            destination_id=view.to_id,
+            content=view.text,
+            is_broadcast=view.is_broadcast,
+            metadata={
+                'channel': view.channel,
+                'snr': view.snr,
+                'packet_id': view.packet_id,
+            }
+        )
 
-                # Notify callbacks
-                self._notify_message(msg)
+        # Queue for bridging if enabled
+        if self._should_bridge(msg):
+            self._mesh_to_rns_queue.put(msg)
+            self._queue_event.set()
 
-        except Exception as e:
-            logger.error(f"Error processing Meshtastic message: {e}")
+        # Notify callbacks
+        self._notify_message(msg)
 
     def _on_lxmf_receive(self, message):
         """Handle incoming LXMF message"""
+        if self._recorder:
+            try:
+                self._recorder.record('lxmf', {
+                    'source_hash': message.source_hash,
+                    'content': message.content,
+                    'title': message.title,
+                })
+            except Exception as e:
+                logger.debug(f"Packet recorder error: {e}")
         try:
             # Update node info
             source_hash = message.source_hash
@@ -625,6 +752,7 @@ class RNSMeshtasticBridge:
             # Queue for bridging if enabled
             if self._should_bridge(msg):
                 self._rns_to_mesh_queue.put(msg)
+                self._queue_event.set()
 
             # Notify callbacks
             self._notify_message(msg)
@@ -637,7 +765,7 @@ class RNSMeshtasticBridge:
         try:
             node = UnifiedNode.from_rns(dest_hash, app_data=app_data)
             self.node_tracker.add_node(node)
-            logger.debug(f"Discovered RNS node: {dest_hash.hex()[:8]}")
+            logger.debug("Discovered RNS node: %.8s", dest_hash.hex())
         except Exception as e:
             logger.error(f"Error processing RNS announce: {e}")
 
@@ -679,8 +807,8 @@ class RNSMeshtasticBridge:
         if result.bounced:
             self.stats['bounced'] += 1
             logger.info(
-                f"Message bounced (confidence {result.confidence:.2f}): "
-                f"{msg.source_id[:8]}... -> {result.bounce_reason}"
+                "Message bounced (confidence %.2f): %.8s... -> %s",
+                result.confidence, msg.source_id, result.bounce_reason
             )
             # Bounced messages go to queue category, don't bridge immediately
             return result.category == RoutingCategory.QUEUE.value
@@ -688,8 +816,8 @@ class RNSMeshtasticBridge:
         # Log classification decision
         if result.confidence < 0.7:
             logger.debug(
-                f"Routing decision (confidence {result.confidence:.2f}): "
-                f"{result.category} - {result.reason}"
+                "Routing decision (confidence %.2f): %s - %s",
+                result.confidence, result.category, result.reason
             )
 
         # Determine if we should bridge based on category
@@ -794,12 +922,13 @@ class RNSMeshtasticBridge:
                 destination_hash = self._get_rns_destination(msg.destination_id)
 
             if self.send_to_rns(content, destination_hash):
-                logger.info(f"Bridge Mesh→RNS: {content[:50]}...")
+                logger.info("Bridge Mesh→RNS: %.50s...", content)
                 self.stats['messages_mesh_to_rns'] += 1
+                self._observe_latency('mesh_to_rns', msg)
             else:
                 # Log but don't count as error for broadcasts (expected behavior)
                 if msg.is_broadcast:
-                    logger.debug(f"Mesh→RNS broadcast not sent (no propagation node): {content[:30]}...")
+                    logger.debug("Mesh→RNS broadcast not sent (no propagation node): %.30s...", content)
                 else:
                     logger.warning(f"Failed to bridge Mesh→RNS: {content[:30]}...")
                     self.stats['errors'] += 1
@@ -824,8 +953,9 @@ class RNSMeshtasticBridge:
             content = prefix + msg.content
 
             if self.send_to_meshtastic(content, channel=self.config.meshtastic.channel):
-                logger.info(f"Bridge RNS→Mesh: {content[:50]}...")
+                logger.info("Bridge RNS→Mesh: %.50s...", content)
                 self.stats['messages_rns_to_mesh'] += 1
+                self._observe_latency('rns_to_mesh', msg)
             else:
                 logger.warning("Failed to bridge RNS→Mesh")
                 self.stats['errors'] += 1
@@ -23,6 +23,25 @@ from collections import defaultdict
 
 from .config import RNSOverMeshtasticConfig
 
+try:
+    from utils.metrics import get_metrics
+except ImportError:
+    from ..utils.metrics import get_metrics
+
+# asyncio stream client (TCP always; serial with pyserial-asyncio)
+try:
+    from utils.meshtastic_client import StreamInterface, SERIAL_ASYNC_AVAILABLE
+    STREAM_CLIENT_AVAILABLE = True
+except ImportError:
+    STREAM_CLIENT_AVAILABLE = False
+    SERIAL_ASYNC_AVAILABLE = False
+
+# Received packets are decoded once and routed by portnum
+try:
+    from utils.packet_view import PacketDispatcher, PacketView
+except ImportError:
+    from ..utils.packet_view import PacketDispatcher, PacketView
+
 logger = logging.getLogger(__name__)
 
 
@@ -132,7 +151,13 @@ class TransportStats:
     latency_samples: List[float] = field(default_factory=list)
 
     def record_latency(self, latency_ms: float):
-        """Record a latency sample"""
+        """Record a latency sample (also fed to the latency histogram)"""
+        metrics = get_metrics()
+        if metrics:
+            metrics.histogram(
+                'meshforge_transport_latency_seconds',
+                'RNS-over-Meshtastic round-trip latency',
+            ).observe(latency_ms / 1000.0)
         self.latency_samples.append(latency_ms)
         # Keep last 100 samples
         if len(self.latency_samples) > 100:
@@ -195,6 +220,7 @@ class RNSMeshtasticTransport:
 
         # State
         self._running = False
+        self._stop_event = threading.Event()  # Wakes the cleanup loop on stop()
         self._connected = False
         self._interface = None
 
@@ -218,8 +244,21 @@ class RNSMeshtasticTransport:
         self._packet_callbacks: List[Callable[[bytes], None]] = []
         self._status_callbacks: List[Callable[[str, dict], None]] = []
 
-        # Speed preset delay (seconds between fragments)
-        self._fragment_delay = self.config.get_throughput_estimate()['delay']
+        # Speed preset delay (seconds between fragments), never shorter
+        # than a full fragment takes on air
+        throughput = self.config.get_throughput_estimate(MAX_FRAGMENT_SIZE)
+        self._fragment_delay = max(throughput['delay'], throughput.get('fragment_airtime', 0))
+
+        # Optional traffic recorder (see gateway.replay.PacketRecorder)
+        self._recorder = None
+
+        # Only private app packets (port 256) carry RNS; other ports
+        # are dropped after a portnum lookup
+        self._dispatcher = PacketDispatcher("Transport")
+        self._dispatcher.register('PRIVATE_APP', self._on_private_app)
+
+        if get_metrics():
+            self._register_metrics()
 
     @property
     def is_running(self) -> bool:
@@ -242,6 +281,7 @@ class RNSMeshtasticTransport:
             return False
 
         self._running = True
+        self._stop_event.clear()
         self.stats.start_time = datetime.now()
 
         # Start worker threads
@@ -277,6 +317,7 @@ class RNSMeshtasticTransport:
 
         logger.info("Stopping transport...")
         self._running = False
+        self._stop_event.set()
 
         # Disconnect from Meshtastic
         self._disconnect()
@@ -286,6 +327,10 @@ class RNSMeshtasticTransport:
             if thread and thread.is_alive():
                 thread.join(timeout=5)
 
+        metrics = get_metrics()
+        if metrics:
+            metrics.unregister_owner(self)
+
         logger.info("Transport stopped")
         self._notify_status("stopped")
 
@@ -306,6 +351,10 @@ class RNSMeshtasticTransport:
         self._outbound_queue.put((packet, destination))
         return True
 
+    def set_recorder(self, recorder) -> None:
+        """Record received Meshtastic packets (None to stop)"""
+        self._recorder = recorder
+
     def register_packet_callback(self, callback: Callable[[bytes], None]):
         """Register callback for received packets"""
         self._packet_callbacks.append(callback)
@@ -325,6 +374,7 @@ class RNSMeshtasticTransport:
             'device_path': self.config.device_path,
             'speed_preset': throughput['name'],
             'estimated_bps': throughput['bps'],
+            'max_bytes_per_sec': throughput.get('max_bytes_per_sec'),
             'range_estimate': throughput['range'],
             'hop_limit': self.config.hop_limit,
             'pending_fragments': len(self._pending_packets),
@@ -336,28 +386,52 @@ class RNSMeshtasticTransport:
     # Private Methods
     # ========================================
 
+    def _register_metrics(self):
+        """Expose transport counters and queue depths in the metrics registry"""
+        metrics = get_metrics()
+        counters = {
+            'packets_sent': 'RNS packets sent over Meshtastic',
+            'packets_received': 'RNS packets reassembled from Meshtastic',
+            'fragments_sent': 'Fragments sent',
+            'fragments_received': 'Fragments received',
+            'bytes_sent': 'RNS payload bytes sent',
+            'bytes_received': 'RNS payload bytes received',
+            'reassembly_timeouts': 'Packets dropped incomplete',
+            'crc_errors': 'Malformed fragments',
+        }
+        for field_name, help_text in counters.items():
+            metrics.counter_fn(
+                f'meshforge_transport_{field_name}',
+                lambda t, f=field_name: getattr(t.stats, f),
+                help_text, owner=self)
+        metrics.gauge_fn('meshforge_transport_pending_packets',
+                         lambda t: len(t._pending_packets),
+                         'Packets awaiting reassembly', owner=self)
+        metrics.gauge_fn('meshforge_transport_outbound_queue_depth',
+                         lambda t: t._outbound_queue.qsize(),
+                         'Packets waiting to be fragmented and sent', owner=self)
+
     def _connect(self) -> bool:
         """Connect to Meshtastic interface"""
+        conn_type = self.config.connection_type.lower()
+        if STREAM_CLIENT_AVAILABLE and (conn_type == "tcp" or
+                                        (conn_type == "serial" and SERIAL_ASYNC_AVAILABLE)):
+            return self._connect_stream(conn_type, self.config.device_path)
+
         try:
             import meshtastic
             from pubsub import pub
 
-            conn_type = self.config.connection_type.lower()
             device = self.config.device_path
 
             logger.info(f"Connecting to Meshtastic ({conn_type}: {device})")
 
             if conn_type == "tcp":
                 import meshtastic.tcp_interface
-                # Parse host:port
-                if ':' in device:
-                    host, port = device.rsplit(':', 1)
-                    port = int(port)
-                else:
-                    host = device
-                    port = 4403
+                host, port = self._parse_tcp_device(device)
                 self._interface = meshtastic.tcp_interface.TCPInterface(
-                    hostname=host
+                    hostname=host,
+                    portNumber=port
                 )
 
             elif conn_type == "serial":
@@ -393,6 +467,39 @@ class RNSMeshtasticTransport:
             logger.error(f"Failed to connect to Meshtastic: {e}")
             return False
 
+    @staticmethod
+    def _parse_tcp_device(device: str):
+        """'host[:port]' -> (host, port)"""
+        if ':' in device:
+            host, port = device.rsplit(':', 1)
+            return host, int(port)
+        return device, 4403
+
+    def _connect_stream(self, conn_type: str, device: str) -> bool:
+        """Connect with the asyncio stream client (no pubsub, no reader thread)"""
+        logger.info(f"Connecting to Meshtastic ({conn_type}: {device})")
+        if conn_type == "tcp":
+            host, port = self._parse_tcp_device(device)
+            interface = StreamInterface(host, port, on_receive=self._on_meshtastic_receive,
+                                        on_connection=self._on_stream_connection,
+                                        reconnect=True)
+        else:
+            interface = StreamInterface(device=device, on_receive=self._on_meshtastic_receive,
+                                        on_connection=self._on_stream_connection,
+                                        reconnect=True)
+        if not interface.connect():
+            logger.error(f"Failed to connect to Meshtastic: {interface.last_error}")
+            return False
+        self._interface = interface
+        self._connected = True
+        logger.info("Connected to Meshtastic")
+        return True
+
+    def _on_stream_connection(self, connected: bool):
+        """Stream client lost or regained its connection (it reconnects itself)"""
+        self._connected = connected
+        self._notify_status("connected" if connected else "disconnected")
+
     def _disconnect(self):
         """Disconnect from Meshtastic"""
         if self._interface:
@@ -524,6 +631,13 @@ class RNSMeshtasticTransport:
                             packet = pending.reassemble()
                             del self._pending_packets[packet_id]
 
+                            metrics = get_metrics()
+                            if metrics:
+                                metrics.histogram(
+                                    'meshforge_transport_reassembly_seconds',
+                                    'First fragment to reassembled packet',
+                                ).observe((datetime.now() - pending.first_seen).total_seconds())
+
                             self.stats.packets_received += 1
                             self.stats.bytes_received += len(packet)
                             self.stats.reassembly_successes += 1
@@ -542,7 +656,8 @@ class RNSMeshtasticTransport:
         """Worker thread for cleaning up stale fragments"""
         while self._running:
             try:
-                time.sleep(5)  # Check every 5 seconds
+                if self._stop_event.wait(5):  # Check every 5 seconds
+                    break
 
                 timeout = timedelta(seconds=self.config.fragment_timeout_sec)
                 now = datetime.now()
@@ -574,22 +689,18 @@ class RNSMeshtasticTransport:
 
     def _on_meshtastic_receive(self, packet: dict):
         """Handle incoming Meshtastic packet"""
-        try:
-            decoded = packet.get('decoded', {})
-            portnum = decoded.get('portnum')
+        self._dispatcher.dispatch(packet)
 
-            # Only process private app packets (port 256 for RNS)
-            if portnum != 'PRIVATE_APP' and portnum != 256:
-                return
-
-            payload = decoded.get('payload')
-            if payload:
-                if isinstance(payload, str):
-                    payload = payload.encode('latin-1')
-                self._inbound_queue.put(payload)
+    def _on_private_app(self, view: PacketView):
+        if self._recorder:
+            try:
+                self._recorder.record('transport', view.packet)
+            except Exception as e:
+                logger.debug(f"Packet recorder error: {e}")
 
-        except Exception as e:
-            logger.error(f"Error processing Meshtastic packet: {e}")
+        payload = view.payload
+        if payload:
+            self._inbound_queue.put(payload)
 
     def _notify_packet(self, packet: bytes):
         """Notify packet callbacks"""
@@ -16,6 +16,8 @@ from gi.repository import Gtk, Adw, GLib, Pango
 from typing import Optional
 from datetime import datetime
 
+from .panel_registry import PanelTimers
+
 # Use centralized logging
 from utils.logging_config import get_logger
 logger = get_logger(__name__)
@@ -52,6 +54,7 @@ class AmateurPanel(Gtk.Box):
         # Station ID timer - use new StationIDTimer class
         self._station_id_timer: Optional[StationIDTimer] = None
         self._ui_update_timer = None
+        self.panel_timers = PanelTimers()  # Paused while the page is hidden
 
         self._build_ui()
         self._start_id_timer()
@@ -508,7 +511,7 @@ class AmateurPanel(Gtk.Box):
         self._station_id_timer.start()
 
         # Start UI update timer (every second for real-time countdown)
-        self._ui_update_timer = GLib.timeout_add(1000, self._update_id_display)
+        self._ui_update_timer = self.panel_timers.add(1000, self._update_id_display)
 
     def _update_id_display(self) -> bool:
         """Update the ID countdown display every second"""
@@ -781,7 +784,7 @@ class AmateurPanel(Gtk.Box):
 
         # Stop the UI update timer
         if self._ui_update_timer:
-            GLib.source_remove(self._ui_update_timer)
+            self.panel_timers.remove(self._ui_update_timer)
             self._ui_update_timer = None
 
         logger.debug("Amateur panel resources cleaned up")
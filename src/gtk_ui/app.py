@@ -14,21 +14,23 @@ import os
 import subprocess
 import threading
 import logging
+import time
 from pathlib import Path
 
-# Set up logging for GTK app diagnostics
-logging.basicConfig(
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Set up logging for GTK app diagnostics (written off the GTK main loop)
+from utils.logging_config import setup_logging
+setup_logging(
     level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/meshforge-gtk.log'),
-    ]
+    log_file='/tmp/meshforge-gtk.log',
+    log_format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    console=False,
+    suppress_libs=False,
 )
 logger = logging.getLogger('gtk_app')
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 # Import centralized path utility
 try:
     from utils.paths import get_real_user_home
@@ -41,6 +43,29 @@ except ImportError:
 
 from __version__ import __version__, get_full_version, __app_name__
 
+from .panel_registry import PanelRegistry
+
+try:
+    from utils.system_state import get_system_state, format_uptime
+    HAS_SYSTEM_STATE = True
+except ImportError:
+    HAS_SYSTEM_STATE = False
+
+
+def _process_age() -> float:
+    """Seconds since this process started (for the startup benchmark)"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return time.monotonic() - _IMPORT_TIME
+
+
+_IMPORT_TIME = time.monotonic()
+
 # Edition detection
 try:
     from core.edition import Edition, detect_edition, has_feature, get_edition_info
@@ -136,6 +161,23 @@ class MeshForgeApp(Adw.Application):
         self.window.present()
         logger.info("MeshForge GTK application ready")
 
+        if os.environ.get('MESHFORGE_STARTUP_BENCHMARK') == '1':
+            # Low priority idle runs once the first frame is drawn and the
+            # main loop has nothing else to do: the window is interactive
+            GLib.idle_add(self._report_startup, priority=GLib.PRIORITY_LOW)
+
+    def _report_startup(self):
+        """Print time to first interactive window and quit (benchmark mode)"""
+        stats = self.window.panels.stats()
+        elapsed = _process_age()
+        print(f"startup: interactive after {elapsed:.2f}s "
+              f"({len(stats['loaded'])}/{stats['registered']} panels built: "
+              f"{', '.join(stats['loaded'])})")
+        for name, ms in sorted(stats['load_ms'].items(), key=lambda item: -item[1]):
+            print(f"  {name:<14} {ms:8.1f} ms")
+        self.quit()
+        return False
+
 
 # Backwards compatibility alias
 MeshtasticdApp = MeshForgeApp
@@ -151,6 +193,9 @@ class MeshForgeWindow(Adw.ApplicationWindow):
     DEFAULT_HEIGHT = 768
     SIDEBAR_COLLAPSE_WIDTH = 900  # Collapse sidebar below this width
 
+    # Hidden panels registered as unloadable are torn down after this long
+    PANEL_IDLE_UNLOAD = 600  # seconds
+
     # Edition-specific colors
     EDITION_COLORS = {
         "pro": "#1a73e8",      # Blue
@@ -194,10 +239,9 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         # Track subprocess for nano/terminal operations
         self.external_process = None
 
-        # Cache for node count (avoid repeated connections)
-        self._node_count_cache = "--"
-        self._node_count_timestamp = 0
-        self._node_count_cache_ttl = 30  # Cache for 30 seconds
+        # Status bar feed from the shared system-state poller
+        self._state_unsubscribe = None
+        self._system_state = None
 
         # Create the main layout
         self._build_ui()
@@ -213,26 +257,12 @@ class MeshForgeWindow(Adw.ApplicationWindow):
 
     def _on_close_request(self, window):
         """Handle window close - cleanup all panels with cleanup methods."""
-        # List of panel attribute names that might have cleanup methods
-        panel_attrs = [
-            'diagnostics_panel',
-            'mesh_tools_panel',
-            'rns_panel',
-            'tools_panel',
-            'map_panel',
-            'radio_config_panel',
-            'ham_tools_panel',
-            'hamclock_panel',
-            'meshbot_panel',
-        ]
+        # Only panels that were actually built need cleaning up
+        self.panels.cleanup()
 
-        for attr_name in panel_attrs:
-            panel = getattr(self, attr_name, None)
-            if panel and hasattr(panel, 'cleanup'):
-                try:
-                    panel.cleanup()
-                except Exception as e:
-                    logger.warning(f"Error cleaning up {attr_name}: {e}")
+        if self._state_unsubscribe:
+            self._state_unsubscribe()
+            self._state_unsubscribe = None
 
         # Return False to allow the window to close
         return False
@@ -432,41 +462,49 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         self.content_stack.set_hexpand(True)
         self.content_stack.set_transition_type(Gtk.StackTransitionType.SLIDE_LEFT_RIGHT)
 
-        # Add content pages BEFORE sidebar (so stack has pages when nav callback fires)
-        logger.info("Loading GTK panels...")
+        # Register content pages BEFORE sidebar (so stack has pages when nav
+        # callback fires). Each panel is built the first time its page is
+        # shown; only the dashboard is built up front.
+        self.panels = PanelRegistry(
+            self.content_stack, owner=self,
+            placeholder=self._make_loading_placeholder,
+            on_error=self._add_error_placeholder,
+            idle_unload=self.PANEL_IDLE_UNLOAD,
+        )
+        # (page name, loader, window attribute, unload when idle)
         panel_loaders = [
-            ("dashboard", self._add_dashboard_page),
-            ("service", self._add_service_page),
-            ("install", self._add_install_page),
-            ("config", self._add_config_page),
-            ("radio_config", self._add_radio_config_page),
-            ("rns", self._add_rns_page),
+            ("dashboard", self._add_dashboard_page, "dashboard_panel", False),
+            ("service", self._add_service_page, "service_panel", False),
+            ("install", self._add_install_page, "install_panel", False),
+            ("config", self._add_config_page, "config_panel", False),
+            ("radio_config", self._add_radio_config_page, "radio_config_panel", False),
+            ("rns", self._add_rns_page, "rns_panel", False),
             # Consolidated tool panels
-            ("mesh_tools", self._add_mesh_tools_page),
-            ("ham_tools", self._add_ham_tools_page),
+            ("mesh_tools", self._add_mesh_tools_page, "mesh_tools_panel", False),
+            ("ham_tools", self._add_ham_tools_page, "ham_tools_panel", False),
             # Legacy panels (still available)
-            ("map", self._add_map_page),
-            ("hamclock", self._add_hamclock_page),
-            ("cli", self._add_cli_page),
-            ("hardware", self._add_hardware_page),
-            ("tools", self._add_tools_page),
-            ("diagnostics", self._add_diagnostics_page),
-            ("aredn", self._add_aredn_page),
-            ("amateur", self._add_amateur_page),
-            ("meshbot", self._add_meshbot_page),
-            ("messaging", self._add_messaging_page),
-            ("settings", self._add_settings_page),
+            ("map", self._add_map_page, "map_panel", True),
+            ("hamclock", self._add_hamclock_page, "hamclock_panel", True),
+            ("cli", self._add_cli_page, "cli_panel", False),
+            ("hardware", self._add_hardware_page, "hardware_panel", True),
+            ("tools", self._add_tools_page, "tools_panel", True),
+            ("diagnostics", self._add_diagnostics_page, "diagnostics_panel", True),
+            ("aredn", self._add_aredn_page, "aredn_panel", True),
+            ("amateur", self._add_amateur_page, "amateur_panel", False),
+            ("meshbot", self._add_meshbot_page, "meshbot_panel", False),
+            ("messaging", self._add_messaging_page, "messaging_panel", False),
+            ("settings", self._add_settings_page, "settings_panel", False),
         ]
-
-        for name, loader in panel_loaders:
-            try:
-                logger.debug(f"Loading panel: {name}")
-                loader()
-                logger.debug(f"Loaded panel: {name} OK")
-            except Exception as e:
-                logger.error(f"Failed to load panel {name}: {e}", exc_info=True)
-                # Create error placeholder
-                self._add_error_placeholder(name, str(e))
+        for name, loader, attr, unloadable in panel_loaders:
+            setattr(self, attr, None)
+            self.panels.register(name, loader, attr=attr, unloadable=unloadable)
+
+        if os.environ.get('MESHFORGE_EAGER_PANELS') == '1':
+            # Old behaviour, for comparison and debugging
+            logger.info("Loading all GTK panels (eager mode)...")
+            self.panels.load_all()
+        else:
+            self.panels.show("dashboard")
 
         # Left sidebar navigation (after content_stack exists)
         sidebar = self._create_sidebar()
@@ -484,9 +522,10 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         self.bottom_status = self._create_bottom_status()
         main_box.append(self.bottom_status)
 
-        # Start status update timer
-        GLib.timeout_add_seconds(5, self._update_status)
-        self._update_status()
+        # Status bar follows the shared system-state poller; the timer
+        # only re-renders uptime from the cached state
+        self._start_status_updates()
+        GLib.timeout_add_seconds(60, self._update_status)
 
         # Set up responsive layout handling
         self._setup_responsive_layout()
@@ -807,6 +846,20 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         self.content_stack.add_named(panel, "settings")
         self.settings_panel = panel
 
+    def _make_loading_placeholder(self, panel_name: str):
+        """Stand-in page shown until a panel is built (usually one frame)"""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        box.set_valign(Gtk.Align.CENTER)
+        box.set_halign(Gtk.Align.CENTER)
+        spinner = Gtk.Spinner()
+        spinner.set_size_request(32, 32)
+        spinner.start()
+        box.append(spinner)
+        label = Gtk.Label(label="Loading...")
+        label.add_css_class("dim-label")
+        box.append(label)
+        return box
+
     def _add_error_placeholder(self, panel_name: str, error_message: str):
         """Add a placeholder for a panel that failed to load"""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
@@ -981,133 +1034,30 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         load_logs()
         dialog.present()
 
-    def _update_status(self):
-        """Update status bar information"""
-        # Run in thread to avoid blocking UI
-        thread = threading.Thread(target=self._update_status_thread)
-        thread.daemon = True
-        thread.start()
-        return True  # Continue timer
-
-    def _update_status_thread(self):
-        """Thread for updating status"""
-        try:
-            import socket
-
-            # Check service status - multiple methods
-            is_active = False
-
-            # Method 1: systemctl is-active
-            result = subprocess.run(
-                ['systemctl', 'is-active', 'meshtasticd'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.stdout.strip() == 'active':
-                is_active = True
-
-            # Method 2: Check if process is running
-            if not is_active:
-                result = subprocess.run(
-                    ['pgrep', '-f', 'meshtasticd'],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    is_active = True
-
-            # Method 3: Check TCP port 4403
-            if not is_active:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1.0)
-                    if sock.connect_ex(('localhost', 4403)) == 0:
-                        is_active = True
-                    sock.close()
-                except Exception:
-                    pass
-
-            # Get uptime if active
-            uptime = "--"
-            node_count = "--"
-            if is_active:
-                result = subprocess.run(
-                    ['systemctl', 'show', 'meshtasticd', '--property=ActiveEnterTimestamp'],
-                    capture_output=True, text=True, timeout=5
-                )
-                if 'ActiveEnterTimestamp=' in result.stdout:
-                    timestamp = result.stdout.split('=')[1].strip()
-                    if timestamp:
-                        uptime = self._calculate_uptime(timestamp)
-
-                # Try to get node count from meshtastic CLI
-                node_count = self._get_node_count()
-
-            # Update UI in main thread
-            GLib.idle_add(self._update_status_ui, is_active, uptime, node_count)
-
-        except Exception as e:
-            GLib.idle_add(self._update_status_ui, False, "--", "--")
-
-    def _get_node_count(self):
-        """Get the number of nodes from meshtastic TCP interface or CLI"""
-        import time as time_module
-        import socket
-
-        # Check for web client mode - don't connect if enabled
-        try:
-            from utils.common import SettingsManager
-            settings = SettingsManager()
-            if settings.get("web_client_mode", False):
-                return "--"  # Return placeholder when web client mode is on
-        except Exception:
-            pass
+    def _start_status_updates(self):
+        """Subscribe the status bar to shared system-state change events"""
+        if not HAS_SYSTEM_STATE:
+            self._update_status_ui(False, "--", "--")
+            return
+        self._state_unsubscribe = get_system_state().subscribe(
+            lambda state, changes: GLib.idle_add(self._on_system_state, state))
 
-        # Check cache first
-        now = time_module.time()
-        if now - self._node_count_timestamp < self._node_count_cache_ttl:
-            return self._node_count_cache
+    def _on_system_state(self, state):
+        """Shared state changed (main thread)"""
+        self._system_state = state
+        self._update_status()
+        return False
 
-        # Quick pre-check: is meshtasticd TCP port reachable?
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1.0)
-            sock.connect(("localhost", 4403))
-            sock.close()
-        except (socket.timeout, socket.error, OSError):
-            # Port not reachable, skip node count
-            return self._node_count_cache
-
-        # Use CLI method (more reliable, avoids meshtastic library noise)
-        try:
-            import re
-            # Find meshtastic CLI using centralized function
-            try:
-                from utils.cli import find_meshtastic_cli
-                cli_path = find_meshtastic_cli()
-            except ImportError:
-                cli_path = shutil.which('meshtastic')
-
-            if not cli_path:
-                return self._node_count_cache
-
-            # Run meshtastic --nodes to get node info (suppress stderr)
-            result = subprocess.run(
-                [cli_path, '--host', 'localhost', '--nodes'],
-                capture_output=True, text=True,
-                timeout=10
-            )
-
-            if result.returncode == 0 and result.stdout:
-                # Look for node IDs in the output (format: !xxxxxxxx)
-                node_ids = re.findall(r'!([0-9a-fA-F]{8})', result.stdout)
-                if node_ids:
-                    self._node_count_cache = str(len(set(node_ids)))
-                    self._node_count_timestamp = now
-                    return self._node_count_cache
-            return self._node_count_cache
-        except subprocess.TimeoutExpired:
-            return self._node_count_cache
-        except Exception:
-            return self._node_count_cache
+    def _update_status(self):
+        """Render the status bar from the last shared state (no I/O)"""
+        state = self._system_state
+        if state is None:
+            return True  # Continue timer
+        is_active = state.is_running('meshtasticd')
+        uptime = format_uptime(state.uptime('meshtasticd')) if is_active else "--"
+        node_count = state.node_count if is_active and state.node_count is not None else "--"
+        self._update_status_ui(is_active, uptime, node_count)
+        return True  # Continue timer
 
     def _update_status_ui(self, is_active, uptime, node_count="--"):
         """Update status UI elements (must run in main thread)"""
@@ -1126,73 +1076,6 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         self.node_count_label.set_label(f"Nodes: {node_count}")
         return False
 
-    def _calculate_uptime(self, timestamp):
-        """Calculate uptime from timestamp"""
-        try:
-            from datetime import datetime
-            import re
-
-            if not timestamp or timestamp == 'n/a':
-                return "--"
-
-            # Try multiple timestamp formats
-            # Format 1: "2026-01-02 10:30:45 UTC"
-            # Format 2: "Thu 2026-01-02 10:30:45 UTC"
-            # Format 3: "Thu Jan  2 10:30:45 2026"
-
-            start = None
-
-            # Try ISO format first (most common)
-            try:
-                # Remove timezone suffix
-                clean_ts = re.sub(r'\s+(UTC|[A-Z]{3,4})$', '', timestamp)
-                # Remove day name prefix if present
-                clean_ts = re.sub(r'^[A-Za-z]+\s+', '', clean_ts)
-                start = datetime.strptime(clean_ts[:19], '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                pass
-
-            # Try alternative format (ctime-like)
-            if not start:
-                try:
-                    # Format: "Thu Jan  2 10:30:45 2026"
-                    start = datetime.strptime(timestamp, '%a %b %d %H:%M:%S %Y')
-                except ValueError:
-                    pass
-
-            # Try with timezone
-            if not start:
-                try:
-                    # Format: "Thu 2026-01-02 10:30:45 PST"
-                    clean_ts = re.sub(r'\s+[A-Z]{3,4}$', '', timestamp)
-                    start = datetime.strptime(clean_ts, '%a %Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    pass
-
-            if not start:
-                return "--"
-
-            now = datetime.now()
-            delta = now - start
-
-            total_seconds = delta.total_seconds()
-            if total_seconds < 0:
-                return "--"
-
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-
-            if hours > 24:
-                days = hours // 24
-                hours = hours % 24
-                return f"{days}d {hours}h"
-            elif hours > 0:
-                return f"{hours}h {minutes}m"
-            else:
-                return f"{minutes}m"
-        except (ValueError, TypeError, OSError):
-            return "--"
-
     def open_terminal_editor(self, file_path, callback=None):
         """
         Open a file in nano editor in a terminal window.
@@ -0,0 +1,372 @@
+"""
+Lazy panel registry for the main window
+
+MeshForgeWindow used to construct every page at startup: ~19 panels,
+several of them large (RNS, Tools, HamClock, the WebKit map), each
+starting its own refresh timers and background threads before the
+window was even shown. The registry instead puts a cheap placeholder in
+the Gtk.Stack for each page and builds the real panel the first time
+the page becomes visible.
+
+Panels that keep periodic work in a PanelTimers (the `panel_timers`
+attribute) have those timers paused while the page is hidden and
+resumed, with one immediate run, when it is shown again. Pages
+registered as unloadable can be torn down (cleanup() + removed from the
+stack) after sitting hidden for a while; they are rebuilt on the next
+visit.
+
+Usage (inside the window):
+    self.panels = PanelRegistry(self.content_stack, self,
+                                placeholder=self._make_loading_placeholder,
+                                on_error=self._add_error_placeholder)
+    self.panels.register("map", self._add_map_page, attr="map_panel", unloadable=True)
+    self.panels.load("dashboard")
+
+Loaders are the window's existing _add_*_page methods: they add the
+panel to the stack under the page name and set the window attribute.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import gi
+    gi.require_version('Gtk', '4.0')
+    from gi.repository import GLib
+except (ImportError, ValueError):
+    GLib = None
+
+logger = logging.getLogger(__name__)
+
+# How often hidden unloadable panels are checked for idleness (seconds)
+SWEEP_INTERVAL = 60
+
+
+class PanelTimers:
+    """
+    Periodic GLib timers owned by one panel, which can be paused as a group.
+
+    Callbacks follow GLib semantics: return True to keep running, False
+    to stop. While paused no callbacks run; resume() re-arms every timer
+    and (unless refresh_on_resume=False) runs each callback once right
+    away so the page shows current data.
+    """
+
+    @dataclass
+    class _Timer:
+        interval_ms: int
+        callback: Callable[[], Any]
+        refresh_on_resume: bool
+        source_id: Optional[int] = None
+
+    def __init__(self):
+        self._timers: Dict[int, 'PanelTimers._Timer'] = {}
+        self._next_handle = 1
+        self._paused = False
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def add(self, interval_ms: int, callback: Callable[[], Any],
+            refresh_on_resume: bool = True) -> int:
+        """Run callback every interval_ms; returns a handle for remove()"""
+        handle = self._next_handle
+        self._next_handle += 1
+        self._timers[handle] = self._Timer(interval_ms, callback, refresh_on_resume)
+        if not self._paused:
+            self._arm(handle)
+        return handle
+
+    def add_seconds(self, seconds: int, callback: Callable[[], Any],
+                    refresh_on_resume: bool = True) -> int:
+        return self.add(seconds * 1000, callback, refresh_on_resume)
+
+    def remove(self, handle: Optional[int]) -> None:
+        timer = self._timers.pop(handle, None)
+        if timer is not None:
+            self._disarm(timer)
+
+    def pause(self) -> None:
+        if self._paused:
+            return
+        self._paused = True
+        for timer in self._timers.values():
+            self._disarm(timer)
+
+    def resume(self) -> None:
+        if not self._paused:
+            return
+        self._paused = False
+        for handle, timer in list(self._timers.items()):
+            self._arm(handle)
+            if timer.refresh_on_resume:
+                GLib.idle_add(self._fire, handle, False)
+
+    def cancel_all(self) -> None:
+        for timer in self._timers.values():
+            self._disarm(timer)
+        self._timers.clear()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def _arm(self, handle: int) -> None:
+        timer = self._timers[handle]
+        if timer.source_id is None:
+            if timer.interval_ms % 1000 == 0:
+                # Second-granularity timers are coalesced by GLib (fewer wakeups)
+                timer.source_id = GLib.timeout_add_seconds(
+                    timer.interval_ms // 1000, self._fire, handle, True)
+            else:
+                timer.source_id = GLib.timeout_add(timer.interval_ms, self._fire, handle, True)
+
+    @staticmethod
+    def _disarm(timer: '_Timer') -> None:
+        if timer.source_id is not None:
+            GLib.source_remove(timer.source_id)
+            timer.source_id = None
+
+    def _fire(self, handle: int, from_timer: bool) -> bool:
+        timer = self._timers.get(handle)
+        if timer is None or self._paused:
+            if timer is not None and from_timer:
+                timer.source_id = None
+            return False
+        try:
+            keep = timer.callback()
+        except Exception as e:
+            logger.error(f"Panel timer {getattr(timer.callback, '__name__', handle)} failed: {e}")
+            keep = True
+        if not keep:
+            # Returning False ends the GLib source; just forget it
+            if from_timer:
+                timer.source_id = None
+            self.remove(handle)
+            return False
+        return from_timer
+
+
+@dataclass
+class _Page:
+    name: str
+    loader: Callable[[], None]
+    attr: Optional[str] = None
+    unloadable: bool = False
+    widget: Any = None          # real panel once loaded
+    placeholder: Any = None
+    hidden_since: Optional[float] = None
+    loads: int = 0
+    load_seconds: float = 0.0
+
+
+class PanelRegistry:
+    """
+    Builds stack pages on first view, pauses hidden ones, unloads idle ones.
+
+    The stack must support add_named / remove / get_child_by_name /
+    get_visible_child_name / set_visible_child_name and the
+    'notify::visible-child-name' signal (a Gtk.Stack).
+    """
+
+    def __init__(self, stack, owner: Any = None,
+                 placeholder: Optional[Callable[[str], Any]] = None,
+                 on_error: Optional[Callable[[str, str], None]] = None,
+                 idle_unload: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            stack: The Gtk.Stack holding the pages
+            owner: Object whose panel attributes are cleared on unload
+            placeholder: Factory for a page's stand-in widget (name -> widget)
+            on_error: Called as on_error(name, message) when a loader fails;
+                must add a page named name to the stack
+            idle_unload: Seconds a hidden unloadable page is kept (None: never unload)
+            clock: Time source (monotonic seconds)
+        """
+        self.stack = stack
+        self.owner = owner
+        self.placeholder = placeholder
+        self.on_error = on_error
+        self.idle_unload = idle_unload
+        self.clock = clock
+        self._pages: Dict[str, _Page] = {}
+        self._visible: Optional[str] = None
+        self._switching = False
+        self._sweep_id = None
+        stack.connect('notify::visible-child-name', self._on_visible_changed)
+
+    # === Registration ===
+
+    def register(self, name: str, loader: Callable[[], None], attr: Optional[str] = None,
+                 unloadable: bool = False) -> None:
+        """Add a page; its panel is built by loader() on first view"""
+        page = self._pages[name] = _Page(name, loader, attr, unloadable)
+        self._add_placeholder(page)
+        if unloadable and self.idle_unload and self._sweep_id is None and GLib is not None:
+            self._sweep_id = GLib.timeout_add_seconds(SWEEP_INTERVAL, self._sweep_tick)
+
+    def _add_placeholder(self, page: _Page) -> None:
+        if self.placeholder is None:
+            return
+        page.placeholder = self.placeholder(page.name)
+        self.stack.add_named(page.placeholder, page.name)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._pages)
+
+    def is_loaded(self, name: str) -> bool:
+        page = self._pages.get(name)
+        return page is not None and page.widget is not None
+
+    def get(self, name: str) -> Any:
+        """The loaded panel widget (None if not built)"""
+        page = self._pages.get(name)
+        return page.widget if page else None
+
+    def loaded(self) -> Dict[str, Any]:
+        return {name: page.widget for name, page in self._pages.items()
+                if page.widget is not None}
+
+    # === Loading ===
+
+    def load(self, name: str) -> Any:
+        """Build page name now if needed; returns its widget"""
+        page = self._pages.get(name)
+        if page is None:
+            return None
+        if page.widget is not None:
+            return page.widget
+
+        was_visible = self.stack.get_visible_child_name() == name
+        self._switching = True
+        try:
+            if page.placeholder is not None:
+                self.stack.remove(page.placeholder)
+                page.placeholder = None
+            start = time.perf_counter()
+            try:
+                page.loader()
+            except Exception as e:
+                logger.error(f"Failed to load panel {name}: {e}", exc_info=True)
+                if self.stack.get_child_by_name(name) is None and self.on_error:
+                    self.on_error(name, str(e))
+            page.widget = self.stack.get_child_by_name(name)
+            page.loads += 1
+            page.load_seconds = time.perf_counter() - start
+            logger.debug(f"Loaded panel {name} in {page.load_seconds * 1000:.0f} ms")
+            if was_visible:
+                self.stack.set_visible_child_name(name)
+        finally:
+            self._switching = False
+        return page.widget
+
+    def load_all(self) -> None:
+        """Build every page (eager mode)"""
+        for name in self._pages:
+            self.load(name)
+        for name, page in self._pages.items():
+            if name != self._visible:
+                self._set_active(page, False)
+
+    def show(self, name: str) -> None:
+        """Build page name if needed and make it the visible page"""
+        self.load(name)
+        self.stack.set_visible_child_name(name)
+
+    # === Visibility ===
+
+    def _on_visible_changed(self, stack, _pspec=None) -> None:
+        if self._switching:
+            return
+        name = stack.get_visible_child_name()
+        if name == self._visible:
+            return
+        previous = self._pages.get(self._visible) if self._visible else None
+        self._visible = name
+        if previous is not None:
+            self._set_active(previous, False)
+        page = self._pages.get(name)
+        if page is None:
+            return
+        if page.widget is None:
+            self.load(name)
+        self._set_active(page, True)
+
+    def _set_active(self, page: _Page, active: bool) -> None:
+        page.hidden_since = None if active else self.clock()
+        timers = getattr(page.widget, 'panel_timers', None)
+        if timers is None:
+            return
+        if active:
+            timers.resume()
+        else:
+            timers.pause()
+
+    # === Unloading ===
+
+    def unload(self, name: str) -> bool:
+        """Tear down a loaded, hidden page; it is rebuilt on its next visit"""
+        page = self._pages.get(name)
+        if page is None or page.widget is None or name == self._visible:
+            return False
+        widget, page.widget = page.widget, None
+        self._cleanup(name, widget)
+        self._switching = True
+        try:
+            self.stack.remove(widget)
+            self._add_placeholder(page)
+        finally:
+            self._switching = False
+        if self.owner is not None and page.attr:
+            setattr(self.owner, page.attr, None)
+        logger.info(f"Unloaded idle panel {name}")
+        return True
+
+    def sweep(self) -> List[str]:
+        """Unload unloadable pages hidden for longer than idle_unload"""
+        if not self.idle_unload:
+            return []
+        now = self.clock()
+        idle = [name for name, page in self._pages.items()
+                if page.unloadable and page.widget is not None
+                and page.hidden_since is not None
+                and now - page.hidden_since >= self.idle_unload]
+        return [name for name in idle if self.unload(name)]
+
+    def _sweep_tick(self) -> bool:
+        self.sweep()
+        return True
+
+    # === Shutdown ===
+
+    def cleanup(self) -> None:
+        """Clean up every loaded panel (window close)"""
+        if self._sweep_id is not None and GLib is not None:
+            GLib.source_remove(self._sweep_id)
+            self._sweep_id = None
+        for name, widget in self.loaded().items():
+            self._cleanup(name, widget)
+
+    @staticmethod
+    def _cleanup(name: str, widget: Any) -> None:
+        timers = getattr(widget, 'panel_timers', None)
+        if timers is not None:
+            timers.cancel_all()
+        if hasattr(widget, 'cleanup'):
+            try:
+                widget.cleanup()
+            except Exception as e:
+                logger.warning(f"Error cleaning up {name} panel: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Which pages are built, and how long each took"""
+        return {
+            'registered': len(self._pages),
+            'loaded': [name for name, page in self._pages.items() if page.widget is not None],
+            'load_ms': {name: round(page.load_seconds * 1000, 1)
+                        for name, page in self._pages.items() if page.loads},
+        }
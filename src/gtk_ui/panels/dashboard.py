@@ -10,6 +10,7 @@ gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, GLib
 import subprocess
 import threading
+import time
 
 # Import unified commands layer (shared with CLI)
 try:
@@ -18,6 +19,23 @@ try:
 except ImportError:
     COMMANDS_AVAILABLE = False
 
+# Per-node telemetry history for the trend chart
+try:
+    from utils.telemetry_store import get_telemetry_store
+    TELEMETRY_STORE_AVAILABLE = True
+except ImportError:
+    TELEMETRY_STORE_AVAILABLE = False
+
+# Chart choices: (label, metric) and (label, hours)
+TELEMETRY_METRICS = [
+    ("Battery %", "battery_level"),
+    ("Voltage", "voltage"),
+    ("SNR", "snr"),
+    ("Channel util %", "channel_utilization"),
+    ("Temperature", "temperature"),
+]
+TELEMETRY_SPANS = [("6 hours", 6), ("24 hours", 24), ("7 days", 168), ("30 days", 720)]
+
 # Fallback to old service checker
 try:
     from utils.service_check import check_service, ServiceState
@@ -95,6 +113,9 @@ class DashboardPanel(Gtk.Box):
         )
         grid.attach(self.hardware_card, 1, 1, 1, 1)
 
+        if TELEMETRY_STORE_AVAILABLE:
+            self.append(self._build_telemetry_chart())
+
         # Log output area
         log_frame = Gtk.Frame()
         log_frame.set_label("Recent Service Logs")
@@ -112,6 +133,140 @@ class DashboardPanel(Gtk.Box):
         log_frame.set_child(scrolled)
         self.append(log_frame)
 
+    def _build_telemetry_chart(self):
+        """Node telemetry trend: node/metric/span selectors over a line chart"""
+        frame = Gtk.Frame()
+        frame.set_label("Node Telemetry History")
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_margin_start(10)
+        box.set_margin_end(10)
+        box.set_margin_top(5)
+        box.set_margin_bottom(10)
+
+        controls = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self._telemetry_nodes = []
+        self._telemetry_updating = False
+        self.telemetry_node_dropdown = Gtk.DropDown.new_from_strings(["(no history yet)"])
+        self.telemetry_metric_dropdown = Gtk.DropDown.new_from_strings(
+            [label for label, _ in TELEMETRY_METRICS])
+        self.telemetry_span_dropdown = Gtk.DropDown.new_from_strings(
+            [label for label, _ in TELEMETRY_SPANS])
+        self.telemetry_span_dropdown.set_selected(1)
+        for dropdown in (self.telemetry_node_dropdown, self.telemetry_metric_dropdown,
+                         self.telemetry_span_dropdown):
+            dropdown.connect("notify::selected", self._on_telemetry_selection)
+            controls.append(dropdown)
+        self.telemetry_summary = Gtk.Label(label="")
+        self.telemetry_summary.set_xalign(0)
+        self.telemetry_summary.set_hexpand(True)
+        controls.append(self.telemetry_summary)
+        box.append(controls)
+
+        self._telemetry_points = []
+        self._telemetry_resolution = 0
+        self.telemetry_chart = Gtk.DrawingArea()
+        self.telemetry_chart.set_content_height(140)
+        self.telemetry_chart.set_draw_func(self._draw_telemetry)
+        box.append(self.telemetry_chart)
+
+        frame.set_child(box)
+        return frame
+
+    def _on_telemetry_selection(self, dropdown, _pspec):
+        if not self._telemetry_updating:
+            self._refresh_telemetry()
+
+    def _refresh_telemetry(self):
+        """Reload the node list and the selected series in the background"""
+        if not TELEMETRY_STORE_AVAILABLE:
+            return
+        node_index = self.telemetry_node_dropdown.get_selected()
+        node = (self._telemetry_nodes[node_index]
+                if node_index < len(self._telemetry_nodes) else None)
+        _, metric = TELEMETRY_METRICS[self.telemetry_metric_dropdown.get_selected()]
+        _, hours = TELEMETRY_SPANS[self.telemetry_span_dropdown.get_selected()]
+
+        def fetch():
+            try:
+                store = get_telemetry_store()
+                nodes = sorted({s['node'] for s in store.list_series()})
+                selected = node if node in nodes else (nodes[0] if nodes else None)
+                series = (store.query(selected, metric, start=time.time() - hours * 3600)
+                          if selected else None)
+                GLib.idle_add(self._update_telemetry, nodes, selected, series)
+            except Exception as e:
+                GLib.idle_add(self.telemetry_summary.set_label, f"History unavailable: {e}")
+
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def _update_telemetry(self, nodes, selected, series):
+        """Apply fetched history (main thread)"""
+        if nodes != self._telemetry_nodes:
+            self._telemetry_nodes = nodes
+            # Replacing the model re-fires notify::selected; skip that refresh
+            self._telemetry_updating = True
+            try:
+                self.telemetry_node_dropdown.set_model(
+                    Gtk.StringList.new(nodes or ["(no history yet)"]))
+                if selected in nodes:
+                    self.telemetry_node_dropdown.set_selected(nodes.index(selected))
+            finally:
+                self._telemetry_updating = False
+
+        points = series['points'] if series else []
+        self._telemetry_points = points
+        self._telemetry_resolution = series['resolution'] if series else 0
+        if points:
+            values = [p[1] if len(p) == 2 else p[2] for p in points]
+            self.telemetry_summary.set_label(
+                f"{len(points)} points  last {values[-1]:g}  "
+                f"min {min(p[1] for p in points):g}  max {max(p[-1] for p in points):g}")
+        else:
+            self.telemetry_summary.set_label("No samples in this range")
+        self.telemetry_chart.queue_draw()
+        return False
+
+    def _draw_telemetry(self, area, cr, width, height):
+        """Line chart: avg (or raw) line over a min/max band for rollups"""
+        points = self._telemetry_points
+        if len(points) < 2:
+            return
+        pad = 6
+        t0, t1 = points[0][0], points[-1][0]
+        lows = [p[1] for p in points]
+        highs = [p[-1] for p in points]
+        lo, hi = min(lows), max(highs)
+        if hi == lo:
+            hi, lo = hi + 1, lo - 1
+
+        def x(t):
+            return pad + (t - t0) / max(1, t1 - t0) * (width - 2 * pad)
+
+        def y(v):
+            return height - pad - (v - lo) / (hi - lo) * (height - 2 * pad)
+
+        if self._telemetry_resolution:
+            # min/max band
+            cr.set_source_rgba(0.2, 0.5, 0.9, 0.2)
+            cr.move_to(x(points[0][0]), y(highs[0]))
+            for p, high in zip(points[1:], highs[1:]):
+                cr.line_to(x(p[0]), y(high))
+            for p, low in zip(reversed(points), reversed(lows)):
+                cr.line_to(x(p[0]), y(low))
+            cr.close_path()
+            cr.fill()
+
+        cr.set_source_rgb(0.2, 0.5, 0.9)
+        cr.set_line_width(1.5)
+        for i, p in enumerate(points):
+            value = p[1] if len(p) == 2 else p[2]
+            if i == 0:
+                cr.move_to(x(p[0]), y(value))
+            else:
+                cr.line_to(x(p[0]), y(value))
+        cr.stroke()
+
     def _create_status_card(self, title, value, icon_name):
         """Create a status card widget"""
         frame = Gtk.Frame()
@@ -162,6 +317,7 @@ class DashboardPanel(Gtk.Box):
         thread = threading.Thread(target=self._fetch_data)
         thread.daemon = True
         thread.start()
+        self._refresh_telemetry()
 
     def _fetch_data(self):
         """Fetch all status data in background thread using commands layer"""
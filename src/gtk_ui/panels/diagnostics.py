@@ -19,6 +19,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List
 
+from ..panel_registry import PanelTimers
+
 # Import diagnostic system
 try:
     from utils.network_diagnostics import (
@@ -77,8 +79,9 @@ class DiagnosticsPanel(Gtk.Box):
 
         self._build_ui()
 
-        # Start periodic updates (store timer ID for cleanup)
-        self._update_timer_id = GLib.timeout_add_seconds(5, self._update_health_display)
+        # Start periodic updates (paused while the page is hidden)
+        self.panel_timers = PanelTimers()
+        self.panel_timers.add_seconds(5, self._update_health_display)
         self._is_destroyed = False
 
     def _build_ui(self):
@@ -907,9 +910,7 @@ class DiagnosticsPanel(Gtk.Box):
         self._is_destroyed = True
 
         # Stop the periodic timer
-        if hasattr(self, '_update_timer_id') and self._update_timer_id:
-            GLib.source_remove(self._update_timer_id)
-            self._update_timer_id = None
+        self.panel_timers.cancel_all()
 
         # Unregister callbacks from the diagnostics singleton
         if self.diag:
@@ -63,6 +63,15 @@ except ImportError:
         except Exception:
             return False
 
+from ..panel_registry import PanelTimers
+
+# Shared cached/concurrent HamClock fetch layer
+try:
+    from commands import hamclock as hamclock_commands
+    HAS_HAMCLOCK_COMMANDS = True
+except ImportError:
+    HAS_HAMCLOCK_COMMANDS = False
+
 # Try to import WebKit for embedded view
 # Note: WebKit doesn't work when running as root (sandbox issues)
 _is_root = os.geteuid() == 0
@@ -114,7 +123,8 @@ class HamClockPanel(Gtk.Box):
         self.set_margin_top(20)
         self.set_margin_bottom(20)
 
-        # Auto-refresh state
+        # Auto-refresh state; periodic timers pause while the page is hidden
+        self.panel_timers = PanelTimers()
         self._auto_refresh_timer_id = None
         self._last_update_time = None
         self._update_check_timer_id = None
@@ -141,7 +151,7 @@ class HamClockPanel(Gtk.Box):
             GLib.timeout_add(2000, self._start_auto_refresh)
 
         # Start update time checker (updates "last updated" display)
-        self._update_check_timer_id = GLib.timeout_add(60000, self._check_data_freshness)
+        self._update_check_timer_id = self.panel_timers.add_seconds(60, self._check_data_freshness)
 
     def _load_settings_legacy(self):
         """Legacy settings load for fallback"""
@@ -1138,42 +1148,71 @@ class HamClockPanel(Gtk.Box):
 
         def fetch():
             api_url = f"{url}:{api_port}"
-            weather_data = {}
-            success_count = 0
 
             logger.debug(f"[HamClock] Fetching from {api_url}...")
 
-            # Try various HamClock endpoints
-            endpoints = [
-                ("get_sys.txt", self._parse_sys),
-                ("get_spacewx.txt", self._parse_spacewx),
-                ("get_bc.txt", self._parse_band_conditions),
-            ]
+            weather_data, success_count = self._fetch_endpoints(api_url, timeout=5)
+
+            logger.debug(f"[HamClock] Fetched {success_count} endpoints, {len(weather_data)} values")
+            GLib.idle_add(self._update_weather_display, weather_data)
+
+        threading.Thread(target=fetch, daemon=True).start()
 
+    def _fetch_endpoints(self, api_url, timeout=5):
+        """
+        Fetch and parse get_sys/get_spacewx/get_bc from api_url.
+
+        Goes through the shared commands layer when available: the three
+        requests run concurrently and recent responses are served from
+        the process-wide cache (also used by the TUI and CLI). Runs on a
+        worker thread.
+
+        Returns:
+            (weather_data, success_count)
+        """
+        endpoints = [
+            ("get_sys.txt", self._parse_sys),
+            ("get_spacewx.txt", self._parse_spacewx),
+            ("get_bc.txt", self._parse_band_conditions),
+        ]
+        weather_data = {}
+        success_count = 0
+
+        if HAS_HAMCLOCK_COMMANDS:
+            results = hamclock_commands.fetch_endpoints(
+                [endpoint for endpoint, _ in endpoints], base_url=api_url)
             for endpoint, parser in endpoints:
+                result = results[endpoint]
+                if not result.success:
+                    logger.debug(f"[HamClock] {endpoint}: {result.message}")
+                    continue
                 try:
-                    full_url = f"{api_url}/{endpoint}"
-                    logger.debug(f"[HamClock] Trying {full_url}...")
-
-                    req = urllib.request.Request(full_url, method='GET')
-                    req.add_header('User-Agent', 'MeshForge/1.0')
-                    with urllib.request.urlopen(req, timeout=5) as response:
-                        data = response.read().decode('utf-8')
-                        logger.debug(f"[HamClock] {endpoint} response: {data[:100]}...")
-                        parsed = parser(data)
-                        weather_data.update(parsed)
-                        success_count += 1
-                except urllib.error.HTTPError as e:
-                    logger.debug(f"[HamClock] {endpoint}: HTTP {e.code} - {e.reason}")
-                except urllib.error.URLError as e:
-                    logger.debug(f"[HamClock] {endpoint}: URL Error - {e.reason}")
+                    weather_data.update(parser(result.raw_output))
+                    success_count += 1
                 except Exception as e:
                     logger.debug(f"[HamClock] {endpoint}: Error - {e}")
+            return weather_data, success_count
 
-            logger.debug(f"[HamClock] Fetched {success_count} endpoints, {len(weather_data)} values")
-            GLib.idle_add(self._update_weather_display, weather_data)
+        for endpoint, parser in endpoints:
+            try:
+                full_url = f"{api_url}/{endpoint}"
+                logger.debug(f"[HamClock] Trying {full_url}...")
 
-        threading.Thread(target=fetch, daemon=True).start()
+                req = urllib.request.Request(full_url, method='GET')
+                req.add_header('User-Agent', 'MeshForge/1.0')
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    data = response.read().decode('utf-8')
+                    logger.debug(f"[HamClock] {endpoint} response: {data[:100]}...")
+                    weather_data.update(parser(data))
+                    success_count += 1
+            except urllib.error.HTTPError as e:
+                logger.debug(f"[HamClock] {endpoint}: HTTP {e.code} - {e.reason}")
+            except urllib.error.URLError as e:
+                logger.debug(f"[HamClock] {endpoint}: URL Error - {e.reason}")
+            except Exception as e:
+                logger.debug(f"[HamClock] {endpoint}: Error - {e}")
+
+        return weather_data, success_count
 
     def _parse_band_conditions(self, data):
         """Parse band conditions response from HamClock API (get_bc.txt)"""
@@ -1771,7 +1810,7 @@ class HamClockPanel(Gtk.Box):
         self._retry_count = 0
 
         # Schedule periodic refresh
-        self._auto_refresh_timer_id = GLib.timeout_add(interval_ms, self._do_auto_refresh)
+        self._auto_refresh_timer_id = self.panel_timers.add(interval_ms, self._do_auto_refresh)
 
         # Update UI
         self.status_label.set_label(f"Auto-refresh: every {interval_minutes} min")
@@ -1781,7 +1820,7 @@ class HamClockPanel(Gtk.Box):
     def _stop_auto_refresh(self):
         """Stop the auto-refresh timer"""
         if self._auto_refresh_timer_id:
-            GLib.source_remove(self._auto_refresh_timer_id)
+            self.panel_timers.remove(self._auto_refresh_timer_id)
             self._auto_refresh_timer_id = None
             logger.info("[HamClock] Auto-refresh stopped")
             self.status_label.set_label("Auto-refresh disabled")
@@ -1810,31 +1849,12 @@ class HamClockPanel(Gtk.Box):
 
         def fetch():
             api_url = f"{url}:{api_port}"
-            weather_data = {}
-            success = False
 
             logger.debug(f"[HamClock] Auto-refresh fetch from {api_url}...")
 
-            endpoints = [
-                ("get_sys.txt", self._parse_sys),
-                ("get_spacewx.txt", self._parse_spacewx),
-                ("get_bc.txt", self._parse_band_conditions),
-            ]
-
-            for endpoint, parser in endpoints:
-                try:
-                    full_url = f"{api_url}/{endpoint}"
-                    req = urllib.request.Request(full_url, method='GET')
-                    req.add_header('User-Agent', 'MeshForge/1.0')
-                    with urllib.request.urlopen(req, timeout=10) as response:
-                        data = response.read().decode('utf-8')
-                        parsed = parser(data)
-                        weather_data.update(parsed)
-                        success = True
-                except Exception as e:
-                    logger.debug(f"[HamClock] Auto-refresh {endpoint}: {e}")
+            weather_data, success_count = self._fetch_endpoints(api_url, timeout=10)
 
-            if success:
+            if success_count:
                 self._retry_count = 0
                 GLib.idle_add(self._update_weather_display, weather_data)
             else:
@@ -1890,5 +1910,5 @@ class HamClockPanel(Gtk.Box):
         logger.debug("[HamClock] Cleaning up panel resources")
         self._stop_auto_refresh()
         if self._update_check_timer_id:
-            GLib.source_remove(self._update_check_timer_id)
+            self.panel_timers.remove(self._update_check_timer_id)
             self._update_check_timer_id = None
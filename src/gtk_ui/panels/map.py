@@ -12,6 +12,8 @@ import json
 import urllib.parse
 from pathlib import Path
 
+from ..panel_registry import PanelTimers
+
 # Import logging - try comprehensive utils first, fall back to standard
 try:
     from utils.logging_utils import get_logger
@@ -57,11 +59,8 @@ except (ValueError, ImportError):
 class MapPanel(Gtk.Box):
     """Map panel showing nodes from both RNS and Meshtastic networks"""
 
-    # Connection settings - short-lived to avoid blocking web client
-    _monitor = None
-    _monitor_lock = threading.Lock()
-    _last_connect_attempt = 0
-    _connect_backoff = 5  # Minimum seconds between connection attempts
+    # The Meshtastic connection is the process-wide shared NodeMonitor
+    # (monitoring.monitor_service); the map holds a lease while refreshing
     _use_persistent_connection = False  # Set True for persistent (may block web client)
 
     def __init__(self, main_window):
@@ -70,7 +69,7 @@ class MapPanel(Gtk.Box):
         self.node_tracker = None
         self.webview = None
         self._current_geojson = {"type": "FeatureCollection", "features": []}
-        self._refresh_timer_id = None  # Track timer for cleanup
+        self.panel_timers = PanelTimers()  # Paused while the page is hidden
 
         self.set_margin_start(20)
         self.set_margin_end(20)
@@ -79,8 +78,8 @@ class MapPanel(Gtk.Box):
 
         self._init_node_tracker()
         self._build_ui()
-        # Store timer ID for cleanup - refresh every 30 seconds to reduce memory pressure
-        self._refresh_timer_id = GLib.timeout_add_seconds(30, self._auto_refresh)
+        # Refresh every 30 seconds to reduce memory pressure
+        self.panel_timers.add_seconds(30, self._auto_refresh)
 
     def _init_node_tracker(self):
         """Initialize the node tracker for RNS discovery"""
@@ -103,11 +102,36 @@ class MapPanel(Gtk.Box):
         except Exception as e:
             logger.error(f"Failed to initialize node tracker: {e}")
 
+    @staticmethod
+    def _get_service():
+        """Process-wide shared NodeMonitor service (None if unavailable)"""
+        try:
+            from ...monitoring.monitor_service import get_monitor_service
+        except ImportError:
+            try:
+                from monitoring.monitor_service import get_monitor_service
+            except ImportError:
+                return None
+        return get_monitor_service('localhost', 4403)
+
     @classmethod
-    def _get_monitor(cls):
-        """Get or create persistent NodeMonitor"""
-        import time
+    def _keep_connection(cls):
+        """Hold the connection between refreshes?
+
+        Without the multiplexing proxy, meshtasticd's single client slot
+        is freed after each refresh so the web client can use it.
+        """
+        if cls._use_persistent_connection:
+            return True
+        try:
+            from utils.meshtastic_proxy import get_proxy_endpoint
+            return get_proxy_endpoint('localhost', 4403) is not None
+        except ImportError:
+            return False
 
+    @classmethod
+    def _get_monitor(cls):
+        """Get the shared NodeMonitor (connects on first use)"""
         # Check for web client mode - don't connect if enabled
         try:
             from ...utils.common import SettingsManager
@@ -117,37 +141,11 @@ class MapPanel(Gtk.Box):
         except Exception:
             pass
 
-        with cls._monitor_lock:
-            # Check if monitor exists and is connected
-            if cls._monitor is not None:
-                try:
-                    if cls._monitor.is_connected:
-                        return cls._monitor, None
-                except (BrokenPipeError, OSError, Exception) as e:
-                    logger.debug(f"Monitor connection check failed: {e}")
-
-                # Disconnect old monitor safely
-                try:
-                    cls._monitor.disconnect()
-                except (BrokenPipeError, OSError, Exception):
-                    pass
-                cls._monitor = None
-
-            # Backoff: Don't retry too frequently
-            now = time.time()
-            if now - cls._last_connect_attempt < cls._connect_backoff:
-                return None, "Waiting to reconnect..."
-            cls._last_connect_attempt = now
-
-            # Create new monitor
-            try:
-                from ...monitoring.node_monitor import NodeMonitor
-            except ImportError:
-                try:
-                    from monitoring.node_monitor import NodeMonitor
-                except ImportError:
-                    return None, "NodeMonitor not available"
+        service = cls._get_service()
+        if service is None:
+            return None, "NodeMonitor not available"
 
+        if not service.is_connected:
             try:
                 import socket
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -165,55 +163,31 @@ class MapPanel(Gtk.Box):
                     diag.log_connection("map", "meshtasticd:4403", False, str(e))
                 return None, error_msg
 
-            try:
-                monitor = NodeMonitor(host='localhost', port=4403)
-                if monitor.connect(timeout=15.0):
-                    # Wait for nodes to load - MQTT meshes can have 100+ nodes
-                    # Poll until node count stabilizes or timeout
-                    last_count = 0
-                    stable_count = 0
-                    for _ in range(10):  # Max 10 seconds
-                        time.sleep(1.0)
-                        count = monitor.get_node_count()
-                        if count == last_count:
-                            stable_count += 1
-                            if stable_count >= 2:  # Stable for 2 seconds
-                                break
-                        else:
-                            stable_count = 0
-                            last_count = count
-                    cls._monitor = monitor
-                    logger.info(f"NodeMonitor connected, {monitor.get_node_count()} nodes")
-                    if diag:
-                        diag.log_connection("map", "meshtasticd:4403", True)
-                        diag.log_event(
-                            EventCategory.NETWORK, EventSeverity.INFO, "map",
-                            f"Discovered {monitor.get_node_count()} Meshtastic nodes"
-                        )
-                    return monitor, None
-                else:
-                    error_msg = "Failed to connect to meshtasticd"
-                    if diag:
-                        diag.log_connection("map", "meshtasticd:4403", False, error_msg)
-                    return None, error_msg
-            except Exception as e:
-                error_str = str(e).lower()
-                # Detect common connection conflicts
-                if 'connection refused' in error_str or 'refused' in error_str:
-                    error_msg = "Connection refused - another client may be connected"
-                elif 'timed out' in error_str or 'timeout' in error_str:
-                    error_msg = "Connection timeout - meshtasticd may be busy with another client"
-                elif 'broken pipe' in error_str:
-                    error_msg = "Connection lost - another client took over"
-                elif 'already in use' in error_str:
-                    error_msg = "Port in use by another client (meshing-around, nomadnet?)"
-                else:
-                    error_msg = f"Connection error: {e}"
-
-                logger.warning(f"[Map] {error_msg}")
-                if diag:
-                    diag.log_connection("map", "meshtasticd:4403", False, str(e))
-                return None, error_msg
+        connects = service.get_stats()['connects']
+        monitor, error_msg = service.get_monitor()
+        if monitor is None:
+            error_str = (error_msg or "").lower()
+            # Detect common connection conflicts
+            if 'connection refused' in error_str or 'refused' in error_str:
+                error_msg = "Connection refused - another client may be connected"
+            elif 'timed out' in error_str or 'timeout' in error_str:
+                error_msg = "Connection timeout - meshtasticd may be busy with another client"
+            elif 'broken pipe' in error_str:
+                error_msg = "Connection lost - another client took over"
+            elif 'already in use' in error_str:
+                error_msg = "Port in use by another client (meshing-around, nomadnet?)"
+            logger.warning(f"[Map] {error_msg}")
+            if diag:
+                diag.log_connection("map", "meshtasticd:4403", False, error_msg)
+            return None, error_msg
+
+        if diag and service.get_stats()['connects'] != connects:
+            diag.log_connection("map", "meshtasticd:4403", True)
+            diag.log_event(
+                EventCategory.NETWORK, EventSeverity.INFO, "map",
+                f"Discovered {monitor.get_node_count()} Meshtastic nodes"
+            )
+        return monitor, None
 
     def _build_ui(self):
         """Build the map panel UI"""
@@ -425,8 +399,14 @@ class MapPanel(Gtk.Box):
             nodes_raw = []
             error_msg = None
 
-            # Get persistent monitor
-            monitor, error_msg = MapPanel._get_monitor()
+            # Lease the shared monitor for this refresh
+            service = MapPanel._get_service()
+            if service:
+                service.acquire("map")
+            try:
+                monitor, error_msg = MapPanel._get_monitor()
+            except Exception as e:
+                monitor, error_msg = None, str(e)
 
             if monitor:
                 try:
@@ -501,33 +481,20 @@ class MapPanel(Gtk.Box):
                     }
                     geojson = {"type": "FeatureCollection", "features": features}
 
-                    # Disconnect after reading to avoid blocking web client
-                    if not MapPanel._use_persistent_connection:
-                        with MapPanel._monitor_lock:
-                            try:
-                                if MapPanel._monitor:
-                                    MapPanel._monitor.disconnect()
-                                    logger.debug("Disconnected monitor (non-persistent mode)")
-                            except Exception:
-                                pass
-                            MapPanel._monitor = None
-
                 except (BrokenPipeError, OSError) as e:
-                    # Connection lost - clear monitor for reconnect next time
+                    # Connection lost - the shared monitor reconnects next time
                     # Use debug level to avoid log spam during reconnection
                     logger.debug(f"Meshtastic connection lost: {e}")
-                    with MapPanel._monitor_lock:
-                        try:
-                            if MapPanel._monitor:
-                                MapPanel._monitor.disconnect()
-                        except Exception:
-                            pass
-                        MapPanel._monitor = None
                     error_msg = "Connection lost - will retry"
                 except Exception as e:
                     logger.debug(f"Error fetching Meshtastic nodes: {e}")
                     error_msg = str(e)
 
+            if service:
+                # Without a proxy, free meshtasticd's slot now unless another
+                # panel in this process still holds a lease
+                service.release("map", linger=None if MapPanel._keep_connection() else 0)
+
             # Also fetch RNS nodes from the unified tracker
             rns_count = 0
             if self.node_tracker:
@@ -958,12 +925,7 @@ document.addEventListener('DOMContentLoaded', function() {{
     def cleanup(self):
         """Cleanup when panel is destroyed"""
         # Remove auto-refresh timer to prevent memory leaks
-        if self._refresh_timer_id:
-            try:
-                GLib.source_remove(self._refresh_timer_id)
-                self._refresh_timer_id = None
-            except Exception:
-                pass
+        self.panel_timers.cancel_all()
 
         # Stop node tracker
         if self.node_tracker:
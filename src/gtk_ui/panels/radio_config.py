@@ -20,6 +20,12 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+# Shared LoRa channel-plan tables (frequency calculator)
+try:
+    from utils.channel_plan import plan as channel_plan
+except ImportError:
+    from ...utils.channel_plan import plan as channel_plan
+
 # Import meshtastic connection utilities
 try:
     from utils.meshtastic_connection import (
@@ -1198,10 +1204,8 @@ class RadioConfigPanel(Gtk.Box):
 
         box.append(grid)
 
-        # Store current params for frequency calculation
-        self._freq_calc_num_slots = 104  # Default for US/LONG_FAST
-        self._freq_calc_freq_start = 902.0
-        self._freq_calc_bw = 250
+        # Current slot table for frequency calculation
+        self._freq_calc_plan = channel_plan("US", "LONG_FAST")
 
         # Calculate on load
         GLib.idle_add(self._update_frequency_calculator)
@@ -1241,8 +1245,7 @@ class RadioConfigPanel(Gtk.Box):
 
         # Get channel name and calculate its slot
         channel_name = presets[preset_idx]
-        h = self._djb2_hash(channel_name)
-        slot = h % self._freq_calc_num_slots
+        slot = self._freq_calc_plan.slot_for(channel_name)
 
         # Update slot dropdown to match (without triggering the slot changed handler)
         self.freq_calc_slot_dropdown.handler_block_by_func(self._on_freq_slot_selected)
@@ -1254,8 +1257,6 @@ class RadioConfigPanel(Gtk.Box):
 
     def _update_frequency_calculator(self):
         """Update all frequency calculator fields and rebuild slot dropdown"""
-        import math
-
         # Get selected region - must match dropdown order exactly
         regions = ["UNSET", "US", "EU_433", "EU_868", "CN", "JP", "ANZ", "KR", "TW", "RU",
                    "IN", "NZ_865", "TH", "LORA_24", "UA_433", "UA_868", "MY_433", "MY_919",
@@ -1269,24 +1270,15 @@ class RadioConfigPanel(Gtk.Box):
         preset_idx = self.freq_calc_preset.get_selected()
         preset = presets[preset_idx] if preset_idx < len(presets) else "LONG_FAST"
 
-        # Get region parameters and bandwidth
-        freq_start, freq_end, spacing, _ = self._get_region_params(region)
-        bw = self._get_preset_bandwidth(preset)
-
-        # Calculate number of slots
-        num_slots = int(math.floor((freq_end - freq_start) / (spacing + (bw / 1000))))
-
-        # Store for frequency calculation
-        self._freq_calc_num_slots = num_slots
-        self._freq_calc_freq_start = freq_start
-        self._freq_calc_bw = bw
+        # Precomputed slot table for this region and preset
+        self._freq_calc_plan = channel_plan(region, preset)
+        num_slots = self._freq_calc_plan.num_channels
 
         # Update Number of slots label
         self.freq_calc_num_slots.set_label(str(num_slots))
 
         # Calculate default slot (for "LongFast" channel name)
-        default_hash = self._djb2_hash("LongFast")
-        default_slot = default_hash % num_slots
+        default_slot = self._freq_calc_plan.slot_for("LongFast")
         self.freq_calc_default_slot.set_label(str(default_slot + 1))  # 1-indexed display
 
         # Rebuild slot dropdown with new range
@@ -1295,10 +1287,7 @@ class RadioConfigPanel(Gtk.Box):
         self.freq_calc_slot_dropdown.set_model(slot_model)
 
         # Set to default slot (LongFast)
-        if default_slot < num_slots:
-            self.freq_calc_slot_dropdown.set_selected(default_slot)
-        else:
-            self.freq_calc_slot_dropdown.set_selected(0)
+        self.freq_calc_slot_dropdown.set_selected(default_slot)
 
         # Set channel preset to LongFast
         self.freq_calc_channel_preset.set_selected(1)  # LongFast
@@ -1307,66 +1296,10 @@ class RadioConfigPanel(Gtk.Box):
         self._update_slot_frequency()
 
     def _update_slot_frequency(self):
-        """Calculate and display frequency for selected slot"""
-        slot_idx = self.freq_calc_slot_dropdown.get_selected()
-        slot = slot_idx  # 0-indexed internally
-
-        # Calculate center frequency: freqStart + (bw / 2000) + (slot * (bw / 1000))
-        center_freq = self._freq_calc_freq_start + (self._freq_calc_bw / 2000) + (slot * (self._freq_calc_bw / 1000))
-        self.freq_calc_freq.set_label(f"{center_freq:.3f} MHz")
-
-    def _djb2_hash(self, s):
-        """Calculate djb2 hash - same algorithm as Meshtastic firmware"""
-        h = 5381
-        for c in s:
-            h = ((h << 5) + h) + ord(c)
-        return h & 0xFFFFFFFF  # Keep it 32-bit unsigned
-
-    def _get_region_params(self, region):
-        """Get frequency parameters for a region"""
-        # Region parameters: (freqStart, freqEnd, spacing, dutyCycle)
-        # Spacing is typically 0 for most regions (calculated from bandwidth)
-        # Based on https://meshtastic.org/docs/overview/radio-settings/
-        regions = {
-            "UNSET": (902.0, 928.0, 0, 100),      # Defaults to US
-            "US": (902.0, 928.0, 0, 100),
-            "EU_433": (433.0, 434.0, 0, 10),
-            "EU_868": (869.4, 869.65, 0, 10),
-            "CN": (470.0, 510.0, 0, 100),
-            "JP": (920.8, 923.8, 0, 100),
-            "ANZ": (915.0, 928.0, 0, 100),
-            "KR": (920.0, 923.0, 0, 100),
-            "TW": (920.0, 925.0, 0, 100),
-            "RU": (868.7, 869.2, 0, 100),
-            "IN": (865.0, 867.0, 0, 100),
-            "NZ_865": (864.0, 868.0, 0, 100),
-            "TH": (920.0, 925.0, 0, 100),
-            "LORA_24": (2400.0, 2483.5, 0, 100),
-            "UA_433": (433.0, 434.79, 0, 10),
-            "UA_868": (868.0, 868.6, 0, 1),
-            "MY_433": (433.0, 435.0, 0, 100),
-            "MY_919": (919.0, 924.0, 0, 100),
-            "SG_923": (920.0, 925.0, 0, 100),
-            "PH": (920.0, 925.0, 0, 100),        # Philippines 920 MHz band
-            "UK_868": (869.4, 869.65, 0, 10),    # UK 868 MHz (same as EU_868)
-            "SINGAPORE": (920.0, 925.0, 0, 100), # Same as SG_923
-        }
-        return regions.get(region, (902.0, 928.0, 0, 100))
-
-    def _get_preset_bandwidth(self, preset):
-        """Get bandwidth in kHz for a modem preset"""
-        # Bandwidths from Meshtastic modem presets
-        presets = {
-            "LONG_FAST": 250,
-            "LONG_SLOW": 125,
-            "LONG_MODERATE": 125,
-            "MEDIUM_SLOW": 250,
-            "MEDIUM_FAST": 250,
-            "SHORT_SLOW": 250,
-            "SHORT_FAST": 250,
-            "SHORT_TURBO": 500,
-        }
-        return presets.get(preset, 250)
+        """Display the frequency of the selected slot"""
+        slot = self.freq_calc_slot_dropdown.get_selected()  # 0-indexed internally
+        if slot < self._freq_calc_plan.num_channels:
+            self.freq_calc_freq.set_label(f"{self._freq_calc_plan.frequency(slot):.3f} MHz")
 
     def _add_position_section(self, parent):
         """Add position settings section"""
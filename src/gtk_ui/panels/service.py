@@ -26,6 +26,12 @@ except ImportError:
     run_admin_command_async = None
     systemctl_admin = None
 
+# Shared journal follower (log follow mode reads its buffer)
+try:
+    from utils.log_service import get_log_service
+except ImportError:
+    get_log_service = None
+
 # Fallback to old service checker
 try:
     from utils.service_check import check_service, ServiceState
@@ -428,7 +434,10 @@ class ServicePanel(Gtk.Box):
     def _on_follow_toggled(self, button):
         """Handle follow toggle"""
         if button.get_active():
-            # Start following logs
+            # Start following logs; once the shared follower is up, each
+            # tick reads its buffer (commands layer) instead of journalctl
+            if get_log_service is not None:
+                get_log_service().start()
             self.follow_timer = GLib.timeout_add_seconds(2, self._follow_tick)
             self._fetch_logs()
         else:
@@ -479,10 +479,9 @@ class SettingsPanel(Gtk.Box):
             # Disconnect any existing connections
             try:
                 from ..panels.map import MapPanel
-                with MapPanel._monitor_lock:
-                    if MapPanel._monitor:
-                        MapPanel._monitor.disconnect()
-                        MapPanel._monitor = None
+                service = MapPanel._get_service()
+                if service:
+                    service.shutdown()
             except Exception:
                 pass
         else:
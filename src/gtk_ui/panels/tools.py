@@ -22,6 +22,8 @@ import urllib.request
 import webbrowser
 from pathlib import Path
 
+from ..panel_registry import PanelTimers
+
 # Import centralized path utility
 try:
     from utils.paths import get_real_user_home
@@ -163,8 +165,9 @@ class ToolsPanel(Gtk.Box):
         sys_frame.set_child(sys_box)
         content.append(sys_frame)
 
-        # Start system monitor update timer
-        GLib.timeout_add_seconds(2, self._update_system_stats)
+        # Start system monitor update timer (paused while the page is hidden)
+        self.panel_timers = PanelTimers()
+        self.panel_timers.add_seconds(2, self._update_system_stats)
 
         # Network Tools Section
         net_frame = Gtk.Frame()
@@ -14,6 +14,12 @@ gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, GLib
 
+try:
+    from utils.net_scanner import local_subnets, scan_sync
+except ImportError:
+    local_subnets = None
+    scan_sync = None
+
 
 class NetworkToolsMixin:
     """Mixin providing network testing functionality for ToolsPanel"""
@@ -111,30 +117,18 @@ class NetworkToolsMixin:
 
     def _run_scan(self):
         """Run device scan in background"""
+        if scan_sync is None:
+            GLib.idle_add(self._log, "Scan error: network scanner not available")
+            return
         try:
-            # Get local network
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-
-            base = '.'.join(local_ip.split('.')[:3])
-            found = []
-
-            GLib.idle_add(self._log, f"Scanning {base}.1-254...")
-
-            for i in range(1, 255):
-                ip = f"{base}.{i}"
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(0.3)
-                    result = sock.connect_ex((ip, 4403))
-                    sock.close()
-                    if result == 0:
-                        found.append(ip)
-                        GLib.idle_add(self._log, f"Found: {ip}:4403")
-                except Exception:
-                    pass
+            subnets = local_subnets()
+            if not subnets:
+                GLib.idle_add(self._log, "No local network found")
+                return
+
+            GLib.idle_add(self._log, f"Scanning {', '.join(str(s) for s in subnets)}...")
+            found = scan_sync(subnets, ['meshtastic'],
+                              callback=lambda r: GLib.idle_add(self._log, f"Found: {r.address}"))
 
             if found:
                 GLib.idle_add(self._log, f"\nFound {len(found)} device(s)")
@@ -1427,6 +1427,7 @@ Made with aloha for the mesh community
         """Messaging menu."""
         choices = [
             ("view", "View Recent Messages"),
+            ("search", "Search Messages"),
             ("send", "Send Message"),
             ("stats", "Message Statistics"),
             ("back", "Back"),
@@ -1444,6 +1445,8 @@ Made with aloha for the mesh community
 
             if choice == "view":
                 self._view_messages()
+            elif choice == "search":
+                self._search_messages()
             elif choice == "send":
                 self._send_message()
             elif choice == "stats":
@@ -1476,6 +1479,53 @@ Made with aloha for the mesh community
         except Exception as e:
             self.dialog.msgbox("Error", f"Failed to load messages:\n{e}")
 
+    def _search_messages(self):
+        """Full-text search of message history, a page at a time."""
+        try:
+            query = self.dialog.inputbox(
+                "Search Messages",
+                "Callsign, incident number or keywords\n"
+                "(\"quoted phrase\", prefix*):",
+                ""
+            )
+            if not query:
+                return
+
+            sys.path.insert(0, str(self.src_dir))
+            from commands import messaging
+
+            page_size = 10
+            offset = 0
+            while True:
+                result = messaging.search_messages(query, limit=page_size, offset=offset)
+                if not result.success:
+                    self.dialog.msgbox("Error", result.message)
+                    return
+
+                messages = result.data.get('messages', [])
+                if not messages:
+                    self.dialog.msgbox("Search", "No more matches." if offset else
+                                       f"No messages match '{query}'.")
+                    return
+
+                text = ""
+                for msg in messages:
+                    ts = (msg.get('timestamp') or '')[:16]
+                    from_id = msg.get('from_id', '?')
+                    snippet = msg.get('snippet') or msg.get('content', '')
+                    text += f"[{ts}] {from_id} ({msg.get('network', '')})\n  {snippet[:70]}\n\n"
+
+                title = f"Matches {offset + 1}-{offset + len(messages)}"
+                if len(messages) < page_size:
+                    self.dialog.msgbox(title, text)
+                    return
+                if not self.dialog.yesno(title, text + "Show more matches?", default_no=True):
+                    return
+                offset += page_size
+
+        except Exception as e:
+            self.dialog.msgbox("Error", f"Search failed:\n{e}")
+
     def _send_message(self):
         """Send a message."""
         try:
@@ -1580,42 +1630,11 @@ Storage: messages.db"""
 
         All 22 Meshtastic regions supported with correct band definitions.
         """
-        # Region definitions: (name, freq_start_mhz, freq_end_mhz, default_slots, description)
-        # Slots are calculated dynamically based on bandwidth, default_slots is for display
-        regions = [
-            # Americas
-            ("US", 902.0, 928.0, 104, "United States ISM"),
-            ("ANZ", 915.0, 928.0, 52, "Australia/NZ"),
-
-            # Europe
-            ("EU_868", 869.4, 869.65, 1, "EU 869 MHz (SRD)"),
-            ("EU_433", 433.0, 434.0, 8, "EU 433 MHz"),
-            ("UK_868", 869.4, 869.65, 1, "UK 869 MHz"),
-            ("UA_868", 868.0, 868.6, 2, "Ukraine 868 MHz"),
-            ("UA_433", 433.0, 434.79, 8, "Ukraine 433 MHz"),
-            ("RU", 868.7, 869.2, 2, "Russia"),
-
-            # Asia-Pacific
-            ("JP", 920.8, 923.8, 10, "Japan"),
-            ("KR", 920.0, 923.0, 12, "Korea"),
-            ("TW", 920.0, 925.0, 20, "Taiwan"),
-            ("CN", 470.0, 510.0, 80, "China"),
-            ("IN", 865.0, 867.0, 8, "India"),
-            ("TH", 920.0, 925.0, 20, "Thailand"),
-            ("PH", 920.0, 925.0, 20, "Philippines"),
-            ("SG_923", 920.0, 925.0, 20, "Singapore 923"),
-            ("MY_433", 433.0, 435.0, 8, "Malaysia 433 MHz"),
-            ("MY_919", 919.0, 924.0, 20, "Malaysia 919 MHz"),
-
-            # Oceania
-            ("NZ_865", 864.0, 868.0, 16, "New Zealand 865 MHz"),
-
-            # 2.4 GHz ISM (worldwide)
-            ("LORA_24", 2400.0, 2483.5, 39, "2.4 GHz ISM (worldwide)"),
-        ]
+        from utils.channel_plan import REGIONS, djb2_hash, num_channels as slot_count, slot_frequency
 
         # Select region
-        region_choices = [(r[0], f"{r[0]}: {r[1]:.1f}-{r[2]:.1f} MHz") for r in regions]
+        region_choices = [(name, f"{name}: {r['start']:.1f}-{r['end']:.1f} MHz")
+                          for name, r in REGIONS.items()]
         region_choices.append(("back", "Back"))
 
         region_choice = self.dialog.menu(
@@ -1627,13 +1646,7 @@ Storage: messages.db"""
         if not region_choice or region_choice == "back":
             return
 
-        # Find region
-        region = None
-        for r in regions:
-            if r[0] == region_choice:
-                region = r
-                break
-
+        region = REGIONS.get(region_choice)
         if not region:
             return
 
@@ -1673,17 +1686,13 @@ Storage: messages.db"""
         try:
             bw_khz = float(bw_choice)
 
-            region_name = region[0]
-            freq_start = region[1]
-            freq_end = region[2]
-            max_slots = region[3]
-            region_desc = region[4]
+            region_name = region_choice
+            freq_start = region['start']
+            freq_end = region['end']
+            region_desc = region['desc']
 
-            # Calculate num_channels based on bandwidth
-            # Formula: slots = floor((freq_end - freq_start) / (bw_khz / 1000))
-            import math
-            calculated_slots = int(math.floor((freq_end - freq_start) / (bw_khz / 1000)))
-            num_channels = min(calculated_slots, max_slots) if calculated_slots > 0 else max_slots
+            # slots = floor((freq_end - freq_start) / (bw_khz / 1000))
+            num_channels = slot_count(region_name, bw_khz)
 
             if mode == "name":
                 # Get channel name
@@ -1696,14 +1705,6 @@ Storage: messages.db"""
                 if not channel_name:
                     return
 
-                # djb2 hash algorithm
-                def djb2_hash(s):
-                    h = 5381
-                    for c in s:
-                        h = ((h << 5) + h) + ord(c)
-                        h &= 0xFFFFFFFF  # Keep as 32-bit
-                    return h
-
                 hash_val = djb2_hash(channel_name)
                 slot = hash_val % num_channels
 
@@ -1722,9 +1723,8 @@ Storage: messages.db"""
                     self.dialog.msgbox("Error", f"Slot must be 0-{num_channels-1}")
                     return
 
-            # Calculate frequency
             # freq = freqStart + (bw/2000) + (slot * (bw/1000))
-            freq_mhz = freq_start + (bw_khz / 2000) + (slot * (bw_khz / 1000))
+            freq_mhz = slot_frequency(region_name, bw_khz, slot)
 
             text = f"""Frequency Slot Calculation:
 
@@ -13,6 +13,10 @@ Usage:
 Daemon Control:
     python3 src/main_gtk.py --status       # Check if daemon is running
     python3 src/main_gtk.py --stop         # Stop running daemon
+
+Startup benchmark (time to first interactive window, then exit):
+    sudo python3 src/main_gtk.py --startup-benchmark
+    sudo python3 src/main_gtk.py --startup-benchmark --eager-panels   # build every panel
 """
 
 import os
@@ -367,6 +371,10 @@ def main():
                         help='Check if daemon is running')
     parser.add_argument('--stop', action='store_true',
                         help='Stop running daemon')
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help='Print time to first interactive window and exit')
+    parser.add_argument('--eager-panels', action='store_true',
+                        help='Build every panel at startup instead of on first view')
     args, remaining = parser.parse_known_args()
 
     # Handle daemon control commands (don't need root)
@@ -385,6 +393,11 @@ def main():
     check_gtk()
     check_meshtastic_cli()
 
+    if args.startup_benchmark:
+        os.environ['MESHFORGE_STARTUP_BENCHMARK'] = '1'
+    if args.eager_panels:
+        os.environ['MESHFORGE_EAGER_PANELS'] = '1'
+
     # Daemonize if requested (spawns new process and exits)
     if args.daemon:
         daemonize()
@@ -48,6 +48,30 @@ except ImportError:
     _check_service = None
     check_port = None
 
+# Shared service/port poller (also feeds /api/status/stream)
+try:
+    from utils.system_state import get_system_state
+except ImportError:
+    get_system_state = None
+
+# Native /proc and sysfs readers
+try:
+    from utils import sysinfo
+except ImportError:
+    sysinfo = None
+
+# Shared journal follower (log endpoints read its buffer)
+try:
+    from utils import log_service
+except ImportError:
+    log_service = None
+
+# Shared /proc/net socket table parser
+try:
+    from utils import network_diag
+except ImportError:
+    network_diag = None
+
 # Import meshtastic connection manager for resilient TCP handling
 try:
     from utils.meshtastic_connection import get_connection_manager, MeshtasticConnectionManager
@@ -116,10 +140,10 @@ def cleanup_processes():
     except Exception:
         pass
 
-    # Close node monitor gracefully
+    # Release the shared node monitor
     try:
         if _node_monitor is not None:
-            _node_monitor.disconnect()
+            _node_monitor.shutdown()
             _node_monitor = None
     except Exception:
         pass
@@ -347,6 +371,18 @@ def find_meshtastic_cli():
 
 def check_service_status():
     """Check meshtasticd service status using centralized checker"""
+    # Shared poller state: no per-request subprocesses
+    if get_system_state:
+        state = get_system_state().get()
+        unit = state.service('meshtasticd')
+        if unit is not None and unit.active == 'active':
+            return True, "Running (systemd)"
+        if unit is not None and unit.process:
+            return True, "Running (process)"
+        if state.port_open('meshtasticd'):
+            return True, "Running (TCP 4403)"
+        return False, "Stopped"
+
     # Use centralized service checker if available
     if _check_service:
         status = _check_service('meshtasticd')
@@ -453,10 +489,14 @@ def get_system_stats():
     # Temperature
     try:
         temp = None
-        temp_file = Path('/sys/class/thermal/thermal_zone0/temp')
-        if temp_file.exists():
-            temp = int(temp_file.read_text().strip()) / 1000
+        if sysinfo is not None:
+            temp = sysinfo.cpu_temperature()
+        else:
+            temp_file = Path('/sys/class/thermal/thermal_zone0/temp')
+            if temp_file.exists():
+                temp = int(temp_file.read_text().strip()) / 1000
         if temp is None:
+            # No thermal zone exposed: ask the Pi firmware
             result = subprocess.run(['vcgencmd', 'measure_temp'],
                                    capture_output=True, text=True, timeout=5)
             if result.returncode == 0 and 'temp=' in result.stdout:
@@ -490,8 +530,21 @@ def get_system_stats():
     return stats
 
 
+def _shared_logs():
+    """The running log service once its backfill is in (None: use journalctl)"""
+    if log_service is None:
+        return None
+    logs = log_service.get_log_service()
+    if logs.wait_ready(timeout=5) and logs.running:
+        return logs
+    return None
+
+
 def get_service_logs(lines=50):
     """Get recent service logs"""
+    logs = _shared_logs()
+    if logs is not None:
+        return log_service.format_entries(logs.tail('meshtasticd', lines))
     try:
         result = subprocess.run(
             ['journalctl', '-u', 'meshtasticd', '-n', str(lines), '--no-pager'],
@@ -783,152 +836,153 @@ def get_nodes():
         return {'error': str(e), 'nodes': []}
 
 
-# Node monitor for full node data with positions
+# Shared node monitor service (one connection for every request)
 _node_monitor = None
 _node_monitor_lock = threading.Lock()
 
 
-def get_nodes_full():
-    """Get detailed node info including positions using NodeMonitor"""
+def _get_monitor_service():
+    """Lease the process-wide NodeMonitor service for the web server's lifetime"""
     global _node_monitor
+    with _node_monitor_lock:
+        if _node_monitor is None:
+            try:
+                from monitoring.monitor_service import get_monitor_service
+            except ImportError:
+                from src.monitoring.monitor_service import get_monitor_service
+            _node_monitor = get_monitor_service('localhost', 4403)
+            _node_monitor.acquire('web')
+        return _node_monitor
 
-    # Check if port is reachable first
+
+def get_nodes_full():
+    """Get detailed node info including positions using the shared NodeMonitor"""
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3.0)
-        if sock.connect_ex(('localhost', 4403)) != 0:
+        service = _get_monitor_service()
+    except ImportError:
+        return {'error': 'NodeMonitor not available'}
+
+    # Check if port is reachable first
+    if not service.is_connected:
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(3.0)
+            if sock.connect_ex(('localhost', 4403)) != 0:
+                sock.close()
+                return {'error': 'meshtasticd not running (port 4403)'}
             sock.close()
-            return {'error': 'meshtasticd not running (port 4403)'}
-        sock.close()
-    except Exception:
-        return {'error': 'Cannot connect to meshtasticd'}
+        except Exception:
+            return {'error': 'Cannot connect to meshtasticd'}
 
     try:
-        with _node_monitor_lock:
-            # Import NodeMonitor
-            try:
-                from monitoring.node_monitor import NodeMonitor
-            except ImportError:
-                try:
-                    from src.monitoring.node_monitor import NodeMonitor
-                except ImportError:
-                    return {'error': 'NodeMonitor not available'}
-
-            # Create or reuse monitor
-            if _node_monitor is None or not _node_monitor.is_connected:
-                if _node_monitor:
-                    try:
-                        _node_monitor.disconnect()
-                    except Exception:
-                        pass
-                _node_monitor = NodeMonitor(host='localhost', port=4403)
-                if not _node_monitor.connect(timeout=10.0):
-                    return {'error': 'Failed to connect to meshtasticd'}
+        monitor, error = service.get_monitor()
+        if monitor is None:
+            return {'error': error or 'Failed to connect to meshtasticd'}
+
+        # Get nodes
+        nodes = []
+        my_node = monitor.get_my_node()
+
+        for node in monitor.get_nodes():
+            node_data = {
+                'id': node.node_id,
+                'name': node.long_name or node.short_name or node.node_id,
+                'short': node.short_name,
+                'hardware': node.hardware_model,
+                'role': node.role,
+                'snr': node.snr,
+                'hops': node.hops_away,
+                'via_mqtt': node.via_mqtt,
+                'is_me': node.node_id == monitor.my_node_id,
+            }
 
-            # Get nodes
-            nodes = []
-            my_node = _node_monitor.get_my_node()
-
-            for node in _node_monitor.get_nodes():
-                node_data = {
-                    'id': node.node_id,
-                    'name': node.long_name or node.short_name or node.node_id,
-                    'short': node.short_name,
-                    'hardware': node.hardware_model,
-                    'role': node.role,
-                    'snr': node.snr,
-                    'hops': node.hops_away,
-                    'via_mqtt': node.via_mqtt,
-                    'is_me': node.node_id == _node_monitor.my_node_id,
+            # Position
+            if node.position and (node.position.latitude or node.position.longitude):
+                node_data['position'] = {
+                    'latitude': node.position.latitude,
+                    'longitude': node.position.longitude,
+                    'altitude': node.position.altitude,
                 }
 
-                # Position
-                if node.position and (node.position.latitude or node.position.longitude):
-                    node_data['position'] = {
-                        'latitude': node.position.latitude,
-                        'longitude': node.position.longitude,
-                        'altitude': node.position.altitude,
-                    }
+            # Metrics
+            if node.metrics:
+                node_data['battery'] = node.metrics.battery_level
+                node_data['voltage'] = node.metrics.voltage
+                if node.metrics.temperature:
+                    node_data['temperature'] = node.metrics.temperature
+                if node.metrics.humidity:
+                    node_data['humidity'] = node.metrics.humidity
+
+            # Last heard
+            if node.last_heard:
+                node_data['last_heard'] = node.last_heard.isoformat()
+                # Calculate how long ago
+                delta = datetime.now() - node.last_heard
+                if delta.total_seconds() < 60:
+                    node_data['last_heard_ago'] = f"{int(delta.total_seconds())}s ago"
+                elif delta.total_seconds() < 3600:
+                    node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 60)}m ago"
+                elif delta.total_seconds() < 86400:
+                    node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 3600)}h ago"
+                else:
+                    node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 86400)}d ago"
 
-                # Metrics
-                if node.metrics:
-                    node_data['battery'] = node.metrics.battery_level
-                    node_data['voltage'] = node.metrics.voltage
-                    if node.metrics.temperature:
-                        node_data['temperature'] = node.metrics.temperature
-                    if node.metrics.humidity:
-                        node_data['humidity'] = node.metrics.humidity
-
-                # Last heard
-                if node.last_heard:
-                    node_data['last_heard'] = node.last_heard.isoformat()
-                    # Calculate how long ago
-                    delta = datetime.now() - node.last_heard
-                    if delta.total_seconds() < 60:
-                        node_data['last_heard_ago'] = f"{int(delta.total_seconds())}s ago"
-                    elif delta.total_seconds() < 3600:
-                        node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 60)}m ago"
-                    elif delta.total_seconds() < 86400:
-                        node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 3600)}h ago"
-                    else:
-                        node_data['last_heard_ago'] = f"{int(delta.total_seconds() / 86400)}d ago"
-
-                nodes.append(node_data)
-
-            # Try to add RNS nodes from gateway
-            rns_nodes_added = 0
-            try:
-                from gateway.node_tracker import UnifiedNodeTracker
-                # Check if there's a running tracker instance we can query
-                # This is a singleton-ish pattern - try to get cached instance
-                tracker_file = '/tmp/meshforge_rns_nodes.json'
-                import json
-                import os
-                if os.path.exists(tracker_file):
-                    with open(tracker_file) as f:
-                        rns_data = json.load(f)
-                        for rnode in rns_data.get('nodes', []):
-                            # Only add if not already in list (by matching name or RNS hash)
-                            existing_ids = {n.get('id') for n in nodes}
-                            if rnode.get('rns_hash') and rnode.get('rns_hash') not in existing_ids:
-                                node_data = {
-                                    'id': rnode.get('rns_hash', '')[:16],
-                                    'name': rnode.get('name', 'RNS Node'),
-                                    'short': rnode.get('short_name', 'RNS'),
-                                    'hardware': 'RNS',
-                                    'network': 'rns',
-                                    'is_me': False,
-                                }
-                                if rnode.get('position'):
-                                    pos = rnode['position']
-                                    if pos.get('latitude') and pos.get('longitude'):
-                                        node_data['position'] = {
-                                            'latitude': pos['latitude'],
-                                            'longitude': pos['longitude'],
-                                            'altitude': pos.get('altitude', 0),
-                                        }
-                                if rnode.get('last_seen'):
-                                    node_data['last_heard'] = rnode['last_seen']
-                                nodes.append(node_data)
-                                rns_nodes_added += 1
-            except Exception as e:
-                logger.debug(f"Could not load RNS nodes: {e}")
-
-            # Mark meshtastic nodes with network type
-            for node in nodes:
-                if 'network' not in node:
-                    node['network'] = 'meshtastic'
-
-            # Count nodes with positions
-            nodes_with_position = sum(1 for n in nodes if 'position' in n)
-
-            return {
-                'nodes': nodes,
-                'my_node_id': _node_monitor.my_node_id,
-                'total_nodes': len(nodes),
-                'nodes_with_position': nodes_with_position,
-                'rns_nodes': rns_nodes_added,
-            }
+            nodes.append(node_data)
+
+        # Try to add RNS nodes from gateway
+        rns_nodes_added = 0
+        try:
+            from gateway.node_tracker import UnifiedNodeTracker
+            # Check if there's a running tracker instance we can query
+            # This is a singleton-ish pattern - try to get cached instance
+            tracker_file = '/tmp/meshforge_rns_nodes.json'
+            import json
+            import os
+            if os.path.exists(tracker_file):
+                with open(tracker_file) as f:
+                    rns_data = json.load(f)
+                    for rnode in rns_data.get('nodes', []):
+                        # Only add if not already in list (by matching name or RNS hash)
+                        existing_ids = {n.get('id') for n in nodes}
+                        if rnode.get('rns_hash') and rnode.get('rns_hash') not in existing_ids:
+                            node_data = {
+                                'id': rnode.get('rns_hash', '')[:16],
+                                'name': rnode.get('name', 'RNS Node'),
+                                'short': rnode.get('short_name', 'RNS'),
+                                'hardware': 'RNS',
+                                'network': 'rns',
+                                'is_me': False,
+                            }
+                            if rnode.get('position'):
+                                pos = rnode['position']
+                                if pos.get('latitude') and pos.get('longitude'):
+                                    node_data['position'] = {
+                                        'latitude': pos['latitude'],
+                                        'longitude': pos['longitude'],
+                                        'altitude': pos.get('altitude', 0),
+                                    }
+                            if rnode.get('last_seen'):
+                                node_data['last_heard'] = rnode['last_seen']
+                            nodes.append(node_data)
+                            rns_nodes_added += 1
+        except Exception as e:
+            logger.debug(f"Could not load RNS nodes: {e}")
+
+        # Mark meshtastic nodes with network type
+        for node in nodes:
+            if 'network' not in node:
+                node['network'] = 'meshtastic'
+
+        # Count nodes with positions
+        nodes_with_position = sum(1 for n in nodes if 'position' in n)
+
+        return {
+            'nodes': nodes,
+            'my_node_id': monitor.my_node_id,
+            'total_nodes': len(nodes),
+            'nodes_with_position': nodes_with_position,
+            'rns_nodes': rns_nodes_added,
+        }
 
     except Exception as e:
         return {'error': f'Error getting nodes: {str(e)}'}
@@ -1345,7 +1399,7 @@ def validate_journalctl_since(since_value):
 @app.route('/api/logs/stream')
 @login_required
 def api_logs_stream():
-    """Stream service logs (returns last N lines, call repeatedly for updates)"""
+    """Stream service logs (returns last N lines; pass ?cursor= for only newer ones)"""
     lines = request.args.get('lines', 100, type=int)
     since = request.args.get('since', '')
 
@@ -1355,9 +1409,29 @@ def api_logs_stream():
         if not is_valid:
             return jsonify({'error': error}), 400
 
+    # Limit lines to reasonable range
+    lines = max(1, min(lines, 1000))
+
+    # Served from the shared follower; pass the returned cursor back to
+    # get only newer lines. Absolute --since values, and windows longer
+    # than the buffer holds, still need journalctl.
+    window = log_service.parse_since(since) if log_service and since else None
+    logs = _shared_logs() if not since or window is not None else None
+    if logs is not None and window is not None and not logs.covers(window):
+        logs = None
+    if logs is not None:
+        cursor = request.args.get('cursor', 0, type=int)
+        entries, next_cursor = logs.read(cursor, unit='meshtasticd', limit=lines)
+        if window is not None:
+            cutoff = datetime.now().timestamp() - window
+            entries = [e for e in entries if e.timestamp >= cutoff]
+        return jsonify({
+            'logs': log_service.format_entries(entries),
+            'cursor': next_cursor,
+            'timestamp': datetime.now().isoformat()
+        })
+
     try:
-        # Limit lines to reasonable range
-        lines = max(1, min(lines, 1000))
         cmd = ['journalctl', '-u', 'meshtasticd', '-n', str(lines), '--no-pager']
         if since:
             cmd.extend(['--since', since])
@@ -1376,72 +1450,22 @@ def api_logs_stream():
 # ============================================================================
 
 def parse_proc_net(protocol: str) -> list:
-    """Parse /proc/net/udp or /proc/net/tcp"""
-    results = []
-    proc_file = f"/proc/net/{protocol}"
-    try:
-        with open(proc_file, 'r') as f:
-            lines = f.readlines()[1:]
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 10:
-                local_addr = parts[1]
-                state = parts[3]
-                inode = parts[9]
-                addr_parts = local_addr.split(':')
-                hex_ip = addr_parts[0]
-                hex_port = addr_parts[1]
-                try:
-                    ip_int = int(hex_ip, 16)
-                    ip_bytes = [(ip_int >> i) & 0xFF for i in (0, 8, 16, 24)]
-                    ip_str = '.'.join(str(b) for b in ip_bytes)
-                    port = int(hex_port, 16)
-                    state_names = {
-                        '01': 'ESTABLISHED', '0A': 'LISTEN', '06': 'TIME_WAIT',
-                        '08': 'CLOSE_WAIT', '07': 'CLOSE'
-                    }
-                    results.append({
-                        'ip': ip_str, 'port': port,
-                        'state': state_names.get(state.upper(), state),
-                        'inode': inode
-                    })
-                except (ValueError, IndexError):
-                    continue
-    except (FileNotFoundError, PermissionError):
-        pass
-    return results
+    """Parse /proc/net/udp or /proc/net/tcp (shared parser in utils.network_diag)"""
+    if network_diag is None:
+        return []
+    return network_diag.parse_proc_net(protocol)
 
 
 def parse_proc_net_v6(protocol: str) -> list:
     """Parse /proc/net/udp6 or /proc/net/tcp6 for IPv6"""
-    results = []
-    proc_file = f"/proc/net/{protocol}"
-    try:
-        with open(proc_file, 'r') as f:
-            lines = f.readlines()[1:]
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 10:
-                local_addr = parts[1]
-                state = parts[3]
-                inode = parts[9]
-                addr_parts = local_addr.split(':')
-                hex_ip = addr_parts[0]
-                hex_port = addr_parts[1]
-                try:
-                    port = int(hex_port, 16)
-                    ip_str = hex_ip if len(hex_ip) != 32 else ':'.join(
-                        hex_ip[i:i+4] for i in range(0, 32, 4)
-                    ).lower()
-                    results.append({
-                        'ip': ip_str, 'port': port,
-                        'state': state, 'inode': inode
-                    })
-                except (ValueError, IndexError):
-                    continue
-    except (FileNotFoundError, PermissionError):
-        pass
-    return results
+    return parse_proc_net(protocol)
+
+
+def read_sockets(protocols, **filters) -> list:
+    """All requested socket tables in one pass (see network_diag.read_sockets)"""
+    if network_diag is None:
+        return []
+    return network_diag.read_sockets(protocols, **filters)
 
 
 @app.route('/api/network/udp')
@@ -1469,11 +1493,10 @@ def api_network_tcp():
 def api_network_rns_ports():
     """Check RNS AutoInterface port 29716"""
     rns_port = 29716
-    udp_v4 = parse_proc_net('udp')
-    udp_v6 = parse_proc_net_v6('udp6')
+    in_use = read_sockets(('udp', 'udp6'), ports=(rns_port,), with_process=True)
 
-    in_use_v4 = [e for e in udp_v4 if e['port'] == rns_port]
-    in_use_v6 = [e for e in udp_v6 if e['port'] == rns_port]
+    in_use_v4 = [e for e in in_use if e['protocol'] == 'udp']
+    in_use_v6 = [e for e in in_use if e['protocol'] == 'udp6']
 
     # Check RNS processes
     try:
@@ -1499,11 +1522,12 @@ def api_network_rns_ports():
 def api_network_meshtastic_ports():
     """Check meshtasticd ports 4403, 9443"""
     tcp_ports = [4403, 9443]
-    tcp_entries = parse_proc_net('tcp')
+    tcp_entries = read_sockets(('tcp', 'tcp6'), ports=tcp_ports, states=('LISTEN',),
+                               with_process=True)
 
     results = {}
     for port in tcp_ports:
-        listening = [e for e in tcp_entries if e['port'] == port and e['state'] == 'LISTEN']
+        listening = [e for e in tcp_entries if e['port'] == port]
         results[str(port)] = {
             'listening': len(listening) > 0,
             'entries': listening
@@ -1560,7 +1584,11 @@ def api_network_multicast():
 @app.route('/api/network/process-ports')
 @login_required
 def api_network_process_ports():
-    """Get process-to-port mapping using ss"""
+    """Get process-to-port mapping (from /proc; ss or netstat as fallback)"""
+    if sysinfo is not None:
+        sockets = sysinfo.listening_sockets()
+        return jsonify({'output': sysinfo.format_sockets(sockets), 'tool': 'proc',
+                        'sockets': sockets})
     try:
         result = subprocess.run(
             ['ss', '-tulnp'],
@@ -1588,17 +1616,22 @@ def api_network_process_ports():
 @login_required
 def api_network_full_diagnostics():
     """Run full network diagnostics"""
+    by_protocol = {protocol: [] for protocol in ('tcp', 'udp', 'tcp6', 'udp6')}
+    for entry in read_sockets(tuple(by_protocol)):
+        by_protocol[entry['protocol']].append(entry)
+
     return jsonify({
         'udp': {
-            'ipv4': [e for e in parse_proc_net('udp') if e['port'] != 0],
-            'ipv6': [e for e in parse_proc_net_v6('udp6') if e['port'] != 0]
+            'ipv4': [e for e in by_protocol['udp'] if e['port'] != 0],
+            'ipv6': [e for e in by_protocol['udp6'] if e['port'] != 0]
         },
         'tcp': {
-            'ipv4': [e for e in parse_proc_net('tcp') if e['state'] == 'LISTEN'],
-            'ipv6': [e for e in parse_proc_net_v6('tcp6')]
+            'ipv4': [e for e in by_protocol['tcp'] if e['state'] == 'LISTEN'],
+            'ipv6': by_protocol['tcp6']
         },
-        'rns_port_29716_free': len([e for e in parse_proc_net('udp') if e['port'] == 29716]) == 0,
-        'meshtastic_4403_listening': len([e for e in parse_proc_net('tcp') if e['port'] == 4403 and e['state'] == 'LISTEN']) > 0,
+        'rns_port_29716_free': not any(e['port'] == 29716 for e in by_protocol['udp']),
+        'meshtastic_4403_listening': any(
+            e['port'] == 4403 and e['state'] == 'LISTEN' for e in by_protocol['tcp']),
         'timestamp': datetime.now().isoformat()
     })
 
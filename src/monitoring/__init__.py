@@ -17,9 +17,18 @@ Usage:
     monitor.on_node_update = my_callback
 
     monitor.disconnect()
+
+    # Or share one connection with the rest of the process
+    from src.monitoring import get_monitor_service
+
+    service = get_monitor_service()
+    service.acquire("my-panel")
+    monitor, error = service.get_monitor()
 """
 
 from .node_monitor import NodeMonitor, NodeInfo, NodeMetrics, NodePosition
+from .monitor_service import NodeMonitorService, get_monitor_service
 
-__all__ = ['NodeMonitor', 'NodeInfo', 'NodeMetrics', 'NodePosition']
+__all__ = ['NodeMonitor', 'NodeInfo', 'NodeMetrics', 'NodePosition',
+           'NodeMonitorService', 'get_monitor_service']
 __version__ = '0.1.0'
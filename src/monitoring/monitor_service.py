@@ -0,0 +1,366 @@
+"""
+Shared NodeMonitor service
+
+One NodeMonitor per process (per meshtasticd endpoint), shared by every
+panel and handler that needs live node data. Consumers take a lease
+instead of connecting themselves; the connection is opened on first use,
+kept while any lease is held, and closed a short while after the last
+one is released. The monitor object - and with it the node table -
+survives reconnects, so a dropped connection never empties a view.
+
+Node and packet events are fanned out to any number of subscribers
+(NodeMonitor itself has a single callback slot per event).
+
+Usage:
+    service = get_monitor_service()
+    service.acquire("map")
+    monitor, error = service.get_monitor()
+    if monitor:
+        nodes = monitor.get_nodes()
+    token = service.subscribe(lambda event, data: ..., events={'node_updated'})
+    ...
+    service.unsubscribe(token)
+    service.release("map")
+
+    with service.lease("cli", linger=0):     # one-shot use
+        monitor, error = service.get_monitor()
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .node_monitor import ConnectionState, NodeInfo, NodeMonitor
+
+logger = logging.getLogger(__name__)
+
+# Keep the connection this long after the last lease is released, so a
+# panel that is closed and reopened (or polls) does not reconnect
+DEFAULT_LINGER = 30.0
+# Minimum seconds between failed connection attempts
+DEFAULT_CONNECT_BACKOFF = 5.0
+DEFAULT_CONNECT_TIMEOUT = 15.0
+# After connecting, wait up to this long for the node count to settle
+# (the initial node DB can take a few seconds on busy MQTT meshes)
+DEFAULT_SETTLE_TIMEOUT = 10.0
+SETTLE_POLL = 0.5
+
+# Event names passed to subscribers
+EVENTS = ('node_added', 'node_updated', 'packet', 'connection')
+
+Subscriber = Callable[[str, Any], None]
+
+
+class NodeMonitorService:
+    """
+    Reference-counted owner of one NodeMonitor.
+
+    Thread-safe; get_monitor() blocks while a connection is being made,
+    so call it from worker threads, not a UI main loop.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 4403,
+                 monitor_factory: Optional[Callable[[str, int], NodeMonitor]] = None,
+                 linger: float = DEFAULT_LINGER,
+                 connect_backoff: float = DEFAULT_CONNECT_BACKOFF,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 settle_timeout: float = DEFAULT_SETTLE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.linger = linger
+        self.connect_backoff = connect_backoff
+        self.connect_timeout = connect_timeout
+        self.settle_timeout = settle_timeout
+        self._factory = monitor_factory or (
+            lambda h, p: NodeMonitor(host=h, port=p, telemetry_history=True))
+
+        self._lock = threading.Lock()          # leases, subscribers, timer
+        self._connect_lock = threading.Lock()  # one connection attempt at a time
+        self._monitor: Optional[NodeMonitor] = None
+        self._owners: Dict[str, int] = {}
+        self._subscribers: Dict[int, Tuple[Subscriber, Optional[frozenset]]] = {}
+        self._next_token = 1
+        self._idle_timer: Optional[threading.Timer] = None
+        self._last_attempt = 0.0
+        self._last_error: Optional[str] = None
+        self._stats = {'connects': 0, 'disconnects': 0, 'reuses': 0, 'events': 0}
+
+    # === Leases ===
+
+    def acquire(self, owner: str = "") -> int:
+        """Register interest in live data; returns the total lease count."""
+        with self._lock:
+            self._owners[owner] = self._owners.get(owner, 0) + 1
+            self._cancel_idle_timer()
+            return sum(self._owners.values())
+
+    def release(self, owner: str = "", linger: Optional[float] = None) -> int:
+        """
+        Drop one lease. When none remain, disconnect after linger seconds
+        (default: the service's linger; 0 disconnects now).
+
+        Returns:
+            Remaining lease count
+        """
+        with self._lock:
+            count = self._owners.get(owner, 0)
+            if count <= 1:
+                self._owners.pop(owner, None)
+            else:
+                self._owners[owner] = count - 1
+            remaining = sum(self._owners.values())
+        if remaining == 0:
+            self._schedule_idle(self.linger if linger is None else linger)
+        return remaining
+
+    @contextmanager
+    def lease(self, owner: str = "", linger: Optional[float] = None):
+        """Hold a lease for the duration of a with-block (release(owner, linger) after)."""
+        self.acquire(owner)
+        try:
+            yield self
+        finally:
+            self.release(owner, linger)
+
+    @property
+    def ref_count(self) -> int:
+        with self._lock:
+            return sum(self._owners.values())
+
+    def owners(self) -> List[str]:
+        with self._lock:
+            return sorted(self._owners)
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _schedule_idle(self, delay: float):
+        if delay <= 0:
+            self._disconnect_if_idle()
+            return
+        with self._lock:
+            self._cancel_idle_timer()
+            self._idle_timer = threading.Timer(delay, self._disconnect_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _disconnect_if_idle(self):
+        with self._lock:
+            if self._owners:
+                return
+            self._idle_timer = None
+        with self._connect_lock:
+            with self._lock:
+                if self._owners:
+                    return
+            self._disconnect()
+
+    # === Connection ===
+
+    def get_monitor(self) -> Tuple[Optional[NodeMonitor], Optional[str]]:
+        """
+        The shared monitor, connecting it if needed.
+
+        Returns:
+            (monitor, None) when connected, else (None, reason)
+        """
+        with self._connect_lock:
+            monitor = self._monitor
+            if monitor is not None:
+                try:
+                    if monitor.is_connected:
+                        self._stats['reuses'] += 1
+                        return monitor, None
+                except Exception as e:
+                    logger.debug(f"Monitor connection check failed: {e}")
+                if monitor.state == ConnectionState.RECONNECTING:
+                    # NodeMonitor's own reconnect loop is running
+                    return None, "Reconnecting to meshtasticd..."
+
+            now = time.monotonic()
+            if self._last_attempt and now - self._last_attempt < self.connect_backoff:
+                return None, self._last_error or "Waiting to reconnect..."
+            self._last_attempt = now
+
+            if monitor is None:
+                monitor = self._factory(self.host, self.port)
+                self._install_callbacks(monitor)
+                self._monitor = monitor
+
+            error = "Failed to connect to meshtasticd"
+            try:
+                connected = monitor.connect(timeout=self.connect_timeout)
+            except Exception as e:
+                connected = False
+                error = f"Connection error: {e}"
+            if not connected:
+                self._last_error = error
+                logger.warning(f"[MonitorService] {error}")
+                return None, error
+
+            self._stats['connects'] += 1
+            self._last_attempt = 0.0
+            self._last_error = None
+            self._wait_for_nodes(monitor)
+            logger.info(f"Shared NodeMonitor connected, {monitor.get_node_count()} nodes")
+
+        if self.ref_count == 0:
+            # Nobody holds a lease: don't keep the slot forever
+            self._schedule_idle(self.linger)
+        return monitor, None
+
+    def _wait_for_nodes(self, monitor: NodeMonitor):
+        """Poll until the node count is stable for a second (or settle_timeout)."""
+        deadline = time.monotonic() + self.settle_timeout
+        last_count = -1
+        stable_since = None
+        while time.monotonic() < deadline:
+            count = monitor.get_node_count()
+            if count == last_count:
+                if stable_since is None:
+                    stable_since = time.monotonic()
+                elif time.monotonic() - stable_since >= 1.0:
+                    return
+            else:
+                last_count = count
+                stable_since = None
+            time.sleep(SETTLE_POLL)
+
+    def _disconnect(self):
+        monitor = self._monitor
+        if monitor is None:
+            return
+        try:
+            monitor.disconnect()
+        except Exception as e:
+            logger.debug(f"Error disconnecting shared monitor: {e}")
+        self._stats['disconnects'] += 1
+        logger.info("Shared NodeMonitor disconnected (no users)")
+
+    @property
+    def is_connected(self) -> bool:
+        monitor = self._monitor
+        try:
+            return bool(monitor and monitor.is_connected)
+        except Exception:
+            return False
+
+    def get_nodes(self) -> List[NodeInfo]:
+        """Last known nodes, without connecting (empty before the first connect)."""
+        monitor = self._monitor
+        return monitor.get_nodes() if monitor else []
+
+    def shutdown(self):
+        """Disconnect regardless of leases (process exit)."""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._owners.clear()
+        with self._connect_lock:
+            self._disconnect()
+            self._monitor = None
+
+    # === Events ===
+
+    def subscribe(self, callback: Subscriber, events: Optional[Iterable[str]] = None) -> int:
+        """
+        Call callback(event, data) for node and packet events.
+
+        Args:
+            callback: Called from the monitor's threads; keep it short
+            events: Subset of EVENTS (default: all)
+
+        Returns:
+            Token for unsubscribe()
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (callback, frozenset(events) if events else None)
+        return token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def _install_callbacks(self, monitor: NodeMonitor):
+        monitor.on_node_added = lambda node: self._emit('node_added', node)
+        monitor.on_node_update = lambda node: self._emit('node_updated', node)
+        monitor.on_message = lambda packet: self._emit('packet', packet)
+        monitor.on_connection_change = lambda state: self._emit('connection', state)
+
+    def _emit(self, event: str, data: Any):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+            self._stats['events'] += 1
+        for callback, events in subscribers:
+            if events is not None and event not in events:
+                continue
+            try:
+                callback(event, data)
+            except Exception as e:
+                logger.error(f"Error in monitor subscriber for {event}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['leases'] = dict(self._owners)
+            stats['subscribers'] = len(self._subscribers)
+        stats['connected'] = self.is_connected
+        stats['nodes'] = len(self.get_nodes())
+        return stats
+
+
+_services: Dict[Tuple[str, int], NodeMonitorService] = {}
+_services_lock = threading.Lock()
+
+
+def get_monitor_service(host: str = "localhost", port: int = 4403) -> NodeMonitorService:
+    """The process-wide service for a meshtasticd endpoint."""
+    with _services_lock:
+        service = _services.get((host, port))
+        if service is None:
+            service = _services[(host, port)] = NodeMonitorService(host=host, port=port)
+        return service
+
+
+def get_node_list(owner: str, host: str = "localhost", port: int = 4403,
+                  linger: Optional[float] = None) -> Optional[List[Dict[str, str]]]:
+    """
+    Node list in connection_manager.get_nodes() form, from the shared monitor.
+
+    Takes a lease for owner only for the duration of the call; the
+    connection then lingers (default: the service's linger), so refreshes
+    within that window reuse it and other clients get the slot back after.
+
+    Returns:
+        List of {'id', 'name', 'short'} dicts, or None if not connected
+    """
+    service = get_monitor_service(host, port)
+    with service.lease(owner, linger):
+        monitor, error = service.get_monitor()
+        if monitor is None:
+            logger.debug(f"Shared monitor unavailable for {owner}: {error}")
+            return None
+        nodes = monitor.get_nodes()
+    return [{'id': node.node_id,
+             'name': node.long_name or '',
+             'short': node.short_name or ''}
+            for node in nodes]
+
+
+def _shutdown_all():
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        try:
+            service.shutdown()
+        except Exception as e:
+            logger.debug(f"Monitor service shutdown failed: {e}")
+
+
+atexit.register(_shutdown_all)
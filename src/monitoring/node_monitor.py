@@ -45,6 +45,36 @@ except ImportError:
                 pass
 
 
+# Shared meshtasticd session (optional; many monitors can connect through it)
+try:
+    from utils.meshtastic_proxy import get_proxy_endpoint
+    PROXY_AVAILABLE = True
+except ImportError:
+    PROXY_AVAILABLE = False
+
+
+# asyncio stream client (preferred over meshtastic.tcp_interface + pubsub)
+try:
+    from utils.meshtastic_client import StreamInterface
+    STREAM_CLIENT_AVAILABLE = True
+except ImportError:
+    STREAM_CLIENT_AVAILABLE = False
+
+
+# Received packets are decoded once and routed by portnum
+try:
+    from utils.packet_view import PacketDispatcher, PacketView
+except ImportError:
+    from ..utils.packet_view import PacketDispatcher, PacketView
+
+# Per-node telemetry history (optional; shared SQLite time-series store)
+try:
+    from utils.telemetry_store import get_telemetry_store
+    TELEMETRY_STORE_AVAILABLE = True
+except ImportError:
+    TELEMETRY_STORE_AVAILABLE = False
+
+
 class ConnectionState(Enum):
     """Monitor connection states"""
     DISCONNECTED = "disconnected"
@@ -120,16 +150,20 @@ class NodeMonitor:
         monitor.disconnect()
     """
 
-    def __init__(self, host: str = "localhost", port: int = 4403):
+    def __init__(self, host: str = "localhost", port: int = 4403,
+                 telemetry_history: bool = False):
         """
         Initialize NodeMonitor.
 
         Args:
             host: Hostname of meshtasticd (default: localhost)
             port: TCP port (default: 4403)
+            telemetry_history: Record node metrics into the shared
+                telemetry store (utils.telemetry_store) once connected
         """
         self.host = host
         self.port = port
+        self.telemetry_history = telemetry_history
         self.interface = None
         self._nodes: Dict[str, NodeInfo] = {}
         self._lock = threading.Lock()
@@ -137,6 +171,7 @@ class NodeMonitor:
         self._running = False
         self._reconnect_thread = None
         self._holds_global_lock = False  # Track if we hold the global connection lock
+        self.telemetry_store = None  # Set on connect (history for node metrics)
 
         # Callbacks
         self.on_node_update: Optional[Callable[[NodeInfo], None]] = None
@@ -150,6 +185,15 @@ class NodeMonitor:
         self.my_node_id: Optional[str] = None
         self.my_node_num: Optional[int] = None
 
+        # Received packets: decoded once, node updates applied in place
+        # (the connection's node.updated events are not used)
+        self._dispatcher = PacketDispatcher("NodeMonitor")
+        self._dispatcher.register(None, self._touch_sender)
+        self._dispatcher.register(None, self._forward_packet)
+        self._dispatcher.register('POSITION_APP', self._on_position)
+        self._dispatcher.register('TELEMETRY_APP', self._on_telemetry)
+        self._dispatcher.register('NODEINFO_APP', self._on_nodeinfo)
+
     @property
     def state(self) -> ConnectionState:
         """Current connection state"""
@@ -195,54 +239,55 @@ class NodeMonitor:
             logger.warning("Already connected")
             return True
 
-        # Acquire global lock - meshtasticd only supports one TCP connection
-        if not MESHTASTIC_CONNECTION_LOCK.acquire(timeout=timeout):
+        host, port = self.host, self.port
+        endpoint = get_proxy_endpoint(self.host, self.port) if PROXY_AVAILABLE else None
+        if endpoint:
+            # The proxy holds meshtasticd's only slot and serves every client
+            host, port = endpoint
+        elif MESHTASTIC_CONNECTION_LOCK.acquire(timeout=timeout):
+            # Global lock - meshtasticd only supports one TCP connection
+            self._holds_global_lock = True
+        else:
             logger.error("Could not acquire connection lock (another connection in progress)")
             return False
 
-        self._holds_global_lock = True
         self.state = ConnectionState.CONNECTING
         self._running = True
 
         try:
-            # Wait for cooldown from previous connection
-            wait_for_cooldown()
-
-            from meshtastic.tcp_interface import TCPInterface
-            from pubsub import pub
-
-            # Subscribe to meshtastic events
-            pub.subscribe(self._on_receive, "meshtastic.receive")
-            pub.subscribe(self._on_connection, "meshtastic.connection.established")
-            pub.subscribe(self._on_disconnect, "meshtastic.connection.lost")
-            pub.subscribe(self._on_node_update_event, "meshtastic.node.updated")
+            if not endpoint:
+                # Wait for cooldown from previous connection
+                wait_for_cooldown()
 
             # Pre-check: Test if port is reachable (fail fast)
             import socket
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(min(timeout, 5.0))
             try:
-                sock.connect((self.host, self.port))
+                sock.connect((host, port))
                 sock.close()
             except (socket.timeout, socket.error, OSError) as e:
-                raise ConnectionError(f"Cannot reach {self.host}:{self.port} - {e}")
+                raise ConnectionError(f"Cannot reach {host}:{port} - {e}")
 
             # Connect
-            logger.info(f"Connecting to {self.host}:{self.port}...")
-            self.interface = TCPInterface(
-                hostname=self.host,
-                portNumber=self.port
-            )
-
-            # Wait for connection
-            start = time.time()
-            while self.interface.myInfo is None and (time.time() - start) < timeout:
-                time.sleep(0.1)
+            logger.info(f"Connecting to {host}:{port}...")
+            if STREAM_CLIENT_AVAILABLE:
+                my_node_num = self._open_stream_interface(host, port, timeout)
+            else:
+                my_node_num = self._open_library_interface(host, port, timeout)
 
-            if self.interface.myInfo:
-                self.my_node_num = self.interface.myInfo.my_node_num
+            if my_node_num is not None:
+                self.my_node_num = my_node_num
                 self.my_node_id = f"!{self.my_node_num:08x}"
                 self.state = ConnectionState.CONNECTED
+                # Opt-in: the store is process-global
+                if (self.telemetry_history and TELEMETRY_STORE_AVAILABLE
+                        and self.telemetry_store is None):
+                    try:
+                        self.telemetry_store = get_telemetry_store()
+                        self.telemetry_store.start()
+                    except Exception as e:
+                        logger.warning(f"Telemetry history disabled: {e}")
                 self._load_initial_nodes()
                 logger.info(f"Connected. My node: {self.my_node_id}")
                 return True
@@ -265,6 +310,43 @@ class NodeMonitor:
                 self.on_error(e)
             return False
 
+    def _open_stream_interface(self, host: str, port: int, timeout: float) -> Optional[int]:
+        """Connect with the asyncio stream client; returns my node number"""
+        self.interface = StreamInterface(
+            host, port,
+            on_receive=lambda packet: self._on_receive(packet, self.interface),
+            on_connection=self._on_stream_connection,
+        )
+        if not self.interface.connect(timeout=timeout):
+            raise ConnectionError(self.interface.last_error or "Connection timeout")
+        return self.interface.my_node_num
+
+    def _open_library_interface(self, host: str, port: int, timeout: float) -> Optional[int]:
+        """Connect with meshtastic.tcp_interface + pubsub; returns my node number"""
+        from meshtastic.tcp_interface import TCPInterface
+        from pubsub import pub
+
+        # Subscribe to meshtastic events
+        pub.subscribe(self._on_receive, "meshtastic.receive")
+        pub.subscribe(self._on_connection, "meshtastic.connection.established")
+        pub.subscribe(self._on_disconnect, "meshtastic.connection.lost")
+
+        self.interface = TCPInterface(
+            hostname=host,
+            portNumber=port
+        )
+
+        # Wait for connection
+        start = time.time()
+        while self.interface.myInfo is None and (time.time() - start) < timeout:
+            time.sleep(0.1)
+        return self.interface.myInfo.my_node_num if self.interface.myInfo else None
+
+    def _on_stream_connection(self, connected: bool):
+        """Stream client callback: only a lost connection needs handling"""
+        if not connected:
+            self._on_disconnect(self.interface)
+
     def _release_global_lock(self):
         """Release the global connection lock if we hold it"""
         if getattr(self, '_holds_global_lock', False):
@@ -296,7 +378,6 @@ class NodeMonitor:
                 pub.unsubscribe(self._on_receive, "meshtastic.receive")
                 pub.unsubscribe(self._on_connection, "meshtastic.connection.established")
                 pub.unsubscribe(self._on_disconnect, "meshtastic.connection.lost")
-                pub.unsubscribe(self._on_node_update_event, "meshtastic.node.updated")
             except Exception:
                 pass
 
@@ -327,6 +408,7 @@ class NodeMonitor:
                 node_info = self._parse_node_data(node_id, node_data)
                 if node_info:
                     self._nodes[node_info.node_id] = node_info
+                    self._record_telemetry(node_info)
                     if self.on_node_added:
                         try:
                             self.on_node_added(node_info)
@@ -370,46 +452,9 @@ class NodeMonitor:
                 is_licensed=user.get('isLicensed', False),
             )
 
-            # Position - handle both float (latitude) and integer (latitudeI) formats
             if position:
-                # Prefer float format, fall back to integer format (divide by 1e7)
-                lat = position.get('latitude')
-                if lat is None:
-                    lat_i = position.get('latitudeI')
-                    lat = lat_i / 1e7 if lat_i is not None else None
-
-                lon = position.get('longitude')
-                if lon is None:
-                    lon_i = position.get('longitudeI')
-                    lon = lon_i / 1e7 if lon_i is not None else None
-
-                # Handle timestamp - may be None or invalid
-                pos_time = None
-                if 'time' in position and position['time']:
-                    try:
-                        pos_time = datetime.fromtimestamp(position['time'])
-                    except (TypeError, ValueError, OSError):
-                        pass
-
-                node_info.position = NodePosition(
-                    latitude=lat,
-                    longitude=lon,
-                    altitude=position.get('altitude'),
-                    precision_bits=position.get('precisionBits'),
-                    time=pos_time,
-                )
-
-            # Metrics
-            node_info.metrics = NodeMetrics(
-                battery_level=device_metrics.get('batteryLevel'),
-                voltage=device_metrics.get('voltage'),
-                channel_utilization=device_metrics.get('channelUtilization'),
-                air_util_tx=device_metrics.get('airUtilTx'),
-                temperature=env_metrics.get('temperature'),
-                humidity=env_metrics.get('relativeHumidity'),
-                pressure=env_metrics.get('barometricPressure'),
-                last_updated=datetime.now(),
-            )
+                node_info.position = self._parse_position(position)
+            node_info.metrics = self._parse_metrics(device_metrics, env_metrics)
 
             # Last heard - handle None or invalid timestamps
             if 'lastHeard' in data and data['lastHeard']:
@@ -424,13 +469,127 @@ class NodeMonitor:
             logger.error(f"Error parsing node data: {e}")
             return None
 
+    @staticmethod
+    def _parse_position(position: dict) -> NodePosition:
+        """Position dict (float latitude or integer latitudeI format) -> NodePosition"""
+        # Prefer float format, fall back to integer format (divide by 1e7)
+        lat = position.get('latitude')
+        if lat is None:
+            lat_i = position.get('latitudeI')
+            lat = lat_i / 1e7 if lat_i is not None else None
+
+        lon = position.get('longitude')
+        if lon is None:
+            lon_i = position.get('longitudeI')
+            lon = lon_i / 1e7 if lon_i is not None else None
+
+        # Handle timestamp - may be None or invalid
+        pos_time = None
+        if position.get('time'):
+            try:
+                pos_time = datetime.fromtimestamp(position['time'])
+            except (TypeError, ValueError, OSError):
+                pass
+
+        return NodePosition(
+            latitude=lat,
+            longitude=lon,
+            altitude=position.get('altitude'),
+            precision_bits=position.get('precisionBits'),
+            time=pos_time,
+        )
+
+    @staticmethod
+    def _parse_metrics(device_metrics: dict, env_metrics: dict) -> NodeMetrics:
+        """deviceMetrics / environmentMetrics dicts -> NodeMetrics"""
+        return NodeMetrics(
+            battery_level=device_metrics.get('batteryLevel'),
+            voltage=device_metrics.get('voltage'),
+            channel_utilization=device_metrics.get('channelUtilization'),
+            air_util_tx=device_metrics.get('airUtilTx'),
+            temperature=env_metrics.get('temperature'),
+            humidity=env_metrics.get('relativeHumidity'),
+            pressure=env_metrics.get('barometricPressure'),
+            last_updated=datetime.now(),
+        )
+
     def _on_receive(self, packet, interface):
-        """Handle received packets"""
-        try:
-            if self.on_message:
-                self.on_message(packet)
-        except Exception as e:
-            logger.error(f"Error in message callback: {e}")
+        """Handle received packets (one shared view, routed by portnum)"""
+        self._dispatcher.dispatch(packet)
+
+    def _forward_packet(self, view: PacketView):
+        if self.on_message:
+            self.on_message(view.packet)
+
+    def _touch_sender(self, view: PacketView):
+        """Every packet: last heard, SNR and hops of the sender, in place"""
+        node = self._nodes.get(view.from_id)
+        is_new = node is None
+        if is_new:
+            if not view.from_num:
+                return
+            with self._lock:
+                node = self._nodes.setdefault(
+                    view.from_id, NodeInfo(node_id=view.from_id, node_num=view.from_num))
+        packet = view.packet
+        rx_time = packet.get('rxTime')
+        node.last_heard = datetime.fromtimestamp(rx_time) if rx_time else datetime.now()
+        via_mqtt = packet.get('viaMqtt', False)
+        node.via_mqtt = via_mqtt
+        snr = packet.get('rxSnr')
+        if snr is not None and not via_mqtt:
+            node.snr = snr
+        hops = view.hops_away
+        if hops is not None:
+            node.hops_away = hops
+        # Nodes first heard here are announced; the per-port handlers
+        # (which run next) report changes to known nodes
+        if is_new and self.on_node_added:
+            self.on_node_added(node)
+
+    def _on_position(self, view: PacketView):
+        node = self._nodes.get(view.from_id)
+        position = view.position
+        if node is None or (position.get('latitudeI') is None
+                            and position.get('latitude') is None):
+            return
+        node.position = self._parse_position(position)
+        self._notify_node_update(node)
+
+    def _on_telemetry(self, view: PacketView):
+        node = self._nodes.get(view.from_id)
+        telemetry = view.telemetry
+        device = telemetry.get('deviceMetrics')
+        env = telemetry.get('environmentMetrics')
+        if node is None or (not device and not env):
+            return
+        update = self._parse_metrics(device or {}, env or {})
+        metrics = node.metrics
+        # Device and environment reports arrive separately: merge
+        for name, value in update.__dict__.items():
+            if value is not None:
+                setattr(metrics, name, value)
+        self._record_telemetry(node)
+        self._notify_node_update(node)
+
+    def _on_nodeinfo(self, view: PacketView):
+        node = self._nodes.get(view.from_id)
+        user = view.user
+        if node is None or not user:
+            return
+        node.long_name = user.get('longName', node.long_name)
+        node.short_name = user.get('shortName', node.short_name)
+        node.hardware_model = user.get('hwModel', node.hardware_model)
+        node.role = user.get('role', node.role)
+        node.is_licensed = user.get('isLicensed', node.is_licensed)
+        self._notify_node_update(node)
+
+    def _notify_node_update(self, node_info: NodeInfo):
+        if self.on_node_update:
+            try:
+                self.on_node_update(node_info)
+            except Exception as e:
+                logger.error(f"Error in node_update callback: {e}")
 
     def _on_connection(self, interface, topic=None):
         """Handle connection established"""
@@ -449,28 +608,28 @@ class NodeMonitor:
         if self._running:
             self._start_reconnect()
 
-    def _on_node_update_event(self, node, interface):
-        """Handle node update from meshtastic"""
+    def _record_telemetry(self, node_info: NodeInfo):
+        """Append the node's metrics and SNR to the telemetry history"""
+        if self.telemetry_store is None:
+            return
+        metrics = node_info.metrics
+        values = {
+            'battery_level': metrics.battery_level,
+            'voltage': metrics.voltage,
+            'channel_utilization': metrics.channel_utilization,
+            'air_util_tx': metrics.air_util_tx,
+            'temperature': metrics.temperature,
+            'humidity': metrics.humidity,
+            'pressure': metrics.pressure,
+            'snr': node_info.snr,
+        }
+        # lastHeard dates the report; a repeat of the same report is skipped
+        when = node_info.last_heard
         try:
-            if isinstance(node, dict):
-                node_id = node.get('num', 0)
-                node_info = self._parse_node_data(str(node_id), node)
-            else:
-                node_id = getattr(node, 'num', 0)
-                node_info = self._parse_node_data(str(node_id), node.__dict__ if hasattr(node, '__dict__') else {})
-
-            if node_info:
-                with self._lock:
-                    is_new = node_info.node_id not in self._nodes
-                    self._nodes[node_info.node_id] = node_info
-
-                if is_new and self.on_node_added:
-                    self.on_node_added(node_info)
-                elif self.on_node_update:
-                    self.on_node_update(node_info)
-
+            self.telemetry_store.record(node_info.node_id, values,
+                                        when.timestamp() if when else None)
         except Exception as e:
-            logger.error(f"Error handling node update: {e}")
+            logger.debug(f"Telemetry record failed for {node_info.node_id}: {e}")
 
     def _start_reconnect(self):
         """Start reconnection thread"""
@@ -33,7 +33,9 @@ Configuration (~/.config/meshforge/plugins/mqtt_bridge.json):
     "reconnect_delay": 5,
     "publish_nodes": true,
     "publish_messages": true,
-    "subscribe_commands": true
+    "subscribe_commands": true,
+    "node_ingest": false,
+    "ingest_protobuf": false
 }
 
 Inspired by pdxlocations/connect for nodeless MQTT connectivity.
@@ -85,7 +87,12 @@ class MQTTBridgePlugin(IntegrationPlugin):
         self._reconnect_thread = None
         self._stop_reconnect = threading.Event()
         self._message_callbacks: list[Callable] = []
+        self._raw_callbacks: list[Callable] = []
+        self._extra_topics: list[str] = []
         self._tls_configured = False
+        self._ingest = None
+        self._node_tracker = None
+        self._active = False
 
     @staticmethod
     def get_metadata() -> PluginMetadata:
@@ -122,6 +129,7 @@ class MQTTBridgePlugin(IntegrationPlugin):
             "publish_nodes": True,
             "publish_messages": True,
             "subscribe_commands": True,
+            "node_ingest": False,
         }
 
     def _save_config(self) -> None:
@@ -137,14 +145,20 @@ class MQTTBridgePlugin(IntegrationPlugin):
     def activate(self) -> None:
         """Activate the MQTT bridge."""
         logger.info("MQTT Bridge plugin activated")
+        self._active = True
+        self._start_configured_ingest()
         # Auto-connect if configured
         if self._config.get("auto_connect", False):
             self.connect()
 
     def deactivate(self) -> None:
         """Deactivate the MQTT bridge."""
+        self._active = False
         self._stop_reconnect.set()
         self.disconnect()
+        if self._ingest:
+            self._ingest.stop()
+            self._ingest = None
         logger.info("MQTT Bridge plugin deactivated")
 
     def _setup_tls(self, client) -> None:
@@ -188,6 +202,11 @@ class MQTTBridgePlugin(IntegrationPlugin):
                 topic = f"{self._config['topic_prefix']}/+/json/#"
                 client.subscribe(topic)
                 logger.info(f"Subscribed to: {topic}")
+
+            # Re-subscribe extra topics (e.g. node ingest) after reconnect
+            for topic in self._extra_topics:
+                client.subscribe(topic)
+                logger.info(f"Subscribed to: {topic}")
         else:
             error_msgs = {
                 1: "Incorrect protocol version",
@@ -214,6 +233,16 @@ class MQTTBridgePlugin(IntegrationPlugin):
             topic = msg.topic
             payload = msg.payload
 
+            # Raw consumers (node ingest) get bytes and parse off-thread
+            for callback in self._raw_callbacks:
+                try:
+                    callback(topic, payload)
+                except Exception as e:
+                    logger.error(f"Raw message callback error: {e}")
+
+            if not self._message_callbacks:
+                return
+
             # Try to decode as JSON
             try:
                 data = json.loads(payload.decode('utf-8'))
@@ -333,6 +362,63 @@ class MQTTBridgePlugin(IntegrationPlugin):
         """Register a callback for incoming MQTT messages."""
         self._message_callbacks.append(callback)
 
+    def register_raw_callback(self, callback: Callable) -> None:
+        """Register a callback receiving (topic, payload bytes) undecoded.
+
+        Called on the MQTT network thread - callbacks must not block.
+        """
+        self._raw_callbacks.append(callback)
+
+    def subscribe(self, topic: str) -> None:
+        """Subscribe to an additional topic (kept across reconnects)."""
+        if topic not in self._extra_topics:
+            self._extra_topics.append(topic)
+        if self._connected and self._client:
+            self._client.subscribe(topic)
+            logger.info(f"Subscribed to: {topic}")
+
+    def enable_node_ingest(self, tracker, **kwargs):
+        """Feed Meshtastic MQTT traffic into a UnifiedNodeTracker.
+
+        Args:
+            tracker: UnifiedNodeTracker to upsert nodes into
+            **kwargs: Passed to MQTTNodeIngest (workers, batch_size, ...)
+
+        Returns:
+            The running MQTTNodeIngest (see get_stats() for throughput)
+        """
+        from gateway.mqtt_ingest import MQTTNodeIngest
+
+        if self._ingest is None:
+            kwargs.setdefault("include_protobuf", self._config.get("ingest_protobuf", False))
+            self._ingest = MQTTNodeIngest(tracker, **kwargs)
+            self._ingest.start()
+            self._ingest.attach(self)
+        return self._ingest
+
+    def set_node_tracker(self, tracker) -> None:
+        """Set the gateway's UnifiedNodeTracker used by node ingest.
+
+        Starts the ingest straight away if the plugin is already active
+        and "node_ingest" is enabled.
+        """
+        self._node_tracker = tracker
+        if self._active:
+            self._start_configured_ingest()
+
+    def _start_configured_ingest(self) -> None:
+        """Start node ingest if enabled in config and a tracker is set."""
+        if not self._config.get("node_ingest", False):
+            return
+        if self._node_tracker is None:
+            logger.info("MQTT node ingest enabled - waiting for gateway node tracker")
+            return
+        self.enable_node_ingest(self._node_tracker)
+
+    def get_ingest_stats(self) -> Optional[Dict[str, Any]]:
+        """Get node ingest throughput metrics, if ingest is enabled."""
+        return self._ingest.get_stats() if self._ingest else None
+
     def send(self, data: Dict[str, Any]) -> bool:
         """Publish data to MQTT."""
         if not self._connected or not self._client:
@@ -23,6 +23,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt, Confirm
 from rich.live import Live
 
+try:
+    from utils.net_scanner import scan_sync
+except ImportError:
+    scan_sync = None
+
 console = Console()
 
 # Meshtastic default ports
@@ -458,37 +463,28 @@ class NetworkTools:
         else:
             # Manual scan without nmap
             console.print("[yellow]nmap not found, using basic scan...[/yellow]\n")
-            base = '.'.join(network.split('.')[:3])
-            found = []
-
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Scanning...", total=254)
-
-                for i in range(1, 255):
-                    ip = f"{base}.{i}"
-                    progress.update(task, description=f"Scanning {ip}...")
-
-                    try:
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        sock.settimeout(0.5)
-                        result = sock.connect_ex((ip, 4403))
-                        sock.close()
-
-                        if result == 0:
-                            found.append(ip)
-                            console.print(f"[green]Found: {ip}:4403[/green]")
-                    except Exception:
-                        pass
+            if scan_sync is None:
+                console.print("[red]Network scanner not available[/red]")
+                input("\nPress Enter to continue...")
+                return
 
-                    progress.advance(task)
+            try:
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console
+                ) as progress:
+                    progress.add_task(f"Scanning {network}...", total=None)
+                    found = scan_sync(
+                        network, ['meshtastic'],
+                        callback=lambda r: console.print(f"[green]Found: {r.address}[/green]"))
+            except ValueError as e:
+                console.print(f"[red]Invalid network range: {e}[/red]")
+                found = None
 
             if found:
                 console.print(f"\n[green]Found {len(found)} Meshtastic device(s)![/green]")
-            else:
+            elif found is not None:
                 console.print("\n[yellow]No Meshtastic devices found on port 4403[/yellow]")
 
         input("\nPress Enter to continue...")
@@ -22,6 +22,11 @@ from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, FloatPrompt, IntPrompt
 from rich.layout import Layout
 
+try:
+    from utils.airtime import LoRaModem, MODEM_PRESETS
+except ImportError:
+    from ..utils.airtime import LoRaModem, MODEM_PRESETS
+
 console = Console()
 
 
@@ -46,9 +51,9 @@ LORA_PRESETS = {
     'MEDIUM_FAST': LoRaPreset('MEDIUM_FAST', 250000, 9, '4/5', 3516, -117, 12, 3),
     'MEDIUM_SLOW': LoRaPreset('MEDIUM_SLOW', 250000, 10, '4/5', 1953, -120, 18, 5),
     'LONG_FAST': LoRaPreset('LONG_FAST', 250000, 11, '4/5', 1066, -123, 30, 8),
-    'LONG_MODERATE': LoRaPreset('LONG_MODERATE', 125000, 11, '4/5', 533, -126, 50, 12),
-    'LONG_SLOW': LoRaPreset('LONG_SLOW', 125000, 12, '4/5', 293, -129, 80, 20),
-    'VERY_LONG_SLOW': LoRaPreset('VERY_LONG_SLOW', 62500, 12, '4/5', 146, -132, 120, 30),
+    'LONG_MODERATE': LoRaPreset('LONG_MODERATE', 125000, 11, '4/8', 533, -126, 50, 12),
+    'LONG_SLOW': LoRaPreset('LONG_SLOW', 125000, 12, '4/8', 293, -129, 80, 20),
+    'VERY_LONG_SLOW': LoRaPreset('VERY_LONG_SLOW', 62500, 12, '4/8', 146, -132, 120, 30),
 }
 
 # Regional frequency bands
@@ -363,42 +368,31 @@ class RFTools:
             bw = int(Prompt.ask("Bandwidth (Hz)", default="125000"))
             sf = int(Prompt.ask("Spreading Factor (7-12)", default="11"))
             cr = Prompt.ask("Coding Rate (4/5, 4/6, 4/7, 4/8)", default="4/5")
+            # Parse coding rate (format: "4/5", "4/6", etc.)
+            cr_parts = cr.split('/')
+            if len(cr_parts) >= 2 and cr_parts[1].isdigit():
+                cr_val = int(cr_parts[1])
+            else:
+                cr_val = 5  # Default to 4/5 coding rate if invalid format
+            modem = LoRaModem(sf, bw, cr_val)
         else:
             try:
                 preset_name = list(LORA_PRESETS.keys())[int(choice) - 1]
-                preset = LORA_PRESETS[preset_name]
-                bw = preset.bandwidth
-                sf = preset.spreading_factor
-                cr = preset.coding_rate
             except (ValueError, IndexError):
-                preset = LORA_PRESETS['LONG_FAST']
-                bw = preset.bandwidth
-                sf = preset.spreading_factor
-                cr = preset.coding_rate
+                preset_name = 'LONG_FAST'
+            modem = MODEM_PRESETS[preset_name]
 
         payload = int(Prompt.ask("Payload size (bytes)", default="32"))
 
-        # Calculate time-on-air (simplified)
-        # Symbol time = 2^SF / BW
-        t_sym = (2 ** sf) / bw
-
-        # Preamble symbols (Meshtastic uses 8)
-        n_preamble = 8
-        t_preamble = (n_preamble + 4.25) * t_sym
-
-        # Payload symbols (simplified)
-        # Parse coding rate (format: "4/5", "4/6", etc.)
-        cr_parts = cr.split('/')
-        if len(cr_parts) >= 2 and cr_parts[1].isdigit():
-            cr_val = int(cr_parts[1]) - 4
-        else:
-            cr_val = 1  # Default to 4/5 coding rate if invalid format
-        n_payload = 8 + max(math.ceil((8 * payload - 4 * sf + 28) / (4 * sf)) * (cr_val + 4), 0)
-        t_payload = n_payload * t_sym
-
-        t_total = (t_preamble + t_payload) * 1000  # ms
+        # Semtech time-on-air with the Meshtastic 16-symbol preamble
+        t_sym = modem.symbol_time
+        t_preamble = modem.preamble_time
+        t_total = modem.time_on_air(payload) * 1000  # ms
+        t_payload = t_total / 1000 - t_preamble
 
         console.print(f"\n[cyan]Time-on-Air Analysis:[/cyan]")
+        console.print(f"  Coding rate: 4/{modem.coding_rate}"
+                      f"{'  (low data rate optimize)' if modem.low_data_rate else ''}")
         console.print(f"  Symbol time: {t_sym * 1000:.2f} ms")
         console.print(f"  Preamble time: {t_preamble * 1000:.2f} ms")
         console.print(f"  Payload time: {t_payload * 1000:.2f} ms")
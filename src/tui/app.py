@@ -13,13 +13,17 @@ import shlex
 import logging
 from pathlib import Path
 
-# Set up logging for TUI diagnostics
-logging.basicConfig(
+# Add parent to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Set up logging for TUI diagnostics (file only: the screen belongs to Textual)
+from utils.logging_config import setup_logging
+setup_logging(
     level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/meshforge-tui.log'),
-    ]
+    log_file='/tmp/meshforge-tui.log',
+    log_format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    console=False,
+    suppress_libs=False,
 )
 logger = logging.getLogger('tui')
 
@@ -34,9 +38,6 @@ from textual.binding import Binding
 from textual.screen import Screen
 from textual import work
 
-# Add parent to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from __version__ import __version__
 
 # Import centralized service checker
@@ -47,6 +48,25 @@ except ImportError:
     check_port = None
     ServiceStatus = None
 
+# Shared service/port poller (one set of probes for every UI)
+try:
+    from utils.system_state import get_system_state
+except ImportError:
+    get_system_state = None
+
+# Shared journal follower (log views read its buffer)
+try:
+    from utils.log_service import get_log_service
+except ImportError:
+    get_log_service = None
+
+# Shared network scanner (meshtasticd, AREDN, MQTT, RNS probes)
+try:
+    from utils.net_scanner import NetworkScanner, local_subnets
+except ImportError:
+    NetworkScanner = None
+    local_subnets = None
+
 
 class StatusWidget(Static):
     """Status bar widget showing service state"""
@@ -81,6 +101,7 @@ class DashboardPane(Container):
         super().__init__(*args, **kwargs)
         self._auto_refresh = False
         self._refresh_interval = 5  # seconds
+        self._state_unsubscribe = None
 
     def compose(self) -> ComposeResult:
         yield Static("# MeshForge Dashboard", classes="title")
@@ -155,6 +176,43 @@ class DashboardPane(Container):
         # Start background data refresh - @work decorator handles async scheduling
         self.refresh_data()
 
+        # Service changes are pushed by the shared poller between refreshes
+        if get_system_state:
+            self._state_unsubscribe = get_system_state().subscribe(
+                lambda state, changes: self.app.call_from_thread(self._show_system_state, state),
+                initial=False)
+
+    def on_unmount(self):
+        if self._state_unsubscribe:
+            self._state_unsubscribe()
+            self._state_unsubscribe = None
+
+    def _show_system_state(self, state) -> None:
+        """Render meshtasticd/rnsd status from a shared SystemState"""
+        try:
+            status_widget = self.query_one("#service-status", Static)
+            detail_widget = self.query_one("#service-detail", Static)
+            rns_widget = self.query_one("#rns-status", Static)
+            rns_detail = self.query_one("#rns-detail", Static)
+        except Exception:
+            return  # Not composed (or already gone)
+
+        unit = state.service('meshtasticd')
+        if state.is_running('meshtasticd'):
+            status_widget.update("[green]● Running[/green]")
+            detail_widget.update("TCP 4403 open" if state.port_open('meshtasticd')
+                                 else (unit.status if unit else "Running"))
+        else:
+            status_widget.update("[red]○ Stopped[/red]")
+            detail_widget.update(unit.status if unit else "Not running")
+
+        if state.is_running('rnsd'):
+            rns_widget.update("[green]● Running[/green]")
+            rns_detail.update("rnsd active")
+        else:
+            rns_widget.update("[yellow]○ Inactive[/yellow]")
+            rns_detail.update("Optional")
+
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle dashboard button presses"""
         button_id = event.button.id
@@ -216,10 +274,10 @@ class DashboardPane(Container):
         """Fetch and display node list"""
         log = self.query_one("#dashboard-log", Log)
         try:
-            # Try to use connection_manager
+            # Try the shared node monitor / connection_manager
             try:
-                from utils.connection_manager import get_nodes
-                nodes = await asyncio.get_running_loop().run_in_executor(None, get_nodes)
+                from tui.panes.base import fetch_node_list
+                nodes = await asyncio.get_running_loop().run_in_executor(None, fetch_node_list)
                 if nodes:
                     log.write(f"\n[cyan]Found {len(nodes)} node(s):[/cyan]")
                     for node in nodes:
@@ -363,8 +421,18 @@ class DashboardPane(Container):
 
         # Show checking status
         status_widget.update("[yellow]Checking...[/yellow]")
+        state = None
+        if get_system_state:
+            try:
+                # Cached by the shared poller; only polls if nothing is cached yet
+                state = await asyncio.get_running_loop().run_in_executor(
+                    None, get_system_state().get)
+            except Exception as e:
+                logger.debug(f"Shared system state unavailable: {e}")
         try:
-            if check_service:
+            if state is not None:
+                self._show_system_state(state)
+            elif check_service:
                 # Use centralized service checker (run in thread pool)
                 service_status = await asyncio.get_running_loop().run_in_executor(
                     None, lambda: check_service('meshtasticd')
@@ -400,15 +468,16 @@ class DashboardPane(Container):
         nodes_detail = self.query_one("#nodes-detail", Static)
         try:
             try:
-                from utils.connection_manager import get_nodes, is_available
+                from utils.connection_manager import is_available
+                from tui.panes.base import fetch_node_list
 
                 # Check if port is available first
                 available = await asyncio.get_running_loop().run_in_executor(None, is_available)
                 if available:
                     # Fetch fresh nodes (also updates cache)
                     nodes_detail.update("Fetching...")
-                    nodes = await asyncio.get_running_loop().run_in_executor(None, get_nodes)
-                    logger.debug(f"get_nodes returned: {len(nodes) if nodes else 0} nodes")
+                    nodes = await asyncio.get_running_loop().run_in_executor(None, fetch_node_list)
+                    logger.debug(f"fetch_node_list returned: {len(nodes) if nodes else 0} nodes")
                     if nodes:
                         count = len(nodes) if isinstance(nodes, list) else 0
                         nodes_widget.update(f"[green]{count} nodes[/green]")
@@ -428,24 +497,25 @@ class DashboardPane(Container):
             nodes_widget.update("[red]Error[/red]")
             nodes_detail.update(str(e)[:20])
 
-        # RNS Status
+        # RNS Status (already rendered when the shared state is available)
         rns_widget = self.query_one("#rns-status", Static)
         rns_detail = self.query_one("#rns-detail", Static)
         try:
-            result = await asyncio.create_subprocess_exec(
-                'systemctl', 'is-active', 'rnsd',
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await result.communicate()
-            status = stdout.decode().strip()
+            if state is None:
+                result = await asyncio.create_subprocess_exec(
+                    'systemctl', 'is-active', 'rnsd',
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                stdout, _ = await result.communicate()
+                status = stdout.decode().strip()
 
-            if status == "active":
-                rns_widget.update("[green]● Running[/green]")
-                rns_detail.update("rnsd active")
-            else:
-                rns_widget.update("[yellow]○ Inactive[/yellow]")
-                rns_detail.update("Optional")
+                if status == "active":
+                    rns_widget.update("[green]● Running[/green]")
+                    rns_detail.update("rnsd active")
+                else:
+                    rns_widget.update("[yellow]○ Inactive[/yellow]")
+                    rns_detail.update("Optional")
         except Exception:
             rns_widget.update("[yellow]N/A[/yellow]")
             rns_detail.update("Check failed")
@@ -699,6 +769,11 @@ class ServicePane(Container):
     async def _follow_logs(self):
         """Worker that follows logs"""
         log = self.query_one("#svc-log", Log)
+        if get_log_service is not None:
+            logs = get_log_service()
+            if await asyncio.to_thread(logs.wait_ready, 5) and logs.running:
+                await self._follow_shared_logs(log, logs)
+                return
         while self._following:
             try:
                 result = await asyncio.create_subprocess_exec(
@@ -712,6 +787,18 @@ class ServicePane(Container):
                 log.write(f"[red]Error fetching logs: {e}[/red]")
             await asyncio.sleep(2)  # Refresh every 2 seconds
 
+    async def _follow_shared_logs(self, log: Log, logs):
+        """Append new lines from the shared follower as they arrive"""
+        entries, cursor = logs.read(unit='meshtasticd', limit=20)
+        log.clear()
+        for entry in entries:
+            log.write_line(entry.line)
+        while self._following and logs.running:
+            entries, cursor = await asyncio.to_thread(
+                logs.wait, cursor, 1.0, 'meshtasticd')
+            for entry in entries:
+                log.write_line(entry.line)
+
 
 class ConfigPane(Container):
     """Configuration file manager pane"""
@@ -1216,56 +1303,28 @@ class ToolsPane(Container):
 
     @work
     async def _scan_devices(self, output: Log):
-        """Scan for Meshtastic devices - concurrent scan for speed"""
-        import socket
+        """Scan local subnets for Meshtastic devices, streaming hits as found"""
         output.write("\n[cyan]Scanning for Meshtastic devices (port 4403)...[/cyan]")
         logger.info("Starting device scan")
 
+        if NetworkScanner is None:
+            output.write("[red]Network scanner not available[/red]")
+            return
+
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            base = '.'.join(local_ip.split('.')[:3])
+            subnets = await asyncio.to_thread(local_subnets)
+            if not subnets:
+                output.write("[yellow]No local network found[/yellow]")
+                return
+            output.write(f"  Scanning {', '.join(str(s) for s in subnets)} ...")
+            logger.debug(f"Scanning subnets {subnets}")
 
             found = []
-
-            async def check_host(ip: str):
-                """Check single host - async"""
-                try:
-                    # Use asyncio for non-blocking connect
-                    reader, writer = await asyncio.wait_for(
-                        asyncio.open_connection(ip, 4403),
-                        timeout=0.5
-                    )
-                    writer.close()
-                    await writer.wait_closed()
-                    return ip
-                except (asyncio.TimeoutError, OSError, ConnectionRefusedError):
-                    return None
-
-            # Scan in batches of 50 for responsiveness
-            output.write(f"  Scanning {base}.1-254 ...")
-            logger.debug(f"Scanning subnet {base}.0/24")
-
-            batch_size = 50
-            for batch_start in range(1, 255, batch_size):
-                batch_end = min(batch_start + batch_size, 255)
-                tasks = [
-                    check_host(f"{base}.{i}")
-                    for i in range(batch_start, batch_end)
-                ]
-                results = await asyncio.gather(*tasks)
-
-                for ip in results:
-                    if ip:
-                        output.write(f"  [green]Found: {ip}:4403[/green]")
-                        found.append(ip)
-                        logger.info(f"Found Meshtastic device at {ip}:4403")
-
-                # Update progress
-                progress = (batch_end / 254) * 100
-                output.write(f"  Progress: {progress:.0f}%")
+            async for result in NetworkScanner().scan(subnets, ['meshtastic']):
+                output.write(f"  [green]Found: {result.address}[/green]"
+                             f" [dim]({result.rtt * 1000:.0f} ms)[/dim]")
+                found.append(result.host)
+                logger.info(f"Found Meshtastic device at {result.address}")
 
             output.write(f"\n[cyan]Scan complete. Found {len(found)} device(s)[/cyan]")
             logger.info(f"Scan complete: found {len(found)} devices")
@@ -1382,30 +1441,12 @@ class ToolsPane(Container):
 
     # Network Diagnostics Methods
     def _parse_proc_net(self, protocol: str) -> list:
-        """Parse /proc/net/udp or /proc/net/tcp"""
-        results = []
+        """Parse /proc/net/udp or /proc/net/tcp (shared parser in utils.network_diag)"""
         try:
-            with open(f"/proc/net/{protocol}", 'r') as f:
-                lines = f.readlines()[1:]
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 10:
-                    addr_parts = parts[1].split(':')
-                    try:
-                        ip_int = int(addr_parts[0], 16)
-                        ip_bytes = [(ip_int >> i) & 0xFF for i in (0, 8, 16, 24)]
-                        ip_str = '.'.join(str(b) for b in ip_bytes)
-                        port = int(addr_parts[1], 16)
-                        state_names = {'01': 'ESTABLISHED', '0A': 'LISTEN', '06': 'TIME_WAIT'}
-                        results.append({
-                            'ip': ip_str, 'port': port,
-                            'state': state_names.get(parts[3].upper(), parts[3])
-                        })
-                    except (ValueError, IndexError):
-                        continue
-        except (FileNotFoundError, PermissionError):
-            pass
-        return results
+            from utils.network_diag import parse_proc_net
+        except ImportError:
+            return []
+        return parse_proc_net(protocol)
 
     @work
     async def _show_udp_listeners(self, output: Log):
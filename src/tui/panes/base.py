@@ -17,3 +17,21 @@ except ImportError:
     check_service = None
     check_port = None
     ServiceStatus = None
+
+
+def fetch_node_list():
+    """
+    Node list for the TUI (blocking - run in an executor).
+
+    Uses the process-wide shared NodeMonitor, so refreshes reuse one
+    connection; falls back to connection_manager when it is unavailable.
+    """
+    try:
+        from monitoring.monitor_service import get_node_list
+        nodes = get_node_list("tui")
+        if nodes is not None:
+            return nodes
+    except ImportError:
+        pass
+    from utils.connection_manager import get_nodes
+    return get_nodes()
@@ -18,6 +18,12 @@ try:
 except ImportError:
     check_service = None
 
+# Shared service/port poller (one set of probes for every UI)
+try:
+    from utils.system_state import get_system_state
+except ImportError:
+    get_system_state = None
+
 
 class DashboardPane(Container):
     """Dashboard showing system status"""
@@ -142,9 +148,9 @@ class DashboardPane(Container):
         log = self.query_one("#dashboard-log", Log)
         try:
             try:
-                from utils.connection_manager import get_nodes
+                from .base import fetch_node_list
                 loop = asyncio.get_event_loop()
-                nodes = await loop.run_in_executor(None, get_nodes)
+                nodes = await loop.run_in_executor(None, fetch_node_list)
                 if nodes:
                     log.write(f"\n[cyan]Found {len(nodes)} node(s):[/cyan]")
                     for node in nodes:
@@ -266,12 +272,30 @@ class DashboardPane(Container):
         """Refresh dashboard data"""
         log = self.query_one("#dashboard-log", Log)
 
+        # Shared poller state (cached; replaces per-refresh systemctl calls)
+        state = None
+        if get_system_state:
+            try:
+                state = await asyncio.get_event_loop().run_in_executor(
+                    None, get_system_state().get)
+            except Exception as e:
+                logger.debug(f"Shared system state unavailable: {e}")
+
         # Service status
         try:
             status_widget = self.query_one("#service-status", Static)
             detail_widget = self.query_one("#service-detail", Static)
 
-            if check_service:
+            if state is not None:
+                unit = state.service('meshtasticd')
+                if state.is_running('meshtasticd'):
+                    status_widget.update("[green]● Running[/green]")
+                    detail_widget.update("TCP 4403 open" if state.port_open('meshtasticd')
+                                         else unit.status)
+                else:
+                    status_widget.update("[red]○ Stopped[/red]")
+                    detail_widget.update(unit.status if unit else "Not running")
+            elif check_service:
                 loop = asyncio.get_event_loop()
                 service_status = await loop.run_in_executor(
                     None, lambda: check_service('meshtasticd')
@@ -304,12 +328,13 @@ class DashboardPane(Container):
             nodes_widget = self.query_one("#nodes-status", Static)
             nodes_detail = self.query_one("#nodes-detail", Static)
             try:
-                from utils.connection_manager import get_nodes, is_available
+                from utils.connection_manager import is_available
+                from .base import fetch_node_list
                 loop = asyncio.get_event_loop()
                 available = await loop.run_in_executor(None, is_available)
                 if available:
                     nodes_detail.update("Fetching...")
-                    nodes = await loop.run_in_executor(None, get_nodes)
+                    nodes = await loop.run_in_executor(None, fetch_node_list)
                     if nodes:
                         count = len(nodes) if isinstance(nodes, list) else 0
                         nodes_widget.update(f"[green]{count} nodes[/green]")
@@ -330,13 +355,16 @@ class DashboardPane(Container):
         try:
             rns_widget = self.query_one("#rns-status", Static)
             rns_detail = self.query_one("#rns-detail", Static)
-            result = await asyncio.create_subprocess_exec(
-                'systemctl', 'is-active', 'rnsd',
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await result.communicate()
-            status = stdout.decode().strip()
+            if state is not None:
+                status = "active" if state.is_running('rnsd') else "inactive"
+            else:
+                result = await asyncio.create_subprocess_exec(
+                    'systemctl', 'is-active', 'rnsd',
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                stdout, _ = await result.communicate()
+                status = stdout.decode().strip()
             if status == "active":
                 rns_widget.update("[green]● Running[/green]")
                 rns_detail.update("rnsd active")
@@ -0,0 +1,290 @@
+"""
+LoRa Airtime - time-on-air, channel utilization and throughput model
+
+Pure functions/dataclasses for the LoRa PHY, shared by the RF tools menu,
+LoRa configurator, gateway pacing and the web tools API.
+
+Time on air follows the Semtech SX127x/SX126x formula (AN1200.13):
+
+    Tsym      = 2^SF / BW
+    Tpreamble = (Npreamble + 4.25) * Tsym
+    Npayload  = 8 + max(ceil((8*PL - 4*SF + 28 + 16*CRC - 20*IH) / (4*(SF - 2*DE))) * (CR + 4), 0)
+
+with DE (low data rate optimization) switched on automatically when a
+symbol is longer than 16 ms, as the radio drivers do.
+
+A packet is at most 255 bytes, so each modem's airtime is tabulated once
+for every payload size 0-255 (cached); batch calls are then table lookups
+and the whole preset matrix costs microseconds after the first use.
+
+Usage:
+    time_on_air(50, 'LONG_FAST')                        # seconds
+    MODEM_PRESETS['SHORT_TURBO'].time_on_air_batch([16, 64, 255])
+    channel_utilization(40, preset='LONG_FAST').utilization
+    max_throughput('SHORT_TURBO')                        # bytes/s
+"""
+
+import math
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+MAX_LORA_PACKET = 255           # bytes the radio FIFO can send
+MESHTASTIC_HEADER = 16          # to, from, id, flags, channel hash, next hop, relay
+MESHTASTIC_MAX_PAYLOAD = MAX_LORA_PACKET - MESHTASTIC_HEADER
+MESHTASTIC_PREAMBLE = 16        # symbols (firmware 2.x)
+LDRO_SYMBOL_TIME = 0.016        # seconds; longer symbols need low data rate optimization
+
+# Meshtastic's polite channel limit: above this, nodes stop sending optional traffic
+POLITE_UTILIZATION = 0.25
+
+# Lowest SNR (dB) each spreading factor demodulates (SX127x/SX126x datasheets)
+SNR_THRESHOLDS = {6: -5.0, 7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0}
+
+
+@dataclass(frozen=True)
+class LoRaModem:
+    """LoRa modulation parameters."""
+    spreading_factor: int
+    bandwidth: float                  # Hz
+    coding_rate: int = 5              # denominator: 5-8 for 4/5-4/8
+    preamble: int = MESHTASTIC_PREAMBLE
+    explicit_header: bool = True
+    crc: bool = True
+    ldro: Optional[bool] = None       # None: on when a symbol exceeds 16 ms
+
+    @property
+    def symbol_time(self) -> float:
+        """Seconds per symbol."""
+        return (1 << self.spreading_factor) / self.bandwidth
+
+    @property
+    def low_data_rate(self) -> bool:
+        if self.ldro is not None:
+            return self.ldro
+        return self.symbol_time > LDRO_SYMBOL_TIME
+
+    @property
+    def snr_threshold(self) -> float:
+        """Lowest SNR (dB) this modem can demodulate."""
+        return SNR_THRESHOLDS[self.spreading_factor]
+
+    @property
+    def preamble_time(self) -> float:
+        return (self.preamble + 4.25) * self.symbol_time
+
+    @property
+    def bitrate(self) -> float:
+        """Raw PHY bit rate (bits/s) after coding."""
+        return self.spreading_factor * self.bandwidth / (1 << self.spreading_factor) \
+            * 4 / self.coding_rate
+
+    def payload_symbols(self, payload: int) -> int:
+        sf = self.spreading_factor
+        numerator = (8 * payload - 4 * sf + 28 + (16 if self.crc else 0)
+                     - (0 if self.explicit_header else 20))
+        denominator = 4 * (sf - (2 if self.low_data_rate else 0))
+        return 8 + max(-(-numerator // denominator), 0) * self.coding_rate
+
+    def time_on_air(self, payload: int) -> float:
+        """Seconds on air for a payload (bytes, as handed to the radio)."""
+        if 0 <= payload <= MAX_LORA_PACKET:
+            return _airtime_table(self)[payload]
+        return self._time_on_air(payload)
+
+    def _time_on_air(self, payload: int) -> float:
+        return self.preamble_time + self.payload_symbols(payload) * self.symbol_time
+
+    def time_on_air_batch(self, payloads: Iterable[int]) -> List[float]:
+        """time_on_air() for many payload sizes."""
+        table = _airtime_table(self)
+        return [table[p] if 0 <= p <= MAX_LORA_PACKET else self._time_on_air(p)
+                for p in payloads]
+
+    def table(self) -> Tuple[float, ...]:
+        """Airtime (seconds) indexed by payload size 0-255."""
+        return _airtime_table(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            'spreading_factor': self.spreading_factor,
+            'bandwidth_hz': self.bandwidth,
+            'coding_rate': f"4/{self.coding_rate}",
+            'preamble': self.preamble,
+            'low_data_rate_optimize': self.low_data_rate,
+            'symbol_time_ms': round(self.symbol_time * 1000, 3),
+            'bitrate_bps': round(self.bitrate, 1),
+        }
+
+
+@lru_cache(maxsize=256)
+def _airtime_table(modem: LoRaModem) -> Tuple[float, ...]:
+    return tuple(modem._time_on_air(p) for p in range(MAX_LORA_PACKET + 1))
+
+
+# Meshtastic modem presets (firmware RadioInterface.cpp), fastest first
+MODEM_PRESETS: Dict[str, LoRaModem] = {
+    'SHORT_TURBO': LoRaModem(7, 500_000, 5),
+    'SHORT_FAST': LoRaModem(7, 250_000, 5),
+    'SHORT_SLOW': LoRaModem(8, 250_000, 5),
+    'MEDIUM_FAST': LoRaModem(9, 250_000, 5),
+    'MEDIUM_SLOW': LoRaModem(10, 250_000, 5),
+    'LONG_FAST': LoRaModem(11, 250_000, 5),
+    'LONG_MODERATE': LoRaModem(11, 125_000, 8),
+    'LONG_SLOW': LoRaModem(12, 125_000, 8),
+    'VERY_LONG_SLOW': LoRaModem(12, 62_500, 8),
+}
+
+ModemSpec = Union[str, LoRaModem]
+
+
+def get_modem(modem: ModemSpec) -> LoRaModem:
+    """A LoRaModem, or the one for a preset name.
+
+    Raises:
+        KeyError: Unknown preset
+    """
+    return modem if isinstance(modem, LoRaModem) else MODEM_PRESETS[modem.upper()]
+
+
+def time_on_air(payload: int, modem: ModemSpec = 'LONG_FAST') -> float:
+    """Seconds on air for a payload of this many bytes."""
+    return get_modem(modem).time_on_air(payload)
+
+
+def preset_matrix(payloads: Sequence[int],
+                  presets: Optional[Iterable[str]] = None) -> Dict[str, List[float]]:
+    """Airtime (seconds) of every payload size under every preset."""
+    return {name: MODEM_PRESETS[name].time_on_air_batch(payloads)
+            for name in (presets if presets is not None else MODEM_PRESETS)}
+
+
+def max_throughput(modem: ModemSpec, payload: int = MESHTASTIC_MAX_PAYLOAD,
+                   header: int = MESHTASTIC_HEADER, duty_cycle: float = 100.0) -> float:
+    """Best-case application bytes/s: back-to-back full packets within a duty cycle (%)."""
+    airtime = get_modem(modem).time_on_air(payload + header)
+    return payload / airtime * duty_cycle / 100
+
+
+# ============================================================================
+# Channel utilization
+# ============================================================================
+
+@dataclass(frozen=True)
+class Traffic:
+    """One kind of packet each node originates."""
+    name: str
+    payload: int          # application bytes (header added on air)
+    interval: float       # seconds between packets, per node
+
+
+# Meshtastic defaults (approximate encoded sizes)
+DEFAULT_TRAFFIC = (
+    Traffic('nodeinfo', 70, 3 * 3600),
+    Traffic('position', 35, 15 * 60),
+    Traffic('telemetry', 30, 30 * 60),
+)
+
+
+@dataclass
+class UtilizationReport:
+    """Projected channel load for a mesh."""
+    nodes: int
+    preset: str
+    transmissions: float                # on-air copies of each packet (origin + relays)
+    packets_per_hour: float             # transmissions heard on the channel
+    airtime_per_hour: float             # seconds the channel is busy per hour
+    utilization: float                  # busy fraction (can exceed 1: saturated)
+    node_duty_cycle: float              # % of time each node transmits
+    delivery_probability: float         # per transmission, pure ALOHA exp(-2G)
+    duty_limit: Optional[float] = None  # regional limit (%)
+    by_traffic: Dict[str, float] = field(default_factory=dict)   # airtime/hour by kind
+
+    @property
+    def within_duty_cycle(self) -> bool:
+        return self.duty_limit is None or self.node_duty_cycle <= self.duty_limit
+
+    @property
+    def polite(self) -> bool:
+        return self.utilization <= POLITE_UTILIZATION
+
+    def to_dict(self) -> Dict:
+        return {
+            'nodes': self.nodes,
+            'preset': self.preset,
+            'transmissions_per_packet': round(self.transmissions, 2),
+            'packets_per_hour': round(self.packets_per_hour, 1),
+            'airtime_per_hour_s': round(self.airtime_per_hour, 2),
+            'channel_utilization_pct': round(self.utilization * 100, 2),
+            'node_duty_cycle_pct': round(self.node_duty_cycle, 3),
+            'delivery_probability': round(self.delivery_probability, 4),
+            'duty_limit_pct': self.duty_limit,
+            'within_duty_cycle': self.within_duty_cycle,
+            'polite': self.polite,
+            'airtime_by_traffic_s': {k: round(v, 2) for k, v in self.by_traffic.items()},
+        }
+
+
+def channel_utilization(nodes: int, traffic: Iterable[Traffic] = DEFAULT_TRAFFIC,
+                        preset: ModemSpec = 'LONG_FAST', hop_limit: int = 3,
+                        relays: Optional[float] = None,
+                        duty_limit: Optional[float] = None) -> UtilizationReport:
+    """Project channel load for nodes all sending a traffic mix.
+
+    Args:
+        nodes: Nodes sharing the channel
+        traffic: What each node originates
+        preset: Modem preset name or LoRaModem
+        hop_limit: Flood hop limit; each hop adds one rebroadcast
+        relays: Override the rebroadcasts per packet (default min(hop_limit, nodes - 1))
+        duty_limit: Regional per-node duty cycle limit (%)
+
+    Returns:
+        UtilizationReport
+    """
+    modem = get_modem(preset)
+    if relays is None:
+        relays = min(hop_limit, max(nodes - 1, 0))
+    copies = 1 + relays
+
+    by_traffic = {}
+    packets = 0.0
+    for kind in traffic:
+        per_hour = nodes * 3600 / kind.interval * copies
+        packets += per_hour
+        by_traffic[kind.name] = (by_traffic.get(kind.name, 0.0)
+                                 + per_hour * modem.time_on_air(kind.payload + MESHTASTIC_HEADER))
+    airtime = sum(by_traffic.values())
+    utilization = airtime / 3600
+
+    return UtilizationReport(
+        nodes=nodes,
+        preset=preset if isinstance(preset, str) else 'custom',
+        transmissions=copies,
+        packets_per_hour=packets,
+        airtime_per_hour=airtime,
+        utilization=utilization,
+        node_duty_cycle=utilization / nodes * 100 if nodes else 0.0,
+        delivery_probability=math.exp(-2 * utilization),
+        duty_limit=duty_limit,
+        by_traffic=by_traffic,
+    )
+
+
+def max_nodes(target: float = POLITE_UTILIZATION, traffic: Iterable[Traffic] = DEFAULT_TRAFFIC,
+              preset: ModemSpec = 'LONG_FAST', hop_limit: int = 3, limit: int = 100_000) -> int:
+    """Largest mesh whose projected utilization stays at or below target."""
+    traffic = tuple(traffic)
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if channel_utilization(mid, traffic, preset, hop_limit).utilization <= target:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def with_preamble(modem: ModemSpec, preamble: int) -> LoRaModem:
+    """The same modem with another preamble length."""
+    return replace(get_modem(modem), preamble=preamble)
@@ -27,6 +27,11 @@ try:
 except ImportError:
     urllib = None
 
+try:
+    from utils.net_scanner import NetworkScanner, PROBES, scan_sync
+except ImportError:
+    from .net_scanner import NetworkScanner, PROBES, scan_sync
+
 logger = logging.getLogger(__name__)
 
 
@@ -361,26 +366,31 @@ class AREDNScanner:
     def __init__(self, timeout: int = 2):
         self.timeout = timeout
         self._stop_scan = False
+        self._scanner: Optional[NetworkScanner] = None
 
     def scan_subnet(self, subnet: str, callback: Optional[Callable[[AREDNNode], None]] = None,
                     max_threads: int = 20) -> List[AREDNNode]:
         """
         Scan a subnet for AREDN nodes.
 
+        The subnet is swept for web servers (ports 80 and 8080) by the
+        shared asyncio scanner; only hosts that answer get the sysinfo
+        API request, so empty addresses cost one connect, not a timeout
+        per thread.
+
         Args:
             subnet: Subnet in CIDR notation (e.g., "10.0.0.0/24")
             callback: Optional callback for each discovered node
-            max_threads: Maximum concurrent scan threads
+            max_threads: Maximum concurrent sysinfo requests
 
         Returns:
             List of discovered AREDNNode objects
         """
-        import ipaddress
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import ThreadPoolExecutor
 
-        network = ipaddress.ip_network(subnet, strict=False)
-        nodes = []
         self._stop_scan = False
+        self._scanner = NetworkScanner(max_timeout=self.timeout)
+        probes = [PROBES['aredn'], PROBES['aredn'].with_port(80)]
 
         def check_host(ip: str) -> Optional[AREDNNode]:
             if self._stop_scan:
@@ -397,17 +407,18 @@ class AREDNScanner:
                 logger.debug(f"Scan {ip}: {e}")
             return None
 
+        hosts = set()
+        futures = []
         with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            futures = {executor.submit(check_host, str(ip)): ip for ip in network.hosts()}
+            def on_web_server(result):
+                # Query each host once, while the sweep carries on
+                if result.host not in hosts:
+                    hosts.add(result.host)
+                    futures.append(executor.submit(check_host, result.host))
 
-            for future in as_completed(futures):
-                if self._stop_scan:
-                    break
-                result = future.result()
-                if result:
-                    nodes.append(result)
+            scan_sync(subnet, probes, callback=on_web_server, scanner=self._scanner)
 
-        return nodes
+        return [f.result() for f in futures if f.result() is not None]
 
     def scan_common_ranges(self, callback: Optional[Callable[[AREDNNode], None]] = None) -> List[AREDNNode]:
         """
@@ -438,6 +449,8 @@ class AREDNScanner:
     def stop(self):
         """Stop ongoing scan"""
         self._stop_scan = True
+        if self._scanner:
+            self._scanner.stop()
 
 
 class MikroTikAREDN:
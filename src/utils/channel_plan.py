@@ -0,0 +1,324 @@
+"""
+LoRa Channel Plan - Meshtastic frequency slots for every region and preset
+
+Single source for the channel math the firmware does in RadioInterface.cpp:
+
+    num_channels = floor((freqEnd - freqStart) / bw)
+    slot         = djb2(channel_name) % num_channels
+    frequency    = freqStart + bw / 2 + slot * bw
+
+Slot -> frequency tables for every (region, preset) pair are built once at
+import, and band edges are kept in integer Hz so 869.65 - 869.4 can't round
+down a slot. Channel-name hashes are memoized, and batch calls hash each
+name once and take one modulo per distinct slot count rather than per preset,
+so thousands of candidate names are scored in milliseconds.
+
+Usage:
+    plan('US', 'LONG_FAST').frequency_for('LongFast')      # 906.875
+    plan_channels(['Ops', 'Net', 'SAR'], 'US')             # collisions, free slots
+    lookup_frequency(906.875, candidates=['LongFast', 'Ops'])
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# All Meshtastic regions: band edges (MHz), duty cycle (%), max power (dBm)
+REGIONS = {
+    # Americas
+    'US': {'start': 902.0, 'end': 928.0, 'duty': 100, 'power': 30, 'desc': 'United States ISM'},
+    'ANZ': {'start': 915.0, 'end': 928.0, 'duty': 100, 'power': 30, 'desc': 'Australia/New Zealand'},
+    # Europe
+    'EU_868': {'start': 869.4, 'end': 869.65, 'duty': 10, 'power': 27, 'desc': 'EU 869 MHz SRD'},
+    'EU_433': {'start': 433.0, 'end': 434.0, 'duty': 10, 'power': 12, 'desc': 'EU 433 MHz'},
+    'UK_868': {'start': 869.4, 'end': 869.65, 'duty': 10, 'power': 27, 'desc': 'UK 869 MHz'},
+    'UA_868': {'start': 868.0, 'end': 868.6, 'duty': 100, 'power': 20, 'desc': 'Ukraine 868 MHz'},
+    'UA_433': {'start': 433.0, 'end': 434.79, 'duty': 100, 'power': 12, 'desc': 'Ukraine 433 MHz'},
+    'RU': {'start': 868.7, 'end': 869.2, 'duty': 100, 'power': 20, 'desc': 'Russia'},
+    # Asia-Pacific
+    'JP': {'start': 920.8, 'end': 923.8, 'duty': 100, 'power': 16, 'desc': 'Japan'},
+    'KR': {'start': 920.0, 'end': 923.0, 'duty': 100, 'power': 10, 'desc': 'Korea'},
+    'TW': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 27, 'desc': 'Taiwan'},
+    'CN': {'start': 470.0, 'end': 510.0, 'duty': 100, 'power': 19, 'desc': 'China'},
+    'IN': {'start': 865.0, 'end': 867.0, 'duty': 100, 'power': 30, 'desc': 'India'},
+    'TH': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 16, 'desc': 'Thailand'},
+    'PH': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 16, 'desc': 'Philippines'},
+    'SG_923': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 20, 'desc': 'Singapore 923'},
+    'MY_433': {'start': 433.0, 'end': 435.0, 'duty': 100, 'power': 12, 'desc': 'Malaysia 433 MHz'},
+    'MY_919': {'start': 919.0, 'end': 924.0, 'duty': 100, 'power': 20, 'desc': 'Malaysia 919 MHz'},
+    # Oceania
+    'NZ_865': {'start': 864.0, 'end': 868.0, 'duty': 100, 'power': 36, 'desc': 'New Zealand 865 MHz'},
+    # 2.4 GHz ISM
+    'LORA_24': {'start': 2400.0, 'end': 2483.5, 'duty': 100, 'power': 10, 'desc': '2.4 GHz ISM (worldwide)'},
+}
+
+# Names some UIs use for a region above
+REGION_ALIASES = {'UNSET': 'US', 'SINGAPORE': 'SG_923'}
+
+# Modem presets: bandwidth (kHz), spreading factor, coding rate
+PRESETS = {
+    'LONG_FAST': {'bandwidth': 250, 'sf': 11, 'cr': '4/5'},
+    'LONG_SLOW': {'bandwidth': 125, 'sf': 12, 'cr': '4/8'},
+    'LONG_MODERATE': {'bandwidth': 125, 'sf': 11, 'cr': '4/8'},
+    'MEDIUM_FAST': {'bandwidth': 250, 'sf': 9, 'cr': '4/5'},
+    'MEDIUM_SLOW': {'bandwidth': 250, 'sf': 10, 'cr': '4/5'},
+    'SHORT_FAST': {'bandwidth': 250, 'sf': 7, 'cr': '4/5'},
+    'SHORT_SLOW': {'bandwidth': 250, 'sf': 8, 'cr': '4/5'},
+    'SHORT_TURBO': {'bandwidth': 500, 'sf': 7, 'cr': '4/5'},
+    'VERY_LONG_SLOW': {'bandwidth': 62.5, 'sf': 12, 'cr': '4/8'},
+}
+
+# Channel name the firmware hashes when the primary channel has none
+DEFAULT_CHANNEL_NAMES = {
+    'LONG_FAST': 'LongFast',
+    'LONG_SLOW': 'LongSlow',
+    'LONG_MODERATE': 'LongMod',
+    'MEDIUM_FAST': 'MediumFast',
+    'MEDIUM_SLOW': 'MediumSlow',
+    'SHORT_FAST': 'ShortFast',
+    'SHORT_SLOW': 'ShortSlow',
+    'SHORT_TURBO': 'ShortTurbo',
+    'VERY_LONG_SLOW': 'VLongSlow',
+}
+
+
+# ============================================================================
+# Hashing
+# ============================================================================
+
+_MASK = 0xFFFFFFFF
+_POW33 = [1]    # 33**k mod 2**32, grown on demand
+
+
+def _powers(n: int) -> List[int]:
+    while len(_POW33) <= n:
+        _POW33.append((_POW33[-1] * 33) & _MASK)
+    return _POW33
+
+
+@lru_cache(maxsize=8192)
+def djb2_hash(s: str) -> int:
+    """
+    DJB2 hash algorithm - same as Meshtastic firmware RadioInterface.cpp
+
+    Hashes the UTF-8 bytes, as the firmware does with the C string.
+    Evaluated as the polynomial 5381*33^n + sum(b_i * 33^(n-1-i)) so the
+    per-byte work runs in C (map/sum) instead of a Python loop.
+
+    Args:
+        s: String to hash (channel name)
+
+    Returns:
+        32-bit unsigned hash value
+    """
+    data = s.encode('utf-8')
+    powers = _powers(len(data))
+    return (5381 * powers[len(data)] + sum(map(mul, reversed(data), powers))) & _MASK
+
+
+# ============================================================================
+# Precomputed plans
+# ============================================================================
+
+def _hz(mhz: float) -> int:
+    return round(mhz * 1_000_000)
+
+
+def num_channels(region: str, bandwidth_khz: float) -> int:
+    """Number of frequency slots a region has at a bandwidth (at least 1)."""
+    band = REGIONS[REGION_ALIASES.get(region, region)]
+    width = _hz(band['end']) - _hz(band['start'])
+    return max(1, width // round(bandwidth_khz * 1000))
+
+
+def slot_frequency(region: str, bandwidth_khz: float, slot: int) -> float:
+    """Center frequency (MHz) of a slot."""
+    band = REGIONS[REGION_ALIASES.get(region, region)]
+    bw = round(bandwidth_khz * 1000)
+    return (_hz(band['start']) + bw // 2 + slot * bw) / 1_000_000
+
+
+@dataclass(frozen=True)
+class ChannelPlan:
+    """Slot table for one region and modem preset."""
+    region: str
+    preset: str
+    bandwidth_khz: float
+    start_mhz: float
+    end_mhz: float
+    num_channels: int
+    frequencies: Tuple[float, ...] = field(repr=False)   # center MHz by slot
+
+    def slot_for(self, channel: str) -> int:
+        return djb2_hash(channel) % self.num_channels
+
+    def frequency(self, slot: int) -> float:
+        return self.frequencies[slot]
+
+    def frequency_for(self, channel: str) -> float:
+        return self.frequencies[self.slot_for(channel)]
+
+    def slot_at(self, freq_mhz: float, tolerance_khz: Optional[float] = None) -> Optional[int]:
+        """Slot whose center is within tolerance of freq (default: half a channel)."""
+        bw = round(self.bandwidth_khz * 1000)
+        offset = _hz(freq_mhz) - _hz(self.start_mhz) - bw // 2
+        slot = round(offset / bw)
+        if not 0 <= slot < self.num_channels:
+            return None
+        tolerance = bw / 2 if tolerance_khz is None else tolerance_khz * 1000
+        return slot if abs(offset - slot * bw) <= tolerance else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'region': self.region,
+            'preset': self.preset,
+            'bandwidth_khz': self.bandwidth_khz,
+            'num_channels': self.num_channels,
+            'start_mhz': self.start_mhz,
+            'end_mhz': self.end_mhz,
+        }
+
+
+def _build_plans() -> Dict[Tuple[str, str], ChannelPlan]:
+    plans = {}
+    for region, band in REGIONS.items():
+        for preset, info in PRESETS.items():
+            bw = info['bandwidth']
+            count = num_channels(region, bw)
+            plans[(region, preset)] = ChannelPlan(
+                region, preset, bw, band['start'], band['end'], count,
+                tuple(slot_frequency(region, bw, slot) for slot in range(count)))
+    return plans
+
+
+_PLANS = _build_plans()
+
+
+def plan(region: str, preset: str) -> ChannelPlan:
+    """The precomputed plan for a region and preset.
+
+    Raises:
+        KeyError: Unknown region or preset
+    """
+    return _PLANS[(REGION_ALIASES.get(region, region), preset)]
+
+
+def all_plans(region: Optional[str] = None,
+              preset: Optional[str] = None) -> List[ChannelPlan]:
+    """Every plan, optionally narrowed to one region and/or preset."""
+    if region is not None:
+        region = REGION_ALIASES.get(region, region)
+    return [p for (r, pr), p in _PLANS.items()
+            if (region is None or r == region) and (preset is None or pr == preset)]
+
+
+# ============================================================================
+# Batch API
+# ============================================================================
+
+@dataclass
+class SlotReport:
+    """Where a set of channel names lands under one preset."""
+    plan: ChannelPlan
+    slots: Dict[str, int]                       # name -> slot
+    collisions: Dict[int, List[str]]            # slot -> names sharing it
+    free: List[int]                             # slots no name uses
+
+    def to_dict(self) -> Dict:
+        return {
+            **self.plan.to_dict(),
+            'slots': {name: {'slot': slot, 'frequency_mhz': self.plan.frequencies[slot]}
+                      for name, slot in self.slots.items()},
+            'collisions': {str(slot): names for slot, names in self.collisions.items()},
+            'free_slots': self.free,
+        }
+
+
+def slots_for_names(names: Iterable[str], region: str,
+                    presets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Slot of every name under every preset: {preset: {name: slot}}."""
+    names = list(dict.fromkeys(names))
+    hashes = [djb2_hash(name) for name in names]
+    by_count: Dict[int, Dict[str, int]] = {}
+    result = {}
+    for preset in (presets if presets is not None else PRESETS):
+        count = plan(region, preset).num_channels
+        if count not in by_count:
+            by_count[count] = {name: h % count for name, h in zip(names, hashes)}
+        result[preset] = by_count[count]
+    return result
+
+
+def plan_channels(names: Iterable[str], region: str,
+                  presets: Optional[Iterable[str]] = None) -> Dict[str, SlotReport]:
+    """Collisions and free slots for a set of channel names, per preset.
+
+    Args:
+        names: Candidate channel names
+        region: Region code (see REGIONS)
+        presets: Presets to evaluate (default: all)
+
+    Returns:
+        Dict of preset -> SlotReport
+    """
+    reports = {}
+    by_count: Dict[int, Tuple[Dict[int, List[str]], List[int]]] = {}
+    for preset, slots in slots_for_names(names, region, presets).items():
+        channel_plan = plan(region, preset)
+        count = channel_plan.num_channels
+        if count not in by_count:
+            occupied: Dict[int, List[str]] = {}
+            for name, slot in slots.items():
+                occupied.setdefault(slot, []).append(name)
+            by_count[count] = (
+                {slot: group for slot, group in sorted(occupied.items()) if len(group) > 1},
+                [slot for slot in range(count) if slot not in occupied],
+            )
+        collisions, free = by_count[count]
+        reports[preset] = SlotReport(channel_plan, slots, collisions, free)
+    return reports
+
+
+@dataclass
+class FrequencyMatch:
+    """A plan whose slot grid puts a channel on an observed frequency."""
+    plan: ChannelPlan
+    slot: int
+    names: List[str]        # candidate names that hash to this slot
+
+    def to_dict(self) -> Dict:
+        return {**self.plan.to_dict(), 'slot': self.slot,
+                'frequency_mhz': self.plan.frequencies[self.slot], 'names': self.names}
+
+
+def lookup_frequency(freq_mhz: float, candidates: Optional[Iterable[str]] = None,
+                     region: Optional[str] = None, preset: Optional[str] = None,
+                     tolerance_khz: Optional[float] = None) -> List[FrequencyMatch]:
+    """Which (region, preset, slot) an observed frequency is, and which names map there.
+
+    A hash can't be inverted, so names come from candidates (default: the
+    presets' default channel names).
+
+    Args:
+        freq_mhz: Observed center frequency
+        candidates: Channel names to test
+        region, preset: Narrow the search
+        tolerance_khz: Allowed offset from a slot center (default: half a channel)
+
+    Returns:
+        Matches; those with candidate names first
+    """
+    names = list(dict.fromkeys(candidates if candidates is not None
+                               else DEFAULT_CHANNEL_NAMES.values()))
+    hashes = [(name, djb2_hash(name)) for name in names]
+    matches = []
+    for channel_plan in all_plans(region, preset):
+        slot = channel_plan.slot_at(freq_mhz, tolerance_khz)
+        if slot is None:
+            continue
+        count = channel_plan.num_channels
+        matches.append(FrequencyMatch(channel_plan, slot,
+                                      [name for name, h in hashes if h % count == slot]))
+    matches.sort(key=lambda m: not m.names)
+    return matches
@@ -27,6 +27,11 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+try:
+    from utils.metrics import get_metrics
+except ImportError:
+    from .metrics import get_metrics
+
 
 class Category(Enum):
     """Base category enum - subclass for specific domains"""
@@ -293,6 +298,8 @@ class Classifier:
         3. Check with bouncer
         4. Record receipt
         """
+        start = time.perf_counter()
+
         # Step 1: Classify
         category, confidence, reason, metadata = self._classify(data)
 
@@ -314,6 +321,15 @@ class Classifier:
         # Step 4: Record receipt
         self._record_receipt(result)
 
+        metrics = get_metrics()
+        if metrics:
+            name = type(self).__name__
+            metrics.histogram('meshforge_classifier_seconds', 'Classification time',
+                              classifier=name).observe(time.perf_counter() - start)
+            metrics.counter('meshforge_classifier_decisions', 'Classification decisions',
+                            classifier=name, category=result.category,
+                            bounced=str(result.bounced).lower()).inc()
+
         return result
 
     def _classify(self, data: Any) -> Tuple[str, float, str, Dict]:
@@ -26,6 +26,10 @@ Usage:
         conn = get_connection(blocking=False)
     except ConnectionBusy:
         nodes = get_cached_nodes()  # Use cached data instead
+
+When the multiplexing proxy (utils/meshtastic_proxy.py) is running,
+connections go to it instead of meshtasticd (no cooldown), and
+get_nodes()/get_device_info() read its live node DB directly.
 """
 import json
 import logging
@@ -37,6 +41,18 @@ from typing import Optional, Dict, Any, List, Union
 
 logger = logging.getLogger(__name__)
 
+try:
+    from utils.metrics import get_metrics
+except ImportError:
+    from .metrics import get_metrics
+
+# Shared meshtasticd session (optional; used when the proxy is running)
+try:
+    from utils.meshtastic_proxy import api_request, get_proxy_endpoint, get_proxy_nodes
+    PROXY_AVAILABLE = True
+except ImportError:
+    PROXY_AVAILABLE = False
+
 # Cooldown between connections (meshtasticd needs time to cleanup)
 CONNECTION_COOLDOWN = 1.0  # seconds
 
@@ -156,9 +172,19 @@ class _ConnectionManager:
         """
         caller_id = caller or threading.current_thread().name
 
+        wait_start = time.perf_counter()
         acquired = self._conn_lock.acquire(blocking=blocking, timeout=timeout if blocking else -1)
 
+        metrics = get_metrics()
+        if metrics:
+            metrics.histogram('meshforge_connection_lock_wait_seconds',
+                              'Time spent waiting for the meshtasticd connection lock'
+                              ).observe(time.perf_counter() - wait_start)
+
         if not acquired:
+            if metrics:
+                metrics.counter('meshforge_connection_busy',
+                                'Connection requests refused because the lock was held').inc()
             raise ConnectionBusy(f"Connection busy, held by {self._lock_holder}")
 
         self._lock_holder = caller_id
@@ -166,11 +192,20 @@ class _ConnectionManager:
         logger.debug(f"Connection lock acquired by {caller_id}")
 
         if connect:
+            connect_start = time.perf_counter()
             try:
-                return self._establish_connection()
+                conn = self._establish_connection()
             except Exception as e:
+                if metrics:
+                    metrics.counter('meshforge_connection_failures',
+                                    'Failed meshtasticd connection attempts').inc()
                 self.release_connection()
                 raise ConnectionError(f"Failed to connect: {e}") from e
+            if metrics:
+                metrics.histogram('meshforge_connection_connect_seconds',
+                                  'Time to establish a meshtasticd connection (incl. cooldown)'
+                                  ).observe(time.perf_counter() - connect_start)
+            return conn
 
         return "locked"
 
@@ -182,16 +217,21 @@ class _ConnectionManager:
             max_retries: Number of connection attempts
             retry_delay: Initial delay between retries (uses exponential backoff)
         """
-        # Wait for cooldown before connecting
-        self._wait_for_cooldown()
+        host, port = self._host, self._port
+        endpoint = self._proxy_endpoint()
+        if endpoint:
+            # The proxy keeps meshtasticd's slot; its clients need no cooldown
+            host, port = endpoint
+        else:
+            self._wait_for_cooldown()
 
         last_error = None
         for attempt in range(max_retries):
             try:
                 import meshtastic.tcp_interface
                 self._connection = meshtastic.tcp_interface.TCPInterface(
-                    hostname=self._host,
-                    portNumber=self._port
+                    hostname=host,
+                    portNumber=port
                 )
                 return self._connection
             except ImportError:
@@ -245,6 +285,12 @@ class _ConnectionManager:
             logger.debug(f"Waiting {wait_time:.2f}s for meshtasticd cooldown")
             time.sleep(wait_time)
 
+    def _proxy_endpoint(self):
+        """(host, port) of a running proxy for our meshtasticd, else None."""
+        if not PROXY_AVAILABLE:
+            return None
+        return get_proxy_endpoint(self._host, self._port)
+
     def is_available(self, timeout: float = 2.0) -> bool:
         """Check if meshtasticd port is reachable."""
         try:
@@ -298,6 +344,16 @@ class _ConnectionManager:
         Returns:
             List of node dicts
         """
+        if self._proxy_endpoint():
+            proxied = get_proxy_nodes()
+            if proxied is not None:
+                nodes = [{'id': node_id,
+                          'name': (node.get('user') or {}).get('longName', ''),
+                          'short': (node.get('user') or {}).get('shortName', '')}
+                         for node_id, node in proxied.items()]
+                self.save_to_cache(nodes=nodes)
+                return nodes
+
         try:
             conn = self.get_connection(blocking=False, connect=True, caller="get_nodes")
             try:
@@ -335,6 +391,22 @@ class _ConnectionManager:
         Returns:
             Device info dict
         """
+        if self._proxy_endpoint():
+            try:
+                reply = api_request('info')
+            except (OSError, ValueError):
+                reply = {}
+            my_node = reply.get('my_node') if reply.get('ok') else None
+            if my_node:
+                user = my_node.get('user') or {}
+                info = {'node_num': my_node.get('num'),
+                        'long_name': user.get('longName', ''),
+                        'short_name': user.get('shortName', ''),
+                        'node_id': user.get('id', ''),
+                        'hardware': user.get('hwModel', '')}
+                self.save_to_cache(info=info)
+                return info
+
         try:
             conn = self.get_connection(blocking=False, connect=True, caller="get_device_info")
             try:
@@ -18,6 +18,11 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
+try:
+    from utils.sysinfo import usb_devices, usb_sysfs_available
+except ImportError:
+    from .sysinfo import usb_devices, usb_sysfs_available
+
 
 class DeviceType(Enum):
     """Device classification"""
@@ -207,7 +212,10 @@ class DeviceScanner:
         }
 
     def _scan_usb_devices(self) -> List[USBDevice]:
-        """Scan USB bus for devices"""
+        """Scan USB bus for devices (sysfs; lsusb where sysfs is missing)"""
+        if usb_sysfs_available():
+            return [self._usb_device_from_sysfs(d) for d in usb_devices()]
+
         devices = []
 
         try:
@@ -260,6 +268,23 @@ class DeviceScanner:
 
         return devices
 
+    def _usb_device_from_sysfs(self, usb) -> USBDevice:
+        """USBDevice from a sysinfo.UsbDevice, annotated from KNOWN_DEVICES"""
+        known = self.KNOWN_DEVICES.get(usb.usb_id, {})
+        return USBDevice(
+            bus=usb.bus,
+            device=usb.device,
+            vendor_id=usb.vendor_id,
+            product_id=usb.product_id,
+            description=usb.description or known.get('name', 'Unknown'),
+            manufacturer=usb.manufacturer,
+            serial=usb.serial,
+            driver=usb.driver,
+            device_type=known.get('type', DeviceType.UNKNOWN),
+            meshtastic_compatible=known.get('meshtastic', False),
+            notes=known.get('notes', ''),
+        )
+
     def _enrich_usb_device(self, dev: USBDevice):
         """Add details from sysfs"""
         try:
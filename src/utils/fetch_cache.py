@@ -0,0 +1,427 @@
+"""
+Fetch Cache - TTL cache for slow upstream data (HamClock, NOAA SWPC)
+
+Space weather and propagation data change every few minutes to hours
+upstream, but each panel used to fetch it afresh, one blocking urllib
+call after another. FetchCache sits between callers and the network:
+
+- Per-key TTL, matched to how often the upstream data changes
+- Stale-while-revalidate: an expired value is returned at once (flagged
+  stale) while a single background refresh runs
+- Single flight: concurrent misses for a key share one request
+- Failures are remembered for error_ttl, so an unreachable host costs
+  one timeout, not one per caller; the last good value (persisted to
+  disk) is served instead, so panels still show data offline
+- gather() runs several fetches concurrently
+- One background refresher per process keeps recently used keys warm
+  for every consumer (GTK, TUI, web)
+
+Usage:
+    cache = get_fetch_cache()
+    cached = cache.get("noaa:kp", lambda: fetch_json(url), ttl=900)
+    cached.value, cached.stale, cached.age
+
+    results = cache.gather({'kp': get_kp, 'xray': get_xray})
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from utils.paths import get_real_user_home
+except ImportError:
+    def get_real_user_home() -> Path:
+        sudo_user = os.environ.get('SUDO_USER')
+        if sudo_user and sudo_user != 'root':
+            return Path(f'/home/{sudo_user}')
+        return Path.home()
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# An expired value is served while revalidating until it is this many
+# TTLs old; older values are refreshed before returning
+STALE_FACTOR = 4
+# Remember a failed fetch this long before trying the upstream again
+ERROR_TTL = 30.0
+# Background refresher: wake interval, refresh keys this close to expiry,
+# and stop refreshing keys nobody has read for KEEP_WARM seconds
+REFRESH_INTERVAL = 15.0
+REFRESH_AHEAD = 0.9
+KEEP_WARM = 900.0
+# Coalesce last-good writes to disk
+SAVE_DELAY = 5.0
+
+Loader = Callable[[], Any]
+
+
+@dataclass
+class CachedValue:
+    """A value from the cache and how fresh it is"""
+    value: Any
+    fetched_at: float            # time.time() of the successful fetch
+    stale: bool = False          # past its TTL, or the refresh failed
+    error: Optional[str] = None  # why the last refresh failed
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'ttl', 'loader', 'persist',
+                 'error', 'error_at', 'last_used')
+
+    def __init__(self):
+        self.value = None
+        self.fetched_at = 0.0       # 0: no value yet
+        self.ttl = 0.0
+        self.loader: Optional[Loader] = None
+        self.persist = True
+        self.error: Optional[BaseException] = None
+        self.error_at = 0.0
+        self.last_used = 0.0
+
+
+class FetchCache:
+    """
+    Thread-safe TTL cache with stale-while-revalidate.
+
+    Loaders are plain callables that return a value or raise; they run
+    in the calling thread on a miss and in a small worker pool when
+    revalidating.
+    """
+
+    def __init__(self, path: Optional[Path] = None, persist: bool = True,
+                 max_workers: int = 4, error_ttl: float = ERROR_TTL,
+                 background: bool = True):
+        """
+        Args:
+            path: Last-good JSON file (default ~/.cache/meshforge/fetch_cache.json)
+            persist: Load and save last-good values
+            max_workers: Threads for gather() and for revalidation
+            error_ttl: Seconds a failed fetch is remembered
+            background: Run the shared refresher thread
+        """
+        self.path = Path(path) if path else self.default_path()
+        self.persist = persist
+        self.error_ttl = error_ttl
+        self.background = background
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="fetch-cache")
+        self._gather_pool = ThreadPoolExecutor(max_workers=max_workers,
+                                               thread_name_prefix="fetch-gather")
+        self._local = threading.local()
+        self._loaded = not persist
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'fetches': 0,
+                      'errors': 0, 'revalidations': 0, 'offline_hits': 0}
+
+    @staticmethod
+    def default_path() -> Path:
+        return get_real_user_home() / '.cache' / 'meshforge' / 'fetch_cache.json'
+
+    # === Reads ===
+
+    def get(self, key: str, loader: Loader, ttl: float,
+            persist: bool = True, allow_stale: bool = True) -> CachedValue:
+        """
+        Cached value for key, fetching with loader when needed.
+
+        Args:
+            key: Cache key (e.g. the URL)
+            loader: Fetches a fresh value; raises on failure
+            ttl: Seconds a value is fresh
+            persist: Keep the last good value on disk
+            allow_stale: Serve expired values (while revalidating, or when
+                the fetch fails); False for liveness probes
+
+        Raises:
+            Whatever loader raised, when there is no value to fall back on
+        """
+        self._ensure_loaded()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.ttl = ttl
+            entry.loader = loader
+            entry.persist = persist
+            entry.last_used = now
+            has_value = entry.fetched_at > 0 and (allow_stale or now - entry.fetched_at < ttl)
+            age = now - entry.fetched_at
+            if has_value and age < ttl:
+                self.stats['hits'] += 1
+                return CachedValue(entry.value, entry.fetched_at)
+            if has_value and age < ttl * STALE_FACTOR:
+                self.stats['stale_hits'] += 1
+                revalidate = key not in self._inflight and not self._recent_error(entry, now)
+                stale = CachedValue(entry.value, entry.fetched_at, stale=True,
+                                    error=str(entry.error) if entry.error else None)
+            else:
+                stale = None
+                if self._recent_error(entry, now):
+                    if has_value:
+                        self.stats['offline_hits'] += 1
+                        return CachedValue(entry.value, entry.fetched_at, stale=True,
+                                           error=str(entry.error))
+                    raise entry.error
+                self.stats['misses'] += 1
+        if stale is not None:
+            if revalidate:
+                self._revalidate(key)
+            self._start_refresher()
+            return stale
+
+        self._start_refresher()
+        try:
+            value, fetched_at = self._fetch(key, loader)
+        except Exception as e:
+            with self._lock:
+                if allow_stale and entry.fetched_at > 0:
+                    self.stats['offline_hits'] += 1
+                    return CachedValue(entry.value, entry.fetched_at, stale=True, error=str(e))
+            raise
+        return CachedValue(value, fetched_at)
+
+    def peek(self, key: str) -> Optional[CachedValue]:
+        """Cached value without fetching (None if never fetched)"""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fetched_at <= 0:
+                return None
+            return CachedValue(entry.value, entry.fetched_at,
+                               stale=time.time() - entry.fetched_at >= entry.ttl,
+                               error=str(entry.error) if entry.error else None)
+
+    def _recent_error(self, entry: _Entry, now: float) -> bool:
+        return entry.error is not None and now - entry.error_at < self.error_ttl
+
+    # === Fetching ===
+
+    def _fetch(self, key: str, loader: Loader):
+        """Run loader once for all concurrent callers; returns (value, fetched_at)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if owner:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _load(self, key: str, loader: Loader, future: Future):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.error = e
+                    entry.error_at = time.time()
+                self.stats['errors'] += 1
+                self._inflight.pop(key, None)
+            logger.debug(f"Fetch failed for {key}: {e}")
+            future.set_exception(e)
+            return
+        fetched_at = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            entry.value = value
+            entry.fetched_at = fetched_at
+            entry.error = None
+            self.stats['fetches'] += 1
+            self._inflight.pop(key, None)
+            if entry.persist and self.persist:
+                self._dirty = True
+        if self.persist:
+            self._schedule_save()
+        future.set_result((value, fetched_at))
+
+    def _revalidate(self, key: str):
+        """Refresh key in the background (no-op if already in flight)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.loader is None or key in self._inflight:
+                return
+            future = self._inflight[key] = Future()
+            loader = entry.loader
+            self.stats['revalidations'] += 1
+        try:
+            self._pool.submit(self._load, key, loader, future)
+        except RuntimeError:
+            # Pool shut down (process exit)
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Forget one key (or all); the persisted copy is rewritten on save"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._dirty = True
+
+    # === Concurrency ===
+
+    def gather(self, calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Run callables concurrently; returns {name: result}.
+
+        A callable that raises yields its exception object as the result.
+        Nested gather() calls (from inside a gathered callable) run inline
+        so the pool cannot deadlock on itself.
+        """
+        if getattr(self._local, 'in_gather', False) or len(calls) <= 1:
+            return {name: self._call(fn) for name, fn in calls.items()}
+        futures = {name: self._gather_pool.submit(self._gathered, fn)
+                   for name, fn in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def _gathered(self, fn):
+        self._local.in_gather = True
+        try:
+            return self._call(fn)
+        finally:
+            self._local.in_gather = False
+
+    @staticmethod
+    def _call(fn):
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    # === Background refresh ===
+
+    def _start_refresher(self):
+        if not self.background or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop,
+                                               name="fetch-cache-refresh", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(REFRESH_INTERVAL):
+            self.refresh_due()
+
+    def refresh_due(self) -> int:
+        """Revalidate recently used keys that are close to expiry; returns count"""
+        now = time.time()
+        with self._lock:
+            due = [key for key, entry in self._entries.items()
+                   if entry.loader is not None
+                   and now - entry.last_used < KEEP_WARM
+                   and (entry.fetched_at <= 0 or now - entry.fetched_at >= entry.ttl * REFRESH_AHEAD)
+                   and not self._recent_error(entry, now)
+                   and key not in self._inflight]
+        for key in due:
+            self._revalidate(key)
+        return len(due)
+
+    # === Persistence ===
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable fetch cache {self.path}: {e}")
+                return
+            if data.get('version') != CACHE_VERSION:
+                return
+            for key, item in data.get('entries', {}).items():
+                if key in self._entries:
+                    continue
+                entry = self._entries[key] = _Entry()
+                entry.value = item.get('value')
+                entry.fetched_at = float(item.get('fetched_at', 0))
+                entry.ttl = float(item.get('ttl', 0))
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write last-good values to disk now (if anything changed)"""
+        with self._lock:
+            self._save_timer = None
+            if not self._dirty or not self.persist:
+                return
+            self._dirty = False
+            entries = {}
+            for key, entry in self._entries.items():
+                if entry.persist and entry.fetched_at > 0:
+                    entries[key] = {'value': entry.value, 'fetched_at': entry.fetched_at,
+                                    'ttl': entry.ttl}
+        try:
+            payload = json.dumps({'version': CACHE_VERSION, 'entries': entries})
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Fetch cache not saved (unserializable value): {e}")
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug(f"Could not save fetch cache {self.path}: {e}")
+
+    def close(self):
+        """Stop the refresher and write pending values"""
+        self._stop.set()
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer:
+            timer.cancel()
+        self.flush()
+        self._pool.shutdown(wait=False)
+        self._gather_pool.shutdown(wait=False)
+
+
+_cache: Optional[FetchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fetch_cache() -> FetchCache:
+    """The process-wide cache (and its one refresher thread)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FetchCache()
+            atexit.register(_cache.close)
+        return _cache
@@ -762,44 +762,19 @@ def find_rns_processes() -> List[int]:
     """
     Find running RNS-related processes.
 
+    Scans /proc directly (no pgrep fork); this runs during gateway and
+    node tracker startup.
+
     Returns:
         List of PIDs for rnsd or other RNS processes
     """
-    pids = []
-
-    # Check for rnsd
-    try:
-        result = subprocess.run(
-            ['pgrep', '-f', 'rnsd'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for pid_str in result.stdout.strip().split('\n'):
-                try:
-                    pids.append(int(pid_str))
-                except ValueError:
-                    pass
-    except (subprocess.SubprocessError, FileNotFoundError):
-        pass
-
-    # Also check for python processes running RNS
     try:
-        result = subprocess.run(
-            ['pgrep', '-f', 'RNS.Reticulum'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for pid_str in result.stdout.strip().split('\n'):
-                try:
-                    pid = int(pid_str)
-                    if pid not in pids:
-                        pids.append(pid)
-                except ValueError:
-                    pass
-    except (subprocess.SubprocessError, FileNotFoundError):
-        pass
+        from utils.sysinfo import find_processes
+    except ImportError:
+        from .sysinfo import find_processes
 
-    return pids
+    # rnsd itself, and python processes running RNS
+    return [proc.pid for proc in find_processes(r'rnsd|RNS\.Reticulum', fresh=True)]
 
 
 def kill_rns_processes(force: bool = False) -> Dict[str, any]:
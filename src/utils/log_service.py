@@ -0,0 +1,571 @@
+"""
+Shared service-log follower for MeshForge
+
+The web log endpoints, the TUI and GTK log views and the diagnostics
+engine all read meshtasticd/rnsd logs. Each used to ask journalctl on its
+own: a `journalctl -n N` per poll, a `journalctl -f` process per
+streaming web client, and a `journalctl --since '1 hour ago' -p err` per
+service on every diagnostics cycle.
+
+LogService follows the journal once for the whole process:
+
+- with the systemd.journal reader when python-systemd is installed
+  (inotify-driven, no child process), otherwise with one
+  `journalctl -f -o json` process for all watched units;
+- it backfills the last ERROR_WINDOW seconds on start, then follows;
+- the journald cursor of the last entry is kept, so a follower that
+  dies is restarted after it without gaps or duplicates;
+- entries go into one bounded ring buffer, numbered with an increasing
+  sequence number that readers use as their own cursor;
+- error entries (priority err and worse) are also kept per unit for
+  ERROR_WINDOW seconds, so "errors in the last hour" is a length lookup.
+
+Any number of readers follow incrementally from their cursor:
+
+    from utils.log_service import get_log_service
+
+    logs = get_log_service()
+    entries, cursor = logs.read(unit='meshtasticd')     # backlog
+    while streaming:
+        entries, cursor = logs.wait(cursor, timeout=30, unit='meshtasticd')
+        for entry in entries:
+            send(entry.line)
+
+    logs.error_count('meshtasticd')                     # last hour
+
+Relative windows longer than the buffer holds (see covers()) still go
+to journalctl.
+"""
+
+import atexit
+import json
+import logging
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from systemd import journal as _journal
+    HAS_SYSTEMD_JOURNAL = True
+except ImportError:
+    _journal = None
+    HAS_SYSTEMD_JOURNAL = False
+
+logger = logging.getLogger(__name__)
+
+# Units followed by default
+DEFAULT_UNITS = ('meshtasticd', 'rnsd')
+
+# Entries kept in the ring buffer (all units together)
+LOG_CAPACITY = 2000
+
+# Error-rate window (seconds), also how far back the start-up backfill goes
+ERROR_WINDOW = 3600.0
+
+# Error entries kept per unit within the window
+ERROR_HISTORY = 500
+
+# Syslog priority at or below which an entry counts as an error (3 = err)
+ERROR_PRIORITY = 3
+
+# Wait before restarting a follower that exited (seconds, doubles to the max)
+RESTART_DELAY = 2.0
+RESTART_DELAY_MAX = 60.0
+
+_RELATIVE_SINCE = re.compile(
+    r'^(\d+)\s*(s|sec|second|m|min|minute|h|hour|d|day|w|week)s?(\s+ago)?$')
+_SINCE_UNITS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60,
+                'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400,
+                'w': 604800, 'week': 604800}
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """One journal entry."""
+    seq: int                  # position in this process's stream (reader cursor)
+    unit: str                 # 'meshtasticd', not 'meshtasticd.service'
+    message: str
+    priority: int = 6         # syslog priority; 6 = info
+    timestamp: float = 0.0    # epoch seconds
+    identifier: str = ''      # SYSLOG_IDENTIFIER, falls back to the unit
+    pid: Optional[int] = None
+    hostname: str = ''
+    cursor: str = ''          # journald cursor
+
+    @property
+    def is_error(self) -> bool:
+        return self.priority <= ERROR_PRIORITY
+
+    @property
+    def line(self) -> str:
+        """The entry as journalctl's short format prints it"""
+        stamp = datetime.fromtimestamp(self.timestamp).strftime('%b %d %H:%M:%S')
+        ident = self.identifier or self.unit
+        if self.pid is not None:
+            ident = f"{ident}[{self.pid}]"
+        host = f" {self.hostname}" if self.hostname else ''
+        return f"{stamp}{host} {ident}: {self.message}"
+
+
+def format_entries(entries: Iterable[LogEntry]) -> str:
+    """Entries as journalctl-style text, one per line"""
+    return ''.join(entry.line + '\n' for entry in entries)
+
+
+def parse_since(since: str) -> Optional[float]:
+    """
+    Seconds covered by a relative time like '5m', '1h' or '2 hours ago'.
+    None for anything else (absolute dates, 'today'), which only
+    journalctl itself can answer.
+    """
+    match = _RELATIVE_SINCE.match((since or '').strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * _SINCE_UNITS[match.group(2)]
+
+
+def _unit_name(unit: str) -> str:
+    return unit[:-len('.service')] if unit.endswith('.service') else unit
+
+
+def _text(value: Any) -> str:
+    """journalctl -o json prints non-UTF-8 fields as byte arrays"""
+    if isinstance(value, list):
+        return bytes(value).decode('utf-8', 'replace')
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return '' if value is None else str(value)
+
+
+def _int(value: Any, default: Optional[int] = None) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A journal record (journalctl JSON or systemd.journal.Reader entry)
+    as LogEntry fields. Unit messages logged by systemd itself (Started,
+    Stopped, ...) carry the unit in UNIT, their own being init.scope.
+    """
+    unit = (record.get('UNIT') or record.get('OBJECT_SYSTEMD_UNIT')
+            or record.get('_SYSTEMD_UNIT') or '')
+    realtime = record.get('__REALTIME_TIMESTAMP')
+    if isinstance(realtime, datetime):
+        timestamp = realtime.timestamp()
+    else:
+        usec = _int(realtime)
+        timestamp = usec / 1_000_000 if usec is not None else time.time()
+    return {
+        'unit': _unit_name(_text(unit)),
+        'message': _text(record.get('MESSAGE')),
+        'priority': _int(record.get('PRIORITY'), 6),
+        'timestamp': timestamp,
+        'identifier': _text(record.get('SYSLOG_IDENTIFIER')),
+        'pid': _int(record.get('_PID')),
+        'hostname': _text(record.get('_HOSTNAME')),
+        'cursor': _text(record.get('__CURSOR')),
+    }
+
+
+# ============================================================================
+# Followers: where records come from
+# ============================================================================
+
+class JournalctlFollower:
+    """One `journalctl -o json` process for every watched unit."""
+
+    def __init__(self, units: Iterable[str]):
+        self._unit_args = [f'--unit={unit}.service' for unit in units]
+        self._process: Optional[subprocess.Popen] = None
+        self._closed = False
+
+    def backfill(self, since: float) -> Iterator[Dict[str, Any]]:
+        """Entries from the last since seconds"""
+        result = subprocess.run(
+            ['journalctl', '-o', 'json', '--no-pager', '--since', f'-{int(since)}s']
+            + self._unit_args,
+            capture_output=True, text=True, timeout=60)
+        for line in result.stdout.splitlines():
+            record = self._parse(line)
+            if record is not None:
+                yield record
+
+    def follow(self, after_cursor: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """New entries until close() (or journalctl exits)"""
+        cmd = ['journalctl', '-o', 'json', '--no-pager', '--follow'] + self._unit_args
+        cmd += ['--after-cursor', after_cursor] if after_cursor else ['--lines', '0']
+        if self._closed:
+            return
+        self._process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, text=True)
+        if self._closed:            # close() ran while we were starting
+            self._terminate()
+        try:
+            for line in self._process.stdout:
+                if self._closed:
+                    break
+                record = self._parse(line)
+                if record is not None:
+                    yield record
+        finally:
+            self._terminate()
+
+    def close(self):
+        self._closed = True
+        self._terminate()
+
+    def _terminate(self):
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    @staticmethod
+    def _parse(line: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+
+class JournalReaderFollower:
+    """The python-systemd journal reader (no child process)."""
+
+    # How often a blocked wait() checks for close()
+    POLL_SECONDS = 1.0
+
+    def __init__(self, units: Iterable[str]):
+        self._reader = _journal.Reader()
+        # What journalctl -u matches: the unit's own entries, or systemd's
+        # about it. Matches on the same field are ORed.
+        for unit in units:
+            self._reader.add_match(_SYSTEMD_UNIT=f'{unit}.service')
+        self._reader.add_disjunction()
+        for unit in units:
+            self._reader.add_match(UNIT=f'{unit}.service')
+        self._closed = False
+
+    def backfill(self, since: float) -> Iterator[Dict[str, Any]]:
+        self._reader.seek_realtime(datetime.fromtimestamp(time.time() - since))
+        for entry in self._reader:
+            yield entry
+
+    def follow(self, after_cursor: Optional[str]) -> Iterator[Dict[str, Any]]:
+        if after_cursor:
+            self._reader.seek_cursor(after_cursor)
+            self._reader.get_next()      # the cursor's own entry was already seen
+        else:
+            self._reader.seek_tail()
+            self._reader.get_previous()
+        while not self._closed:
+            if self._reader.wait(self.POLL_SECONDS) == _journal.NOP:
+                continue
+            for entry in self._reader:
+                yield entry
+
+    def close(self):
+        self._closed = True
+
+
+def _default_follower(units: Iterable[str]):
+    if HAS_SYSTEMD_JOURNAL:
+        try:
+            return JournalReaderFollower(units)
+        except Exception as e:
+            logger.debug(f"journal reader unavailable, using journalctl: {e}")
+    return JournalctlFollower(units)
+
+
+# ============================================================================
+# The service
+# ============================================================================
+
+class LogService:
+    """
+    Follows the journal for a set of units and serves the entries to
+    any number of readers.
+
+    Args:
+        units: Units to follow (without .service)
+        capacity: Ring buffer size
+        error_window: Error-rate window and backfill depth (seconds)
+        follower_factory: Builds the record source for a list of units
+            (JournalReaderFollower / JournalctlFollower; injectable for tests)
+        autostart: Start following on the first read
+    """
+
+    def __init__(self, units: Iterable[str] = DEFAULT_UNITS, capacity: int = LOG_CAPACITY,
+                 error_window: float = ERROR_WINDOW, follower_factory=None,
+                 autostart: bool = True):
+        self.units = tuple(units)
+        self.capacity = capacity
+        self.error_window = error_window
+        self._follower_factory = follower_factory or _default_follower
+        self._autostart = autostart
+
+        self._entries: deque = deque(maxlen=capacity)
+        self._errors: Dict[str, deque] = {unit: deque(maxlen=ERROR_HISTORY)
+                                          for unit in self.units}
+        self._error_totals: Dict[str, int] = {unit: 0 for unit in self.units}
+        self._seq = 0
+        self._journal_cursor: Optional[str] = None
+        self._changed = threading.Condition()
+
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._follower = None
+        self._lock = threading.Lock()
+
+    # --- lifecycle ---
+
+    def start(self):
+        """Start the follower thread (no-op if running)"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='log-service', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop following; buffered entries stay readable"""
+        self._stop.set()
+        follower = self._follower
+        if follower is not None:
+            follower.close()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        with self._changed:
+            self._changed.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the start-up backfill; True once it is in the buffer"""
+        self._ensure_started()
+        return self._ready.wait(timeout)
+
+    def watches(self, unit: str) -> bool:
+        return _unit_name(unit) in self._errors
+
+    # --- reading ---
+
+    @property
+    def cursor(self) -> int:
+        """Sequence number of the newest entry (0 before any)"""
+        return self._seq
+
+    def read(self, cursor: int = 0, unit: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[LogEntry], int]:
+        """
+        Entries newer than cursor, oldest first, and the cursor to pass
+        next time. cursor=0 reads the whole buffer; a cursor that fell
+        out of the buffer reads from the oldest entry still kept. With
+        limit, the newest limit matching entries are returned.
+        """
+        self._ensure_started()
+        unit = _unit_name(unit) if unit else None
+        with self._changed:
+            entries = self._after(cursor)
+            next_cursor = self._seq
+        if unit:
+            entries = [e for e in entries if e.unit == unit]
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return entries, next_cursor
+
+    def wait(self, cursor: int, timeout: Optional[float] = None, unit: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[LogEntry], int]:
+        """read(), blocking up to timeout until something newer than cursor arrives"""
+        self._ensure_started()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._changed:
+                while self._seq <= cursor and not self._stop.is_set():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+            entries, next_cursor = self.read(cursor, unit, limit)
+            # Only other units' entries arrived: keep waiting for this one
+            if entries or self._stop.is_set() or (
+                    deadline is not None and time.monotonic() >= deadline):
+                return entries, next_cursor
+            cursor = next_cursor
+
+    def tail(self, unit: Optional[str] = None, lines: int = 50) -> List[LogEntry]:
+        """The newest lines entries (of unit)"""
+        return self.read(0, unit, lines)[0]
+
+    def covers(self, window: float) -> bool:
+        """
+        True if the buffer holds every entry of the last window seconds.
+
+        Longer windows (beyond the error_window backfill, or past entries
+        the ring buffer has already dropped) need journalctl.
+        """
+        if window > self.error_window:
+            return False
+        with self._changed:
+            if len(self._entries) < self.capacity:
+                return True
+            return self._entries[0].timestamp <= time.time() - window
+
+    def error_count(self, unit: str, window: Optional[float] = None) -> Optional[int]:
+        """
+        Error entries from unit in the last window seconds (default: error_window).
+
+        None when the history cannot answer: the window is longer than
+        error_window, or more than ERROR_HISTORY errors arrived within it.
+        """
+        self._ensure_started()
+        errors = self._errors.get(_unit_name(unit))
+        if errors is None:
+            return 0
+        window = self.error_window if window is None else window
+        if window > self.error_window:
+            return None
+        cutoff = time.time() - window
+        with self._changed:
+            self._expire(errors)
+            if len(errors) == errors.maxlen and errors[0].timestamp >= cutoff:
+                return None     # older errors in the window were dropped
+            count = 0
+            for entry in reversed(errors):
+                if entry.timestamp < cutoff:
+                    break
+                count += 1
+            return count
+
+    def recent_errors(self, unit: str, count: int = 5) -> List[LogEntry]:
+        """The newest error entries from unit within the window, newest last"""
+        self._ensure_started()
+        errors = self._errors.get(_unit_name(unit))
+        if errors is None or count <= 0:
+            return []
+        with self._changed:
+            self._expire(errors)
+            return list(errors)[-count:]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._changed:
+            return {
+                'units': list(self.units),
+                'buffered': len(self._entries),
+                'capacity': self.capacity,
+                'cursor': self._seq,
+                'errors': {unit: len(errors) for unit, errors in self._errors.items()},
+                'error_totals': dict(self._error_totals),
+                'ready': self._ready.is_set(),
+                'running': self.running,
+            }
+
+    # --- ingestion ---
+
+    def ingest(self, record: Dict[str, Any]) -> LogEntry:
+        """Add one journal record (normally called by the follower thread)"""
+        fields = normalize_record(record)
+        with self._changed:
+            self._seq += 1
+            entry = LogEntry(seq=self._seq, **fields)
+            self._entries.append(entry)
+            if entry.cursor:
+                self._journal_cursor = entry.cursor
+            errors = self._errors.get(entry.unit)
+            if errors is not None and entry.is_error:
+                errors.append(entry)
+                self._error_totals[entry.unit] += 1
+            self._changed.notify_all()
+        return entry
+
+    def _after(self, cursor: int) -> List[LogEntry]:
+        # Sequence numbers are contiguous: the newest (seq - cursor) entries
+        # are the new ones, taken from the right without copying the buffer
+        count = min(self._seq - max(cursor, 0), len(self._entries))
+        if count <= 0:
+            return []
+        if count == len(self._entries):
+            return list(self._entries)
+        new = list(islice(reversed(self._entries), count))
+        new.reverse()
+        return new
+
+    def _expire(self, errors: deque):
+        cutoff = time.time() - self.error_window
+        while errors and errors[0].timestamp < cutoff:
+            errors.popleft()
+
+    def _ensure_started(self):
+        if self._autostart and self._thread is None:
+            self.start()
+
+    def _run(self):
+        delay = RESTART_DELAY
+        backfilled = False
+        while not self._stop.is_set():
+            self._follower = follower = self._follower_factory(self.units)
+            try:
+                if not backfilled:
+                    for record in follower.backfill(self.error_window):
+                        self.ingest(record)
+                    backfilled = True
+                    self._ready.set()
+                for record in follower.follow(self._journal_cursor):
+                    self.ingest(record)
+                    delay = RESTART_DELAY
+            except FileNotFoundError:
+                logger.debug("journalctl not available; log service idle")
+                self._ready.set()
+                return
+            except Exception as e:
+                logger.debug(f"log follower failed: {e}")
+            finally:
+                follower.close()
+                self._ready.set()   # readers get what there is rather than hang
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, RESTART_DELAY_MAX)
+
+
+_service: Optional[LogService] = None
+_service_lock = threading.Lock()
+
+
+def get_log_service() -> LogService:
+    """The process-wide log service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = LogService()
+            atexit.register(_service.stop)
+        return _service
+
+
+def peek_log_service(unit: Optional[str] = None) -> Optional[LogService]:
+    """
+    The shared service if it is already running with its backfill done
+    (and following unit), else None. For callers that can run journalctl
+    themselves and should not start a follower just to answer once.
+    """
+    service = _service
+    if service is None or not service.running or not service._ready.is_set():
+        return None
+    if unit is not None and not service.watches(unit):
+        return None
+    return service
@@ -12,13 +12,31 @@ Usage:
 Or for module-level configuration:
     from utils.logging_config import setup_logging
     setup_logging(level=logging.DEBUG, log_file="/var/log/meshforge.log")
+
+File output goes through a QueueHandler: the logging thread only puts
+the record on a queue and a QueueListener thread does the disk writes,
+so a slow SD card never stalls the bridge or UI threads. Files rotate
+by size and at midnight. json_file adds a JSON-lines copy for tools.
+
+Hot paths (packet receive, per-message bridge logging) can be rate
+limited per call site:
+
+    from utils.logging_config import rate_limit
+    rate_limit(logger, rate=2, burst=20)   # INFO and below: ~2/s after a burst of 20
 """
 
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
+import os
+import queue
 import sys
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 import threading
 
 # Thread-safe initialization
@@ -41,6 +59,14 @@ LEVEL_COLORS = {
 RESET = '\033[0m'
 
 
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'taskName'}
+
+# Background writer for file handlers (see setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 class ColoredFormatter(logging.Formatter):
     """Formatter that adds colors to log levels for terminal output."""
 
@@ -56,6 +82,189 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, msg, plus thread,
+    location, exception text and any extra={...} fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+            'where': f"{record.module}:{record.lineno}",
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that also rolls over at local midnight, so a
+    quiet day doesn't end up in the same file as a busy one and a busy
+    day is still capped at max_bytes per file. Backups are numbered
+    (.1 newest) like RotatingFileHandler's.
+    """
+
+    def __init__(self, filename, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 daily: bool = True, encoding: Optional[str] = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.daily = daily
+        self.rollover_at = self._next_midnight(time.time())
+
+    @staticmethod
+    def _next_midnight(now: float) -> float:
+        tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.daily and record.created >= self.rollover_at:
+            self.rollover_at = self._next_midnight(record.created)
+            # Nothing to keep from an empty day
+            try:
+                return os.path.getsize(self.baseFilename) > 0
+            except OSError:
+                return False
+        return bool(super().shouldRollover(record))
+
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    Appends to one file per day, named from a strftime pattern
+    (e.g. 'events_%Y%m%d.log'). The file stays open until the date
+    changes instead of being reopened for every record.
+    """
+
+    def __init__(self, directory: Union[str, Path], pattern: str,
+                 on_open: Optional[Callable[[Path], None]] = None):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.on_open = on_open
+        self._day = datetime.now().strftime(pattern)
+        super().__init__(str(self.directory / self._day), encoding='utf-8', delay=True)
+
+    def emit(self, record: logging.LogRecord):
+        day = datetime.fromtimestamp(record.created).strftime(self.pattern)
+        if day != self._day:
+            self.close()
+            self._day = day
+            self.baseFilename = os.path.abspath(str(self.directory / day))
+        if self.stream is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.stream = self._open()
+            if self.on_open:
+                try:
+                    self.on_open(Path(self.baseFilename))
+                except Exception:
+                    pass
+        logging.StreamHandler.emit(self, record)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (logger, file, line): after a burst,
+    records pass at about rate per second; the rest are dropped. With
+    sample=N every Nth dropped record still passes. The next record
+    that passes says how many were dropped. Records above max_level
+    (warnings and errors by default) always pass.
+
+    Attach to a logger (not a handler) so dropped records are discarded
+    in the calling thread before any formatting or queueing.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 10, sample: int = 0,
+                 max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample = sample
+        self.max_level = max_level
+        self._buckets: Dict[Tuple, List] = {}   # site -> [tokens, last, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        site = (record.name, record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            bucket = self._buckets.get(site)
+            if bucket is None:
+                bucket = self._buckets[site] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                if not (self.sample and bucket[2] % self.sample == 0):
+                    return False
+            else:
+                bucket[0] = tokens - 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.suppressed = dropped
+            record.msg = f"{record.msg} [+{dropped} similar suppressed]"
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Records currently held back, per 'logger:line'"""
+        with self._lock:
+            return {f"{name}:{line}": bucket[2]
+                    for (name, _, line), bucket in self._buckets.items() if bucket[2]}
+
+
+def rate_limit(logger: Union[str, logging.Logger], rate: float = 1.0, burst: int = 10,
+               sample: int = 0, max_level: int = logging.INFO) -> RateLimitFilter:
+    """
+    Rate limit a hot logger's INFO/DEBUG records (see RateLimitFilter).
+
+    Returns:
+        The filter (logger.removeFilter(f) undoes it)
+    """
+    if isinstance(logger, str):
+        logger = logging.getLogger(logger)
+    limiter = RateLimitFilter(rate, burst, sample, max_level)
+    logger.addFilter(limiter)
+    return limiter
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the exception text separate from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now: they may be mutated or not be thread-safe later
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def queued(handlers: Iterable[logging.Handler]) -> Tuple[logging.Handler,
+                                                         logging.handlers.QueueListener]:
+    """
+    A handler that queues records for handlers, and the started
+    listener thread that writes them (stop() it to flush).
+    """
+    records: queue.Queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return _QueueHandler(records), listener
+
+
 def setup_logging(
     level: int = logging.INFO,
     log_file: Optional[str] = None,
@@ -64,6 +273,9 @@ def setup_logging(
     max_bytes: int = 10 * 1024 * 1024,  # 10MB
     backup_count: int = 5,
     suppress_libs: bool = True,
+    console: bool = True,
+    json_file: Optional[str] = None,
+    use_queue: bool = True,
 ) -> None:
     """
     Configure the root logger with consistent settings.
@@ -73,11 +285,14 @@ def setup_logging(
         log_file: Optional file path for logging
         log_format: Log message format string
         use_colors: Enable colored output in terminal
-        max_bytes: Max log file size before rotation
+        max_bytes: Max log file size before rotation (files also rotate daily)
         backup_count: Number of backup files to keep
         suppress_libs: Suppress noisy third-party loggers
+        console: Log to stdout (off for full-screen UIs)
+        json_file: Optional JSON-lines log file
+        use_queue: Write files from a background thread
     """
-    global _initialized
+    global _initialized, _listener
 
     with _lock:
         if _initialized:
@@ -89,31 +304,42 @@ def setup_logging(
         # Remove existing handlers
         root_logger.handlers.clear()
 
-        # Console handler with colors
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level)
-
-        if use_colors:
-            console_formatter = ColoredFormatter(log_format)
-        else:
-            console_formatter = logging.Formatter(log_format)
-
-        console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
-
-        # File handler if specified
-        if log_file:
-            log_path = Path(log_file)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file,
-                maxBytes=max_bytes,
-                backupCount=backup_count,
+        # Console handler with colors (written directly: keeps order with print())
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(level)
+
+            if use_colors:
+                console_formatter = ColoredFormatter(log_format)
+            else:
+                console_formatter = logging.Formatter(log_format)
+
+            console_handler.setFormatter(console_formatter)
+            root_logger.addHandler(console_handler)
+
+        # File handlers, written by the queue listener thread
+        file_handlers = []
+        for path, formatter in ((log_file, logging.Formatter(log_format)),
+                                (json_file, JsonFormatter())):
+            if not path:
+                continue
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            file_handler = SizedTimedRotatingFileHandler(
+                path,
+                max_bytes=max_bytes,
+                backup_count=backup_count,
             )
             file_handler.setLevel(level)
-            file_handler.setFormatter(logging.Formatter(log_format))
-            root_logger.addHandler(file_handler)
+            file_handler.setFormatter(formatter)
+            file_handlers.append(file_handler)
+
+        if file_handlers and use_queue:
+            queue_handler, _listener = queued(file_handlers)
+            root_logger.addHandler(queue_handler)
+            atexit.register(shutdown_logging)
+        else:
+            for file_handler in file_handlers:
+                root_logger.addHandler(file_handler)
 
         # Suppress noisy third-party loggers
         if suppress_libs:
@@ -132,6 +358,63 @@ def setup_logging(
         _initialized = True
 
 
+def shutdown_logging() -> None:
+    """Flush queued records to disk and stop the writer thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+_event_loggers: Dict[str, logging.Logger] = {}
+_event_listeners: List[logging.handlers.QueueListener] = []
+
+
+def get_event_logger(directory: Union[str, Path], pattern: str = 'events_%Y%m%d.log',
+                     on_open: Optional[Callable[[Path], None]] = None) -> logging.Logger:
+    """
+    A logger that appends bare lines to a daily file in directory,
+    through a queue (so callers never wait on the disk) and with the
+    file kept open. One per directory and pattern; it does not
+    propagate to the root logger.
+
+    Args:
+        directory: Where the daily files go
+        pattern: strftime file name pattern
+        on_open: Called with each newly opened file (e.g. to fix ownership)
+    """
+    key = f"{Path(directory).resolve()}/{pattern}"
+    with _lock:
+        event_logger = _event_loggers.get(key)
+        if event_logger is not None:
+            return event_logger
+
+        file_handler = DailyFileHandler(directory, pattern, on_open=on_open)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        queue_handler, listener = queued([file_handler])
+        _event_listeners.append(listener)
+
+        event_logger = logging.getLogger(f"meshforge.events.{len(_event_loggers)}")
+        event_logger.handlers.clear()
+        event_logger.addHandler(queue_handler)
+        event_logger.setLevel(logging.INFO)
+        event_logger.propagate = False
+        _event_loggers[key] = event_logger
+        if len(_event_listeners) == 1:
+            atexit.register(_stop_event_listeners)
+        return event_logger
+
+
+def _stop_event_listeners():
+    for listener in _event_listeners:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    _event_listeners.clear()
+
+
 def get_logger(name: str = None) -> logging.Logger:
     """
     Get a logger instance with the given name.
@@ -0,0 +1,659 @@
+"""
+Mesh Capacity Simulator - discrete-event Meshtastic flood simulation
+
+Answers capacity questions ("what happens to delivery if 300 more nodes
+join LongFast?") by replaying hours of traffic in seconds. One event
+heap drives everything: no threads, no wall-clock sleeps.
+
+Model:
+- Links: utils.rf link budget plus log-distance excess loss
+  (path_loss_exponent; 2.0 is free space) and fixed per-link log-normal
+  shadowing. A link decodes when its SNR clears the spreading factor's
+  demodulation threshold, and interferes down to capture_db below it.
+- Airtime: utils.airtime (Semtech time-on-air) for each packet size.
+- Collisions: overlapping receptions at a node corrupt each other unless
+  one is capture_db stronger; radios are half duplex.
+- Flood routing as the firmware does it: each node rebroadcasts a new
+  packet while hops remain, after an SNR-weighted contention window
+  (weak, distant receivers go first), cancels its rebroadcast when it
+  hears another copy first, and backs off while the channel is busy.
+- A packet still queued tx_timeout seconds after it entered a node's TX
+  queue is dropped as stale (counted in stale_drops, not in latency),
+  so a saturated channel sheds load instead of delivering hour-old news.
+
+Usage:
+    report = simulate(500, duration=3600, area_km=40, seed=1)
+    print(report.delivery_ratio, report.latency['p90'])
+
+    python3 -m utils.mesh_sim --nodes 100 400 --hours 1 --area-km 40
+"""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from utils.airtime import DEFAULT_TRAFFIC, MESHTASTIC_HEADER, Traffic, get_modem
+    from utils.rf import haversine_distance, link_budget, snr_estimate
+except ImportError:
+    from .airtime import DEFAULT_TRAFFIC, MESHTASTIC_HEADER, Traffic, get_modem
+    from .rf import haversine_distance, link_budget, snr_estimate
+
+# Firmware contention window (RadioInterface.cpp)
+CW_MIN = 3
+CW_MAX = 8
+SNR_MIN = -20.0
+SNR_MAX = 10.0
+CAD_SYMBOLS = 2
+MAC_TURNAROUND = 0.0076     # propagation + radio turnaround + MAC processing, seconds
+
+_ORIGINATE, _ATTEMPT, _TX_END = 0, 1, 2
+
+
+@dataclass
+class SimConfig:
+    """Radio, routing and traffic parameters for a simulation run."""
+    preset: str = 'LONG_FAST'
+    freq_mhz: float = 906.875
+    tx_power_dbm: float = 20.0
+    antenna_gain_dbi: float = 2.0
+    noise_floor_dbm: float = -120.0
+    path_loss_exponent: float = 3.0     # 2.0 = free space
+    shadowing_db: float = 4.0           # per-link log-normal sigma
+    capture_db: float = 6.0             # a packet this much stronger survives an overlap
+    hop_limit: int = 3
+    queue_limit: int = 16               # firmware TX queue depth
+    tx_timeout: Optional[float] = 30.0  # queued this long: dropped as stale (None: never)
+    traffic: Tuple[Traffic, ...] = DEFAULT_TRAFFIC
+    collisions: bool = True             # False: ideal channel, as a baseline
+    csma: bool = True                   # defer while the channel is busy
+    seed: Optional[int] = None
+
+
+class SimNode:
+    """A radio in the simulated mesh."""
+
+    __slots__ = ('index', 'node_id', 'x', 'y', 'links', 'pending', 'receptions',
+                 'armed', 'deferred', 'tx_end', 'tx_count', 'tx_airtime', 'heard_airtime')
+
+    def __init__(self, index: int, node_id: str, x: float, y: float):
+        self.index = index
+        self.node_id = node_id
+        self.x = x                      # metres on a local plane
+        self.y = y
+        self.links: List[Tuple[int, float, bool]] = []   # (neighbour, snr dB, decodable)
+        self.pending: Dict[int, '_Item'] = {}             # FIFO TX queue by packet id
+        self.receptions: List['_Rx'] = []                 # signals arriving right now
+        self.armed = False                                # transmit timer running
+        self.deferred = False                             # waiting for the channel to clear
+        self.tx_end = 0.0
+        self.tx_count = 0
+        self.tx_airtime = 0.0
+        self.heard_airtime = 0.0
+
+
+class MeshNetwork:
+    """Node positions and the radio links between them."""
+
+    def __init__(self, positions: Sequence[Tuple[float, float]],
+                 config: Optional[SimConfig] = None,
+                 node_ids: Optional[Sequence[str]] = None,
+                 rng: Optional[random.Random] = None):
+        self.config = config or SimConfig()
+        self.nodes = [SimNode(i, node_ids[i] if node_ids else f"!sim{i:05x}", x, y)
+                      for i, (x, y) in enumerate(positions)]
+        self._build_links(rng or random.Random(self.config.seed))
+
+    @classmethod
+    def scattered(cls, count: int, area_km: float = 20.0,
+                  config: Optional[SimConfig] = None) -> 'MeshNetwork':
+        """count nodes scattered uniformly over an area_km square."""
+        config = config or SimConfig()
+        rng = random.Random(config.seed)
+        side = area_km * 1000
+        positions = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(count)]
+        return cls(positions, config, rng=rng)
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Sequence[Tuple[str, float, float]],
+                         config: Optional[SimConfig] = None) -> 'MeshNetwork':
+        """Nodes at (node_id, latitude, longitude), projected onto a local plane."""
+        lat0 = min(lat for _, lat, _ in coordinates)
+        lon0 = min(lon for _, _, lon in coordinates)
+        positions = [(haversine_distance(lat0, lon0, lat0, lon),
+                      haversine_distance(lat0, lon0, lat, lon0))
+                     for _, lat, lon in coordinates]
+        return cls(positions, config, [node_id for node_id, _, _ in coordinates])
+
+    def path_snr(self, distance_m: float) -> float:
+        """SNR (dB) over a path this long, before shadowing."""
+        c = self.config
+        distance_m = max(distance_m, 1.0)
+        rx_dbm = link_budget(c.tx_power_dbm, c.antenna_gain_dbi, c.antenna_gain_dbi,
+                             distance_m, c.freq_mhz)
+        rx_dbm -= 10 * (c.path_loss_exponent - 2) * math.log10(distance_m)
+        return snr_estimate(rx_dbm, c.noise_floor_dbm)
+
+    def range_m(self, snr_db: float) -> float:
+        """Distance at which path_snr() falls to snr_db."""
+        low, high = 0.0, 7.0            # log10 metres: 1 m - 10,000 km
+        for _ in range(50):
+            mid = (low + high) / 2
+            if self.path_snr(10 ** mid) >= snr_db:
+                low = mid
+            else:
+                high = mid
+        return 10 ** low
+
+    def _build_links(self, rng: random.Random):
+        c = self.config
+        threshold = get_modem(c.preset).snr_threshold
+        audible = threshold - c.capture_db
+        reach = max(self.range_m(audible - 3 * c.shadowing_db), 1.0)
+
+        # Only nodes in adjacent grid cells can hear each other
+        cells: Dict[Tuple[int, int], List[SimNode]] = {}
+        for node in self.nodes:
+            cells.setdefault((int(node.x // reach), int(node.y // reach)), []).append(node)
+
+        for (cx, cy), members in cells.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    others = cells.get((cx + dx, cy + dy))
+                    if others is None:
+                        continue
+                    for a in members:
+                        for b in others:
+                            if b.index <= a.index:
+                                continue
+                            distance = math.hypot(a.x - b.x, a.y - b.y)
+                            if distance > reach:
+                                continue
+                            snr = self.path_snr(distance)
+                            if c.shadowing_db:
+                                snr += rng.gauss(0, c.shadowing_db)
+                            if snr >= audible:
+                                decodable = snr >= threshold
+                                a.links.append((b.index, snr, decodable))
+                                b.links.append((a.index, snr, decodable))
+
+    def reachable(self, hops: int) -> List[int]:
+        """For each node, how many others a flood of this many hops can reach.
+
+        Breadth-first over decodable links, one integer bitmask per node.
+        """
+        masks = []
+        for node in self.nodes:
+            mask = 0
+            for index, _, decodable in node.links:
+                if decodable:
+                    mask |= 1 << index
+            masks.append(mask)
+
+        counts = []
+        for node in self.nodes:
+            seen = 1 << node.index
+            frontier = [node.index]
+            for _ in range(hops):
+                found = 0
+                for index in frontier:
+                    found |= masks[index]
+                found &= ~seen
+                if not found:
+                    break
+                seen |= found
+                frontier = []
+                while found:
+                    low = found & -found
+                    frontier.append(low.bit_length() - 1)
+                    found ^= low
+            counts.append(bin(seen).count('1') - 1)
+        return counts
+
+    @property
+    def mean_degree(self) -> float:
+        """Average number of neighbours each node can decode."""
+        if not self.nodes:
+            return 0.0
+        return sum(sum(1 for link in n.links if link[2]) for n in self.nodes) / len(self.nodes)
+
+
+class LatencyHistogram:
+    """Fixed-width latency histogram: constant memory for millions of samples."""
+
+    def __init__(self, bin_width: float = 0.05, max_latency: float = 3600.0):
+        self.bin_width = bin_width
+        self.bins = [0] * (int(max_latency / bin_width) + 1)   # last bin: overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.bins[min(int(value / self.bin_width), len(self.bins) - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bin holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.bins):
+            seen += n
+            if seen >= target and n:
+                return min((i + 1) * self.bin_width, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50': round(self.percentile(50), 3),
+            'p90': round(self.percentile(90), 3),
+            'p99': round(self.percentile(99), 3),
+            'max': round(self.max, 3),
+        }
+
+
+@dataclass
+class SimReport:
+    """Outcome of a simulation run."""
+    nodes: int
+    duration: float
+    preset: str
+    mean_degree: float
+    originated: int
+    transmissions: int
+    rebroadcasts: int
+    suppressed: int             # rebroadcasts cancelled on hearing another copy
+    collisions: int             # decodable receptions lost to overlap or half duplex
+    backoffs: int               # attempts deferred by a busy channel
+    queue_drops: int
+    stale_drops: int            # queued packets dropped after tx_timeout
+    deliveries: int
+    delivery_ratio: float       # share of nodes within flood range that got each packet
+    coverage_ratio: float       # share of all other nodes that got each packet
+    mean_hops: float
+    latency: Dict[str, float]   # seconds from origination to first reception
+    channel_utilization: float  # mean share of time a node hears the channel busy
+    airtime_utilization: float  # all airtime / duration (exceeds 1 with spatial reuse)
+    node_duty_cycle: Dict[str, float] = field(default_factory=dict)   # % mean/max
+    events: int = 0
+    wall_time: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'nodes': self.nodes,
+            'duration_s': self.duration,
+            'preset': self.preset,
+            'mean_degree': round(self.mean_degree, 1),
+            'originated': self.originated,
+            'transmissions': self.transmissions,
+            'rebroadcasts': self.rebroadcasts,
+            'suppressed': self.suppressed,
+            'collisions': self.collisions,
+            'backoffs': self.backoffs,
+            'queue_drops': self.queue_drops,
+            'stale_drops': self.stale_drops,
+            'deliveries': self.deliveries,
+            'delivery_ratio': round(self.delivery_ratio, 4),
+            'coverage_ratio': round(self.coverage_ratio, 4),
+            'mean_hops': round(self.mean_hops, 2),
+            'latency_s': self.latency,
+            'channel_utilization_pct': round(self.channel_utilization * 100, 2),
+            'airtime_utilization_pct': round(self.airtime_utilization * 100, 2),
+            'node_duty_cycle_pct': self.node_duty_cycle,
+            'events': self.events,
+            'wall_time_s': round(self.wall_time, 3),
+        }
+
+
+class _Packet:
+    __slots__ = ('id', 'origin', 'created', 'size', 'seen')
+
+    def __init__(self, packet_id, origin, created, size, node_count):
+        self.id = packet_id
+        self.origin = origin
+        self.created = created
+        self.size = size                    # bytes on air
+        self.seen = bytearray(node_count)   # nodes that have received it
+
+
+class _Item:
+    """A packet in a node's TX queue."""
+    __slots__ = ('packet', 'hop_limit', 'snr', 'queued')
+
+    def __init__(self, packet, hop_limit, queued, snr=None):
+        self.packet = packet
+        self.hop_limit = hop_limit
+        self.queued = queued                # when it entered this node's queue
+        self.snr = snr                      # set for rebroadcasts
+
+
+class _Tx:
+    __slots__ = ('packet', 'hop_limit', 'receptions')
+
+    def __init__(self, packet, hop_limit):
+        self.packet = packet
+        self.hop_limit = hop_limit
+        self.receptions = []
+
+
+class _Rx:
+    __slots__ = ('snr', 'decodable', 'ok')
+
+    def __init__(self, snr, decodable, ok):
+        self.snr = snr
+        self.decodable = decodable
+        self.ok = ok
+
+
+class FloodSimulator:
+    """Discrete-event Meshtastic flood simulation over a MeshNetwork.
+
+    Usage:
+        network = MeshNetwork.scattered(1000, area_km=60, config=SimConfig(seed=7))
+        report = FloodSimulator(network).run(2 * 3600)
+    """
+
+    def __init__(self, network: MeshNetwork, config: Optional[SimConfig] = None):
+        self.network = network
+        self.config = config or network.config
+        self.modem = get_modem(self.config.preset)
+        self.slot_time = CAD_SYMBOLS * self.modem.symbol_time + MAC_TURNAROUND
+        self.now = 0.0
+        self.latency = LatencyHistogram()
+        self._rng = random.Random(self.config.seed)
+        self._random = self._rng.random
+        self._heap: List[tuple] = []
+        self._seq = 0
+        self._packet_ids = 0
+        self._originated = [0] * len(network.nodes)     # packets per origin
+        self.stats = dict.fromkeys(('originated', 'transmissions', 'rebroadcasts', 'suppressed',
+                                    'collisions', 'backoffs', 'queue_drops', 'stale_drops',
+                                    'deliveries', 'hops'), 0)
+
+    def _push(self, when: float, kind: int, a, b=None):
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, kind, a, b))
+
+    def _rebroadcast_delay(self, snr: float) -> float:
+        """SNR-weighted contention window: weak (distant) receivers go first."""
+        snr = min(max(snr, SNR_MIN), SNR_MAX)
+        cw = int(CW_MIN + (snr - SNR_MIN) * (CW_MAX - CW_MIN) / (SNR_MAX - SNR_MIN))
+        return (2 * CW_MAX + int(self._random() * (1 << cw))) * self.slot_time
+
+    def _tx_delay(self, node: SimNode) -> float:
+        """Random backoff, widening with the channel utilization the node hears."""
+        utilization = min(node.heard_airtime / self.now, 1.0) if self.now > 0 else 0.0
+        cw = int(CW_MIN + utilization * (CW_MAX - CW_MIN))
+        return (int(self._random() * (1 << cw)) + 1) * self.slot_time
+
+    def send(self, index: int, payload: int = 50, at: float = 0.0):
+        """Schedule a one-off broadcast of payload bytes from node index."""
+        self._push(at, _ORIGINATE, self.network.nodes[index], Traffic('message', payload, math.inf))
+
+    def run(self, duration: float) -> SimReport:
+        """Originate traffic for duration seconds, then let the floods drain."""
+        started = time.perf_counter()
+        nodes = self.network.nodes
+        for node in nodes:
+            for traffic in self.config.traffic:
+                first = self._rng.uniform(0, traffic.interval)
+                if first < duration:
+                    self._push(first, _ORIGINATE, node, traffic)
+
+        heap = self._heap
+        pop = heapq.heappop
+        events = 0
+        while heap:
+            self.now, _, kind, a, b = pop(heap)
+            events += 1
+            if kind == _TX_END:
+                self._finish(a)
+            elif kind == _ATTEMPT:
+                self._attempt(a)
+            else:
+                self._originate(a, b, duration)
+
+        return self._report(duration, events, time.perf_counter() - started)
+
+    def _originate(self, node: SimNode, traffic: Traffic, duration: float):
+        stats = self.stats
+        if traffic.interval < math.inf:
+            following = self.now + self._rng.expovariate(1 / traffic.interval)
+            if following < duration:
+                self._push(following, _ORIGINATE, node, traffic)
+
+        if len(node.pending) >= self.config.queue_limit:
+            stats['queue_drops'] += 1
+            return
+        self._packet_ids += 1
+        packet = _Packet(self._packet_ids, node.index, self.now,
+                         traffic.payload + MESHTASTIC_HEADER, len(self.network.nodes))
+        packet.seen[node.index] = 1
+        node.pending[packet.id] = _Item(packet, self.config.hop_limit, self.now)
+        stats['originated'] += 1
+        self._originated[node.index] += 1
+        self._arm(node)
+
+    def _arm(self, node: SimNode):
+        """Start the transmit timer for the head of the queue.
+
+        As in the firmware, one timer serves the whole queue: rebroadcasts
+        wait out their SNR-weighted window, own packets a random backoff.
+        """
+        if node.armed or node.deferred or not node.pending:
+            return
+        head = next(iter(node.pending.values()))
+        delay = (self._rebroadcast_delay(head.snr) if head.snr is not None
+                 else self._tx_delay(node))
+        node.armed = True
+        self._push(max(self.now, node.tx_end) + delay, _ATTEMPT, node)
+
+    def _attempt(self, node: SimNode):
+        node.armed = False
+        if not node.pending:
+            return
+        now = self.now
+        if self.config.csma and node.receptions:
+            # Channel busy: listen until it clears, then back off again
+            self.stats['backoffs'] += 1
+            node.deferred = True
+            return
+        if self._drop_stale(node):
+            # The head went stale: the next packet waits out its own window
+            self._arm(node)
+            return
+
+        item = node.pending.pop(next(iter(node.pending)))
+        packet = item.packet
+        airtime = self.modem.time_on_air(packet.size)
+        node.tx_end = now + airtime
+        node.tx_count += 1
+        node.tx_airtime += airtime
+        self.stats['transmissions'] += 1
+        if packet.origin != node.index:
+            self.stats['rebroadcasts'] += 1
+
+        collisions = self.config.collisions
+        capture = self.config.capture_db
+        if collisions:
+            for rx in node.receptions:      # half duplex: sending drops what we were hearing
+                rx.ok = False
+
+        tx = _Tx(packet, item.hop_limit)
+        nodes = self.network.nodes
+        receptions = tx.receptions
+        for index, snr, decodable in node.links:
+            receiver = nodes[index]
+            receiver.heard_airtime += airtime
+            ok = decodable
+            heard = receiver.receptions
+            if collisions:
+                if receiver.tx_end > now:
+                    ok = False
+                if heard:
+                    # Capture effect: only a signal capture_db above the rest survives
+                    weaker, stronger = snr + capture, snr - capture
+                    for other in heard:
+                        if other.snr < weaker:
+                            other.ok = False
+                        if other.snr > stronger:
+                            ok = False
+            rx = _Rx(snr, decodable, ok)
+            heard.append(rx)
+            receptions.append((receiver, rx))
+        self._push(node.tx_end, _TX_END, tx)
+        self._arm(node)
+
+    def _drop_stale(self, node: SimNode) -> bool:
+        """Drop packets queued longer than tx_timeout; True if the head went."""
+        timeout = self.config.tx_timeout
+        if timeout is None:
+            return False
+        cutoff = self.now - timeout
+        pending = node.pending
+        if next(iter(pending.values())).queued >= cutoff:
+            return False
+        stale = [pid for pid, item in pending.items() if item.queued < cutoff]
+        for pid in stale:
+            del pending[pid]
+        self.stats['stale_drops'] += len(stale)
+        return True
+
+    def _finish(self, tx: _Tx):
+        lost = 0
+        for receiver, rx in tx.receptions:
+            heard = receiver.receptions
+            heard.remove(rx)
+            if rx.ok:
+                self._receive(receiver, tx, rx.snr)
+            elif rx.decodable:
+                lost += 1
+            if receiver.deferred and not heard:
+                receiver.deferred = False
+                self._arm(receiver)
+        self.stats['collisions'] += lost
+
+    def _receive(self, node: SimNode, tx: _Tx, snr: float):
+        stats = self.stats
+        packet = tx.packet
+        if packet.seen[node.index]:
+            # Someone else already relayed it: drop our queued copy
+            if node.pending.pop(packet.id, None) is not None:
+                stats['suppressed'] += 1
+            return
+
+        packet.seen[node.index] = 1
+        stats['deliveries'] += 1
+        stats['hops'] += self.config.hop_limit - tx.hop_limit + 1
+        self.latency.add(self.now - packet.created)
+
+        if tx.hop_limit > 0:
+            if len(node.pending) >= self.config.queue_limit:
+                stats['queue_drops'] += 1
+                return
+            node.pending[packet.id] = _Item(packet, tx.hop_limit - 1, self.now, snr)
+            self._arm(node)
+
+    def _report(self, duration: float, events: int, wall_time: float) -> SimReport:
+        stats = self.stats
+        nodes = self.network.nodes
+        elapsed = max(self.now, duration) or 1.0
+        others = stats['originated'] * (len(nodes) - 1)
+        # A packet travels at most hop_limit + 1 transmissions
+        reach = self.network.reachable(self.config.hop_limit + 1)
+        in_range = sum(n * r for n, r in zip(self._originated, reach))
+        duty = [n.tx_airtime / elapsed * 100 for n in nodes] or [0.0]
+        return SimReport(
+            nodes=len(nodes),
+            duration=duration,
+            preset=self.config.preset,
+            mean_degree=self.network.mean_degree,
+            originated=stats['originated'],
+            transmissions=stats['transmissions'],
+            rebroadcasts=stats['rebroadcasts'],
+            suppressed=stats['suppressed'],
+            collisions=stats['collisions'],
+            backoffs=stats['backoffs'],
+            queue_drops=stats['queue_drops'],
+            stale_drops=stats['stale_drops'],
+            deliveries=stats['deliveries'],
+            delivery_ratio=stats['deliveries'] / in_range if in_range else 0.0,
+            coverage_ratio=stats['deliveries'] / others if others else 0.0,
+            mean_hops=stats['hops'] / stats['deliveries'] if stats['deliveries'] else 0.0,
+            latency=self.latency.summary(),
+            channel_utilization=(sum(min(n.heard_airtime / elapsed, 1.0) for n in nodes)
+                                 / len(nodes)) if nodes else 0.0,
+            airtime_utilization=sum(n.tx_airtime for n in nodes) / elapsed,
+            node_duty_cycle={'mean': round(sum(duty) / len(duty), 3),
+                             'max': round(max(duty), 3)},
+            events=events,
+            wall_time=wall_time,
+        )
+
+
+def simulate(node_count: int, duration: float = 3600.0, area_km: float = 20.0,
+             **config) -> SimReport:
+    """Build a random network of node_count nodes and run it.
+
+    Args:
+        node_count: Nodes scattered over an area_km square
+        duration: Simulated seconds of traffic
+        area_km: Side of the square
+        **config: SimConfig fields (preset, hop_limit, seed, ...)
+
+    Returns:
+        SimReport
+    """
+    network = MeshNetwork.scattered(node_count, area_km, SimConfig(**config))
+    return FloodSimulator(network).run(duration)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Discrete-event Meshtastic capacity simulator")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[100, 400],
+                        help="Mesh sizes to compare")
+    parser.add_argument('--hours', type=float, default=1.0, help="Simulated hours of traffic")
+    parser.add_argument('--area-km', type=float, default=20.0, help="Side of the square area")
+    parser.add_argument('--preset', default='LONG_FAST', help="Modem preset")
+    parser.add_argument('--hop-limit', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--ideal', action='store_true', help="Disable collisions (baseline)")
+    parser.add_argument('--tx-timeout', type=float, default=SimConfig.tx_timeout,
+                        help="Drop packets queued this many seconds (0: never)")
+    parser.add_argument('--json', action='store_true', help="Print JSON")
+    args = parser.parse_args(argv)
+
+    reports = [simulate(n, args.hours * 3600, args.area_km, preset=args.preset.upper(),
+                        hop_limit=args.hop_limit, seed=args.seed, collisions=not args.ideal,
+                        tx_timeout=args.tx_timeout or None)
+               for n in args.nodes]
+
+    if args.json:
+        print(json.dumps([r.to_dict() for r in reports], indent=2))
+        return 0
+
+    print(f"{args.preset.upper()}, {args.area_km:g} km square, {args.hours:g} h, "
+          f"hop limit {args.hop_limit}")
+    print(f"{'nodes':>6} {'degree':>7} {'delivery':>9} {'p50 s':>7} {'p90 s':>7} "
+          f"{'ch util':>8} {'tx':>8} {'wall s':>7}")
+    for r in reports:
+        print(f"{r.nodes:>6} {r.mean_degree:>7.1f} {r.delivery_ratio * 100:>8.1f}% "
+              f"{r.latency['p50']:>7.2f} {r.latency['p90']:>7.2f} "
+              f"{r.channel_utilization * 100:>7.1f}% {r.transmissions:>8} {r.wall_time:>7.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,615 @@
+"""
+Async Meshtastic Client - asyncio-native stream protocol client
+
+Talks the Meshtastic stream protocol (see utils.meshtastic_stream) to
+meshtasticd over TCP, or to a radio over serial when pyserial-asyncio is
+installed, without the meshtastic package, pypubsub or per-connection
+reader/heartbeat threads.
+
+- Idle costs nothing: the reader task waits on the socket, the
+  heartbeat on a timer.
+- Backpressure: decoded packets go to bounded per-consumer queues and
+  the reader stops reading while a consumer is full, so a slow consumer
+  slows the TCP stream instead of growing memory. Sends await drain().
+- Pluggable decoder: MeshPacket bytes -> whatever the consumer wants
+  (default: meshtastic-library-shaped dicts).
+
+StreamInterface wraps a client for threaded code. It exposes the subset
+of meshtastic.tcp_interface.TCPInterface that MeshForge uses (sendText,
+sendData, sendPosition, nodes, getMyNodeInfo, close) and delivers
+packets through callbacks instead of pubsub. All StreamInterfaces in a
+process share one event loop thread.
+
+Usage:
+    async with MeshtasticStreamClient('localhost', 4403) as client:
+        await client.send_text("hello")
+        async for packet in client.packets():
+            print(packet['fromId'], packet['decoded']['portnum'])
+
+    # From threaded code
+    iface = StreamInterface('localhost', 4403, on_receive=handle_packet)
+    if iface.connect(timeout=10):
+        iface.sendText("hello", destinationId='!abcd1234')
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from utils.meshtastic_stream import (
+    BROADCAST_NUM,
+    PORTNUM_VALUES,
+    START2,
+    FrameDecoder,
+    ProtocolError,
+    decode_from_radio,
+    decode_mesh_packet,
+    decode_my_info,
+    decode_node_info,
+    disconnect,
+    encode_fixed32,
+    encode_varint,
+    frame,
+    heartbeat,
+    mesh_packet,
+    new_packet_id,
+    node_id,
+    parse_node_id,
+    text_packet,
+    want_config,
+)
+
+# Serial radios (optional)
+try:
+    import serial_asyncio
+    SERIAL_ASYNC_AVAILABLE = True
+except ImportError:
+    serial_asyncio = None
+    SERIAL_ASYNC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 4403
+DEFAULT_BAUDRATE = 115200
+CONNECT_TIMEOUT = 15.0
+# Give up on a config download (and reconnect) after this long
+CONFIG_TIMEOUT = 30.0
+# meshtasticd drops clients that stay silent for ~15 minutes
+HEARTBEAT_INTERVAL = 300.0
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 30.0
+# Packets buffered per packets() consumer before the reader pauses
+QUEUE_SIZE = 256
+SEND_TIMEOUT = 10.0
+READ_SIZE = 4096
+
+# Events passed to listeners as (event, data)
+EVENTS = ('packet', 'node', 'connected', 'disconnected')
+
+_EOF = object()
+
+PacketDecoder = Callable[[bytes], Any]
+Listener = Callable[[str, Any], None]
+
+# Ports whose payload updates the sender's node entry
+_NODE_PORTS = ('NODEINFO_APP', 'POSITION_APP', 'TELEMETRY_APP')
+
+
+class MeshtasticStreamClient:
+    """
+    One Meshtastic stream connection, run inside an asyncio event loop.
+
+    Not thread-safe: call it from the loop it runs on (see StreamInterface
+    for threaded callers).
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = DEFAULT_PORT,
+                 device: Optional[str] = None, baudrate: int = DEFAULT_BAUDRATE,
+                 decoder: Optional[PacketDecoder] = None,
+                 queue_size: int = QUEUE_SIZE, reconnect: bool = False,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL,
+                 config_timeout: float = CONFIG_TIMEOUT):
+        """
+        Args:
+            host, port: meshtasticd TCP endpoint (ignored when device is set)
+            device: Serial device path (needs pyserial-asyncio)
+            decoder: MeshPacket bytes -> packet object; dicts in the
+                meshtastic-library shape also update the node table
+            queue_size: Packets buffered per packets() consumer
+            reconnect: Keep reconnecting after a lost connection
+        """
+        self.host = host
+        self.port = port
+        self.device = device
+        self.baudrate = baudrate
+        self.decoder = decoder or decode_mesh_packet
+        self.queue_size = queue_size
+        self.reconnect = reconnect
+        self.heartbeat_interval = heartbeat_interval
+        self.config_timeout = config_timeout
+
+        # Node DB in interface.nodes shape, keyed by '!abcd1234'
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.my_info: Dict[str, Any] = {}
+        self.my_node_num: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+        self._listeners: List[Listener] = []
+        self._queues: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._nonce = 0
+        self._config_deadline = 0.0
+        self._closing = False
+
+        self.stats = {'connects': 0, 'frames_in': 0, 'frames_out': 0, 'packets': 0,
+                      'decode_errors': 0, 'backpressure_waits': 0}
+
+    @property
+    def endpoint(self) -> str:
+        return self.device or f"{self.host}:{self.port}"
+
+    @property
+    def connected(self) -> bool:
+        """True once the config download has completed on a live connection."""
+        return bool(self._ready and self._ready.is_set() and self._writer)
+
+    # === Lifecycle ===
+
+    async def connect(self, timeout: float = CONNECT_TIMEOUT):
+        """
+        Connect and download the radio config (node DB).
+
+        Raises:
+            ConnectionError: endpoint unreachable or no config within timeout
+        """
+        if self.connected:
+            return
+        self.start()
+        ready = asyncio.ensure_future(self._ready.wait())
+        try:
+            await asyncio.wait({ready, self._task}, timeout=timeout,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+        if self.connected:
+            return
+        error = self.last_error or f"No config from {self.endpoint} within {timeout:.0f}s"
+        await self.close()
+        raise ConnectionError(error)
+
+    def start(self):
+        """Begin connecting in the background (returns immediately)."""
+        self._closing = False
+        if self._ready is None:
+            self._ready = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        """Disconnect and end every packets() iterator."""
+        self._closing = True
+        writer = self._writer
+        if writer is not None:
+            try:
+                writer.write(frame(disconnect()))
+            except (ConnectionError, OSError, RuntimeError):
+                pass
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._end_iterators()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _open(self):
+        if self.device:
+            if not SERIAL_ASYNC_AVAILABLE:
+                raise ConnectionError("Serial needs pyserial-asyncio (pip install pyserial-asyncio)")
+            reader, writer = await serial_asyncio.open_serial_connection(
+                url=self.device, baudrate=self.baudrate)
+            # Wake the radio's stream API (as the meshtastic library does)
+            writer.write(bytes([START2]) * 32)
+            await asyncio.sleep(0.1)
+            return reader, writer
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while not self._closing:
+            try:
+                reader, writer = await self._open()
+            except (OSError, ConnectionError) as e:
+                self.last_error = f"Cannot reach {self.endpoint}: {e}"
+                logger.debug(self.last_error)
+                if not self.reconnect:
+                    self._end_iterators()
+                    return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX)
+                continue
+
+            self._writer = writer
+            self.stats['connects'] += 1
+            keepalive = asyncio.ensure_future(self._heartbeat_loop())
+            error = None
+            try:
+                self._request_config()
+                await self._read(reader)
+            except (ConnectionError, OSError, ProtocolError) as e:
+                error = str(e) or type(e).__name__
+            except asyncio.TimeoutError:
+                error = "Config download timed out"
+            finally:
+                keepalive.cancel()
+                was_ready = self._ready.is_set()
+                self._ready.clear()
+                self._writer = None
+                writer.close()
+
+            if self._closing:
+                return
+            self.last_error = error
+            logger.warning(f"Meshtastic connection to {self.endpoint} lost: {error}")
+            if was_ready:
+                delay = RECONNECT_MIN
+                self._emit('disconnected', error)
+            if not self.reconnect:
+                self._end_iterators()
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _request_config(self):
+        self._nonce = new_packet_id()
+        self._config_deadline = time.monotonic() + self.config_timeout
+        self._writer.write(frame(want_config(self._nonce)))
+        self.stats['frames_out'] += 1
+
+    async def _read(self, reader: asyncio.StreamReader):
+        decoder = FrameDecoder()
+        while True:
+            timeout = None
+            if not self._ready.is_set():
+                timeout = max(0.1, self._config_deadline - time.monotonic())
+            data = await asyncio.wait_for(reader.read(READ_SIZE), timeout)
+            if not data:
+                raise ConnectionError("meshtasticd closed the connection")
+            for payload in decoder.feed(data):
+                self.stats['frames_in'] += 1
+                await self._on_from_radio(payload)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if self.connected:
+                await self.send(heartbeat())
+
+    # === Receive ===
+
+    async def _on_from_radio(self, payload: bytes):
+        try:
+            kind, value = decode_from_radio(payload)
+        except ProtocolError:
+            self.stats['decode_errors'] += 1
+            return
+
+        if kind == 'packet':
+            try:
+                packet = self.decoder(value)
+            except (ProtocolError, ValueError) as e:
+                self.stats['decode_errors'] += 1
+                logger.debug(f"Undecodable MeshPacket: {e}")
+                return
+            self.stats['packets'] += 1
+            if isinstance(packet, dict):
+                self._update_node(packet)
+            self._emit('packet', packet)
+            for queue in list(self._queues):
+                if queue.full():
+                    self.stats['backpressure_waits'] += 1
+                await queue.put(packet)
+        elif kind == 'my_info':
+            self.my_info = decode_my_info(value)
+            self.my_node_num = self.my_info.get('myNodeNum')
+        elif kind == 'node_info':
+            node = decode_node_info(value)
+            num = node.get('num')
+            if num is not None:
+                self.nodes[node_id(num)] = node
+                if self._ready.is_set():
+                    self._emit('node', node)
+        elif kind == 'config_complete_id':
+            if value == self._nonce and not self._ready.is_set():
+                self._ready.set()
+                logger.info(f"Connected to {self.endpoint}: {len(self.nodes)} nodes")
+                self._emit('connected', self.my_node_num)
+        elif kind == 'rebooted':
+            logger.info("Radio rebooted; refreshing config")
+            self._ready.clear()
+            self._request_config()
+
+    def _update_node(self, packet: Dict[str, Any]):
+        """Fold what a packet says about its sender into the node DB."""
+        num = packet.get('from')
+        if not num:
+            return
+        key = node_id(num)
+        node = self.nodes.get(key)
+        is_new = node is None
+        if is_new:
+            node = self.nodes[key] = {'num': num}
+        node['lastHeard'] = packet.get('rxTime') or int(time.time())
+        via_mqtt = packet.get('viaMqtt', False)
+        node['viaMqtt'] = via_mqtt
+        if 'rxSnr' in packet and not via_mqtt:
+            node['snr'] = packet['rxSnr']
+        hop_start, hop_limit = packet.get('hopStart'), packet.get('hopLimit')
+        if hop_start is not None and hop_limit is not None and hop_start >= hop_limit:
+            node['hopsAway'] = hop_start - hop_limit
+
+        decoded = packet.get('decoded') or {}
+        portnum = decoded.get('portnum')
+        if portnum == 'NODEINFO_APP' and 'user' in decoded:
+            node['user'] = decoded['user']
+        elif portnum == 'POSITION_APP' and (decoded.get('position') or {}).get('latitudeI'):
+            node['position'] = decoded['position']
+        elif portnum == 'TELEMETRY_APP' and 'telemetry' in decoded:
+            telemetry = decoded['telemetry']
+            for name in ('deviceMetrics', 'environmentMetrics'):
+                if name in telemetry:
+                    node[name] = telemetry[name]
+        if is_new or portnum in _NODE_PORTS:
+            self._emit('node', node)
+
+    # === Consumers ===
+
+    def add_listener(self, callback: Listener):
+        """Call callback(event, data) for each EVENTS item, on the loop thread."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Listener):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event: str, data: Any):
+        for callback in list(self._listeners):
+            try:
+                callback(event, data)
+            except Exception as e:
+                logger.error(f"Meshtastic client listener error ({event}): {e}")
+
+    async def packets(self, maxsize: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Decoded packets as they arrive, until close().
+
+        Each iterator has its own bounded queue; while it is full the
+        reader waits, holding back every consumer and the socket.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize or self.queue_size)
+        self._queues.add(queue)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _EOF:
+                    return
+                yield item
+        finally:
+            self._queues.discard(queue)
+
+    def __aiter__(self):
+        return self.packets()
+
+    def _end_iterators(self):
+        for queue in list(self._queues):
+            while queue.full():
+                queue.get_nowait()
+            queue.put_nowait(_EOF)
+
+    # === Send ===
+
+    async def send(self, to_radio: bytes):
+        """Send one serialized ToRadio, waiting for the transport to drain."""
+        writer = self._writer
+        if writer is None:
+            raise ConnectionError(f"Not connected to {self.endpoint}")
+        async with self._write_lock:
+            writer.write(frame(to_radio))
+            await writer.drain()
+        self.stats['frames_out'] += 1
+
+    async def send_text(self, text: str, destination=None, channel: int = 0,
+                        want_ack: bool = False) -> int:
+        """Send a text message; returns the packet id."""
+        packet_id = new_packet_id()
+        await self.send(text_packet(text, to=_destination(destination), channel=channel,
+                                    want_ack=want_ack, packet_id=packet_id))
+        return packet_id
+
+    async def send_data(self, payload: bytes, destination=None,
+                        portnum=PORTNUM_VALUES['PRIVATE_APP'], channel: int = 0,
+                        hop_limit: Optional[int] = None, want_ack: bool = False,
+                        want_response: bool = False) -> int:
+        """Send an application payload on portnum; returns the packet id."""
+        if isinstance(portnum, str):
+            portnum = PORTNUM_VALUES[portnum]
+        packet_id = new_packet_id()
+        await self.send(mesh_packet(portnum, bytes(payload), to=_destination(destination),
+                                    channel=channel, want_ack=want_ack, packet_id=packet_id,
+                                    hop_limit=hop_limit, want_response=want_response))
+        return packet_id
+
+
+def _destination(value) -> int:
+    return BROADCAST_NUM if value is None else parse_node_id(value)
+
+
+def _position_payload(latitude: float, longitude: float, altitude: int) -> bytes:
+    payload = b''
+    if latitude:
+        payload += encode_fixed32(1, int(latitude * 1e7) & 0xFFFFFFFF)
+    if longitude:
+        payload += encode_fixed32(2, int(longitude * 1e7) & 0xFFFFFFFF)
+    if altitude:
+        payload += encode_varint(3, altitude & 0xFFFFFFFFFFFFFFFF)
+    return payload
+
+
+# ============================================================================
+# Threaded facade
+# ============================================================================
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_client_loop() -> asyncio.AbstractEventLoop:
+    """The event loop hosting every StreamInterface (one daemon thread per process)."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop_thread is None or not _loop_thread.is_alive():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            _loop_thread = threading.Thread(target=run, daemon=True, name="meshtastic-client")
+            _loop_thread.start()
+            started.wait()
+            _loop = loop
+        return _loop
+
+
+class StreamInterface:
+    """
+    Blocking, meshtastic-library-shaped facade over MeshtasticStreamClient.
+
+    Callbacks run on the shared client loop thread: keep them short.
+    Send calls made from a callback are queued rather than awaited.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = DEFAULT_PORT,
+                 device: Optional[str] = None,
+                 on_receive: Optional[Callable[[Any], None]] = None,
+                 on_node_updated: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_connection: Optional[Callable[[bool], None]] = None,
+                 decoder: Optional[PacketDecoder] = None,
+                 reconnect: bool = False, send_timeout: float = SEND_TIMEOUT):
+        self.on_receive = on_receive
+        self.on_node_updated = on_node_updated
+        self.on_connection = on_connection
+        self.send_timeout = send_timeout
+        self._loop = get_client_loop()
+        self._client = MeshtasticStreamClient(host, port, device=device, decoder=decoder,
+                                              reconnect=reconnect)
+        self._client.add_listener(self._dispatch)
+
+    @property
+    def client(self) -> MeshtasticStreamClient:
+        return self._client
+
+    def _dispatch(self, event: str, data: Any):
+        if event == 'packet':
+            if self.on_receive:
+                self.on_receive(data)
+        elif event == 'node':
+            if self.on_node_updated:
+                self.on_node_updated(data)
+        elif self.on_connection:
+            self.on_connection(event == 'connected')
+
+    def _call(self, coro, timeout: float):
+        if threading.current_thread() is _loop_thread:
+            # Called from a callback: blocking here would deadlock the loop
+            asyncio.ensure_future(coro)
+            return None
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Meshtastic call timed out after {timeout:.0f}s")
+
+    # === Connection ===
+
+    def connect(self, timeout: float = CONNECT_TIMEOUT) -> bool:
+        """Connect and load the node DB; False (see last_error) on failure."""
+        try:
+            self._call(self._client.connect(timeout), timeout + 5)
+            return True
+        except (ConnectionError, OSError, TimeoutError) as e:
+            self._client.last_error = str(e)
+            logger.debug(f"StreamInterface connect failed: {e}")
+            return False
+
+    def start(self):
+        """Connect in the background, reconnecting whenever the link drops."""
+        self._client.reconnect = True
+        self._loop.call_soon_threadsafe(self._client.start)
+
+    def close(self, timeout: float = 5.0):
+        try:
+            self._call(self._client.close(), timeout)
+        except (TimeoutError, RuntimeError) as e:
+            logger.debug(f"StreamInterface close: {e}")
+
+    @property
+    def isConnected(self) -> bool:
+        return self._client.connected
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self._client.last_error
+
+    @property
+    def my_node_num(self) -> Optional[int]:
+        return self._client.my_node_num
+
+    @property
+    def nodes(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of the node DB, keyed by '!abcd1234'."""
+        return dict(self._client.nodes)
+
+    def getMyNodeInfo(self) -> Dict[str, Any]:
+        num = self._client.my_node_num
+        if num is None:
+            return {}
+        return self._client.nodes.get(node_id(num)) or {'num': num}
+
+    # === Send (meshtastic library signatures) ===
+
+    def sendText(self, text: str, destinationId=None, wantAck: bool = False,
+                 channelIndex: int = 0, **_kwargs) -> Optional[int]:
+        return self._call(self._client.send_text(text, destinationId, channel=channelIndex,
+                                                 want_ack=wantAck), self.send_timeout)
+
+    def sendData(self, data: bytes, destinationId=None, portNum=256, wantAck: bool = False,
+                 wantResponse: bool = False, channelIndex: int = 0,
+                 hopLimit: Optional[int] = None, **_kwargs) -> Optional[int]:
+        return self._call(self._client.send_data(data, destinationId, portnum=portNum,
+                                                 channel=channelIndex, hop_limit=hopLimit,
+                                                 want_ack=wantAck, want_response=wantResponse),
+                          self.send_timeout)
+
+    def sendPosition(self, latitude: float = 0.0, longitude: float = 0.0, altitude: int = 0,
+                     destinationId=None, wantAck: bool = False, wantResponse: bool = False,
+                     channelIndex: int = 0, **_kwargs) -> Optional[int]:
+        return self.sendData(_position_payload(latitude, longitude, altitude), destinationId,
+                             portNum=PORTNUM_VALUES['POSITION_APP'], wantAck=wantAck,
+                             wantResponse=wantResponse, channelIndex=channelIndex)
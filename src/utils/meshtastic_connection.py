@@ -8,6 +8,10 @@ one TCP client connection at a time. Features:
 - Safe connection cleanup that handles already-closed connections
 - Cooldown period between connections to prevent rapid reconnect issues
 - Timeout handling
+
+When the multiplexing proxy (utils/meshtastic_proxy.py) is running, the
+lock and cooldown are skipped: connections go to the proxy, and node
+lists and sends use its JSON API without a session at all.
 """
 
 import socket
@@ -19,6 +23,13 @@ from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Shared meshtasticd session (optional; used when the proxy is running)
+try:
+    from utils.meshtastic_proxy import api_request, get_proxy_endpoint, get_proxy_nodes
+    PROXY_AVAILABLE = True
+except ImportError:
+    PROXY_AVAILABLE = False
+
 # Singleton instance
 _connection_manager: Optional['MeshtasticConnectionManager'] = None
 _manager_lock = threading.Lock()
@@ -153,10 +164,20 @@ class MeshtasticConnectionManager:
         except RuntimeError:
             pass  # Lock not held
 
-    def _create_interface(self):
+    def _proxy_endpoint(self):
+        """(host, port) of a running proxy for our meshtasticd, else None"""
+        if not PROXY_AVAILABLE:
+            return None
+        return get_proxy_endpoint(self.host, self.port)
+
+    def _create_interface(self, host: Optional[str] = None, port: Optional[int] = None):
         """
         Create a new meshtastic TCP interface.
 
+        Args:
+            host: Override host (e.g. the proxy)
+            port: Override port
+
         Returns:
             TCPInterface instance
 
@@ -165,7 +186,8 @@ class MeshtasticConnectionManager:
         """
         try:
             import meshtastic.tcp_interface
-            return meshtastic.tcp_interface.TCPInterface(hostname=self.host)
+            return meshtastic.tcp_interface.TCPInterface(hostname=host or self.host,
+                                                         portNumber=port or self.port)
         except ImportError:
             raise ConnectionError("meshtastic library not installed")
         except Exception as e:
@@ -199,6 +221,19 @@ class MeshtasticConnectionManager:
         Raises:
             ConnectionError: If connection fails after all retries
         """
+        endpoint = self._proxy_endpoint()
+        if endpoint:
+            # The proxy serves any number of clients: no lock, no cooldown
+            interface = self._create_interface(*endpoint)
+            try:
+                yield interface
+            finally:
+                try:
+                    interface.close()
+                except Exception as e:
+                    logger.debug(f"Error closing proxy connection: {e}")
+            return
+
         if not self.acquire_lock(timeout=lock_timeout):
             raise ConnectionError("Could not acquire connection lock (another operation in progress)")
 
@@ -259,6 +294,18 @@ class MeshtasticConnectionManager:
         Returns:
             List of node dictionaries, empty list on error
         """
+        if self._proxy_endpoint():
+            proxied = get_proxy_nodes()
+            if proxied is not None:
+                return [
+                    {
+                        'id': (node.get('user') or {}).get('id') or node_id,
+                        'name': (node.get('user') or {}).get('longName', ''),
+                        'short': (node.get('user') or {}).get('shortName', ''),
+                    }
+                    for node_id, node in proxied.items()
+                ]
+
         try:
             with self.with_connection(max_retries=max_retries) as iface:
                 nodes = []
@@ -369,6 +416,13 @@ class MeshtasticConnectionManager:
         Returns:
             True if sent successfully, False on error
         """
+        if self._proxy_endpoint():
+            try:
+                return bool(api_request('send_text', text=text, to=destination).get('ok'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to send message via proxy: {e}")
+                return False
+
         try:
             with self.with_connection(max_retries=max_retries) as iface:
                 if destination == '^all':
@@ -0,0 +1,713 @@
+"""
+Meshtastic Multiplexing Proxy
+
+meshtasticd accepts a single TCP client. Every MeshForge UI (GTK map,
+web, TUI, gateway) used to take turns on that slot under a global lock,
+with cooldown sleeps and a full config download per session.
+
+The proxy holds the one upstream connection permanently, decodes the
+FromRadio stream once, and serves any number of local clients:
+
+- Stream port (default 4404): speaks the Meshtastic TCP protocol, so
+  meshtastic.tcp_interface.TCPInterface(hostname, portNumber=4404)
+  works unchanged. want_config_id is answered instantly from the
+  proxy's cache and live node DB; packets and log records are fanned
+  out to every client; writes from all clients go upstream in order.
+- API port (default 4405): JSON lines for callers that only need data:
+  {"cmd": "nodes"}, {"cmd": "info"}, {"cmd": "send_text", "text": ...},
+  {"cmd": "subscribe"} for a packet/node event stream.
+
+Usage:
+    cd src && python3 -m utils.meshtastic_proxy
+    cd src && python3 -m utils.meshtastic_proxy --upstream 192.168.1.20:4403
+
+    # From other code
+    endpoint = get_proxy_endpoint('localhost', 4403)  # (host, port) or None
+    nodes = api_request('nodes')['nodes']
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.meshtastic_stream import (
+    CONFIG_KINDS,
+    FR_CONFIG_COMPLETE_ID,
+    FR_NODE_INFO,
+    NI_DEVICE_METRICS,
+    NI_HOPS_AWAY,
+    NI_LAST_HEARD,
+    NI_NUM,
+    NI_POSITION,
+    NI_SNR,
+    NI_USER,
+    NI_VIA_MQTT,
+    TM_DEVICE_METRICS,
+    FrameDecoder,
+    ProtocolError,
+    decode_from_radio,
+    decode_mesh_packet,
+    decode_my_info,
+    decode_node_info,
+    decode_to_radio,
+    encode_bytes,
+    encode_fixed32,
+    encode_float,
+    encode_from_radio,
+    encode_varint,
+    frame,
+    heartbeat,
+    iter_fields,
+    node_id,
+    parse_node_id,
+    split_fields,
+    text_packet,
+    want_config,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPSTREAM_HOST = '127.0.0.1'
+DEFAULT_UPSTREAM_PORT = 4403
+DEFAULT_STREAM_PORT = 4404
+DEFAULT_API_PORT = 4405
+
+# Upstream keepalive (meshtasticd drops idle clients after ~15 min)
+HEARTBEAT_INTERVAL = 300.0
+# Give up on a config download and reconnect after this long
+CONFIG_TIMEOUT = 30.0
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 30.0
+
+# Per-client outbound queue; a client this far behind is dropped
+CLIENT_QUEUE_SIZE = 2000
+UPSTREAM_QUEUE_SIZE = 256
+# An API send waits this long for room in the upstream queue
+UPSTREAM_SEND_TIMEOUT = 5.0
+
+# How long get_proxy_endpoint() trusts a probe result; nothing listening
+# on the API port (no proxy installed/running) is trusted for longer
+ENDPOINT_CACHE_SEC = 5.0
+ENDPOINT_ABSENT_CACHE_SEC = 60.0
+
+_LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1', '')
+
+
+def _json_safe(value):
+    """Bytes -> base64 so packets can go out as JSON."""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+class _Client:
+    """A connected stream or API client with its own outbound queue."""
+
+    def __init__(self, writer: asyncio.StreamWriter, kind: str):
+        self.writer = writer
+        self.kind = kind
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        peer = writer.get_extra_info('peername')
+        self.name = f"{kind}:{peer[0]}:{peer[1]}" if peer else kind
+        self.task: Optional[asyncio.Task] = None
+
+    def send(self, data: bytes) -> bool:
+        """Queue bytes for this client; False if it has fallen too far behind."""
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def pump(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is None:
+                    break
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.writer.close()
+
+
+class MeshtasticProxy:
+    """
+    One upstream meshtasticd session shared by many local clients.
+
+    Run it with serve_forever() inside an event loop, or start()/stop()
+    to host it on a background thread.
+    """
+
+    def __init__(self, upstream_host: str = DEFAULT_UPSTREAM_HOST,
+                 upstream_port: int = DEFAULT_UPSTREAM_PORT,
+                 listen_host: str = '127.0.0.1',
+                 stream_port: int = DEFAULT_STREAM_PORT,
+                 api_port: int = DEFAULT_API_PORT,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.listen_host = listen_host
+        self.stream_port = stream_port
+        self.api_port = api_port
+        self.heartbeat_interval = heartbeat_interval
+
+        # Config replay cache from the last completed download
+        self._config_frames: List[bytes] = []
+        self._session_frames: Optional[List[bytes]] = None
+        self._session_nodes: Dict[int, Dict[int, bytes]] = {}
+        self._nonce = 0
+        self._session_started = 0.0
+        self.my_info: Dict[str, Any] = {}
+
+        # Live node DB: num -> NodeInfo fields (encoded), decoded lazily
+        self._nodes: Dict[int, Dict[int, bytes]] = {}
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+
+        self._clients: Set[_Client] = set()
+        self._subscribers: Set[_Client] = set()
+        self._upstream_queue: Optional[asyncio.Queue] = None
+        self._upstream_writer: Optional[asyncio.StreamWriter] = None
+        self._config_ready: Optional[asyncio.Event] = None
+        self._connected: Optional[asyncio.Event] = None
+        self._servers: list = []
+        self._tasks: List[asyncio.Task] = []
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+
+        self.stats = {
+            'upstream_connects': 0, 'config_downloads': 0, 'frames_from_radio': 0,
+            'frames_to_radio': 0, 'clients_served': 0, 'clients_dropped': 0,
+            'config_replays': 0,
+        }
+
+    # === Lifecycle ===
+
+    async def serve_forever(self):
+        """Open the listeners and keep the upstream session alive until stop()."""
+        self._loop = asyncio.get_running_loop()
+        self._upstream_queue = asyncio.Queue(maxsize=UPSTREAM_QUEUE_SIZE)
+        self._config_ready = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+        self._servers = [
+            await asyncio.start_server(self._handle_stream_client,
+                                       self.listen_host, self.stream_port),
+            await asyncio.start_server(self._handle_api_client,
+                                       self.listen_host, self.api_port),
+        ]
+        # Pick up OS-assigned ports (port 0)
+        self.stream_port = self._servers[0].sockets[0].getsockname()[1]
+        self.api_port = self._servers[1].sockets[0].getsockname()[1]
+        logger.info(f"Meshtastic proxy: {self.upstream_host}:{self.upstream_port} -> "
+                    f"stream {self.listen_host}:{self.stream_port}, api {self.api_port}")
+
+        self._tasks = [asyncio.ensure_future(self._upstream_loop()),
+                       asyncio.ensure_future(self._heartbeat_loop())]
+        # A "no proxy" probe result from this process is now stale
+        with _endpoint_lock:
+            _endpoint_cache.clear()
+        self._started.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        for server in self._servers:
+            server.close()
+        for task in self._tasks:
+            task.cancel()
+        for client in list(self._clients | self._subscribers):
+            client.send(None)
+            if client.task:
+                client.task.cancel()
+        if self._upstream_writer:
+            self._upstream_writer.close()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """Run the proxy on a daemon thread; returns once it is listening."""
+        if self._thread and self._thread.is_alive():
+            return True
+        self._started.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.serve_forever()),
+                                        daemon=True, name="meshtastic-proxy")
+        self._thread.start()
+        return self._started.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Close listeners and the upstream session."""
+        if self._loop and self._stopping and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self._connected and self._connected.is_set())
+
+    # === Upstream ===
+
+    async def _upstream_loop(self):
+        delay = RECONNECT_MIN
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.upstream_host,
+                                                               self.upstream_port)
+            except OSError as e:
+                logger.debug(f"Upstream {self.upstream_host}:{self.upstream_port} "
+                             f"unavailable: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX)
+                continue
+
+            delay = RECONNECT_MIN
+            self.stats['upstream_connects'] += 1
+            self._upstream_writer = writer
+            self._connected.set()
+            # The previous cache keeps answering clients until this download completes
+            logger.info(f"Connected to meshtasticd at {self.upstream_host}:{self.upstream_port}")
+            sender = asyncio.ensure_future(self._upstream_sender(writer))
+            try:
+                self._request_config()
+                await self._read_upstream(reader)
+            except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+                logger.warning(f"Upstream connection lost: {e}")
+            finally:
+                self._connected.clear()
+                self._upstream_writer = None
+                self._session_frames = None
+                sender.cancel()
+                writer.close()
+            await asyncio.sleep(delay)
+
+    def _request_config(self):
+        """Start a config download; clients keep the old cache until it completes."""
+        self._nonce = int.from_bytes(os.urandom(4), 'little') or 1
+        self._session_frames = []
+        self._session_nodes = {}
+        self._session_started = time.monotonic()
+        # Written directly (whole frames, same loop) so it never waits behind client writes
+        self._upstream_writer.write(frame(want_config(self._nonce)))
+        self.stats['frames_to_radio'] += 1
+
+    async def _upstream_sender(self, writer: asyncio.StreamWriter):
+        """Single writer: ToRadio from every client goes out in arrival order."""
+        while True:
+            payload = await self._upstream_queue.get()
+            writer.write(frame(payload))
+            await writer.drain()
+            self.stats['frames_to_radio'] += 1
+
+    async def _read_upstream(self, reader: asyncio.StreamReader):
+        decoder = FrameDecoder()
+        while True:
+            timeout = None
+            if self._session_frames is not None:
+                timeout = max(1.0, CONFIG_TIMEOUT - (time.monotonic() - self._session_started))
+            data = await asyncio.wait_for(reader.read(4096), timeout)
+            if not data:
+                raise ConnectionError("meshtasticd closed the connection")
+            for payload in decoder.feed(data):
+                self.stats['frames_from_radio'] += 1
+                try:
+                    self._on_from_radio(payload)
+                except ProtocolError as e:
+                    logger.debug(f"Undecodable FromRadio frame: {e}")
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if self.is_connected:
+                try:
+                    self._upstream_queue.put_nowait(heartbeat())
+                except asyncio.QueueFull:
+                    pass
+
+    def _on_from_radio(self, payload: bytes):
+        kind, value = decode_from_radio(payload)
+
+        if kind in CONFIG_KINDS:
+            self._on_config_frame(kind, value, payload)
+            return
+
+        if kind == 'packet':
+            try:
+                packet = decode_mesh_packet(value)
+            except ProtocolError:
+                packet = None
+            if packet:
+                self._update_node(packet, value)
+                self._publish({'event': 'packet', 'packet': packet})
+        elif kind == 'rebooted':
+            logger.info("Radio rebooted; refreshing config")
+            self._request_config()
+
+        data = frame(payload)
+        for client in list(self._clients):
+            if not client.send(data):
+                self._drop(client, "too far behind")
+
+    def _on_config_frame(self, kind: str, value, payload: bytes):
+        if self._session_frames is None:
+            # Unsolicited config: only node info is worth keeping
+            if kind == 'node_info':
+                self._store_node_info(self._nodes, value)
+            return
+
+        if kind == 'config_complete_id':
+            if value != self._nonce:
+                return
+            self._config_frames = self._session_frames
+            self._session_frames = None
+            # Nodes heard during the download are newer than their config entry
+            for num, fields in self._nodes.items():
+                self._session_nodes.setdefault(num, {}).update(fields)
+            self._nodes = self._session_nodes
+            self._decoded.clear()
+            self.stats['config_downloads'] += 1
+            self._config_ready.set()
+            logger.info(f"Config cached: {len(self._config_frames)} frames, "
+                        f"{len(self._nodes)} nodes")
+            self._publish({'event': 'config', 'nodes': len(self._nodes)})
+        elif kind == 'node_info':
+            self._store_node_info(self._session_nodes, value)
+        else:
+            if kind == 'my_info':
+                self.my_info = decode_my_info(value)
+            self._session_frames.append(payload)
+
+    def _store_node_info(self, table: Dict[int, Dict[int, bytes]], value: bytes):
+        num = next((item for field, _wt, item in iter_fields(value) if field == NI_NUM), None)
+        if num is None:
+            return
+        table[num] = split_fields(value)
+        self._decoded.pop(num, None)
+
+    def _update_node(self, packet: Dict[str, Any], raw: bytes):
+        """Fold what a packet says about its sender into the node DB."""
+        num = packet.get('from')
+        if not num:
+            return
+        fields = self._nodes.get(num)
+        if fields is None:
+            fields = self._nodes[num] = {NI_NUM: encode_varint(NI_NUM, num)}
+        fields[NI_LAST_HEARD] = encode_fixed32(NI_LAST_HEARD,
+                                               packet.get('rxTime') or int(time.time()))
+        via_mqtt = packet.get('viaMqtt', False)
+        fields[NI_VIA_MQTT] = encode_varint(NI_VIA_MQTT, 1) if via_mqtt else b''
+        if 'rxSnr' in packet and not via_mqtt:
+            fields[NI_SNR] = encode_float(NI_SNR, packet['rxSnr'])
+        hop_start, hop_limit = packet.get('hopStart'), packet.get('hopLimit')
+        if hop_start is not None and hop_limit is not None and hop_start >= hop_limit:
+            fields[NI_HOPS_AWAY] = encode_varint(NI_HOPS_AWAY, hop_start - hop_limit)
+
+        decoded = packet.get('decoded') or {}
+        portnum = decoded.get('portnum')
+        payload = decoded.get('payload', b'')
+        if portnum == 'NODEINFO_APP' and 'user' in decoded:
+            fields[NI_USER] = encode_bytes(NI_USER, payload)
+        elif portnum == 'POSITION_APP' and decoded.get('position', {}).get('latitudeI'):
+            fields[NI_POSITION] = encode_bytes(NI_POSITION, payload)
+        elif portnum == 'TELEMETRY_APP' and 'telemetry' in decoded:
+            for field, _wt, value in iter_fields(payload):
+                if field == TM_DEVICE_METRICS:
+                    fields[NI_DEVICE_METRICS] = encode_bytes(NI_DEVICE_METRICS, value)
+        self._decoded.pop(num, None)
+        if portnum in ('NODEINFO_APP', 'POSITION_APP', 'TELEMETRY_APP'):
+            self._publish({'event': 'node', 'id': node_id(num), 'node': self._node_dict(num)})
+
+    def _node_bytes(self, num: int) -> bytes:
+        fields = self._nodes[num]
+        return b''.join(fields[f] for f in sorted(fields))
+
+    def _node_dict(self, num: int) -> Dict[str, Any]:
+        node = self._decoded.get(num)
+        if node is None:
+            try:
+                node = decode_node_info(self._node_bytes(num))
+            except ProtocolError:
+                node = {'num': num}
+            self._decoded[num] = node
+        return node
+
+    # === Stream clients ===
+
+    async def _handle_stream_client(self, reader: asyncio.StreamReader,
+                                    writer: asyncio.StreamWriter):
+        client = _Client(writer, 'stream')
+        client.task = asyncio.ensure_future(client.pump())
+        self._clients.add(client)
+        self.stats['clients_served'] += 1
+        logger.debug(f"Client connected: {client.name}")
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for payload in decoder.feed(data):
+                    if not await self._on_to_radio(client, payload):
+                        return
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._drop(client)
+            logger.debug(f"Client disconnected: {client.name}")
+
+    async def _on_to_radio(self, client: _Client, payload: bytes) -> bool:
+        """Handle one ToRadio from a client; False closes the client."""
+        try:
+            kind, value = decode_to_radio(payload)
+        except ProtocolError:
+            return True
+        if kind == 'want_config_id':
+            return await self._replay_config(client, value)
+        elif kind == 'disconnect':
+            return False
+        elif kind == 'heartbeat':
+            pass  # the proxy keeps the upstream session alive itself
+        elif kind is not None:
+            await self._upstream_queue.put(payload)
+        return True
+
+    async def _replay_config(self, client: _Client, nonce: int) -> bool:
+        """Answer want_config_id from the cache - no upstream round trip.
+
+        Returns False (client closed) if no config arrives in time.
+        """
+        try:
+            await asyncio.wait_for(self._config_ready.wait(), CONFIG_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._drop(client, "no config from meshtasticd")
+            return False
+        self.stats['config_replays'] += 1
+        frames = [frame(p) for p in self._config_frames]
+        # Own node first, as the radio sends it
+        my_num = self.my_info.get('myNodeNum')
+        nums = sorted(self._nodes, key=lambda n: (n != my_num, n))
+        frames.extend(frame(encode_bytes(FR_NODE_INFO, self._node_bytes(num))) for num in nums)
+        frames.append(frame(encode_from_radio(FR_CONFIG_COMPLETE_ID, nonce)))
+        for data in frames:
+            if not client.send(data):
+                self._drop(client, "too far behind")
+                return False
+        return True
+
+    def _drop(self, client: _Client, reason: str = ''):
+        """Forget a client; with a reason (it fell behind) close it at once."""
+        if client not in self._clients and client not in self._subscribers:
+            return
+        self._clients.discard(client)
+        self._subscribers.discard(client)
+        if reason:
+            self.stats['clients_dropped'] += 1
+            logger.warning(f"Dropping {client.name}: {reason}")
+        if reason or not client.send(None):
+            client.task.cancel()
+            client.writer.close()
+
+    # === JSON API ===
+
+    async def _handle_api_client(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        client = _Client(writer, 'api')
+        client.task = asyncio.ensure_future(client.pump())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be an object")
+                    response = await self._api_call(client, request)
+                except (ValueError, KeyError, TypeError, ProtocolError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                client.send(json.dumps(_json_safe(response)).encode() + b'\n')
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._subscribers.discard(client)
+            if not client.send(None):
+                client.task.cancel()
+                client.writer.close()
+
+    async def _api_call(self, client: _Client, request: Dict[str, Any]) -> Dict[str, Any]:
+        cmd = request.get('cmd')
+        if cmd == 'ping':
+            return {'ok': True, 'connected': self.is_connected,
+                    'config_ready': self._config_ready.is_set(),
+                    'stream_port': self.stream_port, 'clients': len(self._clients)}
+        if cmd == 'nodes':
+            return {'ok': True, 'connected': self.is_connected,
+                    'nodes': {node_id(num): self._node_dict(num) for num in list(self._nodes)}}
+        if cmd == 'info':
+            my_num = self.my_info.get('myNodeNum')
+            return {'ok': True, 'connected': self.is_connected,
+                    'upstream': f"{self.upstream_host}:{self.upstream_port}",
+                    'my_info': self.my_info,
+                    'my_node': self._node_dict(my_num) if my_num in self._nodes else None,
+                    'node_count': len(self._nodes), 'clients': len(self._clients),
+                    'stats': dict(self.stats)}
+        if cmd == 'send_text':
+            text = request['text']
+            payload = text_packet(text, to=parse_node_id(request.get('to', '^all')),
+                                  channel=int(request.get('channel', 0)),
+                                  want_ack=bool(request.get('want_ack', False)))
+            return await self._api_send(payload)
+        if cmd == 'to_radio':
+            return await self._api_send(base64.b64decode(request['payload']))
+        if cmd == 'subscribe':
+            self._subscribers.add(client)
+            return {'ok': True, 'subscribed': True}
+        raise ValueError(f"unknown cmd {cmd!r}")
+
+    async def _api_send(self, payload: bytes) -> Dict[str, Any]:
+        if not self.is_connected:
+            return {'ok': False, 'error': 'meshtasticd not connected'}
+        try:
+            await asyncio.wait_for(self._upstream_queue.put(payload), UPSTREAM_SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            return {'ok': False, 'error': 'upstream busy'}
+        return {'ok': True}
+
+    def _publish(self, event: Dict[str, Any]):
+        if not self._subscribers:
+            return
+        line = json.dumps(_json_safe(event)).encode() + b'\n'
+        for client in list(self._subscribers):
+            if not client.send(line):
+                self._drop(client, "event subscriber too far behind")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats.update(connected=self.is_connected, nodes=len(self._nodes),
+                     clients=len(self._clients), subscribers=len(self._subscribers))
+        return stats
+
+
+# ============================================================================
+# Client helpers
+# ============================================================================
+
+# (host, api_port) -> (expires, endpoint)
+_endpoint_cache: Dict[Tuple[str, int], Tuple[float, Optional[Tuple[str, int]]]] = {}
+_endpoint_lock = threading.Lock()
+
+
+def api_request(cmd: str, host: str = '127.0.0.1', port: int = DEFAULT_API_PORT,
+                timeout: float = 2.0, **params) -> Dict[str, Any]:
+    """
+    One request/response on the proxy's JSON API.
+
+    Raises:
+        OSError: proxy not reachable
+        ValueError: bad response
+    """
+    request = dict(params, cmd=cmd)
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b'\n'):
+                break
+    if not chunks:
+        raise ValueError("empty response from proxy")
+    return json.loads(b''.join(chunks))
+
+
+def get_proxy_endpoint(host: str = 'localhost', port: int = DEFAULT_UPSTREAM_PORT,
+                       api_port: int = DEFAULT_API_PORT) -> Optional[Tuple[str, int]]:
+    """
+    Where to connect instead of meshtasticd at host:port, if a proxy runs.
+
+    Only a local meshtasticd on its standard port is redirected; the
+    probe result is cached for a few seconds, or for a minute when no
+    proxy is listening at all.
+    """
+    if host not in _LOCAL_HOSTS or port != DEFAULT_UPSTREAM_PORT:
+        return None
+    key = (host, api_port)
+    now = time.monotonic()
+    with _endpoint_lock:
+        cached = _endpoint_cache.get(key)
+        if cached and now < cached[0]:
+            return cached[1]
+    endpoint = None
+    ttl = ENDPOINT_CACHE_SEC
+    try:
+        reply = api_request('ping', port=api_port, timeout=0.5)
+        if reply.get('ok') and reply.get('connected'):
+            endpoint = ('127.0.0.1', int(reply['stream_port']))
+    except ConnectionRefusedError:
+        ttl = ENDPOINT_ABSENT_CACHE_SEC
+    except (OSError, ValueError, KeyError):
+        pass
+    with _endpoint_lock:
+        _endpoint_cache[key] = (now + ttl, endpoint)
+    return endpoint
+
+
+def get_proxy_nodes(api_port: int = DEFAULT_API_PORT) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Live node DB from a running proxy, or None if there is none."""
+    try:
+        reply = api_request('nodes', port=api_port)
+    except (OSError, ValueError):
+        return None
+    return reply.get('nodes') if reply.get('ok') else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Share one meshtasticd connection between clients")
+    parser.add_argument('--upstream', default=f"{DEFAULT_UPSTREAM_HOST}:{DEFAULT_UPSTREAM_PORT}",
+                        help="meshtasticd host:port")
+    parser.add_argument('--listen', default='127.0.0.1', help="Address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_STREAM_PORT,
+                        help="Meshtastic protocol port for clients")
+    parser.add_argument('--api-port', type=int, default=DEFAULT_API_PORT, help="JSON API port")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    host, _, port = args.upstream.rpartition(':')
+    proxy = MeshtasticProxy(upstream_host=host or args.upstream,
+                            upstream_port=int(port) if port.isdigit() else DEFAULT_UPSTREAM_PORT,
+                            listen_host=args.listen, stream_port=args.port,
+                            api_port=args.api_port)
+    try:
+        asyncio.run(proxy.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,612 @@
+"""
+Meshtastic Stream Protocol - framing and a minimal protobuf wire codec
+
+meshtasticd (and serial radios) speak the Meshtastic stream protocol:
+each protobuf message is framed as
+
+    0x94 0xC3 <len_hi> <len_lo> <payload: ToRadio or FromRadio>
+
+with anything between frames being firmware debug text. This module
+splits and builds frames and reads the handful of protobuf fields
+MeshForge needs (node DB, packet headers, text/position/telemetry)
+without requiring the meshtastic or protobuf packages.
+
+Decoded dicts use the same camelCase shape as the meshtastic Python
+library (interface.nodes / pubsub packets), so existing parsers such as
+NodeMonitor._parse_node_data() accept them unchanged.
+
+Usage:
+    decoder = FrameDecoder()
+    for payload in decoder.feed(sock.recv(4096)):
+        kind, value = decode_from_radio(payload)
+"""
+
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Frame header
+START1 = 0x94
+START2 = 0xC3
+HEADER_LEN = 4
+MAX_PAYLOAD = 512  # firmware MAX_TO_FROM_RADIO_SIZE
+
+BROADCAST_NUM = 0xFFFFFFFF
+
+# Wire types
+WT_VARINT = 0
+WT_FIXED64 = 1
+WT_LEN = 2
+WT_FIXED32 = 5
+
+# FromRadio fields (mesh.proto)
+FR_ID = 1
+FR_PACKET = 2
+FR_MY_INFO = 3
+FR_NODE_INFO = 4
+FR_CONFIG = 5
+FR_LOG_RECORD = 6
+FR_CONFIG_COMPLETE_ID = 7
+FR_REBOOTED = 8
+FR_MODULE_CONFIG = 9
+FR_CHANNEL = 10
+FR_QUEUE_STATUS = 11
+FR_XMODEM = 12
+FR_METADATA = 13
+FR_MQTT_PROXY = 14
+FR_FILE_INFO = 15
+FR_CLIENT_NOTIFICATION = 16
+FR_DEVICEUI_CONFIG = 17
+
+FROM_RADIO_KINDS = {
+    FR_PACKET: 'packet', FR_MY_INFO: 'my_info', FR_NODE_INFO: 'node_info',
+    FR_CONFIG: 'config', FR_LOG_RECORD: 'log_record',
+    FR_CONFIG_COMPLETE_ID: 'config_complete_id', FR_REBOOTED: 'rebooted',
+    FR_MODULE_CONFIG: 'module_config', FR_CHANNEL: 'channel',
+    FR_QUEUE_STATUS: 'queue_status', FR_XMODEM: 'xmodem', FR_METADATA: 'metadata',
+    FR_MQTT_PROXY: 'mqtt_proxy', FR_FILE_INFO: 'file_info',
+    FR_CLIENT_NOTIFICATION: 'client_notification', FR_DEVICEUI_CONFIG: 'deviceui_config',
+}
+
+# Frames that only appear in answer to want_config_id
+CONFIG_KINDS = frozenset(('my_info', 'node_info', 'config', 'module_config', 'channel',
+                          'metadata', 'file_info', 'deviceui_config', 'config_complete_id'))
+
+# ToRadio fields
+TR_PACKET = 1
+TR_WANT_CONFIG_ID = 3
+TR_DISCONNECT = 4
+TR_XMODEM = 5
+TR_MQTT_PROXY = 6
+TR_HEARTBEAT = 7
+
+TO_RADIO_KINDS = {
+    TR_PACKET: 'packet', TR_WANT_CONFIG_ID: 'want_config_id', TR_DISCONNECT: 'disconnect',
+    TR_XMODEM: 'xmodem', TR_MQTT_PROXY: 'mqtt_proxy', TR_HEARTBEAT: 'heartbeat',
+}
+
+# NodeInfo fields
+NI_NUM = 1
+NI_USER = 2
+NI_POSITION = 3
+NI_SNR = 4
+NI_LAST_HEARD = 5
+NI_DEVICE_METRICS = 6
+NI_CHANNEL = 7
+NI_VIA_MQTT = 8
+NI_HOPS_AWAY = 9
+
+# Telemetry fields
+TM_DEVICE_METRICS = 2
+TM_ENVIRONMENT_METRICS = 3
+
+PORTNUMS = {
+    0: 'UNKNOWN_APP', 1: 'TEXT_MESSAGE_APP', 2: 'REMOTE_HARDWARE_APP', 3: 'POSITION_APP',
+    4: 'NODEINFO_APP', 5: 'ROUTING_APP', 6: 'ADMIN_APP', 7: 'TEXT_MESSAGE_COMPRESSED_APP',
+    8: 'WAYPOINT_APP', 9: 'AUDIO_APP', 10: 'DETECTION_SENSOR_APP', 11: 'ALERT_APP',
+    32: 'REPLY_APP', 33: 'IP_TUNNEL_APP', 34: 'PAXCOUNTER_APP', 64: 'SERIAL_APP',
+    65: 'STORE_FORWARD_APP', 66: 'RANGE_TEST_APP', 67: 'TELEMETRY_APP', 68: 'ZPS_APP',
+    69: 'SIMULATOR_APP', 70: 'TRACEROUTE_APP', 71: 'NEIGHBORINFO_APP', 72: 'ATAK_PLUGIN',
+    73: 'MAP_REPORT_APP', 74: 'POWERSTRESS_APP', 76: 'RETICULUM_TUNNEL_APP',
+    77: 'CAYENNE_APP', 256: 'PRIVATE_APP', 257: 'ATAK_FORWARDER',
+}
+PORTNUM_VALUES = {name: num for num, name in PORTNUMS.items()}
+
+ROLES = {
+    0: 'CLIENT', 1: 'CLIENT_MUTE', 2: 'ROUTER', 3: 'ROUTER_CLIENT', 4: 'REPEATER',
+    5: 'TRACKER', 6: 'SENSOR', 7: 'TAK', 8: 'CLIENT_HIDDEN', 9: 'LOST_AND_FOUND',
+    10: 'TAK_TRACKER', 11: 'ROUTER_LATE',
+}
+
+_hw_names = None
+
+
+def hw_model_name(value: int) -> str:
+    """HardwareModel enum name (from the meshtastic package when installed)."""
+    global _hw_names
+    if _hw_names is None:
+        try:
+            try:
+                from meshtastic.protobuf import mesh_pb2
+            except ImportError:
+                from meshtastic import mesh_pb2
+            _hw_names = {v.number: v.name for v in mesh_pb2.HardwareModel.DESCRIPTOR.values}
+        except Exception:
+            _hw_names = {0: 'UNSET', 4: 'TBEAM', 7: 'T_ECHO', 9: 'RAK4631',
+                         37: 'PORTDUINO', 43: 'HELTEC_V3', 255: 'PRIVATE_HW'}
+    return _hw_names.get(value, str(value))
+
+
+class ProtocolError(ValueError):
+    """Malformed frame or protobuf payload."""
+    pass
+
+
+# ============================================================================
+# Framing
+# ============================================================================
+
+def frame(payload: bytes) -> bytes:
+    """Wrap one serialized ToRadio/FromRadio in a stream frame."""
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"payload of {len(payload)} bytes exceeds {MAX_PAYLOAD}")
+    return bytes((START1, START2, len(payload) >> 8, len(payload) & 0xFF)) + payload
+
+
+class FrameDecoder:
+    """
+    Incremental frame splitter.
+
+    Bytes outside frames (firmware debug output) and frames with an
+    impossible length are skipped, resynchronising on the next header.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.skipped = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes; return the complete payloads now available."""
+        buf = self._buf
+        buf += data
+        payloads = []
+        pos = 0
+        end = len(buf)
+        while True:
+            start = buf.find(START1, pos)
+            if start < 0:
+                self.skipped += end - pos
+                pos = end
+                break
+            self.skipped += start - pos
+            pos = start
+            if end - pos < 2:
+                break
+            if buf[pos + 1] != START2:
+                self.skipped += 1
+                pos += 1
+                continue
+            if end - pos < HEADER_LEN:
+                break
+            length = (buf[pos + 2] << 8) | buf[pos + 3]
+            if length > MAX_PAYLOAD:
+                self.skipped += 1
+                pos += 1
+                continue
+            if end - pos < HEADER_LEN + length:
+                break
+            payloads.append(bytes(buf[pos + HEADER_LEN:pos + HEADER_LEN + length]))
+            pos += HEADER_LEN + length
+        del buf[:pos]
+        return payloads
+
+
+# ============================================================================
+# Protobuf wire format
+# ============================================================================
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise ProtocolError("truncated varint")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise ProtocolError("varint too long")
+
+
+def iter_fields(buf: bytes) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield (field_number, wire_type, value) for each field in a message.
+
+    Varints and fixed ints come back as unsigned ints, length-delimited
+    fields as bytes.
+    """
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == WT_VARINT:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == WT_LEN:
+            length, pos = _read_varint(buf, pos)
+            if pos + length > end:
+                raise ProtocolError("truncated field")
+            value = bytes(buf[pos:pos + length])
+            pos += length
+        elif wire_type == WT_FIXED32:
+            if pos + 4 > end:
+                raise ProtocolError("truncated fixed32")
+            value = int.from_bytes(buf[pos:pos + 4], 'little')
+            pos += 4
+        elif wire_type == WT_FIXED64:
+            if pos + 8 > end:
+                raise ProtocolError("truncated fixed64")
+            value = int.from_bytes(buf[pos:pos + 8], 'little')
+            pos += 8
+        else:
+            raise ProtocolError(f"unsupported wire type {wire_type}")
+        yield field, wire_type, value
+
+
+def split_fields(buf: bytes) -> Dict[int, bytes]:
+    """
+    Map field number -> that field's encoded bytes (key included).
+
+    Re-joining the values re-creates the message, so single fields can
+    be replaced without knowing the rest of the schema.
+    """
+    fields: Dict[int, bytes] = {}
+    start = 0
+    for field, _wire_type, end in _iter_spans(buf):
+        fields[field] = fields.get(field, b'') + bytes(buf[start:end])
+        start = end
+    return fields
+
+
+def _iter_spans(buf: bytes) -> Iterator[Tuple[int, int, int]]:
+    """Yield (field, wire_type, end offset) per field."""
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == WT_VARINT:
+            _, pos = _read_varint(buf, pos)
+        elif wire_type == WT_LEN:
+            length, pos = _read_varint(buf, pos)
+            pos += length
+        elif wire_type == WT_FIXED32:
+            pos += 4
+        elif wire_type == WT_FIXED64:
+            pos += 8
+        else:
+            raise ProtocolError(f"unsupported wire type {wire_type}")
+        if pos > end:
+            raise ProtocolError("truncated field")
+        yield field, wire_type, pos
+
+
+def _varint(value: int) -> bytes:
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_varint(field: int, value: int) -> bytes:
+    return _varint(field << 3 | WT_VARINT) + _varint(int(value))
+
+
+def encode_bytes(field: int, value: bytes) -> bytes:
+    return _varint(field << 3 | WT_LEN) + _varint(len(value)) + value
+
+
+def encode_fixed32(field: int, value: int) -> bytes:
+    return _varint(field << 3 | WT_FIXED32) + struct.pack('<I', value & 0xFFFFFFFF)
+
+
+def encode_float(field: int, value: float) -> bytes:
+    return _varint(field << 3 | WT_FIXED32) + struct.pack('<f', value)
+
+
+def _int32(value: int) -> int:
+    """Varint-encoded int32/int64 -> signed."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _sfixed32(value: int) -> int:
+    return value - (1 << 32) if value >= 1 << 31 else value
+
+
+def _float(value: int) -> float:
+    return round(struct.unpack('<f', struct.pack('<I', value))[0], 6)
+
+
+# ============================================================================
+# Message decoders (camelCase dicts, as the meshtastic library returns)
+# ============================================================================
+
+def node_id(num: int) -> str:
+    """Node number -> '!abcd1234' (or '^all' for broadcast)."""
+    return '^all' if num == BROADCAST_NUM else f"!{num:08x}"
+
+
+def decode_user(buf: bytes) -> Dict[str, Any]:
+    user: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            user['id'] = value.decode('utf-8', 'replace')
+        elif field == 2:
+            user['longName'] = value.decode('utf-8', 'replace')
+        elif field == 3:
+            user['shortName'] = value.decode('utf-8', 'replace')
+        elif field == 5:
+            user['hwModel'] = hw_model_name(value)
+        elif field == 6:
+            user['isLicensed'] = bool(value)
+        elif field == 7:
+            user['role'] = ROLES.get(value, str(value))
+    return user
+
+
+def decode_position(buf: bytes) -> Dict[str, Any]:
+    position: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            position['latitudeI'] = _sfixed32(value)
+            position['latitude'] = position['latitudeI'] / 1e7
+        elif field == 2:
+            position['longitudeI'] = _sfixed32(value)
+            position['longitude'] = position['longitudeI'] / 1e7
+        elif field == 3:
+            position['altitude'] = _int32(value)
+        elif field == 4:
+            position['time'] = value
+        elif field == 23:
+            position['precisionBits'] = value
+    return position
+
+
+def decode_device_metrics(buf: bytes) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    names = {1: 'batteryLevel', 2: 'voltage', 3: 'channelUtilization',
+             4: 'airUtilTx', 5: 'uptimeSeconds'}
+    for field, wire_type, value in iter_fields(buf):
+        name = names.get(field)
+        if name:
+            metrics[name] = _float(value) if wire_type == WT_FIXED32 else value
+    return metrics
+
+
+def decode_environment_metrics(buf: bytes) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    names = {1: 'temperature', 2: 'relativeHumidity', 3: 'barometricPressure',
+             4: 'gasResistance', 5: 'voltage', 6: 'current', 7: 'iaq'}
+    for field, wire_type, value in iter_fields(buf):
+        name = names.get(field)
+        if name:
+            metrics[name] = _float(value) if wire_type == WT_FIXED32 else value
+    return metrics
+
+
+def decode_telemetry(buf: bytes) -> Dict[str, Any]:
+    telemetry: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            telemetry['time'] = value
+        elif field == TM_DEVICE_METRICS:
+            telemetry['deviceMetrics'] = decode_device_metrics(value)
+        elif field == TM_ENVIRONMENT_METRICS:
+            telemetry['environmentMetrics'] = decode_environment_metrics(value)
+    return telemetry
+
+
+def decode_node_info(buf: bytes) -> Dict[str, Any]:
+    """NodeInfo -> the dict shape of interface.nodes[...]"""
+    node: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == NI_NUM:
+            node['num'] = value
+        elif field == NI_USER:
+            node['user'] = decode_user(value)
+        elif field == NI_POSITION:
+            node['position'] = decode_position(value)
+        elif field == NI_SNR:
+            node['snr'] = _float(value)
+        elif field == NI_LAST_HEARD:
+            node['lastHeard'] = value
+        elif field == NI_DEVICE_METRICS:
+            node['deviceMetrics'] = decode_device_metrics(value)
+        elif field == NI_CHANNEL:
+            node['channel'] = value
+        elif field == NI_VIA_MQTT:
+            node['viaMqtt'] = bool(value)
+        elif field == NI_HOPS_AWAY:
+            node['hopsAway'] = value
+    return node
+
+
+def decode_my_info(buf: bytes) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            info['myNodeNum'] = value
+        elif field == 8:
+            info['rebootCount'] = value
+        elif field == 11:
+            info['minAppVersion'] = value
+    return info
+
+
+def decode_data(buf: bytes) -> Dict[str, Any]:
+    """Data (decoded payload) with typed sub-messages for common ports."""
+    decoded: Dict[str, Any] = {'portnum': 'UNKNOWN_APP', 'payload': b''}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            decoded['portnum'] = PORTNUMS.get(value, value)
+        elif field == 2:
+            decoded['payload'] = value
+        elif field == 3:
+            decoded['wantResponse'] = bool(value)
+        elif field == 6:
+            decoded['requestId'] = value
+        elif field == 7:
+            decoded['replyId'] = value
+        elif field == 8:
+            decoded['emoji'] = value
+    portnum = decoded['portnum']
+    payload = decoded['payload']
+    try:
+        if portnum == 'TEXT_MESSAGE_APP':
+            decoded['text'] = payload.decode('utf-8', 'replace')
+        elif portnum == 'POSITION_APP':
+            decoded['position'] = decode_position(payload)
+        elif portnum == 'NODEINFO_APP':
+            decoded['user'] = decode_user(payload)
+        elif portnum == 'TELEMETRY_APP':
+            decoded['telemetry'] = decode_telemetry(payload)
+    except ProtocolError:
+        pass  # keep the raw payload
+    return decoded
+
+
+def decode_mesh_packet(buf: bytes) -> Dict[str, Any]:
+    """MeshPacket -> the dict shape of a meshtastic.receive packet"""
+    packet: Dict[str, Any] = {}
+    for field, _wt, value in iter_fields(buf):
+        if field == 1:
+            packet['from'] = value
+        elif field == 2:
+            packet['to'] = value
+        elif field == 3:
+            packet['channel'] = value
+        elif field == 4:
+            packet['decoded'] = decode_data(value)
+        elif field == 5:
+            packet['encrypted'] = value
+        elif field == 6:
+            packet['id'] = value
+        elif field == 7:
+            packet['rxTime'] = value
+        elif field == 8:
+            packet['rxSnr'] = _float(value)
+        elif field == 9:
+            packet['hopLimit'] = value
+        elif field == 10:
+            packet['wantAck'] = bool(value)
+        elif field == 12:
+            packet['rxRssi'] = _int32(value)
+        elif field == 14:
+            packet['viaMqtt'] = bool(value)
+        elif field == 15:
+            packet['hopStart'] = value
+    if 'from' in packet:
+        packet['fromId'] = node_id(packet['from'])
+    if 'to' in packet:
+        packet['toId'] = node_id(packet['to'])
+    return packet
+
+
+def decode_from_radio(payload: bytes) -> Tuple[Optional[str], Any]:
+    """
+    Classify a FromRadio message.
+
+    Returns:
+        (kind, value) where kind is a FROM_RADIO_KINDS name (None if the
+        message carries no known variant) and value the raw field value
+        (bytes for sub-messages, int for ids)
+    """
+    for field, _wt, value in iter_fields(payload):
+        kind = FROM_RADIO_KINDS.get(field)
+        if kind:
+            return kind, value
+    return None, None
+
+
+def decode_to_radio(payload: bytes) -> Tuple[Optional[str], Any]:
+    """Classify a ToRadio message; see decode_from_radio()."""
+    for field, _wt, value in iter_fields(payload):
+        kind = TO_RADIO_KINDS.get(field)
+        if kind:
+            return kind, value
+    return None, None
+
+
+# ============================================================================
+# Encoders
+# ============================================================================
+
+def encode_from_radio(field: int, value) -> bytes:
+    """FromRadio with a single variant (bytes sub-message or int)."""
+    if isinstance(value, (bytes, bytearray)):
+        return encode_bytes(field, bytes(value))
+    return encode_varint(field, int(value))
+
+
+def want_config(nonce: int) -> bytes:
+    return encode_varint(TR_WANT_CONFIG_ID, nonce)
+
+
+def heartbeat() -> bytes:
+    return encode_bytes(TR_HEARTBEAT, b'')
+
+
+def disconnect() -> bytes:
+    return encode_varint(TR_DISCONNECT, 1)
+
+
+def new_packet_id() -> int:
+    return int.from_bytes(os.urandom(4), 'little') or 1
+
+
+def text_packet(text: str, to: int = BROADCAST_NUM, channel: int = 0,
+                want_ack: bool = False, packet_id: Optional[int] = None) -> bytes:
+    """ToRadio carrying a TEXT_MESSAGE_APP MeshPacket (sender filled in by the radio)."""
+    payload = text.encode('utf-8')
+    if len(payload) > 228:
+        raise ProtocolError("text longer than 228 bytes")
+    return mesh_packet(PORTNUM_VALUES['TEXT_MESSAGE_APP'], payload, to=to, channel=channel,
+                       want_ack=want_ack, packet_id=packet_id)
+
+
+def mesh_packet(portnum: int, payload: bytes, to: int = BROADCAST_NUM, channel: int = 0,
+                want_ack: bool = False, packet_id: Optional[int] = None,
+                hop_limit: Optional[int] = None, want_response: bool = False) -> bytes:
+    """ToRadio carrying a decoded MeshPacket."""
+    data = encode_varint(1, portnum) + encode_bytes(2, payload)
+    if want_response:
+        data += encode_varint(3, 1)
+    packet = encode_fixed32(2, to)
+    if channel:
+        packet += encode_varint(3, channel)
+    packet += encode_bytes(4, data)
+    packet += encode_fixed32(6, packet_id if packet_id is not None else new_packet_id())
+    if hop_limit is not None:
+        packet += encode_varint(9, hop_limit)
+    if want_ack:
+        packet += encode_varint(10, 1)
+    return encode_bytes(TR_PACKET, packet)
+
+
+def parse_node_id(value) -> int:
+    """'!abcd1234', '^all', '0xabcd1234' or an int -> node number."""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if text in ('^all', '', 'all', 'broadcast'):
+        return BROADCAST_NUM
+    if text.startswith('!'):
+        return int(text[1:], 16)
+    return int(text, 0)
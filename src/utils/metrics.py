@@ -0,0 +1,592 @@
+"""
+MeshForge In-Process Metrics Registry
+
+Lightweight counters, gauges and fixed-bucket histograms that gateway
+components record into, rendered as Prometheus text for /metrics.
+
+Histograms use HDR-style log-linear buckets (SUB_BUCKETS per power of
+two) so recording is a bisect into a fixed array - no samples are kept
+and memory is constant regardless of traffic.
+
+Processes share metrics the same way they share gateway state: each
+process can export periodic JSON snapshots to
+~/.local/share/meshforge/metrics/<process>.json, and the web monitor
+merges fresh snapshots into its /metrics output.
+
+Components get the registry from get_metrics() (None when instrumentation
+is switched off) and drop their function metrics with unregister_owner()
+when they stop.
+
+Usage:
+    from utils.metrics import get_metrics
+    metrics = get_metrics()
+
+    metrics.counter('meshforge_bridge_messages_total', 'Bridged messages',
+                    direction='mesh_to_rns').inc()
+    metrics.histogram('meshforge_bridge_latency_seconds', 'Bridge latency',
+                      direction='mesh_to_rns').observe(0.012)
+    metrics.gauge_fn('meshforge_bridge_queue_depth', lambda b: b.queue.qsize(),
+                     'Queued messages', owner=bridge, direction='mesh_to_rns')
+
+    with metrics.timer('meshforge_classifier_seconds', 'Classify time'):
+        classify(...)
+
+    text = render_prometheus(collect_all('web_monitor'))
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Try to import paths helper for proper home directory resolution
+try:
+    from utils.paths import get_real_user_home
+except ImportError:
+    def get_real_user_home() -> Path:
+        sudo_user = os.environ.get('SUDO_USER')
+        if sudo_user and sudo_user != 'root':
+            return Path(f'/home/{sudo_user}')
+        return Path.home()
+
+# Histogram bucket layout (seconds): 10 us .. ~160 s, 2 buckets per octave
+HISTOGRAM_MIN = 1e-5
+HISTOGRAM_MAX = 160.0
+SUB_BUCKETS = 2
+
+# Snapshots older than this are ignored when merging
+SNAPSHOT_MAX_AGE = 120.0
+
+# MESHFORGE_METRICS=0 turns component instrumentation off (see get_metrics)
+METRICS_ENABLED = os.environ.get('MESHFORGE_METRICS', '1') != '0'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _counter_name(name: str) -> str:
+    return name if name.endswith('_total') else name + '_total'
+
+
+def make_buckets(minimum: float = HISTOGRAM_MIN, maximum: float = HISTOGRAM_MAX,
+                 sub_buckets: int = SUB_BUCKETS) -> List[float]:
+    """Log-linear bucket upper bounds from minimum to >= maximum"""
+    bounds = []
+    octave = minimum
+    while octave < maximum:
+        step = octave / sub_buckets
+        for i in range(1, sub_buckets + 1):
+            bounds.append(float(f"{octave + step * i:.6g}"))
+        octave *= 2
+    return bounds
+
+
+DEFAULT_BUCKETS = make_buckets()
+
+
+# ============================================================================
+# Metric Types
+# ============================================================================
+
+class Counter:
+    """Monotonic counter"""
+
+    kind = 'counter'
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self):
+        return [('', self._value)]
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self):
+        return [('', self._value)]
+
+
+class FunctionMetric:
+    """
+    Counter or gauge evaluated at collection time.
+
+    Lets components expose counters they already keep (stats dicts,
+    queue sizes) without touching every increment site. With an owner,
+    fn is called as fn(owner) through a weak reference, so registering
+    does not keep the owner alive; a dead owner yields no samples.
+
+    Several owners can share one (name, labels) key - e.g. two bridges in
+    one process - and their values are summed, like a plain counter that
+    both increment.
+    """
+
+    def __init__(self, kind: str, fn: Callable, owner: Any = None):
+        self.kind = kind
+        self._bindings: List[Tuple[Callable, Optional[weakref.ref]]] = []
+        self.bind(fn, owner)
+
+    def bind(self, fn: Callable, owner: Any = None):
+        """Add owner's fn (replacing any earlier fn for the same owner)"""
+        self.unbind(owner)
+        ref = weakref.ref(owner) if owner is not None else None
+        self._bindings = self._bindings + [(fn, ref)]
+
+    def unbind(self, owner: Any) -> bool:
+        """Remove owner's fn (and any dead owners'); True if none are left"""
+        self._bindings = [(fn, ref) for fn, ref in self._bindings
+                          if ref is not None and ref() is not None and ref() is not owner]
+        return not self._bindings
+
+    @property
+    def owned(self) -> bool:
+        return all(ref is not None for _, ref in self._bindings)
+
+    @property
+    def value(self) -> Optional[float]:
+        total = None
+        for fn, ref in self._bindings:
+            try:
+                if ref is None:
+                    value = fn()
+                else:
+                    owner = ref()
+                    if owner is None:
+                        continue
+                    value = fn(owner)
+            except Exception as e:
+                logger.debug(f"Function metric failed: {e}")
+                continue
+            if value is not None:
+                total = value if total is None else total + value
+        return total
+
+    def samples(self):
+        value = self.value
+        return [] if value is None else [('', value)]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with percentile estimates.
+
+    Buckets are shared upper bounds (see make_buckets); observations above
+    the last bound land in the +Inf bucket.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._min = math.inf
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def percentile(self, pct: float) -> float:
+        """Estimate a percentile (upper bound of the containing bucket)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            maximum = self._max
+        if total == 0:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * total))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                if index >= len(self.buckets):
+                    return maximum
+                return min(self.buckets[index], maximum)
+        return maximum
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'count': self._count,
+                'sum': self._sum,
+                'min': self._min if self._count else 0.0,
+                'max': self._max,
+            }
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            out.append(('_bucket', cumulative, ('le', _format_value(bound))))
+        out.append(('_bucket', total, ('le', '+Inf')))
+        out.append(('_sum', total_sum))
+        out.append(('_count', total))
+        return out
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+class MetricsRegistry:
+    """Process-wide metric store keyed by (name, labels)"""
+
+    def __init__(self):
+        self._families: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._exporter: Optional[threading.Thread] = None
+        self._exporter_stop = threading.Event()
+
+    def _get(self, name: str, kind: str, help_text: str, labels: Dict[str, Any], factory):
+        key = _label_key(labels)
+        family = self._families.get(name)
+        if family is not None and family['type'] == kind:
+            metric = family['metrics'].get(key)
+            if metric is not None:
+                return metric
+        with self._lock:
+            family = self._families.setdefault(name, {
+                'type': kind, 'help': help_text, 'metrics': {},
+            })
+            if family['type'] != kind:
+                raise ValueError(f"Metric {name} already registered as {family['type']}")
+            metric = family['metrics'].get(key)
+            if metric is None:
+                metric = factory()
+                family['metrics'][key] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str = '', **labels) -> Counter:
+        """Get or create a counter (_total is appended to the name)"""
+        return self._get(_counter_name(name), 'counter', help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = '', **labels) -> Gauge:
+        """Get or create a settable gauge"""
+        return self._get(name, 'gauge', help_text, labels, Gauge)
+
+    def counter_fn(self, name: str, fn: Callable, help_text: str = '',
+                   owner: Any = None, **labels) -> FunctionMetric:
+        """Register a counter read from fn at collection time (summed across owners)"""
+        return self._set_fn(_counter_name(name), 'counter', fn, owner, help_text, labels)
+
+    def gauge_fn(self, name: str, fn: Callable, help_text: str = '',
+                 owner: Any = None, **labels) -> FunctionMetric:
+        """Register a gauge read from fn at collection time (summed across owners)"""
+        return self._set_fn(name, 'gauge', fn, owner, help_text, labels)
+
+    def _set_fn(self, name: str, kind: str, fn: Callable, owner: Any,
+                help_text: str, labels: Dict[str, Any]) -> FunctionMetric:
+        with self._lock:
+            family = self._families.setdefault(name, {
+                'type': kind, 'help': help_text, 'metrics': {},
+            })
+            if family['type'] != kind:
+                raise ValueError(f"Metric {name} already registered as {family['type']}")
+            key = _label_key(labels)
+            metric = family['metrics'].get(key)
+            if (owner is not None and isinstance(metric, FunctionMetric)
+                    and metric.owned):
+                # Another instance already reports here: sum them
+                metric.bind(fn, owner)
+            else:
+                # Without an owner, fn replaces whatever was registered
+                metric = FunctionMetric(kind, fn, owner)
+                family['metrics'][key] = metric
+            return metric
+
+    def histogram(self, name: str, help_text: str = '',
+                  buckets: Optional[List[float]] = None, **labels) -> Histogram:
+        """Get or create a histogram"""
+        return self._get(name, 'histogram', help_text, labels,
+                         lambda: Histogram(buckets))
+
+    @contextmanager
+    def timer(self, name: str, help_text: str = '', **labels):
+        """Observe the duration of a with-block into a histogram"""
+        histogram = self.histogram(name, help_text, **labels)
+        start = time.perf_counter()
+        try:
+            yield histogram
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    def unregister(self, name: str, **labels):
+        """Remove one labelled metric (or the whole family if no labels)"""
+        if name not in self._families and _counter_name(name) in self._families:
+            name = _counter_name(name)
+        with self._lock:
+            if not labels:
+                self._families.pop(name, None)
+                return
+            family = self._families.get(name)
+            if family:
+                family['metrics'].pop(_label_key(labels), None)
+
+    def unregister_owner(self, owner: Any):
+        """Remove every function metric registered with this owner"""
+        with self._lock:
+            for family in self._families.values():
+                metrics = family['metrics']
+                for key, metric in list(metrics.items()):
+                    if isinstance(metric, FunctionMetric) and metric.owned and metric.unbind(owner):
+                        del metrics[key]
+
+    def clear(self):
+        """Remove all metrics. Used for testing."""
+        with self._lock:
+            self._families.clear()
+
+    def collect(self) -> List[dict]:
+        """
+        Snapshot all metrics as plain data.
+
+        Returns:
+            [{'name', 'type', 'help', 'samples': [[suffix, labels, value], ...]}]
+        """
+        with self._lock:
+            families = [(name, dict(f, metrics=dict(f['metrics'])))
+                        for name, f in self._families.items()]
+
+        result = []
+        for name, family in sorted(families):
+            samples = []
+            for key, metric in family['metrics'].items():
+                for sample in metric.samples():
+                    labels = dict(key)
+                    if len(sample) == 3:
+                        labels[sample[2][0]] = sample[2][1]
+                    samples.append([sample[0], labels, sample[1]])
+            result.append({
+                'name': name,
+                'type': family['type'],
+                'help': family['help'],
+                'samples': samples,
+            })
+        return result
+
+    # ========================================
+    # Cross-process snapshots
+    # ========================================
+
+    @staticmethod
+    def get_snapshot_dir() -> Path:
+        """Directory holding per-process metric snapshots"""
+        return get_real_user_home() / '.local' / 'share' / 'meshforge' / 'metrics'
+
+    def write_snapshot(self, process: str, directory: Optional[Path] = None) -> bool:
+        """Atomically write this registry to <dir>/<process>.json"""
+        directory = directory or self.get_snapshot_dir()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{process}.json"
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({
+                'process': process,
+                'pid': os.getpid(),
+                'time': time.time(),
+                'families': self.collect(),
+            }))
+            os.replace(tmp, path)
+            return True
+        except Exception as e:
+            logger.debug(f"Could not write metrics snapshot: {e}")
+            return False
+
+    def start_exporter(self, process: str, interval: float = 15.0,
+                       directory: Optional[Path] = None):
+        """Write snapshots every `interval` seconds from a daemon thread"""
+        if self._exporter and self._exporter.is_alive():
+            return
+        self._exporter_stop.clear()
+
+        def loop():
+            while not self._exporter_stop.wait(interval):
+                self.write_snapshot(process, directory)
+            self.write_snapshot(process, directory)
+
+        self.write_snapshot(process, directory)
+        self._exporter = threading.Thread(target=loop, daemon=True, name="MetricsExporter")
+        self._exporter.start()
+
+    def stop_exporter(self, timeout: float = 2.0):
+        """Stop the snapshot exporter (writes a final snapshot)"""
+        self._exporter_stop.set()
+        if self._exporter and self._exporter.is_alive():
+            self._exporter.join(timeout=timeout)
+        self._exporter = None
+
+
+def load_snapshots(directory: Optional[Path] = None, exclude: Optional[str] = None,
+                   max_age: float = SNAPSHOT_MAX_AGE) -> List[dict]:
+    """
+    Load fresh snapshot families from other processes.
+
+    Each sample gains a process="<name>" label so identical metric names
+    from different processes stay distinct.
+    """
+    directory = directory or MetricsRegistry.get_snapshot_dir()
+    families = []
+    try:
+        paths = sorted(directory.glob('*.json'))
+    except OSError:
+        return families
+
+    now = time.time()
+    for path in paths:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        process = data.get('process', path.stem)
+        if process == exclude or now - data.get('time', 0) > max_age:
+            continue
+        for family in data.get('families', []):
+            for sample in family.get('samples', []):
+                sample[1]['process'] = process
+            families.append(family)
+    return families
+
+
+def collect_all(process: str, directory: Optional[Path] = None) -> List[dict]:
+    """This process's families plus fresh snapshots from other processes"""
+    families = get_registry().collect()
+    for family in families:
+        for sample in family['samples']:
+            sample[1]['process'] = process
+    return families + load_snapshots(directory, exclude=process)
+
+
+# ============================================================================
+# Prometheus Text Rendering
+# ============================================================================
+
+def _format_value(value: float) -> str:
+    if value is None:
+        return 'NaN'
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_prometheus(families: List[dict], extra_labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Render collected families in Prometheus text exposition format.
+
+    Families with the same name (e.g. from several processes) are merged
+    under one HELP/TYPE header.
+    """
+    merged: Dict[str, dict] = {}
+    for family in families:
+        target = merged.setdefault(family['name'], {
+            'type': family['type'], 'help': family.get('help', ''), 'samples': [],
+        })
+        for suffix, labels, value in family['samples']:
+            if extra_labels:
+                labels = dict(extra_labels, **labels)
+            target['samples'].append((suffix, labels, value))
+
+    lines = []
+    for name in sorted(merged):
+        family = merged[name]
+        if family['help']:
+            lines.append(f"# HELP {name} {_escape(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for suffix, labels, value in family['samples']:
+            if labels:
+                label_str = ','.join(f'{k}="{_escape(str(v))}"' for k, v in sorted(labels.items()))
+                lines.append(f"{name}{suffix}{{{label_str}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name}{suffix} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# Global instance
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return _registry
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """
+    Registry for instrumented gateway components.
+
+    Returns None when MESHFORGE_METRICS=0, so components can skip
+    instrumentation entirely (e.g. for uninstrumented benchmarks).
+    """
+    return _registry if METRICS_ENABLED else None
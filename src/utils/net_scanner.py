@@ -0,0 +1,476 @@
+"""
+Network Scanner - concurrent service discovery for MeshForge
+
+One asyncio engine behind every "scan the network" button (TUI tools
+pane, GTK network tools, AREDN node discovery). It probes any number of
+subnets/CIDRs for any number of services at once:
+
+    meshtastic  4403  Meshtastic TCP API (meshtasticd, WiFi nodes)
+    aredn       8080  AREDN node web/API (answers HTTP)
+    meshchat    5555  Reticulum MeshChat web interface (answers HTTP)
+    mqtt        1883  MQTT broker (answers CONNECT with CONNACK)
+    rns         4242  RNS TCPServerInterface
+
+Design:
+- Connects run on one event loop; an asyncio.Semaphore caps how many are
+  in flight, and a probe task is only created once a slot is free, so a
+  /16 never builds 65k pending tasks.
+- Results are streamed as they arrive (async generator, or a callback for
+  the threaded sync wrapper).
+- Connect timeouts adapt to the network: every answered connect (open or
+  refused) is an RTT sample, and the timeout follows srtt + 4 * rttvar
+  (RFC 6298), clamped. Silent hosts then cost a few RTTs, not a fixed
+  half second.
+
+Usage:
+    scanner = NetworkScanner()
+    async for result in scanner.scan(local_subnets(), ['meshtastic', 'mqtt']):
+        print(result.address, result.probe)
+
+    # From a worker thread
+    results = scan_sync('10.0.0.0/24', ['aredn'], callback=print)
+
+Benchmark (a /16 of loopback addresses with stand-in services):
+    python3 -m utils.net_scanner --benchmark --json
+"""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import (AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Union)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 256
+INITIAL_TIMEOUT = 0.5       # before the first RTT sample
+MIN_TIMEOUT = 0.25      # event-loop scheduling lag counts against the connect too
+MAX_TIMEOUT = 3.0
+READ_TIMEOUT = 2.0          # banner/handshake after connect
+
+# Wider local networks are narrowed to the /24 around our own address
+MAX_LOCAL_HOSTS = 254
+
+
+@dataclass(frozen=True)
+class Probe:
+    """A service to look for: a TCP port plus an optional handshake."""
+    name: str
+    port: int
+    label: str
+    payload: bytes = b''        # sent after connect
+    expect: bytes = b''         # response must start with this
+
+    def with_port(self, port: int) -> 'Probe':
+        return replace(self, port=port)
+
+
+def _mqtt_connect(client_id: str = 'meshforge-scan') -> bytes:
+    """MQTT 3.1.1 CONNECT, clean session, 60 s keepalive."""
+    ident = client_id.encode()
+    variable = b'\x00\x04MQTT\x04\x02\x00\x3c'
+    body = variable + len(ident).to_bytes(2, 'big') + ident
+    return bytes([0x10, len(body)]) + body
+
+
+_HTTP_GET = b'GET %s HTTP/1.0\r\nUser-Agent: MeshForge/1.0\r\n\r\n'
+
+PROBES: Dict[str, Probe] = {
+    'meshtastic': Probe('meshtastic', 4403, 'Meshtastic TCP'),
+    'aredn': Probe('aredn', 8080, 'AREDN node', _HTTP_GET % b'/a/sysinfo', b'HTTP/'),
+    'meshchat': Probe('meshchat', 5555, 'MeshChat', _HTTP_GET % b'/', b'HTTP/'),
+    'mqtt': Probe('mqtt', 1883, 'MQTT broker', _mqtt_connect(), b'\x20'),
+    'rns': Probe('rns', 4242, 'RNS TCP interface'),
+}
+
+ProbeSpec = Union[str, Probe]
+TargetSpec = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network,
+                   Iterable[Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]]]
+
+
+@dataclass
+class ScanResult:
+    """One service found on one host."""
+    host: str
+    port: int
+    probe: str
+    label: str
+    rtt: float                  # connect time in seconds
+    banner: str = ''            # first response line, for handshake probes
+
+    @property
+    def address(self) -> str:
+        return f"[{self.host}]:{self.port}" if ':' in self.host else f"{self.host}:{self.port}"
+
+    def to_dict(self) -> Dict:
+        return {'host': self.host, 'port': self.port, 'probe': self.probe,
+                'label': self.label, 'rtt_ms': round(self.rtt * 1000, 2),
+                'banner': self.banner}
+
+
+class RttEstimator:
+    """Smoothed RTT and connect timeout, as TCP computes its RTO (RFC 6298)."""
+
+    def __init__(self, initial: float = INITIAL_TIMEOUT, minimum: float = MIN_TIMEOUT,
+                 maximum: float = MAX_TIMEOUT):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.samples = 0
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.initial
+        return min(self.maximum, max(self.minimum, self.srtt + 4 * self.rttvar))
+
+
+def parse_targets(targets: TargetSpec) -> List[Union[ipaddress.IPv4Network,
+                                                     ipaddress.IPv6Network]]:
+    """CIDRs, single addresses or network objects as a list of networks."""
+    if isinstance(targets, (str, ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        targets = [targets]
+    return [ipaddress.ip_network(t, strict=False) for t in targets]
+
+
+def iter_hosts(networks: Sequence) -> Iterator[tuple]:
+    """(network index, host) for every host address, each host once."""
+    seen = set()
+    for index, network in enumerate(networks):
+        hosts = [network.network_address] if network.num_addresses == 1 else network.hosts()
+        for address in hosts:
+            if address not in seen:
+                seen.add(address)
+                yield index, str(address)
+
+
+def resolve_probes(probes: Optional[Iterable[ProbeSpec]]) -> List[Probe]:
+    if probes is None:
+        return list(PROBES.values())
+    resolved = []
+    for probe in probes:
+        if isinstance(probe, str):
+            if probe not in PROBES:
+                raise ValueError(f"Unknown probe '{probe}' (choose from {', '.join(PROBES)})")
+            probe = PROBES[probe]
+        resolved.append(probe)
+    return resolved
+
+
+def local_subnets(max_hosts: int = MAX_LOCAL_HOSTS) -> List[ipaddress.IPv4Network]:
+    """IPv4 networks of the interfaces that are up, excluding loopback.
+
+    Networks with more than max_hosts addresses are narrowed to the /24
+    around our own address (a 10.0.0.0/8 mesh is not scanned whole).
+    """
+    try:
+        from utils.sysinfo import network_interfaces
+    except ImportError:
+        from .sysinfo import network_interfaces
+
+    subnets = []
+    for iface in network_interfaces():
+        if 'UP' not in iface['flags'] or 'LOOPBACK' in iface['flags']:
+            continue
+        for info in iface['addr_info']:
+            if info.get('family') != 'inet' or not info.get('local'):
+                continue
+            network = ipaddress.ip_interface(f"{info['local']}/{info['prefixlen']}").network
+            if network.num_addresses - 2 > max_hosts:
+                network = ipaddress.ip_interface(f"{info['local']}/24").network
+            if network not in subnets:
+                subnets.append(network)
+
+    if not subnets:
+        # No interface table; fall back to the address of the default route
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                subnets.append(ipaddress.ip_interface(f"{s.getsockname()[0]}/24").network)
+        except OSError:
+            pass
+    return subnets
+
+
+class NetworkScanner:
+    """
+    Concurrent TCP service scanner.
+
+    One RttEstimator is kept per target network, so a fast LAN and a slow
+    RF-linked subnet scanned together each get their own timeout.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY,
+                 initial_timeout: float = INITIAL_TIMEOUT,
+                 min_timeout: float = MIN_TIMEOUT, max_timeout: float = MAX_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT):
+        self.concurrency = concurrency
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.read_timeout = read_timeout
+        self._stop = threading.Event()
+        self.estimators: List[RttEstimator] = []
+        self.stats: Dict[str, int] = {}
+
+    def stop(self):
+        """Stop a running scan; safe to call from any thread."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    async def scan(self, targets: TargetSpec,
+                   probes: Optional[Iterable[ProbeSpec]] = None) -> AsyncIterator[ScanResult]:
+        """Probe every host of targets for every probe, yielding hits as found.
+
+        Args:
+            targets: CIDR string, address, network, or an iterable of them
+            probes: Probe names from PROBES or Probe objects (default: all)
+        """
+        networks = parse_targets(targets)
+        probe_list = resolve_probes(probes)
+        self._stop.clear()
+        self.estimators = [RttEstimator(self.initial_timeout, self.min_timeout,
+                                        self.max_timeout) for _ in networks]
+        self.stats = {'probes': 0, 'open': 0, 'refused': 0, 'silent': 0, 'found': 0}
+
+        found: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.concurrency)
+        pending = set()
+        done = object()
+
+        async def run(host: str, probe: Probe, estimator: RttEstimator):
+            try:
+                result = await self._probe(host, probe, estimator)
+                if result is not None:
+                    self.stats['found'] += 1
+                    found.put_nowait(result)
+            finally:
+                slots.release()
+
+        async def feed():
+            try:
+                for index, host in iter_hosts(networks):
+                    for probe in probe_list:
+                        await slots.acquire()
+                        if self._stop.is_set():
+                            slots.release()
+                            return
+                        task = asyncio.ensure_future(run(host, probe, self.estimators[index]))
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+                if pending:
+                    await asyncio.wait(list(pending))
+            finally:
+                found.put_nowait(done)
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                item = await found.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            feeder.cancel()
+            for task in list(pending):
+                task.cancel()
+            await asyncio.gather(feeder, *pending, return_exceptions=True)
+
+    async def _probe(self, host: str, probe: Probe,
+                     estimator: RttEstimator) -> Optional[ScanResult]:
+        self.stats['probes'] += 1
+        start = time.monotonic()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, probe.port), timeout=estimator.timeout)
+        except ConnectionRefusedError:
+            # A RST is as good an RTT sample as a SYN-ACK
+            estimator.sample(time.monotonic() - start)
+            self.stats['refused'] += 1
+            return None
+        except (asyncio.TimeoutError, OSError):
+            self.stats['silent'] += 1
+            return None
+
+        rtt = time.monotonic() - start
+        estimator.sample(rtt)
+        self.stats['open'] += 1
+        banner = ''
+        try:
+            if probe.payload or probe.expect:
+                if probe.payload:
+                    writer.write(probe.payload)
+                    await writer.drain()
+                data = await asyncio.wait_for(reader.read(256), timeout=self.read_timeout)
+                if not data.startswith(probe.expect):
+                    return None
+                banner = data.split(b'\r\n', 1)[0].decode('latin-1') if data[:1].isalpha() \
+                    else data[:4].hex()
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return ScanResult(host, probe.port, probe.name, probe.label, rtt, banner)
+
+
+def scan_sync(targets: TargetSpec, probes: Optional[Iterable[ProbeSpec]] = None,
+              callback: Optional[Callable[[ScanResult], None]] = None,
+              scanner: Optional[NetworkScanner] = None, **kwargs) -> List[ScanResult]:
+    """Run a scan on a private event loop in the calling thread.
+
+    For worker threads (GTK, AREDN discovery). callback is called from
+    this thread for every result as it arrives; scanner.stop() from
+    another thread ends the scan early.
+    """
+    scanner = scanner or NetworkScanner(**kwargs)
+
+    async def collect():
+        results = []
+        async for result in scanner.scan(targets, probes):
+            results.append(result)
+            if callback:
+                callback(result)
+        return results
+
+    return asyncio.run(collect())
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+class _StandIn(asyncio.Protocol):
+    """Answers like the real service would to our probe."""
+
+    def __init__(self, probe: Probe):
+        self.probe = probe
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        if self.probe.expect == b'HTTP/':
+            self.transport.write(b'HTTP/1.0 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        elif self.probe.expect == b'\x20':
+            self.transport.write(b'\x20\x02\x00\x00')
+        self.transport.close()
+
+
+async def _benchmark(prefix: int, probes: List[Probe], stand_ins: int, port_offset: int,
+                     concurrency: int) -> Dict:
+    network = ipaddress.ip_network(f'127.0.0.0/{prefix}')
+    probes = [p.with_port(p.port + port_offset) for p in probes]
+    hosts = list(network.hosts())
+    step = max(1, len(hosts) // max(1, stand_ins))
+    loop = asyncio.get_running_loop()
+
+    servers, expected = [], set()
+    for n, address in enumerate(hosts[step // 2::step][:stand_ins]):
+        probe = probes[n % len(probes)]
+        servers.append(await loop.create_server(lambda p=probe: _StandIn(p),
+                                                str(address), probe.port))
+        expected.add((str(address), probe.port))
+
+    scanner = NetworkScanner(concurrency=concurrency)
+    found, first = [], None
+    start = time.perf_counter()
+    try:
+        async for result in scanner.scan(network, probes):
+            if first is None:
+                first = time.perf_counter() - start
+            found.append(result)
+    finally:
+        for server in servers:
+            server.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'network': str(network),
+        'hosts': len(hosts),
+        'probes': [p.name for p in probes],
+        'connects': scanner.stats['probes'],
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'connects_per_s': round(scanner.stats['probes'] / elapsed) if elapsed else 0,
+        'first_result_s': round(first, 4) if first is not None else None,
+        'stand_ins': len(expected),
+        'found': len(found),
+        'missed': len(expected - {(r.host, r.port) for r in found}),
+        'silent': scanner.stats['silent'],
+        'timeout_s': round(scanner.estimators[0].timeout, 4),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry: python3 -m utils.net_scanner"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MeshForge network service scanner")
+    parser.add_argument('targets', nargs='*', help="CIDRs or addresses (default: local subnets)")
+    parser.add_argument('--probe', action='append', choices=list(PROBES),
+                        help="Service to look for (repeatable; default: all)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Scan a loopback network with stand-in services instead")
+    parser.add_argument('--prefix', type=int, default=16, help="Benchmark network size (/N)")
+    parser.add_argument('--stand-ins', type=int, default=50, help="Benchmark services to find")
+    parser.add_argument('--port-offset', type=int, default=20000,
+                        help="Benchmark port shift, clear of real services")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    probes = resolve_probes(args.probe)
+
+    if args.benchmark:
+        report = asyncio.run(_benchmark(args.prefix, probes, args.stand_ins,
+                                        args.port_offset, args.concurrency))
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            for key, value in report.items():
+                print(f"{key:>15}: {value}")
+        return 0 if report['missed'] == 0 else 1
+
+    targets = args.targets or local_subnets()
+    if not targets:
+        print("No local network found; give a CIDR to scan")
+        return 1
+
+    def show(result: ScanResult):
+        if not args.json:
+            print(f"{result.address:<22} {result.label:<18} {result.rtt * 1000:7.1f} ms "
+                  f"{result.banner}".rstrip())
+
+    results = scan_sync(targets, probes, callback=show, concurrency=args.concurrency)
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        print(f"{len(results)} service(s) found")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -5,15 +5,33 @@ Pure Python functions for network diagnostics.
 Used by both GTK UI and Web UI.
 
 Functions:
-- parse_proc_net: Parse /proc/net/{tcp,udp} for connection info
+- read_sockets: Read /proc/net/{tcp,udp,tcp6,udp6} in one pass, filtered by port/state
+- parse_proc_net: Parse one /proc/net/{tcp,udp} table for connection info
+- socket_owners: Map socket inodes to (pid, process name), cached
 - get_socket_to_process: Map socket inodes to process names
 - check_port: Check if a TCP/UDP port is open
+
+Each table is matched with one precompiled regex over the whole file
+instead of splitting every row; port and state filters are compiled into
+that regex so rows that don't match are never decoded. Addresses repeat
+heavily (0.0.0.0, 127.0.0.1, ::), so decoding is memoized.
 """
 
+import ipaddress
 import os
+import re
 import socket
-from pathlib import Path
-from typing import Dict, List, Optional
+import struct
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROC_ROOT = '/proc'
+PROTOCOLS = ('tcp', 'udp', 'tcp6', 'udp6')
+
+# How long one /proc/*/fd scan is reused
+OWNER_TTL = 2.0
 
 # TCP state mapping (hex to name)
 TCP_STATES = {
@@ -29,6 +47,15 @@ TCP_STATES = {
     '0A': 'LISTEN',
     '0B': 'CLOSING',
 }
+_STATE_CODES = {name: code for code, name in TCP_STATES.items()}
+
+# One table row:
+#   sl  local_address rem_address   st tx_queue:rx_queue tr:tm->when retrnsmt   uid  timeout inode
+#   0: 00000000:1133 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 12345
+_ROW = (r'^\s*\d+: ([0-9A-Fa-f]+):({ports}) ([0-9A-Fa-f]+):([0-9A-Fa-f]{{4}}) ({states}) '
+        r'\S+ \S+ \S+\s+(\d+)\s+\d+\s+(\d+)')
+_ANY_PORT = '[0-9A-Fa-f]{4}'
+_ANY_STATE = '[0-9A-Fa-f]{2}'
 
 
 def hex_to_ip(hex_addr: str) -> str:
@@ -41,15 +68,8 @@ def hex_to_ip(hex_addr: str) -> str:
         Dotted IP string like '127.0.0.1'
     """
     try:
-        ip_int = int(hex_addr, 16)
-        ip_bytes = [
-            (ip_int >> 0) & 0xFF,
-            (ip_int >> 8) & 0xFF,
-            (ip_int >> 16) & 0xFF,
-            (ip_int >> 24) & 0xFF,
-        ]
-        return '.'.join(str(b) for b in ip_bytes)
-    except (ValueError, TypeError):
+        return _decode_ipv4(hex_addr.upper())
+    except (ValueError, TypeError, AttributeError, OSError):
         return '0.0.0.0'
 
 
@@ -60,26 +80,107 @@ def hex_to_ipv6(hex_addr: str) -> str:
         hex_addr: 32-character hex string
 
     Returns:
-        IPv6 address string
+        IPv6 address string, eight zero-padded groups
+        (e.g. '0000:0000:0000:0000:0000:0000:0000:0001')
     """
     try:
         if len(hex_addr) != 32:
             return hex_addr
-
-        # Split into 8 groups of 4 hex chars
-        groups = []
-        for i in range(0, 32, 8):
-            # Each 8-char segment is little-endian 32-bit
-            segment = hex_addr[i:i+8]
-            # Reverse byte order within each 32-bit word
-            reversed_seg = segment[6:8] + segment[4:6] + segment[2:4] + segment[0:2]
-            groups.append(reversed_seg[0:4])
-            groups.append(reversed_seg[4:8])
-        return ':'.join(groups).lower()
-    except (ValueError, TypeError):
+        return _explode_ipv6(_decode_ipv6(hex_addr.upper()))
+    except (ValueError, TypeError, OSError):
         return hex_addr
 
 
+@lru_cache(maxsize=1024)
+def _decode_ipv4(hex_addr: str) -> str:
+    return socket.inet_ntop(socket.AF_INET, bytes.fromhex(hex_addr)[::-1])
+
+
+@lru_cache(maxsize=1024)
+def _decode_ipv6(hex_addr: str) -> str:
+    # Four host-endian (little endian) 32-bit words
+    words = struct.unpack('<4I', bytes.fromhex(hex_addr))
+    return socket.inet_ntop(socket.AF_INET6, struct.pack('>4I', *words))
+
+
+@lru_cache(maxsize=1024)
+def _explode_ipv6(address: str) -> str:
+    return ipaddress.IPv6Address(address).exploded
+
+
+@lru_cache(maxsize=64)
+def _row_pattern(ports: Optional[frozenset], states: Optional[frozenset]) -> 're.Pattern':
+    """Row regex with the port/state filters compiled in."""
+    port_re = '|'.join(f'{p:04X}' for p in sorted(ports)) if ports is not None else _ANY_PORT
+    state_re = '|'.join(sorted(states)) if states is not None else _ANY_STATE
+    return re.compile(_ROW.format(ports=port_re or '(?!)', states=state_re or '(?!)'), re.M)
+
+
+def _read_table(path: str) -> str:
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('ascii', 'replace')
+    except OSError:
+        return ''
+
+
+def read_sockets(protocols: Iterable[str] = PROTOCOLS,
+                 ports: Optional[Iterable[int]] = None,
+                 states: Optional[Iterable[str]] = None,
+                 with_process: bool = False,
+                 proc_root: str = PROC_ROOT) -> List[Dict]:
+    """Read the kernel socket tables in a single pass.
+
+    Args:
+        protocols: Any of 'tcp', 'udp', 'tcp6', 'udp6'
+        ports: Only sockets bound to one of these local ports
+        states: Only sockets in one of these states ('LISTEN', 'ESTABLISHED', ...)
+        with_process: Add 'pid' and 'process' from socket_owners()
+        proc_root: /proc mount point (for tests)
+
+    Returns:
+        List of dicts with keys: protocol, ip, port, remote_ip, remote_port,
+        state, state_hex, uid, inode (and pid, process with with_process).
+        IPv6 addresses are compressed, as ss prints them ('::1').
+    """
+    pattern = _row_pattern(
+        frozenset(int(p) for p in ports) if ports is not None else None,
+        frozenset(_STATE_CODES.get(s, s).upper() for s in states) if states is not None else None,
+    )
+
+    results = []
+    for protocol in protocols:
+        decode = _decode_ipv6 if protocol.endswith('6') else _decode_ipv4
+        text = _read_table(f'{proc_root}/net/{protocol}')
+        for local_ip, local_port, remote_ip, remote_port, state_hex, uid, inode \
+                in pattern.findall(text):
+            state_hex = state_hex.upper()
+            try:
+                results.append({
+                    'protocol': protocol,
+                    'ip': decode(local_ip.upper()),
+                    'port': int(local_port, 16),
+                    'remote_ip': decode(remote_ip.upper()),
+                    'remote_port': int(remote_port, 16),
+                    'state': TCP_STATES.get(state_hex, state_hex),
+                    'state_hex': state_hex,
+                    'uid': int(uid),
+                    'inode': inode,
+                })
+            except (ValueError, OSError):
+                continue  # Malformed address
+
+    if with_process and results:
+        # A port lookup only needs its few inodes; a table dump wants the shared scan
+        wanted = {r['inode'] for r in results} if ports is not None else None
+        owners = socket_owners(proc_root, inodes=wanted)
+        for entry in results:
+            pid, name = owners.get(entry['inode'], (None, ''))
+            entry['pid'] = pid
+            entry['process'] = f"{name} (PID {pid})" if pid is not None else ''
+    return results
+
+
 def parse_proc_net(protocol: str) -> List[Dict]:
     """Parse /proc/net/{tcp,udp} for connection info.
 
@@ -88,48 +189,105 @@ def parse_proc_net(protocol: str) -> List[Dict]:
 
     Returns:
         List of connection dicts with keys: ip, port, state, inode
+        (plus the remote address and uid; see read_sockets). IPv6
+        addresses keep hex_to_ipv6's uncompressed format.
     """
-    results = []
-    proc_file = f'/proc/net/{protocol}'
+    entries = read_sockets((protocol,))
+    if protocol.endswith('6'):
+        for entry in entries:
+            entry['ip'] = _explode_ipv6(entry['ip'])
+            entry['remote_ip'] = _explode_ipv6(entry['remote_ip'])
+    return entries
+
+
+# ============================================================================
+# Socket inode -> process
+# ============================================================================
 
-    if not os.path.exists(proc_file):
-        return results
+_owners_lock = threading.Lock()
+_owners_cache: Dict[str, Tuple[float, Dict[str, Tuple[int, str]]]] = {}
 
-    is_v6 = protocol.endswith('6')
-    hex_converter = hex_to_ipv6 if is_v6 else hex_to_ip
 
+def _scan_socket_owners(proc_root: str,
+                        wanted: Optional[set] = None) -> Dict[str, Tuple[int, str]]:
+    """One pass over /proc/*/fd; stops early once every wanted inode is found."""
+    owners = {}
+    remaining = set(wanted) - {'0'} if wanted is not None else None  # 0: no owner (TIME_WAIT)
+    if remaining is not None and not remaining:
+        return owners
     try:
-        with open(proc_file, 'r') as f:
-            lines = f.readlines()[1:]  # Skip header
+        pid_entries = list(os.scandir(proc_root))
+    except OSError:
+        return owners
+
+    for pid_entry in pid_entries:
+        if not pid_entry.name.isdigit():
+            continue
+        found = []
+        try:
+            with os.scandir(f'{pid_entry.path}/fd') as fds:
+                for fd in fds:
+                    try:
+                        target = os.readlink(fd.path)
+                    except OSError:
+                        continue
+                    if target.startswith('socket:['):
+                        found.append(target[8:-1])
+        except OSError:
+            continue  # Exited, or another user's process without root
+        if not found:
+            continue
+
+        try:
+            with open(f'{pid_entry.path}/comm') as f:
+                name = f.read().strip() or 'unknown'
+        except OSError:
+            name = 'unknown'
+        owner = (int(pid_entry.name), name)
+        for inode in found:
+            owners[inode] = owner
+        if remaining is not None:
+            remaining.difference_update(found)
+            if not remaining:
+                break
+    return owners
+
+
+def socket_owners(proc_root: str = PROC_ROOT, inodes: Optional[Iterable[str]] = None,
+                  max_age: float = OWNER_TTL) -> Dict[str, Tuple[int, str]]:
+    """Map socket inodes to (pid, process name).
+
+    A full scan is shared for max_age seconds. When only a few inodes are
+    needed and there's no fresh scan, the scan stops as soon as they are
+    all found (and isn't cached, being partial).
 
-        for line in lines:
-            parts = line.split()
-            if len(parts) < 10:
-                continue
+    Args:
+        proc_root: /proc mount point (for tests)
+        inodes: Only these inodes are needed
+        max_age: Reuse a full scan this recent
 
-            local_addr = parts[1]
-            state_hex = parts[3]
-            inode = parts[9]
+    Returns:
+        Dict mapping inode string to (pid, name)
+    """
+    now = time.monotonic()
+    with _owners_lock:
+        cached = _owners_cache.get(proc_root)
+    if cached and now - cached[0] < max_age:
+        return cached[1]
 
-            try:
-                addr_parts = local_addr.split(':')
-                ip_str = hex_converter(addr_parts[0])
-                port = int(addr_parts[1], 16)
-                state = TCP_STATES.get(state_hex.upper(), state_hex)
+    if inodes is not None:
+        return _scan_socket_owners(proc_root, set(inodes))
 
-                results.append({
-                    'ip': ip_str,
-                    'port': port,
-                    'state': state,
-                    'inode': inode
-                })
-            except (ValueError, IndexError):
-                continue
+    owners = _scan_socket_owners(proc_root)
+    with _owners_lock:
+        _owners_cache[proc_root] = (time.monotonic(), owners)
+    return owners
 
-    except (FileNotFoundError, PermissionError):
-        pass
 
-    return results
+def clear_owner_cache():
+    """Forget cached /proc/*/fd scans."""
+    with _owners_lock:
+        _owners_cache.clear()
 
 
 def get_socket_to_process() -> Dict[str, str]:
@@ -138,39 +296,7 @@ def get_socket_to_process() -> Dict[str, str]:
     Returns:
         Dict mapping inode string to "process_name (PID pid)"
     """
-    inode_map = {}
-
-    try:
-        for pid_dir in Path('/proc').iterdir():
-            if not pid_dir.name.isdigit():
-                continue
-
-            pid = pid_dir.name
-            try:
-                # Get process name
-                comm_file = pid_dir / 'comm'
-                if comm_file.exists():
-                    proc_name = comm_file.read_text().strip()
-                else:
-                    proc_name = "unknown"
-
-                # Check fd directory for sockets
-                fd_dir = pid_dir / 'fd'
-                if fd_dir.exists():
-                    for fd_link in fd_dir.iterdir():
-                        try:
-                            target_str = str(fd_link.readlink())
-                            if target_str.startswith('socket:['):
-                                inode = target_str[8:-1]  # Extract from socket:[12345]
-                                inode_map[inode] = f"{proc_name} (PID {pid})"
-                        except (OSError, PermissionError):
-                            continue
-            except (OSError, PermissionError):
-                continue
-    except Exception:
-        pass
-
-    return inode_map
+    return {inode: f"{name} (PID {pid})" for inode, (pid, name) in socket_owners().items()}
 
 
 def get_listening_ports(protocol: str = 'tcp') -> List[Dict]:
@@ -182,16 +308,11 @@ def get_listening_ports(protocol: str = 'tcp') -> List[Dict]:
     Returns:
         List of dicts with ip, port, process info
     """
-    connections = parse_proc_net(protocol)
     # For TCP, filter to LISTEN state; UDP is stateless
-    if protocol.startswith('tcp'):
-        connections = [c for c in connections if c['state'] == 'LISTEN']
-
-    # Enrich with process info
-    inode_map = get_socket_to_process()
+    states = ('LISTEN',) if protocol.startswith('tcp') else None
+    connections = read_sockets((protocol,), states=states, with_process=True)
     for conn in connections:
-        conn['process'] = inode_map.get(conn['inode'], 'unknown')
-
+        conn['process'] = conn['process'] or 'unknown'
     return connections
 
 
@@ -222,15 +343,10 @@ def get_all_connections() -> Dict[str, List[Dict]]:
     Returns:
         Dict with keys: tcp, udp, tcp6, udp6
     """
-    inode_map = get_socket_to_process()
-
-    result = {}
-    for protocol in ['tcp', 'udp', 'tcp6', 'udp6']:
-        connections = parse_proc_net(protocol)
-        for conn in connections:
-            conn['process'] = inode_map.get(conn['inode'], 'unknown')
-        result[protocol] = connections
-
+    result = {protocol: [] for protocol in PROTOCOLS}
+    for conn in read_sockets(PROTOCOLS, with_process=True):
+        conn['process'] = conn['process'] or 'unknown'
+        result[conn['protocol']].append(conn)
     return result
 
 
@@ -244,11 +360,7 @@ def find_process_on_port(port: int, protocol: str = 'tcp') -> Optional[str]:
     Returns:
         Process info string or None if not found
     """
-    connections = parse_proc_net(protocol)
-    inode_map = get_socket_to_process()
-
-    for conn in connections:
-        if conn['port'] == port:
-            return inode_map.get(conn['inode'], 'unknown')
-
-    return None
+    connections = read_sockets((protocol,), ports=(port,), with_process=True)
+    if not connections:
+        return None
+    return connections[0]['process'] or 'unknown'
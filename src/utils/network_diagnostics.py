@@ -33,6 +33,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Queued daily event files (no open/append/close per event)
+try:
+    from utils.logging_config import get_event_logger
+except ImportError:
+    get_event_logger = None
+
 # Import centralized path utility for sudo compatibility
 try:
     from utils.paths import get_real_user_home
@@ -247,6 +253,12 @@ class NetworkDiagnostics:
 
     def _write_event_to_file(self, event: DiagnosticEvent):
         """Persist event to log file."""
+        if get_event_logger is not None:
+            try:
+                get_event_logger(DIAG_DIR, on_open=self._fix_ownership).info(event.to_log_line())
+                return
+            except Exception as e:
+                logger.debug(f"Event logger unavailable: {e}")
         try:
             log_file = DIAG_DIR / f"events_{datetime.now().strftime('%Y%m%d')}.log"
             with open(log_file, 'a') as f:
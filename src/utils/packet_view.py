@@ -0,0 +1,275 @@
+"""
+Packet View - decode-once access to received Meshtastic packets
+
+Receive handlers used to walk the same packet dict independently:
+packet.get('decoded', {}) per field, int(fromId[1:], 16) per handler,
+payload bytes/str normalisation repeated for every port. PacketView
+wraps a received packet (a meshtastic.receive dict, from pubsub or the
+stream client) and computes each field at most once, on first access.
+
+PacketDispatcher routes views by portnum, so a handler for
+PRIVATE_APP traffic never pays for text or position handling and vice
+versa:
+
+    dispatcher = PacketDispatcher()
+    dispatcher.register('TEXT_MESSAGE_APP', on_text)
+    dispatcher.register(('POSITION_APP', 'TELEMETRY_APP'), on_node_data)
+    dispatcher.register(None, on_any_packet)     # every packet
+    dispatcher.dispatch(packet)                  # one view, shared
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from utils.meshtastic_stream import PORTNUMS
+except ImportError:
+    PORTNUMS = {1: 'TEXT_MESSAGE_APP', 3: 'POSITION_APP', 4: 'NODEINFO_APP',
+                67: 'TELEMETRY_APP', 256: 'PRIVATE_APP'}
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_IDS = ('!ffffffff', '^all')
+BROADCAST_NUM = 0xFFFFFFFF
+
+_UNSET = object()
+
+PacketHandler = Callable[['PacketView'], None]
+
+
+def portnum_name(portnum) -> Optional[str]:
+    """'TEXT_MESSAGE_APP', 1 or '1' -> 'TEXT_MESSAGE_APP' (None stays None)."""
+    if portnum is None or portnum.__class__ is str and not portnum.isdigit():
+        return portnum
+    try:
+        number = int(portnum)
+    except (TypeError, ValueError):
+        return str(portnum)
+    return PORTNUMS.get(number, str(number))
+
+
+class PacketView:
+    """
+    Lazily decoded, cached view of one received packet.
+
+    Read-only: the underlying dict is shared with every handler and is
+    available unchanged as .packet.
+    """
+
+    __slots__ = ('packet', '_decoded', '_portnum', '_from_num', '_payload', '_text')
+
+    def __init__(self, packet: Dict[str, Any]):
+        self.packet = packet
+        self._decoded = _UNSET
+        self._portnum = _UNSET
+        self._from_num = _UNSET
+        self._payload = _UNSET
+        self._text = _UNSET
+
+    @classmethod
+    def of(cls, packet: Union['PacketView', Dict[str, Any]]) -> 'PacketView':
+        """View of packet (a view is returned as is)."""
+        return packet if packet.__class__ is cls else cls(packet)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.packet.get(key, default)
+
+    # === Decoded section ===
+
+    @property
+    def decoded(self) -> Dict[str, Any]:
+        if self._decoded is _UNSET:
+            self._decoded = self.packet.get('decoded') or {}
+        return self._decoded
+
+    @property
+    def portnum(self) -> Optional[str]:
+        """Port name, also for packets that carry the number (256 -> 'PRIVATE_APP')."""
+        if self._portnum is _UNSET:
+            self._portnum = portnum_name(self.decoded.get('portnum'))
+        return self._portnum
+
+    @property
+    def payload(self) -> bytes:
+        """Raw payload bytes (str payloads are latin-1 encoded back to bytes)."""
+        if self._payload is _UNSET:
+            payload = self.decoded.get('payload', b'')
+            if isinstance(payload, str):
+                payload = payload.encode('latin-1')
+            elif payload is None:
+                payload = b''
+            self._payload = payload
+        return self._payload
+
+    @property
+    def text(self) -> str:
+        if self._text is _UNSET:
+            text = self.decoded.get('text')
+            if text is None:
+                payload = self.decoded.get('payload', b'')
+                if isinstance(payload, (bytes, bytearray)):
+                    text = payload.decode('utf-8', errors='ignore')
+                else:
+                    text = str(payload)
+            self._text = text
+        return self._text
+
+    @property
+    def position(self) -> Dict[str, Any]:
+        return self.decoded.get('position') or {}
+
+    @property
+    def telemetry(self) -> Dict[str, Any]:
+        return self.decoded.get('telemetry') or {}
+
+    @property
+    def user(self) -> Dict[str, Any]:
+        return self.decoded.get('user') or {}
+
+    # === Header ===
+
+    @property
+    def from_num(self) -> int:
+        """Sender node number (0 if unknown)."""
+        if self._from_num is _UNSET:
+            num = self.packet.get('from')
+            if num is None:
+                from_id = self.packet.get('fromId')
+                num = 0
+                if from_id and from_id[0] == '!':
+                    try:
+                        num = int(from_id[1:], 16)
+                    except ValueError:
+                        pass
+            self._from_num = num
+        return self._from_num
+
+    @property
+    def from_id(self) -> Optional[str]:
+        from_id = self.packet.get('fromId')
+        if from_id is None and self.from_num:
+            from_id = f"!{self.from_num:08x}"
+        return from_id
+
+    @property
+    def to_id(self) -> Optional[str]:
+        to_id = self.packet.get('toId')
+        if to_id is None:
+            to = self.packet.get('to')
+            if to is not None:
+                to_id = '^all' if to == BROADCAST_NUM else f"!{to:08x}"
+        return to_id
+
+    @property
+    def is_broadcast(self) -> bool:
+        return self.to_id in BROADCAST_IDS
+
+    @property
+    def channel(self) -> int:
+        return self.packet.get('channel', 0)
+
+    @property
+    def packet_id(self) -> Optional[int]:
+        return self.packet.get('id')
+
+    @property
+    def snr(self) -> Optional[float]:
+        return self.packet.get('rxSnr')
+
+    @property
+    def rssi(self) -> Optional[int]:
+        return self.packet.get('rxRssi')
+
+    @property
+    def rx_time(self) -> Optional[int]:
+        return self.packet.get('rxTime')
+
+    @property
+    def via_mqtt(self) -> bool:
+        return bool(self.packet.get('viaMqtt', False))
+
+    @property
+    def hops_away(self) -> Optional[int]:
+        """hopStart - hopLimit, or None when the packet does not say."""
+        hop_start = self.packet.get('hopStart')
+        hop_limit = self.packet.get('hopLimit')
+        if hop_start is None or hop_limit is None or hop_start < hop_limit:
+            return None
+        return hop_start - hop_limit
+
+
+class PacketDispatcher:
+    """
+    portnum -> handlers table; one PacketView per dispatched packet.
+
+    Handlers registered for None see every packet, before the
+    per-port handlers. Packets no handler wants are dropped after a
+    single dict lookup, without building a view. A failing handler is
+    logged and skipped.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._any: Tuple[PacketHandler, ...] = ()
+        self._by_port: Dict[str, Tuple[PacketHandler, ...]] = {}
+        # Raw decoded['portnum'] value (name or number) -> handlers
+        self._routes: Dict[Any, Tuple[PacketHandler, ...]] = {}
+
+    def register(self, portnums: Union[None, str, int, Iterable[Union[str, int]]],
+                 handler: PacketHandler):
+        """Call handler(view) for packets on portnums (None: every packet)."""
+        if portnums is None:
+            self._any = self._any + (handler,)
+        else:
+            if isinstance(portnums, (str, int)):
+                portnums = (portnums,)
+            for portnum in portnums:
+                name = portnum_name(portnum)
+                self._by_port[name] = self._by_port.get(name, ()) + (handler,)
+        self._routes = {}
+
+    def unregister(self, handler: PacketHandler):
+        self._any = tuple(h for h in self._any if h != handler)
+        self._by_port = {port: tuple(h for h in handlers if h != handler)
+                         for port, handlers in self._by_port.items()}
+        self._routes = {}
+
+    def handlers_for(self, portnum) -> List[PacketHandler]:
+        return list(self._route(portnum))
+
+    def _route(self, portnum) -> Tuple[PacketHandler, ...]:
+        try:
+            return self._routes[portnum]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._any    # unhashable portnum: not a port we know
+        handlers = self._any + self._by_port.get(portnum_name(portnum), ())
+        self._routes[portnum] = handlers
+        return handlers
+
+    def dispatch(self, packet: Union[PacketView, Dict[str, Any]]) -> Optional[PacketView]:
+        """Route one packet; returns its view (None if no handler wanted it)."""
+        if packet.__class__ is PacketView:
+            view = packet
+            handlers = self._route(view.decoded.get('portnum'))
+            if not handlers:
+                return None
+        else:
+            decoded = packet.get('decoded') or {}
+            portnum = decoded.get('portnum')
+            try:
+                handlers = self._routes[portnum]
+            except (KeyError, TypeError):
+                handlers = self._route(portnum)
+            if not handlers:
+                return None
+            view = PacketView(packet)
+            view._decoded = decoded
+        for handler in handlers:
+            try:
+                handler(view)
+            except Exception as e:
+                logger.error(f"{self.name or 'Packet'} handler error "
+                             f"({view.portnum}): {e}")
+        return view
@@ -143,10 +143,51 @@ def check_systemd_service(service_name: str) -> Tuple[bool, bool]:
     return is_running, is_enabled
 
 
+def _shared_state(name: str, port: Optional[int], host: str):
+    """
+    The shared poller's state if it already watches this service.
+
+    Only used when a poller is running in this process (a UI is up), so
+    one-off checks from scripts still probe directly.
+    """
+    if host not in ('localhost', '127.0.0.1'):
+        return None
+    try:
+        from utils.system_state import peek_system_state
+    except ImportError:
+        try:
+            from .system_state import peek_system_state
+        except ImportError:
+            return None
+    state = peek_system_state()
+    if state is None or state.service(name) is None:
+        return None
+    if port and port not in state.ports:
+        return None
+    return state
+
+
+def _systemd_unit_exists(systemd_name: str) -> bool:
+    """False only when systemd positively reports the unit as missing."""
+    try:
+        result = subprocess.run(
+            ['systemctl', 'status', systemd_name],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        return 'could not be found' not in result.stderr.lower()
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return True
+
+
 def check_service(name: str, port: Optional[int] = None, host: str = 'localhost') -> ServiceStatus:
     """
     Check if a service is available and provide actionable feedback.
 
+    Answers from the shared system-state poller when one is running;
+    otherwise probes the port and systemd directly.
+
     Args:
         name: Service name (e.g., 'meshtasticd', 'hamclock')
         port: Override port to check (uses known default if not specified)
@@ -162,9 +203,20 @@ def check_service(name: str, port: Optional[int] = None, host: str = 'localhost'
     description = config.get('description', name)
     fix_hint = config.get('fix_hint', f'Start {name} service')
 
+    state = _shared_state(name, check_port_num, host)
+    if state is not None:
+        unit = state.service(name)
+        port_open = lambda: state.ports.get(check_port_num, False)
+        systemd_status = lambda: (unit.running, unit.enabled == 'enabled')
+        installed = lambda: unit.loaded
+    else:
+        port_open = lambda: check_port(check_port_num, host)
+        systemd_status = lambda: check_systemd_service(systemd_name)
+        installed = lambda: _systemd_unit_exists(systemd_name)
+
     # Check port if applicable
     if check_port_num:
-        if check_port(check_port_num, host):
+        if port_open():
             return ServiceStatus(
                 name=name,
                 available=True,
@@ -174,7 +226,7 @@ def check_service(name: str, port: Optional[int] = None, host: str = 'localhost'
             )
 
     # Check systemd service
-    is_running, is_enabled = check_systemd_service(systemd_name)
+    is_running, is_enabled = systemd_status()
 
     if is_running:
         # Service running but port not open (maybe wrong port?)
@@ -206,24 +258,15 @@ def check_service(name: str, port: Optional[int] = None, host: str = 'localhost'
         )
 
     # Check if service exists at all
-    try:
-        result = subprocess.run(
-            ['systemctl', 'status', systemd_name],
-            capture_output=True,
-            text=True,
-            timeout=5
+    if not installed():
+        return ServiceStatus(
+            name=name,
+            available=False,
+            state=ServiceState.NOT_INSTALLED,
+            message=f"{description} is not installed",
+            fix_hint=f"Install {name} first",
+            port=check_port_num
         )
-        if 'could not be found' in result.stderr.lower():
-            return ServiceStatus(
-                name=name,
-                available=False,
-                state=ServiceState.NOT_INSTALLED,
-                message=f"{description} is not installed",
-                fix_hint=f"Install {name} first",
-                port=check_port_num
-            )
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        pass
 
     return ServiceStatus(
         name=name,
@@ -292,6 +292,42 @@ class MeshSimulator:
         """Register callback for node changes"""
         self._node_callbacks.append(callback)
 
+    def simulate_capacity(self, extra_nodes: int = 0, duration: float = 3600.0,
+                          area_km: float = 20.0, **config):
+        """
+        Run the discrete-event flood model (utils.mesh_sim) over these nodes.
+
+        extra_nodes are scattered over an area_km square centred on the
+        current nodes, to ask what a bigger mesh would do.
+
+        Returns:
+            SimReport with delivery ratio, latency and channel utilization
+        """
+        try:
+            from utils.mesh_sim import FloodSimulator, MeshNetwork, SimConfig
+        except ImportError:
+            from .mesh_sim import FloodSimulator, MeshNetwork, SimConfig
+
+        sim_config = SimConfig(**config)
+        coordinates = [(n.node_id, n.latitude, n.longitude) for n in self._nodes.values()]
+        if extra_nodes:
+            rng = random.Random(sim_config.seed)
+            if coordinates:
+                lat0 = sum(c[1] for c in coordinates) / len(coordinates)
+                lon0 = sum(c[2] for c in coordinates) / len(coordinates)
+            else:
+                lat0 = lon0 = 0.0
+            half_lat = area_km / 2 / 111.32
+            half_lon = half_lat / max(math.cos(math.radians(lat0)), 0.01)
+            coordinates += [(f"!sim{i:05x}", lat0 + rng.uniform(-half_lat, half_lat),
+                             lon0 + rng.uniform(-half_lon, half_lon))
+                            for i in range(len(coordinates), len(coordinates) + extra_nodes)]
+        if not coordinates:
+            raise ValueError("No nodes to simulate")
+
+        network = MeshNetwork.from_coordinates(coordinates, sim_config)
+        return FloodSimulator(network).run(duration)
+
     def update_simulation(self):
         """
         Update simulation state (call periodically).
@@ -0,0 +1,581 @@
+"""
+Native system introspection for MeshForge status paths
+
+Status pages used to fork a tool for every fact they showed: `df -h /`
+for disk use, `pgrep -f` to find rnsd, `ip -j addr` and `ss -tulnp` for
+the network page, `lsusb` for the device scanner, `vcgencmd` for the Pi
+temperature. On a Pi each fork+exec costs tens of milliseconds and most
+of a core while it runs; the same numbers are all in the kernel's own
+interfaces:
+
+    disk_usage()          os.statvfs
+    list_processes()      /proc/<pid>/comm + cmdline
+    find_processes()      pgrep -f equivalent over list_processes()
+    network_interfaces()  /sys/class/net + rtnetlink RTM_GETADDR
+                          (/proc/net/if_inet6 if netlink is unavailable)
+    listening_sockets()   /proc/net/{tcp,udp}{,6} + /proc/<pid>/fd inodes
+    usb_devices()         /sys/bus/usb/devices
+    cpu_temperature()     /sys/class/thermal
+
+Every reader keeps its result for a couple of seconds (per arguments),
+so several panels asking in the same refresh share one read. Results
+are shared between callers: treat them as read-only.
+
+Benchmark against the subprocess versions:
+    python3 -m utils.sysinfo --benchmark
+"""
+
+import logging
+import os
+import re
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default result lifetime (seconds)
+CACHE_TTL = 2.0
+
+_cache: Dict[Tuple, Tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(ttl: float = CACHE_TTL):
+    """Keep a function's result for ttl seconds, per positional/keyword arguments"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _cache_lock:
+                hit = _cache.get(key)
+                if hit is not None and now - hit[0] < ttl:
+                    return hit[1]
+            result = func(*args, **kwargs)
+            with _cache_lock:
+                _cache[key] = (now, result)
+            return result
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def clear_cache() -> None:
+    """Forget every cached reading"""
+    with _cache_lock:
+        _cache.clear()
+
+
+# ============================================================================
+# Disk
+# ============================================================================
+
+@dataclass(frozen=True)
+class DiskUsage:
+    """Filesystem usage in bytes; percent matches df's Use% column."""
+    path: str
+    total: int
+    used: int
+    free: int          # available to unprivileged users
+    percent: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@_cached(ttl=10.0)
+def disk_usage(path: str = '/') -> Optional[DiskUsage]:
+    """statvfs(path), or None if the path can't be read"""
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    # df: used / (used + available), rounded up
+    usable = used + free
+    percent = -(-used * 100 // usable) if usable else 0
+    return DiskUsage(path=path, total=total, used=used, free=free, percent=int(percent))
+
+
+# ============================================================================
+# Processes
+# ============================================================================
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    name: str                   # /proc/<pid>/comm (kernel truncates to 15 chars)
+    argv: Tuple[str, ...]
+
+    @property
+    def cmdline(self) -> str:
+        """Command line as pgrep -f matches it"""
+        return ' '.join(self.argv) if self.argv else self.name
+
+
+def _read_process(proc_root: str, pid: str) -> Optional[ProcessInfo]:
+    base = os.path.join(proc_root, pid)
+    try:
+        with open(os.path.join(base, 'comm'), 'rb') as f:
+            name = f.read().strip().decode(errors='replace')
+        with open(os.path.join(base, 'cmdline'), 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None     # exited while we looked
+    argv = tuple(arg.decode(errors='replace') for arg in raw.split(b'\0') if arg)
+    return ProcessInfo(int(pid), name, argv)
+
+
+@_cached(ttl=CACHE_TTL)
+def list_processes(proc_root: str = '/proc') -> List[ProcessInfo]:
+    """Every process on the system (kernel threads have empty argv)"""
+    try:
+        pids = [entry for entry in os.listdir(proc_root) if entry.isdigit()]
+    except OSError:
+        return []
+    processes = []
+    for pid in pids:
+        info = _read_process(proc_root, pid)
+        if info is not None:
+            processes.append(info)
+    return processes
+
+
+def find_processes(pattern: str, full: bool = True, fresh: bool = False,
+                   proc_root: str = '/proc') -> List[ProcessInfo]:
+    """
+    Processes whose command line (full=True, like pgrep -f) or name
+    (like pgrep) matches the regular expression pattern.
+
+    The calling process is never included, as with pgrep. Pass
+    fresh=True when the answer drives an action (kill, restart) and a
+    process list up to CACHE_TTL old is not good enough.
+    """
+    regex = re.compile(pattern)
+    own_pid = os.getpid()
+    processes = list_processes.uncached(proc_root) if fresh else list_processes(proc_root)
+    return [proc for proc in processes
+            if proc.pid != own_pid
+            and regex.search(proc.cmdline if full else proc.name)]
+
+
+# ============================================================================
+# Temperature
+# ============================================================================
+
+# Preferred thermal zone types, best first (Pi, x86, generic)
+_CPU_ZONE_TYPES = ('cpu-thermal', 'cpu_thermal', 'x86_pkg_temp', 'soc_thermal', 'coretemp')
+
+
+@_cached(ttl=5.0)
+def cpu_temperature(thermal_root: str = '/sys/class/thermal') -> Optional[float]:
+    """
+    CPU temperature in degrees C from sysfs (what vcgencmd measure_temp
+    reports on a Pi), or None if there is no thermal zone.
+    """
+    zones = []
+    try:
+        names = sorted(n for n in os.listdir(thermal_root) if n.startswith('thermal_zone'))
+    except OSError:
+        return None
+    for zone in names:
+        base = os.path.join(thermal_root, zone)
+        try:
+            with open(os.path.join(base, 'temp')) as f:
+                millidegrees = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        try:
+            with open(os.path.join(base, 'type')) as f:
+                zone_type = f.read().strip()
+        except OSError:
+            zone_type = ''
+        zones.append((zone_type, millidegrees / 1000.0))
+    if not zones:
+        return None
+    for preferred in _CPU_ZONE_TYPES:
+        for zone_type, temp in zones:
+            if zone_type == preferred:
+                return round(temp, 1)
+    return round(zones[0][1], 1)
+
+
+# ============================================================================
+# Network interfaces
+# ============================================================================
+
+# net/if.h flags
+_IFF_FLAGS = ((0x1, 'UP'), (0x2, 'BROADCAST'), (0x8, 'LOOPBACK'),
+              (0x10, 'POINTOPOINT'), (0x40, 'RUNNING'), (0x100, 'PROMISC'),
+              (0x1000, 'MULTICAST'))
+
+# rtnetlink constants (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h)
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_RTM_NEWADDR = 20
+_RTM_GETADDR = 22
+_NLM_F_REQUEST = 0x1
+_NLM_F_DUMP = 0x300
+_IFA_ADDRESS = 1
+_IFA_LOCAL = 2
+_IFA_LABEL = 3
+_NLMSG_HDR = struct.Struct('=IHHII')
+_IFADDRMSG = struct.Struct('=BBBBI')
+_RTATTR = struct.Struct('=HH')
+
+_SCOPES = {0: 'global', 200: 'site', 253: 'link', 254: 'host', 255: 'nowhere'}
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _netlink_addresses() -> List[Tuple[int, Dict[str, Any]]]:
+    """(ifindex, addr_info) for every address, via one RTM_GETADDR dump"""
+    addresses = []
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, 0) as sock:   # NETLINK_ROUTE
+        sock.settimeout(2.0)
+        sock.bind((0, 0))
+        payload = _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(payload), _RTM_GETADDR,
+                                  _NLM_F_REQUEST | _NLM_F_DUMP, 1, 0) + payload)
+        while True:
+            data = sock.recv(65536)
+            offset = 0
+            while offset + _NLMSG_HDR.size <= len(data):
+                length, msg_type, _, _, _ = _NLMSG_HDR.unpack_from(data, offset)
+                if length < _NLMSG_HDR.size:
+                    return addresses
+                if msg_type == _NLMSG_DONE:
+                    return addresses
+                if msg_type == _NLMSG_ERROR:
+                    raise OSError("netlink RTM_GETADDR failed")
+                if msg_type == _RTM_NEWADDR:
+                    addresses.append(_parse_ifaddr(data, offset + _NLMSG_HDR.size,
+                                                   offset + length))
+                offset += (length + 3) & ~3
+
+
+def _parse_ifaddr(data: bytes, start: int, end: int) -> Tuple[int, Dict[str, Any]]:
+    family, prefixlen, _, scope, index = _IFADDRMSG.unpack_from(data, start)
+    attrs = {}
+    offset = start + _IFADDRMSG.size
+    while offset + _RTATTR.size <= end:
+        length, attr_type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[attr_type] = data[offset + _RTATTR.size:offset + length]
+        offset += (length + 3) & ~3
+    raw = attrs.get(_IFA_LOCAL) or attrs.get(_IFA_ADDRESS, b'')
+    info = {
+        'family': 'inet6' if family == socket.AF_INET6 else 'inet',
+        'local': socket.inet_ntop(family, raw) if raw else '',
+        'prefixlen': prefixlen,
+        'scope': _SCOPES.get(scope, str(scope)),
+    }
+    if _IFA_LABEL in attrs:
+        info['label'] = attrs[_IFA_LABEL].rstrip(b'\0').decode(errors='replace')
+    return index, info
+
+
+def _inet6_addresses(path: str = '/proc/net/if_inet6') -> List[Tuple[int, Dict[str, Any]]]:
+    """IPv6 addresses from procfs (netlink fallback; procfs has no IPv4 list)"""
+    addresses = []
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 6:
+                    continue
+                hex_addr, index, prefixlen, scope = parts[0], parts[1], parts[2], parts[3]
+                local = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(hex_addr))
+                addresses.append((int(index, 16), {
+                    'family': 'inet6', 'local': local, 'prefixlen': int(prefixlen, 16),
+                    'scope': {0x00: 'global', 0x10: 'host', 0x20: 'link'}.get(
+                        int(scope, 16), str(int(scope, 16))),
+                }))
+    except (OSError, ValueError):
+        pass
+    return addresses
+
+
+@_cached(ttl=5.0)
+def network_interfaces(sys_net: str = '/sys/class/net') -> List[Dict[str, Any]]:
+    """
+    Interfaces in the shape of `ip -j addr`: ifindex, ifname, flags, mtu,
+    operstate, address (MAC) and addr_info, plus rx/tx byte counters.
+    """
+    interfaces = []
+    by_index = {}
+    try:
+        names = sorted(os.listdir(sys_net))
+    except OSError:
+        names = []
+    for name in names:
+        base = os.path.join(sys_net, name)
+        try:
+            index = int(_read_text(os.path.join(base, 'ifindex')) or 0)
+            flags_value = int(_read_text(os.path.join(base, 'flags')) or '0', 16)
+            mtu = int(_read_text(os.path.join(base, 'mtu')) or 0)
+        except ValueError:
+            continue
+        iface = {
+            'ifindex': index,
+            'ifname': name,
+            'flags': [flag for bit, flag in _IFF_FLAGS if flags_value & bit],
+            'mtu': mtu,
+            'operstate': (_read_text(os.path.join(base, 'operstate')) or 'unknown').upper(),
+            'address': _read_text(os.path.join(base, 'address')) or '',
+            'addr_info': [],
+            'stats': {},
+        }
+        for counter in ('rx_bytes', 'tx_bytes', 'rx_packets', 'tx_packets',
+                        'rx_errors', 'tx_errors'):
+            value = _read_text(os.path.join(base, 'statistics', counter))
+            if value is not None and value.isdigit():
+                iface['stats'][counter] = int(value)
+        interfaces.append(iface)
+        by_index[index] = iface
+
+    try:
+        addresses = _netlink_addresses()
+    except (OSError, AttributeError) as e:
+        # No AF_NETLINK (non-Linux) or a locked-down sandbox
+        logger.debug(f"netlink address dump unavailable: {e}")
+        addresses = _inet6_addresses()
+    for index, info in addresses:
+        iface = by_index.get(index)
+        if iface is not None:
+            iface['addr_info'].append(info)
+    return interfaces
+
+
+# ============================================================================
+# Sockets
+# ============================================================================
+
+@_cached(ttl=CACHE_TTL)
+def listening_sockets() -> List[Dict[str, Any]]:
+    """
+    Listening TCP and bound UDP sockets with their owning process: the
+    information `ss -tulnp` prints. Process names need permission to
+    read other users' /proc/<pid>/fd (root), as with ss -p.
+    """
+    try:
+        from utils.network_diag import read_sockets
+    except ImportError:
+        from .network_diag import read_sockets
+
+    sockets = []
+    for entry in (read_sockets(('tcp', 'tcp6'), states=('LISTEN',), with_process=True)
+                  + read_sockets(('udp', 'udp6'), with_process=True)):
+        sockets.append({
+            'protocol': entry['protocol'],
+            'ip': entry['ip'],
+            'port': entry['port'],
+            'state': 'LISTEN' if entry['protocol'].startswith('tcp') else 'UNCONN',
+            'inode': entry['inode'],
+            'process': entry['process'],
+        })
+    return sockets
+
+
+def format_sockets(sockets: List[Dict[str, Any]]) -> str:
+    """listening_sockets() as an ss -tulnp style table"""
+    lines = [f"{'Netid':<6} {'State':<7} {'Local Address:Port':<40} Process"]
+    for sock in sockets:
+        ip = f"[{sock['ip']}]" if ':' in sock['ip'] else sock['ip']
+        lines.append(f"{sock['protocol']:<6} {sock['state']:<7} "
+                     f"{ip + ':' + str(sock['port']):<40} {sock['process']}".rstrip())
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================================================
+# USB
+# ============================================================================
+
+@dataclass(frozen=True)
+class UsbDevice:
+    """One USB device as lsusb lists it, from sysfs."""
+    bus: str             # zero-padded like lsusb: '001'
+    device: str          # '003'
+    vendor_id: str       # '1a86'
+    product_id: str      # '7523'
+    manufacturer: str = ''
+    product: str = ''
+    serial: str = ''
+    driver: str = ''     # interface driver (cp210x, ch341, ...) when bound
+    path: str = ''       # sysfs directory
+
+    @property
+    def usb_id(self) -> str:
+        return f"{self.vendor_id}:{self.product_id}"
+
+    @property
+    def description(self) -> str:
+        return ' '.join(part for part in (self.manufacturer, self.product) if part)
+
+
+def _interface_driver(device_dir: str) -> str:
+    """Driver bound to the device's first interface that has one"""
+    try:
+        entries = sorted(os.listdir(device_dir))
+    except OSError:
+        return ''
+    for entry in entries:
+        if ':' not in entry:
+            continue
+        link = os.path.join(device_dir, entry, 'driver')
+        if os.path.islink(link):
+            return os.path.basename(os.readlink(link))
+    link = os.path.join(device_dir, 'driver')
+    if os.path.islink(link):
+        return os.path.basename(os.readlink(link))
+    return ''
+
+
+def usb_sysfs_available(usb_root: str = '/sys/bus/usb/devices') -> bool:
+    return os.path.isdir(usb_root)
+
+
+@_cached(ttl=5.0)
+def usb_devices(usb_root: str = '/sys/bus/usb/devices') -> List[UsbDevice]:
+    """Every USB device (root hubs included, as lsusb does), by bus and device number"""
+    devices = []
+    try:
+        entries = os.listdir(usb_root)
+    except OSError:
+        return devices
+    for entry in entries:
+        if ':' in entry:
+            continue        # interfaces (1-1.2:1.0), not devices
+        base = os.path.join(usb_root, entry)
+        vendor = _read_text(os.path.join(base, 'idVendor'))
+        product = _read_text(os.path.join(base, 'idProduct'))
+        busnum = _read_text(os.path.join(base, 'busnum'))
+        devnum = _read_text(os.path.join(base, 'devnum'))
+        if not (vendor and product and busnum and devnum):
+            continue
+        try:
+            bus, dev = f"{int(busnum):03d}", f"{int(devnum):03d}"
+        except ValueError:
+            continue
+        devices.append(UsbDevice(
+            bus=bus,
+            device=dev,
+            vendor_id=vendor.lower(),
+            product_id=product.lower(),
+            manufacturer=_read_text(os.path.join(base, 'manufacturer')) or '',
+            product=_read_text(os.path.join(base, 'product')) or '',
+            serial=_read_text(os.path.join(base, 'serial')) or '',
+            driver=_interface_driver(base),
+            path=base,
+        ))
+    devices.sort(key=lambda d: (d.bus, d.device))
+    return devices
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def _measure(func: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    """Wall ms per call and CPU ms per call (this process + reaped children)"""
+    import resource
+
+    def cpu() -> float:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+    cpu_start, wall_start = cpu(), time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return {
+        'wall_ms': (time.perf_counter() - wall_start) * 1000 / rounds,
+        'cpu_ms': (cpu() - cpu_start) * 1000 / rounds,
+    }
+
+
+def _run_tool(argv: List[str]) -> Callable[[], Any]:
+    import subprocess
+
+    def run():
+        subprocess.run(argv, capture_output=True, text=True, timeout=10)
+    return run
+
+
+def benchmark(rounds: int = 20) -> List[Dict[str, Any]]:
+    """Native readers (uncached) against the commands they replace"""
+    import shutil
+
+    cases = [
+        ('disk', lambda: disk_usage.uncached('/'), ['df', '-h', '/']),
+        ('processes', lambda: [p for p in list_processes.uncached() if 'rnsd' in p.cmdline],
+         ['pgrep', '-f', 'rnsd']),
+        ('interfaces', lambda: network_interfaces.uncached(), ['ip', '-j', 'addr']),
+        ('sockets', lambda: listening_sockets.uncached(), ['ss', '-tulnp']),
+        ('usb', lambda: usb_devices.uncached(), ['lsusb']),
+        ('temperature', lambda: cpu_temperature.uncached(), ['vcgencmd', 'measure_temp']),
+    ]
+    results = []
+    for name, native, command in cases:
+        row = {'name': name, 'command': ' '.join(command), 'native': _measure(native, rounds)}
+        if shutil.which(command[0]):
+            row['subprocess'] = _measure(_run_tool(command), rounds)
+        results.append(row)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry: python3 -m utils.sysinfo"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="MeshForge native system introspection")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Compare native readers with the tools they replace")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        usage = disk_usage('/')
+        snapshot = {
+            'disk': usage.to_dict() if usage else None,
+            'temperature': cpu_temperature(),
+            'interfaces': network_interfaces(),
+            'listening': listening_sockets(),
+            'usb': [asdict(d) for d in usb_devices()],
+        }
+        print(json.dumps(snapshot, indent=2))
+        return 0
+
+    results = benchmark(args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'reader':<12} {'native wall':>12} {'native cpu':>11} "
+          f"{'fork wall':>10} {'fork cpu':>9}  command")
+    for row in results:
+        native, forked = row['native'], row.get('subprocess')
+        fork_cols = (f"{forked['wall_ms']:>8.2f}ms {forked['cpu_ms']:>7.2f}ms"
+                     if forked else f"{'n/a':>10} {'n/a':>9}")
+        print(f"{row['name']:<12} {native['wall_ms']:>10.2f}ms {native['cpu_ms']:>9.2f}ms "
+              f"{fork_cols}  {row['command']}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,605 @@
+"""
+Shared system state for MeshForge UIs
+
+The GTK status bar, the TUI dashboard, the web API and the diagnostics
+engine all want the same few facts: are meshtasticd and rnsd running,
+since when, are their ports open, how many nodes are on the mesh. Each
+used to find out on its own every few seconds (systemctl is-active,
+pgrep, systemctl show, a full `meshtastic --nodes` run), so a Pi with
+two UIs open was forking a dozen processes per refresh.
+
+SystemStatePoller does that work once per interval for the whole
+process and keeps the result as an immutable SystemState:
+
+- one `systemctl show` call covers every watched unit (state, enablement
+  and start time);
+- TCP ports are connect-checked in-process;
+- services not active under systemd are looked for in /proc instead of
+  with pgrep;
+- the node count comes from the shared node monitor (CLI as fallback)
+  and is refreshed at most every NODE_COUNT_TTL seconds, only while the
+  meshtasticd port is open.
+
+Between polls the poller stats systemd's per-unit invocation links, so
+a service start, stop or restart is picked up within about a second
+without waiting for the next full poll.
+
+Consumers read the cached state or subscribe to change events.
+Callbacks run on the poller thread; UI code hands them to its own main
+loop (GLib.idle_add, App.call_from_thread, a queue for SSE).
+
+Usage:
+    from utils.system_state import get_system_state
+
+    state = get_system_state().get()
+    if state.is_running('meshtasticd'):
+        print(format_uptime(state.uptime('meshtasticd')))
+
+    unsubscribe = get_system_state().subscribe(
+        lambda state, changes: GLib.idle_add(self._show_state, state))
+"""
+
+import atexit
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from utils.service_check import check_port
+    from utils.sysinfo import list_processes
+except ImportError:
+    from .service_check import check_port
+    from .sysinfo import list_processes
+
+logger = logging.getLogger(__name__)
+
+# Full poll period (seconds)
+POLL_INTERVAL = 5.0
+
+# How often invocation links are checked between polls (seconds)
+WATCH_INTERVAL = 1.0
+
+# Node count refresh period (seconds); counting needs a device connection
+NODE_COUNT_TTL = 30.0
+
+# Services watched by default and the TCP port each listens on (None: no port)
+DEFAULT_SERVICES: Dict[str, Optional[int]] = {
+    'meshtasticd': 4403,
+    'rnsd': 37428,
+}
+
+_SYSTEMD_PROPERTIES = ('Id', 'LoadState', 'ActiveState', 'SubState',
+                       'UnitFileState', 'ActiveEnterTimestampMonotonic')
+
+_INVOCATION_LINK = '/run/systemd/units/invocation:{}.service'
+
+
+@dataclass(frozen=True)
+class UnitState:
+    """One service as seen by systemd and /proc."""
+    name: str
+    active: str = 'unknown'           # ActiveState: active, inactive, failed, ...
+    sub: str = ''                     # SubState: running, dead, ...
+    enabled: str = ''                 # UnitFileState: enabled, disabled, static, ...
+    loaded: bool = True               # False when systemd has no such unit
+    active_since: Optional[float] = None   # epoch seconds the unit became active
+    process: bool = False             # found in /proc (started outside systemd)
+
+    @property
+    def running(self) -> bool:
+        return self.active == 'active' or self.process
+
+    @property
+    def status(self) -> str:
+        """Short text for UIs: 'active', 'inactive', 'running (process)', ..."""
+        if self.active == 'active':
+            return 'active'
+        if self.process:
+            return 'running (process)'
+        if not self.loaded:
+            return 'not installed'
+        return self.active
+
+
+@dataclass(frozen=True)
+class SystemState:
+    """A snapshot of everything the poller watches."""
+    services: Dict[str, UnitState] = field(default_factory=dict)
+    ports: Dict[int, bool] = field(default_factory=dict)
+    service_ports: Dict[str, Optional[int]] = field(default_factory=dict)
+    node_count: Optional[int] = None
+    updated: float = 0.0              # epoch seconds of the poll
+    systemd: bool = True              # False when systemctl is unavailable
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated
+
+    def service(self, name: str) -> Optional[UnitState]:
+        return self.services.get(name)
+
+    def port_open(self, name: str) -> bool:
+        """Whether service name's TCP port accepted a connection"""
+        port = self.service_ports.get(name)
+        return port is not None and self.ports.get(port, False)
+
+    def is_running(self, name: str) -> bool:
+        """Running under systemd, as a process, or answering on its port"""
+        unit = self.services.get(name)
+        return (unit is not None and unit.running) or self.port_open(name)
+
+    def uptime(self, name: str) -> Optional[float]:
+        """Seconds since systemd started name (None if unknown)"""
+        unit = self.services.get(name)
+        if unit is None or unit.active != 'active' or unit.active_since is None:
+            return None
+        return max(0.0, time.time() - unit.active_since)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'services': {
+                name: {
+                    'running': self.is_running(name),
+                    'status': unit.status,
+                    'active_state': unit.active,
+                    'sub_state': unit.sub,
+                    'enabled': unit.enabled,
+                    'port': self.service_ports.get(name),
+                    'port_open': self.port_open(name),
+                    'uptime': self.uptime(name),
+                }
+                for name, unit in self.services.items()
+            },
+            'ports': {str(port): is_open for port, is_open in self.ports.items()},
+            'node_count': self.node_count,
+            'updated': self.updated,
+            'systemd': self.systemd,
+        }
+
+
+class StateChange(NamedTuple):
+    """One changed fact: key is 'service:<name>', 'port:<n>' or 'node_count'."""
+    key: str
+    old: Any
+    new: Any
+
+
+def diff_states(old: Optional[SystemState], new: SystemState) -> List[StateChange]:
+    """What changed between two snapshots (everything, if old is None)"""
+    changes = []
+    old_services = old.services if old else {}
+    for name, unit in new.services.items():
+        before = old_services.get(name)
+        if before is None or before.status != unit.status \
+                or before.active_since != unit.active_since:
+            changes.append(StateChange(f'service:{name}',
+                                       before.status if before else None, unit.status))
+    old_ports = old.ports if old else {}
+    for port, is_open in new.ports.items():
+        if old_ports.get(port) != is_open:
+            changes.append(StateChange(f'port:{port}', old_ports.get(port), is_open))
+    if old is None or old.node_count != new.node_count:
+        changes.append(StateChange('node_count', old.node_count if old else None,
+                                   new.node_count))
+    return changes
+
+
+def format_uptime(seconds: Optional[float]) -> str:
+    """Compact uptime: '3d 4h', '2h 15m', '7m' ('--' if unknown)"""
+    if seconds is None or seconds < 0:
+        return "--"
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    if hours > 24:
+        return f"{hours // 24}d {hours % 24}h"
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def parse_systemctl_show(output: str) -> Dict[str, Dict[str, str]]:
+    """
+    Split `systemctl show a.service b.service --property=...` output.
+
+    Units are separated by blank lines; returns {unit name without
+    '.service': {property: value}}.
+    """
+    units = {}
+    for block in re.split(r'\n\s*\n', output.strip()):
+        props = {}
+        for line in block.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                props[key.strip()] = value.strip()
+        unit_id = props.get('Id', '')
+        if unit_id:
+            units[unit_id[:-len('.service')] if unit_id.endswith('.service') else unit_id] = props
+    return units
+
+
+def _monotonic_usec_to_epoch(value: str) -> Optional[float]:
+    """systemd CLOCK_MONOTONIC microseconds -> epoch seconds"""
+    try:
+        usec = int(value)
+    except (TypeError, ValueError):
+        return None
+    if usec <= 0:
+        return None
+    # Rounded so the same start time compares equal across polls
+    return float(round(time.time() - (time.monotonic() - usec / 1_000_000)))
+
+
+def scan_processes(names: Iterable[str], proc_root: str = '/proc') -> Dict[str, bool]:
+    """
+    Which of names have a running process, by /proc comm and argv[0..1].
+
+    Stands in for `pgrep -f name`: one pass over /proc for all names,
+    no subprocess. Interpreted daemons (python3 /usr/bin/rnsd) match on
+    the script name.
+    """
+    wanted = set(names)
+    found = {name: False for name in wanted}
+    own_pid = os.getpid()
+    for proc in list_processes(proc_root):
+        if proc.pid == own_pid:
+            continue
+        candidates = {proc.name, *(os.path.basename(arg) for arg in proc.argv[:2])}
+        for name in wanted & candidates:
+            found[name] = True
+    return found
+
+
+def _web_client_mode() -> bool:
+    """The user has asked MeshForge not to hold device connections"""
+    try:
+        try:
+            from utils.common import SettingsManager
+        except ImportError:
+            from .common import SettingsManager
+        return bool(SettingsManager().get("web_client_mode", False))
+    except Exception:
+        return False
+
+
+def count_nodes(host: str = 'localhost', port: int = 4403) -> Optional[int]:
+    """
+    Nodes known to meshtasticd, or None if it can't be asked.
+
+    Never holds meshtasticd's single client slot between polls: reads the
+    shared node monitor only if another consumer already has it connected,
+    then a running multiplexing proxy, and otherwise falls back to one
+    transient `meshtastic --nodes` run.
+    """
+    if _web_client_mode():
+        return None
+    try:
+        from monitoring.monitor_service import get_monitor_service
+        service = get_monitor_service(host, port)
+        if service.is_connected:
+            return len(service.get_nodes())
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"Shared monitor node count failed: {e}")
+
+    try:
+        try:
+            from utils.meshtastic_proxy import get_proxy_endpoint, get_proxy_nodes
+        except ImportError:
+            from .meshtastic_proxy import get_proxy_endpoint, get_proxy_nodes
+        if get_proxy_endpoint(host, port):
+            nodes = get_proxy_nodes()
+            if nodes is not None:
+                return len(nodes)
+    except ImportError:
+        pass
+
+    try:
+        try:
+            from utils.cli import find_meshtastic_cli
+        except ImportError:
+            from .cli import find_meshtastic_cli
+        cli_path = find_meshtastic_cli()
+    except ImportError:
+        cli_path = shutil.which('meshtastic')
+    if not cli_path:
+        return None
+    try:
+        result = subprocess.run([cli_path, '--host', host, '--nodes'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.debug(f"meshtastic --nodes failed: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return len(set(re.findall(r'!([0-9a-fA-F]{8})', result.stdout)))
+
+
+Subscriber = Callable[[SystemState, List[StateChange]], None]
+
+
+class SystemStatePoller:
+    """
+    Polls services, ports and node count once per interval for everyone.
+
+    The background thread starts on first use (get(), subscribe() or
+    start()); refresh() polls synchronously and is safe to call from any
+    thread - concurrent callers share one poll.
+    """
+
+    def __init__(self, services: Optional[Dict[str, Optional[int]]] = None,
+                 interval: float = POLL_INTERVAL,
+                 node_count_ttl: float = NODE_COUNT_TTL,
+                 runner: Callable[..., Any] = subprocess.run,
+                 port_check: Callable[[int], bool] = check_port,
+                 node_counter: Optional[Callable[[], Optional[int]]] = count_nodes,
+                 proc_root: str = '/proc',
+                 watch_links: bool = True,
+                 autostart: bool = True):
+        """
+        Args:
+            services: {service name: TCP port or None} (default DEFAULT_SERVICES)
+            interval: Seconds between full polls
+            node_count_ttl: Seconds a node count is reused
+            runner: subprocess.run stand-in (tests)
+            port_check: check_port stand-in, called with the port number
+            node_counter: Returns the node count or None; None disables counting
+            proc_root: /proc mount point (tests)
+            watch_links: Poll early when a unit's invocation link changes
+            autostart: Start the thread on first get()/subscribe()
+        """
+        self.service_ports = dict(DEFAULT_SERVICES if services is None else services)
+        self.interval = interval
+        self.node_count_ttl = node_count_ttl
+        self.runner = runner
+        self.port_check = port_check
+        self.node_counter = node_counter
+        self.proc_root = proc_root
+        self.watch_links = watch_links
+        self.autostart = autostart
+
+        self._state: Optional[SystemState] = None
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()           # state + subscribers
+        self._poll_lock = threading.Lock()      # one poll at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._node_count: Optional[int] = None
+        self._node_count_at = 0.0
+        self._links: Tuple = ()
+        self.polls = 0
+
+    # === Reading ===
+
+    def get(self, max_age: Optional[float] = None) -> SystemState:
+        """
+        Latest state, polling first if there is none (or it is older
+        than max_age seconds). Starts the background poller.
+        """
+        if self.autostart:
+            self.start()
+        state = self.peek()
+        if state is None or (max_age is not None and state.age > max_age):
+            state = self.refresh()
+        return state
+
+    def peek(self) -> Optional[SystemState]:
+        """Latest state without polling (None before the first poll)"""
+        with self._lock:
+            return self._state
+
+    # === Change events ===
+
+    def subscribe(self, callback: Subscriber, initial: bool = True) -> Callable[[], None]:
+        """
+        Call callback(state, changes) after every poll that changed something.
+
+        With initial=True the callback also gets the current state right
+        away (from the calling thread if a state exists, else after the
+        first poll). Returns a function that unsubscribes.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            state = self._state
+        if initial and state is not None:
+            self._notify([callback], state, diff_states(None, state))
+        if self.autostart:
+            self.start()
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, callbacks: List[Subscriber], state: SystemState,
+                changes: List[StateChange]) -> None:
+        for callback in callbacks:
+            try:
+                callback(state, changes)
+            except Exception as e:
+                logger.error(f"System state subscriber "
+                             f"{getattr(callback, '__name__', callback)} failed: {e}")
+
+    # === Polling ===
+
+    def refresh(self) -> SystemState:
+        """Poll now and publish any changes; returns the new state"""
+        polls = self.polls
+        with self._poll_lock:
+            if self.polls != polls:
+                # Another thread polled while we waited; share its result
+                return self.peek()
+            state = self._poll()
+            with self._lock:
+                previous, self._state = self._state, state
+                subscribers = list(self._subscribers)
+            self.polls += 1
+        changes = diff_states(previous, state)
+        if changes:
+            logger.debug(f"System state changed: {[c.key for c in changes]}")
+            self._notify(subscribers, state, changes)
+        return state
+
+    def _poll(self) -> SystemState:
+        units, systemd = self._query_systemd()
+        ports = {}
+        for port in sorted({p for p in self.service_ports.values() if p}):
+            try:
+                ports[port] = bool(self.port_check(port))
+            except Exception:
+                ports[port] = False
+
+        # Only look in /proc for services systemd doesn't report as active
+        missing = [name for name, unit in units.items() if unit.active != 'active']
+        if missing:
+            running = scan_processes(missing, self.proc_root)
+            for name in missing:
+                if running.get(name):
+                    units[name] = replace(units[name], process=True)
+
+        meshtasticd_port = self.service_ports.get('meshtasticd')
+        mesh_up = bool(ports.get(meshtasticd_port)) if meshtasticd_port else False
+        return SystemState(
+            services=units,
+            ports=ports,
+            service_ports=dict(self.service_ports),
+            node_count=self._current_node_count(mesh_up),
+            updated=time.time(),
+            systemd=systemd,
+        )
+
+    def _query_systemd(self) -> Tuple[Dict[str, UnitState], bool]:
+        """Every watched unit from one `systemctl show` call"""
+        names = list(self.service_ports)
+        units = {name: UnitState(name) for name in names}
+        if not names:
+            return units, True
+        try:
+            result = self.runner(
+                ['systemctl', 'show', *[f'{name}.service' for name in names],
+                 f"--property={','.join(_SYSTEMD_PROPERTIES)}", '--no-pager'],
+                capture_output=True, text=True, timeout=5)
+        except FileNotFoundError:
+            return units, False
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug(f"systemctl show failed: {e}")
+            return units, True
+
+        for name, props in parse_systemctl_show(result.stdout or '').items():
+            if name not in units:
+                continue
+            units[name] = UnitState(
+                name=name,
+                active=props.get('ActiveState', 'unknown') or 'unknown',
+                sub=props.get('SubState', ''),
+                enabled=props.get('UnitFileState', ''),
+                loaded=props.get('LoadState', 'loaded') != 'not-found',
+                active_since=_monotonic_usec_to_epoch(
+                    props.get('ActiveEnterTimestampMonotonic', '')),
+            )
+        return units, True
+
+    def _current_node_count(self, mesh_up: bool) -> Optional[int]:
+        if self.node_counter is None:
+            return None
+        if not mesh_up:
+            self._node_count, self._node_count_at = None, 0.0
+            return None
+        now = time.monotonic()
+        if self._node_count_at and now - self._node_count_at < self.node_count_ttl:
+            return self._node_count
+        try:
+            count = self.node_counter()
+        except Exception as e:
+            logger.debug(f"Node count failed: {e}")
+            count = None
+        if count is not None:
+            self._node_count = count
+        # Failed counts are retried on the same schedule, not every poll
+        self._node_count_at = now
+        return self._node_count
+
+    def _link_fingerprint(self) -> Tuple:
+        """lstat of each unit's invocation link: changes on start/stop/restart"""
+        fingerprint = []
+        for name in self.service_ports:
+            try:
+                st = os.lstat(_INVOCATION_LINK.format(name))
+                fingerprint.append((st.st_ino, st.st_mtime_ns))
+            except OSError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
+    # === Thread ===
+
+    def start(self) -> None:
+        """Start the background poller (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='system-state',
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        next_poll = 0.0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            links = self._link_fingerprint() if self.watch_links else ()
+            if now >= next_poll or links != self._links:
+                self._links = links
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"System state poll failed: {e}")
+                next_poll = time.monotonic() + self.interval
+            wait = min(WATCH_INTERVAL, self.interval) if self.watch_links else self.interval
+            self._stop.wait(max(0.0, min(wait, next_poll - time.monotonic())))
+
+
+_poller: Optional[SystemStatePoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_system_state() -> SystemStatePoller:
+    """The process-wide poller"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = SystemStatePoller()
+            atexit.register(_poller.stop)
+        return _poller
+
+
+def peek_system_state(max_age: float = POLL_INTERVAL * 2) -> Optional[SystemState]:
+    """
+    The shared state if a poller is already running and its state is
+    recent, else None. For callers that can do their own check and
+    should not start a poller just to answer once.
+    """
+    poller = _poller
+    if poller is None or not poller.running:
+        return None
+    state = poller.peek()
+    if state is None or state.age > max_age:
+        return None
+    return state
@@ -0,0 +1,785 @@
+"""
+MeshForge Telemetry Store
+
+Embedded time-series storage for per-node telemetry (battery, voltage,
+temperature, ...) and link metrics (SNR, RSSI), so there is history for
+trend analysis and spotting failing nodes.
+
+Layout (one SQLite file, ~/.local/share/meshforge/telemetry.db):
+- One series per (node, metric). Samples are stored in columnar chunks:
+  packed arrays of time offsets and values, zlib-compressed, one row
+  per chunk - about 8 bytes per raw sample before compression
+- Three levels: raw samples, 1-minute and 1-hour rollups (min/max/sum/
+  count per bucket). Rollups are aggregated as samples arrive, never
+  re-read from raw
+- New samples collect in memory and are appended as small chunks on
+  flush(); compact() merges the chunks of each window into one so a
+  range query touches a handful of rows
+- Each level has a retention period; expired chunks are deleted and the
+  pages handed back with incremental vacuum, so the file stays bounded
+
+Several processes may record (gateway node tracker, UI node monitors):
+chunks are append-only and rollup buckets merge associatively, so
+nothing is overwritten. Readers see other processes' samples once they
+flush (every FLUSH_INTERVAL when started).
+
+Usage:
+    from utils.telemetry_store import get_telemetry_store
+
+    store = get_telemetry_store()
+    store.start()  # background flush / compaction / retention
+    store.record('!abcd1234', {'battery_level': 87, 'snr': 6.25})
+
+    series = store.query('!abcd1234', 'battery_level', start=time.time() - 86400)
+    # {'resolution': 60, 'points': [[ts, min, avg, max], ...], ...}
+"""
+
+import atexit
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import paths helper for proper home directory resolution
+try:
+    from utils.paths import get_real_user_home
+except ImportError:
+    def get_real_user_home() -> Path:
+        sudo_user = os.environ.get('SUDO_USER')
+        if sudo_user and sudo_user != 'root':
+            return Path(f'/home/{sudo_user}')
+        return Path.home()
+
+
+class Level(NamedTuple):
+    """A storage level: bucket size, chunk window and retention (seconds)."""
+    resolution: int   # 0 = raw samples
+    window: int       # chunk span; one compacted row per series per window
+    retention: float
+
+
+# raw -> 1 min -> 1 h
+LEVELS: Tuple[Level, ...] = (
+    Level(0, 6 * 3600, 2 * 86400),
+    Level(60, 86400, 7 * 86400),
+    Level(3600, 30 * 86400, 90 * 86400),
+)
+
+# Background maintenance intervals (seconds)
+FLUSH_INTERVAL = 60.0
+COMPACT_INTERVAL = 600.0
+RETENTION_INTERVAL = 3600.0
+
+# Open windows are compacted once this many rows were appended
+COMPACT_MIN_ROWS = 8
+
+# Flush early once this many samples are waiting in memory
+MAX_PENDING_SAMPLES = 50000
+
+# Auto resolution: raw up to this span, 1-minute rollups up to the next
+RAW_MAX_SPAN = 6 * 3600
+MINUTE_MAX_SPAN = 7 * 86400
+
+# Chunk arrays are stored little-endian
+_SWAP = sys.byteorder != 'little'
+
+# Time columns hold deltas (first one from the window start): report
+# intervals repeat, so they compress to almost nothing
+_RAW_TYPES = ('I', 'f')                    # time delta, value
+_ROLLUP_TYPES = ('I', 'f', 'f', 'f', 'I')  # time delta, min, max, sum, count
+
+_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS series (
+        id INTEGER PRIMARY KEY,
+        node TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        UNIQUE (node, metric)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS chunks (
+        series_id INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        window INTEGER NOT NULL,
+        first INTEGER NOT NULL,
+        last INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        data BLOB NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_chunks_series ON chunks(series_id, level, window)',
+    'CREATE INDEX IF NOT EXISTS idx_chunks_expiry ON chunks(level, last)',
+]
+
+
+def _pack(arrays: Iterable[array]) -> bytes:
+    parts = []
+    for a in arrays:
+        if _SWAP:
+            a = array(a.typecode, a)
+            a.byteswap()
+        parts.append(a.tobytes())
+    return zlib.compress(b''.join(parts), 1)
+
+
+def _unpack(data: bytes, count: int, typecodes: Tuple[str, ...]) -> List[array]:
+    raw = zlib.decompress(data)
+    arrays = []
+    pos = 0
+    for typecode in typecodes:
+        a = array(typecode)
+        size = a.itemsize * count
+        a.frombytes(raw[pos:pos + size])
+        if _SWAP:
+            a.byteswap()
+        arrays.append(a)
+        pos += size
+    return arrays
+
+
+def _deltas(window: int, times: List[int]) -> array:
+    return array('I', (t - prev for prev, t in zip([window] + times, times)))
+
+
+def _times(window: int, deltas: array) -> List[int]:
+    return list(accumulate(deltas, initial=window))[1:]
+
+
+def _f32(value: float) -> float:
+    """Undo float32 noise for display (4.123 not 4.12300014)."""
+    return float(f'{value:.7g}')
+
+
+class _Raw:
+    """Raw samples of one series in one window: timestamp -> value."""
+
+    __slots__ = ('samples',)
+
+    def __init__(self):
+        self.samples: Dict[int, float] = {}
+
+    def add(self, ts: int, value: float):
+        self.samples[ts] = value
+
+    def merge_chunk(self, window: int, data: bytes, count: int):
+        deltas, values = _unpack(data, count, _RAW_TYPES)
+        for ts, value in zip(_times(window, deltas), values):
+            self.samples[ts] = value
+
+    def encode(self, window: int) -> Tuple[int, int, int, bytes]:
+        times = sorted(self.samples)
+        values = array('f', (self.samples[t] for t in times))
+        return times[0], times[-1], len(times), _pack((_deltas(window, times), values))
+
+    def points(self, start: int, end: int) -> List[List[float]]:
+        return [[t, _f32(v)] for t, v in sorted(self.samples.items()) if start <= t <= end]
+
+
+class _Rollup:
+    """Rollup buckets of one series in one window: bucket -> [min, max, sum, count]."""
+
+    __slots__ = ('buckets',)
+
+    def __init__(self):
+        self.buckets: Dict[int, List[float]] = {}
+
+    def add(self, bucket: int, value: float):
+        b = self.buckets.get(bucket)
+        if b is None:
+            self.buckets[bucket] = [value, value, value, 1]
+        else:
+            if value < b[0]:
+                b[0] = value
+            if value > b[1]:
+                b[1] = value
+            b[2] += value
+            b[3] += 1
+
+    def merge_bucket(self, bucket: int, lo: float, hi: float, total: float, count: int):
+        b = self.buckets.get(bucket)
+        if b is None:
+            self.buckets[bucket] = [lo, hi, total, count]
+        else:
+            b[0] = min(b[0], lo)
+            b[1] = max(b[1], hi)
+            b[2] += total
+            b[3] += count
+
+    def merge_chunk(self, window: int, data: bytes, count: int):
+        deltas, lows, highs, totals, counts = _unpack(data, count, _ROLLUP_TYPES)
+        for bucket, lo, hi, total, n in zip(_times(window, deltas),
+                                            lows, highs, totals, counts):
+            self.merge_bucket(bucket, lo, hi, total, n)
+
+    def encode(self, window: int) -> Tuple[int, int, int, bytes]:
+        times = sorted(self.buckets)
+        columns = (
+            _deltas(window, times),
+            array('f', (self.buckets[t][0] for t in times)),
+            array('f', (self.buckets[t][1] for t in times)),
+            array('f', (self.buckets[t][2] for t in times)),
+            array('I', (int(self.buckets[t][3]) for t in times)),
+        )
+        return times[0], times[-1], len(times), _pack(columns)
+
+    def points(self, start: int, end: int) -> List[List[float]]:
+        return [[t, _f32(b[0]), _f32(b[2] / b[3]), _f32(b[1])]
+                for t, b in sorted(self.buckets.items()) if start <= t <= end]
+
+
+def _new_block(level: int):
+    return _Raw() if LEVELS[level].resolution == 0 else _Rollup()
+
+
+class TelemetryStore:
+    """
+    Per-node time series with rollups and retention.
+
+    record() only touches memory (plus a one-off series lookup); disk
+    work happens in flush(), compact() and apply_retention(), which the
+    background thread from start() runs periodically.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None,
+                 retention: Optional[Dict[int, float]] = None):
+        """
+        Args:
+            db_path: SQLite file (default ~/.local/share/meshforge/telemetry.db)
+            retention: Override retention seconds by resolution, e.g. {0: 86400}
+        """
+        self.db_path = Path(db_path) if db_path else self.default_path()
+        self.levels = tuple(
+            level._replace(retention=retention[level.resolution])
+            if retention and level.resolution in retention else level
+            for level in LEVELS
+        )
+        self._lock = threading.Lock()      # pending data and caches
+        self._db_lock = threading.Lock()   # the connection
+        self._series: Dict[Tuple[str, str], int] = {}
+        self._last_ts: Dict[int, int] = {}
+        # (series_id, level, window) -> _Raw/_Rollup not yet on disk
+        self._pending: Dict[Tuple[int, int, int], Any] = {}
+        self._pending_samples = 0
+        # Windows this process appended to -> rows appended since compaction
+        self._dirty: Dict[Tuple[int, int, int], int] = {}
+        self._stats = {'samples': 0, 'flushes': 0, 'chunks_written': 0,
+                       'chunks_compacted': 0, 'chunks_expired': 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn = self._connect()
+
+    @staticmethod
+    def default_path() -> Path:
+        return get_real_user_home() / '.local' / 'share' / 'meshforge' / 'telemetry.db'
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False,
+                               isolation_level=None)
+        # Must precede the first table to take effect on a new file
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for sql in _SCHEMA:
+                conn.execute(sql)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return conn
+
+    # === Recording ===
+
+    def record(self, node_id: str, values: Dict[str, Any],
+               timestamp: Optional[float] = None) -> int:
+        """
+        Record one sample per metric for a node.
+
+        Non-numeric and None values are skipped, as is a repeat of the
+        series' previous timestamp (the same report seen twice).
+
+        Returns:
+            Number of samples recorded
+        """
+        ts = int(timestamp if timestamp is not None else time.time())
+        recorded = 0
+        for metric, value in values.items():
+            if value is None or isinstance(value, bool):
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not math.isfinite(value):
+                continue
+            series_id = self._series_id(node_id, metric)
+            with self._lock:
+                if self._last_ts.get(series_id) == ts:
+                    continue
+                self._last_ts[series_id] = ts
+                for index, level in enumerate(self.levels):
+                    window = ts - ts % level.window
+                    key = (series_id, index, window)
+                    block = self._pending.get(key)
+                    if block is None:
+                        block = self._pending[key] = _new_block(index)
+                    if level.resolution == 0:
+                        block.add(ts, value)
+                    else:
+                        block.add(ts - ts % level.resolution, value)
+                self._pending_samples += 1
+                self._stats['samples'] += 1
+            recorded += 1
+
+        if self._pending_samples >= MAX_PENDING_SAMPLES:
+            self.flush()
+        return recorded
+
+    def _series_id(self, node_id: str, metric: str, create: bool = True) -> Optional[int]:
+        key = (node_id, metric)
+        series_id = self._series.get(key)
+        if series_id is not None:
+            return series_id
+        with self._db_lock:
+            if create:
+                self._conn.execute('INSERT OR IGNORE INTO series (node, metric) VALUES (?, ?)', key)
+            row = self._conn.execute(
+                'SELECT id FROM series WHERE node = ? AND metric = ?', key).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._series[key] = row[0]
+        return row[0]
+
+    # === Disk maintenance ===
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        Append recorded samples as chunks; returns rows written.
+
+        Raw samples are all written. Rollup buckets are written once
+        complete (bucket end <= now), so a 1-hour bucket becomes one
+        row instead of one per flush; open buckets stay in memory and
+        are still visible to query() in this process.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_samples = 0
+            for key, block in list(pending.items()):
+                resolution = self.levels[key[1]].resolution
+                if not resolution:
+                    continue
+                open_buckets = {b: v for b, v in block.buckets.items() if b + resolution > now}
+                if not open_buckets:
+                    continue
+                kept = _Rollup()
+                kept.buckets = open_buckets
+                self._pending[key] = kept
+                if len(open_buckets) == len(block.buckets):
+                    del pending[key]
+                else:
+                    for bucket in open_buckets:
+                        del block.buckets[bucket]
+        if not pending:
+            return 0
+
+        rows = []
+        for (series_id, level, window), block in pending.items():
+            first, last, count, data = block.encode(window)
+            rows.append((series_id, level, window, first, last, count, data))
+
+        try:
+            with self._db_lock:
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._conn.executemany(
+                        'INSERT INTO chunks (series_id, level, window, first, last, count, data) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        except sqlite3.Error as e:
+            # Put the samples back so the next flush retries them
+            logger.warning(f"Telemetry flush failed: {e}")
+            with self._lock:
+                for key, block in pending.items():
+                    self._merge_pending(key, block)
+            return 0
+
+        with self._lock:
+            for key in pending:
+                self._dirty[key] = self._dirty.get(key, 0) + 1
+            self._stats['flushes'] += 1
+            self._stats['chunks_written'] += len(rows)
+        return len(rows)
+
+    def _merge_pending(self, key: Tuple[int, int, int], block):
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = block
+        elif isinstance(block, _Raw):
+            for ts, value in block.samples.items():
+                current.samples.setdefault(ts, value)
+        else:
+            for bucket, b in block.buckets.items():
+                current.merge_bucket(bucket, *b)
+
+    def compact(self, now: Optional[float] = None, min_rows: int = COMPACT_MIN_ROWS) -> int:
+        """
+        Merge the chunk rows of a window into one.
+
+        Only windows this process appended to: closed windows (end <=
+        now) with two or more rows, and open windows once min_rows were
+        appended - so an open window is rewritten every min_rows
+        flushes, not on every pass.
+
+        Returns:
+            Rows merged away
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            due = [key for key, appended in self._dirty.items()
+                   if appended >= min_rows
+                   or key[2] + self.levels[key[1]].window <= now]
+            for key in due:
+                del self._dirty[key]
+        if not due:
+            return 0
+
+        merged = 0
+        with self._db_lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for series_id, level, window in due:
+                    rows = self._conn.execute(
+                        'SELECT rowid, count, data FROM chunks '
+                        'WHERE series_id = ? AND level = ? AND window = ?',
+                        (series_id, level, window)).fetchall()
+                    if len(rows) < 2:
+                        continue
+                    block = _new_block(level)
+                    for _rowid, count, data in rows:
+                        block.merge_chunk(window, data, count)
+                    first, last, count, data = block.encode(window)
+                    self._conn.executemany('DELETE FROM chunks WHERE rowid = ?',
+                                           [(r[0],) for r in rows])
+                    self._conn.execute(
+                        'INSERT INTO chunks (series_id, level, window, first, last, count, data) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (series_id, level, window, first, last, count, data))
+                    merged += len(rows) - 1
+                self._conn.execute('COMMIT')
+            except Exception as e:
+                self._conn.execute('ROLLBACK')
+                logger.warning(f"Telemetry compaction failed: {e}")
+                with self._lock:
+                    for key in due:
+                        self._dirty[key] = self._dirty.get(key, 0) + min_rows
+                return 0
+        with self._lock:
+            self._stats['chunks_compacted'] += merged
+        return merged
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """Delete chunks past their level's retention; returns chunks removed."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            # Series with samples still in memory must survive
+            in_memory = {key[0] for key in self._pending}
+        removed = 0
+        with self._db_lock:
+            for index, level in enumerate(self.levels):
+                removed += self._conn.execute(
+                    'DELETE FROM chunks WHERE level = ? AND last < ?',
+                    (index, int(now - level.retention))).rowcount
+            orphans = [row[0] for row in self._conn.execute(
+                'SELECT id FROM series WHERE NOT EXISTS '
+                '(SELECT 1 FROM chunks WHERE chunks.series_id = series.id)')
+                if row[0] not in in_memory]
+            self._conn.executemany('DELETE FROM series WHERE id = ?', [(i,) for i in orphans])
+            self._conn.execute('PRAGMA incremental_vacuum')
+        with self._lock:
+            self._stats['chunks_expired'] += removed
+            gone = set(orphans)
+            self._series = {k: v for k, v in self._series.items() if v not in gone}
+            self._last_ts = {k: v for k, v in self._last_ts.items() if k not in gone}
+        return removed
+
+    # === Background maintenance ===
+
+    def start(self, interval: float = FLUSH_INTERVAL):
+        """Flush every interval; compact and apply retention less often."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._maintenance_loop, args=(interval,),
+                                        daemon=True, name="telemetry-store")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread and write out pending samples."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        # Open rollup buckets too: nothing stays behind in memory
+        self.flush(now=float('inf'))
+        self.compact(min_rows=2)
+
+    def _maintenance_loop(self, interval: float):
+        last_compact = last_retention = time.monotonic()
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+                now = time.monotonic()
+                if now - last_compact >= COMPACT_INTERVAL:
+                    self.compact()
+                    last_compact = now
+                if now - last_retention >= RETENTION_INTERVAL:
+                    self.apply_retention()
+                    last_retention = now
+            except Exception as e:
+                logger.warning(f"Telemetry maintenance error: {e}")
+
+    def close(self):
+        self.stop()
+        with self._db_lock:
+            self._conn.close()
+
+    # === Queries ===
+
+    def pick_resolution(self, start: float, end: float, now: Optional[float] = None) -> int:
+        """Finest level that covers start and keeps the point count modest."""
+        now = now if now is not None else time.time()
+        span = end - start
+        for level in self.levels:
+            if start < now - level.retention:
+                continue
+            if level.resolution == 0 and span <= RAW_MAX_SPAN:
+                return 0
+            if level.resolution == 60 and span <= MINUTE_MAX_SPAN:
+                return 60
+            if level.resolution not in (0, 60):
+                return level.resolution
+        return self.levels[-1].resolution
+
+    def query(self, node_id: str, metric: str, start: Optional[float] = None,
+              end: Optional[float] = None, resolution: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Samples of one series in [start, end].
+
+        Args:
+            node_id: Node identifier as recorded (e.g. '!abcd1234')
+            metric: Metric name (e.g. 'battery_level', 'snr')
+            start: Epoch seconds (default: 24 hours ago)
+            end: Epoch seconds (default: now)
+            resolution: 0 (raw), 60 or 3600; default picks by span
+
+        Returns:
+            Dict with node, metric, resolution and points: [ts, value]
+            for raw, [bucket_ts, min, avg, max] for rollups
+        """
+        now = time.time()
+        end = int(end if end is not None else now)
+        start = int(start if start is not None else end - 86400)
+        if resolution is None:
+            resolution = self.pick_resolution(start, end, now)
+        index = next((i for i, lvl in enumerate(self.levels) if lvl.resolution == resolution), None)
+        if index is None:
+            raise ValueError(f"Unknown resolution {resolution}; "
+                             f"use one of {[lvl.resolution for lvl in self.levels]}")
+        result = {'node': node_id, 'metric': metric, 'resolution': resolution,
+                  'start': start, 'end': end, 'points': []}
+
+        series_id = self._series_id(node_id, metric, create=False)
+        if series_id is None:
+            return result
+
+        level = self.levels[index]
+        # Rollup buckets are labelled by their start
+        lower = start - start % resolution if resolution else start
+        with self._db_lock:
+            rows = self._conn.execute(
+                'SELECT window, count, data FROM chunks '
+                'WHERE series_id = ? AND level = ? AND window >= ? AND window <= ? '
+                'AND last >= ? AND first <= ?',
+                (series_id, index, lower - level.window, end, lower, end)).fetchall()
+
+        block = _new_block(index)
+        for window, count, data in rows:
+            block.merge_chunk(window, data, count)
+        with self._lock:
+            for (sid, lvl, window), pending in self._pending.items():
+                if sid != series_id or lvl != index:
+                    continue
+                if isinstance(pending, _Raw):
+                    block.samples.update(pending.samples)
+                else:
+                    for bucket, b in pending.buckets.items():
+                        block.merge_bucket(bucket, *b)
+        result['points'] = block.points(lower, end)
+        return result
+
+    def list_series(self, node_id: Optional[str] = None) -> List[Dict[str, str]]:
+        """Known series, optionally for one node."""
+        with self._db_lock:
+            if node_id:
+                rows = self._conn.execute(
+                    'SELECT node, metric FROM series WHERE node = ? ORDER BY metric',
+                    (node_id,)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    'SELECT node, metric FROM series ORDER BY node, metric').fetchall()
+        return [{'node': node, 'metric': metric} for node, metric in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus on-disk size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_samples'] = self._pending_samples
+        with self._db_lock:
+            stats['series'] = self._conn.execute('SELECT COUNT(*) FROM series').fetchone()[0]
+            stats['chunks'] = self._conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0]
+            page_size = self._conn.execute('PRAGMA page_size').fetchone()[0]
+            pages = self._conn.execute('PRAGMA page_count').fetchone()[0]
+            free = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+        stats['db_bytes'] = page_size * pages
+        stats['free_bytes'] = page_size * free
+        return stats
+
+
+# Telemetry fields recorded from node objects
+NODE_METRICS = ('battery_level', 'voltage', 'channel_utilization', 'air_util_tx',
+                'temperature', 'humidity', 'pressure', 'air_quality', 'snr', 'rssi')
+
+
+_store: Optional[TelemetryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_telemetry_store() -> TelemetryStore:
+    """The process-wide store on the default path."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TelemetryStore()
+        return _store
+
+
+def _close_default():
+    with _store_lock:
+        store = _store
+    if store is not None:
+        try:
+            store.close()
+        except Exception as e:
+            logger.debug(f"Telemetry store close failed: {e}")
+
+
+atexit.register(_close_default)
+
+
+# === Benchmark ===
+
+def _device_readings(rng, state: Dict[str, float]) -> Dict[str, float]:
+    """Next report of a simulated node: slow random walks at device precision."""
+    def walk(name, step, lo, hi, digits):
+        value = min(hi, max(lo, state.get(name, rng.uniform(lo, hi)) + rng.uniform(-step, step)))
+        state[name] = value
+        return round(value, digits)
+
+    return {
+        'battery_level': walk('battery_level', 1.0, 0, 100, 0),
+        'voltage': walk('voltage', 0.01, 3.3, 4.2, 3),
+        'channel_utilization': walk('channel_utilization', 2.0, 0, 60, 2),
+        'air_util_tx': walk('air_util_tx', 0.5, 0, 10, 2),
+        'temperature': walk('temperature', 0.3, -10, 45, 1),
+        'snr': round(walk('snr', 1.0, -20, 12, 2) * 4) / 4,
+        'rssi': walk('rssi', 2.0, -130, -40, 0),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Simulate a fleet reporting telemetry and report write cost and file size."""
+    import argparse
+    import random
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark the telemetry store")
+    parser.add_argument('--nodes', type=int, default=2000, help="Simulated nodes")
+    parser.add_argument('--hours', type=float, default=24.0, help="Simulated history")
+    parser.add_argument('--interval', type=int, default=900,
+                        help="Seconds between a node's reports (device default 900)")
+    parser.add_argument('--path', help="Directory for the test database (use the SD card)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    now = int(time.time())
+    start = now - int(args.hours * 3600)
+    nodes = [{} for _ in range(args.nodes)]
+
+    with tempfile.TemporaryDirectory(dir=args.path) as tmp:
+        store = TelemetryStore(Path(tmp) / 'telemetry.db')
+        record_sec = flush_sec = 0.0
+        samples = 0
+        for tick in range(start, now, int(FLUSH_INTERVAL)):
+            began = time.perf_counter()
+            for node, state in enumerate(nodes):
+                # Each node reports once per interval, at its own phase
+                if (tick + node * 7) % args.interval >= int(FLUSH_INTERVAL):
+                    continue
+                samples += store.record(f'!{node:08x}', _device_readings(rng, state), tick)
+            record_sec += time.perf_counter() - began
+            began = time.perf_counter()
+            store.flush(now=tick + FLUSH_INTERVAL)
+            if (tick - start) % int(COMPACT_INTERVAL) == 0:
+                store.compact(now=tick + FLUSH_INTERVAL)
+            flush_sec += time.perf_counter() - began
+        store.flush(now=float('inf'))
+        store.compact(min_rows=2)
+        stats = store.get_stats()
+        with store._db_lock:
+            level_bytes = dict(store._conn.execute(
+                'SELECT level, SUM(length(data)) FROM chunks GROUP BY level').fetchall())
+
+        step = max(1, args.nodes // 50)
+        began = time.perf_counter()
+        for node in range(0, args.nodes, step):
+            store.query(f'!{node:08x}', 'battery_level', start=start)
+        query_ms = (time.perf_counter() - began) * 1000 / len(range(0, args.nodes, step))
+        store.close()
+
+    ticks = max(1, int(args.hours * 3600 / FLUSH_INTERVAL))
+    days = args.hours / 24
+    print(f"{args.nodes} nodes x 7 metrics, {args.hours:g} h: {samples:,} samples")
+    print(f"record  {samples / record_sec:,.0f} samples/s")
+    print(f"flush   {flush_sec * 1000 / ticks:.1f} ms per {FLUSH_INTERVAL:.0f}s cycle (incl. compaction)")
+    print(f"disk    {stats['db_bytes'] / 1e6:.1f} MB file, {stats['chunks']:,} chunks")
+    steady = 0.0
+    for index, level in enumerate(LEVELS):
+        per_day = level_bytes.get(index, 0) / days
+        steady += per_day * level.retention / 86400
+        print(f"        level {level.resolution or 'raw':>4}: {per_day / 1e6:6.2f} MB/day of chunk data, "
+              f"kept {level.retention / 86400:g} days")
+    print(f"        steady state at default retention: ~{steady / 1e6:.0f} MB of chunk data")
+    print(f"query   {query_ms:.1f} ms per {args.hours:g} h series")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
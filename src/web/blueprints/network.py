@@ -16,6 +16,11 @@ from web.utils import (
     parse_proc_net,
 )
 
+try:
+    from utils import sysinfo
+except ImportError:
+    sysinfo = None
+
 network_bp = Blueprint('network', __name__)
 
 
@@ -103,6 +108,13 @@ def api_network_full_diagnostics():
         'listening_ports': []
     }
 
+    if sysinfo is not None:
+        # sysfs/netlink and /proc/net: same data as ip -j addr and ss -tulnp
+        diagnostics['interfaces'] = sysinfo.network_interfaces()
+        diagnostics['listening_ports'] = sysinfo.format_sockets(
+            sysinfo.listening_sockets()).splitlines()[1:]
+        return jsonify(diagnostics)
+
     # Get network interfaces
     try:
         result = subprocess.run(
@@ -161,7 +173,11 @@ def api_network_multicast():
 
 @network_bp.route('/network/process-ports')
 def api_network_process_ports():
-    """Get process-to-port mapping using ss."""
+    """Get process-to-port mapping (from /proc; ss or netstat as fallback)."""
+    if sysinfo is not None:
+        sockets = sysinfo.listening_sockets()
+        return jsonify({'output': sysinfo.format_sockets(sockets), 'tool': 'proc',
+                        'sockets': sockets})
     try:
         result = subprocess.run(
             ['ss', '-tulnp'],
@@ -6,6 +6,7 @@ Handles mesh node information and messaging.
 
 from flask import Blueprint, jsonify, request
 import re
+import time
 
 nodes_bp = Blueprint('nodes', __name__)
 
@@ -82,6 +83,47 @@ def api_nodes_geojson():
     return jsonify(geojson)
 
 
+@nodes_bp.route('/nodes/<node_id>/telemetry')
+def api_node_telemetry(node_id):
+    """
+    Telemetry history for one node.
+
+    Query: metric (default battery_level), hours (default 24) or
+    start/end (epoch seconds), resolution (0, 60, 3600; default by span).
+    Without metric=... but with series=1, lists the node's metrics.
+    """
+    if not re.match(r'^[!\w.-]{1,64}$', node_id):
+        return jsonify({'error': 'Invalid node ID'}), 400
+
+    try:
+        from utils.telemetry_store import get_telemetry_store
+        store = get_telemetry_store()
+    except Exception as e:
+        return jsonify({'error': f'Telemetry history unavailable: {e}'}), 503
+
+    if request.args.get('series'):
+        return jsonify({'node': node_id,
+                        'metrics': [s['metric'] for s in store.list_series(node_id)]})
+
+    metric = request.args.get('metric', 'battery_level')
+    if not re.match(r'^\w{1,64}$', metric):
+        return jsonify({'error': 'Invalid metric'}), 400
+
+    try:
+        end = float(request.args['end']) if 'end' in request.args else None
+        if 'start' in request.args:
+            start = float(request.args['start'])
+        else:
+            hours = min(max(float(request.args.get('hours', 24)), 0.01), 24 * 730)
+            start = (end if end is not None else time.time()) - hours * 3600
+        resolution = request.args.get('resolution')
+        resolution = int(resolution) if resolution not in (None, '') else None
+        return jsonify(store.query(node_id, metric, start=start, end=end,
+                                   resolution=resolution))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
 def validate_node_id(node_id: str) -> bool:
     """Validate node ID format."""
     if not node_id:
@@ -91,6 +133,40 @@ def validate_node_id(node_id: str) -> bool:
     return bool(re.match(pattern, node_id))
 
 
+@nodes_bp.route('/messages/search')
+def api_search_messages():
+    """Full-text search of stored messages (?q=&since=&network=&limit=&offset=)."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search query required (q)'}), 400
+    if len(query) > 200:
+        return jsonify({'error': 'Search query too long (max 200 chars)'}), 400
+
+    network = request.args.get('network', 'all')
+    if network not in ('all', 'meshtastic', 'rns'):
+        return jsonify({'error': 'Invalid network'}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+
+    since = request.args.get('since') or None
+    if since and not re.match(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2})?)?$', since):
+        return jsonify({'error': 'since must be YYYY-MM-DD[ HH:MM[:SS]] (UTC)'}), 400
+    if since:
+        since = since.replace('T', ' ')
+
+    from commands import messaging
+
+    result = messaging.search_messages(query, since=since, network=network,
+                                       limit=limit, offset=offset)
+    if not result.success:
+        return jsonify({'error': result.message}), 400 if result.data.get('invalid') else 500
+    return jsonify(result.data)
+
+
 @nodes_bp.route('/message', methods=['POST'])
 def api_send_message():
     """Send a message to the mesh network."""
@@ -29,6 +29,37 @@ def api_status():
     })
 
 
+@system_bp.route('/status/stream')
+def api_status_stream():
+    """Push service/port/node-count changes using Server-Sent Events."""
+    import json
+    import queue
+    from utils.system_state import get_system_state
+
+    def generate():
+        changes = queue.Queue(maxsize=10)
+
+        def on_change(state, _changes):
+            try:
+                changes.put_nowait(state)
+            except queue.Full:
+                pass  # Client is behind; it gets the next state
+
+        unsubscribe = get_system_state().subscribe(on_change)
+        try:
+            while True:
+                try:
+                    state = changes.get(timeout=30)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(state.as_dict())}\n\n"
+        finally:
+            unsubscribe()
+
+    return Response(generate(), mimetype='text/event-stream')
+
+
 @system_bp.route('/logs')
 def api_logs():
     """Get service logs."""
@@ -50,6 +81,18 @@ def api_logs_stream():
     if not validate_journalctl_since(since):
         return jsonify({'error': 'Invalid since parameter'}), 400
 
+    try:
+        from utils.log_service import get_log_service, parse_since
+    except ImportError:
+        parse_since = None
+
+    window = parse_since(since) if parse_since else None
+    if window is not None:
+        logs = get_log_service()
+        # Longer windows than the buffer holds go to journalctl
+        if logs.wait_ready(timeout=5) and logs.running and logs.covers(window):
+            return Response(_follow_shared_logs(logs, window), mimetype='text/event-stream')
+
     def generate():
         try:
             # Use journalctl with proper argument list (no shell=True)
@@ -70,6 +113,24 @@ def api_logs_stream():
     return Response(generate(), mimetype='text/event-stream')
 
 
+def _follow_shared_logs(logs, window):
+    """SSE lines from the shared log follower: the last window seconds, then new ones."""
+    import time
+
+    cutoff = time.time() - window
+    entries, cursor = logs.read(unit='meshtasticd', limit=100)
+    for entry in entries:
+        if entry.timestamp >= cutoff:
+            yield f"data: {entry.line}\n\n"
+
+    while logs.running:
+        entries, cursor = logs.wait(cursor, timeout=30, unit='meshtasticd')
+        if not entries:
+            yield ": keepalive\n\n"
+        for entry in entries:
+            yield f"data: {entry.line}\n\n"
+
+
 @system_bp.route('/versions')
 def api_versions():
     """Get software version information."""
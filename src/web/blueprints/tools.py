@@ -2,7 +2,9 @@
 Tools Blueprint - RF and Radio Utilities API
 
 Provides REST API endpoints for:
-- Frequency slot calculator (djb2 hash)
+- Frequency slot calculator (djb2 hash), batch channel planning and
+  reverse frequency lookup (tables from utils.channel_plan)
+- LoRa time-on-air and channel utilization (utils.airtime)
 - Free space path loss
 - Link budget calculations
 - Fresnel zone calculations
@@ -11,6 +13,26 @@ Provides REST API endpoints for:
 from flask import Blueprint, jsonify, request
 import math
 
+try:
+    from utils.channel_plan import (
+        REGIONS, PRESETS, djb2_hash, plan, plan_channels, lookup_frequency,
+    )
+except ImportError:
+    from ...utils.channel_plan import (
+        REGIONS, PRESETS, djb2_hash, plan, plan_channels, lookup_frequency,
+    )
+
+try:
+    from utils.airtime import (
+        DEFAULT_TRAFFIC, MODEM_PRESETS, LoRaModem, Traffic, channel_utilization,
+        max_nodes, max_throughput, preset_matrix,
+    )
+except ImportError:
+    from ...utils.airtime import (
+        DEFAULT_TRAFFIC, MODEM_PRESETS, LoRaModem, Traffic, channel_utilization,
+        max_nodes, max_throughput, preset_matrix,
+    )
+
 tools_bp = Blueprint('tools', __name__)
 
 
@@ -18,65 +40,6 @@ tools_bp = Blueprint('tools', __name__)
 # Frequency Slot Calculator
 # ============================================================================
 
-# All 22 Meshtastic regions with correct band definitions
-REGIONS = {
-    # Americas
-    'US': {'start': 902.0, 'end': 928.0, 'duty': 100, 'power': 30, 'desc': 'United States ISM'},
-    'ANZ': {'start': 915.0, 'end': 928.0, 'duty': 100, 'power': 30, 'desc': 'Australia/New Zealand'},
-    # Europe
-    'EU_868': {'start': 869.4, 'end': 869.65, 'duty': 10, 'power': 27, 'desc': 'EU 869 MHz SRD'},
-    'EU_433': {'start': 433.0, 'end': 434.0, 'duty': 10, 'power': 12, 'desc': 'EU 433 MHz'},
-    'UK_868': {'start': 869.4, 'end': 869.65, 'duty': 10, 'power': 27, 'desc': 'UK 869 MHz'},
-    'UA_868': {'start': 868.0, 'end': 868.6, 'duty': 100, 'power': 20, 'desc': 'Ukraine 868 MHz'},
-    'UA_433': {'start': 433.0, 'end': 434.79, 'duty': 100, 'power': 12, 'desc': 'Ukraine 433 MHz'},
-    'RU': {'start': 868.7, 'end': 869.2, 'duty': 100, 'power': 20, 'desc': 'Russia'},
-    # Asia-Pacific
-    'JP': {'start': 920.8, 'end': 923.8, 'duty': 100, 'power': 16, 'desc': 'Japan'},
-    'KR': {'start': 920.0, 'end': 923.0, 'duty': 100, 'power': 10, 'desc': 'Korea'},
-    'TW': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 27, 'desc': 'Taiwan'},
-    'CN': {'start': 470.0, 'end': 510.0, 'duty': 100, 'power': 19, 'desc': 'China'},
-    'IN': {'start': 865.0, 'end': 867.0, 'duty': 100, 'power': 30, 'desc': 'India'},
-    'TH': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 16, 'desc': 'Thailand'},
-    'PH': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 16, 'desc': 'Philippines'},
-    'SG_923': {'start': 920.0, 'end': 925.0, 'duty': 100, 'power': 20, 'desc': 'Singapore 923'},
-    'MY_433': {'start': 433.0, 'end': 435.0, 'duty': 100, 'power': 12, 'desc': 'Malaysia 433 MHz'},
-    'MY_919': {'start': 919.0, 'end': 924.0, 'duty': 100, 'power': 20, 'desc': 'Malaysia 919 MHz'},
-    # Oceania
-    'NZ_865': {'start': 864.0, 'end': 868.0, 'duty': 100, 'power': 36, 'desc': 'New Zealand 865 MHz'},
-    # 2.4 GHz ISM
-    'LORA_24': {'start': 2400.0, 'end': 2483.5, 'duty': 100, 'power': 10, 'desc': '2.4 GHz ISM (worldwide)'},
-}
-
-# Preset bandwidths (kHz)
-PRESETS = {
-    'LONG_FAST': {'bandwidth': 250, 'sf': 11, 'cr': '4/5'},
-    'LONG_SLOW': {'bandwidth': 125, 'sf': 12, 'cr': '4/8'},
-    'LONG_MODERATE': {'bandwidth': 125, 'sf': 11, 'cr': '4/8'},
-    'MEDIUM_FAST': {'bandwidth': 250, 'sf': 10, 'cr': '4/5'},
-    'MEDIUM_SLOW': {'bandwidth': 250, 'sf': 11, 'cr': '4/5'},
-    'SHORT_FAST': {'bandwidth': 250, 'sf': 9, 'cr': '4/5'},
-    'SHORT_SLOW': {'bandwidth': 250, 'sf': 10, 'cr': '4/5'},
-    'SHORT_TURBO': {'bandwidth': 500, 'sf': 8, 'cr': '4/5'},
-    'VERY_LONG_SLOW': {'bandwidth': 62.5, 'sf': 12, 'cr': '4/8'},
-}
-
-
-def djb2_hash(s: str) -> int:
-    """
-    DJB2 hash algorithm - same as Meshtastic firmware RadioInterface.cpp
-
-    Args:
-        s: String to hash (channel name)
-
-    Returns:
-        32-bit unsigned hash value
-    """
-    h = 5381
-    for c in s:
-        h = ((h << 5) + h) + ord(c)
-    return h & 0xFFFFFFFF
-
-
 @tools_bp.route('/tools/frequency-slot', methods=['GET', 'POST'])
 def frequency_slot():
     """
@@ -124,10 +87,8 @@ def frequency_slot():
     reg = REGIONS[region]
     preset_info = PRESETS[preset]
     bandwidth = preset_info['bandwidth']
-
-    # Calculate number of channels
-    freq_range = (reg['end'] - reg['start']) * 1000  # kHz
-    num_channels = max(1, int(freq_range / bandwidth))
+    channel_plan = plan(region, preset)
+    num_channels = channel_plan.num_channels
 
     # Calculate slot
     if direct_slot is not None:
@@ -145,9 +106,8 @@ def frequency_slot():
         hash_val = djb2_hash(channel)
         slot = hash_val % num_channels
 
-    # Calculate frequency
-    # Formula: freq = freqStart + (bw/2000) + (slot * bw/1000)
-    freq_mhz = reg['start'] + (bandwidth / 2000) + (slot * bandwidth / 1000)
+    # freq = freqStart + (bw/2000) + (slot * bw/1000), from the precomputed table
+    freq_mhz = channel_plan.frequency(slot)
     freq_low = freq_mhz - (bandwidth / 2000)
     freq_high = freq_mhz + (bandwidth / 2000)
 
@@ -212,6 +172,227 @@ def get_presets():
     })
 
 
+@tools_bp.route('/tools/frequency-slot/batch', methods=['POST'])
+def frequency_slot_batch():
+    """
+    Score a set of channel names for one region across presets.
+
+    POST /api/tools/frequency-slot/batch
+        {"channels": ["Ops", "Net", ...], "region": "US", "presets": ["LONG_FAST"]}
+
+    Returns:
+        JSON with per-preset slots, collisions and free slots
+    """
+    data = request.get_json() or {}
+    channels = data.get('channels')
+    region = str(data.get('region', 'US')).upper()
+    presets = data.get('presets')
+
+    if not isinstance(channels, list) or not all(isinstance(c, str) for c in channels):
+        return jsonify({'error': 'channels must be a list of names'}), 400
+    if region not in REGIONS:
+        return jsonify({
+            'error': f'Unknown region: {region}',
+            'valid_regions': list(REGIONS.keys())
+        }), 400
+    if presets is not None:
+        presets = [str(p).upper() for p in presets]
+        unknown = [p for p in presets if p not in PRESETS]
+        if unknown:
+            return jsonify({
+                'error': f'Unknown preset: {unknown[0]}',
+                'valid_presets': list(PRESETS.keys())
+            }), 400
+
+    reports = plan_channels(channels, region, presets)
+    return jsonify({
+        'region': region,
+        'channels': len(set(channels)),
+        'presets': {preset: report.to_dict() for preset, report in reports.items()}
+    })
+
+
+@tools_bp.route('/tools/frequency-slot/lookup', methods=['GET'])
+def frequency_slot_lookup():
+    """
+    Reverse lookup: which region/preset/slot (and channel names) an observed frequency is.
+
+    GET /api/tools/frequency-slot/lookup?freq_mhz=906.875&region=US&candidates=Ops,Net
+
+    Query parameters:
+        freq_mhz: Observed center frequency (required)
+        region, preset: Narrow the search (optional)
+        candidates: Comma-separated channel names (default: preset default names)
+        tolerance_khz: Allowed offset from a slot center (default: half a channel)
+    """
+    try:
+        freq_mhz = float(request.args.get('freq_mhz', ''))
+        tolerance = request.args.get('tolerance_khz')
+        tolerance = float(tolerance) if tolerance else None
+    except ValueError:
+        return jsonify({'error': 'freq_mhz and tolerance_khz must be numbers'}), 400
+
+    region = request.args.get('region')
+    preset = request.args.get('preset')
+    candidates = request.args.get('candidates')
+    candidates = [c for c in candidates.split(',') if c] if candidates else None
+
+    matches = lookup_frequency(freq_mhz, candidates,
+                               region.upper() if region else None,
+                               preset.upper() if preset else None, tolerance)
+    return jsonify({
+        'freq_mhz': freq_mhz,
+        'matches': [m.to_dict() for m in matches]
+    })
+
+
+# ============================================================================
+# Airtime and Channel Utilization
+# ============================================================================
+
+def _int_list(value, default):
+    """Parse "16,50,237" (or a JSON list) into ints."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        value = [v for v in value.split(',') if v.strip()]
+    return [int(v) for v in value]
+
+
+@tools_bp.route('/tools/airtime', methods=['GET', 'POST'])
+def airtime():
+    """
+    LoRa time-on-air for payload sizes across modem presets.
+
+    GET /api/tools/airtime?payloads=16,50,237&presets=LONG_FAST,SHORT_TURBO
+    GET /api/tools/airtime?payloads=50&sf=10&bw=125000&cr=8&preamble=8
+    POST /api/tools/airtime with the same keys as JSON
+
+    Query/JSON parameters:
+        payloads: Payload sizes in bytes (default: 16,50,100,237)
+        presets: Modem presets (default: all)
+        sf, bw, cr, preamble: Custom modem instead of presets (bw in Hz, cr 5-8)
+
+    Returns:
+        JSON with airtime (ms) per preset and payload, plus max throughput
+    """
+    data = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+
+    def param(key):
+        return data.get(key, request.args.get(key))
+
+    try:
+        payloads = _int_list(param('payloads'), [16, 50, 100, 237])
+        if not payloads or any(p < 0 for p in payloads):
+            return jsonify({'error': 'payloads must be non-negative integers'}), 400
+
+        if param('sf') is not None:
+            sf = int(param('sf'))
+            cr = int(param('cr') or 5)
+            bw = float(param('bw') if param('bw') is not None else 125000)
+            if not 6 <= sf <= 12 or not 5 <= cr <= 8:
+                return jsonify({'error': 'sf must be 6-12 and cr 5-8'}), 400
+            preamble = int(param('preamble') if param('preamble') is not None else 16)
+            if not bw > 0:
+                return jsonify({'error': 'bw must be a positive bandwidth in Hz'}), 400
+            if preamble < 0:
+                return jsonify({'error': 'preamble must be a non-negative symbol count'}), 400
+            modems = {'CUSTOM': LoRaModem(sf, bw, cr, preamble)}
+        else:
+            names = param('presets')
+            if isinstance(names, str):
+                names = names.split(',')
+            names = [n.strip().upper() for n in names] if names else list(MODEM_PRESETS)
+            unknown = [n for n in names if n not in MODEM_PRESETS]
+            if unknown:
+                return jsonify({
+                    'error': f'Unknown preset: {unknown[0]}',
+                    'valid_presets': list(MODEM_PRESETS.keys())
+                }), 400
+            modems = {name: MODEM_PRESETS[name] for name in names}
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    if 'CUSTOM' in modems:
+        matrix = {'CUSTOM': modems['CUSTOM'].time_on_air_batch(payloads)}
+    else:
+        matrix = preset_matrix(payloads, modems)
+    return jsonify({
+        'payloads': payloads,
+        'presets': {
+            name: {
+                **modem.to_dict(),
+                'airtime_ms': [round(t * 1000, 2) for t in matrix[name]],
+                'max_bytes_per_sec': round(max_throughput(modem), 1),
+            }
+            for name, modem in modems.items()
+        }
+    })
+
+
+@tools_bp.route('/tools/channel-utilization', methods=['GET', 'POST'])
+def channel_utilization_estimate():
+    """
+    Project channel utilization and duty cycle for a mesh.
+
+    GET /api/tools/channel-utilization?nodes=40&preset=LONG_FAST&hop_limit=3&region=EU_868
+    POST /api/tools/channel-utilization
+        {"nodes": 40, "traffic": [{"name": "text", "payload": 60, "interval": 600}]}
+
+    Query/JSON parameters:
+        nodes: Nodes sharing the channel (required)
+        preset: Modem preset (default: LONG_FAST)
+        hop_limit: Flood hop limit (default: 3)
+        region: Region code, for its duty cycle limit (optional)
+        traffic: List of {name, payload, interval} (default: Meshtastic beacons; POST only)
+
+    Returns:
+        JSON utilization report plus the largest mesh under 25% utilization
+    """
+    data = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+
+    def param(key, default=None):
+        return data.get(key, request.args.get(key, default))
+
+    try:
+        nodes = int(param('nodes', 0))
+        hop_limit = int(param('hop_limit', 3))
+        preset = str(param('preset', 'LONG_FAST')).upper()
+        traffic = tuple(Traffic(str(t.get('name', f'traffic{i}')), int(t['payload']),
+                                float(t['interval']))
+                        for i, t in enumerate(data['traffic'])) \
+            if data.get('traffic') else DEFAULT_TRAFFIC
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        return jsonify({'error': f'Invalid parameters: {e}'}), 400
+
+    if nodes < 1 or not 0 <= hop_limit <= 7:
+        return jsonify({'error': 'nodes must be positive and hop_limit 0-7'}), 400
+    if any(t.interval <= 0 or t.payload < 0 for t in traffic):
+        return jsonify({'error': 'traffic needs positive intervals'}), 400
+    if preset not in MODEM_PRESETS:
+        return jsonify({
+            'error': f'Unknown preset: {preset}',
+            'valid_presets': list(MODEM_PRESETS.keys())
+        }), 400
+
+    duty_limit = None
+    region = param('region')
+    if region:
+        region = str(region).upper()
+        if region not in REGIONS:
+            return jsonify({
+                'error': f'Unknown region: {region}',
+                'valid_regions': list(REGIONS.keys())
+            }), 400
+        duty = REGIONS[region]['duty']
+        duty_limit = duty if duty < 100 else None
+
+    report = channel_utilization(nodes, traffic, preset, hop_limit, duty_limit=duty_limit)
+    result = report.to_dict()
+    result['max_polite_nodes'] = max_nodes(traffic=traffic, preset=preset, hop_limit=hop_limit)
+    return jsonify(result)
+
+
 # ============================================================================
 # RF Calculations
 # ============================================================================
@@ -118,10 +118,10 @@ def parse_proc_net(protocol: str) -> list:
             results.append({
                 'local_ip': conn.get('ip', '0.0.0.0'),
                 'local_port': conn.get('port', 0),
-                'remote_ip': '0.0.0.0',  # Not in shared module output
-                'remote_port': 0,
+                'remote_ip': conn.get('remote_ip', '0.0.0.0'),
+                'remote_port': conn.get('remote_port', 0),
                 'state': conn.get('state', ''),
-                'state_hex': '',
+                'state_hex': conn.get('state_hex', ''),
             })
         return results
 
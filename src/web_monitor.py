@@ -32,6 +32,27 @@ try:
 except ImportError:
     __version__ = "0.4.3"
 
+# In-process metrics registry (Prometheus /metrics)
+try:
+    from utils.metrics import collect_all, render_prometheus
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# Shared service/port poller (one set of probes for every UI in the process)
+try:
+    from utils.system_state import get_system_state
+    SYSTEM_STATE_AVAILABLE = True
+except ImportError:
+    SYSTEM_STATE_AVAILABLE = False
+
+# Native /proc and sysfs readers (no df/vcgencmd forks per request)
+try:
+    from utils import sysinfo
+    SYSINFO_AVAILABLE = True
+except ImportError:
+    SYSINFO_AVAILABLE = False
+
 # Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger('web_monitor')
@@ -140,6 +161,21 @@ def check_systemd_service(name: str) -> dict:
 @cached(ttl=5)
 def get_services_status() -> dict:
     """Get status of core services"""
+    if SYSTEM_STATE_AVAILABLE:
+        state = get_system_state().get()
+        status = {}
+        for name in ('meshtasticd', 'rnsd'):
+            unit = state.service(name)
+            status[name] = {
+                'port_open': state.port_open(name),
+                'systemd': {'running': bool(unit and unit.active == 'active'),
+                            'status': unit.active if unit else 'unknown'}
+            }
+        if not state.systemd:
+            for entry in status.values():
+                entry['systemd']['status'] = 'systemctl not found'
+        return status
+
     return {
         'meshtasticd': {
             'port_open': check_port('127.0.0.1', MESHTASTICD_PORT),
@@ -194,20 +230,28 @@ def get_system_health() -> dict:
 
     # Disk usage
     try:
-        result = subprocess.run(['df', '-h', '/'], capture_output=True, text=True, timeout=5)
-        lines = result.stdout.strip().split('\n')
-        if len(lines) >= 2:
-            parts = lines[1].split()
-            if len(parts) >= 5:
-                health['disk_percent'] = int(parts[4].replace('%', ''))
+        if SYSINFO_AVAILABLE:
+            usage = sysinfo.disk_usage('/')
+            if usage:
+                health['disk_percent'] = usage.percent
+        else:
+            result = subprocess.run(['df', '-h', '/'], capture_output=True, text=True, timeout=5)
+            lines = result.stdout.strip().split('\n')
+            if len(lines) >= 2:
+                parts = lines[1].split()
+                if len(parts) >= 5:
+                    health['disk_percent'] = int(parts[4].replace('%', ''))
     except Exception:
         pass
 
     # Temperature (Raspberry Pi)
     try:
-        temp_file = Path('/sys/class/thermal/thermal_zone0/temp')
-        if temp_file.exists():
-            health['temperature'] = round(int(temp_file.read_text().strip()) / 1000, 1)
+        if SYSINFO_AVAILABLE:
+            health['temperature'] = sysinfo.cpu_temperature()
+        else:
+            temp_file = Path('/sys/class/thermal/thermal_zone0/temp')
+            if temp_file.exists():
+                health['temperature'] = round(int(temp_file.read_text().strip()) / 1000, 1)
     except Exception:
         pass
 
@@ -680,6 +724,16 @@ def api_gateway():
     return jsonify(get_gateway_stats())
 
 
+@app.route('/metrics')
+@requires_auth
+def metrics():
+    """Prometheus text metrics (this process + gateway snapshots)"""
+    if not METRICS_AVAILABLE:
+        return Response("# metrics registry unavailable\n", status=503, mimetype='text/plain')
+    text = render_prometheus(collect_all('web_monitor'))
+    return Response(text, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/health')
 def health_check():
     """Simple health check for load balancers"""
@@ -726,6 +780,7 @@ Environment variables:
 ║  Dashboard: http://{args.host}:{args.port}/
 ║  API:       http://{args.host}:{args.port}/api/status
 ║  Health:    http://{args.host}:{args.port}/health
+║  Metrics:   http://{args.host}:{args.port}/metrics
 ╠═══════════════════════════════════════════════════════════╣
 ║  Auth: {'Enabled' if AUTH_ENABLED else 'Disabled (set MESHFORGE_AUTH=true)'}
 ╚═══════════════════════════════════════════════════════════╝
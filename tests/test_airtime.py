@@ -0,0 +1,139 @@
+"""
+Tests for the LoRa airtime model: Semtech time-on-air, preset tables,
+throughput and channel utilization projections.
+
+Run: python3 -m pytest tests/test_airtime.py -v
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.airtime import (
+    DEFAULT_TRAFFIC, MAX_LORA_PACKET, MODEM_PRESETS, LoRaModem, Traffic, channel_utilization,
+    get_modem, max_nodes, max_throughput, preset_matrix, time_on_air, with_preamble,
+)
+
+
+def _reference(payload, sf, bw, cr, preamble, ldro, crc=True, explicit=True):
+    """AN1200.13 written out with floats."""
+    t_sym = 2 ** sf / bw
+    n = 8 + max(math.ceil((8 * payload - 4 * sf + 28 + 16 * crc - 20 * (not explicit))
+                          / (4 * (sf - 2 * ldro))) * cr, 0)
+    return (preamble + 4.25) * t_sym + n * t_sym
+
+
+class TestTimeOnAir:
+
+    def test_semtech_calculator_values(self):
+        # Semtech LoRa calculator, 8-symbol preamble, CRC on, explicit header
+        assert LoRaModem(7, 125_000, 5, preamble=8).time_on_air(10) == pytest.approx(0.041216)
+        assert LoRaModem(12, 125_000, 5, preamble=8).time_on_air(10) == pytest.approx(0.991232)
+
+    @pytest.mark.parametrize('name', list(MODEM_PRESETS))
+    def test_matches_reference_formula(self, name):
+        modem = MODEM_PRESETS[name]
+        for payload in (0, 1, 16, 50, 100, 237, MAX_LORA_PACKET, 400):
+            assert modem.time_on_air(payload) == pytest.approx(_reference(
+                payload, modem.spreading_factor, modem.bandwidth, modem.coding_rate,
+                modem.preamble, modem.low_data_rate))
+
+    def test_low_data_rate_optimization(self):
+        assert not MODEM_PRESETS['LONG_FAST'].low_data_rate            # 8.2 ms symbols
+        assert MODEM_PRESETS['LONG_MODERATE'].low_data_rate            # 16.4 ms
+        assert MODEM_PRESETS['VERY_LONG_SLOW'].low_data_rate
+        forced = LoRaModem(11, 250_000, 5, ldro=True)
+        assert forced.time_on_air(100) > MODEM_PRESETS['LONG_FAST'].time_on_air(100)
+
+    def test_snr_threshold(self):
+        assert MODEM_PRESETS['SHORT_TURBO'].snr_threshold == -7.5
+        assert MODEM_PRESETS['LONG_FAST'].snr_threshold == -17.5
+        assert MODEM_PRESETS['VERY_LONG_SLOW'].snr_threshold == -20.0
+
+    def test_header_and_crc_options(self):
+        base = LoRaModem(9, 125_000)
+        assert LoRaModem(9, 125_000, crc=False).time_on_air(50) <= base.time_on_air(50)
+        assert LoRaModem(9, 125_000, explicit_header=False).time_on_air(50) < base.time_on_air(50)
+
+    def test_presets_ordered_fastest_first(self):
+        times = [modem.time_on_air(50) for modem in MODEM_PRESETS.values()]
+        assert times == sorted(times)
+
+    def test_lookup_by_name(self):
+        assert get_modem('long_fast') is MODEM_PRESETS['LONG_FAST']
+        assert time_on_air(50) == MODEM_PRESETS['LONG_FAST'].time_on_air(50)
+        with pytest.raises(KeyError):
+            get_modem('WARP')
+        assert with_preamble('LONG_FAST', 8).time_on_air(50) < time_on_air(50)
+
+
+class TestBatch:
+
+    def test_batch_matches_scalar(self):
+        modem = MODEM_PRESETS['MEDIUM_SLOW']
+        payloads = [0, 16, 255, 300]
+        assert modem.time_on_air_batch(payloads) == [modem.time_on_air(p) for p in payloads]
+        assert len(modem.table()) == MAX_LORA_PACKET + 1
+
+    def test_preset_matrix(self):
+        matrix = preset_matrix(range(256))
+        assert set(matrix) == set(MODEM_PRESETS)
+        assert all(len(row) == 256 for row in matrix.values())
+        assert list(preset_matrix([50], ['SHORT_TURBO'])) == ['SHORT_TURBO']
+
+    def test_tables_are_shared(self):
+        assert LoRaModem(11, 250_000).table() is MODEM_PRESETS['LONG_FAST'].table()
+
+    def test_agrees_with_channel_plan_presets(self):
+        from utils.channel_plan import PRESETS
+        for name, info in PRESETS.items():
+            modem = MODEM_PRESETS[name]
+            assert (info['bandwidth'] * 1000, info['sf'], info['cr']) == \
+                (modem.bandwidth, modem.spreading_factor, f"4/{modem.coding_rate}")
+
+
+class TestThroughput:
+
+    def test_max_throughput(self):
+        turbo = max_throughput('SHORT_TURBO')
+        assert turbo > 10 * max_throughput('LONG_FAST')
+        assert max_throughput('SHORT_TURBO', duty_cycle=10) == pytest.approx(turbo / 10)
+        assert MODEM_PRESETS['LONG_FAST'].bitrate == pytest.approx(1074.2, abs=0.1)
+
+
+class TestChannelUtilization:
+
+    def test_scales_with_nodes_and_hops(self):
+        small = channel_utilization(10)
+        large = channel_utilization(100)
+        assert large.utilization == pytest.approx(small.utilization * 10)
+        assert channel_utilization(10, hop_limit=0).utilization == \
+            pytest.approx(small.utilization / 4)
+        assert channel_utilization(1).transmissions == 1     # nobody to relay
+
+    def test_report(self):
+        report = channel_utilization(40, duty_limit=10)
+        expected = 40 * 4 * sum(3600 / t.interval * time_on_air(t.payload + 16)
+                                for t in DEFAULT_TRAFFIC)
+        assert report.airtime_per_hour == pytest.approx(expected)
+        assert report.node_duty_cycle == pytest.approx(report.utilization / 40 * 100)
+        assert report.delivery_probability == pytest.approx(math.exp(-2 * report.utilization))
+        assert report.within_duty_cycle
+        entry = report.to_dict()
+        assert set(entry['airtime_by_traffic_s']) == {'nodeinfo', 'position', 'telemetry'}
+
+    def test_saturation(self):
+        chatty = [Traffic('text', 200, 10)]
+        report = channel_utilization(50, chatty, 'LONG_SLOW', duty_limit=1)
+        assert report.utilization > 1 and not report.polite
+        assert not report.within_duty_cycle
+
+    def test_max_nodes(self):
+        limit = max_nodes(0.25)
+        assert channel_utilization(limit).utilization <= 0.25
+        assert channel_utilization(limit + 1).utilization > 0.25
+        assert max_nodes(preset='SHORT_TURBO') > limit
@@ -295,3 +295,38 @@ class TestBlueprintRegistration:
         assert any('/api/status' in r for r in rules)
         assert any('/api/nodes' in r for r in rules)
         assert any('/api/service' in r for r in rules)
+
+
+@pytest.mark.skipif(not FLASK_AVAILABLE, reason="Flask not installed")
+class TestMessageSearchEndpoint:
+    """Test /api/messages/search"""
+
+    def _client(self):
+        from flask import Flask
+        from web.blueprints import register_blueprints
+
+        app = Flask(__name__)
+        register_blueprints(app)
+        return app.test_client()
+
+    def test_query_required(self):
+        """Missing q is a 400"""
+        assert self._client().get('/api/messages/search').status_code == 400
+
+    def test_bad_since_rejected(self):
+        """since must be a date"""
+        response = self._client().get('/api/messages/search?q=storm&since=yesterday')
+        assert response.status_code == 400
+
+    def test_search_results(self, tmp_path):
+        """Results come from commands.messaging.search_messages"""
+        from commands import messaging
+        from commands.message_store import close_all
+
+        with patch.object(messaging, '_get_db_path', return_value=tmp_path / 'messages.db'):
+            messaging.store_incoming('!aaaa0001', 'storm at the bridge', to_id='local')
+            response = self._client().get('/api/messages/search?q=bridge&limit=5')
+        close_all()
+
+        assert response.status_code == 200
+        assert response.get_json()['count'] == 1
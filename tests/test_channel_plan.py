@@ -0,0 +1,128 @@
+"""
+Tests for the shared LoRa channel plan: djb2 hashing, precomputed
+slot tables, batch collision/free-slot planning and reverse lookup.
+
+Run: python3 -m pytest tests/test_channel_plan.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.channel_plan import (
+    DEFAULT_CHANNEL_NAMES, PRESETS, REGIONS, all_plans, djb2_hash, lookup_frequency,
+    num_channels, plan, plan_channels, slots_for_names,
+)
+
+
+def _reference_djb2(s):
+    h = 5381
+    for c in s.encode('utf-8'):
+        h = ((h << 5) + h) + c
+    return h & 0xFFFFFFFF
+
+
+class TestHash:
+
+    def test_known_values(self):
+        assert djb2_hash('') == 5381
+        assert djb2_hash('a') == 177670
+        assert djb2_hash('LongFast') == 130429955
+        assert djb2_hash('MediumSlow') == 1461554379
+
+    @pytest.mark.parametrize('name', ['x' * 200, 'Ops Net 7', 'Café', '~!@#$%^&*()_+'])
+    def test_matches_byte_loop(self, name):
+        assert djb2_hash(name) == _reference_djb2(name)
+
+
+class TestTables:
+
+    def test_every_region_and_preset(self):
+        assert len(all_plans()) == len(REGIONS) * len(PRESETS)
+        assert len(all_plans(region='US')) == len(PRESETS)
+
+    def test_slot_counts(self):
+        assert plan('US', 'LONG_FAST').num_channels == 104
+        assert plan('US', 'SHORT_TURBO').num_channels == 52
+        assert plan('EU_868', 'LONG_FAST').num_channels == 1
+        assert plan('EU_433', 'LONG_FAST').num_channels == 4
+        assert plan('JP', 'LONG_FAST').num_channels == 12
+        assert plan('CN', 'LONG_FAST').num_channels == 160
+        assert num_channels('UA_433', 250) == 7
+        assert num_channels('US', 62.5) == 416
+
+    def test_frequencies(self):
+        us = plan('US', 'LONG_FAST')
+        assert us.slot_for('LongFast') == 19
+        assert us.frequency_for('LongFast') == 906.875
+        assert us.frequency(20) == 907.125
+        for channel_plan in all_plans():
+            assert channel_plan.start_mhz < channel_plan.frequency(0)
+
+    def test_region_aliases(self):
+        assert plan('UNSET', 'LONG_FAST') is plan('US', 'LONG_FAST')
+        assert plan('SINGAPORE', 'LONG_FAST') is plan('SG_923', 'LONG_FAST')
+        with pytest.raises(KeyError):
+            plan('MARS', 'LONG_FAST')
+
+    def test_slot_at(self):
+        us = plan('US', 'LONG_FAST')
+        assert us.slot_at(906.875) == 19
+        assert us.slot_at(906.9) == 19                    # within half a channel
+        assert us.slot_at(906.9, tolerance_khz=10) is None
+        assert us.slot_at(901.0) is None
+        assert us.slot_at(930.0) is None
+
+
+class TestBatch:
+
+    def test_slots_for_names(self):
+        slots = slots_for_names(['LongFast', 'Ops'], 'US', ['LONG_FAST', 'SHORT_TURBO'])
+        assert slots['LONG_FAST']['LongFast'] == 19
+        assert slots['SHORT_TURBO']['LongFast'] == 130429955 % 52
+
+    def test_collisions_and_free_slots(self):
+        names = [f'chan{i}' for i in range(30)]
+        reports = plan_channels(names, 'EU_433')
+        report = reports['LONG_FAST']
+        assert report.plan.num_channels == 4
+        assert report.free == []
+        assert sum(len(group) for group in report.collisions.values()) == 30
+        assert set(reports) == set(PRESETS)
+
+        sparse = plan_channels(['LongFast'], 'US', ['LONG_FAST'])['LONG_FAST']
+        assert sparse.collisions == {}
+        assert len(sparse.free) == 103 and 19 not in sparse.free
+
+    def test_report_dict(self):
+        entry = plan_channels(['LongFast'], 'US', ['LONG_FAST'])['LONG_FAST'].to_dict()
+        assert entry['slots']['LongFast'] == {'slot': 19, 'frequency_mhz': 906.875}
+        assert entry['num_channels'] == 104
+
+    def test_thousands_of_candidates(self):
+        names = [f'candidate-{i}' for i in range(5000)]
+        reports = plan_channels(names, 'US')
+        assert all(len(r.slots) == 5000 for r in reports.values())
+        # Presets with the same slot count share one table
+        assert reports['LONG_FAST'].slots is reports['MEDIUM_FAST'].slots
+
+
+class TestLookup:
+
+    def test_default_names(self):
+        matches = lookup_frequency(906.875, region='US')
+        assert matches[0].names == ['LongFast']
+        assert {m.plan.preset for m in matches if m.names} >= {'LONG_FAST'}
+        assert all(m.slot == 19 for m in matches if m.plan.bandwidth_khz == 250)
+
+    def test_candidates_and_filters(self):
+        ops = plan('US', 'LONG_FAST').frequency_for('Ops')
+        matches = lookup_frequency(ops, candidates=['Ops', 'Net'], preset='LONG_FAST')
+        assert [(m.plan.region, m.names) for m in matches][0] == ('US', ['Ops'])
+        assert lookup_frequency(100.0) == []
+
+    def test_default_channel_names_cover_presets(self):
+        assert set(DEFAULT_CHANNEL_NAMES) == set(PRESETS)
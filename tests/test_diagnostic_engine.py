@@ -0,0 +1,304 @@
+"""
+Tests for DiagnosticEngine concurrent check execution and result caching.
+
+TestExecutorBenchmark doubles as a benchmark: run with -s to see the
+sequential vs concurrent wall-clock time for a run of slow checks.
+
+Run: python3 -m pytest tests/test_diagnostic_engine.py -v -s
+"""
+
+import threading
+import time
+import pytest
+
+from src.core.diagnostics.engine import DiagnosticEngine, _CheckSpec
+from src.core.diagnostics.models import CheckCategory, CheckResult, CheckStatus, HealthStatus
+
+
+def _result(name, category=CheckCategory.SYSTEM, status=CheckStatus.PASS):
+    return CheckResult(name=name, category=category, status=status, message="ok")
+
+
+def _slow(name, delay, category=CheckCategory.SYSTEM, status=CheckStatus.PASS):
+    def check():
+        time.sleep(delay)
+        return _result(name, category, status)
+    return check
+
+
+@pytest.fixture
+def engine():
+    DiagnosticEngine._instance = None
+    engine = DiagnosticEngine.get_instance()
+    yield engine
+    DiagnosticEngine._instance = None
+
+
+def _use_plan(engine, plan):
+    engine._check_plan = lambda: plan
+
+
+class TestCheckPlan:
+    """The real plan covers every category with named, bounded checks."""
+
+    def test_all_categories_planned(self, engine):
+        plan = engine._check_plan()
+        assert set(plan) == set(CheckCategory)
+        assert all(plan[c] for c in CheckCategory)
+
+    def test_deadlines_exceed_internal_timeouts(self, engine):
+        specs = {s.name: s for specs in engine._check_plan().values() for s in specs}
+        assert specs["meshtasticd logs"].timeout > 10  # journalctl timeout=10
+        assert specs["Meshtastic daemon"].timeout > 5   # systemctl timeout=5
+
+    def test_spec_names_match_results(self, engine):
+        spec = engine._check_plan()[CheckCategory.SYSTEM][0]
+        assert spec.fn(*spec.args).name == spec.name
+
+
+class TestConcurrentExecutor:
+    """Tests for _execute_checks()."""
+
+    def test_results_in_plan_order(self, engine):
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [
+                _CheckSpec("slow", _slow("slow", 0.1), (), 1.0),
+                _CheckSpec("fast", _slow("fast", 0.0), (), 1.0),
+            ],
+        })
+
+        results = engine.run_category(CheckCategory.SYSTEM)
+
+        assert [r.name for r in results] == ["slow", "fast"]
+
+    def test_streams_checks_as_they_complete(self, engine):
+        seen = []
+        engine.register_check_callback(lambda r: seen.append(r.name))
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [
+                _CheckSpec("slow", _slow("slow", 0.2), (), 1.0),
+                _CheckSpec("fast", _slow("fast", 0.0), (), 1.0),
+            ],
+        })
+
+        engine.run_category(CheckCategory.SYSTEM)
+
+        assert seen == ["fast", "slow"]
+
+    def test_each_check_notified_once(self, engine):
+        seen = []
+        engine.register_check_callback(lambda r: seen.append(r.name))
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [_CheckSpec("a", _slow("a", 0), (), 1.0)],
+            CheckCategory.NETWORK: [_CheckSpec("b", _slow("b", 0, CheckCategory.NETWORK), (), 1.0)],
+        })
+
+        engine.run_all()
+
+        assert sorted(seen) == ["a", "b"]
+
+    def test_progress_per_completed_category(self, engine):
+        progress = []
+        engine.register_progress_callback(lambda c, i, n: progress.append((c, i, n)))
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [_CheckSpec("a", _slow("a", 0.15), (), 1.0)],
+            CheckCategory.NETWORK: [_CheckSpec("b", _slow("b", 0, CheckCategory.NETWORK), (), 1.0)],
+        })
+
+        engine._execute_checks([CheckCategory.SYSTEM, CheckCategory.NETWORK])
+
+        assert progress == [("network", 1, 2), ("system", 2, 2)]
+
+    def test_timeout_reported_as_warning(self, engine):
+        release = threading.Event()
+
+        def hangs():
+            release.wait(5)
+            return _result("hangs")
+
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [
+                _CheckSpec("hangs", hangs, (), 0.2),
+                _CheckSpec("fine", _slow("fine", 0), (), 1.0),
+            ],
+        })
+
+        start = time.monotonic()
+        results = engine.run_category(CheckCategory.SYSTEM)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert elapsed < 1.0
+        assert results[0].status == CheckStatus.WARN
+        assert results[0].details == {"timeout": 0.2}
+        assert results[1].status == CheckStatus.PASS
+        assert engine.get_health()["system"].status == HealthStatus.DEGRADED
+
+    def test_deadline_starts_when_check_starts(self, engine):
+        # With one worker the second check queues behind the first; queue
+        # time must not count against its deadline.
+        _use_plan(engine, {
+            CheckCategory.SYSTEM: [
+                _CheckSpec("first", _slow("first", 0.3), (), 1.0),
+                _CheckSpec("second", _slow("second", 0.05), (), 0.2),
+            ],
+        })
+
+        results = engine.run_category(CheckCategory.SYSTEM, max_workers=1)
+
+        assert [r.status for r in results] == [CheckStatus.PASS, CheckStatus.PASS]
+
+    def test_exception_becomes_failure(self, engine):
+        def broken():
+            raise RuntimeError("boom")
+
+        _use_plan(engine, {CheckCategory.SYSTEM: [_CheckSpec("broken", broken, (), 1.0)]})
+
+        results = engine.run_category(CheckCategory.SYSTEM)
+
+        assert results[0].status == CheckStatus.FAIL
+        assert results[0].message == "boom"
+        assert engine.get_health()["system"].status == HealthStatus.UNHEALTHY
+
+    def test_async_mode(self, engine):
+        done = threading.Event()
+        engine.register_progress_callback(lambda c, i, n: i == n and done.set())
+        _use_plan(engine, {CheckCategory.SYSTEM: [_CheckSpec("a", _slow("a", 0), (), 1.0)]})
+
+        assert engine.run_all(async_mode=True) == []
+        assert done.wait(2)
+
+
+class TestResultCache:
+    """Tests for per-check TTLs and watched-path invalidation."""
+
+    def _counting(self, name, calls):
+        def check():
+            calls.append(name)
+            return _result(name)
+        return check
+
+    def test_fresh_result_reused(self, engine):
+        calls = []
+        _use_plan(engine, {CheckCategory.SYSTEM: [
+            _CheckSpec("static", self._counting("static", calls), (), 1.0, ttl=60.0),
+            _CheckSpec("live", self._counting("live", calls), (), 1.0),
+        ]})
+
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        results = engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert sorted(calls) == ["live", "live", "static"]
+        assert [r.name for r in results] == ["static", "live"]
+        assert engine.get_cache_stats()['hits'] == 1
+
+    def test_explicit_run_bypasses_cache(self, engine):
+        calls = []
+        _use_plan(engine, {CheckCategory.SYSTEM: [
+            _CheckSpec("static", self._counting("static", calls), (), 1.0, ttl=60.0),
+        ]})
+
+        engine.run_category(CheckCategory.SYSTEM)
+        engine.run_category(CheckCategory.SYSTEM)
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert calls == ["static", "static"]
+
+    def test_ttl_expiry(self, engine):
+        calls = []
+        _use_plan(engine, {CheckCategory.SYSTEM: [
+            _CheckSpec("short", self._counting("short", calls), (), 1.0, ttl=0.05),
+        ]})
+
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        time.sleep(0.1)
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert calls == ["short", "short"]
+
+    def test_watched_path_change_invalidates(self, engine, tmp_path):
+        config = tmp_path / "config"
+        calls = []
+        _use_plan(engine, {CheckCategory.SYSTEM: [
+            _CheckSpec("config", self._counting("config", calls), (), 1.0,
+                       ttl=float('inf'), watch=(str(config),)),
+        ]})
+
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        config.write_text("[interfaces]\n")  # created
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert calls == ["config", "config"]
+
+    def test_invalidate_by_name(self, engine):
+        calls = []
+        _use_plan(engine, {CheckCategory.SYSTEM: [
+            _CheckSpec("a", self._counting("a", calls), (), 1.0, ttl=60.0),
+            _CheckSpec("b", self._counting("b", calls), (), 1.0, ttl=60.0),
+        ]})
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        calls.clear()
+
+        engine.invalidate(name="a")
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert calls == ["a"]
+
+    def test_failed_checks_not_cached(self, engine):
+        calls = []
+
+        def broken():
+            calls.append("broken")
+            raise RuntimeError("boom")
+
+        _use_plan(engine, {CheckCategory.SYSTEM: [_CheckSpec("broken", broken, (), 1.0, ttl=60.0)]})
+
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+        engine._execute_checks([CheckCategory.SYSTEM], use_cache=True)
+
+        assert calls == ["broken", "broken"]
+
+    def test_real_plan_static_checks_cached(self, engine):
+        engine._execute_checks(list(CheckCategory), use_cache=True)
+        before = engine.get_cache_stats()['hits']
+
+        engine._execute_checks(list(CheckCategory), use_cache=True)
+
+        plan = engine._check_plan()
+        cacheable = sum(1 for specs in plan.values() for s in specs if s.ttl > 0)
+        assert engine.get_cache_stats()['hits'] - before == cacheable
+        # Every subprocess-backed check is cacheable
+        subprocess_checks = {"Meshtastic daemon", "Bluetooth", "RNS daemon", "NomadNet",
+                             "RTL-SDR", "meshtasticd logs"}
+        assert all(s.ttl > 0 for specs in plan.values() for s in specs
+                   if s.name in subprocess_checks)
+
+
+class TestExecutorBenchmark:
+    """Wall-clock time of slow checks, sequential vs concurrent."""
+
+    def test_concurrent_faster_than_sequential(self, engine):
+        delay = 0.1
+        plan = {
+            category: [_CheckSpec(f"{category.value}-{i}",
+                                  _slow(f"{category.value}-{i}", delay, category), (), 2.0)
+                       for i in range(2)]
+            for category in CheckCategory
+        }
+        _use_plan(engine, plan)
+
+        start = time.monotonic()
+        engine.run_all(max_workers=1)
+        sequential = time.monotonic() - start
+
+        start = time.monotonic()
+        results = engine.run_all()
+        concurrent = time.monotonic() - start
+
+        print(f"\n18 checks x {delay * 1000:.0f} ms: sequential {sequential:.2f}s, "
+              f"concurrent {concurrent:.2f}s ({sequential / concurrent:.1f}x)")
+        assert len(results) == 18
+        assert sequential >= 18 * delay
+        assert concurrent < sequential / 3
@@ -0,0 +1,265 @@
+"""
+Tests for the shared fetch cache and the cached HamClock/NOAA commands.
+
+Run: python3 -m pytest tests/test_fetch_cache.py -v
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import utils.fetch_cache as fetch_cache
+from utils.fetch_cache import FetchCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FetchCache(path=tmp_path / 'fetch_cache.json', background=False)
+    yield cache
+    cache.close()
+
+
+class Loader:
+    """Counting loader; fails while .error is set."""
+
+    def __init__(self, value='v', delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.error = None
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"{self.value}{self.calls}"
+
+
+def _expire(cache, key, seconds):
+    """Pretend key was fetched seconds ago."""
+    cache._entries[key].fetched_at = time.time() - seconds
+
+
+def _wait_idle(cache, key):
+    deadline = time.monotonic() + 2
+    while key in cache._inflight:
+        assert time.monotonic() < deadline, "revalidation did not finish"
+        time.sleep(0.01)
+
+
+class TestFetchCache:
+    """TTL, stale-while-revalidate, single-flight and error handling."""
+
+    def test_fresh_hit(self, cache):
+        loader = Loader()
+        assert cache.get('k', loader, ttl=60).value == 'v1'
+        hit = cache.get('k', loader, ttl=60)
+        assert (hit.value, hit.stale) == ('v1', False)
+        assert loader.calls == 1
+        assert cache.stats['hits'] == 1
+
+    def test_stale_while_revalidate(self, cache):
+        loader = Loader()
+        cache.get('k', loader, ttl=10)
+        _expire(cache, 'k', 15)
+
+        stale = cache.get('k', loader, ttl=10)
+        assert (stale.value, stale.stale) == ('v1', True)
+        assert stale.age >= 15
+
+        _wait_idle(cache, 'k')
+        assert cache.get('k', loader, ttl=10).value == 'v2'
+        assert loader.calls == 2
+
+    def test_too_old_refetches(self, cache):
+        loader = Loader()
+        cache.get('k', loader, ttl=10)
+        _expire(cache, 'k', 10 * fetch_cache.STALE_FACTOR + 1)
+
+        fresh = cache.get('k', loader, ttl=10)
+        assert (fresh.value, fresh.stale) == ('v2', False)
+
+    def test_single_flight(self, cache):
+        loader = Loader(delay=0.2)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cache.get('k', loader, ttl=60).value)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert results == ['v1'] * 5
+
+    def test_error_remembered(self, cache):
+        loader = Loader()
+        loader.error = OSError("down")
+        with pytest.raises(OSError):
+            cache.get('k', loader, ttl=60)
+        with pytest.raises(OSError):
+            cache.get('k', loader, ttl=60)
+        assert loader.calls == 1
+
+    def test_offline_serves_last_good(self, cache):
+        loader = Loader()
+        cache.get('k', loader, ttl=10)
+        _expire(cache, 'k', 10 * fetch_cache.STALE_FACTOR + 1)
+        loader.error = OSError("offline")
+
+        cached = cache.get('k', loader, ttl=10)
+        assert (cached.value, cached.stale) == ('v1', True)
+        assert 'offline' in cached.error
+        assert cache.stats['offline_hits'] == 1
+
+    def test_allow_stale_false(self, cache):
+        loader = Loader()
+        cache.get('k', loader, ttl=10, allow_stale=False)
+        _expire(cache, 'k', 15)
+        loader.error = OSError("down")
+
+        with pytest.raises(OSError):
+            cache.get('k', loader, ttl=10, allow_stale=False)
+
+    def test_persistence_round_trip(self, tmp_path):
+        path = tmp_path / 'fetch_cache.json'
+        first = FetchCache(path=path, background=False)
+        first.get('kept', Loader('a'), ttl=60)
+        first.get('live', Loader('b'), ttl=60, persist=False)
+        first.close()
+
+        assert set(json.loads(path.read_text())['entries']) == {'kept'}
+
+        second = FetchCache(path=path, background=False)
+        loader = Loader()
+        loader.error = OSError("offline")
+        try:
+            cached = second.get('kept', loader, ttl=60)
+            assert cached.value == 'a1'
+            assert loader.calls == 0
+        finally:
+            second.close()
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        path = tmp_path / 'fetch_cache.json'
+        path.write_text("{not json")
+        cache = FetchCache(path=path, background=False)
+        try:
+            assert cache.get('k', Loader(), ttl=60).value == 'v1'
+        finally:
+            cache.close()
+
+    def test_refresh_due(self, cache):
+        loader = Loader()
+        cache.get('k', loader, ttl=10)
+        assert cache.refresh_due() == 0
+
+        _expire(cache, 'k', 10 * fetch_cache.REFRESH_AHEAD)
+        assert cache.refresh_due() == 1
+        _wait_idle(cache, 'k')
+        assert cache.peek('k').value == 'v2'
+
+
+class TestGather:
+    """Concurrent fan-out."""
+
+    def test_runs_concurrently(self, cache):
+        def slow(value):
+            time.sleep(0.2)
+            return value
+
+        start = time.monotonic()
+        results = cache.gather({name: (lambda n=name: slow(n)) for name in 'abcd'})
+
+        assert results == {name: name for name in 'abcd'}
+        assert time.monotonic() - start < 0.6
+
+    def test_exceptions_are_results(self, cache):
+        def broken():
+            raise ValueError("bad")
+
+        results = cache.gather({'ok': lambda: 1, 'bad': broken})
+        assert results['ok'] == 1
+        assert isinstance(results['bad'], ValueError)
+
+    def test_nested_gather(self, cache):
+        inner = {name: (lambda n=name: n) for name in 'xyzw'}
+        outer = {name: (lambda: cache.gather(inner)) for name in 'abcdef'}
+
+        results = cache.gather(outer)
+
+        assert all(result == {n: n for n in 'xyzw'} for result in results.values())
+
+
+class TestHamClockCaching:
+    """commands.hamclock over a private cache and a fake HTTP layer."""
+
+    @pytest.fixture
+    def hamclock(self, cache, monkeypatch):
+        from commands import hamclock
+        monkeypatch.setattr(hamclock, 'get_fetch_cache', lambda: cache)
+        monkeypatch.setattr(hamclock, '_get_api_url', lambda: 'http://hc:8082')
+        hamclock.requests = []
+        hamclock.offline = False
+
+        def fake_get(url, timeout=None):
+            hamclock.requests.append(url)
+            time.sleep(0.1)
+            if hamclock.offline:
+                raise OSError("offline")
+            return "SFI=120\nKp=3\nSSN=80\n"
+
+        monkeypatch.setattr(hamclock, '_http_get', fake_get)
+        return hamclock
+
+    def test_endpoint_cached(self, hamclock):
+        first = hamclock._fetch_endpoint('get_spacewx.txt')
+        second = hamclock._fetch_endpoint('get_spacewx.txt')
+
+        assert first.success and second.success
+        assert second.raw_output == first.raw_output
+        assert hamclock.requests == ['http://hc:8082/get_spacewx.txt']
+
+    def test_fetch_endpoints_concurrent(self, hamclock):
+        endpoints = ['get_sys.txt', 'get_spacewx.txt', 'get_bc.txt']
+        start = time.monotonic()
+        results = hamclock.fetch_endpoints(endpoints, base_url='http://other:9000')
+
+        assert time.monotonic() - start < 0.25
+        assert all(results[e].success for e in endpoints)
+        assert sorted(hamclock.requests) == sorted(f"http://other:9000/{e}" for e in endpoints)
+
+    def test_get_all_data_concurrent(self, hamclock):
+        start = time.monotonic()
+        data = hamclock.get_all_data()
+
+        assert time.monotonic() - start < 0.35
+        assert data.data['errors'] == []
+        assert len(hamclock.requests) == 4
+
+    def test_stale_data_flagged(self, hamclock, cache):
+        hamclock.get_space_weather()
+        key = 'hamclock:http://hc:8082/get_spacewx.txt'
+        _expire(cache, key, hamclock.HAMCLOCK_TTLS['get_spacewx.txt'] * 2)
+        hamclock.offline = True
+
+        result = hamclock.get_space_weather()
+
+        assert result.success
+        assert result.data['stale'] is True
+
+    def test_liveness_not_served_stale(self, hamclock, cache):
+        assert hamclock.is_available()
+        _expire(cache, 'hamclock:http://hc:8082/get_sys.txt',
+                hamclock.HAMCLOCK_TTLS['get_sys.txt'] * 2)
+        hamclock.offline = True
+
+        assert not hamclock.is_available()
@@ -282,6 +282,30 @@ try:
             data = response.get_json()
             assert 'radius_m' in data
 
+        def test_airtime_endpoint(self, client):
+            """Test /api/tools/airtime endpoint."""
+            response = client.get('/api/tools/airtime?payloads=10,50&presets=LONG_FAST')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert list(data['presets']) == ['LONG_FAST']
+            assert len(data['presets']['LONG_FAST']['airtime_ms']) == 2
+
+            response = client.get('/api/tools/airtime?payloads=10&sf=7&bw=125000&cr=5&preamble=8')
+            assert response.get_json()['presets']['CUSTOM']['airtime_ms'] == [41.22]
+            assert client.get('/api/tools/airtime?presets=FAST').status_code == 400
+            assert client.get('/api/tools/airtime?sf=7&bw=0').status_code == 400
+            assert client.get('/api/tools/airtime?sf=7&bw=-125000').status_code == 400
+            assert client.get('/api/tools/airtime?sf=7&preamble=-1').status_code == 400
+
+        def test_channel_utilization_endpoint(self, client):
+            """Test /api/tools/channel-utilization endpoint."""
+            response = client.get('/api/tools/channel-utilization?nodes=40&region=EU_868')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['duty_limit_pct'] == 10
+            assert 0 < data['channel_utilization_pct'] < 100
+            assert client.get('/api/tools/channel-utilization').status_code == 400
+
         def test_api_hash_matches_local(self):
             """API djb2 should match local implementation."""
             assert api_djb2_hash("LongFast") == djb2_hash("LongFast")
@@ -90,6 +90,15 @@ class TestRNSOverMeshtasticConfig:
             assert 'delay' in throughput
             assert throughput['bps'] > 0
 
+    def test_get_throughput_estimate_airtime(self):
+        """Fragment airtime comes from the LoRa airtime model."""
+        slow = RNSOverMeshtasticConfig(data_speed=0).get_throughput_estimate(200)
+        fast = RNSOverMeshtasticConfig(data_speed=8).get_throughput_estimate(200)
+
+        assert 1.8 < slow['fragment_airtime'] < 1.9    # 216 bytes at SF11/250 kHz
+        assert fast['fragment_airtime'] < slow['fragment_airtime'] < slow['delay']
+        assert fast['max_bytes_per_sec'] > slow['max_bytes_per_sec']
+
     def test_get_throughput_estimate_invalid_speed(self):
         """Test throughput estimate falls back for invalid speed."""
         config = RNSOverMeshtasticConfig(data_speed=99)
@@ -0,0 +1,264 @@
+"""
+Tests for the shared journal follower.
+
+The journal is faked with a follower that hands out prepared records,
+so no journalctl or python-systemd is needed.
+
+Run: python3 -m pytest tests/test_log_service.py -v
+"""
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import utils.log_service as log_service
+from utils.log_service import LogService, format_entries, normalize_record, parse_since
+
+_seq = iter(range(1, 1_000_000))
+
+
+def _record(message, unit='meshtasticd', priority=6, age=0.0, **extra):
+    n = next(_seq)
+    record = {
+        '_SYSTEMD_UNIT': f'{unit}.service',
+        'MESSAGE': message,
+        'PRIORITY': str(priority),
+        '__REALTIME_TIMESTAMP': str(int((time.time() - age) * 1_000_000)),
+        '__CURSOR': f's=abc;i={n:x}',
+        'SYSLOG_IDENTIFIER': unit,
+        '_PID': '321',
+    }
+    record.update(extra)
+    return record
+
+
+class FakeFollower:
+    """Backfill from a list, follow from a queue; None in the queue ends the follow."""
+
+    def __init__(self, backfill=()):
+        self.backfill_records = list(backfill)
+        self.live = queue.Queue()
+        self.follow_cursors = []
+        self.backfills = 0
+
+    def __call__(self, units):
+        return self
+
+    def backfill(self, since):
+        self.backfills += 1
+        return iter(self.backfill_records)
+
+    def follow(self, after_cursor):
+        self.follow_cursors.append(after_cursor)
+        while True:
+            record = self.live.get()
+            if record is None:
+                return
+            yield record
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake():
+    return FakeFollower([
+        _record('old error', priority=3, age=7200),          # outside the window
+        _record('radio error', priority=3, age=600),
+        _record('booting', age=500),
+        _record('rns up', unit='rnsd', age=400),
+        _record('lost packet', priority=4, age=300),
+    ])
+
+
+@pytest.fixture
+def service(fake, monkeypatch):
+    monkeypatch.setattr(log_service, 'RESTART_DELAY', 0.01)
+    service = LogService(follower_factory=fake)
+    assert service.wait_ready(2)
+    yield service
+    fake.live.put(None)
+    service.stop()
+
+
+def _push(service, fake, record):
+    before = service.cursor
+    fake.live.put(record)
+    deadline = time.monotonic() + 2
+    while service.cursor == before and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestRecords:
+
+    def test_normalize_journalctl_json(self):
+        record = json.loads(json.dumps(_record('x', priority=3)))
+        record['MESSAGE'] = list('café'.encode('utf-8')) + [0xff]
+        fields = normalize_record(record)
+        assert fields['unit'] == 'meshtasticd'
+        assert fields['message'] == 'café�'
+        assert fields['priority'] == 3
+        assert fields['pid'] == 321
+
+    def test_systemd_messages_belong_to_unit(self):
+        fields = normalize_record(_record('Started meshtasticd.service', unit='init.scope',
+                                          UNIT='meshtasticd.service'))
+        assert fields['unit'] == 'meshtasticd'
+
+    def test_parse_since(self):
+        assert parse_since('5m') == 300
+        assert parse_since('2 hours ago') == 7200
+        assert parse_since('30s') == 30
+        assert parse_since('2024-01-15') is None
+        assert parse_since('today') is None
+
+
+class TestBuffer:
+
+    def test_backfill_and_tail(self, service):
+        lines = format_entries(service.tail('meshtasticd', 2)).splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith('meshtasticd[321]: booting')
+        assert lines[1].endswith('meshtasticd[321]: lost packet')
+        assert [e.message for e in service.tail('rnsd')] == ['rns up']
+
+    def test_cursor_reads_only_new(self, service, fake):
+        _, cursor = service.read()
+        assert service.read(cursor) == ([], cursor)
+
+        _push(service, fake, _record('new line'))
+        entries, next_cursor = service.read(cursor)
+        assert [e.message for e in entries] == ['new line']
+        assert next_cursor == cursor + 1
+
+    def test_ring_buffer_bounded(self, fake):
+        fake.backfill_records = [_record(f'line {i}') for i in range(10)]
+        service = LogService(capacity=4, follower_factory=fake)
+        try:
+            assert service.wait_ready(2)
+            # A cursor that fell out of the buffer reads from the oldest kept entry
+            entries, cursor = service.read(2)
+            assert [e.message for e in entries] == ['line 6', 'line 7', 'line 8', 'line 9']
+            assert service.read(8)[0][0].message == 'line 8'
+            assert cursor == 10
+        finally:
+            fake.live.put(None)
+            service.stop()
+
+    def test_covers(self, service):
+        assert service.covers(600)
+        assert service.covers(3600)
+        assert not service.covers(2 * 3600)            # past the backfill
+
+        fake = FakeFollower([_record(f'line {i}', age=100 - i) for i in range(10)])
+        small = LogService(capacity=4, follower_factory=fake)
+        try:
+            assert small.wait_ready(2)
+            assert small.covers(30)                     # all kept since line 6
+            assert not small.covers(300)                # older lines were dropped
+        finally:
+            fake.live.put(None)
+            small.stop()
+
+    def test_wait_wakes_on_new_entry(self, service, fake):
+        _, cursor = service.read()
+        threading.Timer(0.05, fake.live.put, args=(_record('fresh', unit='rnsd'),)).start()
+        threading.Timer(0.1, fake.live.put, args=(_record('wanted'),)).start()
+
+        entries, _ = service.wait(cursor, timeout=2, unit='meshtasticd')
+        assert [e.message for e in entries] == ['wanted']
+        assert service.wait(service.cursor, timeout=0.05) == ([], service.cursor)
+
+
+class TestErrors:
+
+    def test_error_counts_from_backfill(self, service):
+        assert service.error_count('meshtasticd') == 1          # 'old error' is too old
+        assert service.error_count('meshtasticd', window=60) == 0
+        assert [e.message for e in service.recent_errors('meshtasticd')] == ['radio error']
+        assert service.error_count('rnsd') == 0
+        assert service.error_count('hamclock') == 0
+
+    def test_live_errors_counted(self, service, fake):
+        _push(service, fake, _record('crash', priority=2))
+        assert service.error_count('meshtasticd', window=60) == 1
+        assert service.stats()['error_totals']['meshtasticd'] == 3   # every error ingested
+
+    def test_unanswerable_windows(self, service, fake, monkeypatch):
+        assert service.error_count('meshtasticd', window=2 * 3600) is None
+        assert service.error_count('hamclock', window=2 * 3600) == 0   # not watched
+
+        for i in range(log_service.ERROR_HISTORY):
+            service.ingest(_record(f'storm {i}', priority=3))
+        assert service.error_count('meshtasticd') is None
+        assert service.error_count('meshtasticd', window=60) is None
+
+    def test_window_expiry(self, service, monkeypatch):
+        later = time.time() + 3300
+        monkeypatch.setattr(log_service.time, 'time', lambda: later)
+        assert service.error_count('meshtasticd') == 0
+
+
+class TestFollowing:
+
+    def test_restart_resumes_after_cursor(self, service, fake):
+        _push(service, fake, _record('before exit'))
+        last = service.tail(lines=1)[0].cursor
+        fake.live.put(None)                       # journalctl exited
+
+        deadline = time.monotonic() + 2
+        while len(fake.follow_cursors) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert fake.follow_cursors[-1] == last
+        assert fake.backfills == 1
+
+    def test_peek_only_running_service(self, service, monkeypatch):
+        monkeypatch.setattr(log_service, '_service', None)
+        assert log_service.peek_log_service() is None
+        monkeypatch.setattr(log_service, '_service', service)
+        assert log_service.peek_log_service('meshtasticd') is service
+        assert log_service.peek_log_service('hamclock') is None
+
+
+class TestConsumers:
+    """Diagnostics and the commands layer read the buffer, not journalctl."""
+
+    @pytest.fixture
+    def no_journalctl(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("journalctl should not run")
+        monkeypatch.setattr(subprocess, 'run', fail)
+
+    def test_diagnostics_log_check(self, service, fake, no_journalctl, monkeypatch):
+        from src.core.diagnostics import engine as engine_module
+        from src.core.diagnostics.models import CheckStatus
+
+        monkeypatch.setattr(engine_module, 'LOG_SERVICE_AVAILABLE', True)
+        monkeypatch.setattr(engine_module, 'get_log_service', lambda: service, raising=False)
+        engine = engine_module.DiagnosticEngine()
+
+        result = engine._check_service_logs('meshtasticd')
+        assert result.status == CheckStatus.WARN
+        assert result.message == "1 error(s) in last hour"
+
+        for i in range(4):
+            _push(service, fake, _record(f'error {i}', priority=3))
+        result = engine._check_service_logs('meshtasticd')
+        assert result.status == CheckStatus.FAIL
+        assert result.details['recent_errors'][-1].endswith('error 3')
+
+    def test_commands_get_logs(self, service, no_journalctl, monkeypatch):
+        from commands import service as service_commands
+
+        monkeypatch.setattr(log_service, '_service', service)
+        result = service_commands.get_logs('meshtasticd', lines=2)
+        assert result.success
+        assert result.raw_output.splitlines()[-1].endswith('lost packet')
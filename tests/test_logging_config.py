@@ -0,0 +1,190 @@
+"""
+Tests for the central logging pipeline: queued file output, rotation,
+JSON lines and hot-path rate limiting.
+
+Run: python3 -m pytest tests/test_logging_config.py -v
+"""
+
+import json
+import logging
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import utils.logging_config as logging_config
+from utils.logging_config import (
+    DailyFileHandler, JsonFormatter, RateLimitFilter, SizedTimedRotatingFileHandler,
+    get_event_logger, queued, rate_limit,
+)
+
+
+def _record(msg='hello %s', args=('world',), level=logging.INFO, name='test',
+            lineno=10, created=None, **extra):
+    record = logging.LogRecord(name, level, __file__, lineno, msg, args, None)
+    if created is not None:
+        record.created = created
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def clean_root():
+    """setup_logging() configures the root logger once; undo it after."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    logging_config._initialized = False
+    yield root
+    logging_config.shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging_config._initialized = False
+
+
+class TestJsonFormatter:
+
+    def test_fields_and_extra(self):
+        line = JsonFormatter().format(_record(node='!a1b2c3d4', snr=7.5))
+        entry = json.loads(line)
+        assert entry['msg'] == 'hello world'
+        assert entry['level'] == 'INFO'
+        assert entry['logger'] == 'test'
+        assert entry['node'] == '!a1b2c3d4'
+        assert entry['snr'] == 7.5
+        assert 'args' not in entry
+
+    def test_exception_text(self):
+        try:
+            raise ValueError("bad packet")
+        except ValueError:
+            record = logging.LogRecord('test', logging.ERROR, __file__, 1, 'failed', (),
+                                       sys.exc_info())
+        entry = json.loads(JsonFormatter().format(record))
+        assert 'ValueError: bad packet' in entry['exc']
+
+
+class TestRotation:
+
+    def test_rotates_on_size(self, tmp_path):
+        handler = SizedTimedRotatingFileHandler(tmp_path / 'app.log', max_bytes=200,
+                                                backup_count=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for i in range(20):
+            handler.handle(_record('x' * 40, ()))
+        handler.close()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['app.log', 'app.log.1', 'app.log.2']
+        assert (tmp_path / 'app.log').stat().st_size <= 200
+
+    def test_rotates_at_midnight(self, tmp_path):
+        handler = SizedTimedRotatingFileHandler(tmp_path / 'app.log')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler.handle(_record('today', ()))
+        tomorrow = handler.rollover_at + 1
+        handler.handle(_record('tomorrow', (), created=tomorrow))
+        handler.close()
+
+        assert (tmp_path / 'app.log.1').read_text() == 'today\n'
+        assert (tmp_path / 'app.log').read_text() == 'tomorrow\n'
+        assert handler.rollover_at > tomorrow
+
+    def test_daily_file_handler(self, tmp_path):
+        opened = []
+        handler = DailyFileHandler(tmp_path, 'events_%Y%m%d.log', on_open=opened.append)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        now = datetime.now()
+        handler.handle(_record('one', (), created=now.timestamp()))
+        handler.handle(_record('two', (), created=now.timestamp()))
+        handler.handle(_record('three', (), created=(now + timedelta(days=1)).timestamp()))
+        handler.close()
+
+        today = tmp_path / now.strftime('events_%Y%m%d.log')
+        assert today.read_text() == 'one\ntwo\n'
+        assert len(opened) == 2
+
+
+class TestRateLimit:
+
+    def test_burst_then_rate(self):
+        limiter = RateLimitFilter(rate=1, burst=3)
+        passed = [limiter.filter(_record(created=100.0)) for _ in range(10)]
+        assert passed == [True] * 3 + [False] * 7
+
+        # A second later one token is back; the record reports the drops
+        record = _record(created=101.0)
+        assert limiter.filter(record)
+        assert record.suppressed == 7
+        assert record.getMessage() == 'hello world [+7 similar suppressed]'
+
+    def test_sampling_and_levels(self):
+        limiter = RateLimitFilter(rate=0, burst=1, sample=5)
+        passed = [limiter.filter(_record(created=1.0)) for _ in range(11)]
+        assert passed == [True] + [False, False, False, False, True] * 2
+        assert limiter.filter(_record(level=logging.WARNING, created=1.0))
+
+    def test_per_call_site(self):
+        limiter = RateLimitFilter(rate=0, burst=1)
+        assert limiter.filter(_record(lineno=1, created=1.0))
+        assert not limiter.filter(_record(lineno=1, created=1.0))
+        assert limiter.filter(_record(lineno=2, created=1.0))
+        assert limiter.stats() == {'test:1': 1}
+
+    def test_dropped_before_handlers(self):
+        hot = logging.getLogger('test.hot_path')
+        seen = []
+        handler = logging.Handler()
+        handler.emit = seen.append
+        hot.addHandler(handler)
+        hot.propagate = False
+        hot.setLevel(logging.INFO)
+        limiter = rate_limit(hot, rate=0, burst=2)
+        try:
+            for i in range(5):
+                hot.info("packet %d", i)
+            hot.error("boom")
+        finally:
+            hot.removeFilter(limiter)
+            hot.removeHandler(handler)
+        assert [r.getMessage() for r in seen] == ['packet 0', 'packet 1', 'boom']
+
+
+class TestPipeline:
+
+    def test_queued_writes_off_thread(self, tmp_path):
+        file_handler = logging.FileHandler(tmp_path / 'q.log')
+        file_handler.setFormatter(logging.Formatter('%(threadName)s %(message)s'))
+        writes = []
+        emit = file_handler.emit
+        file_handler.emit = lambda record: (writes.append(record), emit(record))
+        queue_handler, listener = queued([file_handler])
+
+        queue_handler.handle(_record('queued %d', (1,)))
+        listener.stop()
+        file_handler.close()
+        assert (tmp_path / 'q.log').read_text() == 'MainThread queued 1\n'
+        assert writes[0].args is None       # merged in the caller's thread
+
+    def test_setup_logging_files(self, tmp_path, clean_root, capsys):
+        logging_config.setup_logging(level=logging.DEBUG, log_file=str(tmp_path / 'mf.log'),
+                                     json_file=str(tmp_path / 'mf.jsonl'), console=False)
+        logging.getLogger('test.setup').info("started %s", 'ok', extra={'port': 4403})
+        logging_config.shutdown_logging()
+
+        assert 'started ok' in (tmp_path / 'mf.log').read_text()
+        entry = json.loads((tmp_path / 'mf.jsonl').read_text().splitlines()[-1])
+        assert entry['msg'] == 'started ok'
+        assert entry['port'] == 4403
+        assert capsys.readouterr().out == ''
+
+    def test_event_logger_shared_per_directory(self, tmp_path):
+        events = get_event_logger(tmp_path)
+        assert get_event_logger(tmp_path) is events
+        events.info("2026-10-18 12:00:00 | INFO | test | hello")
+        for listener in list(logging_config._event_listeners):
+            listener.stop()
+            listener.start()
+        log_file = tmp_path / datetime.now().strftime('events_%Y%m%d.log')
+        assert log_file.read_text() == "2026-10-18 12:00:00 | INFO | test | hello\n"
+        assert not events.propagate
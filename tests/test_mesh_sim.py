@@ -0,0 +1,170 @@
+"""
+Tests for the discrete-event mesh capacity simulator: links from the RF
+model, flood routing, rebroadcast suppression, collisions and reports.
+
+Run: python3 -m pytest tests/test_mesh_sim.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.airtime import get_modem
+from utils.mesh_sim import (
+    FloodSimulator, LatencyHistogram, MeshNetwork, SimConfig, main, simulate,
+)
+from utils.simulator import MeshSimulator, SimulationMode
+
+
+def _line(spacing, count, **config):
+    """Nodes on a line, spacing given as a fraction of the decode range."""
+    config = SimConfig(shadowing_db=0, traffic=(), seed=1, **config)
+    probe = MeshNetwork([], config)
+    step = spacing * probe.range_m(get_modem(config.preset).snr_threshold)
+    return MeshNetwork([(i * step, 0.0) for i in range(count)], config)
+
+
+class TestNetwork:
+
+    def test_links_follow_rf_model(self):
+        network = _line(0.7, 4)
+        first = {index: decodable for index, _, decodable in network.nodes[0].links}
+        assert first == {1: True, 2: False}           # two hops away: interference only
+        assert network.path_snr(100) > network.path_snr(1000)
+        assert network.mean_degree == pytest.approx(1.5)
+
+    def test_reachable(self):
+        network = _line(0.7, 8)
+        assert network.reachable(1) == [1, 2, 2, 2, 2, 2, 2, 1]
+        assert network.reachable(4)[0] == 4
+        assert network.reachable(20)[3] == 7
+
+    def test_from_coordinates(self):
+        network = MeshNetwork.from_coordinates(
+            [('!a', 20.0, -156.0), ('!b', 20.01, -156.0)], SimConfig(shadowing_db=0))
+        a, b = network.nodes
+        assert b.node_id == '!b'
+        assert b.y - a.y == pytest.approx(1112, abs=2)
+        assert network.mean_degree == 1
+
+
+class TestFlooding:
+
+    def test_hop_limit(self):
+        simulator = FloodSimulator(_line(0.7, 7))
+        simulator.send(0)
+        report = simulator.run(60)
+        assert report.deliveries == 4                 # origin + 3 relays
+        assert report.mean_hops == pytest.approx(2.5)
+        assert report.delivery_ratio == 1.0
+        assert report.coverage_ratio == pytest.approx(4 / 6)
+        assert report.transmissions == 4
+
+    def test_rebroadcast_suppression(self):
+        config = SimConfig(shadowing_db=0, traffic=(), seed=3)
+        network = MeshNetwork.scattered(20, area_km=1, config=config)
+        simulator = FloodSimulator(network)
+        simulator.send(0)
+        report = simulator.run(60)
+        assert report.deliveries == 19
+        assert report.rebroadcasts < 5
+        assert report.suppressed + report.rebroadcasts == 19
+
+    def test_hidden_terminal_collision(self):
+        # A and C can't hear each other; both reach B at the same strength
+        for collisions, expected in ((True, 0), (False, 4)):
+            simulator = FloodSimulator(_line(0.8, 3, collisions=collisions))
+            simulator.send(0)
+            simulator.send(2)
+            report = simulator.run(60)
+            assert report.deliveries == expected
+            assert report.collisions == (2 if collisions else 0)
+
+    def test_capture_effect(self):
+        config = SimConfig(shadowing_db=0, traffic=(), seed=1, csma=False)
+        reach = MeshNetwork([], config).range_m(get_modem('LONG_FAST').snr_threshold)
+        network = MeshNetwork([(0, 0), (0.8 * reach, 0), (1.1 * reach, 0)], config)
+        simulator = FloodSimulator(network)
+        simulator.send(0)
+        simulator.send(2)
+        report = simulator.run(60)
+        # The close sender's packet survives at B and is relayed to A
+        assert report.collisions == 1
+        assert report.deliveries == 2
+
+    def test_csma_defers(self):
+        simulator = FloodSimulator(_line(0.5, 2))
+        simulator.send(0)
+        simulator.send(1, at=0.1)
+        report = simulator.run(60)
+        assert report.backoffs >= 1
+        assert report.collisions == 0
+        assert report.deliveries == 2
+
+
+class TestReport:
+
+    def test_histogram(self):
+        histogram = LatencyHistogram(bin_width=0.1, max_latency=10)
+        for value in (0.05, 0.15, 0.25, 0.35, 50.0):
+            histogram.add(value)
+        summary = histogram.summary()
+        assert summary['count'] == 5
+        assert summary['p50'] == pytest.approx(0.3)
+        assert summary['max'] == 50.0
+        assert summary['mean'] == pytest.approx(10.16)
+
+    def test_random_mesh(self):
+        report = simulate(150, duration=1800, area_km=30, seed=5)
+        assert report.originated > 0
+        assert 0 < report.delivery_ratio <= 1
+        assert report.coverage_ratio <= report.delivery_ratio
+        assert 0 < report.channel_utilization <= 1
+        assert report.latency['p50'] <= report.latency['p99'] <= report.latency['max']
+        assert report.to_dict()['events'] == report.events
+
+    def test_deterministic(self):
+        first = simulate(60, duration=900, area_km=20, seed=9).to_dict()
+        second = simulate(60, duration=900, area_km=20, seed=9).to_dict()
+        first.pop('wall_time_s')
+        second.pop('wall_time_s')
+        assert first == second
+
+    def test_more_nodes_load_the_channel(self):
+        small = simulate(20, duration=1800, area_km=10, seed=2)
+        large = simulate(200, duration=1800, area_km=10, seed=2)
+        assert large.channel_utilization > small.channel_utilization
+
+    def test_dense_mesh_drops_stale_tx(self):
+        """A saturated channel sheds stale packets instead of queueing for hours."""
+        dense = simulate(300, duration=900, area_km=20, seed=1)
+        backlog = simulate(300, duration=900, area_km=20, seed=1, tx_timeout=None)
+
+        assert dense.stale_drops > 0 and backlog.stale_drops == 0
+        # At most tx_timeout in each of the hop_limit + 1 queues on the way
+        assert dense.latency['max'] < 30.0 * 4
+        assert backlog.latency['p90'] > 30.0 * 4
+        assert dense.events < backlog.events
+        assert dense.wall_time < 10.0
+
+    def test_cli(self, capsys):
+        assert main(['--nodes', '20', '--hours', '0.25', '--json']) == 0
+        assert '"delivery_ratio"' in capsys.readouterr().out
+
+
+class TestMeshSimulatorCapacity:
+
+    def test_simulate_capacity_with_extra_nodes(self):
+        simulator = MeshSimulator()
+        simulator.set_preset(use_hawaii=False)
+        simulator.enable(SimulationMode.MESH_NETWORK)
+        report = simulator.simulate_capacity(extra_nodes=30, duration=600, area_km=5, seed=4)
+        assert report.nodes == 35
+        assert report.originated > 0
+
+    def test_needs_nodes(self):
+        with pytest.raises(ValueError):
+            MeshSimulator().simulate_capacity()
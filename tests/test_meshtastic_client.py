@@ -0,0 +1,357 @@
+"""
+Tests for the asyncio Meshtastic stream client and its threaded facade.
+
+The client is run against the fake meshtasticd from the proxy tests.
+
+Run: python3 -m pytest tests/test_meshtastic_client.py -v
+"""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path (the client imports utils.meshtastic_stream)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.meshtastic_client import MeshtasticStreamClient, StreamInterface, get_client_loop
+from utils.meshtastic_stream import decode_mesh_packet, decode_to_radio
+
+from tests.test_meshtastic_proxy import (
+    MY_NUM,
+    REMOTE_NUM,
+    FakeMeshtasticd,
+    _mesh_packet,
+    _position,
+    _until,
+)
+
+
+def _run_with_daemon(scenario):
+    """Run scenario(fake) with a fake meshtasticd on a free port."""
+    async def main():
+        fake = FakeMeshtasticd()
+        await fake.start()
+        try:
+            await scenario(fake)
+        finally:
+            await fake.stop()
+    asyncio.run(main())
+
+
+def _text(sender, text):
+    return _mesh_packet(sender, 1, text.encode())
+
+
+def _sent_packets(fake):
+    """MeshPackets the fake received, decoded."""
+    packets = []
+    for payload in fake.received:
+        kind, value = decode_to_radio(payload)
+        if kind == 'packet':
+            packets.append(decode_mesh_packet(value))
+    return packets
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestStreamClient:
+    """Connection, node DB, iterators and sending."""
+
+    def test_connect_loads_node_db(self):
+        async def scenario(fake):
+            async with MeshtasticStreamClient('127.0.0.1', fake.port) as client:
+                assert client.connected
+                assert client.my_node_num == MY_NUM
+                assert client.nodes[f"!{REMOTE_NUM:08x}"]['user']['longName'] == "Remote"
+            assert not client.connected
+        _run_with_daemon(scenario)
+
+    def test_packets_iterator(self):
+        async def scenario(fake):
+            async with MeshtasticStreamClient('127.0.0.1', fake.port) as client:
+                received = []
+
+                async def consume():
+                    async for packet in client.packets():
+                        received.append(packet)
+                        if len(received) == 2:
+                            return
+
+                consumer = asyncio.ensure_future(consume())
+                await asyncio.sleep(0)
+                fake.push_packet(_text(REMOTE_NUM, "one"))
+                fake.push_packet(_mesh_packet(REMOTE_NUM, 3, _position(21.3, -157.8, 10)))
+                await asyncio.wait_for(consumer, 2.0)
+
+                assert received[0]['decoded']['text'] == "one"
+                assert received[1]['decoded']['portnum'] == 'POSITION_APP'
+                position = client.nodes[f"!{REMOTE_NUM:08x}"]['position']
+                assert position['latitude'] == pytest.approx(21.3)
+        _run_with_daemon(scenario)
+
+    def test_close_ends_iterators(self):
+        async def scenario(fake):
+            client = MeshtasticStreamClient('127.0.0.1', fake.port)
+            await client.connect()
+
+            async def consume():
+                return [packet async for packet in client]
+
+            consumer = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            await client.close()
+            assert await asyncio.wait_for(consumer, 2.0) == []
+        _run_with_daemon(scenario)
+
+    def test_backpressure_keeps_every_packet(self):
+        async def scenario(fake):
+            async with MeshtasticStreamClient('127.0.0.1', fake.port, queue_size=4) as client:
+                received = []
+
+                async def consume():
+                    async for packet in client.packets():
+                        received.append(packet['decoded']['text'])
+                        await asyncio.sleep(0.001)
+                        if len(received) == 50:
+                            return
+
+                consumer = asyncio.ensure_future(consume())
+                await asyncio.sleep(0)
+                for i in range(50):
+                    fake.push_packet(_text(REMOTE_NUM, str(i)))
+                await asyncio.wait_for(consumer, 5.0)
+
+                assert received == [str(i) for i in range(50)]
+                assert client.stats['backpressure_waits'] > 0
+        _run_with_daemon(scenario)
+
+    def test_pluggable_decoder(self):
+        async def scenario(fake):
+            raw = _text(REMOTE_NUM, "raw")
+            async with MeshtasticStreamClient('127.0.0.1', fake.port,
+                                              decoder=bytes) as client:
+                iterator = client.packets().__aiter__()
+                pending = asyncio.ensure_future(iterator.__anext__())
+                await asyncio.sleep(0)
+                fake.push_packet(raw)
+                assert await asyncio.wait_for(pending, 2.0) == raw
+                # Non-dict packets leave the node DB alone
+                assert set(client.nodes) == {f"!{MY_NUM:08x}", f"!{REMOTE_NUM:08x}"}
+        _run_with_daemon(scenario)
+
+    def test_send_text_and_data(self):
+        async def scenario(fake):
+            async with MeshtasticStreamClient('127.0.0.1', fake.port) as client:
+                await client.send_text("hi", destination=f"!{REMOTE_NUM:08x}")
+                await client.send_data(b'\x01\x02', portnum='PRIVATE_APP', hop_limit=3)
+                await _until(lambda: len(_sent_packets(fake)) == 2)
+
+            text, data = _sent_packets(fake)
+            assert text['to'] == REMOTE_NUM
+            assert text['decoded']['text'] == "hi"
+            assert data['decoded'] == {'portnum': 'PRIVATE_APP', 'payload': b'\x01\x02'}
+            assert data['hopLimit'] == 3
+        _run_with_daemon(scenario)
+
+    def test_reconnects_and_reloads_config(self):
+        async def scenario(fake):
+            events = []
+            client = MeshtasticStreamClient('127.0.0.1', fake.port, reconnect=True)
+            client.add_listener(lambda event, data: events.append(event))
+            await client.connect()
+
+            fake.drop_clients()
+            await _until(lambda: events.count('connected') == 2, timeout=5.0)
+
+            assert events == ['connected', 'disconnected', 'connected']
+            assert fake.connections == 2
+            assert fake.config_requests == 2
+            await client.close()
+        _run_with_daemon(scenario)
+
+    def test_unreachable_raises(self):
+        async def scenario():
+            client = MeshtasticStreamClient('127.0.0.1', _free_port())
+            with pytest.raises(ConnectionError):
+                await client.connect(timeout=2.0)
+        asyncio.run(scenario())
+
+
+@pytest.fixture
+def daemon():
+    """Fake meshtasticd hosted on the shared client loop."""
+    loop = get_client_loop()
+    fake = FakeMeshtasticd()
+    asyncio.run_coroutine_threadsafe(fake.start(), loop).result(5)
+    yield fake
+    asyncio.run_coroutine_threadsafe(fake.stop(), loop).result(5)
+
+
+def _push(fake, mesh_packet):
+    get_client_loop().call_soon_threadsafe(fake.push_packet, mesh_packet)
+
+
+def _wait(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestStreamInterface:
+    """The blocking facade used by the bridge, transport and NodeMonitor."""
+
+    def test_blocking_api(self, daemon):
+        packets = []
+        iface = StreamInterface('127.0.0.1', daemon.port, on_receive=packets.append)
+        assert iface.connect(timeout=5)
+        try:
+            assert iface.isConnected
+            assert iface.getMyNodeInfo()['user']['shortName'] == "BASE"
+            assert len(iface.nodes) == 2
+
+            iface.sendText("hello", destinationId=REMOTE_NUM, channelIndex=1)
+            iface.sendPosition(destinationId=f"!{REMOTE_NUM:08x}", wantResponse=True)
+            _push(daemon, _text(REMOTE_NUM, "reply"))
+
+            _wait(lambda: packets and len(daemon.received) == 2)
+            assert packets[0]['decoded']['text'] == "reply"
+            text, position = _sent_packets(daemon)
+            assert text['channel'] == 1
+            assert position['decoded']['portnum'] == 'POSITION_APP'
+            assert position['decoded']['wantResponse'] is True
+        finally:
+            iface.close()
+        assert not iface.isConnected
+
+    def test_connect_failure_is_false(self):
+        iface = StreamInterface('127.0.0.1', _free_port())
+        assert iface.connect(timeout=2) is False
+        assert iface.last_error
+
+    def test_send_from_callback_does_not_block(self, daemon):
+        iface = StreamInterface('127.0.0.1', daemon.port)
+        iface.on_receive = lambda packet: iface.sendText("ack")
+        assert iface.connect(timeout=5)
+        try:
+            _push(daemon, _text(REMOTE_NUM, "ping"))
+            _wait(lambda: len(daemon.received) == 1)
+        finally:
+            iface.close()
+
+    def test_single_loop_thread(self, daemon):
+        before = threading.active_count()
+        interfaces = [StreamInterface('127.0.0.1', daemon.port) for _ in range(3)]
+        try:
+            for iface in interfaces:
+                assert iface.connect(timeout=5)
+            assert threading.active_count() == before
+        finally:
+            for iface in interfaces:
+                iface.close()
+
+
+class TestConsumers:
+    """NodeMonitor, the RNS transport and the bridge over the stream client."""
+
+    def test_node_monitor(self, daemon, monkeypatch):
+        import monitoring.node_monitor as node_monitor
+        monkeypatch.setattr(node_monitor, 'TELEMETRY_STORE_AVAILABLE', False)
+        monkeypatch.setattr(node_monitor, 'PROXY_AVAILABLE', False)
+        monkeypatch.setattr(node_monitor, 'wait_for_cooldown', lambda: None)
+
+        monitor = node_monitor.NodeMonitor('127.0.0.1', daemon.port)
+        messages, updates = [], []
+        monitor.on_message = messages.append
+        monitor.on_node_update = updates.append
+        assert monitor.connect(timeout=5)
+        try:
+            assert monitor.my_node_id == f"!{MY_NUM:08x}"
+            assert monitor.get_node_count() == 2
+
+            _push(daemon, _mesh_packet(REMOTE_NUM, 3, _position(21.3, -157.8, 10)))
+            _wait(lambda: messages and updates)
+
+            node = monitor.get_node(f"!{REMOTE_NUM:08x}")
+            assert node.position.latitude == pytest.approx(21.3)
+            assert node.long_name == "Remote"
+        finally:
+            monitor.disconnect()
+
+    @pytest.mark.parametrize('history', [False, True])
+    def test_node_monitor_telemetry_history_opt_in(self, daemon, monkeypatch, history):
+        import monitoring.node_monitor as node_monitor
+        store = MagicMock()
+        monkeypatch.setattr(node_monitor, 'TELEMETRY_STORE_AVAILABLE', True)
+        monkeypatch.setattr(node_monitor, 'get_telemetry_store', lambda: store)
+        monkeypatch.setattr(node_monitor, 'PROXY_AVAILABLE', False)
+        monkeypatch.setattr(node_monitor, 'wait_for_cooldown', lambda: None)
+
+        monitor = node_monitor.NodeMonitor('127.0.0.1', daemon.port,
+                                           telemetry_history=history)
+        assert monitor.connect(timeout=5)
+        monitor.disconnect()
+
+        assert store.start.called is history
+        assert (monitor.telemetry_store is store) is history
+
+    def test_transport_round_trip(self, daemon):
+        from gateway.config import RNSOverMeshtasticConfig
+        from gateway.rns_transport import RNSMeshtasticTransport
+
+        config = RNSOverMeshtasticConfig(enabled=True, connection_type="tcp",
+                                         device_path=f"127.0.0.1:{daemon.port}")
+        transport = RNSMeshtasticTransport(config)
+        transport._fragment_delay = 0
+        received = []
+        transport.register_packet_callback(received.append)
+        assert transport.start()
+        try:
+            packet = bytes(range(256)) * 2
+            assert transport.send_packet(packet)
+            _wait(lambda: len(_sent_packets(daemon)) == 3)
+            for sent in _sent_packets(daemon):
+                assert sent['decoded']['portnum'] == 'PRIVATE_APP'
+                assert sent['hopLimit'] == config.hop_limit
+                # Loop the fragments back as if heard from another node
+                _push(daemon, _mesh_packet(REMOTE_NUM, 256, sent['decoded']['payload']))
+            _wait(lambda: received)
+            assert received == [packet]
+        finally:
+            transport.stop()
+
+    def test_bridge_receives_text(self, daemon):
+        from gateway.config import GatewayConfig
+        from gateway.rns_bridge import RNSMeshtasticBridge
+
+        config = GatewayConfig(enabled=True)
+        config.meshtastic.host = '127.0.0.1'
+        config.meshtastic.port = daemon.port
+        bridge = RNSMeshtasticBridge(config)
+        bridge.node_tracker.add_node = lambda node: None
+        messages = []
+        bridge.register_message_callback(messages.append)
+
+        bridge._start_meshtastic_stream()
+        try:
+            _wait(lambda: bridge._connected_mesh)
+            _push(daemon, _text(REMOTE_NUM, "over the bridge"))
+            _wait(lambda: messages)
+            assert messages[0].content == "over the bridge"
+            assert messages[0].source_id == f"!{REMOTE_NUM:08x}"
+
+            assert bridge.send_to_meshtastic("back", channel=0)
+            _wait(lambda: _sent_packets(daemon))
+            assert _sent_packets(daemon)[0]['decoded']['text'] == "back"
+        finally:
+            bridge._disconnect_meshtastic()
@@ -0,0 +1,454 @@
+"""
+Tests for the Meshtastic stream codec and the multiplexing proxy.
+
+The proxy is run against a fake meshtasticd that speaks the framing
+protocol and, like the real daemon, is only ever connected to once.
+
+Run: python3 -m pytest tests/test_meshtastic_proxy.py -v
+"""
+
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path (the proxy imports utils.meshtastic_stream)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.meshtastic_stream import (
+    FR_CHANNEL,
+    FR_CONFIG_COMPLETE_ID,
+    FR_MY_INFO,
+    FR_NODE_INFO,
+    FR_PACKET,
+    FrameDecoder,
+    ProtocolError,
+    decode_from_radio,
+    decode_mesh_packet,
+    decode_node_info,
+    decode_to_radio,
+    encode_bytes,
+    encode_fixed32,
+    encode_float,
+    encode_from_radio,
+    encode_varint,
+    frame,
+    parse_node_id,
+    split_fields,
+    text_packet,
+    want_config,
+)
+import utils.meshtastic_proxy as meshtastic_proxy
+from utils.meshtastic_proxy import MeshtasticProxy, api_request, get_proxy_endpoint
+
+MY_NUM = 0x11111111
+REMOTE_NUM = 0x22222222
+
+
+def _user(num, long_name, short_name):
+    return (encode_bytes(1, f"!{num:08x}".encode()) + encode_bytes(2, long_name.encode())
+            + encode_bytes(3, short_name.encode()) + encode_varint(5, 9))
+
+
+def _node_info(num, long_name, short_name):
+    return encode_varint(1, num) + encode_bytes(2, _user(num, long_name, short_name))
+
+
+def _mesh_packet(sender, portnum, payload, to=0xFFFFFFFF, snr=6.25, rx_time=1700000000):
+    data = encode_varint(1, portnum) + encode_bytes(2, payload)
+    return (encode_fixed32(1, sender) + encode_fixed32(2, to) + encode_bytes(4, data)
+            + encode_fixed32(6, 1234) + encode_fixed32(7, rx_time) + encode_float(8, snr)
+            + encode_varint(9, 1) + encode_varint(15, 3))
+
+
+def _position(lat, lon, alt):
+    return (encode_fixed32(1, int(lat * 1e7)) + encode_fixed32(2, int(lon * 1e7))
+            + encode_varint(3, alt))
+
+
+class FakeMeshtasticd:
+    """Minimal stand-in for meshtasticd's TCP API."""
+
+    def __init__(self):
+        self.connections = 0
+        self.config_requests = 0
+        self.received = []       # ToRadio payloads other than want_config
+        self._writers = []
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for writer in self._writers:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        decoder = FrameDecoder()
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                return
+            for payload in decoder.feed(data):
+                kind, value = decode_to_radio(payload)
+                if kind == 'want_config_id':
+                    self.config_requests += 1
+                    self._send_config(writer, value)
+                else:
+                    self.received.append(payload)
+
+    def _send_config(self, writer, nonce):
+        for payload in (
+            encode_bytes(FR_MY_INFO, encode_varint(1, MY_NUM)),
+            encode_bytes(FR_NODE_INFO, _node_info(MY_NUM, "Base Station", "BASE")),
+            encode_bytes(FR_NODE_INFO, _node_info(REMOTE_NUM, "Remote", "RM")),
+            encode_bytes(FR_CHANNEL, encode_varint(1, 0)),
+            encode_from_radio(FR_CONFIG_COMPLETE_ID, nonce),
+        ):
+            writer.write(frame(payload))
+
+    def push_packet(self, mesh_packet):
+        for writer in self._writers:
+            writer.write(frame(encode_bytes(FR_PACKET, mesh_packet)))
+
+    def drop_clients(self):
+        """Close every client connection (as a restarting daemon would)."""
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+
+
+class StreamClient:
+    """Just enough of a Meshtastic client to talk to the proxy."""
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.decoder = FrameDecoder()
+        self.frames = []
+
+    @classmethod
+    async def connect(cls, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        return cls(reader, writer)
+
+    def send(self, payload):
+        self.writer.write(frame(payload))
+
+    async def next_frame(self, timeout=2.0):
+        while not self.frames:
+            data = await asyncio.wait_for(self.reader.read(4096), timeout)
+            assert data, "proxy closed the connection"
+            self.frames.extend(self.decoder.feed(data))
+        return decode_from_radio(self.frames.pop(0))
+
+    async def download_config(self, nonce):
+        self.send(want_config(nonce))
+        kinds = []
+        while True:
+            kind, value = await self.next_frame()
+            kinds.append((kind, value))
+            if kind == 'config_complete_id':
+                assert value == nonce
+                return kinds
+
+    def close(self):
+        self.writer.close()
+
+
+async def _api(port, cmd, **params):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(json.dumps(dict(params, cmd=cmd)).encode() + b'\n')
+    reply = json.loads(await asyncio.wait_for(reader.readline(), 2.0))
+    writer.close()
+    return reply
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def _run_with_proxy(scenario):
+    """Run scenario(fake, proxy) with a fake upstream and a proxy on free ports."""
+    async def main():
+        fake = FakeMeshtasticd()
+        await fake.start()
+        proxy = MeshtasticProxy(upstream_port=fake.port, stream_port=0, api_port=0)
+        task = asyncio.ensure_future(proxy.serve_forever())
+        try:
+            await _until(lambda: proxy._config_ready is not None and proxy._config_ready.is_set())
+            await scenario(fake, proxy)
+        finally:
+            proxy._stopping.set()
+            await task
+            await fake.stop()
+    asyncio.run(main())
+
+
+class TestFraming:
+    """Frame splitting and building."""
+
+    def test_round_trip_in_pieces(self):
+        payloads = [b'\x01', b'x' * 300, b'']
+        stream = b''.join(frame(p) for p in payloads)
+        decoder = FrameDecoder()
+
+        out = []
+        for i in range(0, len(stream), 7):
+            out.extend(decoder.feed(stream[i:i + 7]))
+
+        assert out == payloads
+
+    def test_debug_text_skipped(self):
+        decoder = FrameDecoder()
+        noise = b'INFO | ??:??:?? 5 [Router] booting\r\n\x94'
+
+        out = decoder.feed(noise + frame(b'abc') + b'\xc3' * 32 + frame(b'def'))
+
+        assert out == [b'abc', b'def']
+        assert decoder.skipped > len(noise) - 1
+
+    def test_oversized_length_resyncs(self):
+        decoder = FrameDecoder()
+        assert decoder.feed(b'\x94\xc3\xff\xff' + frame(b'ok')) == [b'ok']
+
+    def test_frame_rejects_oversized_payload(self):
+        with pytest.raises(ProtocolError):
+            frame(b'x' * 513)
+
+
+class TestWireCodec:
+    """Decoding into the meshtastic library's dict shapes."""
+
+    def test_text_packet_decodes(self):
+        payload = text_packet("hello mesh", to=REMOTE_NUM, channel=2, want_ack=True)
+        kind, value = decode_to_radio(payload)
+        packet = decode_mesh_packet(value)
+
+        assert kind == 'packet'
+        assert packet['toId'] == "!22222222"
+        assert packet['channel'] == 2
+        assert packet['wantAck'] is True
+        assert packet['decoded']['portnum'] == 'TEXT_MESSAGE_APP'
+        assert packet['decoded']['text'] == "hello mesh"
+
+    def test_position_packet_signed_fields(self):
+        raw = _mesh_packet(REMOTE_NUM, 3, _position(-33.8688, 151.2093, -12))
+        packet = decode_mesh_packet(raw)
+
+        position = packet['decoded']['position']
+        assert position['latitude'] == pytest.approx(-33.8688)
+        assert position['longitude'] == pytest.approx(151.2093)
+        assert position['altitude'] == -12
+        assert packet['fromId'] == "!22222222"
+        assert packet['rxSnr'] == 6.25
+        assert packet['hopStart'] - packet['hopLimit'] == 2
+
+    def test_node_info_matches_library_shape(self):
+        node = decode_node_info(_node_info(REMOTE_NUM, "Remote", "RM"))
+
+        assert node['num'] == REMOTE_NUM
+        assert node['user']['longName'] == "Remote"
+        assert node['user']['shortName'] == "RM"
+        assert node['user']['hwModel'] == "RAK4631"
+
+    def test_split_fields_rejoins(self):
+        raw = _node_info(REMOTE_NUM, "Remote", "RM") + encode_float(4, 1.5)
+        fields = split_fields(raw)
+
+        assert sorted(fields) == [1, 2, 4]
+        assert b''.join(fields[f] for f in sorted(fields)) == raw
+
+    def test_truncated_message_raises(self):
+        with pytest.raises(ProtocolError):
+            decode_node_info(_node_info(REMOTE_NUM, "Remote", "RM")[:-3])
+
+    def test_parse_node_id(self):
+        assert parse_node_id("!22222222") == REMOTE_NUM
+        assert parse_node_id("^all") == 0xFFFFFFFF
+        assert parse_node_id(5) == 5
+
+
+class TestProxy:
+    """One upstream session, many clients."""
+
+    def test_clients_share_one_upstream_session(self):
+        async def scenario(fake, proxy):
+            first = await StreamClient.connect(proxy.stream_port)
+            second = await StreamClient.connect(proxy.stream_port)
+
+            a = await first.download_config(101)
+            b = await second.download_config(202)
+
+            kinds = [k for k, _ in a]
+            assert kinds[0] == 'my_info'
+            assert kinds.count('node_info') == 2
+            assert 'channel' in kinds
+            assert [k for k, _ in b] == kinds
+            assert fake.connections == 1
+            assert fake.config_requests == 1
+            first.close()
+            second.close()
+
+        _run_with_proxy(scenario)
+
+    def test_packets_fan_out_to_all_clients(self):
+        async def scenario(fake, proxy):
+            clients = [await StreamClient.connect(proxy.stream_port) for _ in range(3)]
+            for i, client in enumerate(clients):
+                await client.download_config(i + 1)
+
+            fake.push_packet(_mesh_packet(REMOTE_NUM, 1, b"hi all"))
+
+            for client in clients:
+                kind, value = await client.next_frame()
+                assert kind == 'packet'
+                assert decode_mesh_packet(value)['decoded']['text'] == "hi all"
+                client.close()
+
+        _run_with_proxy(scenario)
+
+    def test_client_writes_reach_radio(self):
+        async def scenario(fake, proxy):
+            client = await StreamClient.connect(proxy.stream_port)
+            await client.download_config(7)
+
+            client.send(text_packet("from client", to=REMOTE_NUM))
+            client.send(encode_bytes(7, b''))  # heartbeat stays local
+
+            await _until(lambda: fake.received)
+            _, value = decode_to_radio(fake.received[0])
+            assert decode_mesh_packet(value)['decoded']['text'] == "from client"
+            await asyncio.sleep(0.05)
+            assert len(fake.received) == 1
+            client.close()
+
+        _run_with_proxy(scenario)
+
+    def test_live_node_db(self):
+        async def scenario(fake, proxy):
+            new_num = 0x33333333
+            fake.push_packet(_mesh_packet(new_num, 3, _position(21.3, -157.8, 40)))
+            fake.push_packet(_mesh_packet(new_num, 4, _user(new_num, "Hiker", "HK")))
+            await _until(lambda: new_num in proxy._nodes and 2 in proxy._nodes[new_num])
+
+            nodes = (await _api(proxy.api_port, 'nodes'))['nodes']
+            node = nodes["!33333333"]
+            assert node['user']['longName'] == "Hiker"
+            assert node['position']['latitude'] == pytest.approx(21.3)
+            assert node['snr'] == 6.25
+            assert node['hopsAway'] == 2
+            assert nodes["!22222222"]['user']['shortName'] == "RM"
+
+            # New clients get the node in their config download
+            client = await StreamClient.connect(proxy.stream_port)
+            config = await client.download_config(9)
+            replayed = [decode_node_info(v) for k, v in config if k == 'node_info']
+            assert replayed[0]['num'] == MY_NUM
+            assert any(n['num'] == new_num and n['user']['shortName'] == "HK"
+                       for n in replayed)
+            client.close()
+
+        _run_with_proxy(scenario)
+
+    def test_api_send_text_and_events(self):
+        async def scenario(fake, proxy):
+            reader, writer = await asyncio.open_connection('127.0.0.1', proxy.api_port)
+            writer.write(b'{"cmd": "subscribe"}\n')
+            assert json.loads(await reader.readline())['subscribed']
+
+            reply = await _api(proxy.api_port, 'send_text', text="via api", to="!22222222")
+            assert reply['ok']
+            await _until(lambda: fake.received)
+            _, value = decode_to_radio(fake.received[0])
+            assert decode_mesh_packet(value)['toId'] == "!22222222"
+
+            fake.push_packet(_mesh_packet(REMOTE_NUM, 1, b"event"))
+            event = json.loads(await asyncio.wait_for(reader.readline(), 2.0))
+            assert event['event'] == 'packet'
+            assert event['packet']['decoded']['text'] == "event"
+            writer.close()
+
+        _run_with_proxy(scenario)
+
+    def test_api_rejects_bad_requests(self):
+        async def scenario(fake, proxy):
+            assert (await _api(proxy.api_port, 'bogus'))['ok'] is False
+            assert (await _api(proxy.api_port, 'send_text'))['ok'] is False
+
+        _run_with_proxy(scenario)
+
+
+class TestBackpressure:
+    """Busy or config-less upstream sessions."""
+
+    def test_api_send_upstream_busy(self, monkeypatch):
+        monkeypatch.setattr(meshtastic_proxy, 'UPSTREAM_SEND_TIMEOUT', 0.05)
+
+        async def main():
+            proxy = MeshtasticProxy(upstream_port=1)
+            proxy._connected = asyncio.Event()
+            proxy._connected.set()
+            proxy._upstream_queue = asyncio.Queue(maxsize=1)
+            proxy._upstream_queue.put_nowait(b'queued')
+            return await proxy._api_send(b'more')
+
+        assert asyncio.run(main()) == {'ok': False, 'error': 'upstream busy'}
+
+    def test_config_wait_times_out(self, monkeypatch):
+        monkeypatch.setattr(meshtastic_proxy, 'CONFIG_TIMEOUT', 0.1)
+        proxy = MeshtasticProxy(upstream_port=1, stream_port=0, api_port=0)
+        assert proxy.start()
+        try:
+            with socket.create_connection(('127.0.0.1', proxy.stream_port), timeout=2) as sock:
+                sock.sendall(frame(want_config(5)))
+                assert sock.recv(4096) == b''
+        finally:
+            proxy.stop()
+
+
+class TestClientHelpers:
+    """Synchronous helpers used by the connection managers."""
+
+    def test_endpoint_only_when_upstream_connected(self):
+        proxy = MeshtasticProxy(upstream_port=1, stream_port=0, api_port=0)
+        assert proxy.start()
+        try:
+            ping = api_request('ping', port=proxy.api_port)
+            assert ping['ok'] and ping['connected'] is False
+            assert get_proxy_endpoint('localhost', 4403, api_port=proxy.api_port) is None
+        finally:
+            proxy.stop()
+
+    def test_absent_proxy_cached_longer(self, monkeypatch):
+        calls = []
+
+        def refused(*args, **kwargs):
+            calls.append(args)
+            raise ConnectionRefusedError()
+
+        monkeypatch.setattr(meshtastic_proxy, 'api_request', refused)
+        monkeypatch.setattr(meshtastic_proxy, '_endpoint_cache', {})
+
+        assert get_proxy_endpoint('localhost', 4403, api_port=1) is None
+        assert get_proxy_endpoint('localhost', 4403, api_port=1) is None
+
+        assert len(calls) == 1
+        expires, _ = meshtastic_proxy._endpoint_cache[('localhost', 1)]
+        assert expires - time.monotonic() > meshtastic_proxy.ENDPOINT_CACHE_SEC
+
+    def test_remote_hosts_not_redirected(self):
+        assert get_proxy_endpoint('192.168.1.20', 4403) is None
+        assert get_proxy_endpoint('localhost', 4500) is None
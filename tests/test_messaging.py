@@ -0,0 +1,455 @@
+"""
+Messaging Command and Message Store Tests
+
+Tests commands/messaging.py against a temporary database and the
+shared MessageStore (WAL, group commit, per-thread readers, migrations).
+
+Run: python3 -m pytest tests/test_messaging.py -v
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands import messaging
+from commands.message_store import MessageStore, MIGRATIONS, get_store, close_all, _fts_query
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "messages.db"
+    with patch.object(messaging, '_get_db_path', return_value=path):
+        yield path
+    close_all()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MessageStore(tmp_path / "store.db")
+    yield store
+    store.close()
+
+
+class TestMessageStore:
+    """Tests for MessageStore."""
+
+    def test_wal_enabled(self, store):
+        mode = store.reader().execute('PRAGMA journal_mode').fetchone()[0]
+        assert mode == 'wal'
+
+    def test_migrated_once(self, store):
+        assert store.schema_version == MIGRATIONS[-1][0]
+
+    def test_upgrades_legacy_database(self, tmp_path):
+        # Database created by the old per-call _init_db(): user_version 0
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute(MIGRATIONS[0][1][0])
+        conn.execute("INSERT INTO messages (network, from_id, content) VALUES ('rns', 'a', 'old')")
+        conn.commit()
+        conn.close()
+
+        store = MessageStore(path)
+        try:
+            rows = store.reader().execute("SELECT content FROM messages").fetchall()
+            assert [r['content'] for r in rows] == ['old']
+            assert store.schema_version == MIGRATIONS[-1][0]
+        finally:
+            store.close()
+
+    def test_insert_returns_id_and_is_readable(self, store):
+        message_id = store.insert_message(network='meshtastic', from_id='!a', content='hi')
+
+        row = store.reader().execute("SELECT * FROM messages WHERE id = ?", (message_id,)).fetchone()
+
+        assert row['content'] == 'hi'
+        assert row['is_dm'] == 0  # broadcast (no to_id)
+
+    def test_insert_messages_ids_in_order(self, store):
+        ids = store.insert_messages([
+            {'network': 'meshtastic', 'from_id': 'local', 'content': f'part {i}'}
+            for i in range(3)
+        ])
+        assert ids == sorted(ids) and len(ids) == 3
+
+    def test_unknown_field_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.insert_message(network='rns', from_id='a', content='x', bogus=1)
+
+    def test_nowait_and_flush(self, store):
+        futures = [store.insert_message(wait=False, network='rns', from_id='a', content=str(i))
+                   for i in range(100)]
+
+        assert store.flush()
+        assert all(f.done() for f in futures)
+        assert store.reader().execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 100
+
+    def test_concurrent_writers_group_commit(self, store):
+        def writer(n):
+            for i in range(50):
+                store.insert_message(network='meshtastic', from_id=f'!{n}', content=str(i))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = store.get_write_stats()
+        assert store.reader().execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 400
+        assert stats['writes'] == 400
+        assert stats['batches'] < 400  # some writes shared a commit
+
+    def test_bad_write_isolated_from_batch(self, store):
+        good = store.insert_message(wait=False, network='rns', from_id='a', content='ok')
+        bad = store.write(lambda conn: conn.execute("INSERT INTO nope VALUES (1)"), wait=False)
+
+        with pytest.raises(sqlite3.OperationalError):
+            bad.result(timeout=5)
+        assert good.result(timeout=5) > 0
+        assert store.get_write_stats()['errors'] == 1
+
+    def test_reader_per_thread(self, store):
+        conns = []
+        t = threading.Thread(target=lambda: conns.append(store.reader()))
+        t.start()
+        t.join()
+
+        assert conns[0] is not store.reader()
+        assert store.reader() is store.reader()
+
+    def test_dead_thread_readers_pruned(self, store):
+        for _ in range(5):
+            t = threading.Thread(target=store.reader)
+            t.start()
+            t.join()
+        store.reader()
+        assert len(store._readers) <= 2
+
+    def test_readers_are_read_only(self, store):
+        with pytest.raises(sqlite3.OperationalError):
+            store.reader().execute("DELETE FROM messages")
+
+    def test_closed_store_rejects_writes(self, store):
+        store.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            store.insert_message(network='rns', from_id='a', content='x')
+
+    def test_get_store_shared(self, tmp_path):
+        try:
+            assert get_store(tmp_path / "a.db") is get_store(tmp_path / "a.db")
+            assert get_store(tmp_path / "a.db") is not get_store(tmp_path / "b.db")
+        finally:
+            close_all()
+
+
+class TestPartitionsAndSummaries:
+    """Tests for month partitions, summary tables and retention."""
+
+    def _insert(self, store, day, **fields):
+        fields.setdefault('network', 'meshtastic')
+        fields.setdefault('from_id', '!aaaa0001')
+        fields.setdefault('to_id', 'local')
+        fields.setdefault('content', 'x')
+        return store.insert_message(timestamp=f"{day} 12:00:00", **fields)
+
+    def _tables(self, store):
+        return store._partition_tables(store.reader())
+
+    def _scan_summaries(self, store):
+        conn = store.reader()
+        conversations = {
+            (r[0], r[1]): (r[2], r[3]) for r in conn.execute('''
+                SELECT partner, network, MAX(timestamp), COUNT(*) FROM messages
+                WHERE partner IS NOT NULL GROUP BY partner, network''')
+        }
+        total = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        sent = conn.execute("SELECT COUNT(*) FROM messages WHERE from_id = 'local'").fetchone()[0]
+        return conversations, total, sent
+
+    def _summaries(self, store):
+        conn = store.reader()
+        conversations = {
+            (r[0], r[1]): (r[2], r[3])
+            for r in conn.execute("SELECT * FROM conversations")
+        }
+        counters = dict(conn.execute("SELECT name, value FROM message_counters").fetchall())
+        return conversations, counters.get('total', 0), counters.get('sent', 0)
+
+    def test_rows_routed_to_month_partitions(self, store):
+        a = self._insert(store, "2026-01-15")
+        b = self._insert(store, "2026-02-15")
+        c = self._insert(store, "2026-01-20")
+
+        tables = self._tables(store)
+        assert "messages_202601" in tables and "messages_202602" in tables
+        ids = [r[0] for r in store.reader().execute("SELECT id FROM messages_202601 ORDER BY id")]
+        assert ids == [a, c]
+        assert len({a, b, c}) == 3 and a < b < c
+
+    def test_view_orders_across_partitions(self, store):
+        self._insert(store, "2026-01-15", content="jan")
+        self._insert(store, "2026-03-15", content="mar")
+        self._insert(store, "2026-02-15", content="feb")
+
+        rows = store.reader().execute(
+            "SELECT content FROM messages ORDER BY timestamp DESC").fetchall()
+
+        assert [r[0] for r in rows] == ["mar", "feb", "jan"]
+
+    def test_partner_derived(self, store):
+        self._insert(store, "2026-01-15", from_id='local', to_id='!bbbb0002')
+        self._insert(store, "2026-01-15", from_id='!cccc0003', to_id='local')
+        self._insert(store, "2026-01-15", from_id='!dddd0004', to_id=None)
+
+        partners = [r[0] for r in store.reader().execute(
+            "SELECT partner FROM messages ORDER BY id")]
+
+        assert partners == ['!bbbb0002', '!cccc0003', None]
+
+    def test_summaries_match_full_scan(self, store):
+        for i in range(60):
+            self._insert(store, f"2026-0{1 + i % 3}-{10 + i % 15:02d}",
+                         network='rns' if i % 4 == 0 else 'meshtastic',
+                         from_id='local' if i % 3 == 0 else f'!{i % 5:08x}',
+                         to_id=None if i % 7 == 0 else f'!{i % 5:08x}')
+
+        assert self._summaries(store) == self._scan_summaries(store)
+
+        store.drop_before("2026-02-12 00:00:00")
+        assert self._summaries(store) == self._scan_summaries(store)
+
+    def test_drop_before_drops_whole_partitions(self, store):
+        self._insert(store, "2026-01-15")
+        self._insert(store, "2026-02-05")
+        self._insert(store, "2026-02-25")
+
+        deleted = store.drop_before("2026-02-10 00:00:00")
+
+        assert deleted == 2
+        assert "messages_202601" not in self._tables(store)
+        assert store.reader().execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 1
+
+    def test_drop_everything_keeps_view_usable(self, store):
+        self._insert(store, "2026-01-15")
+
+        assert store.drop_before("2099-01-01 00:00:00") == 1
+        assert store.reader().execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        assert store.insert_message(network='rns', from_id='a', content='after') > 0
+
+    def test_legacy_upgrade_builds_summaries(self, tmp_path):
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute(MIGRATIONS[0][1][0])
+        conn.executemany(
+            "INSERT INTO messages (network, from_id, to_id, content) VALUES (?, ?, ?, ?)",
+            [('meshtastic', '!aaaa0001', 'local', 'a'), ('meshtastic', 'local', '!aaaa0001', 'b'),
+             ('rns', 'x' * 32, None, 'c')])
+        conn.commit()
+        conn.close()
+
+        store = MessageStore(path)
+        try:
+            assert self._summaries(store) == self._scan_summaries(store)
+            assert self._summaries(store)[0][('!aaaa0001', 'meshtastic')][1] == 2
+            new_id = store.insert_message(network='rns', from_id='a', content='new')
+            assert new_id > 3
+        finally:
+            store.close()
+
+    def test_partition_created_by_other_process(self, tmp_path):
+        path = tmp_path / "shared.db"
+        first = MessageStore(path)
+        second = MessageStore(path)
+        try:
+            self._insert(first, "2026-01-15")
+            self._insert(second, "2026-05-15")
+            self._insert(first, "2026-05-16")
+
+            assert first.reader().execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 3
+        finally:
+            first.close()
+            second.close()
+
+
+class TestSearch:
+    """Tests for the per-partition FTS5 index and MessageStore.search()."""
+
+    def _insert(self, store, day, content, **fields):
+        fields.setdefault('network', 'meshtastic')
+        fields.setdefault('from_id', '!aaaa0001')
+        return store.insert_message(timestamp=f"{day} 12:00:00", content=content, **fields)
+
+    def test_query_terms_quoted(self):
+        assert _fts_query('KD7ABC storm') == '"KD7ABC" AND "storm"'
+        assert _fts_query('"at the bridge" KD7*') == '"at the bridge" AND "KD7"*'
+        assert _fts_query('!a1b2 OR NEAR(x') == '"!a1b2" AND "OR" AND "NEAR(x"'
+
+    def test_query_without_terms_rejected(self):
+        with pytest.raises(ValueError):
+            _fts_query('* " ! -')
+
+    def test_ranked_with_snippet(self, store):
+        self._insert(store, "2026-01-05", "weather check, storm later")
+        best = self._insert(store, "2026-02-05", "storm storm storm warning")
+        self._insert(store, "2026-02-06", "all quiet")
+
+        rows = store.search("storm")
+
+        assert [r['id'] for r in rows][0] == best
+        assert len(rows) == 2
+        assert '[storm]' in rows[0]['snippet']
+
+    def test_callsigns_incidents_and_prefix(self, store):
+        a = self._insert(store, "2026-01-05", "KD7ABC reports incident 2024-0113")
+        b = self._insert(store, "2026-01-06", "KD7XYZ copies")
+
+        assert [r['id'] for r in store.search("2024-0113")] == [a]
+        assert sorted(r['id'] for r in store.search("KD7*")) == [a, b]
+        assert store.search('"incident 2024-0113" KD7ABC')[0]['id'] == a
+
+    def test_filters_and_pagination(self, store):
+        self._insert(store, "2026-01-05", "relay up", network='rns')
+        ids = [self._insert(store, f"2026-03-{d:02d}", "relay up") for d in range(1, 6)]
+
+        assert len(store.search("relay", network='rns')) == 1
+        assert len(store.search("relay", since="2026-02-01")) == 5
+        pages = store.search("relay", limit=2) + store.search("relay", limit=2, offset=2) + \
+            store.search("relay", limit=2, offset=4)
+        assert len({r['id'] for r in pages}) == 6
+        assert set(ids) <= {r['id'] for r in pages}
+
+    def test_index_follows_retention(self, store):
+        self._insert(store, "2026-01-05", "old news")
+        keep = self._insert(store, "2026-02-20", "new news")
+        self._insert(store, "2026-02-01", "boundary news")
+
+        store.drop_before("2026-02-10 00:00:00")
+
+        assert [r['id'] for r in store.search("news")] == [keep]
+        tables = {r[0] for r in store.reader().execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'messages_202601%'")}
+        assert tables == set()
+
+    def test_upgrade_indexes_existing_rows(self, tmp_path):
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute(MIGRATIONS[0][1][0])
+        conn.execute("INSERT INTO messages (network, from_id, content) "
+                     "VALUES ('rns', 'a', 'net control KD7ABC')")
+        conn.commit()
+        conn.close()
+
+        store = MessageStore(path)
+        try:
+            assert [r['content'] for r in store.search("kd7abc")] == ['net control KD7ABC']
+        finally:
+            store.close()
+
+
+class TestMessagingCommands:
+    """Tests for commands/messaging.py on the shared store."""
+
+    def test_store_and_get(self, db_path):
+        stored = messaging.store_incoming("!abcd1234", "hello", snr=5.5, rssi=-90)
+        assert stored.success
+
+        result = messaging.get_messages(limit=10)
+
+        assert result.success
+        assert result.data['count'] == 1
+        msg = result.data['messages'][0]
+        assert msg['id'] == stored.data['message_id']
+        assert msg['content'] == "hello"
+        assert msg['delivered'] is True
+
+    def test_send_message_chunks(self, db_path):
+        result = messaging.send_message("word " * 80, destination="!abcd1234")
+
+        assert result.success
+        assert result.data['chunks'] > 1
+        messages = messaging.get_messages(limit=100).data['messages']
+        assert len(messages) == result.data['chunks']
+        assert result.data['message_id'] == max(m['id'] for m in messages)
+
+    def test_filters_and_conversations(self, db_path):
+        messaging.store_incoming("!aaaa0001", "mesh", network="meshtastic", to_id="local")
+        messaging.store_incoming("b" * 32, "rns", network="rns", to_id="local")
+        messaging.send_message("reply", destination="!aaaa0001")
+
+        assert messaging.get_messages(network="rns").data['count'] == 1
+        assert messaging.get_messages(conversation_with="!aaaa0001").data['count'] == 2
+
+        plan = messaging._get_store().reader().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE (from_id = ? OR to_id = ?)",
+            ("!aaaa0001", "!aaaa0001"))
+        lookups = [row['detail'] for row in plan if row['detail'].startswith(('SCAN', 'SEARCH'))]
+        assert lookups and all(detail.startswith('SEARCH') for detail in lookups)
+
+        partners = {c['partner']: c['message_count']
+                    for c in messaging.get_conversations().data['conversations']}
+        assert partners["!aaaa0001"] == 2
+
+    def test_conversation_includes_broadcasts_and_relays(self, db_path):
+        messaging.store_incoming("!aaaa0001", "dm", to_id="local")
+        messaging.store_incoming("!aaaa0001", "to all", to_id=None)
+        messaging.store_incoming("!bbbb0002", "to a", to_id="!aaaa0001")
+        messaging.store_incoming("!bbbb0002", "unrelated", to_id="local")
+
+        messages = messaging.get_messages(conversation_with="!aaaa0001").data['messages']
+
+        assert sorted(m['content'] for m in messages) == ["dm", "to a", "to all"]
+
+    def test_stats(self, db_path):
+        messaging.store_incoming("!aaaa0001", "one")
+        messaging.send_message("two", destination="!aaaa0001")
+
+        stats = messaging.get_stats().data
+
+        assert stats['total'] == 2
+        assert stats['sent'] == 1
+        assert stats['received'] == 1
+        assert stats['by_network'] == {'meshtastic': 2}
+
+    def test_clear_messages(self, db_path):
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        messaging._get_store().insert_message(
+            network='meshtastic', from_id='!aaaa0001', to_id='local', content='old', timestamp=old)
+        messaging.store_incoming("!aaaa0001", "new", to_id="local")
+
+        result = messaging.clear_messages(older_than_days=30)
+
+        assert result.data['deleted'] == 1
+        assert [m['content'] for m in messaging.get_messages().data['messages']] == ["new"]
+        assert messaging.get_stats().data['total'] == 1
+        assert messaging.get_conversations().data['conversations'][0]['message_count'] == 1
+
+    def test_empty_message_rejected(self, db_path):
+        assert not messaging.send_message("   ").success
+
+    def test_search_messages(self, db_path):
+        messaging.store_incoming("!aaaa0001", "KD7ABC at the bridge", to_id="local")
+        messaging.store_incoming("b" * 32, "all clear", network="rns")
+
+        result = messaging.search_messages("bridge")
+
+        assert result.success
+        assert result.data['count'] == 1
+        assert result.data['messages'][0]['from_id'] == "!aaaa0001"
+        assert '[bridge]' in result.data['messages'][0]['snippet']
+        assert messaging.search_messages("bridge", network="rns").data['count'] == 0
+        since = datetime.now(timezone.utc) + timedelta(days=1)
+        assert messaging.search_messages("bridge", since=since).data['count'] == 0
+
+    def test_search_messages_invalid_query(self, db_path):
+        for query in ("", "***"):
+            result = messaging.search_messages(query)
+            assert not result.success
+            assert result.data['invalid'] is True
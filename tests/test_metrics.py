@@ -0,0 +1,342 @@
+"""
+Tests for the in-process metrics registry and Prometheus rendering.
+
+Run: python3 -m pytest tests/test_metrics.py -v
+"""
+
+import gc
+import json
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path (instrumented modules import utils.metrics)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.metrics import (
+    Histogram,
+    MetricsRegistry,
+    collect_all,
+    get_metrics,
+    get_registry,
+    load_snapshots,
+    make_buckets,
+    render_prometheus,
+)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestBuckets:
+    """Tests for log-linear bucket layout."""
+
+    def test_sorted_and_covering(self):
+        buckets = make_buckets(0.001, 10.0, 2)
+        assert buckets == sorted(buckets)
+        assert buckets[0] > 0.001
+        assert buckets[-1] >= 10.0
+
+    def test_relative_error_bounded(self):
+        buckets = make_buckets(0.001, 10.0, 4)
+        for lower, upper in zip(buckets, buckets[1:]):
+            assert upper / lower <= 1.26
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_observe_counts(self):
+        h = Histogram()
+        for v in (0.001, 0.002, 0.003):
+            h.observe(v)
+        assert h.count == 3
+        assert h.sum == pytest.approx(0.006)
+
+    def test_percentiles(self):
+        h = Histogram()
+        for i in range(1, 1001):
+            h.observe(i / 1000.0)  # 1 ms .. 1 s
+
+        # Bucket upper bounds: within one bucket (<= 2x) of the truth
+        assert 0.5 <= h.percentile(50) <= 0.75
+        assert 0.99 <= h.percentile(99) <= 1.0
+        assert h.percentile(100) == pytest.approx(1.0)
+
+    def test_percentile_empty(self):
+        assert Histogram().percentile(99) == 0.0
+
+    def test_overflow_bucket(self):
+        h = Histogram(buckets=[0.1, 1.0])
+        h.observe(50.0)
+        assert h.percentile(99) == 50.0
+
+    def test_samples_cumulative(self):
+        h = Histogram(buckets=[0.1, 1.0])
+        h.observe(0.05)
+        h.observe(0.5)
+        h.observe(5.0)
+
+        samples = h.samples()
+
+        assert samples[0] == ('_bucket', 1, ('le', '0.1'))
+        assert samples[1] == ('_bucket', 2, ('le', '1'))
+        assert samples[2] == ('_bucket', 3, ('le', '+Inf'))
+        assert samples[-1] == ('_count', 3)
+
+
+class TestRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_counter_same_labels_same_metric(self, registry):
+        a = registry.counter('x', 'help', direction='in')
+        b = registry.counter('x', 'help', direction='in')
+        c = registry.counter('x', 'help', direction='out')
+        a.inc()
+        b.inc(2)
+
+        assert a is b
+        assert a.value == 3
+        assert c.value == 0
+
+    def test_counter_total_suffix(self, registry):
+        registry.counter('meshforge_things').inc()
+        assert registry.collect()[0]['name'] == 'meshforge_things_total'
+
+    def test_type_conflict(self, registry):
+        registry.gauge('x')
+        with pytest.raises(ValueError):
+            registry.histogram('x')
+
+    def test_gauge(self, registry):
+        g = registry.gauge('depth')
+        g.set(5)
+        g.inc()
+        g.dec(2)
+        assert g.value == 4
+
+    def test_gauge_fn(self, registry):
+        items = [1, 2, 3]
+        registry.gauge_fn('items', lambda: len(items))
+        items.append(4)
+
+        assert registry.collect()[0]['samples'] == [['', {}, 4]]
+
+    def test_function_metric_weak_owner(self, registry):
+        class Owner:
+            value = 7
+
+        owner = Owner()
+        registry.counter_fn('owned', lambda o: o.value, owner=owner)
+        assert registry.collect()[0]['samples'][0][2] == 7
+
+        del owner
+        gc.collect()
+        assert registry.collect()[0]['samples'] == []
+
+    def test_function_metric_owners_summed(self, registry):
+        class Owner:
+            def __init__(self, value):
+                self.value = value
+
+        first, second = Owner(2), Owner(5)
+        registry.gauge_fn('depth', lambda o: o.value, owner=first)
+        registry.gauge_fn('depth', lambda o: o.value, owner=second)
+        registry.gauge_fn('depth', lambda o: o.value * 10, owner=first)   # re-register
+        assert registry.collect()[0]['samples'][0][2] == 25
+
+        registry.unregister_owner(first)
+        assert registry.collect()[0]['samples'][0][2] == 5
+
+        registry.unregister_owner(second)
+        assert registry.collect()[0]['samples'] == []
+
+    def test_function_metric_error_skipped(self, registry):
+        registry.gauge_fn('broken', lambda: 1 / 0)
+        assert registry.collect()[0]['samples'] == []
+
+    def test_timer(self, registry):
+        with registry.timer('op_seconds'):
+            time.sleep(0.01)
+        h = registry.histogram('op_seconds')
+        assert h.count == 1
+        assert h.sum >= 0.01
+
+    def test_unregister(self, registry):
+        registry.counter('c', a='1')
+        registry.counter('c', a='2')
+        registry.unregister('c', a='1')
+        assert len(registry.collect()[0]['samples']) == 1
+        registry.unregister('c')
+        assert registry.collect() == []
+
+
+class TestPrometheusRendering:
+    """Tests for render_prometheus()."""
+
+    def test_counter_and_gauge(self, registry):
+        registry.counter('meshforge_msgs', 'Messages', direction='mesh_to_rns').inc(3)
+        registry.gauge('meshforge_depth', 'Depth').set(2)
+
+        text = render_prometheus(registry.collect())
+
+        assert '# HELP meshforge_msgs_total Messages' in text
+        assert '# TYPE meshforge_msgs_total counter' in text
+        assert 'meshforge_msgs_total{direction="mesh_to_rns"} 3' in text
+        assert '# TYPE meshforge_depth gauge' in text
+        assert 'meshforge_depth 2' in text
+        assert text.endswith('\n')
+
+    def test_histogram(self, registry):
+        registry.histogram('lat_seconds', buckets=[0.1, 1.0], stage='x').observe(0.5)
+
+        text = render_prometheus(registry.collect())
+
+        assert '# TYPE lat_seconds histogram' in text
+        assert 'lat_seconds_bucket{le="0.1",stage="x"} 0' in text
+        assert 'lat_seconds_bucket{le="+Inf",stage="x"} 1' in text
+        assert 'lat_seconds_sum{stage="x"} 0.5' in text
+        assert 'lat_seconds_count{stage="x"} 1' in text
+
+    def test_label_escaping(self, registry):
+        registry.counter('c', node='a"b\\c').inc()
+        assert 'c_total{node="a\\"b\\\\c"} 1' in render_prometheus(registry.collect())
+
+    def test_same_family_merged(self, registry):
+        registry.counter('c').inc()
+        families = registry.collect() + [{
+            'name': 'c_total', 'type': 'counter', 'help': '',
+            'samples': [['', {'process': 'gateway'}, 5]],
+        }]
+
+        text = render_prometheus(families)
+
+        assert text.count('# TYPE c_total counter') == 1
+        assert 'c_total{process="gateway"} 5' in text
+
+
+class TestSnapshots:
+    """Tests for cross-process snapshot export/merge."""
+
+    def test_write_and_load(self, registry, tmp_path):
+        registry.counter('meshforge_bridge_messages', direction='mesh_to_rns').inc(4)
+        assert registry.write_snapshot('gateway', tmp_path)
+
+        families = load_snapshots(tmp_path)
+
+        assert families[0]['name'] == 'meshforge_bridge_messages_total'
+        assert families[0]['samples'][0][1] == {'direction': 'mesh_to_rns', 'process': 'gateway'}
+        assert families[0]['samples'][0][2] == 4
+
+    def test_stale_and_excluded_ignored(self, registry, tmp_path):
+        registry.counter('x').inc()
+        registry.write_snapshot('gateway', tmp_path)
+        registry.write_snapshot('web_monitor', tmp_path)
+
+        assert load_snapshots(tmp_path, exclude='gateway')[0]['samples'][0][1]['process'] == 'web_monitor'
+
+        data = json.loads((tmp_path / 'gateway.json').read_text())
+        data['time'] -= 3600
+        (tmp_path / 'gateway.json').write_text(json.dumps(data))
+        assert all(f['samples'][0][1]['process'] != 'gateway'
+                   for f in load_snapshots(tmp_path))
+
+    def test_corrupt_snapshot_skipped(self, tmp_path):
+        (tmp_path / 'bad.json').write_text('{not json')
+        assert load_snapshots(tmp_path) == []
+
+    def test_exporter_writes(self, registry, tmp_path):
+        registry.counter('x').inc()
+        registry.start_exporter('gateway', interval=0.05, directory=tmp_path)
+        registry.stop_exporter()
+        assert (tmp_path / 'gateway.json').exists()
+
+    def test_get_metrics(self, monkeypatch):
+        assert get_metrics() is get_registry()
+        monkeypatch.setattr('utils.metrics.METRICS_ENABLED', False)
+        assert get_metrics() is None
+
+    def test_collect_all_labels_local(self, tmp_path):
+        get_registry().counter('meshforge_test_collect_all').inc()
+        try:
+            families = collect_all('web_monitor', tmp_path)
+            family = [f for f in families if f['name'] == 'meshforge_test_collect_all_total'][0]
+            assert family['samples'][0][1] == {'process': 'web_monitor'}
+        finally:
+            get_registry().unregister('meshforge_test_collect_all')
+
+
+class TestComponentInstrumentation:
+    """Gateway components record into the global registry."""
+
+    def _family(self, name):
+        for family in get_registry().collect():
+            if family['name'] == name:
+                return family
+        return None
+
+    def test_bridge_latency_and_counters(self):
+        from gateway.replay import make_bench_bridge, replay_bridge, synthetic_mesh_stream
+
+        bridge = make_bench_bridge()
+        replay_bridge(synthetic_mesh_stream(50, text_ratio=1.0), bridge=bridge)
+
+        latency = get_registry().histogram('meshforge_bridge_latency_seconds', direction='mesh_to_rns')
+        assert latency.count >= bridge.stats['messages_mesh_to_rns'] > 0
+        assert self._family('meshforge_bridge_messages_total') is not None
+        assert self._family('meshforge_bridge_queue_depth') is not None
+        assert self._family('meshforge_classifier_seconds') is not None
+
+    def test_transport_reassembly_histogram(self):
+        from gateway.replay import replay_transport, synthetic_rns_packets
+
+        before = get_registry().histogram('meshforge_transport_reassembly_seconds').count
+        replay_transport(synthetic_rns_packets(20))
+
+        assert get_registry().histogram('meshforge_transport_reassembly_seconds').count == before + 20
+        assert self._family('meshforge_transport_fragments_sent_total') is not None
+
+    def test_transport_record_latency(self):
+        from gateway.rns_transport import TransportStats
+
+        h = get_registry().histogram('meshforge_transport_latency_seconds')
+        before = h.count
+        TransportStats().record_latency(250.0)
+        assert h.count == before + 1
+
+    def test_tracker_gauges(self):
+        from unittest.mock import patch
+        from gateway.node_tracker import UnifiedNodeTracker, UnifiedNode
+
+        def tracked():
+            # Summed over every live tracker in the process
+            family = self._family('meshforge_tracker_nodes')
+            return sum(value for _, labels, value in family['samples']
+                       if labels == {'network': 'meshtastic'})
+
+        with patch.object(UnifiedNodeTracker, '_load_cache'):
+            tracker = UnifiedNodeTracker()
+        before = tracked()
+        tracker.add_node(UnifiedNode(id="mesh_!00000001", network="meshtastic"))
+        assert tracked() == before + 1
+
+        get_registry().unregister_owner(tracker)
+        assert tracked() == before
+
+    def test_connection_manager_busy(self):
+        from utils import connection_manager
+
+        connection_manager.reset()
+        busy = get_registry().counter('meshforge_connection_busy')
+        before = busy.value
+        connection_manager.get_connection(blocking=False, caller="holder")
+        try:
+            with pytest.raises(connection_manager.ConnectionBusy):
+                connection_manager.get_connection(blocking=False, caller="other")
+        finally:
+            connection_manager.release_connection()
+
+        assert busy.value == before + 1
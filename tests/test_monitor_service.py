@@ -0,0 +1,278 @@
+"""
+Tests for the shared, reference-counted NodeMonitor service.
+
+Run: python3 -m pytest tests/test_monitor_service.py -v
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from monitoring.monitor_service import NodeMonitorService, get_node_list
+from monitoring.node_monitor import ConnectionState, NodeInfo
+import monitoring.monitor_service as monitor_service
+
+
+class FakeMonitor:
+    """Stands in for NodeMonitor: same attributes, no socket."""
+
+    def __init__(self, host, port, succeed=True):
+        self.host = host
+        self.port = port
+        self.succeed = succeed
+        self.state = ConnectionState.DISCONNECTED
+        self.connect_calls = 0
+        self.disconnect_calls = 0
+        self.on_node_added = None
+        self.on_node_update = None
+        self.on_message = None
+        self.on_connection_change = None
+        self._nodes = {"!a": NodeInfo(node_id="!a", node_num=0xa, long_name="Alpha", short_name="A")}
+
+    @property
+    def is_connected(self):
+        return self.state == ConnectionState.CONNECTED
+
+    def connect(self, timeout=15.0):
+        self.connect_calls += 1
+        if self.succeed:
+            self.state = ConnectionState.CONNECTED
+        return self.succeed
+
+    def disconnect(self):
+        self.disconnect_calls += 1
+        self.state = ConnectionState.DISCONNECTED
+
+    def get_nodes(self):
+        return list(self._nodes.values())
+
+    def get_node_count(self):
+        return len(self._nodes)
+
+
+def _service(succeed=True, **kwargs):
+    created = []
+
+    def factory(host, port):
+        monitor = FakeMonitor(host, port, succeed=succeed)
+        created.append(monitor)
+        return monitor
+
+    kwargs.setdefault('linger', 0.05)
+    kwargs.setdefault('settle_timeout', 0)
+    service = NodeMonitorService(monitor_factory=factory, **kwargs)
+    return service, created
+
+
+def _until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestLeases:
+    """One connection while any lease is held, closed after the linger."""
+
+    def test_refcount(self):
+        service, _ = _service()
+        assert service.acquire("map") == 1
+        assert service.acquire("web") == 2
+        assert service.acquire("map") == 3
+        assert service.owners() == ["map", "web"]
+
+        assert service.release("map") == 2
+        assert service.release("map") == 1
+        assert service.owners() == ["web"]
+
+    def test_disconnect_after_linger(self):
+        service, created = _service()
+        service.acquire("map")
+        monitor, error = service.get_monitor()
+        assert error is None
+
+        service.release("map")
+        assert monitor.is_connected
+        assert _until(lambda: not monitor.is_connected)
+        assert service.get_stats()['disconnects'] == 1
+
+    def test_zero_linger_disconnects_now(self):
+        service, _ = _service(linger=60)
+        service.acquire("map")
+        monitor, _ = service.get_monitor()
+
+        service.release("map", linger=0)
+
+        assert not monitor.is_connected
+
+    def test_acquire_cancels_pending_disconnect(self):
+        service, _ = _service(linger=0.2)
+        service.acquire("map")
+        monitor, _ = service.get_monitor()
+        service.release("map")
+
+        service.acquire("web")
+        time.sleep(0.4)
+
+        assert monitor.is_connected
+
+    def test_lease_context(self):
+        service, _ = _service(linger=60)
+        with service.lease("cli", linger=0):
+            monitor, _ = service.get_monitor()
+            assert service.owners() == ["cli"]
+
+        assert service.ref_count == 0
+        assert not monitor.is_connected
+
+    def test_unleased_connection_still_closes(self):
+        service, _ = _service()
+        monitor, _ = service.get_monitor()
+
+        assert _until(lambda: not monitor.is_connected)
+
+
+class TestConnection:
+    """The monitor and its node table are reused."""
+
+    def test_reuse_without_reconnect(self):
+        service, created = _service()
+        service.acquire("map")
+        first, _ = service.get_monitor()
+        second, _ = service.get_monitor()
+
+        assert first is second
+        assert first.connect_calls == 1
+        assert service.get_stats()['reuses'] == 1
+
+    def test_node_table_survives_reconnect(self):
+        service, created = _service()
+        service.acquire("map")
+        monitor, _ = service.get_monitor()
+        service.release("map", linger=0)
+
+        assert [n.node_id for n in service.get_nodes()] == ["!a"]
+        service.acquire("map")
+        again, _ = service.get_monitor()
+
+        assert again is monitor
+        assert len(created) == 1
+        assert monitor.connect_calls == 2
+
+    def test_reconnecting_is_not_retried(self):
+        service, created = _service()
+        service.acquire("map")
+        monitor, _ = service.get_monitor()
+        monitor.state = ConnectionState.RECONNECTING
+
+        result, error = service.get_monitor()
+
+        assert result is None
+        assert "Reconnecting" in error
+        assert monitor.connect_calls == 1
+
+    def test_failed_connect_backs_off(self):
+        service, created = _service(succeed=False, connect_backoff=60)
+        service.acquire("map")
+
+        first = service.get_monitor()
+        second = service.get_monitor()
+
+        assert first[0] is None and second[0] is None
+        assert second[1] == first[1]
+        assert created[0].connect_calls == 1
+
+    def test_shutdown_ignores_leases(self):
+        service, created = _service(linger=60)
+        service.acquire("map")
+        service.acquire("web")
+        monitor, _ = service.get_monitor()
+
+        service.shutdown()
+
+        assert not monitor.is_connected
+        assert service.ref_count == 0
+        assert service.get_nodes() == []
+
+
+class TestEvents:
+    """Monitor callbacks fan out to every subscriber."""
+
+    def test_fan_out_and_filter(self):
+        service, _ = _service()
+        everything, updates = [], []
+        service.subscribe(lambda event, data: everything.append(event))
+        service.subscribe(lambda event, data: updates.append(data), events={'node_updated'})
+        monitor, _ = service.get_monitor()
+
+        node = monitor.get_nodes()[0]
+        monitor.on_node_added(node)
+        monitor.on_node_update(node)
+        monitor.on_message({'decoded': {}})
+
+        assert everything == ['node_added', 'node_updated', 'packet']
+        assert updates == [node]
+
+    def test_failing_subscriber_isolated(self):
+        service, _ = _service()
+        seen = []
+
+        def broken(event, data):
+            raise RuntimeError("boom")
+
+        service.subscribe(broken)
+        service.subscribe(lambda event, data: seen.append(event))
+        monitor, _ = service.get_monitor()
+
+        monitor.on_connection_change(ConnectionState.CONNECTED)
+
+        assert seen == ['connection']
+
+    def test_unsubscribe(self):
+        service, _ = _service()
+        seen = []
+        token = service.subscribe(lambda event, data: seen.append(event))
+        monitor, _ = service.get_monitor()
+
+        service.unsubscribe(token)
+        monitor.on_node_added(monitor.get_nodes()[0])
+
+        assert seen == []
+        assert service.get_stats()['subscribers'] == 0
+
+
+class TestNodeList:
+    """get_node_list() returns connection_manager-shaped dicts."""
+
+    def test_node_list(self, monkeypatch):
+        service, _ = _service(linger=60)
+        monkeypatch.setitem(monitor_service._services, ("fake", 1), service)
+
+        nodes = get_node_list("tui", host="fake", port=1)
+        get_node_list("tui", host="fake", port=1)
+
+        assert nodes == [{'id': '!a', 'name': 'Alpha', 'short': 'A'}]
+        stats = service.get_stats()
+        assert stats['leases'] == {}                # not held between calls
+        assert stats['connects'] == 1 and stats['reuses'] == 1
+        assert service.is_connected                 # lingering for the next refresh
+        service.shutdown()
+
+    def test_node_list_releases_slot(self, monkeypatch):
+        service, created = _service(linger=60)
+        monkeypatch.setitem(monitor_service._services, ("fake", 1), service)
+
+        get_node_list("cli", host="fake", port=1, linger=0)
+
+        assert not created[0].is_connected
+        assert service.ref_count == 0
+
+    def test_node_list_unavailable(self, monkeypatch):
+        service, _ = _service(succeed=False)
+        monkeypatch.setitem(monitor_service._services, ("fake", 1), service)
+
+        assert get_node_list("tui", host="fake", port=1) is None
@@ -0,0 +1,318 @@
+"""
+Tests for MQTT node ingest (MQTT JSON feed -> UnifiedNodeTracker).
+
+Run: python3 -m pytest tests/test_mqtt_ingest.py -v
+"""
+
+import json
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.gateway.node_tracker import UnifiedNodeTracker
+from src.gateway.mqtt_ingest import (
+    IngestStats,
+    MQTTNodeIngest,
+    parse_json_message,
+    DEFAULT_JSON_TOPICS,
+    DEFAULT_PROTOBUF_TOPICS,
+)
+
+# The plugin imports its siblings by their src-relative names
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def make_tracker():
+    with patch.object(UnifiedNodeTracker, '_load_cache'):
+        return UnifiedNodeTracker()
+
+
+def json_msg(node_num, packet_id, msg_type="position", payload=None, **extra):
+    data = {
+        "from": node_num,
+        "id": packet_id,
+        "type": msg_type,
+        "payload": payload or {},
+        "sender": "!deadbeef",
+        "to": 0xFFFFFFFF,
+    }
+    data.update(extra)
+    return json.dumps(data).encode()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestParseJsonMessage:
+    """Tests for parse_json_message()."""
+
+    def test_position(self):
+        key, node = parse_json_message({
+            "from": 0x12345678, "id": 42, "type": "position",
+            "payload": {"latitude_i": 213069000, "longitude_i": -1578583000, "altitude": 12},
+            "snr": 5.5, "rssi": -90, "hops_away": 2,
+        })
+
+        assert key == (0x12345678, 42)
+        assert node.id == "mesh_!12345678"
+        assert node.meshtastic_id == "!12345678"
+        assert node.position.latitude == pytest.approx(21.3069)
+        assert node.position.longitude == pytest.approx(-157.8583)
+        assert node.position.altitude == 12
+        assert node.snr == 5.5
+        assert node.rssi == -90
+        assert node.hops == 2
+
+    def test_nodeinfo(self):
+        _, node = parse_json_message({
+            "from": 1, "id": 7, "type": "nodeinfo",
+            "payload": {"longname": "Hilo Gateway", "shortname": "HILO", "hardware": 43},
+        })
+
+        assert node.name == "Hilo Gateway"
+        assert node.short_name == "HILO"
+        assert node.hardware_model == "43"
+
+    def test_telemetry(self):
+        _, node = parse_json_message({
+            "from": 1, "id": 8, "type": "telemetry",
+            "payload": {"battery_level": 88, "voltage": 4.01, "uptime_seconds": 100},
+        })
+
+        assert node.telemetry.battery_level == 88
+        assert node.telemetry.voltage == 4.01
+        assert node.telemetry.timestamp is not None
+
+    def test_empty_telemetry_has_no_timestamp(self):
+        _, node = parse_json_message({"from": 1, "id": 9, "type": "telemetry", "payload": {}})
+        assert node.telemetry.timestamp is None
+
+    def test_text_message_still_marks_seen(self):
+        _, node = parse_json_message({"from": 1, "id": 10, "type": "text", "payload": {"text": "hi"}})
+        assert node.is_online is True
+        assert node.name == "!00000001"
+
+    def test_missing_from_ignored(self):
+        assert parse_json_message({"id": 1, "type": "text"}) is None
+        assert parse_json_message({"from": "abc", "id": 1}) is None
+        assert parse_json_message({"from": 0xFFFFFFFF, "id": 1}) is None
+
+    def test_no_packet_id_no_key(self):
+        key, _ = parse_json_message({"from": 5, "type": "text"})
+        assert key is None
+
+
+class TestTrackerAddNodes:
+    """Tests for UnifiedNodeTracker.add_nodes() batch upsert."""
+
+    def test_add_nodes_counts_new(self):
+        tracker = make_tracker()
+        _, a = parse_json_message({"from": 1, "id": 1})
+        _, b = parse_json_message({"from": 2, "id": 2})
+        _, a2 = parse_json_message({"from": 1, "id": 3})
+
+        assert tracker.add_nodes([a, b, a2]) == 2
+        assert len(tracker.get_all_nodes()) == 2
+
+    def test_add_nodes_notifies_each(self):
+        tracker = make_tracker()
+        callback = MagicMock()
+        tracker.register_callback(callback)
+        _, a = parse_json_message({"from": 1, "id": 1})
+        _, b = parse_json_message({"from": 2, "id": 2})
+
+        tracker.add_nodes([a, b])
+
+        assert callback.call_count == 2
+
+
+class TestMQTTNodeIngest:
+    """Tests for the ingest pipeline."""
+
+    def test_topics(self):
+        ingest = MQTTNodeIngest(make_tracker())
+        assert ingest.topics == list(DEFAULT_JSON_TOPICS)
+
+        ingest = MQTTNodeIngest(make_tracker(), include_protobuf=True)
+        assert ingest.topics == list(DEFAULT_JSON_TOPICS) + list(DEFAULT_PROTOBUF_TOPICS)
+
+    def test_submit_filters_topics(self):
+        ingest = MQTTNodeIngest(make_tracker())
+
+        assert ingest.submit("msh/US/2/json/LongFast/!deadbeef", b"{}") is True
+        assert ingest.submit("msh/US/2/e/LongFast/!deadbeef", b"\x00") is False
+        assert ingest.submit("msh/US/2/stat/!deadbeef", b"online") is False
+        assert ingest.stats.messages_received == 1
+
+    def test_queue_full_drops(self):
+        ingest = MQTTNodeIngest(make_tracker(), queue_size=2)
+
+        for i in range(5):
+            ingest.submit("msh/US/2/json/LongFast/!a", b"{}")
+
+        assert ingest.stats.dropped == 3
+
+    def test_ingest_upserts_and_dedups(self):
+        tracker = make_tracker()
+        ingest = MQTTNodeIngest(tracker, workers=2, batch_size=16)
+        ingest.start()
+        try:
+            topic = "msh/US/2/json/LongFast/!deadbeef"
+            for node_num in range(1, 51):
+                payload = json_msg(node_num, 1000 + node_num,
+                                   payload={"latitude_i": 200000000, "longitude_i": -1550000000})
+                ingest.submit(topic, payload)
+                # Same packet heard by a second gateway
+                ingest.submit(topic, payload)
+
+            assert wait_for(lambda: ingest.stats.messages_processed == 100)
+        finally:
+            ingest.stop()
+
+        stats = ingest.get_stats()
+        assert stats['duplicates'] == 50
+        assert stats['nodes_upserted'] == 50
+        assert stats['nodes_added'] == 50
+        assert len(tracker.get_nodes_with_position()) == 50
+
+    def test_parse_errors_counted(self):
+        tracker = make_tracker()
+        ingest = MQTTNodeIngest(tracker, workers=1)
+        ingest.start()
+        try:
+            ingest.submit("msh/US/2/json/LongFast/!a", b"not json")
+            ingest.submit("msh/US/2/json/LongFast/!a", b'{"type": "text"}')
+            assert wait_for(lambda: ingest.stats.messages_processed == 2)
+        finally:
+            ingest.stop()
+
+        assert ingest.stats.parse_errors == 1
+        assert ingest.stats.ignored == 1
+        assert tracker.get_all_nodes() == []
+
+    def test_dedup_window_bounded(self):
+        ingest = MQTTNodeIngest(make_tracker(), dedup_size=10)
+        batch = [("json", json_msg(n, n)) for n in range(1, 31)]
+
+        ingest._process_batch(batch)
+
+        assert len(ingest._seen) == 10
+
+    def test_rate_samples_bounded_without_polling(self):
+        ingest = MQTTNodeIngest(make_tracker())
+        ingest._rate_samples.extend((time.monotonic() - 60, n) for n in range(100))
+
+        ingest._process_batch([("json", json_msg(1, 1))])
+
+        assert len(ingest._rate_samples) == 1
+
+    def test_stop_drains_queue(self):
+        tracker = make_tracker()
+        ingest = MQTTNodeIngest(tracker, workers=1)
+        for n in range(1, 21):
+            ingest.submit("msh/US/2/json/LongFast/!a", json_msg(n, n))
+        ingest.start()
+        ingest.stop()
+
+        assert ingest.stats.messages_processed == 20
+
+    def test_get_stats_keys(self):
+        stats = MQTTNodeIngest(make_tracker()).get_stats()
+
+        for key in ('messages_per_second', 'avg_messages_per_second',
+                    'queue_depth', 'duplicates', 'dropped', 'topics'):
+            assert key in stats
+
+    def test_attach_to_plugin(self):
+        ingest = MQTTNodeIngest(make_tracker())
+        plugin = MagicMock()
+
+        ingest.attach(plugin)
+
+        assert plugin.subscribe.call_count == len(DEFAULT_JSON_TOPICS)
+        plugin.register_raw_callback.assert_called_once_with(ingest.submit)
+
+    def test_throughput(self):
+        """Batched ingest keeps well ahead of a busy regional feed."""
+        tracker = make_tracker()
+        ingest = MQTTNodeIngest(tracker)
+        topic = "msh/US/2/json/LongFast/!deadbeef"
+        payloads = [json_msg(1 + (i % 500), i + 1, payload={"battery_level": 90})
+                    for i in range(5000)]
+
+        ingest.start()
+        start = time.perf_counter()
+        try:
+            for payload in payloads:
+                ingest.submit(topic, payload)
+            assert wait_for(lambda: ingest.stats.messages_processed == 5000, timeout=30)
+        finally:
+            ingest.stop()
+        rate = 5000 / (time.perf_counter() - start)
+
+        assert len(tracker.get_all_nodes()) == 500
+        assert rate > 1000
+
+
+class TestPluginActivation:
+    """Tests for starting ingest from the MQTT bridge plugin."""
+
+    def make_plugin(self, **config):
+        from plugins.mqtt_bridge import MQTTBridgePlugin
+        with patch.object(MQTTBridgePlugin, '_load_config', return_value=config):
+            return MQTTBridgePlugin()
+
+    def test_activate_starts_ingest(self):
+        tracker = make_tracker()
+        plugin = self.make_plugin(node_ingest=True)
+        plugin.set_node_tracker(tracker)
+
+        plugin.activate()
+        try:
+            assert plugin._ingest is not None
+            assert plugin._ingest.tracker is tracker
+            assert set(DEFAULT_JSON_TOPICS) <= set(plugin._extra_topics)
+        finally:
+            plugin.deactivate()
+        assert plugin._ingest is None
+
+    def test_tracker_set_after_activate(self):
+        plugin = self.make_plugin(node_ingest=True)
+        plugin.activate()
+        try:
+            assert plugin.get_ingest_stats() is None
+            plugin.set_node_tracker(make_tracker())
+            assert plugin.get_ingest_stats() is not None
+        finally:
+            plugin.deactivate()
+
+    def test_disabled_by_default(self):
+        plugin = self.make_plugin()
+        plugin.set_node_tracker(make_tracker())
+
+        plugin.activate()
+        try:
+            assert plugin.get_ingest_stats() is None
+        finally:
+            plugin.deactivate()
+
+
+class TestIngestStats:
+    """Tests for IngestStats."""
+
+    def test_duplicate_rate(self):
+        stats = IngestStats(messages_processed=10, duplicates=4)
+        assert stats.duplicate_rate == 0.4
+
+    def test_to_dict_no_activity(self):
+        data = IngestStats().to_dict()
+        assert data['avg_messages_per_second'] == 0.0
+        assert data['last_activity'] is None
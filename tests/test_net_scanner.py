@@ -0,0 +1,197 @@
+"""
+Tests for the shared asyncio network scanner.
+
+Services are stood in by asyncio servers on loopback addresses, so the
+scans run against 127.0.0.0/8 without touching the real network.
+
+Run: python3 -m pytest tests/test_net_scanner.py -v
+"""
+
+import asyncio
+import ipaddress
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import net_scanner
+from utils.net_scanner import (
+    PROBES, NetworkScanner, Probe, RttEstimator, iter_hosts, parse_targets, resolve_probes,
+    scan_sync,
+)
+
+PORT = 24403
+
+
+async def _serve(host, port, reply=None):
+    async def handle(reader, writer):
+        if reply is not None:
+            await reader.read(256)
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _scan(scanner, targets, probes):
+    return [r async for r in scanner.scan(targets, probes)]
+
+
+class TestTargets:
+
+    def test_parse_and_dedupe(self):
+        networks = parse_targets(['10.0.0.0/30', '10.0.0.1', ipaddress.ip_network('10.0.0.2/31')])
+        assert [str(n) for n in networks] == ['10.0.0.0/30', '10.0.0.1/32', '10.0.0.2/31']
+        assert list(iter_hosts(networks)) == [(0, '10.0.0.1'), (0, '10.0.0.2'),
+                                              (2, '10.0.0.3')]
+
+    def test_resolve_probes(self):
+        assert resolve_probes(None) == list(PROBES.values())
+        custom = Probe('x', 1, 'X')
+        assert resolve_probes(['mqtt', custom]) == [PROBES['mqtt'], custom]
+        with pytest.raises(ValueError):
+            resolve_probes(['telnet'])
+
+    def test_mqtt_connect_packet(self):
+        packet = PROBES['mqtt'].payload
+        assert packet[0] == 0x10
+        assert packet[1] == len(packet) - 2
+        assert packet[2:8] == b'\x00\x04MQTT'
+
+
+class TestRttEstimator:
+
+    def test_initial_until_sampled(self):
+        estimator = RttEstimator(initial=0.5, minimum=0.01, maximum=3.0)
+        assert estimator.timeout == 0.5
+        estimator.sample(0.02)
+        assert estimator.timeout == pytest.approx(0.02 + 4 * 0.01)
+
+    def test_adapts_and_clamps(self):
+        estimator = RttEstimator(initial=0.5, minimum=0.1, maximum=2.0)
+        for _ in range(50):
+            estimator.sample(0.001)
+        assert estimator.timeout == 0.1
+        for _ in range(50):
+            estimator.sample(1.5)
+        assert 1.5 < estimator.timeout < 2.0
+        estimator.sample(5.0)
+        assert estimator.timeout == 2.0
+
+
+class TestScan:
+
+    def test_finds_services_across_subnets(self):
+        async def run():
+            servers = [await _serve('127.0.1.5', PORT),
+                       await _serve('127.0.2.9', PORT + 1, reply=b'\x20\x02\x00\x00'),
+                       await _serve('127.0.2.10', PORT + 1, reply=b'nope')]
+            scanner = NetworkScanner(concurrency=32)
+            probes = [PROBES['meshtastic'].with_port(PORT), PROBES['mqtt'].with_port(PORT + 1)]
+            try:
+                return scanner, await _scan(scanner, ['127.0.1.0/28', '127.0.2.0/28'], probes)
+            finally:
+                for server in servers:
+                    server.close()
+
+        scanner, results = asyncio.run(run())
+        assert sorted((r.address, r.probe) for r in results) == [
+            ('127.0.1.5:24403', 'meshtastic'), ('127.0.2.9:24404', 'mqtt')]
+        assert next(r for r in results if r.probe == 'mqtt').banner == '20020000'
+        assert scanner.stats['probes'] == 2 * 14 * 2
+        assert scanner.stats['open'] == 3            # the wrong handshake isn't a hit
+        assert all(e.samples > 0 for e in scanner.estimators)
+
+    def test_http_banner(self):
+        async def run():
+            server = await _serve('127.0.3.1', PORT, reply=b'HTTP/1.0 200 OK\r\n\r\n{}')
+            try:
+                return await _scan(NetworkScanner(), '127.0.3.1',
+                                   [PROBES['aredn'].with_port(PORT)])
+            finally:
+                server.close()
+
+        [result] = asyncio.run(run())
+        assert result.banner == 'HTTP/1.0 200 OK'
+        assert result.to_dict()['label'] == 'AREDN node'
+
+    def test_concurrency_bounded(self, monkeypatch):
+        in_flight = []
+        peak = []
+
+        async def probe(self, host, probe, estimator):
+            in_flight.append(host)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.001)
+            in_flight.remove(host)
+
+        monkeypatch.setattr(NetworkScanner, '_probe', probe)
+        asyncio.run(_scan(NetworkScanner(concurrency=8), '10.9.0.0/24', ['meshtastic']))
+        assert len(peak) == 254
+        assert max(peak) == 8
+
+    def test_results_stream_before_scan_ends(self, monkeypatch):
+        async def probe(self, host, probe, estimator):
+            await asyncio.sleep(0 if host == '10.9.0.1' else 0.05)
+            return net_scanner.ScanResult(host, probe.port, probe.name, probe.label, 0.0)
+
+        async def run():
+            scanner = NetworkScanner(concurrency=4)
+            async for result in scanner.scan('10.9.0.0/29', ['rns']):
+                return result.host, scanner.stats
+
+        monkeypatch.setattr(NetworkScanner, '_probe', probe)
+        host, stats = asyncio.run(run())
+        assert host == '10.9.0.1'
+        assert stats['found'] == 1
+
+
+class TestSync:
+
+    def test_callback_and_stop(self, monkeypatch):
+        scanner = NetworkScanner(concurrency=1)
+        seen = []
+
+        async def probe(self, host, probe, estimator):
+            return net_scanner.ScanResult(host, probe.port, probe.name, probe.label, 0.0)
+
+        def callback(result):
+            seen.append(result.host)
+            if len(seen) == 3:
+                scanner.stop()
+
+        monkeypatch.setattr(NetworkScanner, '_probe', probe)
+        results = scan_sync('10.9.0.0/24', ['meshtastic'], callback=callback, scanner=scanner)
+        assert len(seen) == len(results) < 10
+
+    def test_aredn_scanner_queries_only_web_servers(self, monkeypatch):
+        from utils import aredn
+
+        queried = []
+
+        def get_node_info(client):
+            queried.append(client.hostname)
+            return aredn.AREDNNode(hostname=client.hostname)
+
+        async def probe(self, host, probe, estimator):
+            if host in ('10.9.0.7', '10.9.0.20'):
+                return net_scanner.ScanResult(host, probe.port, probe.name, probe.label, 0.0)
+
+        monkeypatch.setattr(NetworkScanner, '_probe', probe)
+        monkeypatch.setattr(aredn.AREDNClient, 'get_node_info', get_node_info)
+        found = []
+        nodes = aredn.AREDNScanner().scan_subnet('10.9.0.0/24', callback=found.append)
+
+        assert sorted(queried) == ['10.9.0.20', '10.9.0.7']   # once, though both ports answer
+        assert sorted(n.ip for n in nodes) == ['10.9.0.20', '10.9.0.7']
+        assert len(found) == 2
+
+
+class TestBenchmark:
+
+    def test_small_benchmark(self, capsys):
+        assert net_scanner.main(['--benchmark', '--prefix', '24', '--stand-ins', '5',
+                                 '--port-offset', '21000', '--json']) == 0
+        assert '"missed": 0' in capsys.readouterr().out
@@ -0,0 +1,136 @@
+"""
+Tests for the shared /proc/net socket table parser.
+
+A fake /proc tree holds the socket tables and per-process fd links.
+
+Run: python3 -m pytest tests/test_network_diag.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import network_diag
+from utils.network_diag import hex_to_ip, hex_to_ipv6, read_sockets, socket_owners
+
+HEADER = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+          "retrnsmt   uid  timeout inode\n")
+
+
+def _row(sl, local, remote, state, inode, uid=0):
+    return (f"{sl:4d}: {local} {remote} {state} 00000000:00000000 00:00000000 "
+            f"00000000 {uid:5d}        0 {inode} 1 0000000000000000 100 0 0 10 0\n")
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    network_diag.clear_owner_cache()
+    yield
+    network_diag.clear_owner_cache()
+
+
+@pytest.fixture
+def proc(tmp_path):
+    net = tmp_path / 'net'
+    net.mkdir()
+    (net / 'tcp').write_text(HEADER + ''.join([
+        _row(0, '00000000:1133', '00000000:0000', '0A', 5001),             # *:4403 LISTEN
+        _row(1, '0100007F:24D3', '00000000:0000', '0A', 5002),             # 127.0.0.1:9427
+        _row(2, '0100007F:1133', '0100007F:D431', '01', 5003, uid=1000),   # established
+        _row(3, '0100007F:D432', '0100007F:1133', '06', 0),                # TIME_WAIT
+    ]))
+    (net / 'udp').write_text(HEADER + _row(0, '00000000:7414', '00000000:0000', '07', 6001))
+    (net / 'tcp6').write_text(HEADER + _row(
+        0, '00000000000000000000000001000000:24E3', '00000000000000000000000000000000:0000',
+        '0A', 7001))
+    (net / 'udp6').write_text(HEADER)
+
+    for pid, comm, inodes in ((42, 'meshtasticd', (5001, 5003)), (77, 'rnsd', (6001,)),
+                              (90, 'bash', ())):
+        fd = tmp_path / str(pid) / 'fd'
+        fd.mkdir(parents=True)
+        (tmp_path / str(pid) / 'comm').write_text(comm + '\n')
+        os.symlink('/dev/null', fd / '0')
+        for n, inode in enumerate(inodes, start=3):
+            os.symlink(f'socket:[{inode}]', fd / str(n))
+    (tmp_path / 'self').mkdir()
+    return tmp_path
+
+
+class TestDecoding:
+
+    def test_hex_to_ip(self):
+        assert hex_to_ip('0100007F') == '127.0.0.1'
+        assert hex_to_ip('0101A8C0') == '192.168.1.1'
+        assert hex_to_ip('zz') == '0.0.0.0'
+
+    def test_hex_to_ipv6(self):
+        assert hex_to_ipv6('00000000000000000000000001000000') == \
+            '0000:0000:0000:0000:0000:0000:0000:0001'
+        assert hex_to_ipv6('000080FE00000000FF005002FEB7F5A6') == \
+            'fe80:0000:0000:0000:0250:00ff:a6f5:b7fe'
+        assert hex_to_ipv6('short') == 'short'
+
+    def test_parse_proc_net_keeps_ipv6_format(self, proc, monkeypatch):
+        real = network_diag.read_sockets
+        monkeypatch.setattr(network_diag, 'read_sockets',
+                            lambda protocols: real(protocols, proc_root=str(proc)))
+
+        entry, = network_diag.parse_proc_net('tcp6')
+
+        assert entry['ip'] == '0000:0000:0000:0000:0000:0000:0000:0001'
+        assert entry['remote_ip'] == '0000:0000:0000:0000:0000:0000:0000:0000'
+
+
+class TestReadSockets:
+
+    def test_all_tables_one_pass(self, proc):
+        entries = read_sockets(proc_root=str(proc))
+
+        assert [(e['protocol'], e['ip'], e['port']) for e in entries] == [
+            ('tcp', '0.0.0.0', 4403), ('tcp', '127.0.0.1', 9427), ('tcp', '127.0.0.1', 4403),
+            ('tcp', '127.0.0.1', 54322), ('udp', '0.0.0.0', 29716), ('tcp6', '::1', 9443)]
+        established = entries[2]
+        assert established['state'] == 'ESTABLISHED'
+        assert (established['remote_ip'], established['remote_port']) == ('127.0.0.1', 54321)
+        assert established['uid'] == 1000
+        assert established['inode'] == '5003'
+        assert entries[3]['state'] == 'TIME_WAIT'
+
+    def test_port_and_state_filters(self, proc):
+        listening = read_sockets(('tcp', 'tcp6'), states=('LISTEN',), proc_root=str(proc))
+        assert [e['port'] for e in listening] == [4403, 9427, 9443]
+
+        on_4403 = read_sockets(('tcp',), ports={4403}, proc_root=str(proc))
+        assert [e['state'] for e in on_4403] == ['LISTEN', 'ESTABLISHED']
+        assert read_sockets(('tcp',), ports=(), proc_root=str(proc)) == []
+
+    def test_missing_table(self, tmp_path):
+        assert read_sockets(('tcp',), proc_root=str(tmp_path)) == []
+
+    def test_with_process(self, proc):
+        entries = read_sockets(('tcp', 'udp'), states=('LISTEN', 'CLOSE'),
+                               with_process=True, proc_root=str(proc))
+        owners = {e['port']: (e['pid'], e['process']) for e in entries}
+        assert owners == {4403: (42, 'meshtasticd (PID 42)'), 9427: (None, ''),
+                          29716: (77, 'rnsd (PID 77)')}
+
+
+class TestSocketOwners:
+
+    def test_full_scan_cached(self, proc):
+        owners = socket_owners(str(proc))
+        assert owners == {'5001': (42, 'meshtasticd'), '5003': (42, 'meshtasticd'),
+                          '6001': (77, 'rnsd')}
+
+        os.symlink('socket:[5002]', proc / '90' / 'fd' / '4')
+        assert socket_owners(str(proc)) is owners
+        assert socket_owners(str(proc), max_age=0)['5002'] == (90, 'bash')
+
+    def test_targeted_scan_not_cached(self, proc):
+        assert socket_owners(str(proc), inodes={'6001', '0'})['6001'] == (77, 'rnsd')
+        assert str(proc) not in network_diag._owners_cache
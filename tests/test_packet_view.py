@@ -0,0 +1,232 @@
+"""
+Tests for the decode-once packet view, portnum dispatch and the
+receive handlers built on them.
+
+Run: python3 -m pytest tests/test_packet_view.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.packet_view import PacketDispatcher, PacketView, portnum_name
+from gateway.node_tracker import UnifiedNode, UnifiedNodeTracker
+from monitoring.node_monitor import NodeMonitor
+
+SENDER = 0x1234abcd
+SENDER_ID = f"!{SENDER:08x}"
+
+
+def _packet(portnum, **decoded):
+    packet = {
+        'id': 7,
+        'from': SENDER,
+        'fromId': SENDER_ID,
+        'toId': '^all',
+        'rxSnr': 6.5,
+        'rxRssi': -90,
+        'hopStart': 3,
+        'hopLimit': 1,
+        'decoded': {'portnum': portnum, **decoded},
+    }
+    return packet
+
+
+class TestPacketView:
+    """Fields are normalised and computed once."""
+
+    def test_portnum_names(self):
+        assert portnum_name(256) == 'PRIVATE_APP'
+        assert portnum_name('1') == 'TEXT_MESSAGE_APP'
+        assert portnum_name('POSITION_APP') == 'POSITION_APP'
+        assert portnum_name(9999) == '9999'
+        assert portnum_name(None) is None
+
+    def test_header(self):
+        view = PacketView(_packet('TEXT_MESSAGE_APP'))
+        assert view.from_num == SENDER
+        assert view.from_id == SENDER_ID
+        assert view.is_broadcast
+        assert view.hops_away == 2
+        assert view.snr == 6.5 and view.rssi == -90
+        assert view.channel == 0
+
+    def test_ids_from_numbers(self):
+        view = PacketView({'from': SENDER, 'to': 0xFFFFFFFF})
+        assert view.from_id == SENDER_ID
+        assert view.to_id == '^all'
+        assert PacketView({'fromId': SENDER_ID}).from_num == SENDER
+
+    def test_invalid_hops(self):
+        assert PacketView({'hopStart': 1, 'hopLimit': 3}).hops_away is None
+        assert PacketView({'hopLimit': 3}).hops_away is None
+
+    def test_payload_and_text(self):
+        view = PacketView(_packet(256, payload='\x00\xff'))
+        assert view.portnum == 'PRIVATE_APP'
+        assert view.payload == b'\x00\xff'
+
+        text = PacketView(_packet('TEXT_MESSAGE_APP', payload=b'hi \xff'))
+        assert text.text == 'hi '
+        assert PacketView(_packet('TEXT_MESSAGE_APP', text='decoded')).text == 'decoded'
+
+    def test_decoded_once(self):
+        packet = _packet('TEXT_MESSAGE_APP', payload=b'one')
+        view = PacketView(packet)
+        assert view.text == 'one'
+        packet['decoded'] = {'portnum': 'POSITION_APP', 'payload': b'two'}
+        assert view.text == 'one'
+        assert view.portnum == 'TEXT_MESSAGE_APP'
+
+    def test_missing_decoded(self):
+        view = PacketView({'fromId': SENDER_ID})
+        assert view.portnum is None
+        assert view.payload == b''
+        assert view.position == {} and view.telemetry == {} and view.user == {}
+
+
+class TestDispatcher:
+    """Routing by portnum, catch-all handlers and error isolation."""
+
+    def test_routes_by_portnum(self):
+        dispatcher = PacketDispatcher()
+        seen = []
+        dispatcher.register('TEXT_MESSAGE_APP', lambda v: seen.append(('text', v.text)))
+        dispatcher.register((3, 'TELEMETRY_APP'), lambda v: seen.append(('node', v.portnum)))
+
+        dispatcher.dispatch(_packet('TEXT_MESSAGE_APP', payload=b'hi'))
+        dispatcher.dispatch(_packet('POSITION_APP'))
+        dispatcher.dispatch(_packet(67))
+
+        assert seen == [('text', 'hi'), ('node', 'POSITION_APP'), ('node', 'TELEMETRY_APP')]
+
+    def test_one_view_shared(self):
+        dispatcher = PacketDispatcher()
+        views = []
+        dispatcher.register(None, views.append)
+        dispatcher.register('PRIVATE_APP', views.append)
+
+        returned = dispatcher.dispatch(_packet('PRIVATE_APP', payload=b'x'))
+
+        assert views == [returned, returned]
+
+    def test_unwanted_packets_skip_view(self):
+        dispatcher = PacketDispatcher()
+        dispatcher.register('PRIVATE_APP', lambda v: pytest.fail("wrong port"))
+
+        assert dispatcher.dispatch(_packet('TEXT_MESSAGE_APP')) is None
+        assert dispatcher.dispatch({'decoded': {'portnum': ['odd']}}) is None
+
+    def test_failing_handler_isolated(self):
+        dispatcher = PacketDispatcher()
+        seen = []
+
+        def broken(view):
+            raise RuntimeError("boom")
+
+        dispatcher.register(None, broken)
+        dispatcher.register(None, seen.append)
+
+        dispatcher.dispatch(_packet('TEXT_MESSAGE_APP'))
+
+        assert len(seen) == 1
+
+    def test_unregister(self):
+        dispatcher = PacketDispatcher()
+        seen = []
+        dispatcher.register('TEXT_MESSAGE_APP', seen.append)
+        dispatcher.dispatch(_packet('TEXT_MESSAGE_APP'))
+
+        dispatcher.unregister(seen.append)
+        dispatcher.dispatch(_packet('TEXT_MESSAGE_APP'))
+
+        assert len(seen) == 1
+        assert dispatcher.handlers_for('TEXT_MESSAGE_APP') == []
+
+
+class TestNodeTrackerTouch:
+    """touch_meshtastic() updates known nodes in place."""
+
+    def test_touch_known_node(self):
+        tracker = UnifiedNodeTracker()
+        tracker._nodes.clear()
+        tracker.add_node(UnifiedNode.from_meshtastic(
+            {'num': SENDER, 'user': {'longName': 'Alpha'}}))
+        events = []
+        tracker.register_callback(lambda event, node: events.append(node))
+
+        tracker.touch_meshtastic(SENDER_ID, snr=-3.0, hops=2, rssi=-101)
+
+        node = tracker.get_node(f"mesh_{SENDER_ID}")
+        assert (node.snr, node.hops, node.rssi) == (-3.0, 2, -101)
+        assert node.name == 'Alpha'
+        assert events == [node]
+
+    def test_touch_unknown_node_adds(self):
+        tracker = UnifiedNodeTracker()
+        tracker._nodes.clear()
+
+        tracker.touch_meshtastic(SENDER_ID, snr=1.0)
+
+        assert tracker.get_node(f"mesh_{SENDER_ID}").snr == 1.0
+
+
+class TestNodeMonitorReceive:
+    """NodeMonitor applies position, telemetry and nodeinfo in place."""
+
+    @pytest.fixture
+    def monitor(self):
+        monitor = NodeMonitor()
+        monitor.added, monitor.updated, monitor.messages = [], [], []
+        monitor.on_node_added = monitor.added.append
+        monitor.on_node_update = monitor.updated.append
+        monitor.on_message = monitor.messages.append
+        return monitor
+
+    def test_new_sender_added(self, monitor):
+        packet = _packet('TEXT_MESSAGE_APP', payload=b'hi')
+        monitor._on_receive(packet, None)
+
+        node = monitor.get_node(SENDER_ID)
+        assert monitor.added == [node]
+        assert monitor.messages == [packet]
+        assert node.snr == 6.5 and node.hops_away == 2
+        assert node.last_heard is not None
+
+    def test_position_in_place(self, monitor):
+        monitor._on_receive(_packet('TEXT_MESSAGE_APP'), None)
+        node = monitor.get_node(SENDER_ID)
+
+        monitor._on_receive(_packet('POSITION_APP', position={
+            'latitudeI': 213000000, 'longitudeI': -1578000000, 'altitude': 12}), None)
+
+        assert monitor.get_node(SENDER_ID) is node
+        assert node.position.latitude == pytest.approx(21.3)
+        assert node.position.altitude == 12
+        assert monitor.updated == [node]
+
+    def test_telemetry_merges(self, monitor):
+        monitor._on_receive(_packet('TELEMETRY_APP', telemetry={
+            'deviceMetrics': {'batteryLevel': 80, 'voltage': 4.0}}), None)
+        monitor._on_receive(_packet('TELEMETRY_APP', telemetry={
+            'environmentMetrics': {'temperature': 21.5}}), None)
+
+        metrics = monitor.get_node(SENDER_ID).metrics
+        assert (metrics.battery_level, metrics.voltage, metrics.temperature) == (80, 4.0, 21.5)
+        assert len(monitor.updated) == 2
+
+    def test_nodeinfo(self, monitor):
+        monitor._on_receive(_packet('NODEINFO_APP', user={
+            'longName': 'Remote', 'shortName': 'RMT', 'hwModel': 'TBEAM'}), None)
+
+        node = monitor.get_node(SENDER_ID)
+        assert (node.long_name, node.short_name, node.hardware_model) == ('Remote', 'RMT', 'TBEAM')
+
+    def test_private_app_only_touches(self, monitor):
+        monitor._on_receive(_packet('PRIVATE_APP', payload=b'\x00'), None)
+
+        assert len(monitor.added) == 1
+        assert monitor.updated == []
@@ -0,0 +1,294 @@
+"""
+Tests for the lazy GTK panel registry and pausable panel timers.
+
+GTK is not needed: the registry only talks to a stack-like object and
+GLib timer functions, both faked here.
+
+Run: python3 -m pytest tests/test_panel_registry.py -v
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# gtk_ui/__init__ imports the GTK app; load the registry module on its own
+_spec = importlib.util.spec_from_file_location(
+    'panel_registry', Path(__file__).parent.parent / 'src' / 'gtk_ui' / 'panel_registry.py')
+panel_registry = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(panel_registry)
+
+PanelRegistry = panel_registry.PanelRegistry
+PanelTimers = panel_registry.PanelTimers
+
+
+class FakeGLib:
+    """Timer sources that only run when the test says so."""
+
+    def __init__(self):
+        self.sources = {}
+        self.idle = []
+        self._next = 1
+
+    def _add(self, interval, callback, *args):
+        source = self._next
+        self._next += 1
+        self.sources[source] = (interval, callback, args)
+        return source
+
+    def timeout_add(self, interval_ms, callback, *args):
+        return self._add(interval_ms, callback, *args)
+
+    def timeout_add_seconds(self, seconds, callback, *args):
+        return self._add(seconds * 1000, callback, *args)
+
+    def idle_add(self, callback, *args):
+        self.idle.append((callback, args))
+
+    def source_remove(self, source):
+        del self.sources[source]
+
+    def tick(self):
+        """Fire every armed timer once."""
+        for source, (_, callback, args) in list(self.sources.items()):
+            if source in self.sources and not callback(*args):
+                self.sources.pop(source, None)
+
+    def run_idle(self):
+        idle, self.idle = self.idle, []
+        for callback, args in idle:
+            callback(*args)
+
+
+class FakeStack:
+    """Enough of Gtk.Stack: named children, visibility and its notify signal."""
+
+    def __init__(self):
+        self.children = {}
+        self.visible = None
+        self._handler = None
+
+    def connect(self, signal, handler):
+        assert signal == 'notify::visible-child-name'
+        self._handler = handler
+
+    def _set_visible(self, name):
+        if name != self.visible:
+            self.visible = name
+            self._handler(self, None)
+
+    def add_named(self, widget, name):
+        self.children[name] = widget
+        if self.visible is None:
+            self._set_visible(name)
+
+    def remove(self, widget):
+        name = next(n for n, w in self.children.items() if w is widget)
+        del self.children[name]
+        if self.visible == name:
+            self._set_visible(next(iter(self.children), None))
+
+    def get_child_by_name(self, name):
+        return self.children.get(name)
+
+    def get_visible_child_name(self):
+        return self.visible
+
+    def set_visible_child_name(self, name):
+        self._set_visible(name)
+
+
+class Placeholder:
+    def __init__(self, name):
+        self.name = name
+
+
+class Panel:
+    def __init__(self, glib=None):
+        self.cleaned = False
+        self.ticks = 0
+        if glib is not None:
+            self.panel_timers = PanelTimers()
+            self.panel_timers.add_seconds(2, self._tick)
+
+    def _tick(self):
+        self.ticks += 1
+        return True
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+@pytest.fixture
+def glib(monkeypatch):
+    fake = FakeGLib()
+    monkeypatch.setattr(panel_registry, 'GLib', fake)
+    return fake
+
+
+class Window:
+    """Stands in for MeshForgeWindow and its _add_*_page loaders."""
+
+    def __init__(self, stack, glib=None):
+        self.stack = stack
+        self.glib = glib
+        self.built = []
+
+    def loader(self, name, fail=False):
+        def load():
+            self.built.append(name)
+            if fail:
+                raise RuntimeError("no WebKit")
+            panel = Panel(self.glib)
+            self.stack.add_named(panel, name)
+            setattr(self, f"{name}_panel", panel)
+        return load
+
+
+@pytest.fixture
+def setup(glib):
+    stack = FakeStack()
+    window = Window(stack, glib)
+    clock = [0.0]
+    errors = []
+
+    def on_error(name, message):
+        errors.append((name, message))
+        stack.add_named(Placeholder(f"error:{name}"), name)
+
+    registry = PanelRegistry(stack, owner=window, placeholder=Placeholder,
+                             on_error=on_error, idle_unload=600, clock=lambda: clock[0])
+    for name in ('dashboard', 'map', 'tools'):
+        registry.register(name, window.loader(name), attr=f"{name}_panel",
+                          unloadable=name != 'dashboard')
+    registry.register('broken', window.loader('broken', fail=True))
+    return registry, stack, window, clock, errors
+
+
+class TestLazyLoading:
+    """Pages are built on first view only."""
+
+    def test_only_first_page_built(self, setup):
+        registry, stack, window, _, _ = setup
+        assert window.built == ['dashboard']
+        assert isinstance(stack.children['map'], Placeholder)
+        assert registry.stats()['loaded'] == ['dashboard']
+
+    def test_navigation_builds_page(self, setup):
+        registry, stack, window, _, _ = setup
+        stack.set_visible_child_name('map')
+
+        assert window.built == ['dashboard', 'map']
+        assert stack.visible == 'map'
+        assert stack.children['map'] is window.map_panel
+        assert registry.get('map') is window.map_panel
+
+        stack.set_visible_child_name('dashboard')
+        stack.set_visible_child_name('map')
+        assert window.built == ['dashboard', 'map']
+
+    def test_loader_failure_shows_error_page(self, setup):
+        registry, stack, window, _, errors = setup
+        registry.show('broken')
+
+        assert errors == [('broken', 'no WebKit')]
+        assert stack.visible == 'broken'
+        assert stack.children['broken'].name == 'error:broken'
+
+    def test_load_all(self, setup, glib):
+        registry, stack, window, _, _ = setup
+        registry.load_all()
+        assert sorted(window.built) == ['broken', 'dashboard', 'map', 'tools']
+        # Pages built in the background start paused
+        assert window.map_panel.panel_timers.paused
+        assert not window.dashboard_panel.panel_timers.paused
+
+
+class TestTimers:
+    """Hidden pages do no periodic work."""
+
+    def test_hidden_page_paused(self, setup, glib):
+        registry, stack, window, _, _ = setup
+        registry.show('tools')
+        glib.tick()
+        assert window.tools_panel.ticks == 1
+
+        registry.show('dashboard')
+        glib.tick()
+        assert window.tools_panel.ticks == 1
+        assert window.dashboard_panel.ticks == 1
+
+    def test_resume_refreshes_once(self, setup, glib):
+        registry, stack, window, _, _ = setup
+        registry.show('tools')
+        registry.show('dashboard')
+        registry.show('tools')
+        glib.run_idle()
+        assert window.tools_panel.ticks == 1
+        glib.tick()
+        assert window.tools_panel.ticks == 2
+
+    def test_callback_false_stops(self, glib):
+        timers = PanelTimers()
+        calls = []
+        timers.add(500, lambda: calls.append(1) and False)
+        glib.tick()
+        glib.tick()
+        assert calls == [1]
+        assert len(timers) == 0
+        assert glib.sources == {}
+
+    def test_remove_and_cancel(self, glib):
+        timers = PanelTimers()
+        handle = timers.add_seconds(5, lambda: True)
+        timers.add(250, lambda: True)
+        assert len(glib.sources) == 2
+
+        timers.remove(handle)
+        assert len(glib.sources) == 1
+        timers.pause()
+        assert glib.sources == {}
+        timers.add(100, lambda: True)        # added while paused: armed on resume
+        assert glib.sources == {}
+        timers.resume()
+        assert len(glib.sources) == 2
+        timers.cancel_all()
+        assert glib.sources == {}
+
+
+class TestUnloading:
+    """Idle unloadable pages are torn down and rebuilt on demand."""
+
+    def test_sweep_unloads_idle(self, setup, glib):
+        registry, stack, window, clock, _ = setup
+        registry.show('map')
+        map_panel = window.map_panel
+        registry.show('dashboard')
+
+        clock[0] = 599
+        assert registry.sweep() == []
+        clock[0] = 600
+        assert registry.sweep() == ['map']
+
+        assert map_panel.cleaned
+        assert window.map_panel is None
+        assert isinstance(stack.children['map'], Placeholder)
+        assert not map_panel.panel_timers._timers
+
+        registry.show('map')
+        assert window.built.count('map') == 2
+        assert window.map_panel is not map_panel
+
+    def test_visible_and_pinned_pages_kept(self, setup, glib):
+        registry, stack, window, clock, _ = setup
+        registry.show('tools')
+        clock[0] = 10000
+        assert registry.sweep() == []           # tools is visible, dashboard pinned
+        assert not registry.unload('tools')
+
+    def test_cleanup_only_built_panels(self, setup, glib):
+        registry, stack, window, _, _ = setup
+        registry.show('tools')
+        registry.cleanup()
+        assert window.dashboard_panel.cleaned and window.tools_panel.cleaned
+        assert not hasattr(window, 'map_panel')
@@ -0,0 +1,279 @@
+"""
+Tests for gateway capture/replay benchmark harness.
+
+The TestReplayBenchmarks cases double as a regression benchmark:
+run with -s to see msg/s and p50/p99 latency for each pipeline.
+
+Run: python3 -m pytest tests/test_replay.py -v -s
+"""
+
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from src.gateway.replay import (
+    CaptureRecord,
+    PacketRecorder,
+    ReplayReport,
+    StubMeshInterface,
+    load_capture,
+    make_bench_bridge,
+    make_bench_transport,
+    replay_bridge,
+    replay_receive,
+    replay_transport,
+    replay_transport_capture,
+    synthetic_lxmf_stream,
+    synthetic_mesh_stream,
+    synthetic_rns_packets,
+    main,
+)
+
+
+class TestCaptureFormat:
+    """Tests for PacketRecorder / load_capture."""
+
+    def test_round_trip_bytes(self, tmp_path):
+        path = tmp_path / "mesh.capture"
+        packet = {
+            'id': 7,
+            'fromId': '!abcd1234',
+            'decoded': {'portnum': 'TEXT_MESSAGE_APP', 'payload': b'\x00hello\xff'},
+        }
+        with PacketRecorder(path) as recorder:
+            recorder.record('meshtastic', packet)
+
+        records = load_capture(path)
+
+        assert len(records) == 1
+        assert records[0].source == 'meshtastic'
+        assert records[0].packet == packet
+        assert records[0].t >= 0
+
+    def test_unserializable_values_dropped(self, tmp_path):
+        path = tmp_path / "mesh.capture"
+        with PacketRecorder(path) as recorder:
+            recorder.record('meshtastic', {'id': 1, 'raw': object(), 'list': [1, object()]})
+
+        packet = load_capture(path)[0].packet
+
+        assert packet == {'id': 1, 'list': [1]}
+
+    def test_header_written(self, tmp_path):
+        path = tmp_path / "mesh.capture"
+        PacketRecorder(path).close()
+
+        header = json.loads(path.read_text().splitlines()[0])
+
+        assert header['format'] == 'meshforge-capture'
+        assert header['version'] == 1
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.jsonl"
+        path.write_text('{"hello": 1}\n')
+
+        with pytest.raises(ValueError):
+            load_capture(path)
+
+    def test_record_after_close_ignored(self, tmp_path):
+        recorder = PacketRecorder(tmp_path / "mesh.capture")
+        recorder.close()
+        recorder.record('meshtastic', {'id': 1})
+        assert recorder.count == 0
+
+
+class TestRecorderHooks:
+    """Tests for set_recorder() on bridge and transport."""
+
+    def test_bridge_records_mesh_packets(self):
+        bridge = make_bench_bridge()
+        recorder = MagicMock()
+        bridge.set_recorder(recorder)
+        packet = synthetic_mesh_stream(1)[0].packet
+
+        bridge._on_meshtastic_receive(packet)
+
+        recorder.record.assert_called_once_with('meshtastic', packet)
+
+    def test_bridge_records_lxmf(self):
+        bridge = make_bench_bridge()
+        recorder = MagicMock()
+        bridge.set_recorder(recorder)
+        message = MagicMock(source_hash=b'\x01' * 16, content="hi", title="t", stamp=None)
+
+        bridge._on_lxmf_receive(message)
+
+        source, data = recorder.record.call_args[0]
+        assert source == 'lxmf'
+        assert data == {'source_hash': b'\x01' * 16, 'content': "hi", 'title': "t"}
+
+    def test_recorder_errors_do_not_stop_bridging(self):
+        bridge = make_bench_bridge()
+        bridge.set_recorder(MagicMock(**{'record.side_effect': OSError("disk full")}))
+        bridge._mesh_dispatcher = MagicMock()
+        packet = synthetic_mesh_stream(1)[0].packet
+
+        bridge._on_meshtastic_receive(packet)
+        bridge._on_lxmf_receive(MagicMock(source_hash=b'\x01' * 16, content="hi",
+                                          title="t", stamp=None))
+
+        bridge._mesh_dispatcher.dispatch.assert_called_once_with(packet)
+        assert bridge.node_tracker.get_all_nodes()
+
+    def test_transport_records_private_app_only(self):
+        transport = make_bench_transport(loopback=False)
+        recorder = MagicMock()
+        transport.set_recorder(recorder)
+
+        transport._on_meshtastic_receive({'decoded': {'portnum': 'TEXT_MESSAGE_APP', 'payload': b'x'}})
+        transport._on_meshtastic_receive({'decoded': {'portnum': 'PRIVATE_APP', 'payload': b'x' * 10}})
+
+        assert recorder.record.call_count == 1
+
+
+class TestSyntheticStreams:
+    """Tests for synthetic traffic generators."""
+
+    def test_mesh_stream_deterministic(self):
+        a = synthetic_mesh_stream(20, seed=3)
+        b = synthetic_mesh_stream(20, seed=3)
+        assert [r.packet for r in a] == [r.packet for r in b]
+
+    def test_mesh_stream_unique_ids(self):
+        ids = [r.packet['id'] for r in synthetic_mesh_stream(100)]
+        assert len(set(ids)) == 100
+
+    def test_mesh_stream_private_ratio(self):
+        records = synthetic_mesh_stream(500, text_ratio=0.2, private_ratio=0.3)
+        ports = [r.packet['decoded']['portnum'] for r in records]
+        assert 100 < ports.count('PRIVATE_APP') < 200
+        position = next(r.packet['decoded'] for r in records
+                        if r.packet['decoded']['portnum'] == 'POSITION_APP')
+        assert position['position']['latitude'] == position['position']['latitudeI'] / 1e7
+
+    def test_rns_packets_sizes(self):
+        packets = synthetic_rns_packets(50, min_size=40, max_size=120)
+        assert all(40 <= len(p) <= 120 for p in packets)
+
+
+class TestReplayReport:
+    """Tests for ReplayReport math."""
+
+    def test_percentiles(self):
+        report = ReplayReport(name="x", injected=100, duration_sec=2.0,
+                              latencies_ms=[float(i) for i in range(1, 101)])
+
+        assert report.msgs_per_sec == 50.0
+        assert report.p50_ms == pytest.approx(50.0, abs=1)
+        assert report.p99_ms == pytest.approx(99.0, abs=1)
+
+    def test_empty(self):
+        data = ReplayReport(name="x").to_dict()
+        assert data['latency_p99_ms'] == 0.0
+        assert data['msgs_per_sec'] == 0.0
+
+
+class TestStubMeshInterface:
+    """Tests for the stub Meshtastic interface."""
+
+    def test_records_text(self):
+        stub = StubMeshInterface()
+        stub.sendText("hello", destinationId="!abcd1234", channelIndex=1)
+        assert stub.sent_text == [("hello", "!abcd1234", 1)]
+
+    def test_send_data_callback(self):
+        seen = []
+        stub = StubMeshInterface(on_send_data=lambda d, dest, port: seen.append(d))
+        stub.sendData(b"abc")
+        assert seen == [b"abc"] and stub.sent_data == 1
+
+
+class TestReplayBenchmarks:
+    """End-to-end replay through the real pipelines (regression benchmark)."""
+
+    def test_bridge_mesh_to_rns(self):
+        records = synthetic_mesh_stream(1000, text_ratio=0.5)
+        texts = sum(1 for r in records if r.packet['decoded']['portnum'] == 'TEXT_MESSAGE_APP')
+
+        report = replay_bridge(records, trace_memory=True)
+        print("\n" + report.format())
+
+        assert report.injected == 1000
+        assert report.completed == report.extra['queued']
+        assert report.extra['bridged_mesh_to_rns'] == report.extra['queued']
+        assert 0 < report.extra['queued'] <= texts
+        assert report.extra['nodes_tracked'] > 0
+        assert report.peak_memory_kb is not None
+        # Idle direction must not throttle the busy one (was ~10 msg/s)
+        assert report.msgs_per_sec > 200
+
+    def test_bridge_rns_to_mesh(self):
+        bridge = make_bench_bridge()
+
+        report = replay_bridge(synthetic_lxmf_stream(300), bridge=bridge)
+        print("\n" + report.format())
+
+        assert report.completed == report.extra['queued']
+        assert len(bridge._mesh_interface.sent_text) == report.extra['bridged_rns_to_mesh']
+
+    def test_bridge_paced_rate(self):
+        report = replay_bridge(synthetic_mesh_stream(50), rate=500)
+        # 50 messages at 500 msg/s take at least ~0.1 s
+        assert report.duration_sec >= 0.09
+
+    def test_bridge_from_capture(self, tmp_path):
+        path = tmp_path / "mesh.capture"
+        with PacketRecorder(path) as recorder:
+            for record in synthetic_mesh_stream(200, text_ratio=1.0):
+                recorder.record(record.source, record.packet)
+
+        report = replay_bridge(load_capture(path))
+
+        assert report.injected == 200
+        assert report.completed == report.extra['queued']
+
+    def test_transport_loopback(self):
+        packets = synthetic_rns_packets(300)
+
+        report = replay_transport(packets, trace_memory=True)
+        print("\n" + report.format())
+
+        assert report.completed == 300
+        assert report.extra['reassembly_successes'] == 300
+        assert report.extra['fragments_sent'] == report.extra['fragments_received']
+        assert report.extra['pending_at_end'] == 0
+
+    def test_transport_capture(self, tmp_path):
+        # Record what a remote transport would put on the air
+        sender = make_bench_transport(loopback=False)
+        records = []
+        for i, packet in enumerate(synthetic_rns_packets(40)):
+            for fragment in sender._fragment_packet(packet):
+                records.append(CaptureRecord(
+                    t=i * 0.001, source='transport',
+                    packet={'decoded': {'portnum': 'PRIVATE_APP', 'payload': fragment.to_bytes()}},
+                ))
+
+        report = replay_transport_capture(records)
+
+        assert report.completed == 40
+        assert report.extra['pending_at_end'] == 0
+
+    def test_receive_handlers(self):
+        records = synthetic_mesh_stream(2000, text_ratio=0.3, private_ratio=0.2)
+        ports = [r.packet['decoded']['portnum'] for r in records]
+
+        report = replay_receive(records)
+        print("\n" + report.format())
+
+        assert report.completed == 2000
+        assert report.extra['fragments_queued'] == ports.count('PRIVATE_APP')
+        assert report.extra['nodes_tracked'] == report.extra['monitor_nodes'] == 50
+        assert report.extra['texts_queued'] <= ports.count('TEXT_MESSAGE_APP')
+        assert report.extra['transport_pkts_per_sec'] > 0
+
+    def test_cli_synthetic(self, capsys):
+        assert main(['--synthetic', '100', '--json']) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data['name'] == 'bridge'
+        assert data['injected'] == 100
@@ -14,10 +14,20 @@ from queue import Queue
 from src.gateway.rns_bridge import (
     BridgedMessage,
     RNSMeshtasticBridge,
+    get_metrics,
 )
 from src.gateway.config import GatewayConfig
 
 
+@pytest.fixture(autouse=True)
+def metrics_dir(tmp_path, monkeypatch):
+    """Keep the bridge's metrics snapshots out of the real home directory."""
+    registry = get_metrics()
+    monkeypatch.setattr(registry, 'get_snapshot_dir', lambda: tmp_path)
+    yield tmp_path
+    registry.stop_exporter()
+
+
 class TestBridgedMessage:
     """Tests for BridgedMessage dataclass."""
 
@@ -245,7 +255,7 @@ class TestRNSMeshtasticBridge:
 class TestBridgeStartStop:
     """Tests for bridge start/stop lifecycle."""
 
-    def test_start_sets_running(self):
+    def test_start_sets_running(self, metrics_dir):
         """Test start sets running flag."""
         with patch('src.gateway.rns_bridge.UnifiedNodeTracker') as mock_tracker:
             mock_tracker_instance = MagicMock()
@@ -261,6 +271,7 @@ class TestBridgeStartStop:
             assert bridge._running is True
             assert bridge.stats['start_time'] is not None
             mock_tracker_instance.start.assert_called_once()
+            assert (metrics_dir / 'gateway.json').exists()
 
             bridge._running = False  # Cleanup
 
@@ -0,0 +1,196 @@
+"""
+Tests for the native /proc and sysfs readers.
+
+Each reader takes its root directory, so the tests build small fake
+/proc and /sys trees instead of depending on the host.
+
+Run: python3 -m pytest tests/test_sysinfo.py -v
+"""
+
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import sysinfo
+from utils.device_scanner import DeviceScanner, DeviceType
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    sysinfo.clear_cache()
+    yield
+    sysinfo.clear_cache()
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _add_process(proc: Path, pid: int, comm: str, argv):
+    _write(proc / str(pid) / 'comm', comm + '\n')
+    (proc / str(pid) / 'cmdline').write_bytes(b'\0'.join(a.encode() for a in argv) + b'\0')
+
+
+class TestCache:
+    """Readers share one read per TTL, keyed by arguments."""
+
+    def test_cached_per_argument(self, tmp_path):
+        proc = tmp_path / 'proc'
+        _add_process(proc, 10, 'rnsd', ['rnsd'])
+        first = sysinfo.list_processes(str(proc))
+        _add_process(proc, 11, 'nomadnet', ['nomadnet'])
+
+        assert sysinfo.list_processes(str(proc)) is first
+        assert len(sysinfo.list_processes.uncached(str(proc))) == 2
+        sysinfo.clear_cache()
+        assert len(sysinfo.list_processes(str(proc))) == 2
+
+
+class TestDiskAndProcesses:
+
+    def test_disk_usage_matches_statvfs(self, tmp_path):
+        usage = sysinfo.disk_usage(str(tmp_path))
+        st = os.statvfs(str(tmp_path))
+        assert usage.total == st.f_blocks * st.f_frsize
+        assert 0 <= usage.percent <= 100
+        assert sysinfo.disk_usage(str(tmp_path / 'missing')) is None
+
+    def test_find_processes_like_pgrep(self, tmp_path):
+        proc = tmp_path / 'proc'
+        _add_process(proc, 100, 'rnsd', ['/usr/bin/python3', '/usr/local/bin/rnsd'])
+        _add_process(proc, 101, 'python3', ['python3', '-c', 'import RNS.Reticulum'])
+        _add_process(proc, 102, 'meshtasticd', ['/usr/bin/meshtasticd'])
+        _add_process(proc, 103, 'kworker/0:1', [])         # kernel thread
+        (proc / 'self').mkdir()
+
+        pids = sorted(p.pid for p in sysinfo.find_processes(r'rnsd|RNS\.Reticulum',
+                                                            proc_root=str(proc)))
+        assert pids == [100, 101]
+        assert [p.pid for p in sysinfo.find_processes('^kworker', full=False,
+                                                      proc_root=str(proc))] == [103]
+
+    def test_fresh_bypasses_cache(self, tmp_path):
+        proc = tmp_path / 'proc'
+        _add_process(proc, 100, 'rnsd', ['rnsd'])
+        assert sysinfo.find_processes('rnsd', proc_root=str(proc))
+        (proc / '100' / 'cmdline').unlink()       # process exited
+
+        assert sysinfo.find_processes('rnsd', proc_root=str(proc))
+        assert sysinfo.find_processes('rnsd', fresh=True, proc_root=str(proc)) == []
+
+
+class TestSysfs:
+    """Temperature, USB and interfaces from fake sysfs trees."""
+
+    def test_cpu_temperature_prefers_cpu_zone(self, tmp_path):
+        _write(tmp_path / 'thermal_zone0' / 'type', 'acpitz\n')
+        _write(tmp_path / 'thermal_zone0' / 'temp', '27800\n')
+        _write(tmp_path / 'thermal_zone1' / 'type', 'cpu-thermal\n')
+        _write(tmp_path / 'thermal_zone1' / 'temp', '48312\n')
+        assert sysinfo.cpu_temperature(str(tmp_path)) == 48.3
+        assert sysinfo.cpu_temperature(str(tmp_path / 'none')) is None
+
+    @pytest.fixture
+    def usb_root(self, tmp_path):
+        root = tmp_path / 'usb'
+        devices = {
+            'usb1': ('1d6b', '0002', 1, 1, 'Linux Foundation', 'xHCI Host Controller', None),
+            '1-1.3': ('1a86', '7523', 1, 4, '', 'USB Serial', 'ch341'),
+            '1-1.2': ('10C4', 'EA60', 1, 3, 'Silicon Labs', 'CP2102 USB to UART', 'cp210x'),
+        }
+        for name, (vendor, product, bus, dev, mfg, prod, driver) in devices.items():
+            base = root / name
+            for attr, value in (('idVendor', vendor), ('idProduct', product),
+                                ('busnum', str(bus)), ('devnum', str(dev)), ('product', prod)):
+                _write(base / attr, value + '\n')
+            if mfg:
+                _write(base / 'manufacturer', mfg + '\n')
+            if driver:
+                iface = root / f'{name}:1.0'
+                iface.mkdir()
+                drivers = tmp_path / 'drivers' / driver
+                drivers.mkdir(parents=True)
+                (iface / 'driver').symlink_to(drivers)
+                (base / f'{name}:1.0').symlink_to(iface)
+        return root
+
+    def test_usb_devices(self, usb_root):
+        devices = sysinfo.usb_devices(str(usb_root))
+
+        assert [(d.bus, d.device, d.usb_id) for d in devices] == [
+            ('001', '001', '1d6b:0002'), ('001', '003', '10c4:ea60'), ('001', '004', '1a86:7523')]
+        cp2102 = devices[1]
+        assert cp2102.description == 'Silicon Labs CP2102 USB to UART'
+        assert cp2102.driver == 'cp210x'
+        assert devices[0].driver == ''
+
+    def test_device_scanner_uses_sysfs(self, usb_root, monkeypatch):
+        import utils.device_scanner as device_scanner
+
+        def no_lsusb(*args, **kwargs):
+            raise AssertionError("lsusb should not run when sysfs is present")
+
+        monkeypatch.setattr(device_scanner.subprocess, 'run', no_lsusb)
+        monkeypatch.setattr(device_scanner, 'usb_sysfs_available', lambda: True)
+        monkeypatch.setattr(device_scanner, 'usb_devices',
+                            lambda: sysinfo.usb_devices(str(usb_root)))
+
+        devices = DeviceScanner()._scan_usb_devices()
+        ch340 = next(d for d in devices if d.vendor_id == '1a86')
+        assert ch340.meshtastic_compatible
+        assert ch340.driver == 'ch341'
+        assert ch340.device_type != DeviceType.UNKNOWN
+
+    def test_network_interfaces(self, tmp_path, monkeypatch):
+        eth = tmp_path / 'eth0'
+        for attr, value in (('ifindex', '2'), ('flags', '0x1043'), ('mtu', '1500'),
+                            ('operstate', 'up'), ('address', 'dc:a6:32:00:00:01'),
+                            ('statistics/rx_bytes', '1234')):
+            _write(eth / attr, value + '\n')
+        monkeypatch.setattr(sysinfo, '_netlink_addresses', lambda: [
+            (2, {'family': 'inet', 'local': '192.168.1.20', 'prefixlen': 24,
+                 'scope': 'global'}),
+            (9, {'family': 'inet', 'local': '10.0.0.1', 'prefixlen': 8, 'scope': 'global'}),
+        ])
+
+        [iface] = sysinfo.network_interfaces(str(tmp_path))
+        assert iface['ifname'] == 'eth0'
+        assert iface['flags'] == ['UP', 'BROADCAST', 'RUNNING', 'MULTICAST']
+        assert iface['operstate'] == 'UP'
+        assert iface['stats'] == {'rx_bytes': 1234}
+        assert [a['local'] for a in iface['addr_info']] == ['192.168.1.20']
+
+    def test_parse_netlink_address(self):
+        addr = socket.inet_aton('192.168.1.20')
+        label = b'eth0\0'
+        attrs = b''
+        for attr_type, value in ((2, addr), (3, label)):
+            length = 4 + len(value)
+            attrs += struct.pack('=HH', length, attr_type) + value + b'\0' * (-length % 4)
+        payload = struct.pack('=BBBBI', socket.AF_INET, 24, 0, 0, 2) + attrs
+
+        index, info = sysinfo._parse_ifaddr(payload, 0, len(payload))
+        assert index == 2
+        assert info == {'family': 'inet', 'local': '192.168.1.20', 'prefixlen': 24,
+                        'scope': 'global', 'label': 'eth0'}
+
+
+class TestSockets:
+
+    def test_format_sockets(self):
+        text = sysinfo.format_sockets([
+            {'protocol': 'tcp', 'ip': '0.0.0.0', 'port': 4403, 'state': 'LISTEN',
+             'process': 'meshtasticd (PID 42)'},
+            {'protocol': 'udp6', 'ip': '::', 'port': 29716, 'state': 'UNCONN', 'process': ''},
+        ])
+        lines = text.splitlines()
+        assert lines[0].startswith('Netid')
+        assert '0.0.0.0:4403' in lines[1] and lines[1].endswith('meshtasticd (PID 42)')
+        assert '[::]:29716' in lines[2]
@@ -0,0 +1,291 @@
+"""
+Tests for the shared system-state poller.
+
+systemctl, port checks, node counting and /proc are all faked.
+
+Run: python3 -m pytest tests/test_system_state.py -v
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import utils.system_state as system_state
+from utils.service_check import ServiceState, check_service
+from utils.system_state import (
+    SystemStatePoller, diff_states, format_uptime, parse_systemctl_show, scan_processes,
+)
+
+
+def _unit_block(name, active='active', sub='running', enabled='enabled',
+                load='loaded', since_usec=None):
+    if since_usec is None:
+        since_usec = int((time.monotonic() - 3700) * 1_000_000) if active == 'active' else 0
+    return (f"Id={name}.service\nLoadState={load}\nActiveState={active}\nSubState={sub}\n"
+            f"UnitFileState={enabled}\nActiveEnterTimestampMonotonic={since_usec}\n")
+
+
+class FakeSystem:
+    """systemctl, ports and a node counter that tests can change."""
+
+    def __init__(self):
+        self.units = {'meshtasticd': {}, 'rnsd': {'active': 'inactive', 'sub': 'dead'}}
+        self.open_ports = {4403}
+        self.nodes = 12
+        self.commands = []
+        self.node_calls = 0
+        self.systemctl_missing = False
+
+    def run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        if self.systemctl_missing:
+            raise FileNotFoundError('systemctl')
+        blocks = [_unit_block(name, **self.units[name])
+                  for name in ('meshtasticd', 'rnsd')]
+        return SimpleNamespace(stdout='\n'.join(blocks), returncode=0)
+
+    def port_check(self, port):
+        return port in self.open_ports
+
+    def count(self):
+        self.node_calls += 1
+        return self.nodes
+
+
+@pytest.fixture
+def fake():
+    return FakeSystem()
+
+
+@pytest.fixture
+def poller(fake, tmp_path):
+    poller = SystemStatePoller(runner=fake.run, port_check=fake.port_check,
+                               node_counter=fake.count, proc_root=str(tmp_path),
+                               interval=60, watch_links=False, autostart=False)
+    yield poller
+    poller.stop()
+
+
+def _add_process(proc_root: Path, pid: int, comm: str, argv):
+    proc = proc_root / str(pid)
+    proc.mkdir()
+    (proc / 'comm').write_text(comm + '\n')
+    (proc / 'cmdline').write_bytes(b'\0'.join(a.encode() for a in argv) + b'\0')
+
+
+class TestParsing:
+    """systemctl output, uptime text and the /proc scan."""
+
+    def test_parse_multiple_units(self):
+        output = _unit_block('meshtasticd') + '\n' + _unit_block('rnsd', load='not-found')
+        units = parse_systemctl_show(output)
+        assert set(units) == {'meshtasticd', 'rnsd'}
+        assert units['rnsd']['LoadState'] == 'not-found'
+
+    def test_format_uptime(self):
+        assert format_uptime(None) == '--'
+        assert format_uptime(420) == '7m'
+        assert format_uptime(2 * 3600 + 15 * 60) == '2h 15m'
+        assert format_uptime(3 * 86400 + 4 * 3600) == '3d 4h'
+
+    def test_scan_processes(self, tmp_path):
+        _add_process(tmp_path, 100, 'meshtasticd', ['/usr/bin/meshtasticd'])
+        _add_process(tmp_path, 200, 'python3', ['/usr/bin/python3', '/usr/local/bin/rnsd'])
+        (tmp_path / 'self').mkdir()
+        found = scan_processes(['meshtasticd', 'rnsd', 'hamclock'], str(tmp_path))
+        assert found == {'meshtasticd': True, 'rnsd': True, 'hamclock': False}
+
+
+class TestPoller:
+    """One batched probe per poll, cached and diffed."""
+
+    def test_single_systemctl_call(self, poller, fake):
+        state = poller.refresh()
+
+        assert len(fake.commands) == 1
+        assert fake.commands[0][:4] == ['systemctl', 'show', 'meshtasticd.service', 'rnsd.service']
+        assert state.is_running('meshtasticd')
+        assert not state.is_running('rnsd')
+        assert state.service('meshtasticd').enabled == 'enabled'
+        assert state.port_open('meshtasticd')
+        assert 3600 < state.uptime('meshtasticd') < 3800
+        assert state.node_count == 12
+
+    def test_node_count_cached(self, poller, fake):
+        for _ in range(3):
+            poller.refresh()
+        assert fake.node_calls == 1
+
+        poller._node_count_at -= poller.node_count_ttl
+        fake.nodes = 13
+        assert poller.refresh().node_count == 13
+
+    def test_node_count_skipped_when_port_closed(self, poller, fake):
+        fake.open_ports = set()
+        state = poller.refresh()
+        assert state.node_count is None
+        assert fake.node_calls == 0
+
+    def test_process_fallback(self, poller, fake, tmp_path):
+        _add_process(tmp_path, 300, 'rnsd', ['rnsd'])
+        state = poller.refresh()
+        assert state.is_running('rnsd')
+        assert state.service('rnsd').status == 'running (process)'
+        assert state.uptime('rnsd') is None
+
+    def test_no_systemctl(self, poller, fake):
+        fake.systemctl_missing = True
+        state = poller.refresh()
+        assert not state.systemd
+        # Port still proves meshtasticd is up
+        assert state.is_running('meshtasticd')
+
+    def test_get_reuses_state(self, poller, fake):
+        first = poller.get()
+        assert poller.get() is first
+        assert len(fake.commands) == 1
+        assert poller.get(max_age=-1) is not first
+
+    def test_concurrent_refresh_shares_poll(self, fake, tmp_path):
+        def slow_run(cmd, **kwargs):
+            time.sleep(0.2)
+            return fake.run(cmd, **kwargs)
+
+        poller = SystemStatePoller(runner=slow_run, port_check=fake.port_check,
+                                   node_counter=None, proc_root=str(tmp_path))
+        threads = [threading.Thread(target=poller.refresh) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(fake.commands) <= 2
+
+
+class TestEvents:
+    """Subscribers hear about changes, not about every poll."""
+
+    def test_change_events(self, poller, fake):
+        events = []
+        poller.subscribe(lambda state, changes: events.append([c.key for c in changes]))
+        poller.refresh()
+        assert events == [['service:meshtasticd', 'service:rnsd', 'port:4403',
+                           'port:37428', 'node_count']]
+
+        poller.refresh()
+        assert len(events) == 1
+
+        fake.units['meshtasticd'] = {'active': 'failed', 'sub': 'failed'}
+        fake.open_ports = set()
+        poller.refresh()
+        assert events[-1] == ['service:meshtasticd', 'port:4403', 'node_count']
+
+    def test_initial_state_and_unsubscribe(self, poller, fake):
+        poller.refresh()
+        events = []
+        unsubscribe = poller.subscribe(lambda state, changes: events.append(state))
+        assert len(events) == 1
+
+        unsubscribe()
+        fake.open_ports = set()
+        poller.refresh()
+        assert len(events) == 1
+
+    def test_failing_subscriber_isolated(self, poller, fake):
+        seen = []
+
+        def broken(state, changes):
+            raise RuntimeError("boom")
+
+        poller.subscribe(broken)
+        poller.subscribe(lambda state, changes: seen.append(state))
+        poller.refresh()
+        assert len(seen) == 1
+
+    def test_diff_ignores_same_state(self, poller):
+        state = poller.refresh()
+        assert diff_states(state, state) == []
+
+    def test_background_thread_publishes(self, fake, tmp_path):
+        poller = SystemStatePoller(runner=fake.run, port_check=fake.port_check,
+                                   node_counter=None, proc_root=str(tmp_path),
+                                   interval=0.05, watch_links=False)
+        changed = threading.Event()
+        poller.subscribe(lambda state, changes: changed.set(), initial=False)
+        try:
+            assert changed.wait(2)
+            changed.clear()
+            fake.units['rnsd'] = {}
+            assert changed.wait(2)
+            assert poller.peek().is_running('rnsd')
+        finally:
+            poller.stop()
+        assert not poller.running
+
+
+class TestSharedConsumers:
+    """check_service answers from a running poller instead of probing."""
+
+    @pytest.fixture
+    def shared(self, poller, monkeypatch):
+        monkeypatch.setattr(system_state, '_poller', poller)
+        poller.start()
+        poller.refresh()
+        return poller
+
+    def test_check_service_uses_shared_state(self, shared, fake, monkeypatch):
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("probed systemd directly")
+
+        monkeypatch.setattr(subprocess, 'run', no_subprocess)
+        assert check_service('meshtasticd').state == ServiceState.AVAILABLE
+
+        status = check_service('rnsd')
+        assert status.state == ServiceState.NOT_RUNNING
+
+    def test_unwatched_service_probes(self, shared, monkeypatch):
+        import utils.service_check as service_check
+        monkeypatch.setattr(service_check, 'check_port', lambda port, host: True)
+        assert check_service('hamclock').available
+
+    def test_no_poller_no_shared_state(self, monkeypatch):
+        monkeypatch.setattr(system_state, '_poller', None)
+        assert system_state.peek_system_state() is None
+
+
+class TestCountNodes:
+    """count_nodes() never keeps meshtasticd's client slot."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        import monitoring.monitor_service as monitor_service
+
+        def factory(host, port):
+            raise AssertionError("connected the shared monitor")
+
+        service = monitor_service.NodeMonitorService(monitor_factory=factory)
+        monkeypatch.setitem(monitor_service._services, ('fake', 1), service)
+        monkeypatch.setattr(system_state, '_web_client_mode', lambda: False)
+        return service
+
+    def test_reads_connected_monitor(self, service, monkeypatch):
+        monitor = SimpleNamespace(is_connected=True, get_nodes=lambda: ['!a', '!b', '!c'])
+        monkeypatch.setattr(service, '_monitor', monitor)
+
+        assert system_state.count_nodes('fake', 1) == 3
+        assert service.ref_count == 0
+
+    def test_transient_cli_otherwise(self, service, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'utils.cli',
+                            SimpleNamespace(find_meshtastic_cli=lambda: '/usr/bin/meshtastic'))
+        monkeypatch.setattr(subprocess, 'run', lambda *a, **kw: SimpleNamespace(
+            returncode=0, stdout='│ !0000000a │\n│ !0000000b │\n│ !0000000a │'))
+
+        assert system_state.count_nodes('fake', 1) == 2
+        assert service.ref_count == 0 and not service.is_connected
@@ -0,0 +1,239 @@
+"""
+Tests for the per-node telemetry time-series store.
+
+Run: python3 -m pytest tests/test_telemetry_store.py -v
+"""
+
+import sys
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path (the store is imported as utils.telemetry_store)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.telemetry_store import TelemetryStore, LEVELS
+
+# A day boundary, so every level's window starts here
+T0 = 1_700_006_400
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry.db")
+    yield store
+    store.close()
+
+
+def _chunk_rows(store, level=None):
+    sql = 'SELECT COUNT(*) FROM chunks'
+    args = ()
+    if level is not None:
+        sql += ' WHERE level = ?'
+        args = (level,)
+    return store._conn.execute(sql, args).fetchone()[0]
+
+
+class TestRecordAndQuery:
+    """Samples come back at every resolution, before and after flush."""
+
+    def test_raw_round_trip(self, store):
+        for i in range(10):
+            store.record("!a", {"battery_level": 90 - i, "voltage": 4.1}, T0 + i * 30)
+
+        before = store.query("!a", "battery_level", T0, T0 + 600, resolution=0)
+        store.flush(now=T0 + 600)
+        after = store.query("!a", "battery_level", T0, T0 + 600, resolution=0)
+
+        assert before['points'] == after['points']
+        assert after['points'][0] == [T0, 90.0]
+        assert after['points'][-1] == [T0 + 270, 81.0]
+        assert len(after['points']) == 10
+
+    def test_minute_rollup(self, store):
+        for i, value in enumerate([10, 20, 30, 40]):
+            store.record("!a", {"snr": value}, T0 + i * 15)
+        store.flush(now=T0 + 3600)
+
+        points = store.query("!a", "snr", T0, T0 + 3600, resolution=60)['points']
+
+        assert points == [[T0, 10.0, 25.0, 40.0]]
+
+    def test_hour_rollup_spans_days(self, store):
+        for hour in range(48):
+            store.record("!a", {"voltage": 3.5 + hour / 100}, T0 + hour * 3600)
+        store.flush(now=T0 + 49 * 3600)
+
+        points = store.query("!a", "voltage", T0, T0 + 48 * 3600, resolution=3600)['points']
+
+        assert len(points) == 48
+        assert points[0][0] == T0
+        assert points[47][1] == pytest.approx(3.97)
+
+    def test_skips_unusable_values(self, store):
+        recorded = store.record("!a", {"battery_level": None, "charging": True,
+                                       "name": "x", "snr": float('nan'), "rssi": -90}, T0)
+
+        assert recorded == 1
+        assert [s['metric'] for s in store.list_series("!a")] == ["rssi"]
+
+    def test_same_timestamp_recorded_once(self, store):
+        store.record("!a", {"snr": 5}, T0)
+        store.record("!a", {"snr": 5}, T0)
+        store.flush(now=T0 + 7200)
+
+        assert len(store.query("!a", "snr", T0, T0 + 60, resolution=0)['points']) == 1
+        assert store.query("!a", "snr", T0, T0 + 60, resolution=60)['points'][0][1:] == [5.0] * 3
+
+    def test_unknown_series_is_empty(self, store):
+        assert store.query("!nobody", "snr", T0, T0 + 60)['points'] == []
+
+    def test_unknown_resolution_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.query("!a", "snr", T0, T0 + 60, resolution=5)
+
+    def test_pick_resolution_by_span(self, store):
+        now = T0 + 86400
+        assert store.pick_resolution(now - 3600, now, now) == 0
+        assert store.pick_resolution(now - 86400, now, now) == 60
+        assert store.pick_resolution(now - 30 * 86400, now, now) == 3600
+
+
+class TestFlushAndCompaction:
+    """Disk layout: complete rollup buckets only, merged chunk rows."""
+
+    def test_open_rollup_buckets_stay_in_memory(self, store):
+        store.record("!a", {"snr": 1}, T0 + 10)
+        store.flush(now=T0 + 30)
+
+        assert _chunk_rows(store, level=0) == 1
+        assert _chunk_rows(store, level=1) == 0
+        assert _chunk_rows(store, level=2) == 0
+        # Still queryable from memory
+        assert store.query("!a", "snr", T0, T0 + 60, resolution=60)['points'] == [[T0, 1.0, 1.0, 1.0]]
+
+        store.flush(now=T0 + 60)
+        assert _chunk_rows(store, level=1) == 1
+
+    def test_compaction_merges_rows(self, store):
+        for i in range(20):
+            store.record("!a", {"snr": i}, T0 + i * 60)
+            store.flush(now=T0 + i * 60 + 1)
+        expected = store.query("!a", "snr", T0, T0 + 3600, resolution=0)['points']
+        assert _chunk_rows(store, level=0) == 20
+
+        # Raw rows plus the 1-minute buckets completed by each flush
+        merged = store.compact(now=T0 + 3600, min_rows=8)
+
+        assert merged == 19 + 18
+        assert _chunk_rows(store, level=0) == 1
+        assert store.query("!a", "snr", T0, T0 + 3600, resolution=0)['points'] == expected
+
+    def test_open_window_waits_for_min_rows(self, store):
+        for i in range(3):
+            store.record("!a", {"snr": i}, T0 + i)
+            store.flush(now=T0 + i + 1)
+
+        assert store.compact(now=T0 + 10, min_rows=8) == 0
+        assert store.compact(now=T0 + 10, min_rows=3) == 2
+
+    def test_stop_writes_everything(self, tmp_path):
+        path = tmp_path / "telemetry.db"
+        store = TelemetryStore(path)
+        store.record("!a", {"snr": 7}, T0)
+        store.close()
+
+        reopened = TelemetryStore(path)
+        try:
+            for resolution in (0, 60, 3600):
+                assert reopened.query("!a", "snr", T0, T0 + 3600, resolution=resolution)['points']
+        finally:
+            reopened.close()
+
+    def test_two_writers_share_a_file(self, tmp_path):
+        path = tmp_path / "telemetry.db"
+        first, second = TelemetryStore(path), TelemetryStore(path)
+        try:
+            first.record("!a", {"snr": 1}, T0)
+            second.record("!a", {"snr": 2}, T0 + 30)
+            first.flush(now=T0 + 3600)
+            second.flush(now=T0 + 3600)
+            first.compact(now=T0 + 86400, min_rows=2)
+
+            points = second.query("!a", "snr", T0, T0 + 60, resolution=0)['points']
+            assert points == [[T0, 1.0], [T0 + 30, 2.0]]
+            assert second.query("!a", "snr", T0, T0 + 60, resolution=60)['points'] == [
+                [T0, 1.0, 1.5, 2.0]]
+        finally:
+            first.close()
+            second.close()
+
+
+class TestRetention:
+    """Expired chunks and empty series are removed."""
+
+    def test_expired_chunks_removed(self, tmp_path):
+        store = TelemetryStore(tmp_path / "telemetry.db", retention={0: 3600})
+        try:
+            store.record("!a", {"snr": 1}, T0)
+            # Next raw window: expiry is per chunk
+            store.record("!a", {"snr": 2}, T0 + 6 * 3600)
+            store.flush(now=T0 + 7 * 3600)
+
+            removed = store.apply_retention(now=T0 + 6 * 3600 + 60)
+
+            assert removed == 1
+            points = store.query("!a", "snr", T0, T0 + 86400, resolution=0)['points']
+            assert points == [[T0 + 6 * 3600, 2.0]]
+            # Rollups keep their own, longer retention
+            assert len(store.query("!a", "snr", T0, T0 + 86400, resolution=60)['points']) == 2
+        finally:
+            store.close()
+
+    def test_orphan_series_dropped(self, store):
+        store.record("!gone", {"snr": 1}, T0)
+        store.flush(now=float('inf'))
+        store.record("!live", {"snr": 1}, T0 + 10 * 365 * 86400)
+
+        store.apply_retention(now=T0 + 10 * 365 * 86400)
+
+        assert [s['node'] for s in store.list_series()] == ["!live"]
+
+    def test_levels_ordered_by_resolution(self):
+        assert [lvl.resolution for lvl in LEVELS] == sorted(lvl.resolution for lvl in LEVELS)
+        assert all(a.retention <= b.retention for a, b in zip(LEVELS, LEVELS[1:]))
+
+
+class TestNodeTrackerRecording:
+    """UnifiedNodeTracker feeds node updates into an attached store."""
+
+    def test_add_node_records_telemetry(self, store):
+        from gateway.node_tracker import UnifiedNode, UnifiedNodeTracker, Telemetry
+
+        tracker = UnifiedNodeTracker()
+        tracker.attach_telemetry_store(store)
+        node = UnifiedNode(id="mesh_abcd", network="meshtastic", meshtastic_id="!abcd")
+        node.snr = 6.5
+        node.telemetry = Telemetry(battery_level=88, voltage=4.02,
+                                   timestamp=datetime.fromtimestamp(T0))
+
+        tracker.add_node(node)
+
+        assert store.query("!abcd", "battery_level", T0 - 60, T0 + 60,
+                           resolution=0)['points'] == [[T0, 88.0]]
+        metrics = {s['metric'] for s in store.list_series("!abcd")}
+        assert metrics == {"battery_level", "voltage", "snr"}
+
+    def test_history_is_opt_in(self, store):
+        from unittest.mock import patch
+        from gateway import node_tracker
+
+        for enabled in (False, True):
+            with patch.object(node_tracker, 'get_telemetry_store', return_value=store) as get, \
+                    patch.object(node_tracker.UnifiedNodeTracker, '_init_rns_main_thread'), \
+                    patch.object(node_tracker.UnifiedNodeTracker, '_save_cache'):
+                tracker = node_tracker.UnifiedNodeTracker(telemetry_history=enabled)
+                tracker.start()
+                tracker.stop(timeout=0.1)
+            assert get.called is enabled
+            assert (tracker._telemetry_store is store) is enabled
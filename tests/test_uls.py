@@ -0,0 +1,216 @@
+"""
+Tests for the local FCC ULS database and batch callsign lookups.
+
+Run: python3 -m pytest tests/test_uls.py -v
+"""
+
+import json
+import sys
+import time
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import amateur.callsign as callsign_module
+from amateur.callsign import CallsignInfo, CallsignManager
+from amateur.uls import UlsDatabase, iter_records
+
+
+def _hd(usi, call, status, grant, expires):
+    fields = ['HD', str(usi), '', '', call, status, 'HA', grant, expires] + [''] * 42
+    return '|'.join(fields)
+
+
+def _en(usi, call, name, street, city, state, zip_code, frn, entity='L', first='', last=''):
+    fields = ['EN', str(usi), '', '', call, entity, '', name, first, '', last, '',
+              '', '', '', street, city, state, zip_code, '', '', '', frn] + [''] * 7
+    return '|'.join(fields)
+
+
+def _am(usi, call, op_class):
+    return '|'.join(['AM', str(usi), '', '', call, op_class] + [''] * 12)
+
+
+def _write_dump(path: Path):
+    hd = [
+        _hd(1, 'W1AW', 'A', '01/01/2020', '01/01/2099'),
+        _hd(2, 'K6OLD', 'E', '05/05/2005', '05/05/2015'),
+        _hd(3, 'K6NEW', 'A', '02/02/2022', '02/02/2099'),
+        _hd(4, 'K6NEW', 'E', '02/02/2010', '02/02/2020'),   # earlier grant, same call
+        _hd(5, 'N0GONE', 'C', '03/03/2021', '03/03/2099'),
+    ]
+    en = [
+        _en(1, 'W1AW', 'AMERICAN RADIO RELAY LEAGUE INC', '225 MAIN ST', 'NEWINGTON',
+            'CT', '06111', '0000000001'),
+        _en(1, 'W1AW', 'CONTACT PERSON', '', '', '', '', '', entity='CE'),
+        _en(2, 'K6OLD', '', '1 OLD RD', 'FRESNO', 'CA', '93701', '0000000002',
+            first='Old', last='Timer'),
+        _en(3, 'K6NEW', 'New Operator', '2 NEW ST', 'SAN JOSE', 'CA', '95112', '0000000003'),
+        _en(4, 'K6NEW', 'Previous Holder', '', '', 'CA', '', ''),
+        _en(5, 'N0GONE', 'Gone Away', '', 'DENVER', 'CO', '', ''),
+    ]
+    am = [_am(1, 'W1AW', 'E'), _am(3, 'K6NEW', 'T'), _am(4, 'K6NEW', 'G')]
+    # A free-text line break inside a record, as found in real dumps
+    en[2] = en[2].replace('1 OLD RD', '1 OLD\nRD')
+
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, lines in (('HD.dat', hd), ('EN.dat', en), ('AM.dat', am),
+                            ('counts', ['ignored'])):
+            zf.writestr(name, '\r\n'.join(lines) + '\r\n')
+    return path
+
+
+@pytest.fixture
+def dump(tmp_path):
+    return _write_dump(tmp_path / 'l_amat.zip')
+
+
+@pytest.fixture
+def db(tmp_path, dump):
+    db = UlsDatabase(tmp_path / 'fcc_uls.db')
+    db.import_zip(dump)
+    yield db
+    db.close()
+
+
+class TestImport:
+    """Parsing and importing the weekly dump."""
+
+    def test_continuation_lines_joined(self):
+        records = list(iter_records(['EN|1|a\r\n', 'b|c\r\n', 'EN|2|d\r\n'], 'EN'))
+        assert records == [['EN', '1', 'a b', 'c'], ['EN', '2', 'd']]
+
+    def test_import_counts_and_info(self, db, dump):
+        info = db.info()
+        assert info['licenses'] == 5
+        assert info['source'] == str(dump)
+        assert db.available
+
+    def test_lookup_joins_tables(self, db):
+        record = db.lookup('w1aw')
+        assert record['name'] == 'AMERICAN RADIO RELAY LEAGUE INC'
+        assert (record['city'], record['state'], record['zip_code']) == ('NEWINGTON', 'CT', '06111')
+        assert record['license_class'] == 'Amateur Extra'
+        assert record['grant_date'] == '2020-01-01'
+        assert record['expiration_date'] == '2099-01-01'
+        assert record['status'] == 'A'
+
+    def test_name_from_parts_and_multiline_address(self, db):
+        record = db.lookup('K6OLD')
+        assert record['name'] == 'Old Timer'
+        assert record['address'] == '1 OLD RD'
+
+    def test_active_license_wins(self, db):
+        record = db.lookup('K6NEW')
+        assert record['name'] == 'New Operator'
+        assert record['license_class'] == 'Technician'
+
+    def test_lookup_many(self, db):
+        found = db.lookup_many(['W1AW', 'k6new', 'NOPE'] + [f"X{i}" for i in range(1200)])
+        assert set(found) == {'W1AW', 'K6NEW'}
+
+    def test_no_database(self, tmp_path):
+        db = UlsDatabase(tmp_path / 'missing.db')
+        assert not db.available
+        assert db.lookup('W1AW') is None
+        assert db.info() == {}
+
+    def test_reimport_replaces(self, db, dump):
+        assert db.lookup('W1AW')
+        db.import_zip(dump)
+        assert db.lookup('W1AW')['frn'] == '0000000001'
+        assert not list(db.path.parent.glob('*.importing'))
+
+    def test_bad_zip_keeps_old_database(self, db, tmp_path):
+        bad = tmp_path / 'bad.zip'
+        with zipfile.ZipFile(bad, 'w') as zf:
+            zf.writestr('HD.dat', _hd(9, 'AA1AA', 'A', '', '') + '\r\n')
+        with pytest.raises(KeyError):
+            db.import_zip(bad)
+        assert db.lookup('W1AW')
+        assert not list(tmp_path.glob('*.importing'))
+
+
+class TestManagerBatch:
+    """CallsignManager over the local database with API fallback."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, dump, monkeypatch):
+        monkeypatch.setattr(callsign_module, 'CACHE_SAVE_DELAY', 0.1)
+        manager = CallsignManager(config_dir=tmp_path / 'config')
+        manager.import_uls(dump)
+        yield manager
+        manager.flush_cache()
+        manager.uls.close()
+
+    def test_lookup_uses_local_database(self, manager):
+        with patch.object(manager, '_lookup_fcc_uls', side_effect=AssertionError("API called")):
+            info = manager.lookup_callsign('W1AW')
+        assert info.name == 'AMERICAN RADIO RELAY LEAGUE INC'
+        # Local answers are not copied into the JSON cache
+        assert 'W1AW' not in manager._cache
+
+    def test_batch_local_then_api(self, manager):
+        requested = []
+
+        def fake_api(callsign):
+            requested.append(callsign)
+            time.sleep(0.1)
+            return CallsignInfo(callsign=callsign, name='From API') if callsign != 'KK6ZZZ' else None
+
+        with patch.object(manager, '_lookup_fcc_uls', side_effect=fake_api):
+            start = time.monotonic()
+            results = manager.lookup_callsigns(
+                ['w1aw', 'K6NEW', 'W1AW', 'KA1AAA', 'KB1BBB', 'KC1CCC', 'KK6ZZZ', 'not-a-call'])
+            elapsed = time.monotonic() - start
+
+        assert results['W1AW'].name == 'AMERICAN RADIO RELAY LEAGUE INC'
+        assert results['KA1AAA'].name == 'From API'
+        assert results['KK6ZZZ'] is None
+        assert results['NOT-A-CALL'] is None
+        assert sorted(requested) == ['KA1AAA', 'KB1BBB', 'KC1CCC', 'KK6ZZZ']
+        assert elapsed < 0.35     # concurrent, not 4 x 0.1 s
+
+    def test_cache_writes_debounced(self, manager):
+        with patch.object(manager, '_lookup_fcc_uls',
+                          side_effect=lambda c: CallsignInfo(callsign=c, name='API')), \
+                patch.object(callsign_module.json, 'dump', wraps=json.dump) as dump:
+            for call in ('KA1AAA', 'KB1BBB', 'KC1CCC'):
+                manager.lookup_callsign(call)
+            assert not manager.cache_file.exists()
+
+            deadline = time.monotonic() + 2
+            while not manager.cache_file.exists():
+                assert time.monotonic() < deadline, "cache never saved"
+                time.sleep(0.02)
+
+        assert dump.call_count == 1
+        saved = json.loads(manager.cache_file.read_text())['cache']
+        assert set(saved) == {'KA1AAA', 'KB1BBB', 'KC1CCC'}
+
+    def test_flush_writes_pending(self, manager, monkeypatch):
+        monkeypatch.setattr(callsign_module, 'CACHE_SAVE_DELAY', 60)
+        with patch.object(manager, '_lookup_fcc_uls',
+                          side_effect=lambda c: CallsignInfo(callsign=c, name='API')):
+            manager.lookup_callsigns(['KA1AAA', 'KB1BBB'])
+        manager.flush_cache()
+
+        assert set(json.loads(manager.cache_file.read_text())['cache']) == {'KA1AAA', 'KB1BBB'}
+        assert manager._save_timer is None
+
+    def test_validate_callsigns_offline(self, manager):
+        with patch.object(manager, '_lookup_fcc_uls', side_effect=AssertionError("API called")):
+            valid = manager.validate_callsigns(['W1AW', 'K6OLD', 'K6NEW', 'N0GONE', 'KA1AAA', 'XX'])
+        assert valid == {'W1AW': True, 'K6OLD': False, 'K6NEW': True,
+                         'N0GONE': False, 'KA1AAA': False, 'XX': False}
+
+    def test_validate_format_only_without_database(self, tmp_path):
+        manager = CallsignManager(config_dir=tmp_path)
+        assert manager.validate_callsigns(['W1AW', 'bogus']) == {'W1AW': True, 'BOGUS': False}
+
+    def test_cache_stats_report_database(self, manager):
+        assert manager.get_cache_stats()['uls_database']['licenses'] == 5